@@ -101,6 +101,15 @@ class CircuitBreaker:
                 raise CircuitBreakerOpen(self.name, 0)
             self._half_open_calls += 1
 
+    def allows_request(self) -> bool:
+        """Whether check() would admit a call, without reserving a probe slot."""
+        current_state = self.state
+        if current_state == CircuitState.CLOSED:
+            return True
+        if current_state == CircuitState.HALF_OPEN:
+            return self._half_open_calls < self.half_open_max_calls
+        return False
+
     def record_success(self) -> None:
         """Record a successful call. Resets failure count, closes circuit if half-open."""
         if (
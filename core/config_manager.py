@@ -337,7 +337,9 @@ class ConfigManager:
         consul = self._get_consul_registry()
         if consul and self._parse_bool(self.get("consul_enabled", True)):
             try:
-                endpoint = consul.get_service_endpoint(service_name)
+                from core.discovery_cache import get_discovery_cache
+
+                endpoint = get_discovery_cache(consul).get_endpoint(service_name)
                 if endpoint:
                     # Parse endpoint: http://host:port or host:port
                     endpoint = endpoint.replace("http://", "").replace("https://", "")
@@ -12,6 +12,8 @@ import json
 from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
 
+from .discovery_cache import get_discovery_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -185,62 +187,18 @@ class ConsulRegistry:
             logger.error(f"Failed to discover service {service_name}: {e}")
             return []
 
-    def get_service_endpoint(self, service_name: str, strategy: str = 'health_weighted') -> Optional[str]:
-        """Get a single service endpoint using advanced load balancing strategy"""
-        instances = self.discover_service(service_name)
-        if not instances:
-            return None
-
-        # 只有一个实例时直接返回
-        if len(instances) == 1:
-            instance = instances[0]
-            return f"http://{instance['address']}:{instance['port']}"
-
-        # 高级负载均衡策略
-        if strategy == 'health_weighted':
-            # 基于健康状态和权重选择最佳实例
-            instance = self._select_best_instance(instances)
-        elif strategy == 'random':
-            import random
-            instance = random.choice(instances)
-        elif strategy == 'round_robin':
-            # 实现真正的轮询（使用实例缓存）
-            instance = self._get_round_robin_instance(service_name, instances)
-        elif strategy == 'least_connections':
-            # 选择连接数最少的实例（模拟实现）
-            instance = min(instances, key=lambda x: hash(x['id']) % 100)
-        else:
-            # 默认随机选择
-            import random
-            instance = random.choice(instances)
-
-        return f"http://{instance['address']}:{instance['port']}"
-
-    def _select_best_instance(self, instances: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """选择最佳实例（基于健康状态和负载）"""
-        # 简单实现：优先选择标签包含'preferred'的实例
-        preferred_instances = [inst for inst in instances if 'preferred' in inst.get('tags', [])]
-        if preferred_instances:
-            import random
-            return random.choice(preferred_instances)
+    def get_service_endpoint(self, service_name: str, strategy: str = 'health_weighted', key: Optional[str] = None) -> Optional[str]:
+        """Get a single service endpoint, served from the watch-refreshed discovery cache
 
-        # 没有首选实例时随机选择
-        import random
-        return random.choice(instances)
-
-    def _get_round_robin_instance(self, service_name: str, instances: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """实现真正的轮询负载均衡"""
-        if not hasattr(self, '_round_robin_counters'):
-            self._round_robin_counters = {}
-
-        if service_name not in self._round_robin_counters:
-            self._round_robin_counters[service_name] = 0
-
-        # 获取当前计数器并递增
-        counter = self._round_robin_counters[service_name]
-        self._round_robin_counters[service_name] = (counter + 1) % len(instances)
+        Instances are picked by core.load_balancer (strategies: health_weighted,
+        p2c, least_connections, sticky, round_robin, random); ``key`` is the
+        affinity key for ``sticky``.
+        """
+        return get_discovery_cache(self).get_endpoint(service_name, strategy, key)
 
-        return instances[counter]
+    async def get_service_endpoint_async(self, service_name: str, strategy: str = 'health_weighted', key: Optional[str] = None) -> Optional[str]:
+        """Async variant of get_service_endpoint (never blocks the event loop)"""
+        return await get_discovery_cache(self).get_endpoint_async(service_name, strategy, key)
 
     def _log_service_metrics(self, operation: str, success: bool, service_name: str = None):
         """记录服务操作指标"""
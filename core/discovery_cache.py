@@ -0,0 +1,383 @@
+"""
+Service Discovery Cache
+
+Keeps per-service healthy instance lists warm in memory so lookups never
+pay a Consul round trip. ``ConsulRegistry.get_service_endpoint`` used to
+issue a synchronous catalog query on every call - on the event loop, for
+every cross-service client and repository that resolved a peer.
+
+- the first lookup of a service fetches it once and starts a watcher
+- each watcher long-polls Consul with blocking queries (``index``/``wait``)
+  and swaps in the new instance list whenever it changes
+- if Consul becomes unreachable the last-known instances keep being served;
+  the watcher retries with exponential backoff
+- lookups are plain dict reads; the async variants only leave the event loop
+  for the one-off cold fetch
+- watchers only run when a Consul host is configured (``CONSUL_HOST``, or
+  ``DISCOVERY_WATCH=true|false`` to force it); otherwise entries are simply
+  re-fetched on lookup once ``refresh_interval`` has passed, so local runs
+  and tests never leave threads polling an absent agent
+
+Watchers are daemon threads rather than asyncio tasks: the python-consul
+client is blocking, and the cache is shared with the synchronous lookup
+paths (``ServiceDiscovery.get_service_url``, ``ConfigManager.discover_service``,
+``BaseServiceClient._discover_service``) that run before any loop exists.
+
+Metrics:
+    discovery_lookup_seconds{service,result}   hit | cold | miss
+    discovery_staleness_seconds{service}       age of the served instance list
+    discovery_watch_errors_total{service}      failed blocking queries
+
+Usage:
+    from core.discovery_cache import get_discovery_cache
+
+    cache = get_discovery_cache(consul_registry)
+    url = cache.get_endpoint("account_service")
+    instances = await cache.get_instances_async("account_service")
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import create_counter, create_histogram
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_LOOKUP_SECONDS = create_histogram(
+    "discovery_lookup_seconds",
+    "Service discovery lookup latency",
+    ["service", "result"],
+    buckets=[0.00001, 0.0001, 0.001, 0.01, 0.1, 0.5, 1.0, 5.0],
+)
+DISCOVERY_STALENESS_SECONDS = create_histogram(
+    "discovery_staleness_seconds",
+    "Seconds since the served instance list was last confirmed by Consul",
+    ["service"],
+    buckets=[1, 5, 15, 30, 60, 120, 300, 900, 3600],
+)
+DISCOVERY_WATCH_ERRORS = create_counter(
+    "discovery_watch_errors_total",
+    "Failed Consul blocking queries while watching a service",
+    ["service"],
+)
+
+
+@dataclass
+class _Entry:
+    instances: List[Dict[str, Any]] = field(default_factory=list)
+    index: Optional[int] = None
+    synced_at: Optional[float] = None  # monotonic time of last successful query
+    checked_at: Optional[float] = None  # monotonic time of last query attempt
+    errors: int = 0
+    last_error: Optional[str] = None
+    watcher: Optional[threading.Thread] = None
+
+
+def _parse_instances(services: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten a Consul health.service response into instance dicts."""
+    instances = []
+    for service in services or []:
+        svc = service["Service"]
+        instances.append(
+            {
+                "id": svc["ID"],
+                "address": svc.get("Address") or service.get("Node", {}).get("Address"),
+                "port": svc["Port"],
+                "tags": svc.get("Tags") or [],
+                "meta": svc.get("Meta") or {},
+            }
+        )
+    return instances
+
+
+def _watch_default() -> bool:
+    """Watch only when pointed at a Consul agent (DISCOVERY_WATCH overrides)."""
+    forced = os.getenv("DISCOVERY_WATCH")
+    if forced:
+        return forced.lower() in ("true", "1", "yes", "on")
+    return bool(os.getenv("CONSUL_HOST"))
+
+
+def instance_url(instance: Dict[str, Any]) -> str:
+    return f"http://{instance['address']}:{instance['port']}"
+
+
+class DiscoveryCache:
+    """In-memory, watch-refreshed view of Consul's healthy service instances."""
+
+    def __init__(
+        self,
+        registry: Any,
+        *,
+        watch: Optional[bool] = None,
+        wait_time: str = "30s",
+        refresh_interval: float = 30.0,
+        retry_base: float = 1.0,
+        retry_max: float = 30.0,
+    ):
+        """
+        Args:
+            registry: ConsulRegistry (core or isa_common) - only its ``consul``
+                client is used
+            watch: Keep entries fresh with watcher threads (default: only
+                when a Consul host is configured, see module docstring)
+            wait_time: Blocking query wait; also bounds staleness while healthy
+            refresh_interval: Re-fetch age of an entry when not watching (seconds)
+            retry_base: First retry delay after a failed query (seconds)
+            retry_max: Retry delay cap (seconds)
+        """
+        self.registry = registry
+        self.watch = _watch_default() if watch is None else watch
+        self.wait_time = wait_time
+        self.refresh_interval = refresh_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_instances(self, service_name: str) -> List[Dict[str, Any]]:
+        """Healthy instances of ``service_name`` (last-known during outages).
+
+        Only the first lookup of a service queries Consul; later ones are
+        served from memory.
+        """
+        started = time.perf_counter()
+        entry = self._entries.get(service_name)
+        if entry is None or self._expired(entry):
+            entry = self._load(service_name)
+            result = "cold"
+        else:
+            result = "hit" if entry.synced_at is not None else "miss"
+        self._observe(service_name, entry, result, started)
+        return entry.instances
+
+    async def get_instances_async(self, service_name: str) -> List[Dict[str, Any]]:
+        """Like ``get_instances`` but never blocks the event loop."""
+        started = time.perf_counter()
+        entry = self._entries.get(service_name)
+        if entry is None or self._expired(entry):
+            entry = await asyncio.to_thread(self._load, service_name)
+            result = "cold"
+        else:
+            result = "hit" if entry.synced_at is not None else "miss"
+        self._observe(service_name, entry, result, started)
+        return entry.instances
+
+    def get_endpoint(
+        self,
+        service_name: str,
+        strategy: str = "health_weighted",
+        key: Optional[str] = None,
+    ) -> Optional[str]:
+        """URL of one instance chosen by ``strategy``, or None if none known.
+
+        Selection is done by ``core.load_balancer``; ``key`` is the affinity
+        key for the ``sticky`` strategy.
+        """
+        return self._choose(
+            service_name, self.get_instances(service_name), strategy, key
+        )
+
+    async def get_endpoint_async(
+        self,
+        service_name: str,
+        strategy: str = "health_weighted",
+        key: Optional[str] = None,
+    ) -> Optional[str]:
+        instances = await self.get_instances_async(service_name)
+        return self._choose(service_name, instances, strategy, key)
+
+    def staleness(self, service_name: str) -> Optional[float]:
+        """Seconds since Consul last confirmed the instance list (None if never)."""
+        entry = self._entries.get(service_name)
+        if entry is None or entry.synced_at is None:
+            return None
+        return time.monotonic() - entry.synced_at
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-service cache state for health/debug endpoints."""
+        return {
+            name: {
+                "instances": len(entry.instances),
+                "staleness_seconds": self.staleness(name),
+                "errors": entry.errors,
+                "last_error": entry.last_error,
+            }
+            for name, entry in list(self._entries.items())
+        }
+
+    def close(self) -> None:
+        """Stop all watchers (each exits once its current query returns)."""
+        self._stop.set()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fetch(
+        self, service_name: str, index: Optional[int] = None, wait: Optional[str] = None
+    ) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        kwargs: Dict[str, Any] = {"passing": True}
+        if index is not None:
+            kwargs.update(index=index, wait=wait or self.wait_time)
+        new_index, services = self.registry.consul.health.service(
+            service_name, **kwargs
+        )
+        return (int(new_index) if new_index is not None else None), _parse_instances(
+            services
+        )
+
+    def _expired(self, entry: _Entry) -> bool:
+        """Unwatched entries are re-fetched once ``refresh_interval`` passes."""
+        return (
+            not self.watch
+            and entry.checked_at is not None
+            and time.monotonic() - entry.checked_at >= self.refresh_interval
+        )
+
+    def _load(self, service_name: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(service_name)
+            if entry is not None and not self._expired(entry):
+                return entry
+            new = entry is None
+            if new:
+                entry = _Entry()
+            entry.checked_at = time.monotonic()
+            try:
+                index, instances = self._fetch(service_name)
+                entry.index, entry.instances = index, instances
+                entry.synced_at = time.monotonic()
+                entry.last_error = None
+            except Exception as e:
+                # Served as empty (or last-known) until Consul answers again
+                entry.errors += 1
+                entry.last_error = str(e)
+                DISCOVERY_WATCH_ERRORS.labels(service=service_name).inc()
+                logger.warning(f"Consul lookup failed for {service_name}: {e}")
+            if new:
+                self._entries[service_name] = entry
+                if self.watch:
+                    self._start_watcher(service_name, entry)
+            return entry
+
+    def _start_watcher(self, service_name: str, entry: _Entry) -> None:
+        if self._stop.is_set():
+            return
+        entry.watcher = threading.Thread(
+            target=self._watch,
+            args=(service_name,),
+            name=f"discovery-watch-{service_name}",
+            daemon=True,
+        )
+        entry.watcher.start()
+
+    def _watch(self, service_name: str) -> None:
+        delay = self.retry_base
+        while not self._stop.is_set():
+            entry = self._entries[service_name]
+            started = time.monotonic()
+            try:
+                index, instances = self._fetch(service_name, index=entry.index or 0)
+            except Exception as e:
+                entry.errors += 1
+                entry.last_error = str(e)
+                DISCOVERY_WATCH_ERRORS.labels(service=service_name).inc()
+                logger.warning(
+                    f"Consul watch failed for {service_name} (serving "
+                    f"{len(entry.instances)} last-known instances, retry in {delay:.0f}s): {e}"
+                )
+                self._stop.wait(delay)
+                delay = min(self.retry_max, delay * 2)
+                continue
+
+            delay = self.retry_base
+            # An unchanged index returned early means the agent is not
+            # blocking; pace the loop instead of spinning
+            if index == entry.index and time.monotonic() - started < self.retry_base:
+                self._stop.wait(self.retry_base)
+            # Consul indexes only grow; a reset means start over
+            if index is None or (entry.index is not None and index < entry.index):
+                index = 0
+            if instances != entry.instances:
+                logger.info(
+                    f"Discovery update for {service_name}: "
+                    f"{len(entry.instances)} -> {len(instances)} instances"
+                )
+            # Replace the list rather than mutate it; readers hold no lock
+            entry.instances = instances
+            entry.index = index
+            entry.synced_at = time.monotonic()
+            entry.last_error = None
+
+    def _observe(
+        self, service_name: str, entry: _Entry, result: str, started: float
+    ) -> None:
+        DISCOVERY_LOOKUP_SECONDS.labels(service=service_name, result=result).observe(
+            time.perf_counter() - started
+        )
+        if entry.synced_at is not None:
+            DISCOVERY_STALENESS_SECONDS.labels(service=service_name).observe(
+                time.monotonic() - entry.synced_at
+            )
+
+    def _choose(
+        self,
+        service_name: str,
+        instances: List[Dict[str, Any]],
+        strategy: str,
+        key: Optional[str],
+    ) -> Optional[str]:
+        from .load_balancer import get_load_balancer
+
+        instance = get_load_balancer().choose(service_name, instances, strategy, key)
+        return instance_url(instance) if instance else None
+
+
+_caches: Dict[str, DiscoveryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_key(registry: Any) -> str:
+    http = getattr(getattr(registry, "consul", None), "http", None)
+    return getattr(http, "base_uri", None) or f"registry-{id(registry)}"
+
+
+def get_discovery_cache(registry: Any) -> DiscoveryCache:
+    """Process-wide cache for the Consul agent ``registry`` talks to."""
+    key = _cache_key(registry)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = DiscoveryCache(registry)
+                _caches[key] = cache
+    return cache
+
+
+def close_discovery_caches() -> None:
+    """Stop every watcher (service shutdown, tests)."""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.close()
+        _caches.clear()
+
+
+__all__ = [
+    "DiscoveryCache",
+    "get_discovery_cache",
+    "close_discovery_caches",
+    "instance_url",
+]
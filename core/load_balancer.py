@@ -0,0 +1,394 @@
+"""
+Client-Side Load Balancing for Discovered Service Instances
+
+Picks one instance per request from the discovery cache's healthy set,
+using live per-instance state kept by the shared HTTP clients:
+
+- ``p2c`` (default): power of two choices - sample two instances, take the
+  one with the lower ``(in_flight + 1) * ewma_latency``. Avoids the herd
+  behaviour of "least loaded" while steering away from hot replicas.
+- ``least_connections``: fewest requests in flight.
+- ``sticky``: rendezvous (highest-random-weight) hashing on an affinity key,
+  for cache-affine services such as memory_service. Only keys owned by a
+  departing or ejected instance move.
+- ``round_robin`` / ``random``.
+
+Latency is a peak-sensitive EWMA: a slower sample is taken immediately,
+faster samples decay it over ``decay_seconds``. New instances start at the
+service's mean latency so a fresh HPA replica is neither starved nor
+flooded.
+
+Outlier ejection reuses ``core.circuit_breaker.CircuitBreaker`` per
+instance: consecutive failures open it and the instance is skipped until
+the breaker lets a half-open probe through. If every instance is ejected
+the full set is used (fail open) rather than failing all traffic.
+
+``BalancedTransport`` wires this into any ``httpx.AsyncClient``: it
+re-targets each request to the chosen instance and records in-flight
+counts, latency and outcome.
+
+Usage:
+    from core.load_balancer import BalancedTransport, param_affinity
+
+    client = httpx.AsyncClient(
+        transport=BalancedTransport(
+            "memory_service", strategy="sticky", affinity=param_affinity("user_id")
+        )
+    )
+"""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from .circuit_breaker import CircuitBreaker
+from .metrics import create_counter
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("p2c", "least_connections", "sticky", "round_robin", "random")
+
+LB_PICKS = create_counter(
+    "client_lb_picks_total",
+    "Instances picked by the client-side load balancer",
+    ["service", "strategy"],
+)
+LB_EJECTED_SKIPS = create_counter(
+    "client_lb_ejected_skips_total",
+    "Picks that skipped instances ejected by their circuit breaker",
+    ["service"],
+)
+
+Instance = Dict[str, Any]
+
+
+@dataclass
+class InstanceStats:
+    """Live load signal for one service instance."""
+
+    breaker: CircuitBreaker
+    in_flight: int = 0
+    ewma: Optional[float] = None  # seconds
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def observe(self, latency: float, decay_seconds: float) -> None:
+        now = time.monotonic()
+        if self.ewma is None or latency > self.ewma:
+            self.ewma = latency
+        else:
+            weight = math.exp(-(now - self.updated_at) / decay_seconds)
+            self.ewma = self.ewma * weight + latency * (1 - weight)
+        self.updated_at = now
+
+
+@dataclass
+class Lease:
+    """An in-flight request against one instance; pass back to ``release``."""
+
+    service_name: str
+    instance: Instance
+    stats: InstanceStats
+    started: float = field(default_factory=time.monotonic)
+
+
+class LoadBalancer:
+    """Per-process instance selector shared by all clients."""
+
+    def __init__(
+        self,
+        *,
+        decay_seconds: float = 10.0,
+        default_latency: float = 0.05,
+        failure_threshold: int = 5,
+        ejection_seconds: float = 30.0,
+    ):
+        self.decay_seconds = decay_seconds
+        self.default_latency = default_latency
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self._stats: Dict[str, Dict[str, InstanceStats]] = {}
+        self._round_robin: Dict[str, int] = {}
+
+    def stats(self, service_name: str, instance: Instance) -> InstanceStats:
+        per_service = self._stats.setdefault(service_name, {})
+        stats = per_service.get(instance["id"])
+        if stats is None:
+            stats = InstanceStats(
+                breaker=CircuitBreaker(
+                    name=f"{service_name}/{instance['id']}",
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.ejection_seconds,
+                )
+            )
+            per_service[instance["id"]] = stats
+        return stats
+
+    def choose(
+        self,
+        service_name: str,
+        instances: List[Instance],
+        strategy: str = "p2c",
+        key: Optional[str] = None,
+    ) -> Optional[Instance]:
+        """Pick an instance, or None when ``instances`` is empty."""
+        if not instances:
+            return None
+        self._prune(service_name, instances)
+
+        candidates = [
+            i for i in instances if self.stats(service_name, i).breaker.allows_request()
+        ]
+        if len(candidates) < len(instances):
+            LB_EJECTED_SKIPS.labels(service=service_name).inc()
+        if not candidates:
+            candidates = instances  # everything ejected: fail open
+
+        if strategy in ("health_weighted", "p2c"):
+            # Legacy "health_weighted" keeps its preference for tagged instances
+            preferred = [i for i in candidates if "preferred" in i.get("tags", [])]
+            if strategy == "health_weighted" and preferred:
+                candidates = preferred
+            chosen = self._p2c(service_name, candidates)
+            strategy = "p2c"
+        elif strategy == "sticky" and key is not None:
+            chosen = max(candidates, key=lambda i: _rendezvous_weight(key, i["id"]))
+        elif strategy == "least_connections":
+            fewest = min(self.stats(service_name, i).in_flight for i in candidates)
+            chosen = random.choice(
+                [
+                    i
+                    for i in candidates
+                    if self.stats(service_name, i).in_flight == fewest
+                ]
+            )
+        elif strategy == "round_robin":
+            # Ordered by id and never reset, so list changes do not restart
+            # the rotation on the first instance
+            counter = self._round_robin.get(service_name, 0)
+            self._round_robin[service_name] = counter + 1
+            chosen = sorted(candidates, key=lambda i: i["id"])[
+                counter % len(candidates)
+            ]
+        else:
+            chosen = random.choice(candidates)
+
+        LB_PICKS.labels(service=service_name, strategy=strategy).inc()
+        return chosen
+
+    def acquire(self, service_name: str, instance: Instance) -> Lease:
+        """Count a request in flight against ``instance``."""
+        stats = self.stats(service_name, instance)
+        try:
+            stats.breaker.check()  # claims the half-open probe slot
+        except Exception:
+            pass  # chosen while failing open
+        stats.in_flight += 1
+        return Lease(service_name, instance, stats)
+
+    def release(self, lease: Lease, success: Optional[bool]) -> None:
+        """Record the outcome and latency of a leased request.
+
+        ``success=None`` (e.g. the caller was cancelled) only ends the lease.
+        """
+        stats = lease.stats
+        stats.in_flight = max(0, stats.in_flight - 1)
+        if success is None:
+            return
+        stats.observe(time.monotonic() - lease.started, self.decay_seconds)
+        if success:
+            stats.breaker.record_success()
+        else:
+            stats.breaker.record_failure()
+
+    def snapshot(self, service_name: str) -> Dict[str, Dict[str, Any]]:
+        """Per-instance load state for debug endpoints."""
+        return {
+            instance_id: {
+                "in_flight": stats.in_flight,
+                "ewma_ms": None if stats.ewma is None else round(stats.ewma * 1000, 2),
+                "breaker": stats.breaker.state.value,
+            }
+            for instance_id, stats in self._stats.get(service_name, {}).items()
+        }
+
+    def _p2c(self, service_name: str, candidates: List[Instance]) -> Instance:
+        if len(candidates) == 1:
+            return candidates[0]
+        a, b = random.sample(candidates, 2)
+        return a if self._score(service_name, a) <= self._score(service_name, b) else b
+
+    def _score(self, service_name: str, instance: Instance) -> float:
+        stats = self.stats(service_name, instance)
+        latency = (
+            stats.ewma if stats.ewma is not None else self._mean_latency(service_name)
+        )
+        return (stats.in_flight + 1) * latency
+
+    def _mean_latency(self, service_name: str) -> float:
+        known = [
+            s.ewma
+            for s in self._stats.get(service_name, {}).values()
+            if s.ewma is not None
+        ]
+        return sum(known) / len(known) if known else self.default_latency
+
+    def _prune(self, service_name: str, instances: List[Instance]) -> None:
+        per_service = self._stats.get(service_name)
+        if not per_service or len(per_service) <= 2 * len(instances):
+            return
+        live = {i["id"] for i in instances}
+        for instance_id in [
+            i for i, s in per_service.items() if i not in live and not s.in_flight
+        ]:
+            del per_service[instance_id]
+
+
+def _rendezvous_weight(key: str, instance_id: str) -> int:
+    digest = hashlib.blake2b(f"{key}\x00{instance_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+_balancer = LoadBalancer()
+
+
+def get_load_balancer() -> LoadBalancer:
+    """Process-wide balancer so every client sees the same load signal."""
+    return _balancer
+
+
+# ----------------------------------------------------------------------
+# httpx integration
+# ----------------------------------------------------------------------
+
+_registry = None
+
+
+async def discovered_instances(service_name: str) -> List[Instance]:
+    """Healthy instances from the shared discovery cache (empty if unknown)."""
+    global _registry
+    from .discovery_cache import get_discovery_cache
+    from .service_discovery import get_service_discovery
+
+    if _registry is None:
+        _registry = get_service_discovery().consul_registry
+    return await get_discovery_cache(_registry).get_instances_async(service_name)
+
+
+def param_affinity(name: str) -> Callable[[httpx.Request], Optional[str]]:
+    """Affinity key from a query parameter or top-level JSON body field."""
+
+    def key(request: httpx.Request) -> Optional[str]:
+        value = request.url.params.get(name)
+        if value:
+            return value
+        if request.headers.get("content-type", "").startswith("application/json"):
+            try:
+                body = json.loads(request.content or b"{}")
+            except (ValueError, httpx.RequestNotRead):
+                return None
+            if isinstance(body, dict) and body.get(name) is not None:
+                return str(body[name])
+        return None
+
+    return key
+
+
+class BalancedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that sends each request to a balanced instance.
+
+    Requests keep their configured URL as the fallback target; when the
+    discovery cache knows instances of ``service_name`` the host and port
+    are rewritten to the chosen one. 5xx responses and connection errors
+    count as failures for outlier ejection.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        *,
+        strategy: str = "p2c",
+        affinity: Optional[Callable[[httpx.Request], Optional[str]]] = None,
+        resolver: Optional[Callable[[str], Awaitable[List[Instance]]]] = None,
+        balancer: Optional[LoadBalancer] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        close_with_client: bool = True,
+    ):
+        """
+        Args:
+            service_name: Consul service name
+            strategy: One of STRATEGIES
+            affinity: Extracts the sticky key from a request (``sticky`` only)
+            resolver: Async ``service_name -> instances`` (default: discovery cache)
+            balancer: Defaults to the process-wide balancer
+            transport: Inner transport (default: a pooled AsyncHTTPTransport)
+            close_with_client: Close the inner transport when the owning
+                client closes; pass False when one transport is shared by
+                short-lived clients
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown load balancing strategy: {strategy}")
+        self.service_name = service_name
+        self.strategy = strategy
+        self.affinity = affinity
+        self.resolver = resolver or discovered_instances
+        self.balancer = balancer or get_load_balancer()
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._close_with_client = close_with_client
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            instances = await self.resolver(self.service_name)
+        except Exception as e:
+            logger.debug(f"Instance lookup failed for {self.service_name}: {e}")
+            instances = []
+
+        key = (
+            self.affinity(request)
+            if self.affinity and self.strategy == "sticky"
+            else None
+        )
+        instance = self.balancer.choose(
+            self.service_name, instances, self.strategy, key
+        )
+        if instance is None:
+            return await self._transport.handle_async_request(request)
+
+        request.url = request.url.copy_with(
+            host=instance["address"], port=instance["port"]
+        )
+        request.headers["Host"] = f"{instance['address']}:{instance['port']}"
+
+        lease = self.balancer.acquire(self.service_name, instance)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except (httpx.ConnectError, httpx.TimeoutException):
+            self.balancer.release(lease, success=False)
+            raise
+        except BaseException:
+            self.balancer.release(lease, success=None)
+            raise
+        self.balancer.release(lease, success=response.status_code < 500)
+        return response
+
+    async def aclose(self) -> None:
+        if self._close_with_client:
+            await self._transport.aclose()
+
+
+__all__ = [
+    "STRATEGIES",
+    "BalancedTransport",
+    "InstanceStats",
+    "Lease",
+    "LoadBalancer",
+    "discovered_instances",
+    "get_load_balancer",
+    "param_affinity",
+]
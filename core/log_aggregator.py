@@ -1,14 +1,27 @@
 """
 日志聚合和分析工具
 提供日志收集、分析和监控功能
+
+日志文件通过 LogIndex 建立稀疏索引: 每个约 256KB 的块记录字节范围、
+时间范围以及按级别/服务/错误消息的计数。索引持久化在日志目录的
+.log_index.json 中，每次只解析文件新增的部分。
+
+- 时间范围读取只打开与时间窗口重叠的块 (mmap + seek)，不再全文件扫描
+- generate_metrics / get_service_health 直接合并块计数，只解析跨越
+  时间窗口边界的块，内存占用与日志量无关
+- search_logs 按文件流式归并，达到 limit 即停止
+- tail_service_logs 按消费者持久化偏移，增量读取新日志
 """
 
+import asyncio
+import heapq
 import json
-import aiofiles
+import mmap
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, AsyncGenerator, Any
+from typing import Dict, Iterator, List, Optional, AsyncGenerator, Any
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from collections import Counter
 import re
 import logging
@@ -69,102 +82,346 @@ class ServiceHealth:
     common_errors: List[str]
 
 
+INDEX_FILE_NAME = ".log_index.json"
+INDEX_VERSION = 1
+# 每个块最多记录的不同错误消息数，超出部分只计入级别计数
+MAX_BLOCK_ERROR_MESSAGES = 50
+
+_TRADITIONAL_PATTERN = re.compile(
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (.*?) - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (.*)'
+)
+
+
+def parse_entry(line: str, service_name: str) -> Optional[LogEntry]:
+    """解析单行日志 (JSON 或传统格式)，无法解析时返回 None"""
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        if line.startswith('{'):
+            data = json.loads(line)
+            return LogEntry(
+                timestamp=datetime.fromisoformat(data.get('timestamp', '').replace('Z', '+00:00')),
+                service=data.get('service', service_name),
+                level=data.get('level', 'INFO'),
+                message=data.get('message', ''),
+                logger=data.get('logger', ''),
+                module=data.get('module'),
+                function=data.get('function'),
+                line=data.get('line'),
+                request_id=data.get('request_id'),
+                user_id=data.get('user_id'),
+                exception=data.get('exception'),
+                extra=data.get('extra')
+            )
+        return _parse_traditional(line, service_name)
+    except (json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+        logger.debug(f"Failed to parse log line: {e}")
+        return None
+
+
+def _parse_traditional(line: str, service_name: str) -> Optional[LogEntry]:
+    # 匹配格式: "2025-09-28 15:44:27,291 - logger_name - LEVEL - message"
+    match = _TRADITIONAL_PATTERN.match(line)
+    if not match:
+        return None
+    timestamp_str, logger_name, level, message = match.groups()
+    try:
+        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
+    except ValueError:
+        return None
+    return LogEntry(
+        timestamp=timestamp,
+        service=service_name,
+        level=level,
+        message=message.strip(),
+        logger=logger_name.strip()
+    )
+
+
+def entry_epoch(entry: LogEntry) -> float:
+    """日志时间戳转 epoch 秒 (JSON 日志带时区，传统日志为本地时间)"""
+    return entry.timestamp.timestamp()
+
+
+@dataclass
+class LogBlock:
+    """索引块: 文件中一段连续字节范围的摘要"""
+    offset: int
+    end: int
+    min_ts: Optional[float] = None
+    max_ts: Optional[float] = None
+    total: int = 0
+    levels: Dict[str, int] = field(default_factory=dict)
+    services: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, entry: LogEntry) -> None:
+        ts = entry_epoch(entry)
+        self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        self.total += 1
+        self.levels[entry.level] = self.levels.get(entry.level, 0) + 1
+        self.services[entry.service] = self.services.get(entry.service, 0) + 1
+        if entry.level == 'ERROR' and (
+            entry.message in self.errors or len(self.errors) < MAX_BLOCK_ERROR_MESSAGES
+        ):
+            self.errors[entry.message] = self.errors.get(entry.message, 0) + 1
+
+
+@dataclass
+class LogFileIndex:
+    """单个日志文件的稀疏索引"""
+    service: str
+    inode: int
+    size: int = 0  # 已索引的字节数 (总在行边界上)
+    blocks: List[LogBlock] = field(default_factory=list)
+
+
+@dataclass
+class LogSummary:
+    """时间窗口内的流式聚合结果"""
+    total: int = 0
+    levels: Counter = field(default_factory=Counter)
+    services: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    min_ts: Optional[float] = None
+    max_ts: Optional[float] = None
+
+    def _span(self, min_ts: Optional[float], max_ts: Optional[float]) -> None:
+        if min_ts is not None:
+            self.min_ts = min_ts if self.min_ts is None else min(self.min_ts, min_ts)
+        if max_ts is not None:
+            self.max_ts = max_ts if self.max_ts is None else max(self.max_ts, max_ts)
+
+    def add_block(self, block: LogBlock) -> None:
+        self.total += block.total
+        self.levels.update(block.levels)
+        self.services.update(block.services)
+        self.errors.update(block.errors)
+        self._span(block.min_ts, block.max_ts)
+
+    def add_entry(self, entry: LogEntry) -> None:
+        self.total += 1
+        self.levels[entry.level] += 1
+        self.services[entry.service] += 1
+        if entry.level == 'ERROR':
+            self.errors[entry.message] += 1
+        ts = entry_epoch(entry)
+        self._span(ts, ts)
+
+
+class LogIndex:
+    """日志目录的持久化稀疏索引"""
+
+    def __init__(self, log_directory: Path, stride: int = 256 * 1024, persist: bool = True):
+        """
+        Args:
+            log_directory: 日志根目录，索引文件保存在其中
+            stride: 索引块大小 (字节)
+            persist: 是否把索引和 tail 偏移写回磁盘
+        """
+        self.log_directory = Path(log_directory)
+        self.stride = stride
+        self.persist = persist
+        self.state_path = self.log_directory / INDEX_FILE_NAME
+        self._files: Dict[str, LogFileIndex] = {}
+        self._cursors: Dict[str, Dict[str, int]] = {}
+        self._dirty = False
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 索引维护
+    # ------------------------------------------------------------------
+
+    def refresh(self, path: Path, service_name: str) -> LogFileIndex:
+        """把文件新增的完整行并入索引；文件轮转或截断时重建"""
+        key = self._key(path)
+        st = path.stat()
+        index = self._files.get(key)
+        if (
+            index is None
+            or index.inode != st.st_ino
+            or index.service != service_name
+            or st.st_size < index.size
+        ):
+            index = LogFileIndex(service=service_name, inode=st.st_ino)
+            self._files[key] = index
+            for cursors in self._cursors.values():
+                cursors.pop(key, None)
+            self._dirty = True
+        if st.st_size > index.size:
+            self._extend(path, index, st.st_size)
+        return index
+
+    def _extend(self, path: Path, index: LogFileIndex, size: int) -> None:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = min(size, len(mm))
+            block = index.blocks[-1] if index.blocks else None
+            if block is None or block.end - block.offset >= self.stride:
+                block = LogBlock(offset=index.size, end=index.size)
+                index.blocks.append(block)
+
+            pos = index.size
+            while pos < size:
+                newline = mm.find(b'\n', pos, size)
+                if newline == -1:
+                    break  # 半行留到下次刷新
+                entry = parse_entry(mm[pos:newline].decode('utf-8', errors='replace'), index.service)
+                if entry is not None:
+                    block.add(entry)
+                pos = block.end = newline + 1
+                if block.end - block.offset >= self.stride:
+                    block = LogBlock(offset=pos, end=pos)
+                    index.blocks.append(block)
+
+            if block.end == block.offset:
+                index.blocks.pop()
+            if pos != index.size:
+                index.size = pos
+                self._dirty = True
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def iter_entries(
+        self,
+        path: Path,
+        index: LogFileIndex,
+        since: float,
+        level: Optional[str] = None,
+    ) -> Iterator[LogEntry]:
+        """按文件顺序产出 since 之后的条目，跳过时间窗口外或不含该级别的块"""
+        blocks = [
+            b for b in index.blocks
+            if b.max_ts is not None and b.max_ts >= since
+            and (level is None or b.levels.get(level))
+        ]
+        if not blocks:
+            return
+        for entry in self._scan(path, index.service, blocks):
+            if entry_epoch(entry) >= since and (level is None or entry.level == level):
+                yield entry
+
+    def summarize(self, path: Path, index: LogFileIndex, since: float, summary: LogSummary) -> None:
+        """把 since 之后的统计合并进 summary；只解析跨越边界的块"""
+        partial = []
+        for block in index.blocks:
+            if block.max_ts is None or block.max_ts < since:
+                continue
+            if block.min_ts >= since:
+                summary.add_block(block)
+            else:
+                partial.append(block)
+        for entry in self._scan(path, index.service, partial):
+            if entry_epoch(entry) >= since:
+                summary.add_entry(entry)
+
+    def tail(self, path: Path, service_name: str, consumer: str) -> List[LogEntry]:
+        """返回 consumer 上次读取之后新增的条目并推进其偏移"""
+        index = self.refresh(path, service_name)
+        key = self._key(path)
+        cursors = self._cursors.setdefault(consumer, {})
+        start = cursors.get(key, 0)
+        if start >= index.size:
+            return []
+        entries = list(self._scan(path, index.service, [LogBlock(offset=start, end=index.size)]))
+        cursors[key] = index.size
+        self._dirty = True
+        return entries
+
+    def _scan(self, path: Path, service_name: str, blocks: List[LogBlock]) -> Iterator[LogEntry]:
+        if not blocks:
+            return
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for block in blocks:
+                pos, end = block.offset, min(block.end, len(mm))
+                while pos < end:
+                    newline = mm.find(b'\n', pos, end)
+                    if newline == -1:
+                        newline = end
+                    entry = parse_entry(mm[pos:newline].decode('utf-8', errors='replace'), service_name)
+                    if entry is not None:
+                        yield entry
+                    pos = newline + 1
+
+    # ------------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------------
+
+    def _key(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.log_directory))
+        except ValueError:
+            return str(path)
+
+    def _load(self) -> None:
+        if not self.persist or not self.state_path.exists():
+            return
+        try:
+            state = json.loads(self.state_path.read_text(encoding='utf-8'))
+            if state.get('version') != INDEX_VERSION:
+                return
+            for key, data in state.get('files', {}).items():
+                blocks = [LogBlock(**b) for b in data.pop('blocks', [])]
+                self._files[key] = LogFileIndex(blocks=blocks, **data)
+            self._cursors = state.get('cursors', {})
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable log index {self.state_path}: {e}")
+            self._files, self._cursors = {}, {}
+
+    def save(self) -> None:
+        """原子写回索引 (无变更时跳过)"""
+        if not self.persist or not self._dirty:
+            return
+        state = {
+            'version': INDEX_VERSION,
+            'files': {key: asdict(index) for key, index in self._files.items()},
+            'cursors': self._cursors,
+        }
+        tmp_path = self.state_path.with_suffix('.tmp')
+        try:
+            tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, self.state_path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not persist log index {self.state_path}: {e}")
+
+
 class LogAggregator:
     """日志聚合器"""
 
-    def __init__(self, log_directory: str = "logs"):
+    def __init__(self, log_directory: str = "logs", persist_index: bool = True):
         self.log_directory = Path(log_directory)
         self.parsed_logs: List[LogEntry] = []
         self.metrics_cache: Optional[LogMetrics] = None
         self.cache_ttl = 300  # 5分钟缓存
         self.last_cache_time: Optional[datetime] = None
+        self.index = LogIndex(self.log_directory, persist=persist_index)
 
     async def parse_log_line(self, line: str, service_name: str) -> Optional[LogEntry]:
         """解析单行日志"""
-        line = line.strip()
-        if not line:
-            return None
-
-        try:
-            # 尝试解析JSON格式
-            if line.startswith('{'):
-                data = json.loads(line)
-                return LogEntry(
-                    timestamp=datetime.fromisoformat(data.get('timestamp', '').replace('Z', '+00:00')),
-                    service=data.get('service', service_name),
-                    level=data.get('level', 'INFO'),
-                    message=data.get('message', ''),
-                    logger=data.get('logger', ''),
-                    module=data.get('module'),
-                    function=data.get('function'),
-                    line=data.get('line'),
-                    request_id=data.get('request_id'),
-                    user_id=data.get('user_id'),
-                    exception=data.get('exception'),
-                    extra=data.get('extra')
-                )
-            else:
-                # 解析传统格式日志
-                return await self.parse_traditional_log(line, service_name)
-
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
-            logger.debug(f"Failed to parse log line: {e}")
-            return None
+        return parse_entry(line, service_name)
 
     async def parse_traditional_log(self, line: str, service_name: str) -> Optional[LogEntry]:
         """解析传统格式日志"""
-        # 匹配格式: "2025-09-28 15:44:27,291 - logger_name - LEVEL - message"
-        pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - (.*?) - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (.*)'
-        match = re.match(pattern, line)
-
-        if match:
-            timestamp_str, logger_name, level, message = match.groups()
-            try:
-                # 转换时间戳
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-
-                return LogEntry(
-                    timestamp=timestamp,
-                    service=service_name,
-                    level=level,
-                    message=message.strip(),
-                    logger=logger_name.strip()
-                )
-            except ValueError:
-                pass
+        return _parse_traditional(line, service_name)
 
-        return None
-
-    async def read_service_logs(self, service_name: str,
-                              hours_back: int = 24) -> AsyncGenerator[LogEntry, None]:
-        """读取指定服务的日志"""
+    def _service_log_files(self, service_name: str) -> List[Path]:
         service_dir = self.log_directory / service_name
 
         # 检查服务特定目录
         if service_dir.exists():
-            log_files = list(service_dir.glob("*.log")) + list(service_dir.glob("*.json"))
-        else:
-            # 回退到根目录下的日志文件
-            log_files = list(self.log_directory.glob(f"{service_name}*.log"))
-
-        cutoff_time = datetime.now() - timedelta(hours=hours_back)
-
-        for log_file in log_files:
-            try:
-                async with aiofiles.open(log_file, 'r', encoding='utf-8') as f:
-                    async for line in f:
-                        entry = await self.parse_log_line(line, service_name)
-                        if entry and entry.timestamp >= cutoff_time:
-                            yield entry
-            except Exception as e:
-                logger.warning(f"Failed to read log file {log_file}: {e}")
+            return list(service_dir.glob("*.log")) + list(service_dir.glob("*.json"))
+        # 回退到根目录下的日志文件
+        return list(self.log_directory.glob(f"{service_name}*.log"))
 
-    async def collect_all_logs(self, hours_back: int = 24) -> List[LogEntry]:
-        """收集所有服务日志"""
-        all_logs = []
-
-        # 获取所有服务名
+    def _discover_services(self) -> List[str]:
         services = set()
+        if not self.log_directory.exists():
+            return []
 
         # 从目录结构推断服务名
         for item in self.log_directory.iterdir():
@@ -174,18 +431,76 @@ class LogAggregator:
                 # 从文件名推断服务名
                 service_name = item.stem.replace('_service', '').replace('-service', '')
                 services.add(service_name)
+        return sorted(services)
 
-        # 收集每个服务的日志
+    def _indexed_files(self, services: List[str]) -> List[tuple]:
+        """刷新索引并返回 (path, index) 列表 (同步，调用方放到线程中执行)"""
+        indexed = []
         for service in services:
+            for log_file in self._service_log_files(service):
+                try:
+                    indexed.append((log_file, self.index.refresh(log_file, service)))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Failed to read log file {log_file}: {e}")
+        self.index.save()
+        return indexed
+
+    async def read_service_logs(self, service_name: str,
+                              hours_back: int = 24) -> AsyncGenerator[LogEntry, None]:
+        """读取指定服务的日志"""
+        since = (datetime.now() - timedelta(hours=hours_back)).timestamp()
+        indexed = await asyncio.to_thread(self._indexed_files, [service_name])
+
+        for log_file, index in indexed:
+            try:
+                for entry in self.index.iter_entries(log_file, index, since):
+                    yield entry
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to read log file {log_file}: {e}")
+
+    async def tail_service_logs(self, service_name: str, consumer: str = "default") -> List[LogEntry]:
+        """增量读取: 返回 consumer 上次调用之后写入的日志"""
+        def _tail() -> List[LogEntry]:
+            entries = []
+            for log_file in self._service_log_files(service_name):
+                try:
+                    entries.extend(self.index.tail(log_file, service_name, consumer))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Failed to read log file {log_file}: {e}")
+            self.index.save()
+            return entries
+
+        entries = await asyncio.to_thread(_tail)
+        entries.sort(key=entry_epoch)
+        return entries
+
+    async def collect_all_logs(self, hours_back: int = 24) -> List[LogEntry]:
+        """收集所有服务日志 (全部载入内存；统计和搜索请用流式接口)"""
+        all_logs = []
+        for service in self._discover_services():
             async for log_entry in self.read_service_logs(service, hours_back):
                 all_logs.append(log_entry)
 
         # 按时间排序
-        all_logs.sort(key=lambda x: x.timestamp)
+        all_logs.sort(key=entry_epoch)
         self.parsed_logs = all_logs
 
         return all_logs
 
+    async def _summarize(self, services: List[str], hours_back: int) -> LogSummary:
+        since = (datetime.now() - timedelta(hours=hours_back)).timestamp()
+
+        def _run() -> LogSummary:
+            summary = LogSummary()
+            for log_file, index in self._indexed_files(services):
+                try:
+                    self.index.summarize(log_file, index, since, summary)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Failed to read log file {log_file}: {e}")
+            return summary
+
+        return await asyncio.to_thread(_run)
+
     async def generate_metrics(self, hours_back: int = 24) -> LogMetrics:
         """生成日志指标"""
         now = datetime.now()
@@ -195,10 +510,10 @@ class LogAggregator:
             (now - self.last_cache_time).total_seconds() < self.cache_ttl):
             return self.metrics_cache
 
-        # 收集日志
-        logs = await self.collect_all_logs(hours_back)
+        # 流式聚合 (块计数合并，不载入日志)
+        summary = await self._summarize(self._discover_services(), hours_back)
 
-        if not logs:
+        if not summary.total:
             return LogMetrics(
                 total_logs=0,
                 error_count=0,
@@ -210,41 +525,32 @@ class LogAggregator:
                 service_distribution={}
             )
 
-        # 统计指标
-        total_logs = len(logs)
-        error_count = len([log for log in logs if log.level == 'ERROR'])
-        warning_count = len([log for log in logs if log.level == 'WARNING'])
-
-        services = list(set(log.service for log in logs))
+        total_logs = summary.total
+        error_count = summary.levels['ERROR']
+        warning_count = summary.levels['WARNING']
 
         time_range = {
-            'start': logs[0].timestamp.isoformat(),
-            'end': logs[-1].timestamp.isoformat()
+            'start': datetime.fromtimestamp(summary.min_ts).isoformat(),
+            'end': datetime.fromtimestamp(summary.max_ts).isoformat()
         }
 
         error_rate = (error_count / total_logs) * 100 if total_logs > 0 else 0
 
         # 顶级错误
-        error_messages = [log.message for log in logs if log.level == 'ERROR']
-        error_counter = Counter(error_messages)
         top_errors = [
             {'message': msg, 'count': count}
-            for msg, count in error_counter.most_common(10)
+            for msg, count in summary.errors.most_common(10)
         ]
 
-        # 服务分布
-        service_counter = Counter(log.service for log in logs)
-        service_distribution = dict(service_counter)
-
         metrics = LogMetrics(
             total_logs=total_logs,
             error_count=error_count,
             warning_count=warning_count,
-            services=services,
+            services=list(summary.services),
             time_range=time_range,
             error_rate=error_rate,
             top_errors=top_errors,
-            service_distribution=service_distribution
+            service_distribution=dict(summary.services)
         )
 
         # 更新缓存
@@ -255,11 +561,9 @@ class LogAggregator:
 
     async def get_service_health(self, service_name: str) -> ServiceHealth:
         """获取服务健康状态"""
-        logs = []
-        async for log_entry in self.read_service_logs(service_name, hours_back=1):
-            logs.append(log_entry)
+        summary = await self._summarize([service_name], hours_back=1)
 
-        if not logs:
+        if not summary.total:
             return ServiceHealth(
                 service_name=service_name,
                 status="unknown",
@@ -272,15 +576,14 @@ class LogAggregator:
             )
 
         # 统计最近1小时的指标
-        error_count = len([log for log in logs if log.level == 'ERROR'])
-        warning_count = len([log for log in logs if log.level == 'WARNING'])
-        total_logs = len(logs)
+        error_count = summary.levels['ERROR']
+        warning_count = summary.levels['WARNING']
+        total_logs = summary.total
 
         error_rate = (error_count / total_logs) * 100 if total_logs > 0 else 0
 
         # 常见错误
-        error_messages = [log.message for log in logs if log.level == 'ERROR']
-        common_errors = [msg for msg, _ in Counter(error_messages).most_common(5)]
+        common_errors = [msg for msg, _ in summary.errors.most_common(5)]
 
         # 确定健康状态
         if error_rate > 10 or error_count > 50:
@@ -293,7 +596,7 @@ class LogAggregator:
         return ServiceHealth(
             service_name=service_name,
             status=status,
-            last_log_time=max(log.timestamp for log in logs),
+            last_log_time=datetime.fromtimestamp(summary.max_ts),
             error_count_1h=error_count,
             warning_count_1h=warning_count,
             total_logs_1h=total_logs,
@@ -307,28 +610,32 @@ class LogAggregator:
                          level: Optional[str] = None,
                          hours_back: int = 24,
                          limit: int = 100) -> List[LogEntry]:
-        """搜索日志"""
-        logs = await self.collect_all_logs(hours_back)
-
-        results = []
+        """搜索日志 (按时间顺序返回最早的 limit 条匹配)"""
+        since = (datetime.now() - timedelta(hours=hours_back)).timestamp()
+        services = [service] if service else self._discover_services()
         query_lower = query.lower()
 
-        for log in logs:
-            # 过滤条件
-            if service and log.service != service:
-                continue
-            if level and log.level != level:
-                continue
+        def _run() -> List[LogEntry]:
+            streams = [
+                self.index.iter_entries(log_file, index, since, level)
+                for log_file, index in self._indexed_files(services)
+            ]
+            results = []
+            for log in heapq.merge(*streams, key=entry_epoch):
+                # 过滤条件
+                if service and log.service != service:
+                    continue
 
-            # 搜索匹配
-            if (query_lower in log.message.lower() or
-                query_lower in log.logger.lower()):
-                results.append(log)
+                # 搜索匹配
+                if (query_lower in log.message.lower() or
+                    query_lower in log.logger.lower()):
+                    results.append(log)
 
-                if len(results) >= limit:
-                    break
+                    if len(results) >= limit:
+                        break
+            return results
 
-        return results
+        return await asyncio.to_thread(_run)
 
     def to_dict(self, obj) -> Dict:
         """转换对象为字典"""
@@ -420,6 +727,7 @@ async def search_recent_errors(log_dir: str = "logs", hours: int = 1) -> List[Di
 # 导出主要类
 __all__ = [
     "LogAggregator",
+    "LogIndex",
     "LogMonitor",
     "LogEntry",
     "LogMetrics",
@@ -0,0 +1,306 @@
+"""
+Queued, Non-Blocking Log Shipping to Loki
+
+``QueuedLokiHandler.emit`` only formats the record and appends it to a
+bounded in-memory queue; a background thread drains the queue in batches
+and pushes them to Loki's HTTP API as gzip-compressed JSON. Logging from a
+request handler therefore never waits on the network.
+
+Back-pressure:
+- Above ``sample_above`` (fraction of ``max_queue``) records below WARNING
+  are sampled at ``sample_rate``.
+- When the queue is full, WARNING and above always evict the oldest queued
+  line; lower levels follow ``overflow`` (``drop_oldest`` / ``drop_newest``).
+
+A failed push is retried with exponential backoff until Loki comes back -
+shipping is never disabled for good. While it is down the queue absorbs
+what it can and the rest is dropped and counted. Batches Loki rejects as
+malformed (4xx other than 429) are dropped instead of retried.
+
+Metrics: ``log_lines_shipped_total{service}``,
+``log_lines_dropped_total{service,reason}`` and
+``log_push_errors_total{service}``.
+
+Usage:
+    handler = QueuedLokiHandler(
+        LokiShipper("http://loki:3100/loki/api/v1/push", {"service": "billing"})
+    )
+    logger.addHandler(handler)
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from .metrics import create_counter
+
+logger = logging.getLogger(__name__)
+
+LOG_LINES_SHIPPED = create_counter(
+    "log_lines_shipped_total",
+    "Log lines accepted by Loki",
+    ["service"],
+)
+LOG_LINES_DROPPED = create_counter(
+    "log_lines_dropped_total",
+    "Log lines dropped before reaching Loki",
+    ["service", "reason"],
+)
+LOG_PUSH_ERRORS = create_counter(
+    "log_push_errors_total",
+    "Failed Loki push requests",
+    ["service"],
+)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+# (timestamp ns, severity, levelno, line)
+_Line = Tuple[int, str, int, str]
+
+
+class LokiShipper:
+    """Bounded queue plus background pusher for one set of Loki labels."""
+
+    def __init__(
+        self,
+        push_url: str,
+        labels: Dict[str, str],
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = "drop_oldest",
+        sample_above: float = 0.8,
+        sample_rate: float = 0.1,
+        retry_base: float = 0.5,
+        retry_max: float = 30.0,
+        timeout: float = 5.0,
+        compress: bool = True,
+        client: Optional[httpx.Client] = None,
+        start: bool = True,
+    ):
+        """
+        Args:
+            push_url: Loki ``/loki/api/v1/push`` URL
+            labels: Stream labels; ``severity`` is added per line
+            max_queue: Queue capacity in lines
+            batch_size: Max lines per push request
+            flush_interval: Max seconds a line waits for its batch to fill
+            overflow: Policy for sub-WARNING lines when the queue is full
+            sample_above: Queue fill fraction where sampling starts
+            sample_rate: Fraction of sub-WARNING lines kept while sampling
+            retry_base: Initial backoff after a failed push (seconds)
+            retry_max: Backoff ceiling (seconds)
+            timeout: HTTP timeout per push
+            compress: gzip the request body
+            client: Pre-built ``httpx.Client`` (tests)
+            start: Start the background thread immediately
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.push_url = push_url
+        self.labels = dict(labels)
+        self.service = self.labels.get("service", "unknown")
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.sample_threshold = int(max_queue * sample_above)
+        self.sample_rate = sample_rate
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.compress = compress
+        self._client = client or httpx.Client(timeout=timeout)
+
+        self._queue: Deque[_Line] = deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failing = False
+        self._shipped = 0
+        self._dropped: Dict[str, int] = {}
+        if start:
+            self.start()
+
+    # ------------------------------------------------------------------
+    # Producer side (called from emit - must never block on I/O)
+    # ------------------------------------------------------------------
+
+    def submit(self, line: str, severity: str, levelno: int, timestamp: float) -> bool:
+        """Queue one line; returns False if it was dropped."""
+        entry = (int(timestamp * 1e9), severity, levelno, line)
+        important = levelno >= logging.WARNING
+        with self._cond:
+            depth = len(self._queue)
+            if (
+                not important
+                and depth >= self.sample_threshold
+                and depth < self.max_queue
+            ):
+                if random.random() >= self.sample_rate:
+                    self._drop("sampled")
+                    return False
+            if depth >= self.max_queue:
+                if not important and self.overflow == "drop_newest":
+                    self._drop("overflow")
+                    return False
+                self._queue.popleft()
+                self._drop("overflow")
+            self._queue.append(entry)
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _drop(self, reason: str, count: int = 1) -> None:
+        self._dropped[reason] = self._dropped.get(reason, 0) + count
+        LOG_LINES_DROPPED.labels(service=self.service, reason=reason).inc(count)
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"loki-shipper-{self.service}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the pusher after one last attempt to flush the queue."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._client.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                if len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+            batch = self._take()
+            if batch:
+                self._ship(batch)
+        # Final drain: one attempt per batch, no backoff
+        while True:
+            batch = self._take()
+            if not batch or not self._push_once(batch):
+                break
+
+    def _take(self) -> List[_Line]:
+        with self._cond:
+            count = min(self.batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _ship(self, batch: List[_Line]) -> None:
+        """Push ``batch``, retrying with backoff until it lands or we stop."""
+        delay = self.retry_base
+        while not self._push_once(batch):
+            if self._stop.wait(delay):
+                self._drop("shutdown", len(batch))
+                return
+            delay = min(delay * 2, self.retry_max)
+
+    def _push_once(self, batch: List[_Line]) -> bool:
+        """One push attempt; True when the batch is finished with."""
+        try:
+            response = self._client.post(
+                self.push_url, content=self._encode(batch), headers=self._headers()
+            )
+        except httpx.HTTPError as e:
+            return self._failed(f"{type(e).__name__}: {e}")
+
+        if response.status_code < 300:
+            self._shipped += len(batch)
+            LOG_LINES_SHIPPED.labels(service=self.service).inc(len(batch))
+            if self._failing:
+                self._failing = False
+                logger.info(f"Loki push recovered for {self.service}")
+            return True
+        if response.status_code < 500 and response.status_code != 429:
+            logger.warning(
+                f"Loki rejected {len(batch)} lines for {self.service}: "
+                f"HTTP {response.status_code} {response.text[:200]}"
+            )
+            self._drop("rejected", len(batch))
+            return True
+        return self._failed(f"HTTP {response.status_code}")
+
+    def _failed(self, error: str) -> bool:
+        LOG_PUSH_ERRORS.labels(service=self.service).inc()
+        if not self._failing:
+            # Log the transition only, not every retry
+            self._failing = True
+            logger.warning(
+                f"Loki push failed for {self.service}, retrying with backoff: {error}"
+            )
+        return False
+
+    def _encode(self, batch: List[_Line]) -> bytes:
+        streams: Dict[str, List[List[str]]] = {}
+        for timestamp, severity, _, line in batch:
+            streams.setdefault(severity, []).append([str(timestamp), line])
+        body = json.dumps(
+            {
+                "streams": [
+                    {"stream": {**self.labels, "severity": severity}, "values": values}
+                    for severity, values in streams.items()
+                ]
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        return gzip.compress(body) if self.compress else body
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.compress:
+            headers["Content-Encoding"] = "gzip"
+        return headers
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and counters for debug endpoints."""
+        with self._cond:
+            depth = len(self._queue)
+        return {
+            "queued": depth,
+            "shipped": self._shipped,
+            "dropped": dict(self._dropped),
+            "failing": self._failing,
+        }
+
+
+class QueuedLokiHandler(logging.Handler):
+    """logging handler that hands formatted records to a ``LokiShipper``."""
+
+    def __init__(self, shipper: LokiShipper, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.shipper = shipper
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.shipper.submit(
+                self.format(record),
+                record.levelname.lower(),
+                record.levelno,
+                record.created,
+            )
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.shipper.close()
+        super().close()
+
+
+__all__ = ["LokiShipper", "OVERFLOW_POLICIES", "QueuedLokiHandler"]
@@ -69,27 +69,6 @@ class StructuredFormatter(logging.Formatter):
         return json.dumps(log_data, ensure_ascii=False)
 
 
-class ResilientLokiHandler(logging.Handler):
-    """Resilient wrapper around LokiHandler that won't crash the app"""
-
-    def __init__(self, loki_handler):
-        super().__init__()
-        self.loki_handler = loki_handler
-        self.failed = False
-
-    def emit(self, record):
-        """Emit a record, catching any exceptions"""
-        if self.failed:
-            return  # Already failed, don't try again
-
-        try:
-            self.loki_handler.emit(record)
-        except Exception:
-            self.failed = True
-            # Silently fail - don't crash the application
-            pass
-
-
 class HumanReadableFormatter(logging.Formatter):
     """人类可读的日志格式化器"""
 
@@ -142,6 +121,11 @@ class UnifiedLoggingConfig:
         self.loki_grpc_port = int(os.getenv("LOKI_GRPC_PORT", "50054"))
         self.loki_url = f"http://{self.loki_grpc_host}:{self.loki_grpc_port}"  # Fallback for HTTP-based handlers
         self.loki_enabled = os.getenv("LOKI_ENABLED", "false").lower() == "true"
+        # 异步推送队列 (emit 只入队，后台线程批量压缩推送)
+        self.loki_queue_size = int(os.getenv("LOKI_QUEUE_SIZE", "10000"))
+        self.loki_batch_size = int(os.getenv("LOKI_BATCH_SIZE", "500"))
+        self.loki_flush_interval = float(os.getenv("LOKI_FLUSH_INTERVAL", "1.0"))
+        self.loki_overflow = os.getenv("LOKI_OVERFLOW_POLICY", "drop_oldest")
 
     def _resolve_log_dir(self, requested_log_dir: str) -> Path:
         """Resolve a writable log directory, falling back to /tmp when needed."""
@@ -298,7 +282,7 @@ class UnifiedLoggingConfig:
         # Loki Handler - 中心化日志系统
         if use_loki:
             try:
-                from logging_loki import LokiHandler
+                from .log_shipper import LokiShipper, QueuedLokiHandler
 
                 # 提取 logger 组件名称
                 # 例如: "payment_service" -> service="payment", logger="main"
@@ -319,20 +303,18 @@ class UnifiedLoggingConfig:
                     "job": f"{service_base}_service"
                 }
 
-                # 创建 Loki handler
-                loki_handler = LokiHandler(
-                    url=f"{self.loki_url}/loki/api/v1/push",
-                    tags=loki_labels,
-                    version="1",
+                # 创建队列化 Loki handler - 推送失败时退避重连，不会永久停用
+                shipper = LokiShipper(
+                    f"{self.loki_url}/loki/api/v1/push",
+                    loki_labels,
+                    max_queue=self.loki_queue_size,
+                    batch_size=self.loki_batch_size,
+                    flush_interval=self.loki_flush_interval,
+                    overflow=self.loki_overflow,
                 )
 
                 # 只发送 INFO 及以上级别到 Loki (减少网络流量)
-                loki_handler.setLevel(logging.INFO)
-
-                # Wrap in resilient handler to prevent crashes
-                resilient_handler = ResilientLokiHandler(loki_handler)
-                resilient_handler.setLevel(logging.INFO)
-                logger.addHandler(resilient_handler)
+                logger.addHandler(QueuedLokiHandler(shipper, level=logging.INFO))
 
                 # 只在主 logger 上记录一次成功信息 - 使用console handler避免循环
                 if logger_component == "main":
@@ -346,9 +328,6 @@ class UnifiedLoggingConfig:
                         console_logger.addHandler(console_handler)
                     console_logger.info(f"✅ Centralized logging enabled | loki_url={self.loki_url}")
 
-            except ImportError:
-                if self.service_name == "main" or "." not in self.service_name:
-                    logger.warning("⚠️  python-logging-loki not installed. Logging to console/file only.")
             except Exception as e:
                 # Loki 不可用 - 不影响应用启动，使用console输出避免循环
                 if logger_component == "main":
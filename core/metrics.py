@@ -16,21 +16,29 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-try:
-    from isa_common.metrics import create_counter, create_histogram
-except ModuleNotFoundError:
 
-    class _NoopMetric:
-        """Drop-in metric object for environments without isa_common metrics."""
+class _NoopMetric:
+    """Drop-in metric object for environments without isa_common metrics."""
+
+    def labels(self, *args, **kwargs):
+        return self
 
-        def labels(self, *args, **kwargs):
-            return self
+    def inc(self, *args, **kwargs):
+        return None
 
-        def inc(self, *args, **kwargs):
-            return None
+    def observe(self, *args, **kwargs):
+        return None
 
-        def observe(self, *args, **kwargs):
-            return None
+    def set(self, *args, **kwargs):
+        return None
+
+    def dec(self, *args, **kwargs):
+        return None
+
+
+try:
+    from isa_common.metrics import create_counter, create_histogram
+except ModuleNotFoundError:
 
     def create_counter(*args, **kwargs):
         return _NoopMetric()
@@ -39,6 +47,14 @@ except ModuleNotFoundError:
         return _NoopMetric()
 
 
+try:
+    from isa_common.metrics import create_gauge
+except ImportError:  # also covers isa_common builds without gauges
+
+    def create_gauge(*args, **kwargs):
+        return _NoopMetric()
+
+
 try:
     from isa_common.observability import setup_observability
 except ModuleNotFoundError:
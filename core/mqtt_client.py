@@ -6,6 +6,8 @@ Provides async-first IoT messaging with topic patterns for device commands,
 sensor readings, and system events.
 """
 
+import asyncio
+import json
 import logging
 import secrets
 from datetime import datetime
@@ -71,6 +73,29 @@ class MQTTTopics:
         return cls.ALERTS.format(alert_type=alert_type)
 
 
+def device_command_payload(
+    device_id: str,
+    command: str,
+    parameters: Optional[Dict[str, Any]] = None,
+    timeout: int = 30,
+    priority: int = 1,
+    require_ack: bool = True,
+    command_id: Optional[str] = None,
+    timestamp: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Message published on ``devices/{device_id}/commands``."""
+    return {
+        "device_id": device_id,
+        "command": command,
+        "parameters": parameters or {},
+        "timestamp": timestamp or datetime.utcnow().isoformat() + "Z",
+        "command_id": command_id or secrets.token_hex(16),
+        "timeout": timeout,
+        "priority": priority,
+        "require_ack": require_ack,
+    }
+
+
 class MQTTEventBus:
     """
     Centralized MQTT event bus for IoT messaging.
@@ -294,6 +319,7 @@ class MQTTEventBus:
         timeout: int = 30,
         priority: int = 1,
         require_ack: bool = True,
+        command_id: Optional[str] = None,
     ) -> Optional[str]:
         """
         Send command to device.
@@ -305,22 +331,15 @@ class MQTTEventBus:
             timeout: Command timeout in seconds
             priority: Priority level (1-10)
             require_ack: Whether acknowledgment is required
+            command_id: Command ID to send (generated if omitted)
 
         Returns:
             str: Command ID if sent, None on failure
         """
-        command_id = secrets.token_hex(16)
-
-        command_data = {
-            "device_id": device_id,
-            "command": command,
-            "parameters": parameters or {},
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "command_id": command_id,
-            "timeout": timeout,
-            "priority": priority,
-            "require_ack": require_ack,
-        }
+        command_data = device_command_payload(
+            device_id, command, parameters, timeout, priority, require_ack, command_id
+        )
+        command_id = command_data["command_id"]
 
         topic = MQTTTopics.device_commands(device_id)
 
@@ -331,6 +350,81 @@ class MQTTEventBus:
             logger.error(f"Failed to send device command: {command} -> {device_id}")
             return None
 
+    async def send_device_commands(
+        self,
+        commands: List[Dict[str, Any]],
+        batch_size: int = 500,
+        max_concurrency: int = 8,
+    ) -> Dict[str, bool]:
+        """
+        Send many device commands over this bus's session.
+
+        Commands go out with ``publish_batch`` in chunks of ``batch_size``,
+        with up to ``max_concurrency`` chunks in flight. A chunk the adapter
+        only partly published is resent message by message so every
+        command's outcome is known; devices drop duplicates by command_id.
+
+        Args:
+            commands: Dicts with device_id, command_id, command and optional
+                parameters, timeout, priority, require_ack
+            batch_size: Messages per publish_batch call
+            max_concurrency: publish_batch calls in flight
+
+        Returns:
+            Dict mapping command_id to whether it was published
+        """
+        if not commands:
+            return {}
+        if not self.connected or not self.session_id:
+            if not await self.connect():
+                return {c["command_id"]: False for c in commands}
+
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        results: Dict[str, bool] = {}
+
+        async def send_chunk(chunk: List[Dict[str, Any]]) -> None:
+            messages = [
+                {
+                    "topic": MQTTTopics.device_commands(c["device_id"]),
+                    "payload": json.dumps(
+                        device_command_payload(
+                            c["device_id"],
+                            c["command"],
+                            c.get("parameters"),
+                            c.get("timeout", 30),
+                            c.get("priority", 1),
+                            c.get("require_ack", True),
+                            c["command_id"],
+                            timestamp,
+                        )
+                    ).encode(),
+                    "qos": 2,
+                    "retained": False,
+                }
+                for c in chunk
+            ]
+            async with semaphore:
+                outcome = await self.publish_batch(messages)
+                if outcome["failed_count"] == 0 and outcome["published_count"] == len(chunk):
+                    sent = [True] * len(chunk)
+                elif outcome["published_count"] == 0:
+                    sent = [False] * len(chunk)
+                else:
+                    sent = await asyncio.gather(
+                        *(self.publish(m["topic"], m["payload"], qos=2) for m in messages)
+                    )
+            for command, ok in zip(chunk, sent):
+                results[command["command_id"]] = ok
+
+        size = max(batch_size, 1)
+        await asyncio.gather(
+            *(send_chunk(commands[i:i + size]) for i in range(0, len(commands), size))
+        )
+
+        logger.info(f"Device commands sent: {sum(results.values())}/{len(commands)}")
+        return results
+
     async def send_ota_command(
         self,
         device_id: str,
@@ -594,10 +688,22 @@ class DeviceCommandClient:
         timeout: int = 30,
         priority: int = 1,
         require_ack: bool = True,
+        command_id: Optional[str] = None,
     ) -> Optional[str]:
         """Send command to device."""
         return await self.mqtt_bus.send_device_command(
-            device_id, command, parameters, timeout, priority, require_ack
+            device_id, command, parameters, timeout, priority, require_ack, command_id
+        )
+
+    async def send_device_commands(
+        self,
+        commands: List[Dict[str, Any]],
+        batch_size: int = 500,
+        max_concurrency: int = 8,
+    ) -> Dict[str, bool]:
+        """Send many device commands; returns command_id -> published."""
+        return await self.mqtt_bus.send_device_commands(
+            commands, batch_size=batch_size, max_concurrency=max_concurrency
         )
 
     async def send_ota_command(
@@ -329,6 +329,9 @@ class NATSEventBus:
         handler: Callable,
         durable: Optional[str] = None,
         delivery_policy: str = "all",
+        batch_size: int = 10,
+        ack_after_handler: bool = False,
+        nak_delay: float = 5.0,
     ) -> Optional[str]:
         """
         Subscribe to events matching pattern.
@@ -338,6 +341,13 @@ class NATSEventBus:
             handler: Async callback function(event: Event)
             durable: Optional durable consumer name
             delivery_policy: 'all', 'new', or 'last'
+            batch_size: Messages requested per pull
+            ack_after_handler: Handle each pulled batch concurrently and ACK a
+                message only after its handler returns; a handler that raises
+                gets the message NAK'd (redelivered after ``nak_delay``
+                seconds). Lets handlers defer completion, e.g. until a
+                write-behind buffer has flushed.
+            nak_delay: Redelivery delay for failed messages (ack_after_handler)
 
         Returns:
             Consumer name if successful
@@ -358,6 +368,9 @@ class NATSEventBus:
                     consumer_name,
                     delivery_policy,
                     ready_event,
+                    batch_size=batch_size,
+                    ack_after_handler=ack_after_handler,
+                    nak_delay=nak_delay,
                 )
             )
             self._subscription_tasks.append(task)
@@ -381,6 +394,47 @@ class NATSEventBus:
             logger.error(f"Error subscribing to {pattern}: {e}")
             return None
 
+    async def subscribe_ephemeral(self, pattern: str, handler: Callable) -> Optional[str]:
+        """
+        Subscribe to events matching pattern with a core NATS subscription.
+
+        Nothing is created on the server, so there is no consumer to clean
+        up when the process exits; in exchange delivery is at-most-once and
+        only covers events published while the subscription is open. Meant
+        for per-replica broadcasts such as cache invalidation.
+
+        Args:
+            pattern: Subject pattern (e.g., "organization_service.organization.>")
+            handler: Async callback function(event: Event)
+
+        Returns:
+            The pattern if subscribed
+        """
+        if not self._is_connected or not self._client:
+            logger.error("Not connected to NATS")
+            return None
+
+        async def listen():
+            try:
+                async for msg in self._client.subscribe(pattern):
+                    if not self._subscriptions.get(pattern, False):
+                        break
+                    try:
+                        await handler(self._message_to_event(msg, pattern))
+                    except Exception as msg_e:
+                        logger.error(f"Error processing message: {msg_e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ephemeral subscription error for {pattern}: {e}")
+            finally:
+                self._subscriptions[pattern] = False
+
+        self._subscriptions[pattern] = True
+        self._subscription_tasks.append(asyncio.create_task(listen()))
+        logger.info("Subscribed to %s (ephemeral)", pattern)
+        return pattern
+
     # Alias for backward compatibility
     async def subscribe(self, pattern: str, handler: Callable, consumer_name: Optional[str] = None) -> Optional[str]:
         """Alias for subscribe_to_events"""
@@ -393,6 +447,9 @@ class NATSEventBus:
         consumer_name: Optional[str],
         delivery_policy: str,
         ready_event: Optional[asyncio.Event] = None,
+        batch_size: int = 10,
+        ack_after_handler: bool = False,
+        nak_delay: float = 5.0,
     ):
         """JetStream pull consumer loop"""
         # Use full pattern to derive stream name (handles wildcards like *.file.>)
@@ -459,36 +516,25 @@ class NATSEventBus:
                     messages = await self._client.pull_messages(
                         stream_name=stream_name,
                         consumer_name=consumer_name,
-                        batch_size=10,
+                        batch_size=batch_size,
                     )
 
                     if messages:
                         _backoff_delay = 1.0  # Reset on success
                         _pull_count += len(messages)
-                        for msg in messages:
-                            try:
-                                # Parse envelope
-                                if isinstance(msg.get("data"), bytes):
-                                    data = json.loads(msg["data"].decode())
-                                else:
-                                    data = msg.get("data", {})
-
-                                # Create event
-                                if "type" in data and "source" in data and "data" in data:
-                                    event = Event.from_dict(data)
-                                else:
-                                    # Wrap raw data
-                                    event = Event(
-                                        event_type=msg.get("subject", pattern),
-                                        source="unknown",
-                                        data=data,
-                                    )
-                                    event.id = str(msg.get("sequence", uuid.uuid4()))
-
-                                await handler(event)
-
-                            except Exception as msg_e:
-                                logger.error(f"Error processing message: {msg_e}")
+                        if ack_after_handler:
+                            await asyncio.gather(
+                                *(
+                                    self._handle_and_ack(msg, pattern, handler, nak_delay)
+                                    for msg in messages
+                                )
+                            )
+                        else:
+                            for msg in messages:
+                                try:
+                                    await handler(self._message_to_event(msg, pattern))
+                                except Exception as msg_e:
+                                    logger.error(f"Error processing message: {msg_e}")
                     else:
                         await asyncio.sleep(1)
 
@@ -506,6 +552,79 @@ class NATSEventBus:
             self._subscriptions[pattern] = False
             logger.info(f"Consumer stopped: {consumer_name}")
 
+    @staticmethod
+    def _message_to_event(msg: Dict[str, Any], pattern: str) -> Event:
+        """Parse a pulled envelope into an Event"""
+        if isinstance(msg.get("data"), bytes):
+            data = json.loads(msg["data"].decode())
+        else:
+            data = msg.get("data", {})
+
+        if "type" in data and "source" in data and "data" in data:
+            return Event.from_dict(data)
+
+        # Wrap raw data
+        event = Event(
+            event_type=msg.get("subject", pattern),
+            source="unknown",
+            data=data,
+        )
+        event.id = str(msg.get("sequence", uuid.uuid4()))
+        return event
+
+    async def _handle_and_ack(
+        self, msg: Dict[str, Any], pattern: str, handler: Callable, nak_delay: float
+    ) -> None:
+        """Run handler for one message, then ACK (success) or NAK (failure).
+
+        Unparseable messages are terminated rather than redelivered forever.
+        """
+        delivery = msg.get("delivery")
+        try:
+            event = self._message_to_event(msg, pattern)
+        except Exception as parse_e:
+            logger.error(f"Dropping unparseable message {msg.get('sequence')}: {parse_e}")
+            await self._settle(delivery, msg, "term")
+            return
+
+        try:
+            await handler(event)
+        except Exception as handler_e:
+            logger.warning(f"Handler failed for {event.id}, requesting redelivery: {handler_e}")
+            await self._settle(delivery, msg, "nak", nak_delay)
+            return
+
+        await self._settle(delivery, msg, "ack")
+
+    async def _settle(
+        self, delivery: Any, msg: Dict[str, Any], action: str, delay: Optional[float] = None
+    ) -> None:
+        """ACK / NAK / TERM one pulled message through its ``delivery`` handle.
+
+        ``delivery`` is the isa_common ``NATSDelivery`` returned with every
+        pulled envelope. Without it the message cannot be settled and is
+        redelivered after ack_wait until max_deliver, so that is logged as
+        an error rather than ignored.
+        """
+        if delivery is None:
+            logger.error(
+                f"Cannot {action} message {msg.get('sequence')} on {msg.get('subject')}: "
+                "pulled envelope has no 'delivery' handle (isa_common too old?); "
+                "it will be redelivered"
+            )
+            return
+        try:
+            if action == "nak" and delivery.is_last_delivery:
+                action = "term"
+            if action == "nak":
+                await delivery.nak(delay=delay)
+            elif action == "term":
+                await delivery.term()
+            else:
+                await delivery.ack()
+        except Exception as e:
+            logger.warning(f"Failed to {action} message {msg.get('sequence')}: {e}")
+
     async def unsubscribe(self, pattern: str) -> bool:
         """Unsubscribe from pattern"""
         if pattern in self._subscriptions:
@@ -140,6 +140,9 @@ class FallbackRateLimitBackend:
     async def get_count(self, key: str, window: float) -> int:
         return await self._call("get_count", key, window)
 
+    async def acquire(self, limits, consume: bool = True):
+        return await self._call("acquire", limits, consume)
+
     async def _call(self, method_name: str, *args: Any) -> Any:
         if self._primary_available:
             try:
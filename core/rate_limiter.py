@@ -2,12 +2,28 @@
 Rate Limiting Middleware for FastAPI Services
 
 Sliding window counter with pluggable backends (in-memory, Redis).
+
+Each ``RateLimitConfig`` picks an algorithm:
+
+- ``sliding_log`` (default): one entry per request in the window; exact,
+  but memory grows with the limit, so only suited to short windows
+- ``sliding_window``: two fixed-window counters, the previous one weighted
+  by how much of it still overlaps the window; O(1) per key
+- ``gcra``: generic cell rate algorithm (a token bucket stored as one
+  timestamp); O(1) per key, spreads requests evenly with bursts up to the
+  limit
+
+``SlidingWindowCounter.check_many`` evaluates several limits at once (one
+Lua script round trip on Redis): a request is admitted, and counted
+against every limit, only if all of them allow it.
 """
 
 import logging
+import math
 import time
+import uuid
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -19,12 +35,37 @@ logger = logging.getLogger(__name__)
 EXCLUDED_PREFIXES = ("/health", "/docs", "/redoc", "/openapi.json", "/info")
 
 
+SLIDING_LOG = "sliding_log"
+SLIDING_WINDOW = "sliding_window"
+GCRA = "gcra"
+ALGORITHMS = (SLIDING_LOG, SLIDING_WINDOW, GCRA)
+
+
 @dataclass
 class RateLimitConfig:
     """Rate limit configuration for an endpoint or default."""
 
     requests: int = 60
     window_seconds: int = 60
+    algorithm: str = SLIDING_LOG
+
+    def __post_init__(self):
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {self.algorithm}")
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one limit in an ``acquire`` call."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0
+
+
+def _retry_seconds(seconds: float) -> int:
+    return max(1, math.ceil(seconds))
 
 
 class InMemoryBackend:
@@ -32,6 +73,10 @@ class InMemoryBackend:
 
     def __init__(self):
         self._windows: Dict[str, list] = {}
+        # sliding_window: key -> [bucket, current count, previous count]
+        self._buckets: Dict[str, list] = {}
+        # gcra: key -> theoretical arrival time
+        self._tats: Dict[str, float] = {}
 
     async def increment(self, key: str, window: float) -> int:
         """Add a timestamp and return current request count within the window."""
@@ -64,12 +109,176 @@ class InMemoryBackend:
             return 0
         return len([t for t in self._windows[key] if t > cutoff])
 
+    async def acquire(
+        self, limits: Sequence[Tuple[str, RateLimitConfig]], consume: bool = True
+    ) -> List[RateLimitResult]:
+        """Evaluate every limit; count the request only if all of them allow it."""
+        now = time.monotonic()
+        results, commits = [], []
+        for key, config in limits:
+            result, commit = self._evaluate(key, config, now, consume)
+            results.append(result)
+            commits.append(commit)
+        if consume and all(r.allowed for r in results):
+            for commit in commits:
+                commit()
+        return results
+
+    def _evaluate(self, key: str, config: RateLimitConfig, now: float, consume: bool):
+        limit, window = config.requests, config.window_seconds
+
+        if limit <= 0:
+            return RateLimitResult(False, limit, 0, _retry_seconds(window)), None
+
+        if config.algorithm == GCRA:
+            interval = window / limit
+            tat = max(self._tats.get(key, now), now)
+            available = math.floor((now + window - tat) / interval)
+            if available >= 1:
+
+                def commit():
+                    self._tats[key] = tat + interval
+
+                return (
+                    RateLimitResult(
+                        True, limit, available - 1 if consume else available
+                    ),
+                    commit,
+                )
+            retry = tat + interval - window - now
+            return RateLimitResult(False, limit, 0, _retry_seconds(retry)), None
+
+        if config.algorithm == SLIDING_WINDOW:
+            bucket = math.floor(now / window)
+            last, current, previous = self._buckets.get(key, (None, 0, 0))
+            if last is None or last < bucket - 1:
+                current, previous = 0, 0
+            elif last == bucket - 1:
+                current, previous = 0, current
+            weight = 1 - (now - bucket * window) / window
+            available = math.floor(limit - (previous * weight + current))
+            if available >= 1:
+                state = [bucket, current + 1, previous]
+
+                def commit():
+                    self._buckets[key] = state
+
+                return (
+                    RateLimitResult(
+                        True, limit, available - 1 if consume else available
+                    ),
+                    commit,
+                )
+            if current + 1 > limit or previous == 0:
+                retry = (bucket + 1) * window - now
+            else:
+                retry = ((1 - (limit - current - 1) / previous) - (1 - weight)) * window
+            return RateLimitResult(False, limit, 0, _retry_seconds(retry)), None
+
+        entries = [t for t in self._windows.get(key, []) if t > now - window]
+        self._windows[key] = entries
+        available = limit - len(entries)
+        if available >= 1:
+            return RateLimitResult(
+                True, limit, available - 1 if consume else available
+            ), lambda: entries.append(now)
+        retry = entries[0] + window - now
+        return RateLimitResult(False, limit, 0, _retry_seconds(retry)), None
+
+
+# Redis version of InMemoryBackend.acquire: all limits are read, and only if
+# every one allows the request are they all updated, atomically.
+#   KEYS[i]: the key for limit i
+#   ARGV[1]: "1" to consume, "0" to only read
+#   ARGV[2]: unique member for sliding_log entries
+#   ARGV[3 + 3(i-1) ..]: algorithm, limit, window seconds of limit i
+# Returns {allowed_1, remaining_1, retry_ms_1, allowed_2, ...}
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local consume = ARGV[1] == '1'
+local out, commits = {}, {}
+local all_allowed = true
+for i, key in ipairs(KEYS) do
+  local base = 3 + (i - 1) * 3
+  local algorithm = ARGV[base]
+  local limit = tonumber(ARGV[base + 1])
+  local window = tonumber(ARGV[base + 2])
+  local available, retry = 0, 0
+  if limit <= 0 then
+    retry = window
+  elseif algorithm == 'gcra' then
+    local interval = window / limit
+    local tat = math.max(tonumber(redis.call('GET', key)) or now, now)
+    available = math.floor((now + window - tat) / interval)
+    if available >= 1 then
+      commits[i] = {'gcra', key, tat + interval, tat + interval - now}
+    else
+      retry = tat + interval - window - now
+    end
+  elseif algorithm == 'sliding_window' then
+    local bucket = math.floor(now / window)
+    local state = redis.call('HMGET', key, 'bucket', 'current', 'previous')
+    local last = tonumber(state[1])
+    local current, previous = tonumber(state[2]) or 0, tonumber(state[3]) or 0
+    if last == nil or last < bucket - 1 then
+      current, previous = 0, 0
+    elseif last == bucket - 1 then
+      current, previous = 0, current
+    end
+    local weight = 1 - (now - bucket * window) / window
+    available = math.floor(limit - (previous * weight + current))
+    if available >= 1 then
+      commits[i] = {'sliding_window', key, bucket, current + 1, previous, window * 2}
+    elseif current + 1 > limit or previous == 0 then
+      retry = (bucket + 1) * window - now
+    else
+      retry = ((1 - (limit - current - 1) / previous) - (1 - weight)) * window
+    end
+  else
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    available = limit - redis.call('ZCARD', key)
+    if available >= 1 then
+      commits[i] = {'sliding_log', key, now, window + 1}
+    else
+      local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+      retry = tonumber(oldest[2]) + window - now
+    end
+  end
+  if available >= 1 then
+    out[#out + 1] = 1
+    out[#out + 1] = consume and available - 1 or available
+    out[#out + 1] = 0
+  else
+    all_allowed = false
+    out[#out + 1] = 0
+    out[#out + 1] = 0
+    out[#out + 1] = math.max(1, math.ceil(retry * 1000))
+  end
+end
+if consume and all_allowed then
+  for _, c in pairs(commits) do
+    if c[1] == 'gcra' then
+      redis.call('SET', c[2], tostring(c[3]), 'PX', math.max(1, math.ceil(c[4] * 1000)))
+    elseif c[1] == 'sliding_window' then
+      redis.call('HSET', c[2], 'bucket', c[3], 'current', c[4], 'previous', c[5])
+      redis.call('PEXPIRE', c[2], math.ceil(c[6] * 1000))
+    else
+      redis.call('ZADD', c[2], c[3], ARGV[2])
+      redis.call('EXPIRE', c[2], math.ceil(c[4]))
+    end
+  end
+end
+return out
+"""
+
 
 class RedisBackend:
     """Redis-backed sliding window. For multi-process / distributed deployments."""
 
     def __init__(self, redis_client):
         self._redis = redis_client
+        self._acquire_script = None
 
     async def increment(self, key: str, window: float) -> int:
         """Increment counter using Redis sorted set with timestamp scores."""
@@ -103,6 +312,32 @@ class RedisBackend:
         results = await pipe.execute()
         return results[1]
 
+    async def acquire(
+        self, limits: Sequence[Tuple[str, RateLimitConfig]], consume: bool = True
+    ) -> List[RateLimitResult]:
+        """Evaluate every limit in one atomic script; see InMemoryBackend.acquire."""
+        if self._acquire_script is None:
+            self._acquire_script = self._redis.register_script(_ACQUIRE_SCRIPT)
+        args = ["1" if consume else "0", uuid.uuid4().hex]
+        for _, config in limits:
+            args += [config.algorithm, config.requests, config.window_seconds]
+        # Each algorithm stores a different Redis type; suffix the key so
+        # switching a limit's algorithm never reads the old structure
+        keys = [
+            key if config.algorithm == SLIDING_LOG else f"{key}:{config.algorithm}"
+            for key, config in limits
+        ]
+        flat = await self._acquire_script(keys=keys, args=args)
+        return [
+            RateLimitResult(
+                allowed=bool(int(flat[i * 3])),
+                limit=config.requests,
+                remaining=int(flat[i * 3 + 1]),
+                retry_after=math.ceil(int(flat[i * 3 + 2]) / 1000),
+            )
+            for i, (_, config) in enumerate(limits)
+        ]
+
 
 class SlidingWindowCounter:
     """Sliding window rate limiter using a pluggable backend."""
@@ -117,6 +352,14 @@ class SlidingWindowCounter:
         Returns:
             (allowed: bool, info: dict) where info contains limit, remaining, retry_after
         """
+        if config.algorithm != SLIDING_LOG:
+            allowed, (result,) = await self.check_many([(key, config)])
+            return allowed, {
+                "limit": result.limit,
+                "remaining": result.remaining,
+                "retry_after": result.retry_after,
+            }
+
         count = await self.backend.increment(key, config.window_seconds)
         remaining = max(0, config.requests - count)
         allowed = count <= config.requests
@@ -133,6 +376,28 @@ class SlidingWindowCounter:
 
         return allowed, info
 
+    async def check_many(
+        self, limits: Sequence[Tuple[str, RateLimitConfig]]
+    ) -> Tuple[bool, List[RateLimitResult]]:
+        """
+        Check several limits for one request in a single backend call.
+
+        The request is counted against every limit only if all of them
+        allow it. Returns (allowed, results) with results in input order.
+        """
+        if not limits:
+            return True, []
+        results = await self.backend.acquire(limits)
+        return all(r.allowed for r in results), results
+
+    async def peek(
+        self, limits: Sequence[Tuple[str, RateLimitConfig]]
+    ) -> List[RateLimitResult]:
+        """Current state of each limit, without counting a request."""
+        if not limits:
+            return []
+        return await self.backend.acquire(limits, consume=False)
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
@@ -216,9 +481,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
 
 __all__ = [
+    "ALGORITHMS",
+    "GCRA",
     "InMemoryBackend",
     "RateLimitConfig",
     "RateLimitMiddleware",
+    "RateLimitResult",
     "RedisBackend",
+    "SLIDING_LOG",
+    "SLIDING_WINDOW",
     "SlidingWindowCounter",
 ]
@@ -543,6 +543,114 @@ class RedisCache:
                 ) from exc
             return deleted
 
+    # -- Versioned writes ----------------------------------------------
+    #
+    # A read-through fill that loads from the database can race an
+    # invalidation: the fill reads the old row, the writer commits and
+    # deletes the key, then the fill stores the old value for a full TTL.
+    # Invalidators ``bump_version`` before deleting; fills read
+    # ``get_version`` before loading and store with ``set_if_version``,
+    # which only writes if no bump happened in between.
+
+    _SET_IF_VERSION_SCRIPT = """
+    if (redis.call('GET', KEYS[2]) or '') == ARGV[1] then
+        redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+        return 1
+    end
+    return 0
+    """
+
+    def _version_key(self, key: str) -> str:
+        return self._full_key(f"{key}:version")
+
+    async def get_version(self, key: str) -> Optional[str]:
+        """Version token of ``key`` ('' if never bumped), or None on error."""
+        client = await self._ensure_client()
+        if client is None or not self._healthy:
+            return None
+        try:
+            raw = await client.get(self._version_key(key))
+        except Exception as exc:
+            self._mark_unhealthy()
+            logger.warning(
+                "redis_cache(%s): GET version failed for %r: %s",
+                self.namespace,
+                key,
+                exc,
+            )
+            CACHE_ERRORS.labels(cache=self.namespace, operation="get_version").inc()
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        return raw or ""
+
+    async def bump_version(self, key: str, *, ttl: int = 86400) -> bool:
+        """Fail every in-flight ``set_if_version`` of ``key``."""
+        client = await self._ensure_client()
+        if client is None:
+            return False
+        version_key = self._version_key(key)
+        try:
+            await client.incr(version_key)
+            await client.expire(version_key, ttl)
+            return True
+        except Exception as exc:
+            self._mark_unhealthy()
+            logger.warning(
+                "redis_cache(%s): INCR version failed for %r: %s",
+                self.namespace,
+                key,
+                exc,
+            )
+            CACHE_ERRORS.labels(cache=self.namespace, operation="bump_version").inc()
+            return False
+
+    async def set_if_version(
+        self,
+        key: str,
+        value: Any,
+        version: str,
+        *,
+        ttl: Optional[int] = None,
+        dumps: Callable[[Any], Any] = None,
+    ) -> bool:
+        """Like ``set`` but only if ``key``'s version is still ``version``."""
+        client = await self._ensure_client()
+        if client is None:
+            return False
+        try:
+            payload = dumps(value) if dumps else json.dumps(value, default=str)
+        except Exception as exc:
+            logger.warning(
+                "redis_cache(%s): serialise failed for %r: %s",
+                self.namespace,
+                key,
+                exc,
+            )
+            CACHE_ERRORS.labels(cache=self.namespace, operation="serialise").inc()
+            return False
+        try:
+            stored = await client.eval(
+                self._SET_IF_VERSION_SCRIPT,
+                2,
+                self._full_key(key),
+                self._version_key(key),
+                version,
+                payload,
+                ttl if ttl is not None else self.default_ttl,
+            )
+            return bool(stored)
+        except Exception as exc:
+            self._mark_unhealthy()
+            logger.warning(
+                "redis_cache(%s): versioned SET failed for %r: %s",
+                self.namespace,
+                key,
+                exc,
+            )
+            CACHE_ERRORS.labels(cache=self.namespace, operation="set").inc()
+            return False
+
     # -- Health check helper -------------------------------------------
 
     async def ping(self) -> bool:
@@ -42,6 +42,12 @@ class BaseServiceClient(ABC):
     cb_failure_threshold: int = 5
     cb_recovery_timeout: float = 30.0
 
+    # Client-side load balancing across discovered instances (see
+    # core.load_balancer). Set lb_affinity_param for cache-affine services
+    # to route by that query/body field with the "sticky" strategy.
+    lb_strategy: str = "p2c"
+    lb_affinity_param: Optional[str] = None
+
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -68,10 +74,14 @@ class BaseServiceClient(ABC):
         # 设置默认 headers
         default_headers = self._build_default_headers(use_internal_auth)
 
-        # 创建 HTTP 客户端
+        # 创建 HTTP 客户端；未指定 base_url 时按实例做负载均衡
+        client_kwargs: Dict[str, Any] = {}
+        if not base_url:
+            client_kwargs["transport"] = self._build_balanced_transport()
         self.client = httpx.AsyncClient(
             timeout=timeout,
-            headers=default_headers
+            headers=default_headers,
+            **client_kwargs
         )
 
         # Circuit breaker per service
@@ -108,6 +118,22 @@ class BaseServiceClient(ABC):
             )
             return default_url
 
+    def _build_balanced_transport(self) -> httpx.AsyncBaseTransport:
+        """
+        构建负载均衡 transport
+
+        请求仍以 base_url 为兜底地址，服务发现有实例时改写为选中的实例。
+        """
+        from core.load_balancer import BalancedTransport, param_affinity
+
+        if self.lb_affinity_param:
+            return BalancedTransport(
+                self.service_name,
+                strategy="sticky",
+                affinity=param_affinity(self.lb_affinity_param),
+            )
+        return BalancedTransport(self.service_name, strategy=self.lb_strategy)
+
     def _build_default_headers(self, use_internal_auth: bool) -> Dict[str, str]:
         """
         构建默认请求headers
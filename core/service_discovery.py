@@ -47,6 +47,23 @@ class ServiceDiscovery:
 
         raise ValueError(f"Service {service_name} not found in Consul")
 
+    async def get_service_url_async(self, service_name: str) -> str:
+        """
+        Async variant of get_service_url; lookups are served from the
+        discovery cache and never block the event loop.
+
+        Raises:
+            ValueError: If service not found in Consul
+        """
+        if not self.consul_registry:
+            raise ValueError("No Consul registry available for service discovery")
+
+        endpoint = await self.consul_registry.get_service_endpoint_async(service_name)
+        if endpoint:
+            return endpoint
+
+        raise ValueError(f"Service {service_name} not found in Consul")
+
     def get_auth_service_url(self) -> str:
         """Get auth service URL"""
         return self.get_service_url("auth_service")
@@ -0,0 +1,756 @@
+"""
+Incremental counter rollups for service statistics endpoints.
+
+Admin dashboards poll ``/stats`` style endpoints that used to run full-table
+``COUNT(CASE WHEN ...)`` scans over the largest tables on every request
+(events, telemetry data, audit events, notifications, orders, permissions).
+This module keeps those counters pre-aggregated in a small per-service
+``<schema>.stat_rollups`` table so the endpoints read O(buckets) rows
+instead of O(rows).
+
+Model
+-----
+A rollup is described by a :class:`RollupSpec`: the source table, the time
+column used for bucketing, and a set of named *dimensions* (SQL expressions
+evaluated against each source row). Every source row contributes to
+
+* the implicit ``_total`` dimension, and
+* one ``(dimension, value)`` counter per dimension whose value is not NULL,
+
+inside the UTC day bucket of its time column (or a single all-time bucket
+when ``time_column`` is ``None``). Rows keyed by service schema, rollup
+name, dimension, value and bucket are stored in ``stat_rollups``; each
+service ships the table in its own migration.
+
+Freshness
+---------
+* **On write** — repositories call :meth:`CounterRollup.increment` after an
+  insert. Increments are best-effort; a failure is logged, never raised.
+* **Reconciliation** — :class:`RollupReconciler` periodically recomputes
+  the most recent ``hot_buckets`` buckets from the source table (cheap
+  indexed range scans that also pick up status transitions on recent rows).
+  Every bucket is only recomputed when the rollup is empty, on demand, or
+  every ``full_reconcile_interval`` seconds when a spec sets one.
+  Reconciliation is the source of truth: it overwrites whatever increments
+  accumulated. A pass is skipped when another replica holds the rollup's
+  advisory lock or finished the same pass recently, so replicas do not
+  repeat each other's scans.
+
+Reads
+-----
+:meth:`CounterRollup.snapshot` reads whole buckets from the rollup table
+and aggregates only the partial buckets at the edges of ``since``/``until``
+from the source table, so arbitrary ranges stay exact. Dimensions listed in
+``count_only`` (per-user / per-device values) are only read as a number of
+distinct values, computed in the database, so a snapshot stays O(dimensions)
+rows however many users or devices there are.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from core.metrics import create_counter, create_histogram
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "TOTAL_DIMENSION",
+    "DEFAULT_FULL_RECONCILE_INTERVAL",
+    "CounterRollup",
+    "RollupReconciler",
+    "RollupSnapshot",
+    "RollupSpec",
+    "ROLLUP_INCREMENTS",
+    "ROLLUP_RECONCILE_DURATION",
+    "ROLLUP_READS",
+]
+
+TOTAL_DIMENSION = "_total"
+
+# Full-reconcile period for rollups without a time column, which have no
+# cheaper hot pass.
+DEFAULT_FULL_RECONCILE_INTERVAL = 3600.0
+
+# Transaction-local flag set by the first statement of a reconcile; the
+# remaining statements only do work when it is 'true'.
+_RUN_GATE = "current_setting('stat_rollups.run', true) = 'true'"
+
+# Bucket used for rollups without a time column.
+_ALL_TIME_BUCKET = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ALL_TIME_SQL = "TIMESTAMPTZ '1970-01-01 00:00:00+00'"
+
+
+# ----------------------------------------------------------------------
+# Metrics
+# ----------------------------------------------------------------------
+
+ROLLUP_INCREMENTS = create_counter(
+    "stat_rollup_increments_total",
+    "Counter rollup increments applied on write",
+    ["rollup", "status"],
+)
+ROLLUP_READS = create_counter(
+    "stat_rollup_reads_total",
+    "Statistics reads served from counter rollups",
+    ["rollup", "status"],
+)
+ROLLUP_RECONCILE_DURATION = create_histogram(
+    "stat_rollup_reconcile_duration_seconds",
+    "Time spent recomputing counter rollups from their source table",
+    ["rollup", "scope"],
+)
+
+
+# ----------------------------------------------------------------------
+# Spec / snapshot
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RollupSpec:
+    """Declarative description of one rollup over a source table.
+
+    ``dimensions`` maps a dimension name to a SQL expression evaluated
+    against the source row; rows where the expression is NULL do not
+    contribute to that dimension. ``amount_column`` is summed alongside the
+    counts (e.g. order totals). ``where`` is a static predicate applied to
+    every source row.
+
+    ``full_reconcile_interval`` is the cluster-wide period of full
+    recomputes; None leaves time-bucketed rollups to hot reconciles plus
+    on-demand :meth:`CounterRollup.reconcile` (rollups without a time column
+    use ``DEFAULT_FULL_RECONCILE_INTERVAL``). ``count_only`` names
+    high-cardinality dimensions that snapshots only expose through
+    :meth:`RollupSnapshot.distinct`.
+    """
+
+    name: str
+    source_table: str
+    dimensions: Mapping[str, str] = field(default_factory=dict)
+    time_column: Optional[str] = None
+    amount_column: Optional[str] = None
+    where: Optional[str] = None
+    hot_buckets: int = 2
+    full_reconcile_interval: Optional[float] = None
+    count_only: Tuple[str, ...] = ()
+
+
+@dataclass
+class RollupSnapshot:
+    """Counters for one rollup over a time range, keyed by dimension/value."""
+
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    amounts: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    distinct_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return self.counts.get(TOTAL_DIMENSION, {}).get("", 0)
+
+    def count(self, dimension: str, value: str) -> int:
+        return self.counts.get(dimension, {}).get(value, 0)
+
+    def by(self, dimension: str) -> Dict[str, int]:
+        return dict(self.counts.get(dimension, {}))
+
+    def distinct(self, dimension: str) -> int:
+        if dimension in self.distinct_counts:
+            return self.distinct_counts[dimension]
+        return sum(1 for n in self.counts.get(dimension, {}).values() if n > 0)
+
+    def amount(self, dimension: str, value: str) -> float:
+        return self.amounts.get(dimension, {}).get(value, 0.0)
+
+    def amount_by(self, dimension: str) -> Dict[str, float]:
+        return dict(self.amounts.get(dimension, {}))
+
+    def _add(self, dimension: str, value: str, count: int, amount: float) -> None:
+        counts = self.counts.setdefault(dimension, {})
+        counts[value] = counts.get(value, 0) + int(count or 0)
+        amounts = self.amounts.setdefault(dimension, {})
+        amounts[value] = amounts.get(value, 0.0) + float(amount or 0)
+
+
+# ----------------------------------------------------------------------
+# Bucket helpers
+# ----------------------------------------------------------------------
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _bucket_floor(value: datetime) -> datetime:
+    return _as_utc(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _plan_range(
+    since: Optional[datetime], until: Optional[datetime]
+) -> Tuple[
+    Optional[Tuple[Optional[datetime], Optional[datetime]]],
+    List[Tuple[datetime, datetime, bool]],
+]:
+    """Split ``[since, until]`` into whole rollup buckets and raw edge ranges.
+
+    Returns ``(bucket_range, edges)``. ``bucket_range`` is ``(first, stop)``
+    with ``stop`` exclusive (either may be None for open ends), or None when
+    no whole bucket lies in the range. ``edges`` are ``(lower, upper,
+    upper_inclusive)`` source time ranges.
+    """
+    start = _as_utc(since) if since else None
+    end = _as_utc(until) if until else None
+
+    first_full = None
+    if start is not None:
+        first_full = _bucket_floor(start)
+        if first_full < start:
+            first_full += timedelta(days=1)
+    last_partial = _bucket_floor(end) if end is not None else None
+
+    if (
+        first_full is not None
+        and last_partial is not None
+        and first_full >= last_partial
+    ):
+        return None, [(start, end, True)]
+
+    edges: List[Tuple[datetime, datetime, bool]] = []
+    if start is not None and first_full > start:
+        edges.append((start, first_full, False))
+    if end is not None:
+        edges.append((last_partial, end, True))
+    return (first_full, last_partial), edges
+
+
+# ----------------------------------------------------------------------
+# CounterRollup
+# ----------------------------------------------------------------------
+
+
+class CounterRollup:
+    """Maintain and read one :class:`RollupSpec` in ``<schema>.<table>``.
+
+    ``db`` is the service's ``AsyncPostgresClient``; the rollup uses the same
+    ``async with db`` / ``query`` / ``execute`` calls as the repositories.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        spec: RollupSpec,
+        *,
+        schema: str,
+        table: str = "stat_rollups",
+    ):
+        self.db = db
+        self.spec = spec
+        self.schema = schema
+        self.table = f"{schema}.{table}"
+        self._dimension_names: List[str] = list(spec.dimensions)
+
+    # -- SQL builders ---------------------------------------------------
+
+    def _bucket_expr(self) -> str:
+        if not self.spec.time_column:
+            return _ALL_TIME_SQL
+        return (
+            f"(date_trunc('day', {self.spec.time_column} AT TIME ZONE 'UTC') "
+            f"AT TIME ZONE 'UTC')"
+        )
+
+    def _source_predicates(self, conditions: Sequence[str]) -> str:
+        predicates = list(conditions)
+        if self.spec.where:
+            predicates.append(f"({self.spec.where})")
+        return f"WHERE {' AND '.join(predicates)}" if predicates else ""
+
+    def _aggregate_sql(
+        self,
+        conditions: Sequence[str],
+        bucketed: bool = True,
+        dimensions: Optional[Sequence[str]] = None,
+    ) -> str:
+        """Aggregate the source into ``(bucket_start, dimension, value, count, amount)``.
+
+        One pass over the source using GROUPING SETS: the empty set yields
+        ``_total`` and each dimension contributes its own set.
+        """
+        dims = list(self._dimension_names if dimensions is None else dimensions)
+        columns = [
+            f"{self._bucket_expr() if bucketed else _ALL_TIME_SQL} AS bucket_start"
+        ]
+        columns += [
+            f"({self.spec.dimensions[name]})::text AS d_{i}"
+            for i, name in enumerate(dims)
+        ]
+        columns.append(
+            f"({self.spec.amount_column})::double precision AS amount"
+            if self.spec.amount_column
+            else "0::double precision AS amount"
+        )
+
+        where_clause = self._source_predicates(conditions)
+
+        grouping_sets = ["(bucket_start)"] + [
+            f"(bucket_start, d_{i})" for i in range(len(dims))
+        ]
+        dimension_case = " ".join(
+            f"WHEN GROUPING(d_{i}) = 0 THEN '{name}'" for i, name in enumerate(dims)
+        )
+        value_case = " ".join(
+            f"WHEN GROUPING(d_{i}) = 0 THEN d_{i}" for i in range(len(dims))
+        )
+        having = " AND ".join(
+            f"(GROUPING(d_{i}) = 1 OR d_{i} IS NOT NULL)" for i in range(len(dims))
+        )
+
+        return f"""
+            SELECT
+                bucket_start,
+                CASE {dimension_case} ELSE '{TOTAL_DIMENSION}' END AS dimension,
+                CASE {value_case} ELSE '' END AS dimension_value,
+                COUNT(*) AS event_count,
+                COALESCE(SUM(amount), 0) AS amount_total
+            FROM (
+                SELECT {", ".join(columns)}
+                FROM {self.spec.source_table}
+                {where_clause}
+            ) AS src
+            GROUP BY GROUPING SETS ({", ".join(grouping_sets)})
+            {"HAVING " + having if having else ""}
+        """
+
+    # -- Writes ---------------------------------------------------------
+
+    async def increment(
+        self,
+        values: Mapping[str, Any],
+        *,
+        at: Optional[datetime] = None,
+        count: int = 1,
+        amount: float = 0.0,
+    ) -> bool:
+        """Add ``count`` source rows with the given dimension ``values``.
+
+        Dimensions missing from ``values`` (or set to None) are skipped, as
+        they would be by reconciliation. Never raises: the next
+        reconciliation repairs any increment that is lost.
+        """
+        return await self.increment_many([(values, at, count, amount)])
+
+    async def increment_many(
+        self,
+        rows: Iterable[Tuple[Mapping[str, Any], Optional[datetime], int, float]],
+    ) -> bool:
+        """Apply several increments as a single multi-row upsert."""
+        deltas: Dict[Tuple[str, str, datetime], List[float]] = {}
+        for values, at, count, amount in rows:
+            if self.spec.time_column:
+                bucket = _bucket_floor(at or datetime.now(timezone.utc))
+            else:
+                bucket = _ALL_TIME_BUCKET
+            keys = [(TOTAL_DIMENSION, "")]
+            keys += [
+                (name, str(values[name]))
+                for name in self._dimension_names
+                if values.get(name) is not None
+            ]
+            for dimension, value in keys:
+                delta = deltas.setdefault((dimension, value, bucket), [0, 0.0])
+                delta[0] += count
+                delta[1] += amount
+
+        if not deltas:
+            return True
+
+        dimensions, values_, buckets, counts, amounts = [], [], [], [], []
+        for (dimension, value, bucket), (count, amount) in deltas.items():
+            dimensions.append(dimension)
+            values_.append(value)
+            buckets.append(bucket)
+            counts.append(int(count))
+            amounts.append(float(amount))
+
+        query = f"""
+            INSERT INTO {self.table} AS r (
+                rollup_name, dimension, dimension_value, bucket_start,
+                event_count, amount_total, updated_at
+            )
+            SELECT $1, d.dimension, d.dimension_value, d.bucket_start,
+                   d.event_count, d.amount_total, NOW()
+            FROM unnest($2::text[], $3::text[], $4::timestamptz[], $5::bigint[], $6::float8[])
+                AS d(dimension, dimension_value, bucket_start, event_count, amount_total)
+            ON CONFLICT (rollup_name, dimension, dimension_value, bucket_start) DO UPDATE SET
+                event_count = r.event_count + EXCLUDED.event_count,
+                amount_total = r.amount_total + EXCLUDED.amount_total,
+                updated_at = NOW()
+        """
+        try:
+            async with self.db:
+                await self.db.execute(
+                    query,
+                    [self.spec.name, dimensions, values_, buckets, counts, amounts],
+                    schema=self.schema,
+                )
+            ROLLUP_INCREMENTS.labels(rollup=self.spec.name, status="ok").inc()
+            return True
+        except Exception as e:
+            ROLLUP_INCREMENTS.labels(rollup=self.spec.name, status="error").inc()
+            logger.warning(f"stat_rollups({self.spec.name}): increment failed: {e}")
+            return False
+
+    async def reconcile(
+        self, since: Optional[datetime] = None, *, min_age: Optional[float] = None
+    ) -> bool:
+        """Recompute buckets from the source table.
+
+        ``since`` limits the work to buckets starting at or after
+        ``since`` (floored to the bucket); None recomputes everything.
+        Runs in one transaction that first tries the rollup's advisory
+        lock: when another replica holds it, or when the same scope was
+        recomputed less than ``min_age`` seconds ago, the transaction does
+        nothing (and still returns True -- the work is someone else's).
+        """
+        scope = "full" if since is None or not self.spec.time_column else "hot"
+        params: List[Any] = [self.spec.name]
+        conditions: List[str] = []
+        bucket_filter = ""
+        if scope == "hot":
+            floor = _bucket_floor(since)
+            params.append(floor)
+            conditions.append(f"{self.spec.time_column} >= $2")
+            bucket_filter = "AND bucket_start >= $2"
+        # A full pass also counts as a hot one
+        markers = [f"{self.spec.name}#hot"]
+        if scope == "full":
+            markers.insert(0, f"{self.spec.name}#full")
+
+        operations = [
+            {
+                "sql": f"""
+                    SELECT set_config(
+                        'stat_rollups.run',
+                        (pg_try_advisory_xact_lock(hashtext($1))
+                         AND NOT EXISTS (
+                            SELECT 1 FROM {self.table}
+                            WHERE rollup_name = $2
+                              AND updated_at > NOW() - make_interval(secs => $3)
+                         ))::text,
+                        true
+                    )
+                """,
+                "params": [
+                    f"{self.table}:{self.spec.name}",
+                    markers[0],
+                    float(min_age or 0),
+                ],
+            },
+            {
+                "sql": f"""
+                    DELETE FROM {self.table}
+                    WHERE rollup_name = $1 {bucket_filter} AND {_RUN_GATE}
+                """,
+                "params": params,
+            },
+            {
+                "sql": f"""
+                    INSERT INTO {self.table} (
+                        rollup_name, dimension, dimension_value, bucket_start,
+                        event_count, amount_total, updated_at
+                    )
+                    SELECT $1, agg.dimension, agg.dimension_value, agg.bucket_start,
+                           agg.event_count, agg.amount_total, NOW()
+                    FROM ({self._aggregate_sql(conditions)}) AS agg
+                    WHERE {_RUN_GATE}
+                    ON CONFLICT (rollup_name, dimension, dimension_value, bucket_start)
+                    DO UPDATE SET
+                        event_count = EXCLUDED.event_count,
+                        amount_total = EXCLUDED.amount_total,
+                        updated_at = NOW()
+                """,
+                "params": params,
+            },
+            {
+                # Completion markers live under their own rollup_name, so
+                # snapshots never see them
+                "sql": f"""
+                    INSERT INTO {self.table} (
+                        rollup_name, dimension, dimension_value, bucket_start,
+                        event_count, amount_total, updated_at
+                    )
+                    SELECT marker, '{TOTAL_DIMENSION}', '', {_ALL_TIME_SQL}, 0, 0, NOW()
+                    FROM unnest($1::text[]) AS marker
+                    WHERE {_RUN_GATE}
+                    ON CONFLICT (rollup_name, dimension, dimension_value, bucket_start)
+                    DO UPDATE SET updated_at = NOW()
+                """,
+                "params": [markers],
+            },
+        ]
+
+        started = time.monotonic()
+        try:
+            async with self.db:
+                ok = await self.db.execute_in_transaction(
+                    operations, schema=self.schema
+                )
+            return bool(ok)
+        except Exception as e:
+            logger.error(f"stat_rollups({self.spec.name}): reconcile failed: {e}")
+            return False
+        finally:
+            ROLLUP_RECONCILE_DURATION.labels(
+                rollup=self.spec.name, scope=scope
+            ).observe(time.monotonic() - started)
+
+    async def reconcile_hot(self, *, min_age: Optional[float] = None) -> bool:
+        """Recompute only the most recent ``hot_buckets`` buckets."""
+        if not self.spec.time_column:
+            return await self.reconcile(min_age=min_age)
+        since = _bucket_floor(datetime.now(timezone.utc)) - timedelta(
+            days=max(self.spec.hot_buckets - 1, 0)
+        )
+        return await self.reconcile(since, min_age=min_age)
+
+    async def is_empty(self) -> bool:
+        """True when the rollup has no rows yet (e.g. freshly migrated)."""
+        try:
+            async with self.db:
+                rows = await self.db.query(
+                    f"SELECT 1 AS present FROM {self.table} WHERE rollup_name = $1 LIMIT 1",
+                    [self.spec.name],
+                    schema=self.schema,
+                )
+        except Exception as e:
+            logger.warning(
+                f"stat_rollups({self.spec.name}): emptiness check failed: {e}"
+            )
+            return False
+        return rows is not None and not rows
+
+    # -- Reads ----------------------------------------------------------
+
+    def _distinct_sql(
+        self,
+        dimension: str,
+        bucket_range: Optional[Tuple[Optional[datetime], Optional[datetime]]],
+        edges: List[Tuple[datetime, datetime, bool]],
+    ) -> Tuple[str, List[Any]]:
+        """Count the distinct values of one dimension over buckets and edges."""
+        params: List[Any] = []
+        parts: List[str] = []
+
+        def param(value: Any) -> str:
+            params.append(value)
+            return f"${len(params)}"
+
+        if bucket_range is not None:
+            first, stop = bucket_range
+            conditions = [
+                f"rollup_name = {param(self.spec.name)}",
+                f"dimension = {param(dimension)}",
+                "event_count > 0",
+            ]
+            if first is not None:
+                conditions.append(f"bucket_start >= {param(first)}")
+            if stop is not None:
+                conditions.append(f"bucket_start < {param(stop)}")
+            parts.append(
+                f"SELECT dimension_value AS v FROM {self.table} "
+                f"WHERE {' AND '.join(conditions)}"
+            )
+        for lower, upper, inclusive in edges:
+            op = "<=" if inclusive else "<"
+            where_clause = self._source_predicates(
+                [
+                    f"{self.spec.time_column} >= {param(lower)}",
+                    f"{self.spec.time_column} {op} {param(upper)}",
+                ]
+            )
+            parts.append(
+                f"SELECT ({self.spec.dimensions[dimension]})::text AS v "
+                f"FROM {self.spec.source_table} {where_clause}"
+            )
+
+        union = " UNION ALL ".join(parts) or "SELECT NULL::text AS v"
+        return (
+            f"SELECT COUNT(DISTINCT v) AS distinct_count FROM ({union}) AS vals",
+            params,
+        )
+
+    async def snapshot(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> RollupSnapshot:
+        """Return counters for ``[since, until]`` (both optional, inclusive).
+
+        Whole buckets come from the rollup table; partial buckets at the
+        edges are aggregated from the source table. Raises on database
+        errors so callers can fall back to their legacy query.
+        """
+        if not self.spec.time_column:
+            since = until = None
+
+        bucket_range, edges = _plan_range(since, until)
+        snapshot = RollupSnapshot()
+        count_only = [d for d in self._dimension_names if d in self.spec.count_only]
+        listed = [d for d in self._dimension_names if d not in self.spec.count_only]
+
+        try:
+            async with self.db:
+                if bucket_range is not None:
+                    first, stop = bucket_range
+                    params: List[Any] = [self.spec.name]
+                    conditions = ["rollup_name = $1"]
+                    if first is not None:
+                        params.append(first)
+                        conditions.append(f"bucket_start >= ${len(params)}")
+                    if stop is not None:
+                        params.append(stop)
+                        conditions.append(f"bucket_start < ${len(params)}")
+                    if count_only:
+                        params.append(count_only)
+                        conditions.append(f"dimension <> ALL(${len(params)}::text[])")
+                    rows = await self.db.query(
+                        f"""
+                            SELECT dimension, dimension_value,
+                                   SUM(event_count) AS event_count,
+                                   SUM(amount_total) AS amount_total
+                            FROM {self.table}
+                            WHERE {" AND ".join(conditions)}
+                            GROUP BY dimension, dimension_value
+                        """,
+                        params,
+                        schema=self.schema,
+                    )
+                    if rows is None:
+                        raise RuntimeError("rollup query failed")
+                    for row in rows:
+                        snapshot._add(
+                            row["dimension"],
+                            row["dimension_value"],
+                            row["event_count"],
+                            row["amount_total"],
+                        )
+
+                for lower, upper, inclusive in edges:
+                    op = "<=" if inclusive else "<"
+                    rows = await self.db.query(
+                        self._aggregate_sql(
+                            [
+                                f"{self.spec.time_column} >= $1",
+                                f"{self.spec.time_column} {op} $2",
+                            ],
+                            bucketed=False,
+                            dimensions=listed,
+                        ),
+                        [lower, upper],
+                        schema=self.schema,
+                    )
+                    if rows is None:
+                        raise RuntimeError("rollup edge query failed")
+                    for row in rows:
+                        snapshot._add(
+                            row["dimension"],
+                            row["dimension_value"],
+                            row["event_count"],
+                            row["amount_total"],
+                        )
+
+                for dimension in count_only:
+                    sql, params = self._distinct_sql(dimension, bucket_range, edges)
+                    rows = await self.db.query(sql, params, schema=self.schema)
+                    if not rows:
+                        raise RuntimeError("rollup distinct query failed")
+                    snapshot.distinct_counts[dimension] = int(
+                        rows[0]["distinct_count"] or 0
+                    )
+        except Exception:
+            ROLLUP_READS.labels(rollup=self.spec.name, status="error").inc()
+            raise
+
+        ROLLUP_READS.labels(rollup=self.spec.name, status="ok").inc()
+        return snapshot
+
+
+# ----------------------------------------------------------------------
+# Reconciler
+# ----------------------------------------------------------------------
+
+
+class RollupReconciler:
+    """Background loop that keeps a service's rollups reconciled.
+
+    Every ``hot_interval`` seconds the recent buckets of each time-bucketed
+    rollup are recomputed, skipped when another replica did so within the
+    last half interval. A rollup is fully recomputed when it is found empty
+    at start-up (so a freshly migrated table is populated) and otherwise
+    only every ``full_reconcile_interval`` seconds, cluster-wide, when its
+    spec sets one (single-bucket rollups: ``DEFAULT_FULL_RECONCILE_INTERVAL``).
+    """
+
+    def __init__(self, rollups: Sequence[CounterRollup], *, hot_interval: float = 60.0):
+        self.rollups = list(rollups)
+        self.hot_interval = hot_interval
+        self._started = time.monotonic()
+        self._checked: set = set()
+        self._last_full: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _full_interval(self, rollup: CounterRollup) -> Optional[float]:
+        if rollup.spec.full_reconcile_interval is not None:
+            return rollup.spec.full_reconcile_interval
+        return None if rollup.spec.time_column else DEFAULT_FULL_RECONCILE_INTERVAL
+
+    async def run_once(self) -> None:
+        now = time.monotonic()
+        for rollup in self.rollups:
+            name = rollup.spec.name
+            if name not in self._checked:
+                self._checked.add(name)
+                if await rollup.is_empty():
+                    if await rollup.reconcile():
+                        self._last_full[name] = now
+                    continue
+
+            interval = self._full_interval(rollup)
+            last_full = self._last_full.get(name, self._started)
+            if interval is not None and now - last_full >= interval:
+                if await rollup.reconcile(min_age=interval):
+                    self._last_full[name] = now
+            elif rollup.spec.time_column:
+                # Rollups without a time column only have one bucket, so
+                # there is no cheaper "hot" pass -- wait for the full one.
+                await rollup.reconcile_hot(min_age=self.hot_interval / 2)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:  # pragma: no cover - defensive, loop must survive
+                logger.error(f"stat_rollups: reconciliation pass failed: {e}")
+            await asyncio.sleep(self.hot_interval)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
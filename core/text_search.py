@@ -0,0 +1,186 @@
+"""
+Indexed text search for repository listings.
+
+Builds the WHERE / rank / ORDER BY fragments repositories splice into their
+``$n``-parameterised queries, so substring search is answered by pg_trgm GIN
+indexes (``CREATE INDEX ... USING gin (col gin_trgm_ops)``) instead of a
+sequential ``ILIKE '%term%'`` scan:
+
+- terms of 3+ characters match anywhere in the column (trigram index);
+  shorter terms match as a prefix, which the same index still serves
+- ``%`` and ``_`` in user input are escaped, so they match literally
+- ``fuzzy=True`` also matches by trigram similarity (typos)
+- ``exact_columns`` (ids, enum-like columns) match on equality only
+- ``rank`` orders exact matches first, then prefix matches, then by
+  similarity
+
+Keyset pagination (``Keyset``) replaces deep OFFSETs: the cursor carries the
+sort key of the last row returned, and the next page seeks past it.
+
+Usage:
+    params = [organization_id]
+    search = TextSearch(("name", "email"), term).bind(params, ranked=True)
+    keyset = Keyset(("created_at", "user_id"))
+    after = keyset.after(cursor, params)   # None on the first page
+    sql = f"SELECT * FROM t WHERE org = $1 AND {search.condition}"
+          f"{' AND ' + after if after else ''} ORDER BY {keyset.order_by} LIMIT 50"
+    next_cursor = keyset.cursor_for(rows[-1])
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence
+
+# pg_trgm only indexes a substring match once it yields a whole trigram
+MIN_TRIGRAM_LENGTH = 3
+
+
+class InvalidCursorError(ValueError):
+    """A pagination cursor could not be decoded"""
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass(frozen=True)
+class BoundTextSearch:
+    """SQL fragments for a search whose parameters were appended to ``params``"""
+
+    condition: str
+    rank: str
+
+
+@dataclass(frozen=True)
+class TextSearch:
+    """Indexed substring / prefix / fuzzy search over text columns"""
+
+    columns: Sequence[str]
+    term: str
+    fuzzy: bool = False
+    exact_columns: Sequence[str] = ()
+
+    @property
+    def normalized(self) -> str:
+        return self.term.strip().lower()
+
+    @property
+    def is_prefix(self) -> bool:
+        """Short terms match as a prefix; substring search needs a full trigram"""
+        return len(self.normalized) < MIN_TRIGRAM_LENGTH
+
+    def bind(self, params: List[Any], *, ranked: bool = False) -> BoundTextSearch:
+        """
+        Append this search's parameters to ``params`` and return its SQL.
+
+        Only parameters the returned fragments reference are appended, so a
+        count query can bind the condition alone; pass ``ranked=True`` to use
+        ``rank`` as well.
+        """
+        term = self.normalized
+        escaped = escape_like(term)
+        bound = {}
+
+        def param(name: str, value: Any) -> str:
+            if name not in bound:
+                params.append(value)
+                bound[name] = f"${len(params)}"
+            return bound[name]
+
+        pattern = param("pattern", escaped + "%" if self.is_prefix else f"%{escaped}%")
+        matches = [f"{col} ILIKE {pattern}" for col in self.columns]
+        if self.fuzzy and not self.is_prefix:
+            matches += [f"{col} % {param('raw', term)}" for col in self.columns]
+        matches += [
+            f"lower({col}) = {param('raw', term)}" for col in self.exact_columns
+        ]
+        condition = f"({' OR '.join(matches)})"
+        if not ranked:
+            return BoundTextSearch(condition=condition, rank="")
+
+        raw, prefix = param("raw", term), param("prefix", escaped + "%")
+        scores = [
+            f"(CASE WHEN lower({col}) = {raw} THEN 2 "
+            f"WHEN {col} ILIKE {prefix} THEN 1 ELSE 0 END + similarity({col}, {raw}))"
+            for col in self.columns
+        ] + [
+            f"(CASE WHEN lower({col}) = {raw} THEN 2 ELSE 0 END)"
+            for col in self.exact_columns
+        ]
+        rank = scores[0] if len(scores) == 1 else f"GREATEST({', '.join(scores)})"
+        return BoundTextSearch(condition=condition, rank=f"({rank})::float8")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key"""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Sort key from ``encode_cursor``; raises InvalidCursorError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}") from e
+    if not isinstance(payload, list) or len(payload) != size:
+        raise InvalidCursorError("Cursor does not match this listing")
+    try:
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}") from e
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """
+    Descending keyset pagination over ``keys`` (SQL expressions or columns).
+
+    The last key must be unique (a primary/business id) so pages never skip
+    or repeat rows; ``names`` are the row keys holding each value (defaults
+    to ``keys``).
+    """
+
+    keys: Sequence[str]
+    names: Optional[Sequence[str]] = None
+
+    @property
+    def order_by(self) -> str:
+        return ", ".join(f"{key} DESC" for key in self.keys)
+
+    def after(self, cursor: Optional[str], params: List[Any]) -> Optional[str]:
+        """Seek condition past ``cursor`` (appending its values), None if no cursor"""
+        if not cursor:
+            return None
+        values = decode_cursor(cursor, len(self.keys))
+        start = len(params) + 1
+        params.extend(values)
+        placeholders = ", ".join(f"${start + i}" for i in range(len(values)))
+        return f"({', '.join(self.keys)}) < ({placeholders})"
+
+    def cursor_for(self, row: Any) -> str:
+        """Cursor continuing after ``row`` (a mapping or an object with attributes)"""
+        names = self.names or self.keys
+        if isinstance(row, Mapping):
+            return encode_cursor([row[name] for name in names])
+        return encode_cursor([getattr(row, name) for name in names])
+
+
+__all__ = [
+    "BoundTextSearch",
+    "InvalidCursorError",
+    "Keyset",
+    "MIN_TRIGRAM_LENGTH",
+    "TextSearch",
+    "decode_cursor",
+    "encode_cursor",
+    "escape_like",
+]
@@ -23,6 +23,7 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.text_search import InvalidCursorError, Keyset, TextSearch
 from google.protobuf.json_format import MessageToDict
 from .models import User, AdminNote
 from .protocols import DuplicateEntryError, UserNotFoundError
@@ -329,41 +330,57 @@ class AccountRepository:
         """Delete account (soft delete by deactivating)"""
         return await self.deactivate_account(user_id)
 
+    # Account listings page by (created_at, user_id) so deep pages seek via
+    # the cursor instead of scanning OFFSET rows
+    _listing_keyset = Keyset(("created_at", "user_id"))
+
+    def _account_filters(
+        self,
+        params: List[Any],
+        is_active: Optional[bool] = None,
+        search: Optional[str] = None,
+    ) -> List[str]:
+        """WHERE conditions for account listings (search is trigram-indexed)"""
+        conditions = []
+        if is_active is not None:
+            params.append(is_active)
+            conditions.append(f"is_active = ${len(params)}")
+        if search:
+            conditions.append(
+                TextSearch(("name", "email"), search).bind(params).condition
+            )
+        return conditions
+
     async def list_accounts(
         self,
         limit: int = 50,
         offset: int = 0,
         is_active: Optional[bool] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[User]:
-        """List accounts with pagination (no subscription filter)"""
+        """
+        List accounts, newest first (no subscription filter)
+
+        With ``cursor`` (from ``listing_cursor`` of the previous page's last
+        account) the page is fetched by keyset and ``offset`` is ignored.
+        """
         try:
-            conditions = []
-            params = []
-            param_count = 1
-
-            if is_active is not None:
-                conditions.append(f"is_active = ${param_count}")
-                params.append(is_active)
-                param_count += 1
-
-            if search is not None:
-                conditions.append(
-                    f"(name ILIKE ${param_count} OR email ILIKE ${param_count})"
-                )
-                params.append(f"%{search}%")
-                param_count += 1
+            params: List[Any] = []
+            conditions = self._account_filters(params, is_active, search)
+            after = self._listing_keyset.after(cursor, params)
+            if after:
+                conditions.append(after)
+                offset = 0
 
             where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-
-            params.append(limit)
-            params.append(offset)
+            params.extend([limit, offset])
 
             query = f"""
                 SELECT * FROM {self.schema}.{self.users_table}
                 {where_clause}
-                ORDER BY created_at DESC
-                LIMIT ${param_count} OFFSET ${param_count + 1}
+                ORDER BY {self._listing_keyset.order_by}
+                LIMIT ${len(params) - 1} OFFSET ${len(params)}
             """
 
             async with self.db:
@@ -376,24 +393,34 @@ class AccountRepository:
 
             return users
 
+        except InvalidCursorError:
+            raise
         except Exception as e:
             logger.error(f"Failed to list accounts: {e}")
             return []
 
+    def listing_cursor(self, user: User) -> str:
+        """Cursor continuing a ``list_accounts`` listing after ``user``"""
+        return self._listing_keyset.cursor_for(user)
+
     async def search_accounts(self, query: str, limit: int = 50) -> List[User]:
-        """Search accounts by name or email"""
+        """Search active accounts by name or email, best matches first"""
         try:
-            search_pattern = f"%{query}%"
+            params: List[Any] = []
+            search = TextSearch(("name", "email"), query, fuzzy=True).bind(
+                params, ranked=True
+            )
+            params.append(limit)
 
             sql = f"""
                 SELECT * FROM {self.schema}.{self.users_table}
-                WHERE (name ILIKE $1 OR email ILIKE $1) AND is_active = TRUE
-                ORDER BY created_at DESC
-                LIMIT $2
+                WHERE {search.condition} AND is_active = TRUE
+                ORDER BY {search.rank} DESC, created_at DESC
+                LIMIT ${len(params)}
             """
 
             async with self.db:
-                rows = await self.db.query(sql, params=[search_pattern, limit])
+                rows = await self.db.query(sql, params=params)
 
             users = []
             if rows:
@@ -661,22 +688,8 @@ class AccountRepository:
     ) -> int:
         """Get total account count with optional filters (for pagination)"""
         try:
-            conditions = []
-            params = []
-            param_count = 1
-
-            if is_active is not None:
-                conditions.append(f"is_active = ${param_count}")
-                params.append(is_active)
-                param_count += 1
-
-            if search is not None:
-                conditions.append(
-                    f"(name ILIKE ${param_count} OR email ILIKE ${param_count})"
-                )
-                params.append(f"%{search}%")
-                param_count += 1
-
+            params: List[Any] = []
+            conditions = self._account_filters(params, is_active, search)
             where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
             query = f"SELECT COUNT(*) as total FROM {self.schema}.{self.users_table} {where_clause}"
@@ -17,6 +17,8 @@ import re
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from core.text_search import InvalidCursorError
+
 # Import protocols (no I/O dependencies)
 from .protocols import (
     AccountRepositoryProtocol,
@@ -439,6 +441,7 @@ class AccountService:
                 offset=(params.page - 1) * params.page_size,
                 is_active=params.is_active,
                 search=params.search,
+                cursor=params.cursor,
             )
 
             accounts = [self._user_to_summary_response(user) for user in users]
@@ -453,8 +456,13 @@ class AccountService:
                 page=params.page,
                 page_size=params.page_size,
                 has_next=has_next,
+                next_cursor=(
+                    self.account_repo.listing_cursor(users[-1]) if has_next else None
+                ),
             )
 
+        except InvalidCursorError as e:
+            raise AccountValidationError(str(e))
         except Exception as e:
             logger.error(f"Failed to list accounts: {e}")
             raise AccountServiceError(f"Failed to list accounts: {str(e)}")
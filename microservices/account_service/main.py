@@ -25,6 +25,7 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -227,6 +228,7 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
     await account_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -499,6 +501,9 @@ async def list_accounts(
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in name/email"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page (keyset pagination)"
+    ),
     account_service: AccountService = Depends(get_account_service),
     caller_id: str = Depends(get_authenticated_caller),
 ):
@@ -514,8 +519,11 @@ async def list_accounts(
             page_size=page_size,
             is_active=is_active,
             search=search,
+            cursor=cursor,
         )
         return await account_service.list_accounts(params)
+    except AccountValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except AccountServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -668,6 +676,9 @@ async def admin_list_accounts(
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in name/email"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page (keyset pagination)"
+    ),
     account_service: AccountService = Depends(get_account_service),
     admin: Dict[str, Any] = Depends(require_admin_token),
 ):
@@ -678,6 +689,7 @@ async def admin_list_accounts(
             page_size=page_size,
             is_active=is_active,
             search=search,
+            cursor=cursor,
         )
         result = await account_service.list_accounts(params)
 
@@ -701,7 +713,10 @@ async def admin_list_accounts(
             page=result.page,
             page_size=result.page_size,
             has_next=result.has_next,
+            next_cursor=result.next_cursor,
         )
+    except AccountValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except AccountServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -0,0 +1,17 @@
+-- Account Service Migration: Trigram indexes for account search
+-- Version: 004
+-- Date: 2026-10-18
+-- Description: Serve name/email substring search (core.text_search) from
+--              pg_trgm GIN indexes instead of a sequential ILIKE scan, and
+--              back keyset pagination of the admin listing
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_users_name_trgm
+    ON account.users USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_email_trgm
+    ON account.users USING gin (email gin_trgm_ops);
+
+-- Keyset pagination: ORDER BY created_at DESC, user_id DESC
+CREATE INDEX IF NOT EXISTS idx_users_created_at_user_id
+    ON account.users (created_at DESC, user_id DESC);
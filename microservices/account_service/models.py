@@ -143,6 +143,9 @@ class AccountSearchResponse(BaseModel):
     page: int
     page_size: int
     has_next: bool
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page by keyset"
+    )
 
 
 class AccountStatsResponse(BaseModel):
@@ -177,6 +180,9 @@ class AccountListParams(BaseModel):
     search: Optional[str] = Field(
         None, description="Search in name/email", max_length=100
     )
+    cursor: Optional[str] = Field(
+        None, description="next_cursor of the previous page (replaces page offset)"
+    )
 
 
 class AccountSearchParams(BaseModel):
@@ -252,6 +258,7 @@ class AdminAccountListResponse(BaseModel):
     page: int
     page_size: int
     has_next: bool
+    next_cursor: Optional[str] = None
 
 
 # --- Admin management models (#193) ---
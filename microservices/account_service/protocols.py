@@ -77,8 +77,13 @@ class AccountRepositoryProtocol(Protocol):
         offset: int = 0,
         is_active: Optional[bool] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[User]:
-        """List accounts with pagination"""
+        """List accounts with offset or keyset (cursor) pagination"""
+        ...
+
+    def listing_cursor(self, user: User) -> str:
+        """Cursor continuing a list_accounts listing after ``user``"""
         ...
 
     async def search_accounts(self, query: str, limit: int = 50) -> List[User]:
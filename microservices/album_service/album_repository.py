@@ -68,6 +68,7 @@ class AlbumRepository:
         self.albums_table = "albums"
         self.album_photos_table = "album_photos"
         self.sync_status_table = "album_sync_status"
+        self.changes_table = "album_photo_changes"
 
     # ==================== Album Operations ====================
 
@@ -272,38 +273,67 @@ class AlbumRepository:
 
     # ==================== Album Photos Operations ====================
 
+    def _log_changes_sql(self, source: str, change_type: str, album_expr: str) -> str:
+        """
+        CTE body appending the rows of ``source`` to the photo change log.
+
+        ``album_expr`` is the album of a ``source`` row (a parameter or one
+        of its columns). Albums that no frame has synced yet are skipped:
+        their first sync sends the full manifest anyway.
+
+        Each album's advisory lock is taken before its rows draw change_ids
+        and held until commit, so one album's change_ids commit in order and
+        a sync cursor never passes a change that is still uncommitted.
+        Albums are locked in album_id order so multi-album writers cannot
+        deadlock.
+        """
+        return f"""
+            INSERT INTO {self.schema}.{self.changes_table}
+            (album_id, photo_id, change_type, changed_at)
+            SELECT c.album_id, c.photo_id, '{change_type}', NOW()
+            FROM (
+                SELECT {album_expr} AS album_id, photo_id
+                FROM {source}
+                ORDER BY 1
+            ) c
+            CROSS JOIN LATERAL (
+                SELECT pg_advisory_xact_lock(
+                    hashtext('{self.schema}.{self.changes_table}:' || c.album_id)
+                )
+            ) l
+            WHERE EXISTS (
+                SELECT 1 FROM {self.schema}.{self.sync_status_table} s
+                WHERE s.album_id = c.album_id
+            )
+        """
+
     async def add_photos_to_album(
         self, album_id: str, photo_ids: List[str], added_by: str
     ) -> int:
         """Add photos to album (returns number of photos added)"""
+        if not photo_ids:
+            return 0
         try:
-            now = datetime.now(timezone.utc)
-            added_count = 0
+            # One statement inserts the batch and logs the photos actually added
+            query = f"""
+                WITH inserted AS (
+                    INSERT INTO {self.schema}.{self.album_photos_table}
+                    (album_id, photo_id, added_by, added_at, is_featured, display_order,
+                     ai_tags, ai_objects, ai_scenes, face_detection_results)
+                    SELECT $1, r.photo_id, $3, $4, false, r.ord - 1,
+                           '[]'::jsonb, '[]'::jsonb, '[]'::jsonb, NULL
+                    FROM unnest($2::text[]) WITH ORDINALITY AS r(photo_id, ord)
+                    ON CONFLICT (album_id, photo_id) DO NOTHING
+                    RETURNING photo_id
+                ), logged AS ({self._log_changes_sql("inserted", "added", "$1")})
+                SELECT COUNT(*) AS added_count FROM inserted
+            """
+            params = [album_id, photo_ids, added_by, datetime.now(timezone.utc)]
 
             async with self.db:
-                for idx, photo_id in enumerate(photo_ids):
-                    query = f"""
-                        INSERT INTO {self.schema}.{self.album_photos_table}
-                        (album_id, photo_id, added_by, added_at, is_featured, display_order,
-                         ai_tags, ai_objects, ai_scenes, face_detection_results)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                        ON CONFLICT (album_id, photo_id) DO NOTHING
-                    """
-                    params = [
-                        album_id,
-                        photo_id,
-                        added_by,
-                        now,
-                        False,
-                        idx,
-                        json.dumps([]),
-                        json.dumps([]),
-                        json.dumps([]),
-                        None,
-                    ]
-                    result = await self.db.execute(query, params=params)
-                    if result:
-                        added_count += result
+                result = await self.db.query_row(query, params=params)
+
+            added_count = int(result["added_count"]) if result else 0
 
             # Update album photo count
             if added_count > 0:
@@ -319,27 +349,52 @@ class AlbumRepository:
         self, album_id: str, photo_ids: List[str]
     ) -> int:
         """Remove photos from album (returns number of photos removed)"""
+        if not photo_ids:
+            return 0
         try:
-            placeholders = ",".join([f"${i + 2}" for i in range(len(photo_ids))])
             query = f"""
-                DELETE FROM {self.schema}.{self.album_photos_table}
-                WHERE album_id = $1 AND photo_id IN ({placeholders})
+                WITH removed AS (
+                    DELETE FROM {self.schema}.{self.album_photos_table}
+                    WHERE album_id = $1 AND photo_id = ANY($2::text[])
+                    RETURNING photo_id
+                ), logged AS ({self._log_changes_sql("removed", "removed", "$1")})
+                SELECT COUNT(*) AS removed_count FROM removed
             """
-            params = [album_id] + photo_ids
+            params = [album_id, photo_ids]
 
             async with self.db:
-                count = await self.db.execute(query, params=params)
+                result = await self.db.query_row(query, params=params)
+
+            count = int(result["removed_count"]) if result else 0
 
             # Update album photo count
-            if count is not None and count > 0:
+            if count > 0:
                 await self.update_album_photo_count(album_id)
 
-            return count if count is not None else 0
+            return count
 
         except Exception as e:
             logger.error(f"Error removing photos from album: {e}")
             raise
 
+    async def get_album_photo_ids(self, album_id: str) -> List[str]:
+        """All photo IDs of an album in display order (full frame manifest)"""
+        try:
+            query = f"""
+                SELECT photo_id FROM {self.schema}.{self.album_photos_table}
+                WHERE album_id = $1
+                ORDER BY display_order ASC, added_at DESC
+            """
+
+            async with self.db:
+                results = await self.db.query(query, params=[album_id])
+
+            return [row["photo_id"] for row in results] if results else []
+
+        except Exception as e:
+            logger.error(f"Error getting album photo ids: {e}")
+            raise
+
     async def get_album_photos(
         self, album_id: str, limit: int = 50, offset: int = 0
     ) -> List[AlbumPhoto]:
@@ -456,8 +511,8 @@ class AlbumRepository:
                     INSERT INTO {self.schema}.{self.sync_status_table}
                     (album_id, user_id, frame_id, last_sync_timestamp, sync_version,
                      total_photos, synced_photos, pending_photos, failed_photos,
-                     sync_status, error_message, created_at, updated_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+                     sync_status, error_message, sync_cursor, created_at, updated_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
                 """
                 params = [
                     album_id,
@@ -471,6 +526,7 @@ class AlbumRepository:
                     status_data.get("failed_photos", 0),
                     status_data.get("sync_status", "pending"),
                     status_data.get("error_message"),
+                    status_data.get("sync_cursor"),
                     now,
                     now,
                 ]
@@ -531,6 +587,82 @@ class AlbumRepository:
             logger.error(f"Error listing album sync statuses: {e}")
             return []
 
+    # ==================== Photo Change Log Operations ====================
+
+    async def get_album_changes(
+        self, album_id: str, after_change_id: int, limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """Photo adds/removes of an album after a sync cursor, oldest first
+
+        Safe to advance a cursor over: change log writers hold the album's
+        advisory lock until commit, so no lower change_id can commit later.
+        """
+        try:
+            query = f"""
+                SELECT change_id, photo_id, change_type
+                FROM {self.schema}.{self.changes_table}
+                WHERE album_id = $1 AND change_id > $2
+                ORDER BY change_id ASC
+                LIMIT {int(limit)}
+            """
+
+            async with self.db:
+                results = await self.db.query(query, params=[album_id, after_change_id])
+
+            return [dict(row) for row in results] if results else []
+
+        except Exception as e:
+            logger.error(f"Error getting album changes: {e}")
+            raise
+
+    async def get_latest_album_change_id(self, album_id: str) -> int:
+        """Newest change_id logged for an album (0 if none)"""
+        try:
+            query = f"""
+                SELECT COALESCE(MAX(change_id), 0) AS change_id
+                FROM {self.schema}.{self.changes_table}
+                WHERE album_id = $1
+            """
+
+            async with self.db:
+                result = await self.db.query_row(query, params=[album_id])
+
+            return int(result["change_id"]) if result else 0
+
+        except Exception as e:
+            logger.error(f"Error getting latest album change: {e}")
+            raise
+
+    async def prune_album_changes(self, album_id: str) -> int:
+        """
+        Delete changes every synced frame of the album has already received
+
+        Frames without a cursor are ignored: their next sync is a full
+        manifest.
+
+        Returns:
+            int: Number of change rows deleted
+        """
+        try:
+            query = f"""
+                DELETE FROM {self.schema}.{self.changes_table}
+                WHERE album_id = $1
+                  AND change_id <= (
+                      SELECT MIN(sync_cursor)
+                      FROM {self.schema}.{self.sync_status_table}
+                      WHERE album_id = $1 AND sync_cursor IS NOT NULL
+                  )
+            """
+
+            async with self.db:
+                count = await self.db.execute(query, params=[album_id])
+
+            return count if count else 0
+
+        except Exception as e:
+            logger.error(f"Error pruning album changes: {e}")
+            return 0
+
     # ==================== Event Handler Methods ====================
 
     async def remove_photo_from_all_albums(self, photo_id: str) -> int:
@@ -545,12 +677,18 @@ class AlbumRepository:
         """
         try:
             query = f"""
-                DELETE FROM {self.schema}.{self.album_photos_table}
-                WHERE photo_id = $1
+                WITH removed AS (
+                    DELETE FROM {self.schema}.{self.album_photos_table}
+                    WHERE photo_id = $1
+                    RETURNING album_id, photo_id
+                ), logged AS ({self._log_changes_sql("removed", "removed", "album_id")})
+                SELECT COUNT(*) AS removed_count FROM removed
             """
 
             async with self.db:
-                count = await self.db.execute(query, params=[photo_id])
+                result = await self.db.query_row(query, params=[photo_id])
+
+            count = int(result["removed_count"]) if result else 0
 
             logger.info(f"Removed photo {photo_id} from {count} albums")
             return count if count else 0
@@ -9,7 +9,7 @@ Uses dependency injection for testability:
 - Event publishers are lazily loaded
 """
 
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 from datetime import datetime, timezone
 import logging
 import uuid
@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 # Import protocols (no I/O dependencies) - NOT the concrete repository!
 from .protocols import (
     AlbumRepositoryProtocol,
+    ManifestPublisherProtocol,
     AlbumNotFoundError,
     AlbumValidationError,
     AlbumServiceError,
@@ -49,6 +50,17 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _net_changes(changes: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """Collapse a change log to each photo's last operation: (added, removed)"""
+    latest: Dict[str, str] = {}
+    for change in changes:
+        latest.pop(change["photo_id"], None)
+        latest[change["photo_id"]] = change["change_type"]
+    added = [p for p, op in latest.items() if op == "added"]
+    removed = [p for p, op in latest.items() if op == "removed"]
+    return added, removed
+
+
 # ==================== Album Service ====================
 
 
@@ -67,6 +79,8 @@ class AlbumService:
         self,
         repository: Optional[AlbumRepositoryProtocol] = None,
         event_bus=None,
+        mqtt_publisher: Optional[ManifestPublisherProtocol] = None,
+        manifest_batch_size: Optional[int] = None,
     ):
         """
         Initialize service with injected dependencies.
@@ -74,9 +88,18 @@ class AlbumService:
         Args:
             repository: Repository (inject mock for testing)
             event_bus: Event bus for publishing events
+            mqtt_publisher: Pushes album manifests to frames (optional)
+            manifest_batch_size: Photo IDs per manifest message
+                (ALBUM_SYNC_MANIFEST_BATCH_SIZE, default 500)
         """
         self.repo = repository  # Will be set by factory if None
         self.event_bus = event_bus
+        self.mqtt_publisher = mqtt_publisher
+        self.manifest_batch_size = max(
+            manifest_batch_size
+            or int(os.getenv("ALBUM_SYNC_MANIFEST_BATCH_SIZE", "500")),
+            1,
+        )
 
     # ==================== Album Lifecycle Operations ====================
 
@@ -559,6 +582,12 @@ class AlbumService:
         """
         Sync album to smart frame
 
+        The frame receives only the photos added/removed since its sync
+        cursor, or the full photo list on its first sync (or when the delta
+        would not be smaller), split into manifest parts of
+        ``manifest_batch_size`` photo IDs. The cursor advances only once
+        every part has been published.
+
         Args:
             album_id: Album ID
             user_id: User ID initiating sync
@@ -578,43 +607,93 @@ class AlbumService:
 
             # TODO: Validate frame_id exists and user has access via device_service
 
-            # Update sync status
-            status_data = {
-                "sync_status": SyncStatus.IN_PROGRESS.value,
-                "last_sync_timestamp": datetime.now(timezone.utc),
-                "sync_version": 1,
+            frame_id = request.frame_id
+            previous = await self.repo.get_album_sync_status(album_id, frame_id)
+            cursor = previous.sync_cursor if previous else None
+            sync_version = previous.sync_version if previous else 0
+            now = datetime.now(timezone.utc)
+
+            # Mark the sync first: once the frame has a status row, photo
+            # changes made while the manifest is built are logged for next time
+            await self.repo.update_album_sync_status(
+                album_id=album_id,
+                frame_id=frame_id,
+                user_id=user_id,
+                status_data={
+                    "sync_status": SyncStatus.IN_PROGRESS.value,
+                    "last_sync_timestamp": now,
+                    "error_message": None,
+                },
+            )
+
+            mode, added, removed, to_cursor = await self._build_manifest(album, cursor)
+
+            status_data: Dict[str, Any] = {
                 "total_photos": album.photo_count,
-                "synced_photos": 0,
-                "pending_photos": album.photo_count,
                 "failed_photos": 0,
-                "error_message": None,
             }
+            if mode == "delta" and not added and not removed:
+                # Frame is already up to date
+                status_data.update(
+                    sync_status=SyncStatus.COMPLETED.value,
+                    synced_photos=album.photo_count,
+                    pending_photos=0,
+                    sync_cursor=to_cursor,
+                )
+            elif self.mqtt_publisher is None:
+                status_data.update(
+                    sync_status=SyncStatus.PENDING.value,
+                    synced_photos=0,
+                    pending_photos=album.photo_count,
+                    error_message="MQTT publisher unavailable; manifest not sent",
+                )
+            elif await self._publish_manifest(
+                album,
+                frame_id,
+                mode,
+                added,
+                removed,
+                sync_version + 1,
+                cursor,
+                to_cursor,
+            ):
+                sync_version += 1
+                status_data.update(
+                    sync_status=(
+                        SyncStatus.IN_PROGRESS.value
+                        if added
+                        else SyncStatus.COMPLETED.value
+                    ),
+                    sync_version=sync_version,
+                    synced_photos=max(album.photo_count - len(added), 0),
+                    pending_photos=len(added),
+                    sync_cursor=to_cursor,
+                )
+            else:
+                status_data.update(
+                    sync_status=SyncStatus.FAILED.value,
+                    synced_photos=0,
+                    pending_photos=album.photo_count,
+                    error_message="Failed to publish album manifest",
+                )
 
             await self.repo.update_album_sync_status(
                 album_id=album_id,
-                frame_id=request.frame_id,
+                frame_id=frame_id,
                 user_id=user_id,
                 status_data=status_data,
             )
+            if "sync_cursor" in status_data:
+                await self.repo.prune_album_changes(album_id)
 
-            # Get updated sync status
             sync_status = await self.repo.get_album_sync_status(
-                album_id=album_id, frame_id=request.frame_id
+                album_id=album_id, frame_id=frame_id
             )
-
-            if not sync_status:
-                # If sync status wasn't created properly, return a default response
-                return AlbumSyncStatusResponse(
-                    album_id=album_id,
-                    frame_id=request.frame_id,
-                    sync_status=SyncStatus.IN_PROGRESS,
-                    total_photos=album.photo_count,
-                    synced_photos=0,
-                    pending_photos=album.photo_count,
-                    failed_photos=0,
-                    last_sync_timestamp=datetime.now(timezone.utc),
-                    error_message=None,
-                )
+            manifest_summary = {
+                "sync_mode": mode,
+                "added_photos": len(added),
+                "removed_photos": len(removed),
+            }
 
             # Publish album.synced event
             if self.event_bus:
@@ -625,9 +704,11 @@ class AlbumService:
                         data={
                             "album_id": album_id,
                             "user_id": user_id,
-                            "frame_id": request.frame_id,
-                            "sync_status": SyncStatus.IN_PROGRESS.value,
+                            "frame_id": frame_id,
+                            "sync_status": status_data["sync_status"],
+                            "sync_version": sync_version,
                             "total_photos": album.photo_count,
+                            **manifest_summary,
                             "timestamp": datetime.now(timezone.utc).isoformat(),
                         },
                     )
@@ -636,9 +717,30 @@ class AlbumService:
                 except Exception as e:
                     logger.error(f"Failed to publish album.synced event: {e}")
 
-            logger.info(f"Album sync initiated: {album_id} to frame {request.frame_id}")
+            logger.info(
+                f"Album sync ({mode}): {album_id} to frame {frame_id}, "
+                f"+{len(added)} -{len(removed)} photos"
+            )
 
-            return AlbumSyncStatusResponse.model_validate(sync_status.model_dump())
+            if not sync_status:
+                # If sync status wasn't stored properly, return it as computed
+                return AlbumSyncStatusResponse(
+                    album_id=album_id,
+                    frame_id=frame_id,
+                    sync_status=status_data["sync_status"],
+                    total_photos=album.photo_count,
+                    synced_photos=status_data["synced_photos"],
+                    pending_photos=status_data["pending_photos"],
+                    failed_photos=0,
+                    last_sync_timestamp=now,
+                    error_message=status_data.get("error_message"),
+                    sync_version=sync_version,
+                    **manifest_summary,
+                )
+
+            return AlbumSyncStatusResponse.model_validate(
+                {**sync_status.model_dump(), **manifest_summary}
+            )
 
         except AlbumNotFoundError:
             raise
@@ -646,6 +748,72 @@ class AlbumService:
             logger.error(f"Failed to sync album: {e}")
             raise AlbumServiceError(f"Failed to sync album: {str(e)}")
 
+    async def _build_manifest(
+        self, album: Album, cursor: Optional[int]
+    ) -> Tuple[str, List[str], List[str], int]:
+        """
+        Photos to add/remove on a frame whose sync cursor is ``cursor``
+
+        Returns:
+            (mode, added, removed, new cursor); mode is "delta", or "full"
+            when ``added`` is the whole album and the frame drops the rest
+        """
+        if cursor is not None:
+            # A change log longer than the album is better sent as a full list
+            limit = max(album.photo_count, self.manifest_batch_size) + 1
+            changes = await self.repo.get_album_changes(
+                album.album_id, cursor, limit=limit
+            )
+            if len(changes) < limit:
+                added, removed = _net_changes(changes)
+                if not changes or len(added) + len(removed) < album.photo_count:
+                    to_cursor = changes[-1]["change_id"] if changes else cursor
+                    return "delta", added, removed, to_cursor
+
+        # Read the log head before the photos so nothing falls between them
+        head = await self.repo.get_latest_album_change_id(album.album_id)
+        photo_ids = await self.repo.get_album_photo_ids(album.album_id)
+        return "full", photo_ids, [], head
+
+    async def _publish_manifest(
+        self,
+        album: Album,
+        frame_id: str,
+        mode: str,
+        added: List[str],
+        removed: List[str],
+        sync_version: int,
+        from_cursor: Optional[int],
+        to_cursor: int,
+    ) -> bool:
+        """Publish a manifest in parts, in order; stops at the first failure"""
+        items = [("removed", p) for p in removed] + [("added", p) for p in added]
+        size = self.manifest_batch_size
+        # A full manifest of an empty album still has to reach the frame
+        chunks = [items[i : i + size] for i in range(0, len(items), size)] or [[]]
+
+        for part, chunk in enumerate(chunks, start=1):
+            manifest = {
+                "mode": mode,
+                "sync_version": sync_version,
+                "from_cursor": from_cursor or 0,
+                "to_cursor": to_cursor,
+                "part": part,
+                "parts": len(chunks),
+                "total_photos": album.photo_count,
+                "added": [p for op, p in chunk if op == "added"],
+                "removed": [p for op, p in chunk if op == "removed"],
+            }
+            if not await self.mqtt_publisher.publish_album_manifest(
+                album.album_id, frame_id, manifest
+            ):
+                logger.error(
+                    f"Album manifest part {part}/{len(chunks)} for frame "
+                    f"{frame_id} was not published"
+                )
+                return False
+        return True
+
     async def get_album_sync_status(
         self, album_id: str, frame_id: str, user_id: str
     ) -> AlbumSyncStatusResponse:
@@ -73,7 +73,7 @@ class AlbumEventHandler:
 
             if album_id:
                 # Add photo to specified album
-                await self.album_repo.add_photo_to_album(album_id, file_id, user_id)
+                await self.album_repo.add_photos_to_album(album_id, [file_id], user_id)
                 logger.info(f"Added photo {file_id} to specified album {album_id}")
 
                 # Publish MQTT notification
@@ -107,7 +107,7 @@ class AlbumEventHandler:
                     default_album = await self.album_service.get_or_create_default_album(user_id)
                     if default_album:
                         album_id = default_album.get('album_id')
-                        await self.album_repo.add_photo_to_album(album_id, file_id, user_id)
+                        await self.album_repo.add_photos_to_album(album_id, [file_id], user_id)
                         logger.info(f"Added photo {file_id} to default album {album_id}")
 
                         # Publish MQTT notification
@@ -18,6 +18,7 @@ from .album_service import AlbumService
 def create_album_service(
     config: Optional[ConfigManager] = None,
     event_bus=None,
+    mqtt_publisher=None,
 ) -> AlbumService:
     """
     Create AlbumService with real dependencies.
@@ -28,6 +29,7 @@ def create_album_service(
     Args:
         config: Optional ConfigManager instance
         event_bus: Optional event bus for publishing events
+        mqtt_publisher: Optional AlbumMQTTPublisher for frame manifests
 
     Returns:
         AlbumService: Configured service instance with real repository
@@ -40,4 +42,5 @@ def create_album_service(
     return AlbumService(
         repository=repository,
         event_bus=event_bus,
+        mqtt_publisher=mqtt_publisher,
     )
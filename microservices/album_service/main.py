@@ -22,6 +22,7 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -103,6 +104,7 @@ async def lifespan(app: FastAPI):
     album_service = create_album_service(
         config=config_manager,
         event_bus=event_bus,
+        mqtt_publisher=mqtt_publisher,
     )
 
     # Check database connection
@@ -226,6 +228,7 @@ async def lifespan(app: FastAPI):
             logger.error(f"Error closing event bus: {e}")
 
     logger.info("Album Service stopped")
+    close_discovery_caches()
 
 
 # Initialize FastAPI app
@@ -0,0 +1,34 @@
+-- Album Service Migration: Photo change log and per-frame sync cursors
+-- Version: 002
+-- Date: 2026-10-19
+-- Description: Record album photo adds/removes so frames receive only the
+--              photos that changed since their last sync instead of the
+--              whole album
+
+-- ====================
+-- Album Photo Change Log
+-- ====================
+-- Written by the same statement that adds/removes album photos, and only for
+-- albums that have at least one synced frame. Rows every frame of the album
+-- has already received are pruned after each sync.
+CREATE TABLE IF NOT EXISTS album.album_photo_changes (
+    change_id BIGSERIAL PRIMARY KEY,
+    album_id VARCHAR(255) NOT NULL,
+    photo_id VARCHAR(255) NOT NULL, -- References storage.storage_files.file_id (no FK)
+    change_type VARCHAR(20) NOT NULL CHECK (change_type IN ('added', 'removed')),
+    changed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_album_photo_changes_album_change
+    ON album.album_photo_changes(album_id, change_id);
+
+-- ====================
+-- Per-frame Sync Cursor
+-- ====================
+-- Highest change_id delivered to the frame; NULL until a manifest has been
+-- delivered, in which case the next sync sends the full manifest
+ALTER TABLE album.album_sync_status
+    ADD COLUMN IF NOT EXISTS sync_cursor BIGINT;
+
+COMMENT ON TABLE album.album_photo_changes IS 'Album photo add/remove log for delta frame sync';
+COMMENT ON COLUMN album.album_sync_status.sync_cursor IS 'Last album_photo_changes.change_id delivered to the frame';
@@ -118,6 +118,7 @@ class AlbumSyncStatus(BaseModel):
     failed_photos: int = 0
     sync_status: SyncStatus = SyncStatus.PENDING
     error_message: Optional[str] = None
+    sync_cursor: Optional[int] = None  # None until a manifest was delivered
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -231,6 +232,10 @@ class AlbumSyncStatusResponse(BaseModel):
     failed_photos: int
     last_sync_timestamp: Optional[datetime]
     error_message: Optional[str]
+    sync_version: int = 0
+    sync_mode: Optional[str] = Field(None, description="Last manifest sent: full or delta")
+    added_photos: int = Field(0, description="Photos added on the frame by the last manifest")
+    removed_photos: int = Field(0, description="Photos removed from the frame by the last manifest")
 
     class Config:
         from_attributes = True
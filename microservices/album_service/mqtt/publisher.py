@@ -219,6 +219,57 @@ class AlbumMQTTPublisher:
             logger.error(f"Failed to publish album_sync MQTT event: {e}")
             return False
 
+    async def publish_album_manifest(
+        self,
+        album_id: str,
+        frame_id: str,
+        manifest: Dict[str, Any],
+    ) -> bool:
+        """
+        Publish one part of an album manifest (photo ID diff) to a frame
+
+        Topic: frames/{frame_id}/sync
+        QoS: 2 (exactly once delivery)
+        Retained: False (a manifest spans several parts; the frame's sync
+        cursor, not the broker, decides what is resent)
+
+        Args:
+            album_id: Album ID
+            frame_id: Frame/device ID
+            manifest: mode (full/delta), sync_version, from_cursor, to_cursor,
+                part, parts, added and removed photo IDs
+
+        Returns:
+            True if published successfully
+        """
+        try:
+            await self._ensure_connected()
+
+            message = {
+                "event_type": "album_manifest",
+                "album_id": album_id,
+                "frame_id": frame_id,
+                **manifest,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+            topic = f"frames/{frame_id}/sync"
+            success = await self.mqtt_bus.publish_json(
+                topic, message, qos=2, retained=False
+            )
+
+            if success:
+                logger.info(
+                    f"Published MQTT album_manifest part {manifest.get('part')}/"
+                    f"{manifest.get('parts')} to {topic}"
+                )
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to publish album_manifest MQTT event: {e}")
+            return False
+
     async def publish_frame_command(
         self,
         frame_id: str,
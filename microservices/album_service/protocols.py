@@ -124,6 +124,26 @@ class AlbumRepositoryProtocol(Protocol):
         """List album sync statuses with optional filters"""
         ...
 
+    # ==================== Photo Change Log Operations ====================
+
+    async def get_album_photo_ids(self, album_id: str) -> List[str]:
+        """All photo IDs of an album in display order"""
+        ...
+
+    async def get_album_changes(
+        self, album_id: str, after_change_id: int, limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """Photo adds/removes of an album after a sync cursor"""
+        ...
+
+    async def get_latest_album_change_id(self, album_id: str) -> int:
+        """Newest change_id logged for an album"""
+        ...
+
+    async def prune_album_changes(self, album_id: str) -> int:
+        """Delete changes every synced frame has received"""
+        ...
+
     # ==================== Event Handler Methods ====================
 
     async def remove_photo_from_all_albums(self, photo_id: str) -> int:
@@ -148,3 +168,14 @@ class EventBusProtocol(Protocol):
     async def publish_event(self, event: Any) -> None:
         """Publish an event"""
         ...
+
+
+@runtime_checkable
+class ManifestPublisherProtocol(Protocol):
+    """Interface for pushing album manifests to frames - no I/O imports"""
+
+    async def publish_album_manifest(
+        self, album_id: str, frame_id: str, manifest: Dict[str, Any]
+    ) -> bool:
+        """Publish one manifest part to a frame"""
+        ...
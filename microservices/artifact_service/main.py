@@ -32,6 +32,7 @@ from core.logger import setup_service_logger
 from core.metrics import setup_metrics
 from core.nats_client import get_event_bus
 from core.rate_limiter import InMemoryBackend, RateLimitConfig, SlidingWindowCounter
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .factory import create_artifact_service
@@ -234,6 +235,7 @@ async def lifespan(app: FastAPI):
     if event_bus:
         await event_bus.close()
     logger.info("Artifact Service shut down cleanly")
+    close_discovery_caches()
 
 
 app = FastAPI(
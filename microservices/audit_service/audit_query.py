@@ -0,0 +1,166 @@
+"""
+Audit Query Helpers
+
+Pure helpers shared by the audit repository and service for event queries:
+
+- filter pushdown: every ``AuditQueryRequest`` filter becomes a SQL predicate
+- keyset cursors over ``(event_timestamp, event_id)`` so deep pages cost the
+  same as the first one (no OFFSET scan)
+- count modes: ``exact`` (COUNT(*)), ``estimated`` (planner row estimate,
+  upgraded to an exact count when the estimate is small) and ``none``
+
+No I/O here - safe to import from the service layer.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+COUNT_MODES = ("exact", "estimated", "none")
+
+# Below this planner estimate an exact COUNT(*) is cheap enough to run.
+EXACT_COUNT_THRESHOLD = 10_000
+
+# Rows per batch when streaming an export.
+EXPORT_BATCH_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded or does not match the query"""
+
+
+@dataclass(frozen=True)
+class AuditCursor:
+    """Position after the last returned row: ``(event_timestamp, event_id)``."""
+
+    timestamp: datetime
+    event_id: str
+    sort_order: str = "desc"
+
+    def encode(self) -> str:
+        payload = json.dumps(
+            [self.timestamp.isoformat(), self.event_id, self.sort_order],
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "AuditCursor":
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            timestamp, event_id, sort_order = json.loads(
+                base64.urlsafe_b64decode(padded.encode())
+            )
+            return cls(datetime.fromisoformat(timestamp), str(event_id), sort_order)
+        except Exception as e:
+            raise InvalidCursorError(f"Invalid audit cursor: {e}") from e
+
+
+def _value(item: Any) -> Any:
+    return getattr(item, "value", item)
+
+
+def _get(query: Any, name: str, default: Any = None) -> Any:
+    if isinstance(query, dict):
+        return query.get(name, default)
+    return getattr(query, name, default)
+
+
+def sort_direction(query: Any) -> str:
+    """Normalised ``ASC``/``DESC`` for the query's sort order."""
+    return (
+        "ASC" if str(_get(query, "sort_order") or "desc").lower() == "asc" else "DESC"
+    )
+
+
+def build_event_filters(query: Any) -> Tuple[List[str], List[Any]]:
+    """Translate an ``AuditQueryRequest`` (or dict) into SQL predicates.
+
+    Returns ``(conditions, params)`` with ``$n`` placeholders numbered from 1.
+    List filters use ``= ANY($n)`` so each stays a single parameter.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+
+    def add(template: str, value: Any) -> None:
+        params.append(value)
+        conditions.append(template.format(p=f"${len(params)}"))
+
+    list_filters = (
+        ("event_types", "event_type"),
+        ("categories", "event_category"),
+        ("severities", "event_severity"),
+    )
+    for field_name, column in list_filters:
+        values = _get(query, field_name)
+        if values:
+            add(f"{column} = ANY({{p}})", [_value(v) for v in values])
+
+    # Single event_type (legacy dict queries)
+    event_type = _get(query, "event_type")
+    if event_type:
+        add("event_type = {p}", _value(event_type))
+
+    for column in ("user_id", "organization_id", "resource_type", "ip_address"):
+        value = _get(query, column)
+        if value:
+            add(f"{column} = {{p}}", value)
+
+    start_time = _get(query, "start_time")
+    if start_time:
+        add("event_timestamp >= {p}", start_time)
+    end_time = _get(query, "end_time")
+    if end_time:
+        add("event_timestamp <= {p}", end_time)
+
+    if _get(query, "success_only"):
+        add("event_status = {p}", "success")
+    elif _get(query, "failure_only"):
+        add("event_status = ANY({p})", ["failure", "error"])
+
+    tags = _get(query, "tags")
+    if tags:
+        add("tags && {p}::text[]", list(tags))
+
+    return conditions, params
+
+
+def keyset_condition(cursor: AuditCursor, direction: str, next_param: int) -> str:
+    """Row-value comparison that resumes strictly after ``cursor``.
+
+    The plain ``event_timestamp`` bound is redundant for correctness but
+    lets the planner prune monthly partitions, which it cannot do from the
+    row-value comparison alone.
+    """
+    op = "<" if direction == "DESC" else ">"
+    ts, event_id = f"${next_param}", f"${next_param + 1}"
+    return (
+        f"event_timestamp {op}= {ts} "
+        f"AND (event_timestamp, event_id) {op} ({ts}, {event_id})"
+    )
+
+
+def resolve_cursor(query: Any) -> Optional[AuditCursor]:
+    """Decode the query's cursor and check it matches the sort order."""
+    token = _get(query, "cursor")
+    if not token:
+        return None
+    cursor = AuditCursor.decode(token)
+    if cursor.sort_order.upper() != sort_direction(query):
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    return cursor
+
+
+__all__ = [
+    "COUNT_MODES",
+    "EXACT_COUNT_THRESHOLD",
+    "EXPORT_BATCH_SIZE",
+    "AuditCursor",
+    "InvalidCursorError",
+    "build_event_filters",
+    "keyset_condition",
+    "resolve_cursor",
+    "sort_direction",
+]
@@ -4,11 +4,13 @@ Audit Repository - Async Version
 Data access layer for audit service using AsyncPostgresClient.
 """
 
+import json
 import logging
 import os
+import re
 import sys
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+from datetime import datetime, timedelta, timezone
 
 sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,6 +18,16 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.stat_rollups import CounterRollup, RollupSpec
+from .audit_query import (
+    EXACT_COUNT_THRESHOLD,
+    EXPORT_BATCH_SIZE,
+    AuditCursor,
+    build_event_filters,
+    keyset_condition,
+    resolve_cursor,
+    sort_direction,
+)
 from .models import (
     AuditEvent,
     SecurityEvent,
@@ -41,6 +53,39 @@ def _pg_min_pool() -> int:
 
 logger = logging.getLogger(__name__)
 
+# Monthly partitions of audit_events are named audit_events_pYYYYMM
+# (see migrations/005_partition_audit_events.sql).
+_PARTITION_NAME = re.compile(r"^audit_events_p(\d{4})(\d{2})$")
+
+# Values written by the original column defaults (migration 001/005) before
+# migration 006 rewrote them; mapped so old rows stay readable
+_LEGACY_SEVERITIES = {
+    "debug": EventSeverity.LOW,
+    "info": EventSeverity.LOW,
+    "warning": EventSeverity.MEDIUM,
+    "error": EventSeverity.HIGH,
+}
+_LEGACY_STATUSES = {
+    "completed": EventStatus.SUCCESS,
+    "failed": EventStatus.FAILURE,
+    "initiated": EventStatus.PENDING,
+    "in_progress": EventStatus.PENDING,
+}
+
+# How many months of partitions to keep created ahead of now.
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _partition_bounds(name: str) -> Optional[Tuple[datetime, datetime]]:
+    """``[start, end)`` of a monthly partition, or None for other tables."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
 
 class AuditRepository:
     """Audit data repository - AsyncPostgresClient"""
@@ -68,6 +113,26 @@ class AuditRepository:
         self.schema = "audit"
         self.audit_events_table = "audit_events"
 
+        # Dashboard counters (core.stat_rollups); reconciled by main.lifespan
+        self.events_rollup = CounterRollup(
+            self.db,
+            RollupSpec(
+                name="audit_events",
+                source_table=f"{self.schema}.{self.audit_events_table}",
+                time_column="event_timestamp",
+                dimensions={
+                    "event_severity": "event_severity",
+                    "event_status": "event_status",
+                },
+            ),
+            schema=self.schema,
+        )
+
+    @property
+    def stat_rollups(self) -> List[CounterRollup]:
+        """Counter rollups maintained for this repository's statistics"""
+        return [self.events_rollup]
+
     async def check_connection(self) -> bool:
         """Check database connection"""
         try:
@@ -116,6 +181,56 @@ class AuditRepository:
 
         return [] if expected_type == "list" else None
 
+    def _row_to_event(self, row: Dict[str, Any]) -> AuditEvent:
+        """Convert an audit_events row to an AuditEvent"""
+        return AuditEvent(
+            id=row.get("event_id"),
+            event_type=EventType(row.get("event_type")),
+            category=AuditCategory(row.get("event_category")),
+            severity=_LEGACY_SEVERITIES.get(row.get("event_severity"))
+            or EventSeverity(row.get("event_severity")),
+            status=_LEGACY_STATUSES.get(row.get("event_status"))
+            or EventStatus(row.get("event_status")),
+            action=row.get("action"),
+            description=row.get("description"),
+            user_id=row.get("user_id"),
+            session_id=row.get("session_id"),
+            organization_id=row.get("organization_id"),
+            resource_type=row.get("resource_type"),
+            resource_id=row.get("resource_id"),
+            resource_name=row.get("resource_name"),
+            ip_address=row.get("ip_address"),
+            user_agent=row.get("user_agent"),
+            api_endpoint=row.get("api_endpoint"),
+            http_method=row.get("http_method"),
+            success=row.get("success", True),
+            error_code=row.get("error_code"),
+            error_message=row.get("error_message"),
+            metadata=self._parse_json_field(row.get("metadata"), expected_type="dict"),
+            tags=row.get("tags"),
+            timestamp=row.get("event_timestamp"),
+            retention_policy=row.get("retention_policy"),
+            compliance_flags=self._parse_json_field(
+                row.get("compliance_flags"), expected_type="list"
+            ),
+        )
+
+    def _rows_to_events(self, rows: List[Dict[str, Any]]) -> List[AuditEvent]:
+        """Convert one page of rows; raises ValueError on a row that does not parse
+
+        A page is never returned short: skipping a row would hide it from
+        an export and break has_more / cursor accounting, which count rows.
+        """
+        events = []
+        for row in rows:
+            try:
+                events.append(self._row_to_event(row))
+            except Exception as e:
+                raise ValueError(
+                    f"Unreadable audit event {row.get('event_id')}: {e}"
+                ) from e
+        return events
+
     async def create_audit_event(self, event: AuditEvent) -> Optional[AuditEvent]:
         """Create audit event"""
         try:
@@ -166,43 +281,124 @@ class AuditRepository:
 
             if results and len(results) > 0:
                 row = results[0]
-                return AuditEvent(
-                    id=row.get("event_id"),
-                    event_type=EventType(row.get("event_type")),
-                    category=AuditCategory(row.get("event_category")),
-                    severity=EventSeverity(row.get("event_severity")),
-                    status=EventStatus(row.get("event_status")),
-                    action=row.get("action"),
-                    description=row.get("description"),
-                    user_id=row.get("user_id"),
-                    session_id=row.get("session_id"),
-                    organization_id=row.get("organization_id"),
-                    resource_type=row.get("resource_type"),
-                    resource_id=row.get("resource_id"),
-                    resource_name=row.get("resource_name"),
-                    ip_address=row.get("ip_address"),
-                    user_agent=row.get("user_agent"),
-                    api_endpoint=row.get("api_endpoint"),
-                    http_method=row.get("http_method"),
-                    success=row.get("success", True),
-                    error_code=row.get("error_code"),
-                    error_message=row.get("error_message"),
-                    metadata=self._parse_json_field(
-                        row.get("metadata"), expected_type="dict"
-                    ),
-                    tags=row.get("tags"),
-                    timestamp=row.get("event_timestamp"),
-                    retention_policy=row.get("retention_policy"),
-                    compliance_flags=self._parse_json_field(
-                        row.get("compliance_flags"), expected_type="list"
-                    ),
+                await self.events_rollup.increment(
+                    {
+                        "event_severity": event.severity.value,
+                        "event_status": event.status.value,
+                    },
+                    at=event.timestamp,
                 )
+                return self._row_to_event(row)
             return None
 
         except Exception as e:
             logger.error(f"Error creating audit event: {e}", exc_info=True)
             return None
 
+    async def create_audit_events(self, events: List[AuditEvent]) -> bool:
+        """Insert a batch of audit events in one statement.
+
+        Rows travel as a single JSON array expanded server-side by
+        jsonb_to_recordset, so the statement size does not depend on the
+        batch size. Rows already present (a retried batch) are skipped and
+        not counted again in the stats rollup. Returns True once the batch
+        is committed.
+        """
+        if not events:
+            return True
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            payload = [
+                {
+                    "event_id": event.id,
+                    "event_type": event.event_type.value,
+                    "event_category": event.category.value,
+                    "event_severity": event.severity.value,
+                    "event_status": event.status.value,
+                    "user_id": event.user_id,
+                    "organization_id": event.organization_id,
+                    "session_id": event.session_id,
+                    "ip_address": event.ip_address,
+                    "user_agent": event.user_agent,
+                    "action": event.action,
+                    "resource_type": event.resource_type,
+                    "resource_id": event.resource_id,
+                    "resource_name": event.resource_name,
+                    "error_message": event.error_message,
+                    "compliance_flags": event.compliance_flags or [],
+                    "metadata": event.metadata or {},
+                    "tags": event.tags,
+                    "event_timestamp": event.timestamp.isoformat(),
+                    "created_at": now,
+                }
+                for event in events
+            ]
+
+            query = f"""
+                INSERT INTO {self.schema}.{self.audit_events_table} (
+                    event_id, event_type, event_category, event_severity, event_status,
+                    user_id, organization_id, session_id, ip_address, user_agent,
+                    action, resource_type, resource_id, resource_name,
+                    error_message, changes_made, risk_score, threat_indicators,
+                    compliance_flags, metadata, tags, event_timestamp, created_at
+                )
+                SELECT
+                    r.event_id, r.event_type, r.event_category, r.event_severity, r.event_status,
+                    r.user_id, r.organization_id, r.session_id, r.ip_address, r.user_agent,
+                    r.action, r.resource_type, r.resource_id, r.resource_name,
+                    r.error_message, '{{}}'::jsonb, 0.0, '[]'::jsonb,
+                    r.compliance_flags, r.metadata, r.tags, r.event_timestamp, r.created_at
+                FROM jsonb_to_recordset($1::jsonb) AS r(
+                    event_id VARCHAR, event_type VARCHAR, event_category VARCHAR,
+                    event_severity VARCHAR, event_status VARCHAR,
+                    user_id VARCHAR, organization_id VARCHAR, session_id VARCHAR,
+                    ip_address VARCHAR, user_agent TEXT,
+                    action VARCHAR, resource_type VARCHAR, resource_id VARCHAR,
+                    resource_name VARCHAR, error_message TEXT,
+                    compliance_flags JSONB, metadata JSONB, tags TEXT[],
+                    event_timestamp TIMESTAMPTZ, created_at TIMESTAMPTZ
+                )
+                ON CONFLICT (event_id, event_timestamp) DO NOTHING
+                RETURNING event_id
+            """
+
+            async with self.db:
+                inserted = await self.db.query(
+                    query, params=[json.dumps(payload, default=str)]
+                )
+            if inserted is None:
+                return False
+
+            # Only rows this statement inserted; redelivered ones are skipped
+            new_ids = {row["event_id"] for row in inserted}
+            new_events = []
+            for event in events:
+                if event.id in new_ids:
+                    new_ids.discard(event.id)
+                    new_events.append(event)
+            if not new_events:
+                return True
+
+            await self.events_rollup.increment_many(
+                (
+                    {
+                        "event_severity": event.severity.value,
+                        "event_status": event.status.value,
+                    },
+                    event.timestamp,
+                    1,
+                    0.0,
+                )
+                for event in new_events
+            )
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Error creating audit event batch ({len(events)} events): {e}"
+            )
+            return False
+
     async def get_audit_events(
         self,
         user_id: Optional[str] = None,
@@ -214,55 +410,17 @@ class AuditRepository:
         offset: int = 0,
     ) -> List[AuditEvent]:
         """Get audit events list"""
-        try:
-            conditions = []
-            params = []
-            param_count = 0
-
-            if user_id:
-                param_count += 1
-                conditions.append(f"user_id = ${param_count}")
-                params.append(user_id)
-
-            if organization_id:
-                param_count += 1
-                conditions.append(f"organization_id = ${param_count}")
-                params.append(organization_id)
-
-            if event_type:
-                param_count += 1
-                conditions.append(f"event_type = ${param_count}")
-                params.append(event_type.value)
-
-            if start_time:
-                param_count += 1
-                conditions.append(f"event_timestamp >= ${param_count}")
-                params.append(start_time)
-
-            if end_time:
-                param_count += 1
-                conditions.append(f"event_timestamp <= ${param_count}")
-                params.append(end_time)
-
-            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-
-            query = f"""
-                SELECT * FROM {self.schema}.{self.audit_events_table}
-                {where_clause}
-                ORDER BY event_timestamp DESC
-                LIMIT ${param_count + 1} OFFSET ${param_count + 2}
-            """
-
-            params.extend([limit, offset])
-
-            async with self.db:
-                results = await self.db.query(query, params=params)
-
-            return [AuditEvent(**event) for event in results] if results else []
-
-        except Exception as e:
-            logger.error(f"Error getting audit events: {e}")
-            return []
+        return await self.query_audit_events(
+            {
+                "user_id": user_id,
+                "organization_id": organization_id,
+                "event_type": event_type,
+                "start_time": start_time,
+                "end_time": end_time,
+                "limit": limit,
+                "offset": offset,
+            }
+        )
 
     async def get_security_events_by_severity(
         self, severity: Optional[EventSeverity] = None, limit: int = 100
@@ -280,6 +438,18 @@ class AuditRepository:
         end_time: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """Get audit statistics"""
+        if not organization_id:
+            try:
+                snapshot = await self.events_rollup.snapshot(start_time, end_time)
+                return {
+                    "total_events": snapshot.total,
+                    "critical_events": snapshot.count("event_severity", "critical"),
+                    "error_events": snapshot.count("event_severity", "error"),
+                    "failed_events": snapshot.count("event_status", "failed"),
+                }
+            except Exception as e:
+                logger.warning(f"Audit rollup unavailable, scanning events: {e}")
+
         try:
             conditions = []
             params = []
@@ -334,24 +504,148 @@ class AuditRepository:
                 "failed_events": 0,
             }
 
-    async def query_audit_events(self, query: Dict[str, Any]) -> List[AuditEvent]:
-        """Query audit events (alias method)"""
+    # ====================
+    # Query engine
+    # ====================
+
+    @staticmethod
+    def _query_dict(query: Any) -> Dict[str, Any]:
         if hasattr(query, "model_dump"):
-            query_dict = query.model_dump()
-        elif hasattr(query, "dict"):
-            query_dict = query.dict()
-        else:
-            query_dict = query
-
-        return await self.get_audit_events(
-            user_id=query_dict.get("user_id"),
-            organization_id=query_dict.get("organization_id"),
-            event_type=query_dict.get("event_type"),
-            start_time=query_dict.get("start_time"),
-            end_time=query_dict.get("end_time"),
-            limit=query_dict.get("limit", 100),
-            offset=query_dict.get("offset", 0),
-        )
+            return query.model_dump()
+        if hasattr(query, "dict"):
+            return query.dict()
+        return dict(query or {})
+
+    async def _fetch_event_rows(
+        self,
+        query: Dict[str, Any],
+        cursor: Optional[AuditCursor],
+        limit: int,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """One page of rows in (event_timestamp, event_id) order; raises on DB error"""
+        conditions, params = build_event_filters(query)
+        direction = sort_direction(query)
+
+        if cursor is not None:
+            conditions.append(keyset_condition(cursor, direction, len(params) + 1))
+            params.extend([cursor.timestamp, cursor.event_id])
+            offset = 0
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        sql = f"""
+            SELECT * FROM {self.schema}.{self.audit_events_table}
+            {where_clause}
+            ORDER BY event_timestamp {direction}, event_id {direction}
+            LIMIT ${len(params)}
+        """
+        if offset:
+            params.append(offset)
+            sql += f" OFFSET ${len(params)}"
+
+        async with self.db:
+            rows = await self.db.query(sql, params=params)
+        if rows is None:
+            raise RuntimeError("audit event query failed")
+        return rows
+
+    async def query_audit_events(
+        self, query: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[AuditEvent]:
+        """Query audit events with every filter pushed down to SQL.
+
+        Pages by keyset when ``query['cursor']`` is set, otherwise by
+        ``offset``. ``limit`` overrides ``query['limit']`` (the service asks
+        for one extra row to detect a further page). Raises on database
+        errors and unreadable rows.
+        """
+        query_dict = self._query_dict(query)
+        try:
+            cursor = resolve_cursor(query_dict)
+            rows = await self._fetch_event_rows(
+                query_dict,
+                cursor,
+                limit if limit is not None else query_dict.get("limit") or 100,
+                query_dict.get("offset") or 0,
+            )
+            return self._rows_to_events(rows)
+        except Exception as e:
+            # An empty page would read as "no more events"; let it fail
+            logger.error(f"Error querying audit events: {e}")
+            raise
+
+    async def count_audit_events(
+        self, query: Dict[str, Any], mode: str = "estimated"
+    ) -> Tuple[Optional[int], bool]:
+        """Count rows matching ``query``'s filters.
+
+        Returns ``(count, is_estimate)``. ``estimated`` uses the planner's
+        row estimate and only runs COUNT(*) when that estimate is below
+        ``EXACT_COUNT_THRESHOLD``. ``none`` skips counting. ``(None, False)``
+        on error.
+        """
+        if mode == "none":
+            return None, False
+
+        conditions, params = build_event_filters(self._query_dict(query))
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        from_clause = f"FROM {self.schema}.{self.audit_events_table} {where_clause}"
+
+        try:
+            async with self.db:
+                if mode == "estimated":
+                    plan_row = await self.db.query_row(
+                        f"EXPLAIN (FORMAT JSON) SELECT 1 {from_clause}", params=params
+                    )
+                    estimate = self._plan_rows(plan_row)
+                    if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                        return estimate, True
+
+                row = await self.db.query_row(
+                    f"SELECT COUNT(*) AS count {from_clause}", params=params
+                )
+            return (int(row["count"]), False) if row else (None, False)
+        except Exception as e:
+            logger.error(f"Error counting audit events: {e}")
+            return None, False
+
+    @staticmethod
+    def _plan_rows(plan_row: Optional[Dict[str, Any]]) -> Optional[int]:
+        """Extract the top-level row estimate from EXPLAIN (FORMAT JSON)"""
+        if not plan_row:
+            return None
+        plan = next(iter(plan_row.values()))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        try:
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+
+    async def stream_audit_events(
+        self, query: Dict[str, Any], batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[AuditEvent]:
+        """Yield every matching event in keyset-paged batches.
+
+        Ignores ``limit``/``offset``; starts after ``query['cursor']`` if
+        set. Raises on database errors and unreadable rows so an export is
+        never silently truncated.
+        """
+        query_dict = self._query_dict(query)
+        direction = sort_direction(query_dict)
+        cursor = resolve_cursor(query_dict)
+
+        while True:
+            rows = await self._fetch_event_rows(query_dict, cursor, batch_size)
+            for event in self._rows_to_events(rows):
+                yield event
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+            cursor = AuditCursor(
+                last["event_timestamp"], last["event_id"], direction.lower()
+            )
 
     async def get_user_activities(
         self, user_id: str, days: int = 30, limit: int = 100
@@ -483,22 +777,108 @@ class AuditRepository:
             organization_id=None, start_time=start_time, end_time=None
         )
 
-    async def cleanup_old_events(self, retention_days: int = 365) -> int:
-        """Cleanup old events"""
+    # ====================
+    # Partition maintenance
+    # ====================
+
+    async def ensure_partitions(
+        self, months_ahead: int = PARTITION_MONTHS_AHEAD
+    ) -> int:
+        """Create monthly partitions from this month to ``months_ahead`` ahead.
+
+        Idempotent; returns the number of partitions created.
+        """
         try:
-            from datetime import timedelta
+            async with self.db:
+                row = await self.db.query_row(
+                    f"SELECT {self.schema}.create_audit_event_partitions("
+                    f"CURRENT_DATE, $1) AS created",
+                    params=[months_ahead],
+                )
+            created = int(row["created"]) if row else 0
+            if created:
+                logger.info(f"Created {created} audit event partition(s)")
+            return created
+        except Exception as e:
+            logger.error(f"Error creating audit event partitions: {e}")
+            return 0
 
-            cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    async def list_partitions(self) -> List[Dict[str, Any]]:
+        """Monthly partitions with their bounds and planner row estimates"""
+        query = """
+            SELECT c.relname AS partition_name,
+                   GREATEST(c.reltuples, 0)::bigint AS estimated_rows
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            JOIN pg_namespace n ON n.oid = p.relnamespace
+            WHERE n.nspname = $1 AND p.relname = $2
+        """
+        async with self.db:
+            rows = await self.db.query(
+                query, params=[self.schema, self.audit_events_table]
+            )
 
-            query = f"""
-                DELETE FROM {self.schema}.{self.audit_events_table}
-                WHERE event_timestamp < $1
-            """
+        partitions = []
+        for row in rows or []:
+            bounds = _partition_bounds(row["partition_name"])
+            if bounds:
+                partitions.append(
+                    {
+                        "partition_name": row["partition_name"],
+                        "range_start": bounds[0],
+                        "range_end": bounds[1],
+                        "estimated_rows": row["estimated_rows"],
+                    }
+                )
+        return sorted(partitions, key=lambda p: p["range_start"])
 
+    async def cleanup_old_events(self, retention_days: int = 365) -> int:
+        """Drop monthly partitions that lie entirely before the retention cutoff.
+
+        Retention is partition-granular: a month is removed once its last
+        day is older than ``retention_days``. Each partition is detached and
+        dropped in its own short transaction, so there is no row-by-row
+        DELETE, no bloat and no long lock. Returns the (estimated) number of
+        events removed.
+        """
+        try:
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
+            removed = 0
+
+            for partition in await self.list_partitions():
+                if partition["range_end"] > cutoff_date:
+                    break
+                name = partition["partition_name"]
+                async with self.db:
+                    dropped = await self.db.execute_in_transaction(
+                        [
+                            {
+                                "sql": f"ALTER TABLE {self.schema}.{self.audit_events_table} "
+                                f"DETACH PARTITION {self.schema}.{name}",
+                                "params": [],
+                            },
+                            {"sql": f"DROP TABLE {self.schema}.{name}", "params": []},
+                        ],
+                        schema=self.schema,
+                    )
+                if not dropped:
+                    logger.error(f"Failed to drop audit partition {name}")
+                    break
+                logger.info(
+                    f"Dropped audit partition {name} ({partition['estimated_rows']} events)"
+                )
+                removed += partition["estimated_rows"]
+
+            # Stragglers that landed in the DEFAULT partition are few; delete them
             async with self.db:
-                count = await self.db.execute(query, params=[cutoff_date])
+                count = await self.db.execute(
+                    f"DELETE FROM {self.schema}.{self.audit_events_table}_default "
+                    f"WHERE event_timestamp < $1",
+                    params=[cutoff_date],
+                )
 
-            return count if count else 0
+            return removed + (count if count else 0)
 
         except Exception as e:
             logger.error(f"Error cleaning up old events: {e}")
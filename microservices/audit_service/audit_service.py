@@ -9,12 +9,13 @@ Uses dependency injection for testability:
 
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, AsyncIterator, TYPE_CHECKING
 
 from datetime import datetime, timedelta
 
 # Import protocols (no I/O dependencies) - NOT the concrete repository!
-from .protocols import AuditRepositoryProtocol
+from .protocols import AuditRepositoryProtocol, AuditServiceError, AuditValidationError
+from .audit_query import COUNT_MODES, AuditCursor, InvalidCursorError, resolve_cursor
 from .models import (
     AuditEvent,
     UserActivity,
@@ -35,7 +36,7 @@ from .models import (
 
 # Type checking imports (not executed at runtime)
 if TYPE_CHECKING:
-    pass
+    from .audit_writer import BufferedAuditWriter
 
 logger = logging.getLogger(__name__)
 
@@ -47,14 +48,21 @@ class AuditService:
     not created internally.
     """
 
-    def __init__(self, repository: Optional[AuditRepositoryProtocol] = None):
+    def __init__(
+        self,
+        repository: Optional[AuditRepositoryProtocol] = None,
+        writer: Optional["BufferedAuditWriter"] = None,
+    ):
         """
         Initialize service with injected dependencies.
 
         Args:
             repository: Repository (inject mock for testing)
+            writer: Optional batching writer; when set, log_event writes
+                through it instead of one INSERT per event
         """
         self.repository = repository  # Will be set by factory if None
+        self.writer = writer
 
         # 风险评分配置
         self.risk_thresholds = {"low": 30, "medium": 60, "high": 80, "critical": 95}
@@ -126,7 +134,10 @@ class AuditService:
             await self._apply_compliance_policies(audit_event)
 
             # 保存到数据库
-            created_event = await self.repository.create_audit_event(audit_event)
+            if self.writer:
+                created_event = await self.writer.submit(audit_event)
+            else:
+                created_event = await self.repository.create_audit_event(audit_event)
             if not created_event:
                 logger.error("保存审计事件失败")
                 return None
@@ -157,39 +168,40 @@ class AuditService:
             return None
 
     async def query_events(self, query: AuditQueryRequest) -> AuditQueryResponse:
-        """查询审计事件"""
+        """查询审计事件
+
+        Keyset-paged: pass ``page_info.next_cursor`` back as ``cursor`` for
+        the next page. ``total_count`` follows ``query.count_mode``.
+        """
         try:
             logger.info(f"查询审计事件: 类型={query.event_types}, 用户={query.user_id}")
 
             # 验证查询参数
             await self._validate_query_parameters(query)
 
-            # 执行查询
-            events = await self.repository.query_audit_events(query)
+            # 执行查询 (one extra row tells us whether another page exists)
+            events = await self.repository.query_audit_events(
+                query, limit=query.limit + 1
+            )
+            has_more = len(events) > query.limit
+            events = events[: query.limit]
 
-            # 计算总数（简化版本）
-            total_count = len(events)
+            next_cursor = None
+            if has_more and events:
+                next_cursor = AuditCursor(
+                    events[-1].timestamp, events[-1].id, query.sort_order.lower()
+                ).encode()
+
+            total_count, is_estimate = await self.repository.count_audit_events(
+                query, mode=query.count_mode
+            )
+            if total_count is None:
+                # Counting skipped or failed: report what is known to exist
+                total_count = (0 if query.cursor else query.offset) + len(events)
+                is_estimate = has_more
 
             # 转换为响应格式
-            event_responses = [
-                AuditEventResponse(
-                    id=event.id,
-                    event_type=event.event_type,
-                    category=event.category,
-                    severity=event.severity,
-                    status=event.status,
-                    action=event.action,
-                    description=event.description,
-                    user_id=event.user_id,
-                    organization_id=event.organization_id,
-                    resource_type=event.resource_type,
-                    resource_name=event.resource_name,
-                    success=event.success,
-                    timestamp=event.timestamp,
-                    metadata=event.metadata,
-                )
-                for event in events
-            ]
+            event_responses = [self._to_event_response(event) for event in events]
 
             return AuditQueryResponse(
                 events=event_responses,
@@ -197,7 +209,8 @@ class AuditService:
                 page_info={
                     "limit": query.limit,
                     "offset": query.offset,
-                    "has_more": total_count >= query.limit,
+                    "has_more": has_more,
+                    "next_cursor": next_cursor,
                 },
                 filters_applied={
                     "event_types": [et.value for et in query.event_types]
@@ -206,7 +219,14 @@ class AuditService:
                     "categories": [cat.value for cat in query.categories]
                     if query.categories
                     else None,
+                    "severities": [sev.value for sev in query.severities]
+                    if query.severities
+                    else None,
                     "user_id": query.user_id,
+                    "organization_id": query.organization_id,
+                    "resource_type": query.resource_type,
+                    "ip_address": query.ip_address,
+                    "tags": query.tags,
                     "time_range": {
                         "start": query.start_time.isoformat()
                         if query.start_time
@@ -214,20 +234,52 @@ class AuditService:
                         "end": query.end_time.isoformat() if query.end_time else None,
                     },
                 },
+                query_metadata={
+                    "count_mode": query.count_mode,
+                    "count_is_estimate": is_estimate,
+                    "pagination": "keyset" if query.cursor else "offset",
+                },
             )
 
+        except AuditValidationError:
+            raise
         except Exception as e:
+            # An empty page would look like the end of the results
             logger.error(f"查询审计事件失败: {e}")
-            return AuditQueryResponse(
-                events=[],
-                total_count=0,
-                page_info={
-                    "limit": query.limit,
-                    "offset": query.offset,
-                    "has_more": False,
-                },
-                filters_applied={},
-            )
+            raise AuditServiceError(f"Failed to query audit events: {e}") from e
+
+    async def export_events(self, query: AuditQueryRequest) -> AsyncIterator[str]:
+        """Validate ``query`` and return an NDJSON line stream of its events.
+
+        Validation runs eagerly so bad queries fail before a response is
+        started. ``limit``/``offset`` are ignored; the repository walks the
+        whole range in keyset batches, so memory stays flat for months of
+        events.
+        """
+        await self._validate_query_parameters(query)
+        return self._export_lines(query)
+
+    async def _export_lines(self, query: AuditQueryRequest) -> AsyncIterator[str]:
+        async for event in self.repository.stream_audit_events(query):
+            yield self._to_event_response(event).model_dump_json() + "\n"
+
+    def _to_event_response(self, event: AuditEvent) -> AuditEventResponse:
+        return AuditEventResponse(
+            id=event.id,
+            event_type=event.event_type,
+            category=event.category,
+            severity=event.severity,
+            status=event.status,
+            action=event.action,
+            description=event.description,
+            user_id=event.user_id,
+            organization_id=event.organization_id,
+            resource_type=event.resource_type,
+            resource_name=event.resource_name,
+            success=event.success,
+            timestamp=event.timestamp,
+            metadata=event.metadata,
+        )
 
     # ====================
     # 用户活动分析
@@ -533,6 +585,15 @@ class AuditService:
             if query.end_time - query.start_time > max_range:
                 raise ValueError("查询时间范围不能超过365天")
 
+        if query.count_mode not in COUNT_MODES:
+            raise AuditValidationError(
+                f"count_mode must be one of {', '.join(COUNT_MODES)}"
+            )
+        try:
+            resolve_cursor(query)
+        except InvalidCursorError as e:
+            raise AuditValidationError(str(e)) from e
+
     def _calculate_threat_level(self, severity: EventSeverity) -> str:
         """计算威胁级别"""
         if severity == EventSeverity.CRITICAL:
@@ -0,0 +1,196 @@
+"""
+Buffered Audit Writer
+
+Coalesces audit event writes into multi-row inserts. The NATS ``*.*``
+subscription delivers an event for every action on the platform, and one
+INSERT round trip per event made the audit consumer the slowest hop in the
+pipeline.
+
+- ``submit()`` parks the caller until its event's batch is committed, so a
+  NATS message is only acked once the row is durable (ack-after-flush)
+- batches flush when ``max_batch_size`` events are waiting or after
+  ``flush_interval`` seconds, whichever comes first
+- at most ``max_pending`` events are in flight; further submitters wait,
+  which throttles the NATS pull loop instead of growing memory without
+  bound (back-pressure)
+- a failed flush fails every caller in the batch (their messages are
+  NAK'd and redelivered) and backs the loop off exponentially
+
+Usage:
+    writer = BufferedAuditWriter(repository)
+    writer.start()
+    await writer.submit(event)   # returns once the batch is committed
+    await writer.stop()          # flushes whatever is still buffered
+"""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from core.metrics import create_counter, create_histogram
+
+from .models import AuditEvent
+from .protocols import AuditRepositoryProtocol, AuditServiceError
+
+logger = logging.getLogger(__name__)
+
+AUDIT_WRITER_FLUSHES = create_counter(
+    "audit_writer_flushes_total",
+    "Audit writer batch flushes",
+    ["status"],
+)
+AUDIT_WRITER_BACKPRESSURE = create_counter(
+    "audit_writer_backpressure_total",
+    "Audit event submissions that waited for buffer capacity",
+    [],
+)
+AUDIT_WRITER_BATCH_SIZE = create_histogram(
+    "audit_writer_batch_size",
+    "Audit events written per flush",
+    [],
+    buckets=[1, 10, 50, 100, 250, 500, 1000],
+)
+
+_Pending = Tuple[AuditEvent, "asyncio.Future[AuditEvent]"]
+
+
+class BufferedAuditWriter:
+    """Batches ``create_audit_events`` calls behind a per-event await."""
+
+    def __init__(
+        self,
+        repository: AuditRepositoryProtocol,
+        *,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_pending: int = 10_000,
+        max_retry_delay: float = 5.0,
+    ):
+        if max_batch_size < 1 or max_pending < max_batch_size:
+            raise ValueError("max_pending must be >= max_batch_size >= 1")
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+
+        self._buffer: List[_Pending] = []
+        self._capacity = asyncio.Semaphore(max_pending)
+        self._wakeup = asyncio.Event()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._failures = 0
+
+    @property
+    def pending(self) -> int:
+        """Events buffered but not yet handed to the repository."""
+        return len(self._buffer)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting events and flush everything still buffered."""
+        self._stopping = True
+        self._wakeup.set()
+        self._batch_ready.set()
+        if self._task:
+            await self._task
+            self._task = None
+        # Loop never started (or died): fail leftovers rather than hang callers
+        while self._buffer:
+            await self._flush(self._take_batch())
+
+    async def submit(self, event: AuditEvent) -> AuditEvent:
+        """Queue ``event`` and wait until its batch is committed.
+
+        Raises:
+            AuditServiceError: writer is stopped or the batch failed to write
+        """
+        if self._stopping:
+            raise AuditServiceError("Audit writer is stopped")
+
+        if self._capacity.locked():
+            AUDIT_WRITER_BACKPRESSURE.inc()
+        await self._capacity.acquire()
+
+        future: "asyncio.Future[AuditEvent]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._buffer.append((event, future))
+        self._wakeup.set()
+        if len(self._buffer) >= self.max_batch_size:
+            self._batch_ready.set()
+
+        # Shield so a cancelled caller does not cancel the shared flush
+        return await asyncio.shield(future)
+
+    def _take_batch(self) -> List[_Pending]:
+        batch = self._buffer[: self.max_batch_size]
+        del self._buffer[: self.max_batch_size]
+        if len(self._buffer) < self.max_batch_size:
+            self._batch_ready.clear()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            if not self._buffer:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            if len(self._buffer) < self.max_batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(
+                        self._batch_ready.wait(), timeout=self.flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+            ok = await self._flush(self._take_batch())
+            if ok:
+                self._failures = 0
+            elif not self._stopping:
+                self._failures += 1
+                await asyncio.sleep(
+                    min(self.max_retry_delay, 0.1 * 2 ** (self._failures - 1))
+                )
+
+    async def _flush(self, batch: List[_Pending]) -> bool:
+        if not batch:
+            return True
+        events = [event for event, _ in batch]
+        started = time.monotonic()
+        try:
+            ok = await self.repository.create_audit_events(events)
+            error = None if ok else AuditServiceError("Audit event batch write failed")
+        except Exception as e:
+            ok, error = False, e
+
+        if ok:
+            AUDIT_WRITER_FLUSHES.labels(status="success").inc()
+            AUDIT_WRITER_BATCH_SIZE.observe(len(batch))
+            logger.debug(
+                f"Flushed {len(batch)} audit events in {time.monotonic() - started:.3f}s"
+            )
+        else:
+            AUDIT_WRITER_FLUSHES.labels(status="failure").inc()
+            logger.error(f"Failed to flush {len(batch)} audit events: {error}")
+
+        for event, future in batch:
+            if not future.done():
+                if ok:
+                    future.set_result(event)
+                else:
+                    future.set_exception(error)
+            self._capacity.release()
+        return ok
+
+
+__all__ = ["BufferedAuditWriter"]
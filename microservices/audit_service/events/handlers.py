@@ -6,6 +6,7 @@ Audit Service Event Handlers
 
 import logging
 from ..models import AuditEventCreateRequest, EventSeverity, AuditCategory, EventType
+from ..protocols import AuditServiceError
 
 logger = logging.getLogger(__name__)
 
@@ -94,26 +95,28 @@ class AuditEventHandlers:
                 tags=["nats_event", source, event_type_str],
             )
 
-            # Log the audit event
-            result = await self.audit_service.log_event(audit_request)
+        except Exception as e:
+            # Malformed event: retrying will not help, so let it be acked
+            logger.error(f"Failed to handle NATS event {event.id}: {e}")
+            return
 
-            if result:
-                # Mark as processed
-                self.processed_event_ids.add(event.id)
-                # Limit cache size
-                if len(self.processed_event_ids) > 10000:
-                    self.processed_event_ids = set(
-                        list(self.processed_event_ids)[5000:]
-                    )
+        # Log the audit event. With the buffered writer this returns once the
+        # batch holding the event is committed; the subscription only ACKs
+        # the message after we return, so a failure here must raise to get
+        # the message redelivered instead of silently dropped.
+        result = await self.audit_service.log_event(audit_request)
 
-                logger.info(
-                    f"Logged NATS event {event.id} ({event_type_str}) to audit trail"
-                )
-            else:
-                logger.error(f"Failed to log NATS event {event.id} to audit trail")
+        if not result:
+            logger.error(f"Failed to log NATS event {event.id} to audit trail")
+            raise AuditServiceError(f"Audit event {event.id} was not persisted")
 
-        except Exception as e:
-            logger.error(f"Failed to handle NATS event {event.id}: {e}")
+        # Mark as processed
+        self.processed_event_ids.add(event.id)
+        # Limit cache size
+        if len(self.processed_event_ids) > 10000:
+            self.processed_event_ids = set(list(self.processed_event_ids)[5000:])
+
+        logger.debug(f"Logged NATS event {event.id} ({event_type_str}) to audit trail")
 
     def _map_nats_event_to_audit_type(self, nats_event_type: str) -> EventType:
         """Map NATS event type to audit EventType"""
@@ -33,8 +33,11 @@ def create_audit_service(
     # Import real repository here (not at module level)
     from .audit_repository import AuditRepository
 
+    from .audit_writer import BufferedAuditWriter
+
     repository = AuditRepository(config=config)
 
     return AuditService(
         repository=repository,
+        writer=BufferedAuditWriter(repository),
     )
@@ -5,13 +5,14 @@ Audit Service Main Application
 提供审计事件记录、查询、分析、安全告警和合规报告功能
 """
 
+import asyncio
 import uvicorn
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, Query, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from core.config_manager import ConfigManager
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
@@ -19,9 +20,12 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.stat_rollups import RollupReconciler
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .audit_service import AuditService
+from .protocols import AuditValidationError
 from .factory import create_audit_service
 from .events.handlers import AuditEventHandlers
 from .events.admin_audit_handler import AdminAuditEventHandler
@@ -61,14 +65,31 @@ audit_service: Optional[AuditService] = None
 admin_audit_repo: Optional[AdminAuditRepository] = None
 event_bus = None
 consul_registry = None
+stats_reconciler: Optional[RollupReconciler] = None
+partition_task: Optional[asyncio.Task] = None
 shutdown_manager = GracefulShutdown("audit_service")
 
+# How often upcoming audit_events partitions are checked/created (seconds)
+PARTITION_MAINTENANCE_INTERVAL = 6 * 3600
+
+
+async def maintain_audit_partitions():
+    """Keep monthly audit_events partitions created ahead of time"""
+    while True:
+        try:
+            if audit_service:
+                await audit_service.repository.ensure_partitions()
+        except Exception as e:
+            logger.error(f"Audit partition maintenance failed: {e}")
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     shutdown_manager.install_signal_handlers()
-    global audit_service, admin_audit_repo, event_bus, consul_registry
+    global audit_service, admin_audit_repo, event_bus, consul_registry, stats_reconciler
+    global partition_task
 
     logger.info("🚀 Audit Service starting up...")
 
@@ -76,9 +97,20 @@ async def lifespan(app: FastAPI):
         # 初始化服务 (使用工厂方法)
         audit_service = create_audit_service(config=config_manager)
 
+        # Batch event inserts (flushed by size or interval)
+        if audit_service.writer:
+            audit_service.writer.start()
+
         # Initialize admin audit repository
         admin_audit_repo = AdminAuditRepository(config=config_manager)
 
+        # Keep the statistics counter rollups reconciled
+        stats_reconciler = RollupReconciler(audit_service.repository.stat_rollups)
+        stats_reconciler.start()
+
+        # Create upcoming audit_events partitions (retention drops old ones)
+        partition_task = asyncio.create_task(maintain_audit_partitions())
+
         # 检查数据库连接
         if await audit_service.repository.check_connection():
             logger.info("✅ 数据库连接成功")
@@ -93,10 +125,14 @@ async def lifespan(app: FastAPI):
             # Initialize event handlers
             event_handlers = AuditEventHandlers(audit_service)
 
-            # Subscribe to ALL events using wildcard pattern
+            # Subscribe to ALL events using wildcard pattern. Messages are
+            # handled concurrently and acked only after the buffered writer
+            # has committed their batch.
             await event_bus.subscribe_to_events(
                 pattern="*.*",  # Subscribe to all events from all services
                 handler=event_handlers.handle_nats_event,
+                batch_size=200,
+                ack_after_handler=True,
             )
             logger.info("✅ Subscribed to all NATS events (*.*) for audit logging")
 
@@ -158,6 +194,16 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
 
+    if stats_reconciler:
+        await stats_reconciler.stop()
+
+    if partition_task:
+        partition_task.cancel()
+
+    # Flush buffered audit events before the event bus stops delivering acks
+    if audit_service and audit_service.writer:
+        await audit_service.writer.stop()
+
     # Consul deregistration
     if consul_registry:
         try:
@@ -172,6 +218,7 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Event bus closed")
     if audit_service:
         logger.info("✅ Audit Service cleanup completed")
+    close_discovery_caches()
 
 
 # 创建FastAPI应用
@@ -249,6 +296,7 @@ async def service_info():
         endpoints={
             "log_event": "/api/v1/audit/events",
             "query_events": "/api/v1/audit/events/query",
+            "export_events": "/api/v1/audit/events/export",
             "user_activities": "/api/v1/audit/users/{user_id}/activities",
             "security_alerts": "/api/v1/audit/security/alerts",
             "compliance_reports": "/api/v1/audit/compliance/reports",
@@ -310,11 +358,35 @@ async def query_audit_events(
         result = await svc.query_events(query)
         return result
 
+    except AuditValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"审计事件查询失败: {e}")
         raise HTTPException(status_code=500, detail=f"事件查询失败: {str(e)}")
 
 
+@app.post("/api/v1/audit/events/export")
+async def export_audit_events(
+    query: AuditQueryRequest, svc: AuditService = Depends(get_audit_service)
+):
+    """Export every matching audit event as NDJSON (one event per line).
+
+    Ignores limit/offset; streams the full range in keyset batches for
+    compliance reports.
+    """
+    try:
+        logger.info(f"导出审计事件: 类型={query.event_types}, 用户={query.user_id}")
+        lines = await svc.export_events(query)
+    except (AuditValidationError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=audit_events.ndjson"},
+    )
+
+
 @app.get("/api/v1/audit/events")
 async def get_audit_events(
     event_type: Optional[str] = Query(None, description="事件类型过滤"),
@@ -324,6 +396,10 @@ async def get_audit_events(
     end_time: Optional[datetime] = Query(None, description="结束时间"),
     limit: int = Query(100, description="返回条数限制", le=1000),
     offset: int = Query(0, description="偏移量"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor (page_info.next_cursor)"
+    ),
+    count_mode: str = Query("estimated", description="exact, estimated or none"),
     svc: AuditService = Depends(get_audit_service),
 ):
     """获取审计事件 (GET方式)"""
@@ -337,11 +413,15 @@ async def get_audit_events(
             end_time=end_time,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count_mode=count_mode,
         )
 
         result = await svc.query_events(query)
         return result
 
+    except AuditValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"审计事件获取失败: {e}")
         raise HTTPException(status_code=500, detail=f"事件获取失败: {str(e)}")
@@ -700,18 +780,22 @@ async def log_batch_events(
 
         logger.info(f"批量记录 {len(events)} 个审计事件")
 
+        # Submitted together so the buffered writer stores them in one flush
+        outcomes = await asyncio.gather(
+            *(svc.log_event(event_request) for event_request in events),
+            return_exceptions=True,
+        )
+
         results = []
         failed_count = 0
 
-        for event_request in events:
-            try:
-                result = await svc.log_event(event_request)
-                if result:
-                    results.append(result)
-                else:
-                    failed_count += 1
-            except Exception as e:
-                logger.error(f"批量事件记录失败: {e}")
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"批量事件记录失败: {outcome}")
+                failed_count += 1
+            elif outcome:
+                results.append(outcome)
+            else:
                 failed_count += 1
 
         return {
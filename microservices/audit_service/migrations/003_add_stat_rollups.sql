@@ -0,0 +1,25 @@
+-- Audit Service Migration: Add statistics counter rollups
+-- Version: 003
+-- Date: 2026-10-18
+-- Description: Pre-aggregated counters read by the statistics endpoint
+--              instead of scanning the source table on every request.
+--              Maintained by core.stat_rollups (increments on write plus
+--              periodic reconciliation from the source table).
+
+CREATE TABLE IF NOT EXISTS audit.stat_rollups (
+    rollup_name VARCHAR(100) NOT NULL,
+    dimension VARCHAR(100) NOT NULL,
+    dimension_value TEXT NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    event_count BIGINT NOT NULL DEFAULT 0,
+    amount_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (rollup_name, dimension, dimension_value, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_stat_rollups_bucket
+    ON audit.stat_rollups(rollup_name, bucket_start);
+
+COMMENT ON TABLE audit.stat_rollups IS
+    'Counter rollups keyed by rollup/dimension/value/day bucket (core.stat_rollups).';
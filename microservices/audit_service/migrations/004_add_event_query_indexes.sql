@@ -0,0 +1,28 @@
+-- Audit Service Migration: Indexes for keyset-paginated event queries
+-- Version: 004
+-- Date: 2026-10-18
+-- Description: Event queries page by (event_timestamp, event_id) instead of
+--              LIMIT/OFFSET and push every filter down to SQL. These
+--              indexes let the common shapes (unfiltered, per user, per
+--              organization, per event type, tag overlap) resume from a
+--              cursor with an index range scan. B-tree indexes serve both
+--              ascending and descending order.
+
+CREATE INDEX IF NOT EXISTS idx_audit_timestamp_event_id
+    ON audit.audit_events(event_timestamp, event_id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_user_time_event_id
+    ON audit.audit_events(user_id, event_timestamp, event_id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_org_time_event_id
+    ON audit.audit_events(organization_id, event_timestamp, event_id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_type_time_event_id
+    ON audit.audit_events(event_type, event_timestamp, event_id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_tags
+    ON audit.audit_events USING GIN (tags);
+
+-- Superseded by the (…, event_timestamp, event_id) indexes above
+DROP INDEX IF EXISTS audit.idx_audit_user_time;
+DROP INDEX IF EXISTS audit.idx_audit_type_time;
@@ -0,0 +1,185 @@
+-- Audit Service Migration: Range-partition audit_events by month
+-- Version: 005
+-- Date: 2026-10-18
+-- Description: audit.audit_events is the largest table in the cluster and
+--              retention ran as one DELETE ... WHERE event_timestamp < $1,
+--              which bloated the table, held locks for the whole run and
+--              caused replication lag. The table is now partitioned by
+--              month on event_timestamp:
+--                * audit.create_audit_event_partitions() creates partitions
+--                  ahead of time (AuditRepository.ensure_partitions, run
+--                  periodically by the service);
+--                * retention detaches and drops whole monthly partitions
+--                  (AuditRepository.cleanup_old_events) instead of deleting
+--                  rows;
+--                * queries filtered on event_timestamp are pruned to the
+--                  matching partitions.
+--              A DEFAULT partition catches out-of-range rows (clock skew,
+--              very old replays) so inserts never fail; creating a
+--              partition moves any matching rows out of it first.
+--
+--              Partitioned tables require unique constraints to include the
+--              partition key, so the primary key becomes
+--              (event_id, event_timestamp) and id is no longer the key.
+
+BEGIN;
+
+ALTER TABLE audit.audit_events RENAME TO audit_events_unpartitioned;
+
+CREATE TABLE audit.audit_events (
+    id BIGSERIAL,
+    event_id VARCHAR(100) NOT NULL,
+
+    -- Event classification
+    event_type VARCHAR(50) NOT NULL,
+    event_category VARCHAR(50) NOT NULL,
+    event_severity VARCHAR(20) DEFAULT 'info',
+    event_status VARCHAR(20) DEFAULT 'completed',
+
+    -- Context
+    user_id VARCHAR(100),
+    organization_id VARCHAR(100),
+    session_id VARCHAR(100),
+    ip_address VARCHAR(50),
+    user_agent TEXT,
+
+    -- Action details
+    action VARCHAR(100) NOT NULL,
+    resource_type VARCHAR(100),
+    resource_id VARCHAR(255),
+    resource_name VARCHAR(255),
+
+    -- Results
+    status_code INTEGER,
+    error_message TEXT,
+    changes_made JSONB DEFAULT '{}'::jsonb,
+
+    -- Security
+    risk_score DOUBLE PRECISION,
+    threat_indicators JSONB DEFAULT '[]'::jsonb,
+    compliance_flags JSONB DEFAULT '[]'::jsonb,
+
+    -- Metadata
+    metadata JSONB DEFAULT '{}'::jsonb,
+    tags TEXT[],
+
+    -- Timestamps
+    event_timestamp TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (event_id, event_timestamp)
+) PARTITION BY RANGE (event_timestamp);
+
+CREATE TABLE audit.audit_events_default
+    PARTITION OF audit.audit_events DEFAULT;
+
+-- Create monthly partitions audit_events_pYYYYMM covering p_from's month
+-- through p_months_ahead months after it. Rows already sitting in the
+-- DEFAULT partition for a new month are moved into it before attaching.
+-- Returns the number of partitions created.
+CREATE OR REPLACE FUNCTION audit.create_audit_event_partitions(
+    p_from DATE,
+    p_months_ahead INT
+) RETURNS INT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', p_from)::date;
+    last_month DATE := (date_trunc('month', p_from) + make_interval(months => p_months_ahead))::date;
+    month_end DATE;
+    part_name TEXT;
+    created INT := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        month_end := (month_start + INTERVAL '1 month')::date;
+        part_name := format('audit_events_p%s', to_char(month_start, 'YYYYMM'));
+
+        IF to_regclass(format('audit.%I', part_name)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE audit.%I (LIKE audit.audit_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                part_name
+            );
+            EXECUTE format(
+                'WITH moved AS (
+                     DELETE FROM audit.audit_events_default
+                     WHERE event_timestamp >= %L AND event_timestamp < %L
+                     RETURNING *
+                 )
+                 INSERT INTO audit.%I SELECT * FROM moved',
+                month_start, month_end, part_name
+            );
+            EXECUTE format(
+                'ALTER TABLE audit.audit_events ATTACH PARTITION audit.%I FOR VALUES FROM (%L) TO (%L)',
+                part_name, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions for existing history plus three months ahead
+SELECT audit.create_audit_event_partitions(
+    COALESCE(
+        (SELECT MIN(event_timestamp) FROM audit.audit_events_unpartitioned)::date,
+        CURRENT_DATE
+    ),
+    (
+        SELECT (
+            EXTRACT(YEAR FROM age(date_trunc('month', CURRENT_DATE),
+                                  date_trunc('month', COALESCE(MIN(event_timestamp), CURRENT_DATE))))::int * 12
+            + EXTRACT(MONTH FROM age(date_trunc('month', CURRENT_DATE),
+                                     date_trunc('month', COALESCE(MIN(event_timestamp), CURRENT_DATE))))::int
+            + 3
+        )
+        FROM audit.audit_events_unpartitioned
+    )
+);
+
+INSERT INTO audit.audit_events (
+    id, event_id, event_type, event_category, event_severity, event_status,
+    user_id, organization_id, session_id, ip_address, user_agent,
+    action, resource_type, resource_id, resource_name,
+    status_code, error_message, changes_made,
+    risk_score, threat_indicators, compliance_flags,
+    metadata, tags, event_timestamp, created_at
+)
+SELECT
+    id, event_id, event_type, event_category, event_severity, event_status,
+    user_id, organization_id, session_id, ip_address, user_agent,
+    action, resource_type, resource_id, resource_name,
+    status_code, error_message, changes_made,
+    risk_score, threat_indicators, compliance_flags,
+    metadata, tags, event_timestamp, created_at
+FROM audit.audit_events_unpartitioned;
+
+SELECT setval(
+    pg_get_serial_sequence('audit.audit_events', 'id'),
+    COALESCE((SELECT MAX(id) FROM audit.audit_events), 0) + 1,
+    false
+);
+
+DROP TABLE audit.audit_events_unpartitioned CASCADE;
+
+-- ====================
+-- Indexes (created on the parent, inherited by every partition)
+-- ====================
+
+CREATE INDEX idx_audit_event_id ON audit.audit_events(event_id);
+CREATE INDEX idx_audit_organization_id ON audit.audit_events(organization_id);
+CREATE INDEX idx_audit_category ON audit.audit_events(event_category);
+CREATE INDEX idx_audit_severity ON audit.audit_events(event_severity);
+CREATE INDEX idx_audit_resource ON audit.audit_events(resource_type, resource_id);
+CREATE INDEX idx_audit_action ON audit.audit_events(action);
+CREATE INDEX idx_audit_org_type ON audit.audit_events(organization_id, event_type);
+CREATE INDEX idx_audit_timestamp_event_id ON audit.audit_events(event_timestamp, event_id);
+CREATE INDEX idx_audit_user_time_event_id ON audit.audit_events(user_id, event_timestamp, event_id);
+CREATE INDEX idx_audit_org_time_event_id ON audit.audit_events(organization_id, event_timestamp, event_id);
+CREATE INDEX idx_audit_type_time_event_id ON audit.audit_events(event_type, event_timestamp, event_id);
+CREATE INDEX idx_audit_tags ON audit.audit_events USING GIN (tags);
+
+COMMENT ON TABLE audit.audit_events IS
+    'Unified audit events, range-partitioned by month on event_timestamp (audit_events_pYYYYMM)';
+
+COMMIT;
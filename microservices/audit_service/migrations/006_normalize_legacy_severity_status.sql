@@ -0,0 +1,30 @@
+-- Audit Service Migration: Normalize legacy severity / status values
+-- Version: 006
+-- Date: 2026-10-19
+-- Description: The event_severity / event_status column defaults ('info',
+--              'completed') were never values of EventSeverity (low,
+--              medium, high, critical) or EventStatus (success, failure,
+--              pending, error), so rows written with the defaults could not
+--              be read back. Rewrite existing legacy values and change the
+--              defaults. The repository also maps legacy values on read.
+
+ALTER TABLE audit.audit_events ALTER COLUMN event_severity SET DEFAULT 'low';
+ALTER TABLE audit.audit_events ALTER COLUMN event_status SET DEFAULT 'success';
+
+UPDATE audit.audit_events
+SET event_severity = CASE event_severity
+        WHEN 'debug' THEN 'low'
+        WHEN 'info' THEN 'low'
+        WHEN 'warning' THEN 'medium'
+        WHEN 'error' THEN 'high'
+    END
+WHERE event_severity IN ('debug', 'info', 'warning', 'error');
+
+UPDATE audit.audit_events
+SET event_status = CASE event_status
+        WHEN 'completed' THEN 'success'
+        WHEN 'failed' THEN 'failure'
+        WHEN 'initiated' THEN 'pending'
+        WHEN 'in_progress' THEN 'pending'
+    END
+WHERE event_status IN ('completed', 'failed', 'initiated', 'in_progress');
@@ -280,10 +280,15 @@ class AuditQueryRequest(BaseModel):
 
     limit: int = Field(default=100, le=1000)
     offset: int = Field(default=0, ge=0)
+    cursor: Optional[
+        str
+    ] = None  # keyset cursor from page_info.next_cursor; overrides offset
 
     sort_by: str = "timestamp"
     sort_order: str = "desc"  # asc, desc
 
+    count_mode: str = "estimated"  # exact, estimated, none
+
 
 class AuditQueryResponse(BaseModel):
     """审计查询响应"""
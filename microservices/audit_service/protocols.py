@@ -4,7 +4,16 @@ Audit Service Protocols (Interfaces)
 These interfaces define contracts for dependency injection.
 NO import-time I/O dependencies - safe to import anywhere.
 """
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    runtime_checkable,
+)
 from datetime import datetime
 
 # Import only models (no I/O dependencies)
@@ -47,6 +56,10 @@ class AuditRepositoryProtocol(Protocol):
         """Create audit event"""
         ...
 
+    async def create_audit_events(self, events: List[AuditEvent]) -> bool:
+        """Insert a batch of audit events; True once committed"""
+        ...
+
     async def get_audit_events(
         self,
         user_id: Optional[str] = None,
@@ -60,8 +73,22 @@ class AuditRepositoryProtocol(Protocol):
         """Get audit events list"""
         ...
 
-    async def query_audit_events(self, query: Dict[str, Any]) -> List[AuditEvent]:
-        """Query audit events"""
+    async def query_audit_events(
+        self, query: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[AuditEvent]:
+        """Query audit events (filters pushed down, keyset cursor paging)"""
+        ...
+
+    async def count_audit_events(
+        self, query: Dict[str, Any], mode: str = "estimated"
+    ) -> Tuple[Optional[int], bool]:
+        """Count matching events; returns (count, is_estimate)"""
+        ...
+
+    def stream_audit_events(
+        self, query: Dict[str, Any], batch_size: int = 1000
+    ) -> AsyncIterator[AuditEvent]:
+        """Stream all matching events in keyset batches"""
         ...
 
     async def get_user_activities(
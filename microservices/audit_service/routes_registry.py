@@ -52,6 +52,12 @@ SERVICE_ROUTES = [
         "auth_required": True,
         "description": "Query audit events",
     },
+    {
+        "path": "/api/v1/audit/events/export",
+        "methods": ["POST"],
+        "auth_required": True,
+        "description": "Export audit events as NDJSON",
+    },
     {
         "path": "/api/v1/audit/events/batch",
         "methods": ["POST"],
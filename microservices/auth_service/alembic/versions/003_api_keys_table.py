@@ -0,0 +1,88 @@
+"""Move API keys out of organizations.api_keys into auth.api_keys
+
+Revision ID: auth_003
+Revises: auth_002
+Create Date: 2026-10-18
+
+New tables:
+  - auth.api_keys — one row per API key, unique on key_hash so validation
+    is a single index lookup instead of a scan of every organization
+
+Data:
+  - Backfills every key from auth.organizations.api_keys. The JSONB column
+    is left in place (no longer written) so a rollback keeps working.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "auth_003"
+down_revision: Union[str, None] = "auth_002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS auth.api_keys (
+            key_id TEXT PRIMARY KEY,
+            organization_id TEXT NOT NULL,
+            key_hash TEXT NOT NULL,
+            name TEXT,
+            project_id TEXT,
+            is_active BOOLEAN NOT NULL DEFAULT TRUE,
+            expires_at TIMESTAMPTZ,
+            rate_limits JSONB NOT NULL DEFAULT '{}'::jsonb,
+            metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            last_used TIMESTAMPTZ,
+            revoked_at TIMESTAMPTZ
+        )
+    """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_api_keys_key_hash ON auth.api_keys(key_hash)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_api_keys_org ON auth.api_keys(organization_id, created_at)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_api_keys_expires ON auth.api_keys(expires_at) "
+        "WHERE expires_at IS NOT NULL"
+    )
+
+    # Backfill; key metadata other than the indexed columns stays JSONB
+    op.execute(
+        """
+        INSERT INTO auth.api_keys (
+            key_id, organization_id, key_hash, name, project_id, is_active,
+            expires_at, rate_limits, metadata, created_at, last_used, revoked_at
+        )
+        SELECT
+            k->>'key_id',
+            o.organization_id,
+            k->>'key_hash',
+            k->>'name',
+            k->>'project_id',
+            COALESCE((k->>'is_active')::boolean, FALSE),
+            (k->>'expires_at')::timestamptz,
+            CASE WHEN jsonb_typeof(k->'rate_limits') = 'object'
+                 THEN k->'rate_limits' ELSE '{}'::jsonb END,
+            k - 'key_id' - 'key_hash' - 'name' - 'project_id' - 'is_active'
+              - 'expires_at' - 'rate_limits' - 'created_at' - 'last_used' - 'revoked_at',
+            COALESCE((k->>'created_at')::timestamptz, o.created_at, NOW()),
+            (k->>'last_used')::timestamptz,
+            (k->>'revoked_at')::timestamptz
+        FROM auth.organizations o
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(o.api_keys) = 'array' THEN o.api_keys ELSE '[]'::jsonb END
+        ) AS k
+        WHERE k->>'key_id' IS NOT NULL AND k->>'key_hash' IS NOT NULL
+        ON CONFLICT DO NOTHING
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS auth.api_keys CASCADE")
@@ -2,11 +2,21 @@
 API Key Repository - Async Version
 
 API key data access layer using AsyncPostgresClient.
-Uses organizations.api_keys JSONB field (will migrate to dedicated table)
+Keys live in auth.api_keys (one row per key, unique on key_hash).
+
+Validation is on every machine-client request, so:
+- a key is looked up by key_hash through a short in-process cache, then a
+  Redis cache shared by replicas, then the unique index
+- revoke/delete/rate-limit updates invalidate both caches; other replicas'
+  in-process entries expire within API_KEY_LOCAL_CACHE_TTL_SECONDS
+- last_used is buffered in memory and written in one batched UPDATE every
+  API_KEY_LAST_USED_FLUSH_SECONDS (and on close)
 """
 
+import asyncio
 import logging
 import json
+import time
 import uuid
 import hashlib
 import secrets
@@ -22,6 +32,7 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.redis_cache import RedisCache, build_redis_cache
 
 
 from core.postgres_client import compute_pool_size as _pg_compute_pool
@@ -42,6 +53,21 @@ logger = logging.getLogger(__name__)
 
 API_KEY_OWNER_TYPES = {"organization", "service_account"}
 
+API_KEY_CACHE_TTL_SECONDS = int(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+API_KEY_LOCAL_CACHE_TTL_SECONDS = float(
+    os.getenv("API_KEY_LOCAL_CACHE_TTL_SECONDS", "5")
+)
+API_KEY_LOCAL_CACHE_SIZE = 10000
+API_KEY_LAST_USED_FLUSH_SECONDS = float(
+    os.getenv("API_KEY_LAST_USED_FLUSH_SECONDS", "30")
+)
+
+# Columns of auth.api_keys; everything else about a key is in ``metadata``
+_KEY_COLUMNS = (
+    "key_id, organization_id, key_hash, name, project_id, is_active, expires_at, "
+    "rate_limits, metadata, created_at, last_used, revoked_at"
+)
+
 
 def _as_list(value: Any) -> List[Any]:
     if value is None:
@@ -75,6 +101,34 @@ def _parse_datetime(value: Any) -> Optional[datetime]:
     return None
 
 
+def _iso(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _key_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """auth.api_keys row -> key record in the JSON shape keys always had."""
+    key_data = dict(_as_dict(row.get("metadata")))
+    key_data.update(
+        {
+            "key_id": row.get("key_id"),
+            "organization_id": row.get("organization_id"),
+            "name": row.get("name"),
+            "key_hash": row.get("key_hash"),
+            "project_id": row.get("project_id"),
+            "is_active": bool(row.get("is_active")),
+            "expires_at": _iso(row.get("expires_at")),
+            "rate_limits": _as_dict(row.get("rate_limits")),
+            "created_at": _iso(row.get("created_at")),
+            "last_used": _iso(row.get("last_used")),
+        }
+    )
+    if row.get("revoked_at"):
+        key_data["revoked_at"] = _iso(row["revoked_at"])
+    return key_data
+
+
 def _ip_matches_allowlist(ip_address: str, allowlist: List[str]) -> bool:
     try:
         parsed_ip = ipaddress.ip_address(ip_address)
@@ -150,7 +204,10 @@ class ApiKeyRepository:
     """API key repository - async data access layer"""
 
     def __init__(
-        self, organization_service_client=None, config: Optional[ConfigManager] = None
+        self,
+        organization_service_client=None,
+        config: Optional[ConfigManager] = None,
+        key_cache: Optional[RedisCache] = None,
     ):
         self.organization_service_client = organization_service_client
 
@@ -177,7 +234,16 @@ class ApiKeyRepository:
             max_pool_size=_pg_max_pool(),
         )
         self.schema = "auth"
-        self.organizations_table = "organizations"
+        self.api_keys_table = "api_keys"
+
+        self._key_cache: RedisCache = key_cache or build_redis_cache(
+            "auth:api_key",
+            service_name="auth_service",
+            default_ttl=API_KEY_CACHE_TTL_SECONDS,
+        )
+        self._local_keys: Dict[str, tuple] = {}
+        self._last_used: Dict[str, datetime] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     def _generate_api_key(self, prefix: str = "isa") -> str:
         """Generate a new API key with prefix"""
@@ -188,21 +254,107 @@ class ApiKeyRepository:
         """Create hash of API key for secure storage"""
         return hashlib.sha256(api_key.encode()).hexdigest()
 
-    def _parse_api_keys(self, api_keys_raw) -> List[Dict[str, Any]]:
-        """Parse API keys from database - handles proto and JSON formats"""
-        from google.protobuf.json_format import MessageToDict
-
-        if hasattr(api_keys_raw, "values"):
-            return [
-                MessageToDict(val.struct_value) if hasattr(val, "struct_value") else val
-                for val in api_keys_raw.values
-            ]
-        elif isinstance(api_keys_raw, str):
-            return json.loads(api_keys_raw)
-        elif isinstance(api_keys_raw, list):
-            return api_keys_raw
-        else:
-            return []
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the periodic last_used flush"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(
+                self._run_flush(), name="api-key-last-used"
+            )
+
+    async def close(self) -> None:
+        """Stop the flush loop, write pending last_used and close the cache"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush_last_used()
+        await self._key_cache.close()
+
+    async def _run_flush(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(API_KEY_LAST_USED_FLUSH_SECONDS)
+                await self.flush_last_used()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"API key last_used flush error: {e}", exc_info=True)
+
+    async def flush_last_used(self) -> int:
+        """Write buffered last_used timestamps; returns the number of keys"""
+        if not self._last_used:
+            return 0
+        pending, self._last_used = self._last_used, {}
+        rows = [
+            {"key_id": key_id, "last_used": used_at.isoformat()}
+            for key_id, used_at in pending.items()
+        ]
+        try:
+            async with self.db:
+                await self.db.execute(
+                    f"""
+                    UPDATE {self.schema}.{self.api_keys_table} AS k
+                    SET last_used = GREATEST(k.last_used, v.last_used)
+                    FROM jsonb_to_recordset($1::jsonb) AS v(key_id text, last_used timestamptz)
+                    WHERE k.key_id = v.key_id
+                    """,
+                    params=[json.dumps(rows)],
+                )
+            return len(rows)
+        except Exception as e:
+            logger.warning(f"Failed to flush API key last_used ({len(rows)} keys): {e}")
+            # Retry next time; uses recorded meanwhile are newer
+            for key_id, used_at in pending.items():
+                self._last_used.setdefault(key_id, used_at)
+            return 0
+
+    # ------------------------------------------------------------------
+    # Key lookup cache
+    # ------------------------------------------------------------------
+
+    async def _lookup_key(self, key_hash: str) -> Optional[Dict[str, Any]]:
+        """Key record for ``key_hash``: in-process cache, Redis, then the index"""
+        local = self._local_keys.get(key_hash)
+        if local is not None and local[0] > time.monotonic():
+            return local[1]
+
+        key_data = await self._key_cache.get(key_hash)
+        if key_data is None:
+            async with self.db:
+                row = await self.db.query_row(
+                    f"SELECT {_KEY_COLUMNS} FROM {self.schema}.{self.api_keys_table} "
+                    "WHERE key_hash = $1",
+                    params=[key_hash],
+                )
+            if not row:
+                return None
+            key_data = _key_from_row(row)
+            await self._key_cache.set(key_hash, key_data)
+
+        if len(self._local_keys) >= API_KEY_LOCAL_CACHE_SIZE:
+            self._local_keys.pop(next(iter(self._local_keys)))
+        self._local_keys[key_hash] = (
+            time.monotonic() + API_KEY_LOCAL_CACHE_TTL_SECONDS,
+            key_data,
+        )
+        return key_data
+
+    async def _invalidate_keys(self, key_hashes: List[str]) -> None:
+        for key_hash in key_hashes:
+            self._local_keys.pop(key_hash, None)
+            if not await self._key_cache.delete(key_hash) and self._key_cache.available:
+                logger.warning(
+                    f"Could not invalidate cached API key {key_hash[-8:]}; "
+                    f"it expires within {API_KEY_CACHE_TTL_SECONDS}s"
+                )
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
 
     async def create_api_key(
         self,
@@ -268,33 +420,35 @@ class ApiKeyRepository:
                         f"Could not verify organization '{organization_id}': {e}"
                     )
 
-            # Get current API keys from organization
-            async with self.db:
-                result = await self.db.query_row(
-                    f"SELECT api_keys FROM {self.schema}.{self.organizations_table} WHERE organization_id = $1",
-                    params=[organization_id],
-                )
-
-            # If organization doesn't exist in auth schema yet, create it
-            if not result:
-                async with self.db:
-                    await self.db.execute(
-                        f"INSERT INTO {self.schema}.{self.organizations_table} (organization_id, name, api_keys) VALUES ($1, $2, $3) ON CONFLICT (organization_id) DO NOTHING",
-                        params=[organization_id, organization_id, json.dumps([])],
-                    )
-                    result = await self.db.query_row(
-                        f"SELECT api_keys FROM {self.schema}.{self.organizations_table} WHERE organization_id = $1",
-                        params=[organization_id],
-                    )
-
-            current_keys = self._parse_api_keys(result.get("api_keys", []))
-            current_keys.append(key_data)
+            metadata = {
+                "permissions": key_data["permissions"],
+                "created_by": created_by,
+                "owner_type": owner_type,
+                "service_account_id": service_account_id,
+                "scopes": key_data["scopes"],
+                "ip_allowlist": key_data["ip_allowlist"],
+                "spend_limit": spend_limit,
+            }
 
-            # Update organization with new API keys list
             async with self.db:
                 count = await self.db.execute(
-                    f"UPDATE {self.schema}.{self.organizations_table} SET api_keys = $1, updated_at = $2 WHERE organization_id = $3",
-                    params=[current_keys, now, organization_id],
+                    f"""
+                    INSERT INTO {self.schema}.{self.api_keys_table} (
+                        key_id, organization_id, key_hash, name, project_id,
+                        is_active, expires_at, rate_limits, metadata, created_at
+                    ) VALUES ($1, $2, $3, $4, $5, TRUE, $6, $7, $8, $9)
+                    """,
+                    params=[
+                        key_data["key_id"],
+                        organization_id,
+                        key_hash,
+                        name,
+                        project_id,
+                        expires_at,
+                        json.dumps(key_data["rate_limits"]),
+                        json.dumps(metadata),
+                        now,
+                    ],
                 )
 
             if count == 0:
@@ -317,83 +471,61 @@ class ApiKeyRepository:
     ) -> Dict[str, Any]:
         """Validate an API key and return organization/permissions"""
         try:
-            key_hash = self._hash_api_key(api_key)
+            key_data = await self._lookup_key(self._hash_api_key(api_key))
 
-            async with self.db:
-                rows = await self.db.query(
-                    f"SELECT organization_id, api_keys FROM {self.schema}.{self.organizations_table}",
-                    params=[],
-                )
-
-            if not rows:
+            if not key_data or not key_data.get("is_active", False):
                 return {"valid": False, "error": "Invalid API key"}
 
-            for row in rows:
-                api_keys = self._parse_api_keys(row.get("api_keys", []))
-
-                for key_data in api_keys:
-                    if key_data.get("key_hash") == key_hash and key_data.get(
-                        "is_active", False
-                    ):
-                        metadata = build_api_key_metadata(key_data)
-
-                        if (
-                            project_id
-                            and metadata.get("project_id")
-                            and metadata["project_id"] != project_id
-                        ):
-                            return {
-                                "valid": False,
-                                "error": f"API key is not scoped to project {project_id}",
-                            }
-
-                        if (
-                            ip_address
-                            and metadata.get("ip_allowlist")
-                            and not _ip_matches_allowlist(
-                                ip_address, metadata["ip_allowlist"]
-                            )
-                        ):
-                            return {
-                                "valid": False,
-                                "error": "IP address is not allowed for this API key",
-                            }
-
-                        # Check expiration
-                        expires_at = key_data.get("expires_at")
-                        if expires_at:
-                            expiry_time = _parse_datetime(expires_at)
-
-                            if expiry_time.tzinfo is None:
-                                current_time = datetime.utcnow().replace(tzinfo=None)
-                            else:
-                                current_time = datetime.now(timezone.utc)
-
-                            if current_time > expiry_time:
-                                return {"valid": False, "error": "API key has expired"}
-
-                        # Update last used timestamp
-                        key_data["last_used"] = datetime.now(timezone.utc).isoformat()
-
-                        async with self.db:
-                            await self.db.execute(
-                                f"UPDATE {self.schema}.{self.organizations_table} SET api_keys = $1 WHERE organization_id = $2",
-                                params=[api_keys, row["organization_id"]],
-                            )
-
-                        result = {
-                            "valid": True,
-                            "organization_id": row["organization_id"],
-                            "key_id": key_data.get("key_id"),
-                            "name": key_data.get("name"),
-                            "permissions": key_data.get("permissions", []),
-                            "created_at": key_data.get("created_at"),
-                            "last_used": key_data.get("last_used"),
-                        }
-                        result.update(metadata)
-                        return result
-
-            return {"valid": False, "error": "Invalid API key"}
+            metadata = build_api_key_metadata(key_data)
+
+            if (
+                project_id
+                and metadata.get("project_id")
+                and metadata["project_id"] != project_id
+            ):
+                return {
+                    "valid": False,
+                    "error": f"API key is not scoped to project {project_id}",
+                }
+
+            if (
+                ip_address
+                and metadata.get("ip_allowlist")
+                and not _ip_matches_allowlist(ip_address, metadata["ip_allowlist"])
+            ):
+                return {
+                    "valid": False,
+                    "error": "IP address is not allowed for this API key",
+                }
+
+            # Check expiration
+            expires_at = key_data.get("expires_at")
+            if expires_at:
+                expiry_time = _parse_datetime(expires_at)
+
+                if expiry_time.tzinfo is None:
+                    current_time = datetime.utcnow().replace(tzinfo=None)
+                else:
+                    current_time = datetime.now(timezone.utc)
+
+                if current_time > expiry_time:
+                    return {"valid": False, "error": "API key has expired"}
+
+            # Buffered; written by flush_last_used
+            now = datetime.now(timezone.utc)
+            self._last_used[key_data["key_id"]] = now
+
+            result = {
+                "valid": True,
+                "organization_id": key_data.get("organization_id"),
+                "key_id": key_data.get("key_id"),
+                "name": key_data.get("name"),
+                "permissions": key_data.get("permissions", []),
+                "created_at": key_data.get("created_at"),
+                "last_used": now.isoformat(),
+            }
+            result.update(metadata)
+            return result
 
         except Exception as e:
             logger.error(f"Error validating API key: {str(e)}")
@@ -405,20 +537,16 @@ class ApiKeyRepository:
         """Get all API keys for an organization (without plain key values)"""
         try:
             async with self.db:
-                result = await self.db.query_row(
-                    f"SELECT api_keys FROM {self.schema}.{self.organizations_table} WHERE organization_id = $1",
+                rows = await self.db.query(
+                    f"SELECT {_KEY_COLUMNS} FROM {self.schema}.{self.api_keys_table} "
+                    "WHERE organization_id = $1 ORDER BY created_at",
                     params=[organization_id],
                 )
 
-            if not result:
-                # No record yet — return empty list (personal accounts may not have a record)
-                return []
-
-            api_keys = self._parse_api_keys(result.get("api_keys", []))
-
             # Remove sensitive data from response
             cleaned_keys = []
-            for key_data in api_keys:
+            for row in rows or []:
+                key_data = _key_from_row(row)
                 if not api_key_matches_project(key_data, project_id):
                     continue
                 cleaned_keys.append(clean_api_key_for_listing(key_data))
@@ -432,37 +560,22 @@ class ApiKeyRepository:
     async def revoke_api_key(self, organization_id: str, key_id: str) -> bool:
         """Revoke (deactivate) an API key"""
         try:
+            now = datetime.now(timezone.utc)
             async with self.db:
-                result = await self.db.query_row(
-                    f"SELECT api_keys FROM {self.schema}.{self.organizations_table} WHERE organization_id = $1",
-                    params=[organization_id],
+                row = await self.db.query_row(
+                    f"""
+                    UPDATE {self.schema}.{self.api_keys_table}
+                    SET is_active = FALSE, revoked_at = $3
+                    WHERE organization_id = $1 AND key_id = $2
+                    RETURNING key_hash
+                    """,
+                    params=[organization_id, key_id, now],
                 )
 
-            if not result:
-                raise ValueError(
-                    f"Organization '{organization_id}' not found in database."
-                )
-
-            api_keys = self._parse_api_keys(result.get("api_keys", []))
-
-            key_found = False
-            for key_data in api_keys:
-                if key_data.get("key_id") == key_id:
-                    key_data["is_active"] = False
-                    key_data["revoked_at"] = datetime.now(timezone.utc).isoformat()
-                    key_found = True
-                    break
-
-            if not key_found:
+            if not row:
                 raise ValueError(f"API key not found: {key_id}")
 
-            now = datetime.now(timezone.utc)
-            async with self.db:
-                await self.db.execute(
-                    f"UPDATE {self.schema}.{self.organizations_table} SET api_keys = $1, updated_at = $2 WHERE organization_id = $3",
-                    params=[api_keys, now, organization_id],
-                )
-
+            await self._invalidate_keys([row["key_hash"]])
             return True
 
         except Exception as e:
@@ -473,31 +586,20 @@ class ApiKeyRepository:
         """Delete an API key permanently"""
         try:
             async with self.db:
-                result = await self.db.query_row(
-                    f"SELECT api_keys FROM {self.schema}.{self.organizations_table} WHERE organization_id = $1",
-                    params=[organization_id],
-                )
-
-            if not result:
-                raise ValueError(
-                    f"Organization '{organization_id}' not found in database."
+                row = await self.db.query_row(
+                    f"""
+                    DELETE FROM {self.schema}.{self.api_keys_table}
+                    WHERE organization_id = $1 AND key_id = $2
+                    RETURNING key_hash
+                    """,
+                    params=[organization_id, key_id],
                 )
 
-            api_keys = self._parse_api_keys(result.get("api_keys", []))
-
-            original_count = len(api_keys)
-            api_keys = [key for key in api_keys if key.get("key_id") != key_id]
-
-            if len(api_keys) == original_count:
+            if not row:
                 raise ValueError(f"API key not found: {key_id}")
 
-            now = datetime.now(timezone.utc)
-            async with self.db:
-                await self.db.execute(
-                    f"UPDATE {self.schema}.{self.organizations_table} SET api_keys = $1, updated_at = $2 WHERE organization_id = $3",
-                    params=[api_keys, now, organization_id],
-                )
-
+            self._last_used.pop(key_id, None)
+            await self._invalidate_keys([row["key_hash"]])
             return True
 
         except Exception as e:
@@ -518,26 +620,14 @@ class ApiKeyRepository:
         """
         try:
             async with self.db:
-                result = await self.db.query_row(
-                    f"SELECT api_keys FROM {self.schema}.{self.organizations_table} "
-                    "WHERE organization_id = $1",
-                    params=[organization_id],
+                row = await self.db.query_row(
+                    f"SELECT rate_limits FROM {self.schema}.{self.api_keys_table} "
+                    "WHERE organization_id = $1 AND key_id = $2",
+                    params=[organization_id, key_id],
                 )
-            if not result:
+            if not row:
                 return None
-            api_keys = self._parse_api_keys(result.get("api_keys", []))
-            for key_data in api_keys:
-                if key_data.get("key_id") == key_id:
-                    raw = key_data.get("rate_limits")
-                    if raw is None:
-                        return {}
-                    if isinstance(raw, str):
-                        try:
-                            return json.loads(raw)
-                        except Exception:
-                            return {}
-                    return raw
-            return None
+            return _as_dict(row.get("rate_limits"))
         except Exception as e:
             logger.error(f"Error reading api-key rate_limits {key_id}: {e}")
             return None
@@ -554,31 +644,18 @@ class ApiKeyRepository:
         """
         try:
             async with self.db:
-                result = await self.db.query_row(
-                    f"SELECT api_keys FROM {self.schema}.{self.organizations_table} "
-                    "WHERE organization_id = $1",
-                    params=[organization_id],
+                row = await self.db.query_row(
+                    f"""
+                    UPDATE {self.schema}.{self.api_keys_table}
+                    SET rate_limits = $3::jsonb
+                    WHERE organization_id = $1 AND key_id = $2
+                    RETURNING key_hash
+                    """,
+                    params=[organization_id, key_id, json.dumps(rate_limits)],
                 )
-            if not result:
+            if not row:
                 return None
-            api_keys = self._parse_api_keys(result.get("api_keys", []))
-
-            updated = False
-            for key_data in api_keys:
-                if key_data.get("key_id") == key_id:
-                    key_data["rate_limits"] = rate_limits
-                    updated = True
-                    break
-            if not updated:
-                return None
-
-            now = datetime.now(timezone.utc)
-            async with self.db:
-                await self.db.execute(
-                    f"UPDATE {self.schema}.{self.organizations_table} "
-                    "SET api_keys = $1, updated_at = $2 WHERE organization_id = $3",
-                    params=[api_keys, now, organization_id],
-                )
+            await self._invalidate_keys([row["key_hash"]])
             return rate_limits
         except Exception as e:
             logger.error(f"Error updating api-key rate_limits {key_id}: {e}")
@@ -589,40 +666,21 @@ class ApiKeyRepository:
         try:
             async with self.db:
                 rows = await self.db.query(
-                    f"SELECT organization_id, api_keys FROM {self.schema}.{self.organizations_table} WHERE api_keys IS NOT NULL",
-                    params=[],
+                    f"""
+                    DELETE FROM {self.schema}.{self.api_keys_table}
+                    WHERE expires_at IS NOT NULL AND expires_at <= $1
+                    RETURNING key_id, key_hash
+                    """,
+                    params=[datetime.now(timezone.utc)],
                 )
 
             if not rows:
                 return 0
 
-            total_removed = 0
-
             for row in rows:
-                api_keys = self._parse_api_keys(row.get("api_keys", []))
-
-                now = datetime.now(timezone.utc)
-                original_count = len(api_keys)
-
-                api_keys = [
-                    key
-                    for key in api_keys
-                    if not (
-                        key.get("expires_at")
-                        and datetime.fromisoformat(key["expires_at"]) <= now
-                    )
-                ]
-
-                removed_count = original_count - len(api_keys)
-                if removed_count > 0:
-                    async with self.db:
-                        await self.db.execute(
-                            f"UPDATE {self.schema}.{self.organizations_table} SET api_keys = $1, updated_at = $2 WHERE organization_id = $3",
-                            params=[api_keys, now, row["organization_id"]],
-                        )
-                    total_removed += removed_count
-
-            return total_removed
+                self._last_used.pop(row["key_id"], None)
+            await self._invalidate_keys([row["key_hash"] for row in rows])
+            return len(rows)
 
         except Exception as e:
             logger.error(f"Error cleaning up expired keys: {str(e)}")
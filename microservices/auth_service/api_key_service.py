@@ -1,6 +1,6 @@
 """
 API Key Service - API key authentication service
-Uses organizations.api_keys JSONB field like the main project
+Keys are stored in auth.api_keys (see ApiKeyRepository)
 """
 
 import logging
@@ -199,6 +199,8 @@ class ApiKeyService:
                 ) = await self._resolve_effective_rate_limits(
                     result.get("organization_id"),
                     result.get("key_id"),
+                    # Already on the (cached) key record; saves a DB read
+                    key_limits=result.get("rate_limits"),
                 )
                 rate_limit_error = await self._enforce_request_limits(
                     organization_id=result.get("organization_id"),
@@ -388,12 +390,12 @@ class ApiKeyService:
         self,
         organization_id: Optional[str],
         key_id: Optional[str],
+        key_limits: Optional[Dict[str, Any]] = None,
     ) -> tuple[Dict[str, Optional[int]], Dict[str, str]]:
         org_limits = await self._get_org_rate_limits(organization_id)
         if not isinstance(org_limits, dict):
             org_limits = {}
-        key_limits: Optional[Dict[str, Any]] = {}
-        if organization_id and key_id:
+        if key_limits is None and organization_id and key_id:
             key_limits = await self.repository.get_api_key_rate_limits(
                 organization_id, key_id
             )
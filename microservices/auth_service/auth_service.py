@@ -29,6 +29,7 @@ from .protocols import (
     AuthRepositoryProtocol,
 )
 from .models import AuthProvider
+from .password_hasher import PasswordHasher, PasswordHasherBusy
 
 # Type checking imports (not executed at runtime)
 if TYPE_CHECKING:
@@ -84,6 +85,7 @@ class AuthenticationService:
         oauth_client_repository: Optional[Any] = None,
         config: Optional["ConfigManager"] = None,
         authorization_code_service: Optional[Any] = None,
+        password_hasher: Optional[PasswordHasher] = None,
     ):
         """
         Initialize authentication service with injected dependencies.
@@ -98,6 +100,7 @@ class AuthenticationService:
             oauth_client_repository: OAuth client repository for machine-to-machine auth
             config: Configuration manager (optional, for backwards compatibility)
             authorization_code_service: AuthorizationCodeService for auth code grant
+            password_hasher: Off-loop bcrypt pool (default: one per service)
         """
         # Store injected dependencies
         self.jwt_manager = jwt_manager
@@ -108,6 +111,7 @@ class AuthenticationService:
         self.auth_repository = auth_repository
         self.oauth_client_repository = oauth_client_repository
         self._auth_code_service = authorization_code_service
+        self.password_hasher = password_hasher or PasswordHasher()
 
         # Auth0 configuration (for OAuth integration)
         self.auth0_domain = (
@@ -509,9 +513,11 @@ class AuthenticationService:
         # Hash password for storage
         password_hash = None
         if password:
-            from .password_utils import hash_password
-
-            password_hash = hash_password(password)
+            try:
+                password_hash = await self.password_hasher.hash(password)
+            except PasswordHasherBusy as e:
+                # Keep the pending registration so the same code can be retried
+                return self._hasher_busy(e)
 
         # Store user in auth repository with password hash
         if self.auth_repository:
@@ -1207,13 +1213,16 @@ class AuthenticationService:
                 }
 
             # Verify password
-            from .password_utils import verify_password
-
-            if not verify_password(password, password_hash):
+            try:
+                password_ok = await self.password_hasher.verify(password, password_hash)
+            except PasswordHasherBusy as e:
+                return self._hasher_busy(e)
+            if not password_ok:
                 logger.warning(
                     f"Login failed: invalid password for user {user['user_id']}"
                 )
                 return {"success": False, "error": "Invalid email or password"}
+            self._upgrade_password_hash(user["user_id"], password, password_hash)
 
             # Update last login timestamp
             await self.auth_repository.update_last_login(user["user_id"])
@@ -1250,6 +1259,28 @@ class AuthenticationService:
             logger.error(f"Login failed with exception: {e}")
             return {"success": False, "error": "Login failed"}
 
+    def _upgrade_password_hash(
+        self, user_id: str, password: str, password_hash: str
+    ) -> None:
+        """Re-hash at the current bcrypt cost after a successful login"""
+        if self.password_hasher.needs_rehash(password_hash):
+            self.password_hasher.rehash_in_background(
+                password,
+                lambda new_hash: self.auth_repository.set_password_hash(
+                    user_id, new_hash
+                ),
+            )
+
+    @staticmethod
+    def _hasher_busy(error: PasswordHasherBusy) -> Dict[str, Any]:
+        """Result for a request shed by the password hashing pool"""
+        logger.warning(f"Password hashing overloaded: {error}")
+        return {
+            "success": False,
+            "error": "Authentication is temporarily overloaded, please retry",
+            "retry_after": error.retry_after,
+        }
+
     # ============================================
     # Admin Authentication
     # ============================================
@@ -1304,13 +1335,16 @@ class AuthenticationService:
                 )
                 return {"success": False, "error": "Invalid email or password"}
 
-            from .password_utils import verify_password
-
-            if not verify_password(password, password_hash):
+            try:
+                password_ok = await self.password_hasher.verify(password, password_hash)
+            except PasswordHasherBusy as e:
+                return self._hasher_busy(e)
+            if not password_ok:
                 logger.warning(
                     f"Admin login failed: invalid password for user {user['user_id']}"
                 )
                 return {"success": False, "error": "Invalid email or password"}
+            self._upgrade_password_hash(user["user_id"], password, password_hash)
 
             # Check admin_roles — must have at least one admin role
             admin_roles = user.get("admin_roles")
@@ -1530,3 +1564,4 @@ class AuthenticationService:
         """Close HTTP client and cleanup resources"""
         if self._http_client:
             await self._http_client.aclose()
+        await self.password_hasher.close()
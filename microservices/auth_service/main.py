@@ -48,6 +48,7 @@ from core.logger import setup_service_logger
 from core.nats_client import NATSEventBus, get_event_bus
 from core.rate_limit_backend import build_rate_limit_backend
 from core.rate_limiter import RateLimitConfig, RateLimitMiddleware
+from core.discovery_cache import close_discovery_caches
 
 from .api_key_repository import ApiKeyRepository
 from .api_key_service import ApiKeyService, raise_api_key_rate_limit_if_present
@@ -429,6 +430,7 @@ class AuthMicroservice:
                 organization_service_client=self.organization_service_client,
                 config=config_manager,
             )
+            self.api_key_repository.start()
             self.oauth_client_repository = OAuthClientRepository(config=config_manager)
             self.auth_repository = AuthRepository(config=config_manager)
             self.device_auth_repository = DeviceAuthRepository(
@@ -488,6 +490,8 @@ class AuthMicroservice:
             await self.project_access_client.close()
         if self.api_key_service:
             await self.api_key_service.close()
+        if self.api_key_repository:
+            await self.api_key_repository.close()
         logger.info("Authentication microservice shutdown completed")
 
 
@@ -509,6 +513,7 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
     await auth_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -621,6 +626,16 @@ def _return_refresh_in_body() -> bool:
     return _env_bool("RETURN_REFRESH_TOKEN_IN_BODY", default=False)
 
 
+def _raise_if_overloaded(result: Dict[str, Any]) -> None:
+    """503 + Retry-After when the password hashing pool shed the request."""
+    if result.get("retry_after"):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=result.get("error"),
+            headers={"Retry-After": str(result["retry_after"])},
+        )
+
+
 # Dependency Injection
 
 
@@ -1299,6 +1314,7 @@ async def verify_registration(
         result = await auth_service.verify_registration(
             pending_registration_id=request.pending_registration_id, code=request.code
         )
+        _raise_if_overloaded(result)
         if not result.get("success"):
             return RegistrationVerifyResponse(success=False, error=result.get("error"))
         return RegistrationVerifyResponse(
@@ -1351,6 +1367,7 @@ async def login(
             organization_id=request.organization_id,
         )
 
+        _raise_if_overloaded(result)
         if not result.get("success"):
             # Return 401 for invalid credentials
             raise HTTPException(
@@ -1450,6 +1467,7 @@ async def admin_login(
             password=request.password,
         )
 
+        _raise_if_overloaded(result)
         if not result.get("success"):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,207 @@
+"""
+Password Hasher for Authentication Service
+
+Runs bcrypt on a bounded worker pool so a login never blocks the event loop
+for the bcrypt cost. bcrypt releases the GIL while hashing, so a thread pool
+sized to the CPU count gives real parallelism without process start-up or
+pickling overhead.
+
+- at most ``max_queue`` jobs may be queued or running; beyond that calls
+  fail fast with ``PasswordHasherBusy`` instead of piling up behind a login
+  storm (token verification and every other request keep their latency)
+- hashes made with a different cost than ``BCRYPT_ROUNDS`` are upgraded
+  in the background after a successful login, using spare capacity only
+
+Configuration (env):
+    PASSWORD_HASH_WORKERS       worker threads (default: CPU count)
+    PASSWORD_HASH_MAX_QUEUE     queued + running jobs before shedding
+                                (default: 8 per worker)
+
+Usage:
+    hasher = PasswordHasher()
+    ok = await hasher.verify(password, password_hash)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional, Set
+
+from core.metrics import create_counter, create_gauge, create_histogram
+
+from . import password_utils
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_QUEUE_DEPTH = create_gauge(
+    "auth_password_hash_queue_depth",
+    "Password hash jobs queued or running",
+)
+PASSWORD_HASH_OPERATIONS = create_counter(
+    "auth_password_hash_operations_total",
+    "Password hash operations by outcome",
+    ["operation", "result"],
+)
+PASSWORD_HASH_WAIT_SECONDS = create_histogram(
+    "auth_password_hash_wait_seconds",
+    "Time a password hash job waits for a worker",
+    ["operation"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+class PasswordHasher:
+    """Async bcrypt with a bounded worker pool and admission control"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        rounds: Optional[int] = None,
+    ):
+        self.max_workers = max_workers or _int_env(
+            "PASSWORD_HASH_WORKERS", os.cpu_count() or 1
+        )
+        self.max_queue = max_queue or _int_env(
+            "PASSWORD_HASH_MAX_QUEUE", self.max_workers * 8
+        )
+        self.rounds = password_utils.BCRYPT_ROUNDS if rounds is None else rounds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        # Moving average of one job's duration, for Retry-After estimates
+        self._avg_seconds = 0.25
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running"""
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost"""
+        return await self._run(
+            "hash", password_utils.hash_password, password, self.rounds
+        )
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against its hash"""
+        return await self._run(
+            "verify", password_utils.verify_password, password, password_hash
+        )
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if the hash uses a different cost than configured"""
+        return password_utils.password_needs_rehash(password_hash, self.rounds)
+
+    def rehash_in_background(
+        self, password: str, save: Callable[[str], Awaitable[object]]
+    ) -> bool:
+        """
+        Hash ``password`` at the current cost and pass it to ``save``.
+
+        Skipped (returns False) when the pool is more than half busy; the
+        hash is upgraded on a later login instead of competing with logins.
+        """
+        if self._pending * 2 >= self.max_queue:
+            PASSWORD_HASH_OPERATIONS.labels(operation="rehash", result="deferred").inc()
+            return False
+
+        async def run():
+            try:
+                await save(await self.hash(password))
+                PASSWORD_HASH_OPERATIONS.labels(operation="rehash", result="ok").inc()
+            except PasswordHasherBusy:
+                pass
+            except Exception as e:
+                logger.warning(f"Password rehash failed: {e}")
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def close(self) -> None:
+        """Let background rehashes finish, then stop the workers"""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ------------------------------------------------------------------
+
+    async def _run(self, operation: str, fn, *args):
+        if self._pending >= self.max_queue:
+            PASSWORD_HASH_OPERATIONS.labels(operation=operation, result="shed").inc()
+            raise PasswordHasherBusy(self._retry_after())
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        timing = {}
+
+        def job():
+            timing["started"] = time.monotonic()
+            PASSWORD_HASH_WAIT_SECONDS.labels(operation=operation).observe(
+                timing["started"] - submitted
+            )
+            try:
+                return fn(*args)
+            finally:
+                timing["elapsed"] = time.monotonic() - timing["started"]
+
+        def done(_future):
+            try:
+                loop.call_soon_threadsafe(self._release, timing.get("elapsed"))
+            except RuntimeError:
+                pass  # loop already closed at shutdown
+
+        self._pending += 1
+        PASSWORD_HASH_QUEUE_DEPTH.set(self._pending)
+        try:
+            future = self._executor.submit(job)
+        except RuntimeError:
+            # Executor shut down underneath us
+            self._release(None)
+            raise
+        # The slot is released when the job finishes (or is cancelled before
+        # it starts), not when the caller stops waiting, so an abandoned
+        # request still counts while its bcrypt call runs
+        future.add_done_callback(done)
+        result = await asyncio.wrap_future(future)
+        PASSWORD_HASH_OPERATIONS.labels(operation=operation, result="ok").inc()
+        return result
+
+    def _release(self, elapsed: Optional[float]) -> None:
+        self._pending -= 1
+        PASSWORD_HASH_QUEUE_DEPTH.set(self._pending)
+        if elapsed is not None:
+            self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * elapsed
+
+    def _retry_after(self) -> int:
+        """Seconds until the current queue should have drained"""
+        return max(1, math.ceil(self._pending * self._avg_seconds / self.max_workers))
+
+
+__all__ = ["PasswordHasher", "PasswordHasherBusy"]
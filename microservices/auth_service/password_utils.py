@@ -5,26 +5,32 @@ Provides secure password hashing and verification using bcrypt.
 """
 
 import logging
+import os
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-# Bcrypt work factor (12 is a good balance of security and performance)
-BCRYPT_ROUNDS = 12
+# Bcrypt work factor (12 is a good balance of security and performance).
+# Hashes with a different cost are upgraded on the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a password using bcrypt.
 
+    Blocks for the full bcrypt cost; async callers should go through
+    ``PasswordHasher`` instead.
+
     Args:
         password: Plain text password
+        rounds: Bcrypt cost (default BCRYPT_ROUNDS)
 
     Returns:
         Bcrypt hash string
     """
     import bcrypt
-    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS if rounds is None else rounds)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -51,6 +57,24 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+def password_needs_rehash(password_hash: str, rounds: Optional[int] = None) -> bool:
+    """
+    Check if a hash was made with a different bcrypt cost than configured.
+
+    Args:
+        password_hash: Bcrypt hash ("$2b$<cost>$...")
+        rounds: Expected cost (default BCRYPT_ROUNDS)
+
+    Returns:
+        True if the hash should be regenerated
+    """
+    expected = BCRYPT_ROUNDS if rounds is None else rounds
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return False  # Not a bcrypt hash we understand; leave it alone
+    return int(parts[2]) != expected
+
+
 def is_password_strong(password: str, min_length: int = 8) -> tuple[bool, Optional[str]]:
     """
     Check if password meets minimum security requirements.
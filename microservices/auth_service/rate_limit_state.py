@@ -4,10 +4,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Any, Dict, Mapping, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from core.rate_limit_backend import build_sliding_window_counter
-from core.rate_limiter import RateLimitConfig, SlidingWindowCounter
+from core.rate_limiter import (
+    GCRA,
+    SLIDING_WINDOW,
+    RateLimitConfig,
+    SlidingWindowCounter,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,14 @@ REQUEST_RATE_WINDOWS = {
     "requests_per_day": 86_400,
 }
 
+# O(1) state per key: a per-request log for a day-long window held one
+# entry per request per API key
+REQUEST_RATE_ALGORITHMS = {
+    "requests_per_second": GCRA,
+    "requests_per_minute": SLIDING_WINDOW,
+    "requests_per_day": SLIDING_WINDOW,
+}
+
 
 def merge_rate_limits(
     org_limits: Optional[Mapping[str, Any]],
@@ -100,35 +113,32 @@ class RequestRateLimiter:
         effective_limits: Mapping[str, Optional[int]],
         field_sources: Mapping[str, str],
     ) -> None:
-        """Increment request counters and raise on the first exceeded limit."""
-
-        for field, window_seconds in REQUEST_RATE_WINDOWS.items():
-            limit = effective_limits.get(field)
-            if limit is None:
-                continue
-
-            source = field_sources.get(field, "unset")
-            if source == "unset":
-                continue
-
-            scope_id = key_id if source == "api_key" else organization_id
-            rate_key = self._rate_key(
-                field=field,
-                source=source,
-                organization_id=organization_id,
-                key_id=key_id,
-            )
-            allowed, info = await self.counter.check(
-                rate_key,
-                RateLimitConfig(requests=int(limit), window_seconds=window_seconds),
-            )
-            if not allowed:
+        """Count the request against every configured limit, or raise.
+
+        All limits are checked in one backend call; a rejected request is
+        not counted against any of them.
+        """
+
+        checks = self._limit_checks(
+            organization_id=organization_id,
+            key_id=key_id,
+            effective_limits=effective_limits,
+            field_sources=field_sources,
+        )
+        allowed, results = await self.counter.check_many(
+            [(rate_key, config) for _, _, rate_key, config in checks]
+        )
+        if allowed:
+            return
+
+        for (field, source, _, config), result in zip(checks, results):
+            if not result.allowed:
                 raise RequestRateLimitExceeded(
                     field=field,
-                    limit=int(limit),
-                    retry_after=int(info.get("retry_after", window_seconds)),
+                    limit=config.requests,
+                    retry_after=result.retry_after or config.window_seconds,
                     source=source,
-                    scope_id=scope_id,
+                    scope_id=key_id if source == "api_key" else organization_id,
                 )
 
     async def snapshot_request_usage(
@@ -141,23 +151,25 @@ class RequestRateLimiter:
     ) -> Dict[str, Dict[str, Any]]:
         """Read current request counts without incrementing counters."""
 
-        usage: Dict[str, Dict[str, Any]] = {}
-        backend = getattr(self.counter, "backend", None)
-        get_count = getattr(backend, "get_count", None)
+        checks = self._limit_checks(
+            organization_id=organization_id,
+            key_id=key_id,
+            effective_limits=effective_limits,
+            field_sources=field_sources,
+        )
+        results = await self.counter.peek(
+            [(rate_key, config) for _, _, rate_key, config in checks]
+        )
+        used_by_field = {
+            field: max(config.requests - result.remaining, 0)
+            for (field, _, _, config), result in zip(checks, results)
+        }
 
+        usage: Dict[str, Dict[str, Any]] = {}
         for field, window_seconds in REQUEST_RATE_WINDOWS.items():
             limit = effective_limits.get(field)
             source = field_sources.get(field, "unset")
-            used = 0
-
-            if callable(get_count) and limit is not None and source != "unset":
-                rate_key = self._rate_key(
-                    field=field,
-                    source=source,
-                    organization_id=organization_id,
-                    key_id=key_id,
-                )
-                used = int(await get_count(rate_key, window_seconds))
+            used = used_by_field.get(field, 0)
 
             remaining = None if limit is None else max(int(limit) - used, 0)
             percentage = None
@@ -175,6 +187,36 @@ class RequestRateLimiter:
 
         return usage
 
+    def _limit_checks(
+        self,
+        *,
+        organization_id: str,
+        key_id: str,
+        effective_limits: Mapping[str, Optional[int]],
+        field_sources: Mapping[str, str],
+    ) -> List[Tuple[str, str, str, RateLimitConfig]]:
+        """(field, source, rate key, config) for every configured request limit."""
+
+        checks = []
+        for field, window_seconds in REQUEST_RATE_WINDOWS.items():
+            limit = effective_limits.get(field)
+            source = field_sources.get(field, "unset")
+            if limit is None or source == "unset":
+                continue
+            rate_key = self._rate_key(
+                field=field,
+                source=source,
+                organization_id=organization_id,
+                key_id=key_id,
+            )
+            config = RateLimitConfig(
+                requests=int(limit),
+                window_seconds=window_seconds,
+                algorithm=REQUEST_RATE_ALGORITHMS[field],
+            )
+            checks.append((field, source, rate_key, config))
+        return checks
+
     @staticmethod
     def _rate_key(
         *,
@@ -18,6 +18,7 @@ sys.path.append(
 from isa_common import AsyncPostgresClient
 from google.protobuf.json_format import MessageToDict
 from core.config_manager import ConfigManager
+from core.stat_rollups import CounterRollup, RollupSpec
 from .models import (
     ResourcePermission,
     UserPermissionRecord,
@@ -81,10 +82,36 @@ class AuthorizationRepository:
         self.schema = "authz"
         self.table_name = "permissions"
 
+        # Service statistics counters (core.stat_rollups); reconciled by
+        # main.lifespan. Revocations/expiry only show up after the next
+        # full reconcile, hence the short (cluster-wide) interval. Per-user
+        # values are only counted, never listed.
+        self.permissions_rollup = CounterRollup(
+            self.db,
+            RollupSpec(
+                name="permissions",
+                source_table=f"{self.schema}.{self.table_name}",
+                where="is_active = TRUE",
+                dimensions={
+                    "permission_type": "permission_type",
+                    "user": "CASE WHEN permission_type = 'user_permission' THEN target_id END",
+                    "resource_type": "CASE WHEN permission_type = 'resource_config' THEN resource_type END",
+                },
+                full_reconcile_interval=300.0,
+                count_only=("user",),
+            ),
+            schema=self.schema,
+        )
+
         # Initialize service clients for cross-service communication
         self.account_client = AccountServiceClient()
         self.org_client = OrganizationServiceClient()
 
+    @property
+    def stat_rollups(self) -> List[CounterRollup]:
+        """Counter rollups maintained for this repository's statistics"""
+        return [self.permissions_rollup]
+
     def _convert_proto_jsonb(self, jsonb_raw):
         """Convert proto JSONB to Python dict"""
         if hasattr(jsonb_raw, "fields"):
@@ -313,6 +340,13 @@ class AuthorizationRepository:
                 count = await self.db.execute(query, params=params)
 
             if count is not None and count > 0:
+                if permission.is_active:
+                    await self.permissions_rollup.increment(
+                        {
+                            "permission_type": "user_permission",
+                            "user": permission.user_id,
+                        }
+                    )
                 return await self.get_user_permission(
                     permission.user_id,
                     permission.resource_type,
@@ -715,6 +749,18 @@ class AuthorizationRepository:
 
     async def get_service_statistics(self) -> Dict[str, Any]:
         """Get service-wide statistics"""
+        try:
+            snapshot = await self.permissions_rollup.snapshot()
+            return {
+                "total_permissions": snapshot.count(
+                    "permission_type", "user_permission"
+                ),
+                "active_users": snapshot.distinct("user"),
+                "resource_types": snapshot.distinct("resource_type"),
+            }
+        except Exception as e:
+            logger.warning(f"Permission rollup unavailable, scanning rows: {e}")
+
         try:
             async with self.db:
                 # Count total user permissions
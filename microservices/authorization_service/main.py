@@ -23,6 +23,8 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.stat_rollups import RollupReconciler
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 # Import internal modules
@@ -59,6 +61,7 @@ logger = app_logger  # for backward compatibility
 authorization_service = None
 event_bus = None  # NATS event bus
 consul_registry = None  # Consul service registry
+stats_reconciler = None  # Statistics rollup reconciliation loop
 shutdown_manager = GracefulShutdown("authorization_service")
 
 
@@ -66,7 +69,7 @@ shutdown_manager = GracefulShutdown("authorization_service")
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
     shutdown_manager.install_signal_handlers()
-    global authorization_service, event_bus, consul_registry
+    global authorization_service, event_bus, consul_registry, stats_reconciler
 
     # Startup
     logger.info("🚀 Authorization Service starting up...")
@@ -102,6 +105,10 @@ async def lifespan(app: FastAPI):
         # Initialize default permissions
         await authorization_service.initialize_default_permissions()
 
+        # Keep the /stats counters reconciled with the permissions table
+        stats_reconciler = RollupReconciler(authorization_service.repository.stat_rollups)
+        stats_reconciler.start()
+
         # Consul service registration
         if config.consul_enabled:
             try:
@@ -143,6 +150,9 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
 
+    if stats_reconciler:
+        await stats_reconciler.stop()
+
     # Consul deregistration
     if consul_registry:
         try:
@@ -161,6 +171,7 @@ async def lifespan(app: FastAPI):
     if authorization_service:
         await authorization_service.cleanup()
     logger.info("✅ Authorization Service shutdown completed")
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -21,6 +21,7 @@ from isa_common.consul_client import ConsulRegistry
 
 from core.admin_audit import publish_admin_action
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from .billing_repository import BillingRepository
 from .billing_service import BillingService
@@ -187,6 +188,7 @@ async def lifespan(app: FastAPI):
         if repository:
             await repository.close()
             logger.info("Billing service database connections closed")
+    close_discovery_caches()
 
 
 # 创建 FastAPI 应用
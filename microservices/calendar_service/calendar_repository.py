@@ -4,6 +4,7 @@ Calendar Repository
 日历事件数据访问层 - PostgreSQL + gRPC (Async)
 """
 
+import json
 import logging
 import os
 import sys
@@ -38,6 +39,10 @@ def _pg_min_pool() -> int:
 logger = logging.getLogger(__name__)
 
 
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
 class CalendarRepository:
     """日历事件数据访问层 - PostgreSQL (Async)"""
 
@@ -68,6 +73,7 @@ class CalendarRepository:
         self.schema = "calendar"
         self.table_name = "calendar_events"
         self.sync_table = "calendar_sync_status"
+        self.reminder_table = "calendar_reminders"
 
     async def create_event(self, event_data: Dict[str, Any]) -> Optional[EventResponse]:
         """创建日历事件"""
@@ -490,6 +496,358 @@ class CalendarRepository:
             logger.error(f"Failed to upsert external calendar event: {e}")
             return None
 
+    # ====================
+    # 外部日历增量同步 (sync_engine.py)
+    # ====================
+
+    async def claim_due_syncs(
+        self, owner: str, limit: int, ttl_seconds: float
+    ) -> List[Dict[str, Any]]:
+        """以租约方式认领到期的同步任务 (SKIP LOCKED, 多副本互不阻塞)"""
+        table = f"{self.schema}.{self.sync_table}"
+        query = f"""
+            UPDATE {table} AS s
+            SET claimed_by = $1,
+                claim_expires_at = NOW() + make_interval(secs => $3),
+                updated_at = NOW()
+            WHERE s.id IN (
+                SELECT id FROM {table}
+                WHERE status <> 'disabled'
+                  AND next_sync_at <= NOW()
+                  AND (claim_expires_at IS NULL OR claim_expires_at < NOW())
+                ORDER BY next_sync_at
+                LIMIT $2
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING s.*
+        """
+        async with self.db:
+            results = await self.db.query(
+                query, params=[owner, limit, float(ttl_seconds)]
+            )
+        return results or []
+
+    async def complete_sync(
+        self,
+        user_id: str,
+        provider: str,
+        *,
+        status: str,
+        next_sync_at: datetime,
+        synced_count: int = 0,
+        sync_token: Optional[str] = None,
+        error_message: Optional[str] = None,
+        failed: bool = False,
+    ) -> bool:
+        """记录一次同步结果，安排下次同步并释放租约"""
+        table = f"{self.schema}.{self.sync_table}"
+        query = f"""
+            INSERT INTO {table} (
+                user_id, provider, last_sync_time, synced_events_count, status,
+                error_message, sync_token, next_sync_at, consecutive_failures,
+                created_at, updated_at
+            ) VALUES (
+                $1, $2, NOW(), $3, $4, $5, $6, $7,
+                CASE WHEN $8::boolean THEN 1 ELSE 0 END, NOW(), NOW()
+            )
+            ON CONFLICT (user_id, provider) DO UPDATE
+            SET last_sync_time = EXCLUDED.last_sync_time,
+                synced_events_count = EXCLUDED.synced_events_count,
+                status = EXCLUDED.status,
+                error_message = EXCLUDED.error_message,
+                sync_token = COALESCE(EXCLUDED.sync_token, {table}.sync_token),
+                next_sync_at = EXCLUDED.next_sync_at,
+                consecutive_failures = CASE
+                    WHEN $8::boolean THEN {table}.consecutive_failures + 1 ELSE 0
+                END,
+                claimed_by = NULL,
+                claim_expires_at = NULL,
+                updated_at = NOW()
+        """
+        try:
+            async with self.db:
+                count = await self.db.execute(
+                    query,
+                    params=[
+                        user_id,
+                        provider,
+                        synced_count,
+                        status,
+                        error_message,
+                        sync_token,
+                        next_sync_at,
+                        failed,
+                    ],
+                )
+            return count is not None and count >= 0
+        except Exception as e:
+            logger.error(f"Failed to record {provider} sync for user {user_id}: {e}")
+            return False
+
+    async def bulk_upsert_external_events(
+        self, user_id: str, provider: str, events: List[Dict[str, Any]]
+    ) -> int:
+        """
+        批量写入外部日历事件 (单条语句, jsonb_to_recordset 展开)
+
+        本地可编辑字段 (category/color/reminders) 不被覆盖; 内容未变化的行
+        不重写，避免增量同步制造无意义的行版本。
+        """
+        if not events:
+            return 0
+        payload = [
+            {
+                "event_id": f"evt_{uuid.uuid4().hex[:16]}",
+                "external_event_id": e["external_event_id"],
+                "title": e["title"],
+                "description": e.get("description"),
+                "location": e.get("location"),
+                "start_time": _isoformat(e["start_time"]),
+                "end_time": _isoformat(e["end_time"]),
+                "all_day": e.get("all_day", False),
+                "timezone": e.get("timezone", "UTC"),
+                "recurrence_rule": e.get("recurrence_rule"),
+                "metadata": e.get("metadata") or {},
+            }
+            for e in events
+        ]
+        table = f"{self.schema}.{self.table_name}"
+        query = f"""
+            INSERT INTO {table} (
+                event_id, user_id, title, description, location,
+                start_time, end_time, all_day, timezone, category,
+                recurrence_type, recurrence_rule, reminders, sync_provider,
+                external_event_id, last_synced_at, is_shared, shared_with,
+                metadata, created_at, updated_at
+            )
+            SELECT
+                r.event_id, $1, r.title, r.description, r.location,
+                r.start_time, r.end_time, r.all_day, r.timezone, 'other',
+                'none', r.recurrence_rule, '[]'::jsonb, $2,
+                r.external_event_id, NOW(), FALSE, '{{}}',
+                r.metadata, NOW(), NOW()
+            FROM jsonb_to_recordset($3::jsonb) AS r(
+                event_id VARCHAR, external_event_id VARCHAR, title VARCHAR,
+                description TEXT, location VARCHAR, start_time TIMESTAMPTZ,
+                end_time TIMESTAMPTZ, all_day BOOLEAN, timezone VARCHAR,
+                recurrence_rule TEXT, metadata JSONB
+            )
+            ON CONFLICT (user_id, sync_provider, external_event_id)
+                WHERE external_event_id IS NOT NULL
+            DO UPDATE SET
+                title = EXCLUDED.title,
+                description = EXCLUDED.description,
+                location = EXCLUDED.location,
+                start_time = EXCLUDED.start_time,
+                end_time = EXCLUDED.end_time,
+                all_day = EXCLUDED.all_day,
+                timezone = EXCLUDED.timezone,
+                recurrence_rule = EXCLUDED.recurrence_rule,
+                metadata = EXCLUDED.metadata,
+                last_synced_at = EXCLUDED.last_synced_at,
+                updated_at = EXCLUDED.updated_at
+            WHERE ({table}.title, {table}.description, {table}.location,
+                   {table}.start_time, {table}.end_time, {table}.all_day,
+                   {table}.timezone, {table}.recurrence_rule, {table}.metadata)
+                IS DISTINCT FROM
+                  (EXCLUDED.title, EXCLUDED.description, EXCLUDED.location,
+                   EXCLUDED.start_time, EXCLUDED.end_time, EXCLUDED.all_day,
+                   EXCLUDED.timezone, EXCLUDED.recurrence_rule, EXCLUDED.metadata)
+        """
+        async with self.db:
+            count = await self.db.execute(
+                query, params=[user_id, provider, json.dumps(payload, default=str)]
+            )
+        return count or 0
+
+    async def delete_external_events(
+        self, user_id: str, provider: str, external_event_ids: List[str]
+    ) -> int:
+        """删除上游已删除/取消的外部事件"""
+        if not external_event_ids:
+            return 0
+        query = f"""
+            DELETE FROM {self.schema}.{self.table_name}
+            WHERE user_id = $1
+              AND sync_provider = $2
+              AND external_event_id = ANY($3::varchar[])
+        """
+        async with self.db:
+            count = await self.db.execute(
+                query, params=[user_id, provider, list(external_event_ids)]
+            )
+        return count or 0
+
+    async def prune_external_events(
+        self,
+        user_id: str,
+        provider: str,
+        keep_external_event_ids: List[str],
+        window_start: datetime,
+        window_end: datetime,
+    ) -> int:
+        """全量同步后清理: 删除同步窗口内上游已不存在的事件 (窗口外的历史事件保留)"""
+        query = f"""
+            DELETE FROM {self.schema}.{self.table_name}
+            WHERE user_id = $1
+              AND sync_provider = $2
+              AND external_event_id IS NOT NULL
+              AND end_time >= $4
+              AND start_time <= $5
+              AND external_event_id <> ALL($3::varchar[])
+        """
+        async with self.db:
+            count = await self.db.execute(
+                query,
+                params=[
+                    user_id,
+                    provider,
+                    list(keep_external_event_ids),
+                    window_start,
+                    window_end,
+                ],
+            )
+        return count or 0
+
+    # ====================
+    # 提醒 (reminder_scheduler.py)
+    # ====================
+
+    async def replace_event_reminders(
+        self,
+        event_id: str,
+        user_id: str,
+        title: str,
+        start_time: datetime,
+        minutes_before: List[int],
+    ) -> List[Dict[str, Any]]:
+        """同步事件的未发送提醒: 删除不再需要的，新增/更新其余的 (已发送的保留)"""
+        try:
+            if isinstance(start_time, str):
+                start_time = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
+            table = f"{self.schema}.{self.reminder_table}"
+
+            delete_query = f"""
+                DELETE FROM {table}
+                WHERE event_id = $1
+                  AND status IN ('pending', 'claimed')
+                  AND NOT (event_start = $2 AND minutes_before = ANY($3::int[]))
+            """
+            # 只为尚未到期的提醒建行；标题变化时刷新未发送的行
+            upsert_query = f"""
+                INSERT INTO {table} (
+                    event_id, user_id, title, event_start, minutes_before, remind_at
+                )
+                SELECT $1, $2, $3, $4, m, $4 - make_interval(mins => m)
+                FROM unnest($5::int[]) AS m
+                WHERE $4 - make_interval(mins => m) > NOW()
+                ON CONFLICT (event_id, event_start, minutes_before) DO UPDATE
+                SET title = EXCLUDED.title, updated_at = NOW()
+                WHERE {table}.status IN ('pending', 'claimed')
+                RETURNING *
+            """
+
+            async with self.db:
+                await self.db.execute(
+                    delete_query, params=[event_id, start_time, minutes_before]
+                )
+                if not minutes_before:
+                    return []
+                results = await self.db.query(
+                    upsert_query,
+                    params=[event_id, user_id, title, start_time, minutes_before],
+                )
+            return results or []
+
+        except Exception as e:
+            logger.error(f"Failed to replace reminders for event {event_id}: {e}")
+            raise
+
+    async def delete_event_reminders(self, event_id: str) -> int:
+        """删除事件的未发送提醒"""
+        query = f"""
+            DELETE FROM {self.schema}.{self.reminder_table}
+            WHERE event_id = $1 AND status IN ('pending', 'claimed')
+        """
+        async with self.db:
+            count = await self.db.execute(query, params=[event_id])
+        return count or 0
+
+    async def get_pending_reminders(
+        self, until: datetime, limit: int = 50000
+    ) -> List[Dict[str, Any]]:
+        """到 until 为止待发送的提醒 (含租约过期的认领)，按到期时间排序"""
+        query = f"""
+            SELECT * FROM {self.schema}.{self.reminder_table}
+            WHERE remind_at <= $1
+              AND (status = 'pending'
+                   OR (status = 'claimed' AND claim_expires_at < NOW()))
+            ORDER BY remind_at
+            LIMIT $2
+        """
+        async with self.db:
+            results = await self.db.query(query, params=[until, limit])
+        return results or []
+
+    async def claim_reminders(
+        self, reminder_ids: List[int], owner: str, ttl_seconds: float
+    ) -> List[Dict[str, Any]]:
+        """以租约方式认领到期提醒，只返回本副本赢得的行"""
+        query = f"""
+            UPDATE {self.schema}.{self.reminder_table}
+            SET status = 'claimed',
+                claimed_by = $2,
+                claim_expires_at = NOW() + make_interval(secs => $3),
+                updated_at = NOW()
+            WHERE reminder_id = ANY($1::bigint[])
+              AND remind_at <= NOW() + INTERVAL '5 seconds'
+              AND (status = 'pending'
+                   OR (status = 'claimed' AND claim_expires_at < NOW()))
+            RETURNING *
+        """
+        async with self.db:
+            results = await self.db.query(
+                query, params=[reminder_ids, owner, float(ttl_seconds)]
+            )
+        return results or []
+
+    async def complete_reminders(self, reminder_ids: List[int], owner: str) -> int:
+        """标记已发送"""
+        query = f"""
+            UPDATE {self.schema}.{self.reminder_table}
+            SET status = 'sent', sent_at = NOW(), attempts = attempts + 1,
+                claim_expires_at = NULL, updated_at = NOW()
+            WHERE reminder_id = ANY($1::bigint[]) AND claimed_by = $2
+        """
+        async with self.db:
+            count = await self.db.execute(query, params=[reminder_ids, owner])
+        return count or 0
+
+    async def release_reminders(
+        self,
+        reminder_ids: List[int],
+        owner: str,
+        retry_at: datetime,
+        max_attempts: int,
+    ) -> List[Dict[str, Any]]:
+        """发送失败: 退回 pending 并延后重试，超过次数标记 failed"""
+        query = f"""
+            UPDATE {self.schema}.{self.reminder_table}
+            SET attempts = attempts + 1,
+                status = CASE WHEN attempts + 1 >= $4 THEN 'failed' ELSE 'pending' END,
+                remind_at = $3,
+                claimed_by = NULL,
+                claim_expires_at = NULL,
+                updated_at = NOW()
+            WHERE reminder_id = ANY($1::bigint[]) AND claimed_by = $2
+            RETURNING *
+        """
+        async with self.db:
+            results = await self.db.query(
+                query, params=[reminder_ids, owner, retry_at, max_attempts]
+            )
+        return results or []
+
     # ====================
     # GDPR 数据管理
     # ====================
@@ -513,6 +871,14 @@ class CalendarRepository:
             async with self.db:
                 sync_count = await self.db.execute(sync_query, params=[user_id])
 
+            # Delete reminders
+            reminder_query = (
+                f"DELETE FROM {self.schema}.{self.reminder_table} WHERE user_id = $1"
+            )
+
+            async with self.db:
+                await self.db.execute(reminder_query, params=[user_id])
+
             total_deleted = (events_count if events_count is not None else 0) + (
                 sync_count if sync_count is not None else 0
             )
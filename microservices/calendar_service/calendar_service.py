@@ -58,6 +58,8 @@ class CalendarService:
         repository: Optional[CalendarEventRepositoryProtocol] = None,
         event_bus=None,
         provider_clients: Optional[Dict[str, Any]] = None,
+        reminder_scheduler=None,
+        sync_engine=None,
     ):
         """
         Initialize service with injected dependencies.
@@ -65,10 +67,14 @@ class CalendarService:
         Args:
             repository: Repository (inject mock for testing)
             event_bus: Event bus for publishing events
+            reminder_scheduler: ReminderScheduler kept in sync with event changes
+            sync_engine: CalendarSyncEngine used for provider syncs it has clients for
         """
         self.repository = repository  # Will be set by factory if None
         self.event_bus = event_bus
         self.provider_clients = provider_clients or {}
+        self.reminder_scheduler = reminder_scheduler
+        self.sync_engine = sync_engine
         self._event_publishers_loaded = False
         self._event_publisher = None
 
@@ -84,6 +90,21 @@ class CalendarService:
                 self.Event = None
             self._event_publishers_loaded = True
 
+    async def _refresh_reminders(
+        self, event: Optional[EventResponse] = None, deleted_event_id: str = None
+    ):
+        """Keep the reminder scheduler in step with an event change (never raises)"""
+        if not self.reminder_scheduler:
+            return
+        try:
+            if deleted_event_id:
+                await self.reminder_scheduler.on_event_deleted(deleted_event_id)
+            elif event:
+                await self.reminder_scheduler.on_event_changed(event)
+        except Exception as e:
+            event_id = deleted_event_id or (event.event_id if event else None)
+            logger.error(f"Failed to refresh reminders for event {event_id}: {e}")
+
     async def create_event(
         self, request: EventCreateRequest
     ) -> Optional[EventResponse]:
@@ -105,6 +126,7 @@ class CalendarService:
                 logger.info(
                     f"Created event {event.event_id} for user {request.user_id}"
                 )
+                await self._refresh_reminders(event)
 
                 # Publish event.created event
                 if self.event_bus:
@@ -202,6 +224,7 @@ class CalendarService:
 
             if updated:
                 logger.info(f"Updated event {event_id}")
+                await self._refresh_reminders(updated)
 
                 # Publish event.updated event
                 if self.event_bus:
@@ -256,6 +279,7 @@ class CalendarService:
 
             if result:
                 logger.info(f"Deleted event {event_id}")
+                await self._refresh_reminders(deleted_event_id=event_id)
 
             return result
 
@@ -267,6 +291,29 @@ class CalendarService:
         self, user_id: str, provider: str, credentials: Dict[str, Any] = None
     ) -> SyncStatusResponse:
         """同步外部日历"""
+        if self.sync_engine and provider in self.sync_engine.provider_clients:
+            # 增量同步 (sync token)，批量写入，并排入后台定时同步
+            run = await self.sync_engine.sync_user(user_id, provider, credentials)
+            if run.status != "success":
+                return SyncStatusResponse(
+                    provider=provider,
+                    last_synced=datetime.utcnow(),
+                    synced_events=0,
+                    status="error",
+                    message=run.error,
+                )
+            return SyncStatusResponse(
+                provider=provider,
+                last_synced=datetime.utcnow(),
+                synced_events=run.synced_events,
+                status="success",
+                message=(
+                    f"Successfully synced {run.synced_events} events "
+                    f"({run.mode}: {run.upserted} updated, {run.deleted} deleted)"
+                ),
+                sync_token=run.sync_token,
+            )
+
         try:
             logger.info(f"Starting {provider} sync for user {user_id}")
 
@@ -12,7 +12,11 @@ from typing import Any
 
 import aiohttp
 
-from .provider_models import ProviderCalendarEvent, ProviderSyncResult
+from .provider_models import (
+    ProviderCalendarEvent,
+    ProviderSyncResult,
+    SyncTokenExpiredError,
+)
 
 
 class GoogleCalendarClient:
@@ -52,6 +56,7 @@ class GoogleCalendarClient:
 
         headers = {"Authorization": f"Bearer {access_token}"}
         events: list[ProviderCalendarEvent] = []
+        deleted: list[str] = []
         next_sync_token: str | None = None
         page_token: str | None = None
 
@@ -64,6 +69,10 @@ class GoogleCalendarClient:
                     headers=headers,
                     params=params,
                 ) as response:
+                    if response.status == 410 and sync_token:
+                        raise SyncTokenExpiredError(
+                            "Google Calendar sync token expired"
+                        )
                     if response.status >= 400:
                         body = await response.text()
                         raise RuntimeError(
@@ -71,17 +80,19 @@ class GoogleCalendarClient:
                         )
                     payload = await response.json()
 
-                events.extend(
-                    _map_google_event(item)
-                    for item in payload.get("items", [])
-                    if item.get("status") != "cancelled"
-                )
+                for item in payload.get("items", []):
+                    if item.get("status") == "cancelled":
+                        deleted.append(item["id"])
+                    else:
+                        events.append(_map_google_event(item))
                 page_token = payload.get("nextPageToken")
                 next_sync_token = payload.get("nextSyncToken") or next_sync_token
                 if not page_token:
                     break
 
-        return ProviderSyncResult(events=events, sync_token=next_sync_token)
+        return ProviderSyncResult(
+            events=events, sync_token=next_sync_token, deleted_event_ids=deleted
+        )
 
 
 def _parse_google_time(
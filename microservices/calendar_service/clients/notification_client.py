@@ -0,0 +1,136 @@
+"""
+Notification Service Client
+
+Client for calendar_service to interact with notification_service.
+Used by the reminder scheduler to deliver due event reminders.
+"""
+
+import logging
+import os
+import sys
+from typing import Any, Dict, List
+
+# Add parent directories to path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from microservices.notification_service.clients.notification_client import (
+    NotificationServiceClient,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationClient:
+    """
+    Wrapper client for Notification Service calls from Calendar Service.
+
+    Implements ReminderNotifierProtocol: one batch call per batch of
+    reminders. The reminder text is filled in here, so delivery does not
+    depend on a template existing in notification_service, and every
+    reminder carries an idempotency key so a retried batch (after a timeout
+    or a partial failure) never notifies the same reminder twice.
+    """
+
+    # Per-recipient statuses that mean notification_service has the reminder
+    ACCEPTED_STATUSES = ("pending", "sending", "sent", "delivered")
+
+    def __init__(
+        self,
+        base_url: str = None,
+        config=None,
+        notification_type: str = "in_app",
+    ):
+        """
+        Initialize Notification Service client
+
+        Args:
+            base_url: Notification service base URL (optional, uses service discovery)
+            config: ConfigManager instance for service discovery
+            notification_type: Delivery channel for reminders
+        """
+        self._client = NotificationServiceClient(base_url=base_url)
+        self.notification_type = notification_type
+
+    async def close(self):
+        """Close HTTP client"""
+        await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def send_reminders(self, reminders: List[Dict[str, Any]]) -> List[int]:
+        """
+        Send due reminders as one notification batch.
+
+        Args:
+            reminders: Claimed reminder rows
+
+        Returns:
+            reminder_ids that notification_service accepted (queued or
+            already sent); the rest are released for retry by the scheduler
+        """
+        if not reminders:
+            return []
+
+        result = await self._client.send_batch_notifications(
+            [_recipient(r) for r in reminders],
+            notification_type=self.notification_type,
+            name="calendar_reminders",
+            priority="high",
+            metadata={"source": "calendar_service"},
+        )
+        if result is None:
+            return []
+
+        statuses = {
+            item.get("idempotency_key"): item.get("status")
+            for item in result.get("results") or []
+        }
+        accepted = []
+        for reminder in reminders:
+            status = statuses.get(_idempotency_key(reminder))
+            if status in self.ACCEPTED_STATUSES:
+                accepted.append(reminder["reminder_id"])
+            else:
+                logger.warning(
+                    f"Reminder {reminder['reminder_id']} not accepted: {status}"
+                )
+        return accepted
+
+
+def _idempotency_key(reminder: Dict[str, Any]) -> str:
+    return f"calendar_reminder:{reminder['reminder_id']}"
+
+
+def _recipient(reminder: Dict[str, Any]) -> Dict[str, Any]:
+    start_time = _isoformat(reminder["event_start"])
+    minutes = reminder["minutes_before"]
+    return {
+        "user_id": reminder["user_id"],
+        "idempotency_key": _idempotency_key(reminder),
+        "subject": f"Reminder: {reminder['title']}",
+        "content": f"{reminder['title']} starts in {minutes} minutes ({start_time})",
+        "variables": {
+            "event_id": reminder["event_id"],
+            "title": reminder["title"],
+            "start_time": start_time,
+            "minutes_before": minutes,
+        },
+        "metadata": {
+            "event_id": reminder["event_id"],
+            "reminder_id": reminder["reminder_id"],
+        },
+    }
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+__all__ = ["NotificationClient"]
@@ -7,7 +7,11 @@ from typing import Any
 
 import aiohttp
 
-from .provider_models import ProviderCalendarEvent, ProviderSyncResult
+from .provider_models import (
+    ProviderCalendarEvent,
+    ProviderSyncResult,
+    SyncTokenExpiredError,
+)
 
 
 class OutlookCalendarClient:
@@ -48,11 +52,16 @@ class OutlookCalendarClient:
             }
 
         events: list[ProviderCalendarEvent] = []
+        deleted: list[str] = []
         delta_link: str | None = None
 
         async with aiohttp.ClientSession(timeout=self.timeout) as session:
             while True:
                 async with session.get(url, headers=headers, params=params) as response:
+                    if response.status == 410 and sync_token:
+                        raise SyncTokenExpiredError(
+                            "Microsoft Graph delta link expired"
+                        )
                     if response.status >= 400:
                         body = await response.text()
                         raise RuntimeError(
@@ -60,11 +69,11 @@ class OutlookCalendarClient:
                         )
                     payload = await response.json()
 
-                events.extend(
-                    _map_outlook_event(item)
-                    for item in payload.get("value", [])
-                    if "@removed" not in item and not item.get("isCancelled", False)
-                )
+                for item in payload.get("value", []):
+                    if "@removed" in item or item.get("isCancelled", False):
+                        deleted.append(item["id"])
+                    else:
+                        events.append(_map_outlook_event(item))
                 next_link = payload.get("@odata.nextLink")
                 delta_link = payload.get("@odata.deltaLink") or delta_link
                 if not next_link:
@@ -72,7 +81,9 @@ class OutlookCalendarClient:
                 url = next_link
                 params = None
 
-        return ProviderSyncResult(events=events, sync_token=delta_link)
+        return ProviderSyncResult(
+            events=events, sync_token=delta_link, deleted_event_ids=deleted
+        )
 
 
 def _parse_outlook_time(value: dict[str, Any]) -> tuple[datetime, str]:
@@ -25,3 +25,9 @@ class ProviderCalendarEvent:
 class ProviderSyncResult:
     events: list[ProviderCalendarEvent]
     sync_token: str | None = None
+    # Events cancelled/removed upstream since the previous sync token
+    deleted_event_ids: list[str] = field(default_factory=list)
+
+
+class SyncTokenExpiredError(Exception):
+    """The provider no longer accepts the stored sync token; a full sync is required."""
@@ -0,0 +1,94 @@
+"""
+Vault Service Client
+
+Client for calendar_service to read users' stored provider OAuth tokens from
+vault_service, so the sync engine can run scheduled syncs without a request
+carrying credentials.
+
+Tokens are vault secrets of type ``oauth_token`` tagged ``calendar:<provider>``
+(e.g. ``calendar:google_calendar``). The secret value is either the bare
+access token or a JSON object passed through to the provider client.
+"""
+
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, Optional
+
+# Add parent directories to path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from microservices.vault_service.client import VaultServiceClient
+
+logger = logging.getLogger(__name__)
+
+
+class VaultClient:
+    """
+    Wrapper client for Vault Service calls from Calendar Service.
+
+    Implements SyncCredentialsProviderProtocol.
+    """
+
+    def __init__(self, base_url: str = None, config=None):
+        """
+        Initialize Vault Service client
+
+        Args:
+            base_url: Vault service base URL (optional, uses service discovery)
+            config: ConfigManager instance for service discovery
+        """
+        self._client = VaultServiceClient(base_url=base_url, config=config)
+
+    async def close(self):
+        """Close HTTP client"""
+        await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_credentials(
+        self, user_id: str, provider: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the user's stored credentials for a calendar provider.
+
+        Args:
+            user_id: User ID
+            provider: SyncProvider value
+
+        Returns:
+            Credentials payload (at least access_token), or None if not stored
+        """
+        listing = await self._client.list_secrets(
+            user_id,
+            secret_type="oauth_token",
+            tags=[f"calendar:{provider}"],
+            page_size=1,
+        )
+        items = (listing or {}).get("items") or []
+        if not items:
+            return None
+
+        secret = await self._client.get_secret(items[0]["vault_id"], user_id)
+        value = (secret or {}).get("secret_value")
+        if not value:
+            return None
+        try:
+            credentials = json.loads(value)
+        except ValueError:
+            return {"access_token": value}
+        if isinstance(credentials, dict):
+            return credentials
+        logger.warning(f"Ignoring malformed {provider} credentials for user {user_id}")
+        return None
+
+
+__all__ = ["VaultClient"]
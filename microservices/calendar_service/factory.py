@@ -8,6 +8,7 @@ Usage:
     from .factory import create_calendar_service
     service = create_calendar_service(config, event_bus)
 """
+import os
 from typing import Optional
 
 from core.config_manager import ConfigManager
@@ -40,4 +41,61 @@ def create_calendar_service(
     return CalendarService(
         repository=repository,
         event_bus=event_bus,
+        reminder_scheduler=create_reminder_scheduler(repository, config),
+        sync_engine=create_sync_engine(repository, config),
+    )
+
+
+def create_reminder_scheduler(repository, config: Optional[ConfigManager] = None):
+    """
+    Create the ReminderScheduler (not started) unless CALENDAR_REMINDERS_ENABLED=false.
+
+    Args:
+        repository: CalendarRepository (implements ReminderRepositoryProtocol)
+        config: Configuration manager for service discovery
+    """
+    if os.getenv("CALENDAR_REMINDERS_ENABLED", "true").lower() != "true":
+        return None
+
+    from .clients.notification_client import NotificationClient
+    from .reminder_scheduler import ReminderScheduler
+
+    return ReminderScheduler(
+        repository,
+        NotificationClient(config=config),
+        horizon_seconds=float(os.getenv("CALENDAR_REMINDER_HORIZON_SECONDS", "300")),
+        batch_size=int(os.getenv("CALENDAR_REMINDER_BATCH_SIZE", "200")),
+    )
+
+
+def create_sync_engine(repository, config: Optional[ConfigManager] = None):
+    """
+    Create the CalendarSyncEngine (not started) unless CALENDAR_SYNC_ENABLED=false.
+
+    Background syncs read provider tokens from vault_service; on-demand syncs
+    use the credentials sent with the request.
+
+    Args:
+        repository: CalendarRepository (implements SyncRepositoryProtocol)
+        config: Configuration manager for service discovery
+    """
+    if os.getenv("CALENDAR_SYNC_ENABLED", "true").lower() != "true":
+        return None
+
+    from .clients.google_calendar_client import GoogleCalendarClient
+    from .clients.outlook_calendar_client import OutlookCalendarClient
+    from .clients.vault_client import VaultClient
+    from .models import SyncProvider
+    from .sync_engine import CalendarSyncEngine
+
+    return CalendarSyncEngine(
+        repository,
+        {
+            SyncProvider.GOOGLE.value: GoogleCalendarClient(),
+            SyncProvider.OUTLOOK.value: OutlookCalendarClient(),
+        },
+        VaultClient(config=config),
+        workers=int(os.getenv("CALENDAR_SYNC_WORKERS", "8")),
+        sync_interval_seconds=float(os.getenv("CALENDAR_SYNC_INTERVAL_SECONDS", "900")),
+        batch_size=int(os.getenv("CALENDAR_SYNC_BATCH_SIZE", "500")),
     )
@@ -17,6 +17,7 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -69,6 +70,16 @@ class CalendarMicroservice:
             self.service = None
             return
 
+        # Start reminder dispatch
+        if self.service.reminder_scheduler:
+            self.service.reminder_scheduler.start()
+            logger.info("✅ Reminder scheduler started")
+
+        # Start background provider sync
+        if self.service.sync_engine:
+            self.service.sync_engine.start()
+            logger.info("✅ Calendar sync engine started")
+
         # Subscribe to events
         if self.event_bus and self.service:
             try:
@@ -88,6 +99,18 @@ class CalendarMicroservice:
                 logger.error(f"❌ Failed to subscribe to events: {e}", exc_info=True)
 
     async def shutdown(self):
+        if self.service and self.service.sync_engine:
+            try:
+                await self.service.sync_engine.stop()
+                logger.info("Calendar sync engine stopped")
+            except Exception as e:
+                logger.error(f"Error stopping calendar sync engine: {e}")
+        if self.service and self.service.reminder_scheduler:
+            try:
+                await self.service.reminder_scheduler.stop()
+                logger.info("Reminder scheduler stopped")
+            except Exception as e:
+                logger.error(f"Error stopping reminder scheduler: {e}")
         if self.event_bus:
             try:
                 await self.event_bus.close()
@@ -159,6 +182,7 @@ async def lifespan(app: FastAPI):
             logger.error(f"❌ Failed to deregister from Consul: {e}")
 
     await microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -0,0 +1,38 @@
+-- Calendar Service Migration: Reminder delivery table
+-- Version: 004
+-- Date: 2026-10-18
+-- Description: One row per event reminder, claimed with a lease by the
+--              replica that delivers it (see reminder_scheduler.py).
+
+CREATE TABLE IF NOT EXISTS calendar.calendar_reminders (
+    reminder_id BIGSERIAL PRIMARY KEY,
+    event_id VARCHAR(100) NOT NULL,
+    user_id VARCHAR(100) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    event_start TIMESTAMPTZ NOT NULL,
+    minutes_before INTEGER NOT NULL,
+    remind_at TIMESTAMPTZ NOT NULL,
+
+    -- pending -> claimed -> sent | failed (claims expire back to claimable)
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    claimed_by VARCHAR(100),
+    claim_expires_at TIMESTAMPTZ,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    sent_at TIMESTAMPTZ,
+
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    UNIQUE (event_id, event_start, minutes_before)
+);
+
+-- Dispatch window scans only touch undelivered rows
+CREATE INDEX IF NOT EXISTS idx_reminders_due
+    ON calendar.calendar_reminders(remind_at)
+    WHERE status IN ('pending', 'claimed');
+
+CREATE INDEX IF NOT EXISTS idx_reminders_event
+    ON calendar.calendar_reminders(event_id);
+
+CREATE INDEX IF NOT EXISTS idx_reminders_user
+    ON calendar.calendar_reminders(user_id);
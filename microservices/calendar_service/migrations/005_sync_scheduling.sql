@@ -0,0 +1,21 @@
+-- Calendar Service Migration: Scheduled incremental provider sync
+-- Version: 005
+-- Date: 2026-10-18
+-- Description: Let the sync engine (sync_engine.py) pick due syncs with a
+--              lease instead of re-syncing inline on every request.
+
+ALTER TABLE calendar.calendar_sync_status
+    ADD COLUMN IF NOT EXISTS next_sync_at TIMESTAMPTZ DEFAULT NOW(),
+    ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS claim_expires_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS consecutive_failures INTEGER NOT NULL DEFAULT 0;
+
+UPDATE calendar.calendar_sync_status
+SET next_sync_at = NOW()
+WHERE next_sync_at IS NULL;
+
+-- Due-sync claims scan only schedulable rows, oldest deadline first
+CREATE INDEX IF NOT EXISTS idx_sync_status_due
+    ON calendar.calendar_sync_status(next_sync_at)
+    WHERE status <> 'disabled';
+
@@ -0,0 +1,25 @@
+-- Calendar Service Migration: Backfill reminder rows
+-- Version: 006
+-- Date: 2026-10-19
+-- Description: Migration 004 only gets rows for events created or updated
+--              after it was deployed. Derive the still-upcoming reminders
+--              of existing events from calendar_events.reminders, the same
+--              way replace_event_reminders does. Safe to re-run.
+
+INSERT INTO calendar.calendar_reminders (
+    event_id, user_id, title, event_start, minutes_before, remind_at
+)
+SELECT DISTINCT
+    e.event_id,
+    e.user_id,
+    e.title,
+    e.start_time,
+    m.minutes::int,
+    e.start_time - make_interval(mins => m.minutes::int)
+FROM calendar.calendar_events e
+CROSS JOIN LATERAL jsonb_array_elements_text(
+    CASE WHEN jsonb_typeof(e.reminders) = 'array' THEN e.reminders ELSE '[]'::jsonb END
+) AS m(minutes)
+WHERE m.minutes ~ '^[0-9]+$'
+  AND e.start_time - make_interval(mins => m.minutes::int) > NOW()
+ON CONFLICT (event_id, event_start, minutes_before) DO NOTHING;
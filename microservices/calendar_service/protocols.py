@@ -110,6 +110,137 @@ class CalendarEventRepositoryProtocol(Protocol):
         ...
 
 
+@runtime_checkable
+class ReminderRepositoryProtocol(Protocol):
+    """
+    Interface for reminder persistence used by ReminderScheduler.
+
+    Rows are dicts with at least reminder_id, event_id, user_id, title,
+    event_start, minutes_before, remind_at and status.
+    """
+
+    async def replace_event_reminders(
+        self,
+        event_id: str,
+        user_id: str,
+        title: str,
+        start_time: datetime,
+        minutes_before: List[int],
+    ) -> List[Dict[str, Any]]:
+        """Make an event's unsent reminders match ``minutes_before``; returns them"""
+        ...
+
+    async def delete_event_reminders(self, event_id: str) -> int:
+        """Delete an event's unsent reminders"""
+        ...
+
+    async def get_pending_reminders(
+        self, until: datetime, limit: int = 50000
+    ) -> List[Dict[str, Any]]:
+        """Unsent reminders due before ``until`` (incl. expired claims), earliest first"""
+        ...
+
+    async def claim_reminders(
+        self, reminder_ids: List[int], owner: str, ttl_seconds: float
+    ) -> List[Dict[str, Any]]:
+        """Lease due reminders to ``owner``; returns only the rows won"""
+        ...
+
+    async def complete_reminders(self, reminder_ids: List[int], owner: str) -> int:
+        """Mark reminders claimed by ``owner`` as sent"""
+        ...
+
+    async def release_reminders(
+        self,
+        reminder_ids: List[int],
+        owner: str,
+        retry_at: datetime,
+        max_attempts: int,
+    ) -> List[Dict[str, Any]]:
+        """Return undelivered reminders to pending at ``retry_at`` (or failed)"""
+        ...
+
+
+@runtime_checkable
+class ReminderNotifierProtocol(Protocol):
+    """Interface for delivering a batch of due reminders"""
+
+    async def send_reminders(self, reminders: List[Dict[str, Any]]) -> List[int]:
+        """Send reminders; returns the reminder_ids that were accepted"""
+        ...
+
+
+@runtime_checkable
+class SyncRepositoryProtocol(Protocol):
+    """
+    Interface for external calendar sync state used by CalendarSyncEngine.
+
+    Sync rows are dicts from calendar_sync_status (user_id, provider,
+    sync_token, next_sync_at, consecutive_failures, ...).
+    """
+
+    async def get_sync_status(
+        self, user_id: str, provider: str = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get sync status for a user/provider"""
+        ...
+
+    async def claim_due_syncs(
+        self, owner: str, limit: int, ttl_seconds: float
+    ) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` syncs whose next_sync_at has passed"""
+        ...
+
+    async def complete_sync(
+        self,
+        user_id: str,
+        provider: str,
+        *,
+        status: str,
+        next_sync_at: datetime,
+        synced_count: int = 0,
+        sync_token: Optional[str] = None,
+        error_message: Optional[str] = None,
+        failed: bool = False,
+    ) -> bool:
+        """Record a sync run, schedule the next one and release the lease"""
+        ...
+
+    async def bulk_upsert_external_events(
+        self, user_id: str, provider: str, events: List[Dict[str, Any]]
+    ) -> int:
+        """Insert/update provider events in one statement; returns rows written"""
+        ...
+
+    async def delete_external_events(
+        self, user_id: str, provider: str, external_event_ids: List[str]
+    ) -> int:
+        """Delete provider events removed upstream"""
+        ...
+
+    async def prune_external_events(
+        self,
+        user_id: str,
+        provider: str,
+        keep_external_event_ids: List[str],
+        window_start: datetime,
+        window_end: datetime,
+    ) -> int:
+        """After a full sync, delete in-window provider events it did not return"""
+        ...
+
+
+@runtime_checkable
+class SyncCredentialsProviderProtocol(Protocol):
+    """Interface for resolving stored provider credentials for background syncs"""
+
+    async def get_credentials(
+        self, user_id: str, provider: str
+    ) -> Optional[Dict[str, Any]]:
+        """Credentials payload for the provider client (e.g. access_token), or None"""
+        ...
+
+
 @runtime_checkable
 class EventBusProtocol(Protocol):
     """Interface for Event Bus - no I/O imports"""
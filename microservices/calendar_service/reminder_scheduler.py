@@ -0,0 +1,287 @@
+"""
+Calendar Reminder Scheduler
+
+Delivers event reminders without polling the events table. Reminders live
+in ``calendar.calendar_reminders`` (one row per event x offset, indexed on
+``remind_at`` for pending rows) and are scheduled in two levels:
+
+- the database holds everything; every ``horizon / 2`` seconds each replica
+  loads the reminders due within the next ``horizon`` into an in-memory heap
+  (one indexed range scan, not a scan of calendars)
+- the heap wakes the dispatch loop exactly when the earliest reminder is
+  due; create/update/delete of an event refreshes that event's reminders
+  in the table and, when they fall inside the horizon, in the heap
+
+Replicas all load the same window, so a reminder is only sent by the
+replica whose ``claim_reminders`` UPDATE wins it. A claim is a lease: if
+the owner dies before marking the reminder sent, the lease expires and any
+replica picks it up on its next load. Due reminders are claimed in batches
+of ``batch_size``; only those the notifier confirms as sent are marked sent,
+the rest are released for retry.
+
+Usage:
+    scheduler = ReminderScheduler(repository, notifier)
+    scheduler.start()
+    await scheduler.on_event_changed(event)   # after create/update
+    await scheduler.on_event_deleted(event_id)
+    await scheduler.stop()
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.metrics import create_counter, create_histogram
+
+from .models import EventResponse
+from .protocols import ReminderNotifierProtocol, ReminderRepositoryProtocol
+
+logger = logging.getLogger(__name__)
+
+REMINDERS_DISPATCHED = create_counter(
+    "calendar_reminders_dispatched_total",
+    "Calendar reminders handled by the dispatch loop",
+    ["status"],
+)
+REMINDER_LAG_SECONDS = create_histogram(
+    "calendar_reminder_lag_seconds",
+    "Delay between a reminder's due time and its delivery",
+    [],
+    buckets=[0.1, 0.5, 1, 2, 5, 15, 60, 300],
+)
+
+
+def _epoch(value: Any) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ReminderScheduler:
+    """Heap-backed, lease-claimed reminder dispatcher for one replica."""
+
+    def __init__(
+        self,
+        repository: ReminderRepositoryProtocol,
+        notifier: ReminderNotifierProtocol,
+        *,
+        horizon_seconds: float = 300.0,
+        batch_size: int = 200,
+        claim_ttl_seconds: float = 120.0,
+        retry_delay_seconds: float = 60.0,
+        max_attempts: int = 5,
+        max_loaded: int = 50000,
+        owner: Optional[str] = None,
+    ):
+        """
+        Args:
+            repository: Reminder persistence (claims and state)
+            notifier: Sends a batch of reminders, returns the delivered ids
+            horizon_seconds: How far ahead reminders are held in memory
+            batch_size: Max reminders per claim + notification call
+            claim_ttl_seconds: Lease length before another replica may retry
+            retry_delay_seconds: Delay before retrying an undelivered reminder
+            max_attempts: Deliveries tried before a reminder is marked failed
+            max_loaded: Max reminders loaded per refresh (earliest first)
+            owner: Replica id recorded on claims
+        """
+        self.repository = repository
+        self.notifier = notifier
+        self.horizon = horizon_seconds
+        self.batch_size = batch_size
+        self.claim_ttl = claim_ttl_seconds
+        self.retry_delay = retry_delay_seconds
+        self.max_attempts = max_attempts
+        self.max_loaded = max_loaded
+        self.owner = (
+            owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+
+        self._heap: List[Tuple[float, int]] = []
+        self._scheduled: Dict[int, float] = {}  # reminder_id -> due epoch
+        self._by_event: Dict[str, Set[int]] = {}
+        self._event_of: Dict[int, str] = {}
+        self._next_load = 0.0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="calendar-reminders")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    # ------------------------------------------------------------------
+    # Incremental refresh (called by CalendarService)
+    # ------------------------------------------------------------------
+
+    async def on_event_changed(self, event: EventResponse) -> None:
+        """Re-derive an event's reminders after it was created or updated."""
+        rows = await self.repository.replace_event_reminders(
+            event_id=event.event_id,
+            user_id=event.user_id,
+            title=event.title,
+            start_time=event.start_time,
+            minutes_before=sorted(set(event.reminders or [])),
+        )
+        self._forget_event(event.event_id)
+        self._schedule_rows(rows)
+
+    async def on_event_deleted(self, event_id: str) -> None:
+        await self.repository.delete_event_reminders(event_id)
+        self._forget_event(event_id)
+
+    # ------------------------------------------------------------------
+    # Heap
+    # ------------------------------------------------------------------
+
+    def _schedule_rows(self, rows: List[Dict[str, Any]]) -> None:
+        limit = time.time() + self.horizon
+        earliest = self._heap[0][0] if self._heap else None
+        for row in rows:
+            due = _epoch(row["remind_at"])
+            if due > limit:
+                continue  # picked up by a later load
+            reminder_id = row["reminder_id"]
+            if self._scheduled.get(reminder_id) == due:
+                continue
+            self._scheduled[reminder_id] = due
+            self._event_of[reminder_id] = row["event_id"]
+            self._by_event.setdefault(row["event_id"], set()).add(reminder_id)
+            heapq.heappush(self._heap, (due, reminder_id))
+        if self._heap and (earliest is None or self._heap[0][0] < earliest):
+            self._wakeup.set()
+
+    def _forget_event(self, event_id: str) -> None:
+        # Heap entries are dropped lazily when popped
+        for reminder_id in self._by_event.pop(event_id, ()):
+            self._scheduled.pop(reminder_id, None)
+            self._event_of.pop(reminder_id, None)
+
+    def _pop_due(self, now: float) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            deadline, reminder_id = heapq.heappop(self._heap)
+            if self._scheduled.get(reminder_id) != deadline:
+                continue  # cancelled or rescheduled
+            del self._scheduled[reminder_id]
+            event_id = self._event_of.pop(reminder_id, None)
+            if event_id in self._by_event:
+                self._by_event[event_id].discard(reminder_id)
+                if not self._by_event[event_id]:
+                    del self._by_event[event_id]
+            due.append(reminder_id)
+        return due
+
+    @property
+    def pending(self) -> int:
+        """Reminders currently held in memory."""
+        return len(self._scheduled)
+
+    # ------------------------------------------------------------------
+    # Dispatch loop
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                now = time.time()
+                if now >= self._next_load:
+                    await self._load(now)
+                    self._next_load = now + self.horizon / 2
+
+                due = self._pop_due(now)
+                if due:
+                    await self.dispatch(due)
+                    continue
+
+                wake_at = self._next_load
+                if self._heap:
+                    wake_at = min(wake_at, self._heap[0][0])
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), max(0.0, wake_at - time.time())
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Reminder dispatch loop error: {e}", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    async def _load(self, now: float) -> None:
+        until = datetime.fromtimestamp(now + self.horizon, tz=timezone.utc)
+        rows = await self.repository.get_pending_reminders(
+            until=until, limit=self.max_loaded
+        )
+        self._schedule_rows(rows)
+
+    async def dispatch(self, reminder_ids: List[int]) -> int:
+        """Claim, send and settle one batch; returns the number delivered."""
+        claimed = await self.repository.claim_reminders(
+            reminder_ids, owner=self.owner, ttl_seconds=self.claim_ttl
+        )
+        if len(claimed) < len(reminder_ids):
+            REMINDERS_DISPATCHED.labels(status="lost_claim").inc(
+                len(reminder_ids) - len(claimed)
+            )
+        if not claimed:
+            return 0
+
+        try:
+            delivered = set(await self.notifier.send_reminders(claimed))
+        except Exception as e:
+            logger.warning(
+                f"Reminder notification call failed for {len(claimed)} reminders: {e}"
+            )
+            delivered = set()
+
+        sent = [r["reminder_id"] for r in claimed if r["reminder_id"] in delivered]
+        undelivered = [
+            r["reminder_id"] for r in claimed if r["reminder_id"] not in delivered
+        ]
+        if sent:
+            await self.repository.complete_reminders(sent, owner=self.owner)
+            REMINDERS_DISPATCHED.labels(status="sent").inc(len(sent))
+            now = time.time()
+            for row in claimed:
+                if row["reminder_id"] in delivered:
+                    REMINDER_LAG_SECONDS.observe(
+                        max(0.0, now - _epoch(row["remind_at"]))
+                    )
+        if undelivered:
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=self.retry_delay)
+            rows = await self.repository.release_reminders(
+                undelivered,
+                owner=self.owner,
+                retry_at=retry_at,
+                max_attempts=self.max_attempts,
+            )
+            REMINDERS_DISPATCHED.labels(status="retry").inc(len(undelivered))
+            self._schedule_rows([r for r in rows if r.get("status") == "pending"])
+        return len(sent)
+
+
+__all__ = ["ReminderScheduler"]
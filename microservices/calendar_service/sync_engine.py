@@ -0,0 +1,411 @@
+"""
+Calendar Sync Engine
+
+Keeps external calendars (Google, Outlook) in step with incremental syncs
+driven from ``calendar.calendar_sync_status`` instead of full re-syncs per
+request:
+
+- every user/provider row carries ``next_sync_at``; each replica claims due
+  rows with a lease (``FOR UPDATE SKIP LOCKED``), so replicas share the work
+  without double-syncing and a crashed replica's syncs are retried once the
+  lease expires
+- a sync sends the stored token (Google ``syncToken`` / Graph delta link)
+  and applies only what changed: upserts in batches of ``batch_size`` through
+  one statement each, upstream deletions as one DELETE
+- an expired token (HTTP 410) falls back to a full sync of the provider
+  window, after which in-window events the provider no longer returns are
+  pruned
+- up to ``workers`` syncs run at once; each provider additionally has a
+  concurrency cap and a token bucket on sync starts so one provider's API
+  quota is not exhausted by a burst of due users
+- failures back off exponentially per user/provider (capped), successes are
+  rescheduled ``sync_interval`` later with jitter to spread load
+
+Usage:
+    engine = CalendarSyncEngine(repository, provider_clients, credentials_provider)
+    engine.start()
+    result = await engine.sync_user(user_id, provider, credentials)  # on demand
+    await engine.stop()
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.metrics import create_counter, create_histogram
+
+from .clients.provider_models import ProviderSyncResult, SyncTokenExpiredError
+from .protocols import SyncCredentialsProviderProtocol, SyncRepositoryProtocol
+
+logger = logging.getLogger(__name__)
+
+# Provider clients fetch this many days ahead when no sync token is sent
+FULL_SYNC_DAYS = 365
+
+# (sync starts per second, concurrent syncs) per provider
+DEFAULT_PROVIDER_LIMITS: Dict[str, Tuple[float, int]] = {
+    "google_calendar": (10.0, 8),
+    "outlook": (4.0, 4),
+}
+
+SYNC_RUNS = create_counter(
+    "calendar_sync_runs_total",
+    "External calendar sync runs",
+    ["provider", "mode", "status"],
+)
+SYNC_CHANGES = create_counter(
+    "calendar_sync_changes_total",
+    "Provider changes applied by calendar sync",
+    ["provider", "change"],
+)
+SYNC_DURATION_SECONDS = create_histogram(
+    "calendar_sync_duration_seconds",
+    "Duration of one user/provider sync",
+    ["provider"],
+    buckets=[0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60],
+)
+SYNC_LAG_SECONDS = create_histogram(
+    "calendar_sync_lag_seconds",
+    "Delay between a sync falling due and starting",
+    ["provider"],
+    buckets=[1, 5, 15, 60, 300, 900, 3600],
+)
+
+
+@dataclass
+class SyncRunResult:
+    """Outcome of one user/provider sync"""
+
+    provider: str
+    status: str  # "success" | "error"
+    mode: str  # "delta" | "full"
+    upserted: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    sync_token: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def synced_events(self) -> int:
+        return self.upserted + self.unchanged + self.deleted
+
+
+class _ProviderLimiter:
+    """Concurrency cap plus token bucket on sync starts for one provider"""
+
+    def __init__(self, rate: float, concurrency: int):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._tokens = min(
+                        self.capacity, self._tokens + (now - self._updated) * self.rate
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return self
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._slots.release()
+
+
+def _epoch(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class CalendarSyncEngine:
+    """Scheduled, token-based, concurrent external calendar sync for one replica."""
+
+    def __init__(
+        self,
+        repository: SyncRepositoryProtocol,
+        provider_clients: Dict[str, Any],
+        credentials_provider: Optional[SyncCredentialsProviderProtocol] = None,
+        *,
+        workers: int = 8,
+        sync_interval_seconds: float = 900.0,
+        poll_interval_seconds: float = 5.0,
+        batch_size: int = 500,
+        claim_ttl_seconds: float = 600.0,
+        retry_base_seconds: float = 60.0,
+        max_backoff_seconds: float = 6 * 3600.0,
+        provider_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        owner: Optional[str] = None,
+    ):
+        """
+        Args:
+            repository: Sync state and bulk event writes
+            provider_clients: SyncProvider value -> client with ``list_events``
+            credentials_provider: Resolves stored credentials for scheduled syncs
+            workers: Max syncs running at once on this replica
+            sync_interval_seconds: Delay between successful syncs of one calendar
+            poll_interval_seconds: How often to look for due syncs when idle
+            batch_size: Max events per bulk upsert statement
+            claim_ttl_seconds: Lease length before another replica may retry
+            retry_base_seconds: First retry delay after a failure (doubles)
+            max_backoff_seconds: Cap on the retry delay
+            provider_limits: Provider -> (sync starts per second, concurrent syncs)
+            owner: Replica id recorded on claims
+        """
+        self.repository = repository
+        self.provider_clients = provider_clients
+        self.credentials_provider = credentials_provider
+        self.workers = workers
+        self.sync_interval = sync_interval_seconds
+        self.poll_interval = poll_interval_seconds
+        self.batch_size = batch_size
+        self.claim_ttl = claim_ttl_seconds
+        self.retry_base = retry_base_seconds
+        self.max_backoff = max_backoff_seconds
+        self.owner = (
+            owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+
+        limits = {**DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+        self._limiters = {
+            provider: _ProviderLimiter(*limits.get(provider, (2.0, 2)))
+            for provider in provider_clients
+        }
+        self._inflight: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="calendar-sync")
+
+    async def stop(self) -> None:
+        """Stop claiming; in-flight syncs are cancelled and their leases expire."""
+        tasks = list(self._inflight)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                free = self.workers - len(self._inflight)
+                claimed = await self._claim(free) if free > 0 else 0
+                if self._inflight and (free <= 0 or claimed == free):
+                    # Saturated: more may be due, claim again as soon as a slot frees
+                    await asyncio.wait(
+                        self._inflight,
+                        timeout=self.poll_interval,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                else:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Calendar sync loop error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self, limit: int) -> int:
+        rows = await self.repository.claim_due_syncs(
+            owner=self.owner, limit=limit, ttl_seconds=self.claim_ttl
+        )
+        for row in rows:
+            task = asyncio.create_task(self._run_claimed(row))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+        return len(rows)
+
+    async def run_once(self) -> int:
+        """Claim every due sync (up to ``workers``) and run them; returns the count."""
+        rows = await self.repository.claim_due_syncs(
+            owner=self.owner, limit=self.workers, ttl_seconds=self.claim_ttl
+        )
+        await asyncio.gather(*(self._run_claimed(row) for row in rows))
+        return len(rows)
+
+    async def _run_claimed(self, row: Dict[str, Any]) -> SyncRunResult:
+        due = _epoch(row.get("next_sync_at"))
+        if due is not None:
+            SYNC_LAG_SECONDS.labels(provider=row["provider"]).observe(
+                max(0.0, time.time() - due)
+            )
+        return await self.sync_user(row["user_id"], row["provider"], state=row)
+
+    def _next_success(self) -> datetime:
+        delay = self.sync_interval * random.uniform(0.9, 1.1)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    def _next_retry(self, failures: int) -> datetime:
+        delay = min(self.max_backoff, self.retry_base * 2 ** max(0, failures - 1))
+        delay *= random.uniform(0.8, 1.0)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    # ------------------------------------------------------------------
+    # One sync
+    # ------------------------------------------------------------------
+
+    async def sync_user(
+        self,
+        user_id: str,
+        provider: str,
+        credentials: Optional[Dict[str, Any]] = None,
+        *,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> SyncRunResult:
+        """
+        Run one incremental sync and record it (never raises).
+
+        Args:
+            user_id: User ID
+            provider: SyncProvider value
+            credentials: Provider credentials; looked up via the credentials
+                provider when omitted
+            state: The user's sync_status row if already loaded (claimed rows)
+        """
+        started = time.monotonic()
+        mode = "delta"
+        try:
+            client = self.provider_clients.get(provider)
+            if client is None:
+                raise ValueError(f"Unsupported provider: {provider}")
+            if state is None:
+                state = await self.repository.get_sync_status(user_id, provider) or {}
+            if credentials is None and self.credentials_provider is not None:
+                credentials = await self.credentials_provider.get_credentials(
+                    user_id, provider
+                )
+            if not credentials:
+                raise ValueError(f"No stored {provider} credentials for user {user_id}")
+
+            sync_token = state.get("sync_token")
+            if not sync_token:
+                mode = "full"
+            window_start = datetime.now(timezone.utc)
+            async with self._limiters[provider]:
+                try:
+                    result = await client.list_events(
+                        credentials, sync_token=sync_token
+                    )
+                except SyncTokenExpiredError:
+                    logger.info(
+                        f"{provider} sync token expired for user {user_id}; full sync"
+                    )
+                    mode = "full"
+                    window_start = datetime.now(timezone.utc)
+                    result = await client.list_events(credentials, sync_token=None)
+
+            run = await self._apply(
+                user_id, provider, result, mode, window_start=window_start
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failures = (state or {}).get("consecutive_failures") or 0
+            logger.warning(f"{provider} sync failed for user {user_id}: {e}")
+            await self.repository.complete_sync(
+                user_id,
+                provider,
+                status="error",
+                error_message=str(e),
+                next_sync_at=self._next_retry(failures + 1),
+                failed=True,
+            )
+            SYNC_RUNS.labels(provider=provider, mode=mode, status="error").inc()
+            return SyncRunResult(
+                provider=provider, status="error", mode=mode, error=str(e)
+            )
+        finally:
+            SYNC_DURATION_SECONDS.labels(provider=provider).observe(
+                time.monotonic() - started
+            )
+
+        await self.repository.complete_sync(
+            user_id,
+            provider,
+            status="active",
+            synced_count=run.synced_events,
+            sync_token=run.sync_token,
+            next_sync_at=self._next_success(),
+        )
+        SYNC_RUNS.labels(provider=provider, mode=mode, status="success").inc()
+        return run
+
+    async def _apply(
+        self,
+        user_id: str,
+        provider: str,
+        result: ProviderSyncResult,
+        mode: str,
+        *,
+        window_start: datetime,
+    ) -> SyncRunResult:
+        """Write one provider result in bulk statements"""
+        events: List[Dict[str, Any]] = [asdict(event) for event in result.events]
+        upserted = 0
+        for i in range(0, len(events), self.batch_size):
+            upserted += await self.repository.bulk_upsert_external_events(
+                user_id, provider, events[i : i + self.batch_size]
+            )
+
+        deleted = await self.repository.delete_external_events(
+            user_id, provider, result.deleted_event_ids
+        )
+        if mode == "full":
+            deleted += await self.repository.prune_external_events(
+                user_id,
+                provider,
+                [event["external_event_id"] for event in events],
+                window_start,
+                window_start + timedelta(days=FULL_SYNC_DAYS),
+            )
+
+        unchanged = len(events) - upserted
+        SYNC_CHANGES.labels(provider=provider, change="upsert").inc(upserted)
+        SYNC_CHANGES.labels(provider=provider, change="unchanged").inc(unchanged)
+        SYNC_CHANGES.labels(provider=provider, change="delete").inc(deleted)
+        return SyncRunResult(
+            provider=provider,
+            status="success",
+            mode=mode,
+            upserted=upserted,
+            unchanged=unchanged,
+            deleted=deleted,
+            sync_token=result.sync_token,
+        )
+
+
+__all__ = ["CalendarSyncEngine", "SyncRunResult"]
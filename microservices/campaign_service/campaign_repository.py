@@ -35,6 +35,7 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.text_search import TextSearch
 from .models import (
     Campaign,
     CampaignAudience,
@@ -318,9 +319,8 @@ class CampaignRepository:
                 params.append(campaign_type.value)
 
             if search:
-                param_count += 1
-                conditions.append(f"LOWER(name) LIKE LOWER(${param_count})")
-                params.append(f"%{search}%")
+                conditions.append(TextSearch(("name",), search).bind(params).condition)
+                param_count = len(params)
 
             where_clause = " AND ".join(conditions)
 
@@ -21,6 +21,7 @@ from core.config_manager import ConfigManager
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from .models import (
     CampaignCreateRequest,
@@ -118,6 +119,7 @@ async def lifespan(app: FastAPI):
         except Exception:
             pass
     await factory.close()
+    close_discovery_caches()
 
 
 # Create FastAPI application
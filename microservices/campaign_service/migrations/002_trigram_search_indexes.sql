@@ -0,0 +1,10 @@
+-- Campaign Service Migration: Trigram index for campaign name search
+-- Version: 002
+-- Date: 2026-10-18
+-- Description: Serve campaign name search (core.text_search) from a pg_trgm
+--              GIN index instead of a sequential LOWER(name) LIKE scan
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_campaigns_name_trgm
+    ON campaign.campaigns USING gin (name gin_trgm_ops);
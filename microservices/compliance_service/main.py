@@ -29,6 +29,7 @@ from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 from .compliance_service import ComplianceService
 from .compliance_repository import ComplianceRepository
@@ -206,6 +207,7 @@ async def lifespan(app: FastAPI):
                 logger.info("Compliance event bus closed")
             except Exception as e:
                 logger.error(f"Error closing event bus: {e}")
+    close_discovery_caches()
 
 
 # ====================
@@ -27,6 +27,7 @@ from core.health import HealthCheck
 from core.logger import setup_service_logger
 from core.metrics import setup_metrics
 from core.nats_client import get_event_bus
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from . import routes_catalog
@@ -132,6 +133,7 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
     await connector_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -16,6 +16,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -209,6 +210,7 @@ async def lifespan(app: FastAPI):
         if repository:
             await repository.close()
             logger.info("Credit service database connections closed")
+    close_discovery_caches()
 
 
 # Create FastAPI application
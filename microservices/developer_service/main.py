@@ -15,6 +15,7 @@ from core.config_manager import ConfigManager
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.health import HealthCheck
 from core.logger import setup_service_logger
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .developer_service import DeveloperOverviewService
@@ -85,6 +86,7 @@ async def lifespan(app: FastAPI):
         await developer_service.close()
     await shutdown_manager.shutdown_with_timeout()
     logger.info("Developer Service shutting down")
+    close_discovery_caches()
 
 
 app = FastAPI(title="Developer Service", version="1.0.0", lifespan=lifespan)
@@ -431,6 +431,34 @@ class DeviceRepository:
             logger.error(f"Error getting device group: {e}")
             return None
 
+    async def list_group_device_ids(self, group_id: str) -> List[str]:
+        """IDs of commandable devices in a group and all of its subgroups"""
+        try:
+            query = f"""
+                WITH RECURSIVE groups AS (
+                    SELECT group_id FROM {self.schema}.{self.groups_table}
+                    WHERE group_id = $1
+                    UNION
+                    SELECT g.group_id
+                    FROM {self.schema}.{self.groups_table} g
+                    JOIN groups p ON g.parent_group_id = p.group_id
+                )
+                SELECT d.device_id
+                FROM {self.schema}.{self.devices_table} d
+                JOIN groups USING (group_id)
+                WHERE d.status <> 'decommissioned'
+                ORDER BY d.device_id
+            """
+
+            async with self.db:
+                results = await self.db.query(query, params=[group_id])
+
+            return [row["device_id"] for row in results] if results else []
+
+        except Exception as e:
+            logger.error(f"Error resolving device group {group_id}: {e}")
+            raise
+
     # ==================== Frame Config Operations ====================
 
     async def create_frame_config(
@@ -621,6 +649,249 @@ class DeviceRepository:
             logger.error(f"Error updating command status: {e}")
             return False
 
+    async def bulk_create_device_commands(
+        self, commands: List[Dict[str, Any]], chunk_size: int = 1000
+    ) -> int:
+        """Insert many pending commands, one statement per ``chunk_size`` rows"""
+        try:
+            now = datetime.now(timezone.utc)
+            query = f"""
+                INSERT INTO {self.schema}.{self.commands_table} (
+                    command_id, device_id, user_id, command, parameters,
+                    timeout, priority, require_ack, status, created_at,
+                    batch_id, group_id
+                )
+                SELECT r.command_id, r.device_id, r.user_id, r.command, r.parameters,
+                       r.timeout, r.priority, r.require_ack, 'pending', $2,
+                       r.batch_id, r.group_id
+                FROM jsonb_to_recordset($1::jsonb) AS r(
+                    command_id text, device_id text, user_id text, command text,
+                    parameters jsonb, timeout int, priority int, require_ack boolean,
+                    batch_id text, group_id text
+                )
+            """
+            created = 0
+            async with self.db:
+                for start in range(0, len(commands), chunk_size):
+                    rows = [
+                        {
+                            "command_id": c["command_id"],
+                            "device_id": c["device_id"],
+                            "user_id": c["user_id"],
+                            "command": c["command"],
+                            "parameters": c.get("parameters") or {},
+                            "timeout": c.get("timeout", 30),
+                            "priority": c.get("priority", 1),
+                            "require_ack": c.get("require_ack", True),
+                            "batch_id": c.get("batch_id"),
+                            "group_id": c.get("group_id"),
+                        }
+                        for c in commands[start : start + chunk_size]
+                    ]
+                    count = await self.db.execute(query, params=[json.dumps(rows), now])
+                    created += count or 0
+
+            return created
+
+        except Exception as e:
+            logger.error(f"Error creating device commands: {e}")
+            raise
+
+    async def bulk_update_command_status(
+        self,
+        command_ids: List[str],
+        status: str,
+        error_message: Optional[str] = None,
+    ) -> int:
+        """
+        Set the dispatch outcome (sent / failed) of many pending commands
+
+        Only rows still ``pending`` change, so an acknowledgement that raced
+        ahead of this update is kept.
+        """
+        if not command_ids:
+            return 0
+        try:
+            timestamp_column = "sent_at" if status == "sent" else "completed_at"
+            query = f"""
+                UPDATE {self.schema}.{self.commands_table}
+                SET status = $2,
+                    {timestamp_column} = clock_timestamp(),
+                    error_message = COALESCE($3, error_message)
+                WHERE command_id = ANY($1::text[]) AND status = 'pending'
+            """
+            params = [command_ids, status, error_message]
+
+            async with self.db:
+                count = await self.db.execute(query, params=params)
+
+            return count or 0
+
+        except Exception as e:
+            logger.error(f"Error updating command statuses: {e}")
+            return 0
+
+    async def bulk_acknowledge_commands(
+        self, device_id: str, acks: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Apply a device's command acknowledgements in one statement
+
+        Each ack has command_id, status (acknowledged / executed / failed) and
+        optional result / error_message. Finished commands are not moved back
+        to ``acknowledged``, and acks for another device's commands are ignored.
+        """
+        if not acks:
+            return 0
+        try:
+            query = f"""
+                UPDATE {self.schema}.{self.commands_table} c
+                SET status = a.status,
+                    acknowledged_at = COALESCE(c.acknowledged_at, clock_timestamp()),
+                    completed_at = CASE
+                        WHEN a.status = 'acknowledged' THEN c.completed_at
+                        ELSE clock_timestamp()
+                    END,
+                    result = COALESCE(a.result, c.result),
+                    error_message = COALESCE(a.error_message, c.error_message)
+                FROM jsonb_to_recordset($1::jsonb) AS a(
+                    command_id text, status text, result jsonb, error_message text
+                )
+                WHERE c.command_id = a.command_id
+                  AND c.device_id = $2
+                  AND (
+                      c.status IN ('pending', 'sent')
+                      OR (c.status = 'acknowledged' AND a.status <> 'acknowledged')
+                  )
+            """
+            rows = [
+                {
+                    "command_id": a["command_id"],
+                    "status": a["status"],
+                    "result": a.get("result"),
+                    "error_message": a.get("error_message"),
+                }
+                for a in acks
+            ]
+            params = [json.dumps(rows), device_id]
+
+            async with self.db:
+                count = await self.db.execute(query, params=params)
+
+            return count or 0
+
+        except Exception as e:
+            logger.error(f"Error acknowledging commands: {e}")
+            raise
+
+    async def get_command_batch_summary(
+        self, batch_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Progress of a command batch
+
+        Returns:
+            Dict with user_id, group_id, command, total, per-status counts,
+            awaiting (commands still expecting an acknowledgement) and
+            deadline (creation time plus the longest command timeout), or
+            None for an unknown batch
+        """
+        try:
+            query = f"""
+                SELECT
+                    MIN(user_id) AS user_id,
+                    MIN(group_id) AS group_id,
+                    MIN(command) AS command,
+                    COUNT(*) AS total,
+                    COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+                    COUNT(*) FILTER (WHERE status = 'sent') AS sent,
+                    COUNT(*) FILTER (WHERE status = 'acknowledged') AS acknowledged,
+                    COUNT(*) FILTER (WHERE status = 'executed') AS executed,
+                    COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+                    COUNT(*) FILTER (WHERE status = 'timeout') AS timeout,
+                    COUNT(*) FILTER (
+                        WHERE require_ack AND status IN ('pending', 'sent')
+                    ) AS awaiting,
+                    MIN(created_at) + MAX(timeout) * INTERVAL '1 second' AS deadline
+                FROM {self.schema}.{self.commands_table}
+                WHERE batch_id = $1
+            """
+
+            async with self.db:
+                result = await self.db.query_row(query, params=[batch_id])
+
+            if not result or not result.get("total"):
+                return None
+            return dict(result)
+
+        except Exception as e:
+            logger.error(f"Error getting command batch summary: {e}")
+            raise
+
+    async def get_command_batch_updates(
+        self,
+        batch_id: str,
+        exclude_command_ids: List[str],
+        after_command_id: str = "",
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Commands of a batch that were acknowledged or finished, except
+        ``exclude_command_ids``, paged by command_id
+
+        Callers exclude the commands they have already seen finish and
+        re-read the rest, rather than keyset on a timestamp: acks from
+        concurrent requests commit in any order relative to their stamps.
+        """
+        try:
+            query = f"""
+                SELECT command_id, device_id, status, result, error_message,
+                       GREATEST(acknowledged_at, completed_at) AS updated_at
+                FROM {self.schema}.{self.commands_table}
+                WHERE batch_id = $1
+                  AND status IN ('acknowledged', 'executed', 'failed', 'timeout')
+                  AND NOT (command_id = ANY($2::text[]))
+                  AND command_id > $3
+                ORDER BY command_id ASC
+                LIMIT {int(limit)}
+            """
+            params = [batch_id, list(exclude_command_ids), after_command_id]
+
+            async with self.db:
+                results = await self.db.query(query, params=params)
+
+            updates = []
+            for row in results or []:
+                row = dict(row)
+                if isinstance(row.get("result"), str):
+                    row["result"] = json.loads(row["result"])
+                updates.append(row)
+            return updates
+
+        except Exception as e:
+            logger.error(f"Error getting command batch updates: {e}")
+            raise
+
+    async def expire_command_batch(self, batch_id: str) -> int:
+        """Mark a batch's commands still waiting for an ack as ``timeout``"""
+        try:
+            query = f"""
+                UPDATE {self.schema}.{self.commands_table}
+                SET status = 'timeout', completed_at = clock_timestamp()
+                WHERE batch_id = $1
+                  AND require_ack
+                  AND status IN ('pending', 'sent')
+            """
+
+            async with self.db:
+                count = await self.db.execute(query, params=[batch_id])
+
+            return count or 0
+
+        except Exception as e:
+            logger.error(f"Error expiring command batch: {e}")
+            raise
+
     # ==================== Utility Methods ====================
 
     async def check_connection(self) -> bool:
@@ -10,9 +10,10 @@ import hashlib
 import secrets
 import jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 import asyncio
+import os
 
 # Import protocols (no I/O dependencies) - NOT the concrete repository!
 from .protocols import DeviceRepositoryProtocol
@@ -23,6 +24,7 @@ from .models import (
     DeviceStatsResponse,
     DeviceHealthResponse,
     DeviceGroupResponse,
+    CommandBatchResponse,
 )
 
 # Import event bus components
@@ -42,6 +44,23 @@ except ImportError:
     logger.warning("MQTT client not available - commands will be simulated")
 
 
+_ACK_PAGE_SIZE = 1000
+_BATCH_COUNT_FIELDS = (
+    "total",
+    "pending",
+    "sent",
+    "acknowledged",
+    "executed",
+    "failed",
+    "timeout",
+    "awaiting",
+)
+
+
+def _batch_counts(summary: Dict[str, Any]) -> Dict[str, int]:
+    return {field: int(summary.get(field) or 0) for field in _BATCH_COUNT_FIELDS}
+
+
 class DeviceService:
     """设备管理服务 - 带数据库持久化
 
@@ -71,6 +90,14 @@ class DeviceService:
         self.mqtt_command_client = mqtt_client
         self._mqtt_initialized = mqtt_client is not None
 
+        # 批量命令：每次 publish_batch 的消息数与并发批次数
+        self.command_publish_batch_size = int(
+            os.getenv("DEVICE_COMMAND_PUBLISH_BATCH_SIZE", "500")
+        )
+        self.command_publish_concurrency = int(
+            os.getenv("DEVICE_COMMAND_PUBLISH_CONCURRENCY", "8")
+        )
+
     async def register_device(
         self, user_id: str, device_data: Dict[str, Any]
     ) -> Optional[DeviceResponse]:
@@ -337,6 +364,7 @@ class DeviceService:
                     timeout=command.get("timeout", 30),
                     priority=command.get("priority", 1),
                     require_ack=command.get("require_ack", True),
+                    command_id=command_id,
                 )
 
                 if mqtt_command_id:
@@ -388,7 +416,6 @@ class DeviceService:
             else:
                 # 模拟发送
                 logger.warning("MQTT client not connected, simulating command send")
-                await asyncio.sleep(0.1)  # 模拟网络延迟
                 await self.device_repo.update_command_status(command_id, "sent")
 
                 logger.info(
@@ -431,6 +458,215 @@ class DeviceService:
             logger.error(f"Error sending command to device: {e}")
             return {"success": False, "error": str(e)}
 
+    async def send_group_command(
+        self, group_id: str, user_id: str, command: Dict[str, Any]
+    ) -> Optional[CommandBatchResponse]:
+        """向设备组（含子组）的所有设备发送命令"""
+        device_ids = await self.device_repo.list_group_device_ids(group_id)
+        batch, _ = await self.send_commands(
+            device_ids, user_id, command, group_id=group_id
+        )
+        return batch
+
+    async def send_commands(
+        self,
+        device_ids: List[str],
+        user_id: str,
+        command: Dict[str, Any],
+        group_id: Optional[str] = None,
+    ) -> Tuple[CommandBatchResponse, Dict[str, Dict[str, str]]]:
+        """
+        批量发送命令
+
+        命令行一次批量写入，通过同一个 MQTT 会话并发分批发布，
+        发布结果再用两条语句批量更新状态。
+
+        Returns:
+            (CommandBatchResponse, {device_id: {"command_id", "status"}})
+        """
+        batch_id = secrets.token_hex(16)
+        rows = [
+            {
+                "command_id": secrets.token_hex(16),
+                "device_id": device_id,
+                "user_id": user_id,
+                "command": command["command"],
+                "parameters": command.get("parameters") or {},
+                "timeout": command.get("timeout", 30),
+                "priority": command.get("priority", 1),
+                "require_ack": command.get("require_ack", True),
+                "batch_id": batch_id,
+                "group_id": group_id,
+            }
+            for device_id in dict.fromkeys(device_ids)
+        ]
+        if rows:
+            await self.device_repo.bulk_create_device_commands(rows)
+
+        await self._ensure_mqtt_connected()
+
+        if self.mqtt_command_client and self.mqtt_command_client.is_connected():
+            dispatch_status = "sent"
+            published = await self.mqtt_command_client.send_device_commands(
+                rows,
+                batch_size=self.command_publish_batch_size,
+                max_concurrency=self.command_publish_concurrency,
+            )
+        else:
+            dispatch_status = "simulated"
+            if rows:
+                logger.warning("MQTT client not connected, simulating command send")
+            published = {row["command_id"]: True for row in rows}
+
+        sent_ids = [r["command_id"] for r in rows if published.get(r["command_id"])]
+        failed_ids = [
+            r["command_id"] for r in rows if not published.get(r["command_id"])
+        ]
+        await self.device_repo.bulk_update_command_status(sent_ids, "sent")
+        await self.device_repo.bulk_update_command_status(
+            failed_ids, "failed", error_message="MQTT send failed"
+        )
+
+        results = {
+            r["device_id"]: {
+                "command_id": r["command_id"],
+                "status": dispatch_status
+                if published.get(r["command_id"])
+                else "failed",
+            }
+            for r in rows
+        }
+        batch = CommandBatchResponse(
+            batch_id=batch_id,
+            group_id=group_id,
+            command=command["command"],
+            status=dispatch_status,
+            total=len(rows),
+            sent=len(sent_ids),
+            failed=len(failed_ids),
+            failed_device_ids=[
+                r["device_id"] for r in rows if not published.get(r["command_id"])
+            ],
+        )
+        logger.info(
+            f"Command batch {batch_id} ({command['command']}): "
+            f"{batch.sent}/{batch.total} {dispatch_status}"
+        )
+
+        # One event per batch instead of one per device
+        if self.event_bus and sent_ids:
+            try:
+                event = Event(
+                    event_type="device.commands_sent",
+                    source="device_service",
+                    data={
+                        "batch_id": batch_id,
+                        "group_id": group_id,
+                        "user_id": user_id,
+                        "command": command["command"],
+                        "parameters": command.get("parameters", {}),
+                        "priority": command.get("priority", 1),
+                        "sent": batch.sent,
+                        "failed": batch.failed,
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    },
+                )
+                await self.event_bus.publish_event(event)
+            except Exception as e:
+                logger.error(f"Failed to publish device.commands_sent event: {e}")
+
+        return batch, results
+
+    async def acknowledge_commands(
+        self, device_id: str, acks: List[Dict[str, Any]]
+    ) -> int:
+        """记录设备的命令回执（一条语句批量更新）"""
+        return await self.device_repo.bulk_acknowledge_commands(device_id, acks)
+
+    async def get_command_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """获取批量命令进度"""
+        return await self.device_repo.get_command_batch_summary(batch_id)
+
+    async def stream_command_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 1.0,
+        max_wait: Optional[float] = None,
+    ):
+        """
+        流式返回批量命令回执
+
+        Yields dicts: a ``summary`` first, then an ``ack`` whenever a command
+        is acknowledged / finished, and a final ``summary`` with ``done`` once
+        no command awaits an ack. Commands still unacknowledged at the batch
+        deadline (creation + longest timeout) are marked ``timeout``.
+        """
+        summary = await self.device_repo.get_command_batch_summary(batch_id)
+        if summary is None:
+            return
+        yield {"type": "summary", "batch_id": batch_id, **_batch_counts(summary)}
+
+        # Every poll re-reads the batch's acknowledged/finished commands
+        # minus those already streamed as finished, so an ack that commits
+        # late is still picked up on the next poll. The summary is read
+        # before the updates: every ack it counts is streamed in the same
+        # poll.
+        finished: set = set()
+        acknowledged: set = set()
+        expired = False
+        started = datetime.now(timezone.utc)
+        while True:
+            summary = await self.device_repo.get_command_batch_summary(batch_id)
+            after_command_id = ""
+            while True:
+                updates = await self.device_repo.get_command_batch_updates(
+                    batch_id, list(finished), after_command_id, limit=_ACK_PAGE_SIZE
+                )
+                for update in updates:
+                    command_id = update["command_id"]
+                    after_command_id = command_id
+                    if update["status"] == "acknowledged":
+                        if command_id in acknowledged:
+                            continue
+                        acknowledged.add(command_id)
+                    else:
+                        finished.add(command_id)
+                    updated_at = update.get("updated_at")
+                    yield {
+                        "type": "ack",
+                        "batch_id": batch_id,
+                        "command_id": command_id,
+                        "device_id": update["device_id"],
+                        "status": update["status"],
+                        "result": update.get("result"),
+                        "error_message": update.get("error_message"),
+                        "at": updated_at.isoformat() if updated_at else None,
+                    }
+                if len(updates) < _ACK_PAGE_SIZE:
+                    break
+
+            now = datetime.now(timezone.utc)
+            if summary["awaiting"] and not expired and now >= summary["deadline"]:
+                try:
+                    await self.device_repo.expire_command_batch(batch_id)
+                    expired = True
+                    continue  # stream the timeouts right away
+                except Exception as e:
+                    # Retried after the poll interval below, not in a tight loop
+                    logger.error(f"Failed to expire command batch {batch_id}: {e}")
+            if not summary["awaiting"] or (
+                max_wait is not None and (now - started).total_seconds() >= max_wait
+            ):
+                break
+            await asyncio.sleep(poll_interval)
+
+        yield {
+            "type": "summary",
+            "batch_id": batch_id,
+            "done": not summary["awaiting"],
+            **_batch_counts(summary),
+        }
+
     async def get_device_health(self, device_id: str) -> Optional[DeviceHealthResponse]:
         """获取设备健康状态 - 从 telemetry_service 获取实际数据"""
         try:
@@ -5,7 +5,9 @@ Device Management Service - Main Application
 """
 
 from fastapi import FastAPI, HTTPException, Depends, Query, Path, Body, Header
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
+import json
 from typing import Optional, Dict, Any, List
 
 
@@ -15,6 +17,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 from .models import (
     DeviceRegistrationRequest,
@@ -22,6 +25,8 @@ from .models import (
     DeviceAuthRequest,
     DeviceCommandRequest,
     BulkCommandRequest,
+    CommandAckRequest,
+    CommandBatchResponse,
     DeviceGroupRequest,
     DevicePairingRequest,
     DevicePairingResponse,
@@ -168,6 +173,7 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
     await microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -555,6 +561,71 @@ async def send_command(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.post("/api/v1/devices/{device_id}/commands/ack")
+async def acknowledge_commands(
+    device_id: str = Path(..., description="Device ID"),
+    request: CommandAckRequest = Body(...),
+    user_context: Dict[str, Any] = Depends(get_user_context),
+):
+    """设备批量上报命令回执"""
+    try:
+        updated = await microservice.service.acknowledge_commands(
+            device_id, [ack.model_dump() for ack in request.acks]
+        )
+        return {"updated": updated}
+    except Exception as e:
+        logger.error(f"Error acknowledging commands: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _get_owned_command_batch(
+    batch_id: str, user_context: Dict[str, Any]
+) -> Dict[str, Any]:
+    batch = await microservice.service.get_command_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Command batch not found")
+    if (
+        batch["user_id"] != user_context["user_id"]
+        and user_context.get("role") != "service"
+    ):
+        raise HTTPException(status_code=403, detail="Access denied")
+    return batch
+
+
+@app.get("/api/v1/devices/commands/batches/{batch_id}")
+async def get_command_batch(
+    batch_id: str = Path(..., description="Command batch ID"),
+    user_context: Dict[str, Any] = Depends(get_user_context),
+):
+    """获取批量命令进度"""
+    try:
+        return await _get_owned_command_batch(batch_id, user_context)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting command batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.get("/api/v1/devices/commands/batches/{batch_id}/stream")
+async def stream_command_batch(
+    batch_id: str = Path(..., description="Command batch ID"),
+    poll_interval: float = Query(1.0, ge=0.2, le=30),
+    max_wait: Optional[float] = Query(None, ge=1, le=3600),
+    user_context: Dict[str, Any] = Depends(get_user_context),
+):
+    """流式返回批量命令回执 (NDJSON)"""
+    await _get_owned_command_batch(batch_id, user_context)
+
+    async def generate():
+        async for item in microservice.service.stream_command_batch(
+            batch_id, poll_interval=poll_interval, max_wait=max_wait
+        ):
+            yield json.dumps(item, default=str) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 # ======================
 # Device Health & Monitoring
 # ======================
@@ -618,6 +689,33 @@ async def add_device_to_group(
     return {"message": f"Device {device_id} added to group {group_id}"}
 
 
+@app.post("/api/v1/groups/{group_id}/commands", response_model=CommandBatchResponse)
+async def send_group_command(
+    group_id: str = Path(..., description="Group ID"),
+    request: DeviceCommandRequest = Body(...),
+    user_context: Dict[str, Any] = Depends(get_user_context),
+):
+    """向设备组发送命令"""
+    try:
+        group = await microservice.service.get_device_group(group_id)
+        if not group:
+            raise HTTPException(status_code=404, detail="Device group not found")
+        if (
+            group.user_id != user_context["user_id"]
+            and user_context.get("role") != "service"
+        ):
+            raise HTTPException(status_code=403, detail="Access denied")
+
+        return await microservice.service.send_group_command(
+            group_id, user_context["user_id"], request.model_dump()
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error sending group command: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 # ======================
 # Bulk Operations
 # ======================
@@ -650,8 +748,6 @@ async def bulk_send_commands(
     user_context: Dict[str, Any] = Depends(get_user_context),
 ):
     """批量发送命令"""
-    results = []
-
     # Create DeviceCommandRequest from flattened BulkCommandRequest
     command_obj = DeviceCommandRequest(
         command=request.command_name,
@@ -661,16 +757,38 @@ async def bulk_send_commands(
         require_ack=request.require_ack,
     )
 
+    try:
+        batch, sent = await microservice.service.send_commands(
+            request.device_ids, user_context["user_id"], command_obj.model_dump()
+        )
+    except Exception as e:
+        logger.error(f"Error sending bulk commands: {e}")
+        results = [
+            {"device_id": device_id, "success": False, "error": str(e)}
+            for device_id in request.device_ids
+        ]
+        return {"results": results, "total": len(request.device_ids)}
+
+    results = []
     for device_id in request.device_ids:
-        try:
-            result = await microservice.service.send_command(
-                device_id, user_context["user_id"], command_obj.model_dump()
+        result = sent[device_id]
+        if result["status"] == "failed":
+            results.append(
+                {
+                    "device_id": device_id,
+                    "success": False,
+                    "command_id": result["command_id"],
+                    "error": "Failed to publish command via MQTT",
+                }
             )
-            results.append({"device_id": device_id, **result})
-        except Exception as e:
-            results.append({"device_id": device_id, "success": False, "error": str(e)})
+        else:
+            results.append({"device_id": device_id, "success": True, **result})
 
-    return {"results": results, "total": len(request.device_ids)}
+    return {
+        "results": results,
+        "total": len(request.device_ids),
+        "batch_id": batch.batch_id,
+    }
 
 
 # ======================
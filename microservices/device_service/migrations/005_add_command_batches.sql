@@ -0,0 +1,17 @@
+-- Device Service Migration: Command batches for group / bulk commands
+-- Version: 005
+-- Date: 2026-10-19
+-- Description: Commands sent to many devices at once share a batch_id so
+--              their rows are written, updated and streamed back as a set
+
+ALTER TABLE device.device_commands
+    ADD COLUMN IF NOT EXISTS batch_id VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS group_id VARCHAR(255);
+
+-- Batch progress queries (status counts, acknowledgements since a time)
+CREATE INDEX IF NOT EXISTS idx_device_commands_batch
+    ON device.device_commands(batch_id)
+    WHERE batch_id IS NOT NULL;
+
+COMMENT ON COLUMN device.device_commands.batch_id IS 'Shared by commands sent together to a device group or device list';
+COMMENT ON COLUMN device.device_commands.group_id IS 'Target device group of a group command';
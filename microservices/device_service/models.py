@@ -133,6 +133,21 @@ class BulkCommandRequest(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class CommandAckItem(BaseModel):
+    """设备命令回执"""
+
+    command_id: str
+    status: str = Field(..., pattern="^(acknowledged|executed|failed)$")
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = Field(None, max_length=1000)
+
+
+class CommandAckRequest(BaseModel):
+    """批量命令回执请求"""
+
+    acks: List[CommandAckItem] = Field(..., min_length=1, max_length=500)
+
+
 class DeviceGroupRequest(BaseModel):
     """设备组请求"""
 
@@ -208,6 +223,19 @@ class DeviceGroupResponse(BaseModel):
     updated_at: datetime
 
 
+class CommandBatchResponse(BaseModel):
+    """批量命令下发结果"""
+
+    batch_id: str
+    group_id: Optional[str] = None
+    command: str
+    status: str  # sent / simulated
+    total: int
+    sent: int
+    failed: int
+    failed_device_ids: List[str] = []
+
+
 class DeviceStatsResponse(BaseModel):
     """设备统计响应"""
 
@@ -102,6 +102,51 @@ class DeviceRepositoryProtocol(Protocol):
         """Update command status"""
         ...
 
+    async def list_group_device_ids(self, group_id: str) -> List[str]:
+        """IDs of commandable devices in a group and its subgroups"""
+        ...
+
+    async def bulk_create_device_commands(
+        self, commands: List[Dict[str, Any]], chunk_size: int = 1000
+    ) -> int:
+        """Insert many pending commands"""
+        ...
+
+    async def bulk_update_command_status(
+        self,
+        command_ids: List[str],
+        status: str,
+        error_message: Optional[str] = None,
+    ) -> int:
+        """Set the dispatch outcome of many pending commands"""
+        ...
+
+    async def bulk_acknowledge_commands(
+        self, device_id: str, acks: List[Dict[str, Any]]
+    ) -> int:
+        """Apply a device's command acknowledgements"""
+        ...
+
+    async def get_command_batch_summary(
+        self, batch_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Progress of a command batch"""
+        ...
+
+    async def get_command_batch_updates(
+        self,
+        batch_id: str,
+        exclude_command_ids: List[str],
+        after_command_id: str = "",
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Acknowledged / finished commands of a batch not in exclude_command_ids"""
+        ...
+
+    async def expire_command_batch(self, batch_id: str) -> int:
+        """Mark a batch's unacknowledged commands as timed out"""
+        ...
+
     async def check_connection(self) -> bool:
         """Check database connection"""
         ...
@@ -144,11 +189,21 @@ class MQTTCommandClientProtocol(Protocol):
         parameters: Dict[str, Any],
         timeout: int = 30,
         priority: int = 1,
-        require_ack: bool = True
+        require_ack: bool = True,
+        command_id: Optional[str] = None,
     ) -> Optional[str]:
         """Send command to device via MQTT"""
         ...
 
+    async def send_device_commands(
+        self,
+        commands: List[Dict[str, Any]],
+        batch_size: int = 500,
+        max_concurrency: int = 8,
+    ) -> Dict[str, bool]:
+        """Send many commands; returns command_id -> published"""
+        ...
+
     def is_connected(self) -> bool:
         """Check if MQTT client is connected"""
         ...
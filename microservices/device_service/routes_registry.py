@@ -69,6 +69,24 @@ SERVICE_ROUTES = [
         "auth_required": True,
         "description": "Send command to device",
     },
+    {
+        "path": "/api/v1/devices/{device_id}/commands/ack",
+        "methods": ["POST"],
+        "auth_required": True,
+        "description": "Report command acknowledgements",
+    },
+    {
+        "path": "/api/v1/devices/commands/batches/{batch_id}",
+        "methods": ["GET"],
+        "auth_required": True,
+        "description": "Get command batch progress",
+    },
+    {
+        "path": "/api/v1/devices/commands/batches/{batch_id}/stream",
+        "methods": ["GET"],
+        "auth_required": True,
+        "description": "Stream command batch acknowledgements (NDJSON)",
+    },
     # Device Groups
     {
         "path": "/api/v1/groups",
@@ -88,6 +106,12 @@ SERVICE_ROUTES = [
         "auth_required": True,
         "description": "Add device to group",
     },
+    {
+        "path": "/api/v1/groups/{group_id}/commands",
+        "methods": ["POST"],
+        "auth_required": True,
+        "description": "Send command to device group",
+    },
     # Bulk Operations
     {
         "path": "/api/v1/devices/bulk/register",
@@ -186,6 +186,49 @@ class DocumentRepository:
             logger.error(f"Error getting document: {e}")
             return None
 
+    async def get_documents_by_ids(
+        self, doc_ids: List[str]
+    ) -> Dict[str, KnowledgeDocument]:
+        """Get many documents (with their ACL columns) in one query, keyed by doc_id"""
+        if not doc_ids:
+            return {}
+        try:
+            query = f"""
+                SELECT * FROM {self.schema}.{self.documents_table}
+                WHERE doc_id = ANY($1::text[])
+            """
+            async with self.db:
+                results = await self.db.query(
+                    query, [list(dict.fromkeys(doc_ids))], schema=self.schema
+                )
+
+            documents = {}
+            for row in results or []:
+                try:
+                    for field in [
+                        "metadata",
+                        "allowed_users",
+                        "allowed_groups",
+                        "denied_users",
+                        "point_ids",
+                        "tags",
+                    ]:
+                        if field in row:
+                            row[field] = self._convert_protobuf_to_native(row[field])
+                    document = KnowledgeDocument.model_validate(row)
+                except Exception as e:
+                    # One bad row must not hide the rest of the batch
+                    logger.warning(
+                        f"Skipping unreadable document {row.get('doc_id')}: {e}"
+                    )
+                    continue
+                documents[document.doc_id] = document
+            return documents
+
+        except Exception as e:
+            logger.error(f"Error getting documents by ids: {e}")
+            return {}
+
     async def get_document_by_file_id(
         self, file_id: str, user_id: str
     ) -> Optional[KnowledgeDocument]:
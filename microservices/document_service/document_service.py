@@ -25,7 +25,6 @@ from .protocols import (
     DocumentServiceError,
 )
 from .models import (
-    AccessLevel,
     DocumentCreateRequest,
     DocumentPermissionHistory,
     DocumentPermissionResponse,
@@ -42,6 +41,7 @@ from .models import (
     SemanticSearchRequest,
     SemanticSearchResponse,
 )
+from .permission_filter import DocumentPermissionFilter, document_acl_decision
 
 # Type checking imports (not executed at runtime)
 if TYPE_CHECKING:
@@ -49,6 +49,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Semantic search over-fetch: first round asks for top_k * factor hits and
+# doubles while permission filtering leaves the page short
+SEARCH_OVERFETCH_FACTOR = 2
+SEARCH_MAX_ROUNDS = 3
+SEARCH_MAX_FETCH = 400
 
 # ==================== Document Service ====================
 
@@ -89,6 +94,9 @@ class DocumentService:
         if not any([storage_client, auth_client, digital_client]):
             self._init_clients()
 
+        # Batched read checks for search results
+        self.permission_filter = DocumentPermissionFilter(self.auth_client)
+
     def _init_clients(self):
         """Initialize service clients"""
         try:
@@ -519,6 +527,7 @@ class DocumentService:
                 changed_at=datetime.utcnow(),
             )
             await self.repo.record_permission_change(history)
+            self.permission_filter.invalidate_document(doc_id)
 
             # Publish permission.updated event
             if self.event_bus:
@@ -654,51 +663,69 @@ class DocumentService:
                     query=request.query, results=[], total_count=0, latency_ms=0.0
                 )
 
-            # Search via Digital Analytics
-            result = await self.digital_client.search_content(
-                user_id=user_id,
-                query=request.query,
-                collection_name=f"user_{user_id}",
-                top_k=request.top_k,
-            )
-
-            if not result:
-                return SemanticSearchResponse(
+            # Over-fetch so hits dropped by the permission filter are refilled;
+            # each round costs one batch document query and one filter pass
+            results: List[SearchResultItem] = []
+            seen_chunks = set()
+            fetch_k = min(request.top_k * SEARCH_OVERFETCH_FACTOR, SEARCH_MAX_FETCH)
+            for _ in range(SEARCH_MAX_ROUNDS):
+                result = await self.digital_client.search_content(
+                    user_id=user_id,
                     query=request.query,
-                    results=[],
-                    total_count=0,
-                    latency_ms=(time.time() - start_time) * 1000,
+                    collection_name=f"user_{user_id}",
+                    top_k=fetch_k,
                 )
+                search_results = (result or {}).get("results", [])
 
-            # Convert to SearchResultItem
-            results = []
-            search_results = result.get("results", [])
-            for item in search_results:
-                score = item.get("score", 0.0)
-                if score < request.min_score:
-                    continue
-
-                doc_id = item.get("metadata", {}).get("doc_id", "")
-                if doc_id:
-                    document = await self.repo.get_document_by_id(doc_id)
-                    if document:
-                        # Check permission
-                        has_access = await self._check_document_permission(
-                            user_id, document, "read"
-                        )
-                        if has_access:
-                            results.append(
-                                SearchResultItem(
-                                    doc_id=doc_id,
-                                    title=document.title,
-                                    doc_type=document.doc_type,
-                                    relevance_score=score,
-                                    snippet=item.get("text", "")[:200],
-                                    file_id=document.file_id,
-                                    chunk_id=item.get("id"),
-                                    metadata=item.get("metadata", {}),
-                                )
+                candidates = []
+                for item in search_results:
+                    chunk_key = item.get("id") or (
+                        item.get("metadata", {}).get("doc_id"),
+                        item.get("text"),
+                    )
+                    if chunk_key in seen_chunks:
+                        continue
+                    seen_chunks.add(chunk_key)
+                    if item.get("score", 0.0) < request.min_score:
+                        continue
+                    if item.get("metadata", {}).get("doc_id"):
+                        candidates.append(item)
+
+                if candidates:
+                    documents = await self.repo.get_documents_by_ids(
+                        [item["metadata"]["doc_id"] for item in candidates]
+                    )
+                    readable = await self.permission_filter.readable(
+                        user_id, documents.values(), "read"
+                    )
+                    for item in candidates:
+                        doc_id = item["metadata"]["doc_id"]
+                        if doc_id not in readable:
+                            continue
+                        document = documents[doc_id]
+                        results.append(
+                            SearchResultItem(
+                                doc_id=doc_id,
+                                title=document.title,
+                                doc_type=document.doc_type,
+                                relevance_score=item.get("score", 0.0),
+                                snippet=item.get("text", "")[:200],
+                                file_id=document.file_id,
+                                chunk_id=item.get("id"),
+                                metadata=item.get("metadata", {}),
                             )
+                        )
+                        if len(results) >= request.top_k:
+                            break
+
+                # Done when filled, the collection is exhausted or the cap is hit
+                if (
+                    len(results) >= request.top_k
+                    or len(search_results) < fetch_k
+                    or fetch_k >= SEARCH_MAX_FETCH
+                ):
+                    break
+                fetch_k = min(fetch_k * 2, SEARCH_MAX_FETCH)
 
             latency_ms = (time.time() - start_time) * 1000
 
@@ -857,20 +884,9 @@ class DocumentService:
         self, user_id: str, document: KnowledgeDocument, action: str
     ) -> bool:
         """Check if user has permission for action on document"""
-        # Owner always has permission
-        if document.user_id == user_id:
-            return True
-
-        # Check explicit deny
-        if user_id in document.denied_users:
-            return False
-
-        # Check access level
-        if document.access_level == AccessLevel.PUBLIC:
-            return True
-
-        if document.access_level == AccessLevel.PRIVATE:
-            return user_id in document.allowed_users
+        decision = document_acl_decision(user_id, document)
+        if decision is not None:
+            return decision
 
         # For TEAM and ORGANIZATION, check via authorization service
         if self.auth_client:
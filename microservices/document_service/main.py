@@ -22,6 +22,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .models import (
@@ -183,6 +184,7 @@ async def lifespan(app: FastAPI):
             logger.error(f"❌ Failed to deregister from Consul: {e}")
 
     logger.info("Document Service stopped")
+    close_discovery_caches()
 
 
 # Initialize FastAPI app
@@ -0,0 +1,175 @@
+"""
+Document Permission Filter
+
+Read-permission check for a whole page of search hits at once. Semantic
+search used to load each hit's document and check it one by one (two
+round trips per hit); now the caller loads every candidate document with
+``get_documents_by_ids`` (the ACL columns live on the document row) and this
+filter decides them in memory:
+
+- owner, explicit deny, PUBLIC and PRIVATE are decided from the row
+- TEAM / ORGANIZATION documents need the authorization service; those
+  checks run concurrently (bounded) and the per-user decisions are cached
+  for ``cache_ttl_seconds`` so repeated searches skip them
+- ``invalidate_document`` drops cached decisions after a permission change
+  on this replica; other replicas converge within the TTL
+
+Usage:
+    permission_filter = DocumentPermissionFilter(auth_client)
+    readable_ids = await permission_filter.readable(user_id, documents)
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import AccessLevel, KnowledgeDocument
+
+logger = logging.getLogger(__name__)
+
+
+def document_acl_decision(user_id: str, document: KnowledgeDocument) -> Optional[bool]:
+    """
+    Permission decided from the document row alone.
+
+    Returns None when the authorization service has to decide (TEAM and
+    ORGANIZATION documents the user is not the owner of).
+    """
+    # Owner always has permission
+    if document.user_id == user_id:
+        return True
+
+    # Check explicit deny
+    if user_id in document.denied_users:
+        return False
+
+    # Check access level
+    if document.access_level == AccessLevel.PUBLIC:
+        return True
+
+    if document.access_level == AccessLevel.PRIVATE:
+        return user_id in document.allowed_users
+
+    return None
+
+
+class DocumentPermissionFilter:
+    """Batched document permission checks with a short per-user decision cache"""
+
+    def __init__(
+        self,
+        auth_client=None,
+        cache_ttl_seconds: float = 30.0,
+        max_cached_users: int = 10000,
+        max_concurrent_checks: int = 16,
+    ):
+        self.auth_client = auth_client
+        self.cache_ttl = cache_ttl_seconds
+        self.max_cached_users = max_cached_users
+        self._checks = asyncio.Semaphore(max_concurrent_checks)
+        # user_id -> {(doc_id, action): (allowed, expires_at)}
+        self._decisions: "OrderedDict[str, Dict[Tuple[str, str], Tuple[bool, float]]]" = (
+            OrderedDict()
+        )
+
+    async def readable(
+        self,
+        user_id: str,
+        documents: Iterable[KnowledgeDocument],
+        action: str = "read",
+    ) -> Set[str]:
+        """IDs of the given documents that ``user_id`` may access"""
+        allowed: Set[str] = set()
+        remote: List[KnowledgeDocument] = []
+        for document in documents:
+            decision = document_acl_decision(user_id, document)
+            if decision is None:
+                remote.append(document)
+            elif decision:
+                allowed.add(document.doc_id)
+        if remote:
+            allowed |= await self._remote_allowed(user_id, remote, action)
+        return allowed
+
+    async def check(
+        self, user_id: str, document: KnowledgeDocument, action: str
+    ) -> bool:
+        """Single-document check with the same rules and cache"""
+        return document.doc_id in await self.readable(user_id, [document], action)
+
+    def invalidate_document(self, doc_id: str) -> None:
+        """Forget cached decisions for a document (its ACL changed)"""
+        for decisions in self._decisions.values():
+            for key in [key for key in decisions if key[0] == doc_id]:
+                del decisions[key]
+
+    # ------------------------------------------------------------------
+
+    async def _remote_allowed(
+        self, user_id: str, documents: List[KnowledgeDocument], action: str
+    ) -> Set[str]:
+        now = time.monotonic()
+        decisions = self._decisions_for(user_id)
+        allowed: Set[str] = set()
+        pending: Dict[str, KnowledgeDocument] = {}
+        for document in documents:
+            cached = decisions.get((document.doc_id, action))
+            if cached and cached[1] > now:
+                if cached[0]:
+                    allowed.add(document.doc_id)
+            else:
+                pending[document.doc_id] = document
+
+        if not pending:
+            return allowed
+
+        if not self.auth_client:
+            # No authorization service: fall back to the row's allow list
+            return allowed | {
+                doc_id
+                for doc_id, document in pending.items()
+                if user_id in document.allowed_users
+            }
+
+        results = await asyncio.gather(
+            *(self._remote_check(user_id, doc_id, action) for doc_id in pending)
+        )
+        expires = time.monotonic() + self.cache_ttl
+        for doc_id, (result, cacheable) in zip(pending, results):
+            if cacheable:
+                decisions[(doc_id, action)] = (result, expires)
+            if result:
+                allowed.add(doc_id)
+        return allowed
+
+    async def _remote_check(
+        self, user_id: str, doc_id: str, action: str
+    ) -> Tuple[bool, bool]:
+        """(allowed, cacheable); failures deny without being cached"""
+        async with self._checks:
+            try:
+                allowed = await self.auth_client.check_permission(
+                    user_id=user_id,
+                    resource_type="document",
+                    resource_id=doc_id,
+                    action=action,
+                )
+                return bool(allowed), True
+            except Exception as e:
+                logger.warning(f"Authorization check failed: {e}")
+                return False, False
+
+    def _decisions_for(self, user_id: str) -> Dict[Tuple[str, str], Tuple[bool, float]]:
+        decisions = self._decisions.get(user_id)
+        if decisions is None:
+            decisions = self._decisions[user_id] = {}
+            while len(self._decisions) > self.max_cached_users:
+                self._decisions.popitem(last=False)
+        else:
+            self._decisions.move_to_end(user_id)
+        return decisions
+
+
+__all__ = ["DocumentPermissionFilter", "document_acl_decision"]
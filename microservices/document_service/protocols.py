@@ -59,6 +59,12 @@ class DocumentRepositoryProtocol(Protocol):
         """Get document by ID"""
         ...
 
+    async def get_documents_by_ids(
+        self, doc_ids: List[str]
+    ) -> Dict[str, KnowledgeDocument]:
+        """Get many documents in one query, keyed by doc_id"""
+        ...
+
     async def get_document_by_file_id(
         self, file_id: str, user_id: str
     ) -> Optional[KnowledgeDocument]:
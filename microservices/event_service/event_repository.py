@@ -7,7 +7,7 @@ Data access layer for event management using PostgresClient.
 import os
 import sys
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Tuple
 
 sys.path.append(
@@ -16,6 +16,7 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.stat_rollups import CounterRollup, RollupSpec
 from .models import (
     Event,
     EventStatus,
@@ -81,8 +82,33 @@ class EventRepository:
         self.event_subscriptions_table = "event_subscriptions"
         self.processing_results_table = "processing_results"
 
+        # Dashboard counters (core.stat_rollups); reconciled by main.lifespan.
+        # Events are reprocessed and change status after the hot buckets were
+        # last reconciled, so the whole rollup is also recomputed hourly.
+        self.events_rollup = CounterRollup(
+            self.db,
+            RollupSpec(
+                name="events",
+                source_table=f"{self.schema}.{self.events_table}",
+                time_column="timestamp",
+                dimensions={
+                    "status": "status",
+                    "event_type": "event_type",
+                    "event_source": "event_source",
+                    "event_category": "event_category",
+                },
+                full_reconcile_interval=3600.0,
+            ),
+            schema=self.schema,
+        )
+
         logger.info("EventRepository initialized with PostgresClient")
 
+    @property
+    def stat_rollups(self) -> List[CounterRollup]:
+        """Counter rollups maintained for this repository's statistics"""
+        return [self.events_rollup]
+
     async def initialize(self):
         """Initialize (for interface consistency with other services)"""
         logger.info("Event Repository initialized")
@@ -123,6 +149,15 @@ class EventRepository:
 
             if count is not None and count > 0:
                 logger.info(f"Event {event.event_id} saved successfully")
+                await self.events_rollup.increment(
+                    {
+                        "status": event.status.value,
+                        "event_type": event.event_type,
+                        "event_source": event.event_source.value,
+                        "event_category": event.event_category.value,
+                    },
+                    at=event.timestamp,
+                )
                 return event
 
             # Try to get event if insert returned None/0
@@ -371,6 +406,12 @@ class EventRepository:
 
     async def get_statistics(self, user_id: Optional[str] = None) -> EventStatistics:
         """Get event statistics"""
+        if not user_id:
+            try:
+                return await self._get_statistics_from_rollup()
+            except Exception as e:
+                logger.warning(f"Event rollup unavailable, scanning events: {e}")
+
         try:
             conditions = []
             params = []
@@ -441,6 +482,29 @@ class EventRepository:
                 events_by_category={},
             )
 
+    async def _get_statistics_from_rollup(self) -> EventStatistics:
+        """Platform-wide statistics from the events counter rollup"""
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        overall = await self.events_rollup.snapshot()
+        month = await self.events_rollup.snapshot(since=today - timedelta(days=30))
+        week = await self.events_rollup.snapshot(since=today - timedelta(days=7))
+        day = await self.events_rollup.snapshot(since=today)
+
+        return EventStatistics(
+            total_events=overall.total,
+            pending_events=overall.count("status", "pending"),
+            processed_events=overall.count("status", "processed"),
+            failed_events=overall.count("status", "failed"),
+            events_today=day.total,
+            events_this_week=week.total,
+            events_this_month=month.total,
+            events_by_type=overall.by("event_type"),
+            events_by_source=overall.by("event_source"),
+            events_by_category=overall.by("event_category"),
+        )
+
     async def save_processing_result(self, result: EventProcessingResult):
         """Save processing result"""
         try:
@@ -46,8 +46,10 @@ from core.config_manager import ConfigManager
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
+from core.stat_rollups import RollupReconciler
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 
@@ -70,6 +72,7 @@ nats_client: Optional[NATS] = None
 js: Optional[JetStreamContext] = None
 event_bus = None  # Centralized NATS event bus
 consul_registry: Optional[ConsulRegistry] = None
+stats_reconciler: Optional[RollupReconciler] = None
 
 # Graceful shutdown manager
 shutdown_manager = GracefulShutdown("event_service")
@@ -83,6 +86,7 @@ async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     shutdown_manager.install_signal_handlers()
     global event_service, event_repository, nats_client, js, event_bus, consul_registry
+    global stats_reconciler
 
     try:
         # Initialize centralized NATS event bus first
@@ -111,6 +115,10 @@ async def lifespan(app: FastAPI):
         batch_size = int(config.get("batch_size", 100))
         asyncio.create_task(process_pending_events(batch_size))
 
+        # Keep the statistics counter rollups reconciled
+        stats_reconciler = RollupReconciler(event_repository.stat_rollups)
+        stats_reconciler.start()
+
         # Consul 服务注册
         if config.consul_enabled:
             try:
@@ -170,10 +178,13 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.error(f"❌ Failed to deregister from Consul: {e}")
 
+        if stats_reconciler:
+            await stats_reconciler.stop()
         if nats_client:
             await nats_client.close()
         if event_repository:
             await event_repository.close()
+    close_discovery_caches()
 
 
 # ==================== FastAPI应用 ====================
@@ -14,6 +14,7 @@ from core.config_manager import ConfigManager
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from .routes_registry import SERVICE_METADATA, get_routes_for_consul
 from .providers.mock import MockFulfillmentProvider
@@ -131,6 +132,7 @@ async def lifespan(app: FastAPI):
             logger.error(f"Error closing event bus: {e}")
 
     logger.info("Fulfillment Service shutting down...")
+    close_discovery_caches()
 
 
 app = FastAPI(title="fulfillment_service", version="0.1.0", lifespan=lifespan)
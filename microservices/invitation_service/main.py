@@ -16,6 +16,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 from .invitation_service import InvitationService
 from .invitation_repository import InvitationRepository
@@ -195,6 +196,7 @@ async def lifespan(app: FastAPI):
                 logger.error(f"Error closing event bus: {e}")
 
         logger.info("Invitation microservice shutdown completed")
+    close_discovery_caches()
 
 
 # 创建FastAPI应用
@@ -21,6 +21,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -127,6 +128,7 @@ async def lifespan(app: FastAPI):
             logger.info("✅ Service deregistered from Consul")
         except Exception as e:
             logger.error(f"❌ Failed to deregister from Consul: {e}")
+    close_discovery_caches()
 
 
 # Create FastAPI app
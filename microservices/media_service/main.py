@@ -22,6 +22,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .models import (
@@ -35,6 +36,8 @@ from .models import (
     PhotoMetadataUpdateRequest,
     PhotoMetadataResponse,
     PhotoCacheResponse,
+    FramePrefetchResponse,
+    FrameCacheStatsResponse,
     CacheStatus,
     MediaServiceStatus,
 )
@@ -47,6 +50,7 @@ from .media_service import (
 )
 from .routes_registry import get_routes_for_consul, SERVICE_METADATA
 from .factory import create_media_service
+from .prefetch_planner import FramePrefetcher
 
 # Initialize configuration
 config_manager = ConfigManager("media_service")
@@ -58,6 +62,7 @@ logger = app_logger
 
 # Global service instance
 media_service = None
+frame_prefetcher: Optional[FramePrefetcher] = None
 event_bus = None  # NATS event bus
 consul_registry: Optional[ConsulRegistry] = None
 shutdown_manager = GracefulShutdown("media_service")
@@ -66,7 +71,7 @@ shutdown_manager = GracefulShutdown("media_service")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
-    global media_service, event_bus, consul_registry
+    global media_service, event_bus, consul_registry, frame_prefetcher
     shutdown_manager.install_signal_handlers()
 
     logger.info("Starting Media Service...")
@@ -143,6 +148,12 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("✅ Database connection verified")
 
+    # Plan frame caches ahead of rotation time
+    if os.getenv("MEDIA_PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes"):
+        frame_prefetcher = FramePrefetcher.from_env(media_service)
+        frame_prefetcher.start()
+        logger.info("✅ Frame photo prefetcher started")
+
     # Consul 服务注册
     if service_config.consul_enabled:
         try:
@@ -182,6 +193,9 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
 
+    if frame_prefetcher:
+        await frame_prefetcher.stop()
+
     if event_bus:
         try:
             await event_bus.close()
@@ -198,6 +212,7 @@ async def lifespan(app: FastAPI):
             logger.error(f"❌ Failed to deregister from Consul: {e}")
 
     logger.info("Media Service stopped")
+    close_discovery_caches()
 
 
 # Initialize FastAPI app
@@ -883,6 +898,40 @@ async def list_frame_cache(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post(
+    "/api/v1/media/frames/{frame_id}/cache/prefetch",
+    response_model=FramePrefetchResponse,
+)
+async def prefetch_frame_cache(
+    frame_id: str,
+    user_id: str = Depends(get_user_id),
+    lookahead: Optional[int] = Query(None, ge=1, le=500),
+    service: MediaService = Depends(get_media_service),
+):
+    """
+    Cache the next photos a smart frame will display (from its rotation schedules)
+    """
+    try:
+        return await service.prefetch_frame(frame_id, user_id, lookahead)
+    except MediaServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get(
+    "/api/v1/media/frames/{frame_id}/cache/stats",
+    response_model=FrameCacheStatsResponse,
+)
+async def get_frame_cache_stats(
+    frame_id: str,
+    user_id: str = Depends(get_user_id),
+    service: MediaService = Depends(get_media_service),
+):
+    """
+    Cache usage and hit rate for a smart frame
+    """
+    return await service.get_frame_cache_stats(frame_id, user_id)
+
+
 @app.patch("/api/v1/cache/{cache_id}/status", response_model=PhotoCacheResponse)
 async def update_cache_status(
     cache_id: str,
@@ -895,6 +944,10 @@ async def update_cache_status(
     """
     try:
         return await service.update_cache_status(cache_id, status, error_message)
+    except MediaNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except MediaValidationError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except MediaServiceError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
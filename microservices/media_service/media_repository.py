@@ -5,11 +5,12 @@ Handles database operations for photo versions, metadata, playlists, schedules,
 Uses PostgresClient with gRPC for PostgreSQL access
 """
 
+import json
 import logging
 import os
 import sys
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -83,6 +84,7 @@ class MediaRepository:
         self.playlists_table = "playlists"
         self.schedules_table = "rotation_schedules"
         self.cache_table = "photo_cache"
+        self.prefetch_passes_table = "prefetch_passes"
 
     def _convert_protobuf_to_native(self, value: Any) -> Any:
         """Convert Protobuf types (Struct, ListValue) to native Python types
@@ -197,6 +199,30 @@ class MediaRepository:
             logger.error(f"Error listing photo versions: {e}")
             return []
 
+    async def get_current_versions(
+        self, photo_ids: List[str], user_id: str
+    ) -> Dict[str, str]:
+        """Current version_id of each photo that has one (photo_id -> version_id)"""
+        if not photo_ids:
+            return {}
+        try:
+            query = f"""
+                SELECT DISTINCT ON (photo_id) photo_id, version_id
+                FROM {self.schema}.{self.versions_table}
+                WHERE photo_id = ANY($1::text[]) AND user_id = $2 AND is_current = true
+                ORDER BY photo_id, version_number DESC
+            """
+            params = [list(photo_ids), user_id]
+
+            async with self.db:
+                results = await self.db.query(query, params=params)
+
+            return {row["photo_id"]: row["version_id"] for row in results or []}
+
+        except Exception as e:
+            logger.error(f"Error getting current photo versions: {e}")
+            raise
+
     async def delete_photo_version(self, version_id: str, user_id: str) -> bool:
         """Delete a photo version"""
         try:
@@ -493,6 +519,35 @@ class MediaRepository:
             logger.error(f"Error listing playlists: {e}")
             return []
 
+    async def get_playlists_by_ids(
+        self, playlist_ids: List[str]
+    ) -> Dict[str, Playlist]:
+        """Get many playlists in one query, keyed by playlist_id"""
+        if not playlist_ids:
+            return {}
+        try:
+            query = f"""
+                SELECT * FROM {self.schema}.{self.playlists_table}
+                WHERE playlist_id = ANY($1::text[])
+            """
+            params = [list(playlist_ids)]
+
+            async with self.db:
+                results = await self.db.query(query, params=params)
+
+            playlists = {}
+            for row in results or []:
+                for field in ["smart_criteria", "photo_ids"]:
+                    if field in row:
+                        row[field] = self._convert_protobuf_to_native(row[field])
+                playlist = Playlist.model_validate(row)
+                playlists[playlist.playlist_id] = playlist
+            return playlists
+
+        except Exception as e:
+            logger.error(f"Error getting playlists by ids: {e}")
+            raise
+
     async def delete_playlist(self, playlist_id: str, user_id: str) -> bool:
         """Delete a playlist"""
         try:
@@ -620,6 +675,74 @@ class MediaRepository:
             logger.error(f"Error listing frame schedules: {e}")
             return []
 
+    async def list_active_schedules(
+        self,
+        after: Optional[Tuple[str, str, str]] = None,
+        limit: int = 1000,
+    ) -> List[RotationSchedule]:
+        """List one page of active schedules of all frames (for cache prefetch planning)
+
+        Pages are ordered by (frame_id, user_id, schedule_id); pass the last
+        row's key as ``after`` to get the next page.
+        """
+        try:
+            params: List[Any] = []
+            keyset = ""
+            if after is not None:
+                params.extend(after)
+                keyset = "AND (frame_id, user_id, schedule_id) > ($1, $2, $3)"
+            query = f"""
+                SELECT
+                    schedule_id, user_id, frame_id, playlist_id, schedule_type,
+                    start_time::text as start_time,
+                    end_time::text as end_time,
+                    days_of_week, rotation_interval, shuffle, is_active,
+                    created_at, updated_at
+                FROM {self.schema}.{self.schedules_table}
+                WHERE is_active = true AND playlist_id IS NOT NULL {keyset}
+                ORDER BY frame_id, user_id, schedule_id
+                LIMIT {int(limit)}
+            """
+
+            async with self.db:
+                results = await self.db.query(query, params=params)
+
+            return [RotationSchedule.model_validate(row) for row in results or []]
+
+        except Exception as e:
+            logger.error(f"Error listing active schedules: {e}")
+            raise
+
+    async def claim_prefetch_pass(self, min_interval: float) -> bool:
+        """Claim the cluster-wide prefetch pass
+
+        Only one replica gets True per ``min_interval`` seconds: the claim
+        takes a try-advisory lock and then moves the pass's start time
+        forward only if the previous pass started long enough ago.
+        """
+        try:
+            query = f"""
+                WITH lock AS (
+                    SELECT pg_try_advisory_xact_lock(hashtext($1)) AS held
+                )
+                INSERT INTO {self.schema}.{self.prefetch_passes_table} (pass_name, started_at)
+                SELECT $1, NOW() FROM lock WHERE held
+                ON CONFLICT (pass_name) DO UPDATE SET started_at = NOW()
+                WHERE {self.prefetch_passes_table}.started_at
+                      <= NOW() - make_interval(secs => $2)
+                RETURNING pass_name
+            """
+            params = [f"{self.schema}.frame_prefetch", float(min_interval)]
+
+            async with self.db:
+                results = await self.db.query(query, params=params)
+
+            return bool(results)
+
+        except Exception as e:
+            logger.error(f"Error claiming prefetch pass: {e}")
+            raise
+
     async def update_schedule_status(
         self, schedule_id: str, user_id: str, is_active: bool
     ) -> Optional[RotationSchedule]:
@@ -664,7 +787,12 @@ class MediaRepository:
     # ==================== Photo Cache Operations ====================
 
     async def create_photo_cache(self, cache_data: PhotoCache) -> Optional[PhotoCache]:
-        """Create a new photo cache entry"""
+        """Create a new photo cache entry
+
+        If the photo already has a pending/downloading/cached entry on the
+        frame (e.g. the prefetcher got there first), that entry is returned
+        instead; callers can tell by its cache_id.
+        """
         try:
             now = datetime.now(timezone.utc)
             cache_status = (
@@ -680,6 +808,9 @@ class MediaRepository:
                     cache_format, cache_quality, hit_count, last_accessed_at,
                     error_message, retry_count, created_at, updated_at, expires_at
                 ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18)
+                ON CONFLICT (frame_id, user_id, photo_id)
+                    WHERE cache_status IN ('pending', 'downloading', 'cached')
+                DO NOTHING
             """
 
             params = [
@@ -708,12 +839,29 @@ class MediaRepository:
 
             if count is not None and count > 0:
                 return await self.get_photo_cache(cache_data.cache_id)
-            return None
+            return await self._get_live_photo_cache(
+                cache_data.frame_id, cache_data.user_id, cache_data.photo_id
+            )
 
         except Exception as e:
             logger.error(f"Error creating photo cache: {e}")
             raise
 
+    async def _get_live_photo_cache(
+        self, frame_id: str, user_id: str, photo_id: str
+    ) -> Optional[PhotoCache]:
+        """The pending/downloading/cached entry of a frame photo, if any"""
+        query = f"""
+            SELECT * FROM {self.schema}.{self.cache_table}
+            WHERE frame_id = $1 AND user_id = $2 AND photo_id = $3
+              AND cache_status IN ('pending', 'downloading', 'cached')
+        """
+        async with self.db:
+            result = await self.db.query_row(
+                query, params=[frame_id, user_id, photo_id]
+            )
+        return PhotoCache.model_validate(result) if result else None
+
     async def get_photo_cache(self, cache_id: str) -> Optional[PhotoCache]:
         """Get photo cache by ID"""
         try:
@@ -796,14 +944,30 @@ class MediaRepository:
     async def update_cache_status(
         self, cache_id: str, status: CacheStatus, error_message: Optional[str] = None
     ) -> Optional[PhotoCache]:
-        """Update cache status"""
+        """Update cache status
+
+        Returns None if the entry does not exist, or if moving it to
+        pending/downloading/cached would give its frame photo a second live
+        entry (the partial unique index allows only one).
+        """
         try:
             query = f"""
-                UPDATE {self.schema}.{self.cache_table}
+                UPDATE {self.schema}.{self.cache_table} AS c
                 SET cache_status = $1,
                     error_message = $2,
                     updated_at = $3
-                WHERE cache_id = $4
+                WHERE c.cache_id = $4
+                  AND (
+                      $1 NOT IN ('pending', 'downloading', 'cached')
+                      OR c.cache_status IN ('pending', 'downloading', 'cached')
+                      OR NOT EXISTS (
+                          SELECT 1 FROM {self.schema}.{self.cache_table} o
+                          WHERE o.frame_id = c.frame_id
+                            AND o.user_id = c.user_id
+                            AND o.photo_id = c.photo_id
+                            AND o.cache_status IN ('pending', 'downloading', 'cached')
+                      )
+                  )
             """
             params = [
                 status.value if hasattr(status, "value") else status,
@@ -820,9 +984,85 @@ class MediaRepository:
             return None
 
         except Exception as e:
+            # A concurrent transition won the live slot first
+            if "idx_photo_cache_live_photo" in str(e):
+                return None
             logger.error(f"Error updating cache status: {e}")
             raise
 
+    async def bulk_create_photo_cache(self, entries: List[PhotoCache]) -> List[str]:
+        """Create many cache entries in one statement
+
+        A photo that already has a pending/downloading/cached entry on the
+        frame is skipped. Returns the cache_ids that were inserted.
+        """
+        if not entries:
+            return []
+        try:
+            rows = [
+                {
+                    "cache_id": e.cache_id,
+                    "user_id": e.user_id,
+                    "frame_id": e.frame_id,
+                    "photo_id": e.photo_id,
+                    "version_id": e.version_id,
+                    "cache_status": e.cache_status.value
+                    if hasattr(e.cache_status, "value")
+                    else e.cache_status,
+                    "cache_quality": e.cache_quality,
+                    "expires_at": e.expires_at.isoformat() if e.expires_at else None,
+                }
+                for e in entries
+            ]
+            query = f"""
+                INSERT INTO {self.schema}.{self.cache_table} (
+                    cache_id, user_id, frame_id, photo_id, version_id,
+                    cache_status, cache_quality, hit_count, retry_count,
+                    created_at, updated_at, expires_at
+                )
+                SELECT v.cache_id, v.user_id, v.frame_id, v.photo_id, v.version_id,
+                       v.cache_status, v.cache_quality, 0, 0, $2, $2, v.expires_at
+                FROM jsonb_to_recordset($1::jsonb) AS v(
+                    cache_id text, user_id text, frame_id text, photo_id text,
+                    version_id text, cache_status text, cache_quality text,
+                    expires_at timestamptz
+                )
+                ON CONFLICT (frame_id, user_id, photo_id)
+                    WHERE cache_status IN ('pending', 'downloading', 'cached')
+                DO NOTHING
+                RETURNING cache_id
+            """
+            params = [json.dumps(rows), datetime.now(timezone.utc)]
+
+            async with self.db:
+                results = await self.db.query(query, params=params)
+
+            return [row["cache_id"] for row in results or []]
+
+        except Exception as e:
+            logger.error(f"Error bulk creating photo cache: {e}")
+            raise
+
+    async def delete_photo_caches(self, cache_ids: List[str]) -> int:
+        """Delete many cache entries in one statement"""
+        if not cache_ids:
+            return 0
+        try:
+            query = f"""
+                DELETE FROM {self.schema}.{self.cache_table}
+                WHERE cache_id = ANY($1::text[])
+            """
+            params = [list(cache_ids)]
+
+            async with self.db:
+                count = await self.db.execute(query, params=params)
+
+            return count if count is not None else 0
+
+        except Exception as e:
+            logger.error(f"Error deleting photo caches: {e}")
+            raise
+
     async def increment_cache_hit(self, cache_id: str) -> bool:
         """Increment cache hit count"""
         try:
@@ -5,7 +5,9 @@ Handles photo versions, metadata, playlists, rotation schedules, and photo cachi
 for smart frame ecosystem.
 """
 
+import asyncio
 import logging
+import os
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
@@ -15,6 +17,8 @@ from core.nats_client import Event
 from .protocols import MediaRepositoryProtocol
 from .models import (
     CacheStatus,
+    FrameCacheStatsResponse,
+    FramePrefetchResponse,
     PhotoCache,
     PhotoCacheResponse,
     PhotoMetadata,
@@ -28,11 +32,13 @@ from .models import (
     PlaylistResponse,
     PlaylistType,
     PlaylistUpdateRequest,
+    PrefetchedPhoto,
     RotationSchedule,
     RotationScheduleCreateRequest,
     RotationScheduleResponse,
     ScheduleType,
 )
+from .prefetch_planner import FRAME_CACHE_REQUESTS, plan_frame, select_evictions
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +95,8 @@ class MediaService:
         event_bus=None,
         storage_client=None,
         device_client=None,
+        prefetch_lookahead: Optional[int] = None,
+        frame_cache_capacity: Optional[int] = None,
     ):
         """
         Initialize MediaService with injected dependencies.
@@ -98,6 +106,8 @@ class MediaService:
             event_bus: Event bus for publishing events
             storage_client: Storage service client (inject mock for testing)
             device_client: Device service client (inject mock for testing)
+            prefetch_lookahead: Photos per frame cached ahead of display
+            frame_cache_capacity: Cache entries kept per frame before eviction
         """
         # Use injected repository or create default
         if repository is not None:
@@ -109,6 +119,12 @@ class MediaService:
             self.repository = MediaRepository()
 
         self.event_bus = event_bus
+        self.prefetch_lookahead = prefetch_lookahead or int(
+            os.getenv("MEDIA_PREFETCH_LOOKAHEAD", "20")
+        )
+        self.frame_cache_capacity = frame_cache_capacity or int(
+            os.getenv("MEDIA_FRAME_CACHE_CAPACITY", "200")
+        )
 
         # Use injected clients or create defaults
         if storage_client is not None:
@@ -784,9 +800,18 @@ class MediaService:
 
             if existing and existing.cache_status == CacheStatus.CACHED:
                 # Already cached, increment hit count
+                FRAME_CACHE_REQUESTS.labels(result="hit").inc()
                 await self.repository.increment_cache_hit(existing.cache_id)
                 return self._cache_to_response(existing)
 
+            FRAME_CACHE_REQUESTS.labels(result="miss").inc()
+            if existing and existing.cache_status in (
+                CacheStatus.PENDING,
+                CacheStatus.DOWNLOADING,
+            ):
+                # Prefetch (or an earlier request) is already fetching it
+                return self._cache_to_response(existing)
+
             # Generate cache_id
             cache_id = f"cache_{uuid.uuid4().hex[:16]}"
 
@@ -808,6 +833,9 @@ class MediaService:
 
             if not created:
                 raise MediaServiceError("Failed to create cache entry")
+            if created.cache_id != cache_id:
+                # Lost the race to the prefetcher (or another request)
+                return self._cache_to_response(created)
 
             # Publish photo.cached event
             if self.event_bus:
@@ -845,10 +873,18 @@ class MediaService:
             )
 
             if not updated:
-                raise MediaServiceError("Failed to update cache status")
+                entry = await self.repository.get_photo_cache(cache_id)
+                if not entry:
+                    raise MediaNotFoundError(f"Cache entry {cache_id} not found")
+                raise MediaValidationError(
+                    f"Photo {entry.photo_id} already has a live cache entry "
+                    f"on frame {entry.frame_id}"
+                )
 
             return self._cache_to_response(updated)
 
+        except (MediaNotFoundError, MediaValidationError):
+            raise
         except Exception as e:
             logger.error(f"Error updating cache status: {e}")
             raise MediaServiceError(f"Failed to update cache: {str(e)}")
@@ -862,6 +898,219 @@ class MediaService:
         )
         return [self._cache_to_response(c) for c in cache_entries]
 
+    async def prefetch_frame(
+        self,
+        frame_id: str,
+        user_id: str,
+        lookahead: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> FramePrefetchResponse:
+        """
+        Cache the photos a frame will display next, ahead of display time
+
+        Plans the next ``lookahead`` photos from the frame's active rotation
+        schedules, creates the missing cache entries (current version of
+        each photo) in one insert, and evicts entries beyond the frame's
+        capacity that are not about to be shown. One
+        ``media.frame.prefetch_planned`` event lists the new entries so the
+        frame can download them before they are due.
+        """
+        try:
+            now = now or datetime.now(timezone.utc)
+            lookahead = lookahead or self.prefetch_lookahead
+
+            schedules = [
+                s
+                for s in await self.repository.list_frame_schedules(frame_id, user_id)
+                if s.is_active and s.playlist_id
+            ]
+            return await self._prefetch_schedules(
+                frame_id, user_id, schedules, lookahead, now
+            )
+
+        except Exception as e:
+            logger.error(f"Error prefetching photos for frame {frame_id}: {e}")
+            raise MediaServiceError(f"Failed to prefetch photos: {str(e)}")
+
+    async def prefetch_all_frames(
+        self,
+        max_concurrent_frames: int = 8,
+        now: Optional[datetime] = None,
+        min_interval: Optional[float] = None,
+        page_size: int = 1000,
+    ) -> int:
+        """Prefetch every frame with an active schedule; returns frames planned
+
+        With ``min_interval`` the pass first claims the cluster-wide prefetch
+        slot and does nothing (returns 0) when another replica ran a pass
+        less than ``min_interval`` seconds ago. Schedules are read page by
+        page; a frame is planned once all of its schedules have been read.
+        """
+        now = now or datetime.now(timezone.utc)
+        if min_interval is not None and not await self.repository.claim_prefetch_pass(
+            min_interval
+        ):
+            logger.debug("Prefetch pass skipped: another replica ran it recently")
+            return 0
+
+        limit = asyncio.Semaphore(max_concurrent_frames)
+
+        async def plan(key, frame_schedules) -> bool:
+            async with limit:
+                try:
+                    await self._prefetch_schedules(
+                        key[0], key[1], frame_schedules, self.prefetch_lookahead, now
+                    )
+                    return True
+                except Exception as e:
+                    logger.warning(f"Prefetch failed for frame {key[0]}: {e}")
+                    return False
+
+        planned = total = 0
+        pending: Dict[tuple, List[RotationSchedule]] = {}
+        after: Optional[tuple] = None
+        while True:
+            page = await self.repository.list_active_schedules(
+                after=after, limit=page_size
+            )
+            for schedule in page:
+                pending.setdefault((schedule.frame_id, schedule.user_id), []).append(
+                    schedule
+                )
+            last_page = len(page) < page_size
+            # The last frame of a full page may continue on the next one
+            held = None
+            if not last_page:
+                tail = page[-1]
+                after = (tail.frame_id, tail.user_id, tail.schedule_id)
+                held_key = (tail.frame_id, tail.user_id)
+                held = (held_key, pending.pop(held_key))
+
+            results = await asyncio.gather(
+                *(
+                    plan(key, frame_schedules)
+                    for key, frame_schedules in pending.items()
+                )
+            )
+            planned += sum(results)
+            total += len(pending)
+            pending = dict([held]) if held else {}
+            if last_page:
+                break
+
+        logger.info(f"Prefetch pass planned {planned}/{total} frames")
+        return planned
+
+    async def _prefetch_schedules(
+        self,
+        frame_id: str,
+        user_id: str,
+        schedules: List[RotationSchedule],
+        lookahead: int,
+        now: datetime,
+    ) -> FramePrefetchResponse:
+        playlists = await self.repository.get_playlists_by_ids(
+            list({s.playlist_id for s in schedules})
+        )
+        planned = plan_frame(schedules, playlists, now, lookahead)
+        planned_ids = [p.photo_id for p in planned]
+
+        entries = await self.repository.list_frame_cache(frame_id, user_id)
+        live = {
+            e.photo_id
+            for e in entries
+            if e.cache_status
+            in (CacheStatus.PENDING, CacheStatus.DOWNLOADING, CacheStatus.CACHED)
+        }
+        missing = [p for p in planned if p.photo_id not in live]
+        versions = await self.repository.get_current_versions(
+            [p.photo_id for p in missing], user_id
+        )
+
+        new_entries = [
+            PhotoCache(
+                cache_id=f"cache_{uuid.uuid4().hex[:16]}",
+                user_id=user_id,
+                frame_id=frame_id,
+                photo_id=p.photo_id,
+                version_id=versions.get(p.photo_id),
+                cache_status=CacheStatus.PENDING,
+                expires_at=p.display_at + timedelta(days=7),
+            )
+            for p in missing
+        ]
+        created_ids = set(await self.repository.bulk_create_photo_cache(new_entries))
+        created = [e for e in new_entries if e.cache_id in created_ids]
+
+        # Capacity counts the entries just created
+        evicted = select_evictions(
+            entries, planned_ids, self.frame_cache_capacity - len(created), now
+        )
+        if evicted:
+            await self.repository.delete_photo_caches([e.cache_id for e in evicted])
+
+        display_at = {p.photo_id: p.display_at for p in planned}
+        if created and self.event_bus:
+            try:
+                event = Event(
+                    event_type="media.frame.prefetch_planned",
+                    source="media_service",
+                    data={
+                        "frame_id": frame_id,
+                        "user_id": user_id,
+                        "entries": [
+                            {
+                                "cache_id": e.cache_id,
+                                "photo_id": e.photo_id,
+                                "version_id": e.version_id,
+                                "display_at": display_at[e.photo_id].isoformat(),
+                            }
+                            for e in created
+                        ],
+                        "evicted_cache_ids": [e.cache_id for e in evicted],
+                        "timestamp": datetime.utcnow().isoformat(),
+                    },
+                )
+                await self.event_bus.publish_event(event)
+            except Exception as e:
+                logger.error(f"Failed to publish frame.prefetch_planned event: {e}")
+
+        cached_versions = {e.photo_id: e.version_id for e in entries}
+        cached_versions.update(versions)
+        return FramePrefetchResponse(
+            frame_id=frame_id,
+            planned=[
+                PrefetchedPhoto(
+                    photo_id=p.photo_id,
+                    version_id=cached_versions.get(p.photo_id),
+                    display_at=p.display_at,
+                )
+                for p in planned
+            ],
+            created=len(created),
+            evicted=len(evicted),
+        )
+
+    async def get_frame_cache_stats(
+        self, frame_id: str, user_id: str
+    ) -> FrameCacheStatsResponse:
+        """Cache usage and hit rate of a frame"""
+        entries = await self.repository.list_frame_cache(frame_id, user_id)
+        by_status: Dict[CacheStatus, int] = {}
+        for entry in entries:
+            by_status[entry.cache_status] = by_status.get(entry.cache_status, 0) + 1
+        used = sum(1 for e in entries if e.hit_count > 0)
+        return FrameCacheStatsResponse(
+            frame_id=frame_id,
+            total_entries=len(entries),
+            cached=by_status.get(CacheStatus.CACHED, 0),
+            pending=by_status.get(CacheStatus.PENDING, 0)
+            + by_status.get(CacheStatus.DOWNLOADING, 0),
+            failed=by_status.get(CacheStatus.FAILED, 0),
+            total_hits=sum(e.hit_count for e in entries),
+            hit_rate=round(used / len(entries), 4) if entries else 0.0,
+        )
+
     # ==================== Validation Methods ====================
 
     def _validate_photo_version_request(self, request: PhotoVersionCreateRequest):
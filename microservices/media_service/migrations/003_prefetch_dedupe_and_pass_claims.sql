@@ -0,0 +1,32 @@
+-- Media Service Migration: Frame prefetch dedupe and pass claims
+-- Version: 003
+-- Date: 2026-10-19
+-- Description: bulk_create_photo_cache relied on NOT EXISTS, which two
+--              replicas planning the same frame could both pass. Enforce
+--              one live (pending/downloading/cached) entry per frame photo
+--              with a partial unique index, and add the row the periodic
+--              prefetch pass claims so only one replica plans at a time.
+
+-- Retire duplicates that already exist, keeping the newest live entry
+UPDATE media.photo_cache c
+SET cache_status = 'expired'
+WHERE c.cache_status IN ('pending', 'downloading', 'cached')
+  AND EXISTS (
+      SELECT 1 FROM media.photo_cache n
+      WHERE n.frame_id = c.frame_id
+        AND n.user_id = c.user_id
+        AND n.photo_id = c.photo_id
+        AND n.cache_status IN ('pending', 'downloading', 'cached')
+        AND n.id > c.id
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_photo_cache_live_photo
+    ON media.photo_cache(frame_id, user_id, photo_id)
+    WHERE cache_status IN ('pending', 'downloading', 'cached');
+
+CREATE TABLE IF NOT EXISTS media.prefetch_passes (
+    pass_name VARCHAR(255) PRIMARY KEY,
+    started_at TIMESTAMPTZ NOT NULL
+);
+
+COMMENT ON TABLE media.prefetch_passes IS 'Start time of the last cluster-wide frame prefetch pass';
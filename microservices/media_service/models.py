@@ -379,6 +379,32 @@ class PhotoCacheResponse(BaseModel):
         from_attributes = True
 
 
+class PrefetchedPhoto(BaseModel):
+    """A photo planned for display on a frame"""
+    photo_id: str
+    version_id: Optional[str] = None
+    display_at: datetime
+
+
+class FramePrefetchResponse(BaseModel):
+    """Result of planning a frame's cache"""
+    frame_id: str
+    planned: List[PrefetchedPhoto] = Field(default_factory=list)
+    created: int = 0
+    evicted: int = 0
+
+
+class FrameCacheStatsResponse(BaseModel):
+    """Cache usage of a frame"""
+    frame_id: str
+    total_entries: int
+    cached: int
+    pending: int
+    failed: int
+    total_hits: int
+    hit_rate: float = Field(..., description="Share of entries displayed at least once")
+
+
 # ==================== Service Status Models ====================
 
 class MediaServiceStatus(BaseModel):
@@ -413,6 +439,7 @@ __all__ = [
     # Response Models
     'PhotoVersionResponse', 'PhotoMetadataResponse', 'PlaylistResponse',
     'RotationScheduleResponse', 'PhotoCacheResponse',
+    'PrefetchedPhoto', 'FramePrefetchResponse', 'FrameCacheStatsResponse',
     # Service Models
     'MediaServiceStatus',
     # Query Models
@@ -0,0 +1,269 @@
+"""
+Frame Photo Prefetch Planner
+
+Frames used to fetch each photo on demand when their rotation schedule
+advanced, so every frame on an hourly rotation hit storage at the same
+moment. The planner predicts what each frame will show next from its
+active rotation schedules and playlists, so the cache entries (with the
+rendition to download) exist well before display time:
+
+- ``upcoming_photos`` models a schedule as fixed slots of
+  ``rotation_interval`` seconds counted from the schedule's ``created_at``;
+  slot ``n`` shows photo ``n mod len(playlist)`` (a deterministic per-cycle
+  shuffle when ``shuffle`` is set, and nothing past the end when ``loop``
+  is off). Time-based schedules only fill slots inside their daily
+  ``start_time``-``end_time`` window on ``days_of_week`` (UTC,
+  Monday = 0). Event-based schedules have no predictable timing and are
+  not prefetched.
+- ``plan_frame`` merges a frame's schedules into its next N photos
+- ``select_evictions`` keeps a frame's cache within capacity: entries
+  that are planned are never evicted; failed / expired entries go first,
+  then the least recently used
+- ``FramePrefetcher`` re-plans every frame with an active schedule on an
+  interval (``MEDIA_PREFETCH_*`` environment variables); each replica runs
+  one, but only the replica that claims the pass plans it
+
+Usage:
+    prefetcher = FramePrefetcher.from_env(media_service)
+    prefetcher.start()
+    ...
+    await prefetcher.stop()
+"""
+
+import asyncio
+import logging
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.metrics import create_counter
+
+from .models import CacheStatus, Playlist, PhotoCache, RotationSchedule, ScheduleType
+
+logger = logging.getLogger(__name__)
+
+FRAME_CACHE_REQUESTS = create_counter(
+    "media_frame_cache_requests_total",
+    "Frame photo requests by cache outcome",
+    ["result"],
+)
+
+# A time-based schedule may be idle for days; stop looking after a week
+PLAN_HORIZON = timedelta(days=8)
+
+
+@dataclass(frozen=True)
+class PlannedPhoto:
+    """A photo a frame is expected to display"""
+
+    photo_id: str
+    display_at: datetime
+    schedule_id: str
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _parse_time(value: Optional[str]) -> Optional[time]:
+    """'HH:MM' or 'HH:MM:SS' → time"""
+    if not value:
+        return None
+    parts = [int(p) for p in value.split(":")[:3]]
+    return time(*parts)
+
+
+def _cycle_order(
+    schedule: RotationSchedule, playlist: Playlist, cycle: int
+) -> List[str]:
+    """Photo order for one pass through the playlist"""
+    order = list(playlist.photo_ids)
+    if schedule.shuffle or playlist.shuffle:
+        random.Random(f"{schedule.schedule_id}:{cycle}").shuffle(order)
+    return order
+
+
+def _window_start(schedule: RotationSchedule, moment: datetime) -> Optional[datetime]:
+    """First instant at or after ``moment`` inside the schedule's active window"""
+    if schedule.schedule_type != ScheduleType.TIME_BASED:
+        return moment
+    start, end = _parse_time(schedule.start_time), _parse_time(schedule.end_time)
+    if start is None or end is None:
+        return moment
+    days = set(schedule.days_of_week or [])
+    # Start from the previous day: its overnight window may still be open
+    for offset in range(-1, PLAN_HORIZON.days):
+        day = (moment + timedelta(days=offset)).date()
+        if days and day.weekday() not in days:
+            continue
+        window_start = datetime.combine(day, start, tzinfo=timezone.utc)
+        window_end = datetime.combine(day, end, tzinfo=timezone.utc)
+        if window_end <= window_start:
+            # Overnight window (e.g. 22:00-06:00)
+            window_end += timedelta(days=1)
+        if moment < window_end:
+            return max(moment, window_start)
+    return None
+
+
+def upcoming_photos(
+    schedule: RotationSchedule,
+    playlist: Playlist,
+    now: datetime,
+    count: int,
+) -> List[PlannedPhoto]:
+    """The next ``count`` photos ``schedule`` will show after ``now``"""
+    if (
+        not schedule.is_active
+        or schedule.schedule_type == ScheduleType.EVENT_BASED
+        or not playlist.photo_ids
+        or count <= 0
+    ):
+        return []
+
+    interval = timedelta(seconds=max(schedule.rotation_interval, 1))
+    anchor = _utc(schedule.created_at) or now
+    size = len(playlist.photo_ids)
+    horizon = now + PLAN_HORIZON
+    orders: Dict[int, List[str]] = {}
+
+    planned: List[PlannedPhoto] = []
+    moment = now
+    while len(planned) < count and moment < horizon:
+        moment = _window_start(schedule, moment)
+        if moment is None:
+            break
+        slot = max((moment - anchor) // interval, 0)
+        cycle, position = divmod(slot, size)
+        if cycle > 0 and not playlist.loop:
+            break
+        if cycle not in orders:
+            orders = {cycle: _cycle_order(schedule, playlist, cycle)}
+        display_at = max(anchor + slot * interval, moment)
+        planned.append(
+            PlannedPhoto(orders[cycle][position], display_at, schedule.schedule_id)
+        )
+        moment = anchor + (slot + 1) * interval
+    return planned
+
+
+def plan_frame(
+    schedules: Iterable[RotationSchedule],
+    playlists: Dict[str, Playlist],
+    now: datetime,
+    lookahead: int,
+) -> List[PlannedPhoto]:
+    """Next ``lookahead`` distinct photos across a frame's schedules"""
+    candidates: List[PlannedPhoto] = []
+    for schedule in schedules:
+        playlist = playlists.get(schedule.playlist_id or "")
+        if playlist is not None:
+            candidates.extend(upcoming_photos(schedule, playlist, now, lookahead))
+
+    planned: Dict[str, PlannedPhoto] = {}
+    for item in sorted(candidates, key=lambda p: p.display_at):
+        planned.setdefault(item.photo_id, item)
+        if len(planned) == lookahead:
+            break
+    return list(planned.values())
+
+
+def select_evictions(
+    entries: Sequence[PhotoCache],
+    keep_photo_ids: Iterable[str],
+    capacity: int,
+    now: datetime,
+) -> List[PhotoCache]:
+    """Entries to drop so that at most ``capacity`` remain (planned photos stay)"""
+    keep = set(keep_photo_ids)
+    stale = {CacheStatus.FAILED, CacheStatus.EXPIRED}
+
+    def rank(entry: PhotoCache) -> Tuple[int, datetime]:
+        expires_at = _utc(entry.expires_at)
+        dead = entry.cache_status in stale or (
+            expires_at is not None and expires_at <= now
+        )
+        last_used = _utc(
+            entry.last_accessed_at or entry.created_at
+        ) or datetime.min.replace(tzinfo=timezone.utc)
+        return (0 if dead else 1, last_used)
+
+    evictable = sorted((e for e in entries if e.photo_id not in keep), key=rank)
+    dead = [e for e in evictable if rank(e)[0] == 0]
+    excess = max(len(entries) - len(dead) - capacity, 0)
+    live = evictable[len(dead) :]
+    return dead + live[:excess]
+
+
+class FramePrefetcher:
+    """Periodically re-plans the cache of every frame with an active schedule"""
+
+    def __init__(
+        self,
+        service,
+        *,
+        interval_seconds: float = 300.0,
+        max_concurrent_frames: int = 8,
+    ):
+        """
+        Args:
+            service: MediaService (``prefetch_all_frames``)
+            interval_seconds: Time between planning passes
+            max_concurrent_frames: Frames planned at once within a pass
+        """
+        self.service = service
+        self.interval = interval_seconds
+        self.max_concurrent_frames = max_concurrent_frames
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, service) -> "FramePrefetcher":
+        """Prefetcher configured from MEDIA_PREFETCH_* environment variables"""
+        return cls(
+            service,
+            interval_seconds=float(os.getenv("MEDIA_PREFETCH_INTERVAL_SECONDS", "300")),
+            max_concurrent_frames=int(os.getenv("MEDIA_PREFETCH_CONCURRENCY", "8")),
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="media-frame-prefetch")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        # Spread replicas so they do not all plan at the same instant
+        await asyncio.sleep(random.uniform(0, min(self.interval, 30.0)))
+        while True:
+            try:
+                # Claim slack below the interval absorbs timer drift
+                await self.service.prefetch_all_frames(
+                    max_concurrent_frames=self.max_concurrent_frames,
+                    min_interval=self.interval * 0.9,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Frame prefetch pass failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+__all__ = [
+    "FRAME_CACHE_REQUESTS",
+    "FramePrefetcher",
+    "PlannedPhoto",
+    "plan_frame",
+    "select_evictions",
+    "upcoming_photos",
+]
@@ -4,7 +4,7 @@ Media Service Protocols (Interfaces)
 These interfaces define contracts for dependency injection.
 NO import-time I/O dependencies - safe to import anywhere.
 """
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Dict, List, Optional, Protocol, Tuple, runtime_checkable
 
 # Import only models (no I/O dependencies)
 from .models import (
@@ -63,6 +63,10 @@ class MediaRepositoryProtocol(Protocol):
         """Delete a photo version"""
         ...
 
+    async def get_current_versions(self, photo_ids: List[str], user_id: str) -> Dict[str, str]:
+        """Current version_id per photo (the rendition frames display)"""
+        ...
+
     # Photo Metadata operations
     async def create_or_update_metadata(self, metadata: PhotoMetadata) -> Optional[PhotoMetadata]:
         """Create or update photo metadata"""
@@ -95,6 +99,10 @@ class MediaRepositoryProtocol(Protocol):
         """Delete a playlist"""
         ...
 
+    async def get_playlists_by_ids(self, playlist_ids: List[str]) -> Dict[str, Playlist]:
+        """Get many playlists keyed by playlist_id"""
+        ...
+
     # Rotation Schedule operations
     async def create_rotation_schedule(self, schedule_data: RotationSchedule) -> Optional[RotationSchedule]:
         """Create a rotation schedule"""
@@ -108,6 +116,16 @@ class MediaRepositoryProtocol(Protocol):
         """List schedules for a frame"""
         ...
 
+    async def list_active_schedules(
+        self, after: Optional[Tuple[str, str, str]] = None, limit: int = 1000
+    ) -> List[RotationSchedule]:
+        """List one page of active schedules of all frames, after a (frame_id, user_id, schedule_id) key"""
+        ...
+
+    async def claim_prefetch_pass(self, min_interval: float) -> bool:
+        """Claim the cluster-wide prefetch pass; False if another replica ran it recently"""
+        ...
+
     async def update_schedule_status(self, schedule_id: str, is_active: bool) -> Optional[RotationSchedule]:
         """Update schedule status"""
         ...
@@ -118,7 +136,7 @@ class MediaRepositoryProtocol(Protocol):
 
     # Photo Cache operations
     async def create_photo_cache(self, cache_data: PhotoCache) -> Optional[PhotoCache]:
-        """Create a photo cache entry"""
+        """Create a photo cache entry; returns the existing live entry if there is one"""
         ...
 
     async def get_photo_cache(self, cache_id: str) -> Optional[PhotoCache]:
@@ -134,7 +152,19 @@ class MediaRepositoryProtocol(Protocol):
         ...
 
     async def update_cache_status(self, cache_id: str, status: CacheStatus) -> Optional[PhotoCache]:
-        """Update cache status"""
+        """Update cache status; None if missing or it would duplicate a live entry"""
+        ...
+
+    async def increment_cache_hit(self, cache_id: str) -> bool:
+        """Record a cache hit"""
+        ...
+
+    async def bulk_create_photo_cache(self, entries: List[PhotoCache]) -> List[str]:
+        """Create many cache entries, skipping photos already cached; returns created cache_ids"""
+        ...
+
+    async def delete_photo_caches(self, cache_ids: List[str]) -> int:
+        """Delete many cache entries"""
         ...
 
     async def check_connection(self) -> bool:
@@ -126,6 +126,18 @@ SERVICE_ROUTES = [
         "auth_required": True,
         "description": "Get frame cache",
     },
+    {
+        "path": "/api/v1/media/frames/{frame_id}/cache/prefetch",
+        "methods": ["POST"],
+        "auth_required": True,
+        "description": "Prefetch upcoming photos for a frame",
+    },
+    {
+        "path": "/api/v1/media/frames/{frame_id}/cache/stats",
+        "methods": ["GET"],
+        "auth_required": True,
+        "description": "Frame cache usage and hit rate",
+    },
     {
         "path": "/api/v1/cache/{cache_id}/status",
         "methods": ["PATCH"],
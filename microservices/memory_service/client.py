@@ -24,6 +24,7 @@ class MemoryServiceClient:
         base_url: str = "http://localhost:8223",
         timeout: float = 30.0,
         api_key: Optional[str] = None,
+        balanced: bool = False,
     ):
         """
         Initialize Memory Service client
@@ -32,16 +33,34 @@ class MemoryServiceClient:
             base_url: Base URL of the memory service
             timeout: Request timeout in seconds
             api_key: Optional API key for authentication
+            balanced: Route each request to a discovered memory_service
+                instance, sticky on ``user_id`` so a user's requests keep
+                hitting the replica with their warm cache. ``base_url`` is
+                the fallback when discovery knows no instances.
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.headers = {"Content-Type": "application/json"}
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
+        self._transport = None
+        if balanced:
+            from core.load_balancer import BalancedTransport, param_affinity
+
+            # Shared across the per-call clients so pooled connections survive
+            self._transport = BalancedTransport(
+                "memory_service",
+                strategy="sticky",
+                affinity=param_affinity("user_id"),
+                close_with_client=False,
+            )
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self.timeout, transport=self._transport)
 
     async def health_check(self) -> Dict[str, Any]:
         """Check service health"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(f"{self.base_url}/health")
             response.raise_for_status()
             return response.json()
@@ -54,7 +73,7 @@ class MemoryServiceClient:
     ) -> Dict[str, Any]:
         """Export a user's memory corpus for GDPR data-request aggregation."""
         params = {"user_id": user_id, "scope": "user"}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/memories/export",
                 params=params,
@@ -86,7 +105,7 @@ class MemoryServiceClient:
         Returns:
             MemoryOperationResult with operation status
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories/factual/extract",
                 json={
@@ -103,7 +122,7 @@ class MemoryServiceClient:
         self, user_id: str, dialog_content: str, importance_score: float = 0.5
     ) -> MemoryOperationResult:
         """Extract and store episodic memories from dialog using AI"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories/episodic/extract",
                 json={
@@ -120,7 +139,7 @@ class MemoryServiceClient:
         self, user_id: str, dialog_content: str, importance_score: float = 0.5
     ) -> MemoryOperationResult:
         """Extract and store procedural memories from dialog using AI"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories/procedural/extract",
                 json={
@@ -137,7 +156,7 @@ class MemoryServiceClient:
         self, user_id: str, dialog_content: str, importance_score: float = 0.5
     ) -> MemoryOperationResult:
         """Extract and store semantic memories from dialog using AI"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories/semantic/extract",
                 json={
@@ -164,7 +183,7 @@ class MemoryServiceClient:
         Returns:
             MemoryOperationResult with created memory ID
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories",
                 json=request.model_dump(),
@@ -191,7 +210,7 @@ class MemoryServiceClient:
         if user_id:
             params["user_id"] = user_id
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories/{memory_type}/{memory_id}",
                 params=params,
@@ -227,7 +246,7 @@ class MemoryServiceClient:
         if importance_min is not None:
             params["importance_min"] = importance_min
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories", params=params, headers=self.headers
             )
@@ -253,7 +272,7 @@ class MemoryServiceClient:
         Returns:
             MemoryOperationResult with operation status
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.put(
                 f"{self.base_url}/memories/{memory_type}/{memory_id}",
                 json=request.model_dump(exclude_unset=True),
@@ -277,7 +296,7 @@ class MemoryServiceClient:
         Returns:
             MemoryOperationResult with operation status
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.delete(
                 f"{self.base_url}/memories/{memory_type}/{memory_id}",
                 params={"user_id": user_id},
@@ -302,7 +321,7 @@ class MemoryServiceClient:
         Returns:
             Dictionary with memories and count
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories/factual/search/subject",
                 params={"user_id": user_id, "subject": subject, "limit": limit},
@@ -325,7 +344,7 @@ class MemoryServiceClient:
         Returns:
             Dictionary with memories and count
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories/episodic/search/event_type",
                 params={"user_id": user_id, "event_type": event_type, "limit": limit},
@@ -344,7 +363,7 @@ class MemoryServiceClient:
         Returns:
             Dictionary with active memories and count
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories/working/active",
                 params={"user_id": user_id},
@@ -369,7 +388,7 @@ class MemoryServiceClient:
         if user_id:
             params["user_id"] = user_id
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories/working/cleanup",
                 params=params,
@@ -393,7 +412,7 @@ class MemoryServiceClient:
         Returns:
             Dictionary with session memories and count
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories/session/{session_id}",
                 params={"user_id": user_id},
@@ -415,7 +434,7 @@ class MemoryServiceClient:
         Returns:
             MemoryOperationResult with operation status
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.post(
                 f"{self.base_url}/memories/session/{session_id}/deactivate",
                 params={"user_id": user_id},
@@ -456,7 +475,7 @@ class MemoryServiceClient:
         if entity_types:
             params["entity_types"] = entity_types
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/memories/graph/search",
                 params=params,
@@ -493,7 +512,7 @@ class MemoryServiceClient:
         if relationship_types:
             params["relationship_types"] = relationship_types
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/memories/graph/neighbors",
                 params=params,
@@ -514,7 +533,7 @@ class MemoryServiceClient:
         Returns:
             Dictionary with memory statistics
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with self._client() as client:
             response = await client.get(
                 f"{self.base_url}/memories/statistics",
                 params={"user_id": user_id},
@@ -9,6 +9,7 @@ from datetime import datetime
 
 from .base_repository import BaseMemoryRepository
 from core.config_manager import ConfigManager
+from core.text_search import TextSearch
 
 logger = logging.getLogger(__name__)
 
@@ -113,13 +114,14 @@ class EpisodicMemoryRepository(BaseMemoryRepository):
             List of matching episodic memories
         """
         try:
+            params = [user_id]
+            search = TextSearch(("location",), location).bind(params)
             query = f"""
                 SELECT * FROM {self.schema}.{self.table_name}
-                WHERE user_id = $1 AND location ILIKE $2
+                WHERE user_id = $1 AND {search.condition}
                 ORDER BY episode_date DESC
                 LIMIT {limit}
             """
-            params = [user_id, f"%{location}%"]
 
             async with self.db:
                 results = await self.db.query(query, params, schema=self.schema)
@@ -76,6 +76,47 @@ class MemoryEventHandlers:
         except Exception as e:
             logger.error(f"Failed to handle session.message_sent event: {e}", exc_info=True)
 
+    async def handle_session_activity(self, event: Event):
+        """
+        Handle session.activity event
+
+        Coalesced form of session.message_sent: buffers every message added
+        to the session since the previous activity event
+        """
+        try:
+            # Check idempotency
+            if self.is_event_processed(event.id):
+                logger.debug(f"Event {event.id} already processed, skipping")
+                return
+
+            user_id = event.data.get("user_id")
+            session_id = event.data.get("session_id")
+            messages = [m for m in event.data.get("messages") or [] if m.get("content")]
+
+            if not user_id or not session_id:
+                logger.warning(f"Missing required fields in session.activity event: {event.id}")
+                return
+
+            buffer = self.session_message_buffer.setdefault(session_id, [])
+            for message in messages:
+                buffer.append({
+                    "role": message.get("role"),
+                    "content": message["content"],
+                    "message_id": message.get("message_id"),
+                    "timestamp": message.get("timestamp", datetime.now().isoformat())
+                })
+
+            logger.info(f"Buffered {len(messages)} messages for session {session_id} (total: {len(buffer)})")
+
+            # If we have at least 4 messages (2 exchanges), try to extract memories
+            if len(buffer) >= 4:
+                await self._extract_memories_from_buffer(user_id, session_id)
+
+            self.mark_event_processed(event.id)
+
+        except Exception as e:
+            logger.error(f"Failed to handle session.activity event: {e}", exc_info=True)
+
     async def handle_session_ended(self, event: Event):
         """
         Handle session.ended event
@@ -230,6 +271,7 @@ class MemoryEventHandlers:
         """Return mapping of event patterns to handler functions"""
         return {
             "*.session.message_sent": self.handle_session_message_sent,
+            "*.session.activity": self.handle_session_activity,
             "*.session.ended": self.handle_session_ended,
             "*.user.deleted": self.handle_user_deleted,
         }
@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any
 
 from .base_repository import BaseMemoryRepository
 from core.config_manager import ConfigManager
+from core.text_search import TextSearch
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +38,14 @@ class FactualMemoryRepository(BaseMemoryRepository):
             List of matching factual memories
         """
         try:
+            params = [user_id]
+            search = TextSearch(("subject",), subject).bind(params)
             query = f"""
                 SELECT * FROM {self.schema}.{self.table_name}
-                WHERE user_id = $1 AND subject ILIKE $2
+                WHERE user_id = $1 AND {search.condition}
                 ORDER BY confidence DESC, created_at DESC
                 LIMIT {limit}
             """
-            params = [user_id, f"%{subject}%"]
 
             async with self.db:
                 results = await self.db.query(query, params, schema=self.schema)
@@ -142,13 +144,14 @@ class FactualMemoryRepository(BaseMemoryRepository):
             List of matching factual memories
         """
         try:
+            params = [user_id]
+            search = TextSearch(("source",), source).bind(params)
             query = f"""
                 SELECT * FROM {self.schema}.{self.table_name}
-                WHERE user_id = $1 AND source ILIKE $2
+                WHERE user_id = $1 AND {search.condition}
                 ORDER BY confidence DESC, created_at DESC
                 LIMIT {limit}
             """
-            params = [user_id, f"%{source}%"]
 
             async with self.db:
                 results = await self.db.query(query, params, schema=self.schema)
@@ -260,13 +263,14 @@ class FactualMemoryRepository(BaseMemoryRepository):
             List of matching factual memories
         """
         try:
+            params = [user_id]
+            search = TextSearch(("predicate",), predicate).bind(params)
             query = f"""
                 SELECT * FROM {self.schema}.{self.table_name}
-                WHERE user_id = $1 AND predicate ILIKE $2
+                WHERE user_id = $1 AND {search.condition}
                 ORDER BY confidence DESC, created_at DESC
                 LIMIT {limit}
             """
-            params = [user_id, f"%{predicate}%"]
 
             async with self.db:
                 results = await self.db.query(query, params, schema=self.schema)
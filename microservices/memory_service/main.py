@@ -34,6 +34,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .models import (
@@ -266,6 +267,7 @@ async def lifespan(app: FastAPI):
 
     # Consul deregistration is handled by shutdown_manager.initiate_shutdown()
     # so traffic stops before we reject requests with 503.
+    close_discovery_caches()
 
 
 # Create FastAPI app
@@ -0,0 +1,18 @@
+-- Memory Service Migration: Trigram indexes for memory text lookups
+-- Version: 012
+-- Date: 2026-10-18
+-- Description: Serve per-user subject/predicate/source/definition/location
+--              substring lookups (core.text_search) from pg_trgm GIN indexes
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_factual_memories_subject_trgm
+    ON memory.factual_memories USING gin (subject gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_factual_memories_predicate_trgm
+    ON memory.factual_memories USING gin (predicate gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_factual_memories_source_trgm
+    ON memory.factual_memories USING gin (source gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_semantic_memories_definition_trgm
+    ON memory.semantic_memories USING gin (definition gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_episodic_memories_location_trgm
+    ON memory.episodic_memories USING gin (location gin_trgm_ops);
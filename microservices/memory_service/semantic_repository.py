@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any
 
 from .base_repository import BaseMemoryRepository
 from core.config_manager import ConfigManager
+from core.text_search import TextSearch
 
 logger = logging.getLogger(__name__)
 
@@ -151,13 +152,14 @@ class SemanticMemoryRepository(BaseMemoryRepository):
             List of matching semantic memories
         """
         try:
+            params = [user_id]
+            search = TextSearch(("definition",), keyword).bind(params)
             query = f"""
                 SELECT * FROM {self.schema}.{self.table_name}
-                WHERE user_id = $1 AND definition ILIKE $2
+                WHERE user_id = $1 AND {search.condition}
                 ORDER BY importance_score DESC, created_at DESC
                 LIMIT {limit}
             """
-            params = [user_id, f"%{keyword}%"]
 
             async with self.db:
                 results = await self.db.query(query, params, schema=self.schema)
@@ -121,40 +121,63 @@ class NotificationServiceClient:
             return None
 
     async def send_batch_notifications(
-        self, notifications: List[Dict[str, Any]]
+        self,
+        notifications: List[Dict[str, Any]],
+        notification_type: str = "email",
+        template_id: Optional[str] = None,
+        name: Optional[str] = None,
+        priority: str = "normal",
+        metadata: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Send multiple notifications in batch
 
         Args:
-            notifications: List of notification dictionaries
+            notifications: Recipient dictionaries (user_id / email / phone,
+                variables, and optionally subject, content, metadata and an
+                idempotency_key so a retried batch does not send twice)
+            notification_type: Type of notification (email, in_app, push, ...)
+            template_id: Template rendered for every recipient (optional)
+            name: Batch name (optional)
+            priority: Priority (low, normal, high, urgent)
+            metadata: Metadata added to every notification (optional)
 
         Returns:
-            Batch send result
+            Batch send result, with one entry per recipient in ``results``
 
         Example:
             >>> notifications = [
             ...     {
             ...         "user_id": "user1",
-            ...         "notification_type": "welcome",
-            ...         "title": "Welcome",
-            ...         "message": "Welcome to our app",
-            ...         "channels": ["email"]
+            ...         "variables": {"name": "Alice"},
+            ...         "idempotency_key": "welcome:user1",
             ...     },
             ...     {
             ...         "user_id": "user2",
-            ...         "notification_type": "welcome",
-            ...         "title": "Welcome",
-            ...         "message": "Welcome to our app",
-            ...         "channels": ["email"]
-            ...     }
+            ...         "variables": {"name": "Bob"},
+            ...         "idempotency_key": "welcome:user2",
+            ...     },
             ... ]
-            >>> result = await client.send_batch_notifications(notifications)
+            >>> result = await client.send_batch_notifications(
+            ...     notifications, notification_type="email", template_id="tpl_welcome"
+            ... )
         """
         try:
+            payload = {
+                "type": notification_type,
+                "recipients": notifications,
+                "priority": priority,
+            }
+
+            if template_id:
+                payload["template_id"] = template_id
+            if name:
+                payload["name"] = name
+            if metadata:
+                payload["metadata"] = metadata
+
             response = await self.client.post(
-                f"{self.base_url}/api/v1/notifications/batch",
-                json={"notifications": notifications},
+                f"{self.base_url}/api/v1/notifications/batch", json=payload
             )
             response.raise_for_status()
             return response.json()
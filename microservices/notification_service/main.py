@@ -19,6 +19,8 @@ from core.health import HealthCheck
 from core.logger import setup_service_logger
 from core.metrics import setup_metrics
 from core.nats_client import get_event_bus
+from core.stat_rollups import RollupReconciler
+from core.discovery_cache import close_discovery_caches
 from fastapi import FastAPI, HTTPException, Query
 
 from isa_common.consul_client import ConsulRegistry
@@ -68,6 +70,7 @@ shutdown_manager = GracefulShutdown("notification_service")
 
 # 后台任务
 background_task = None
+stats_reconciler: Optional[RollupReconciler] = None
 
 
 async def process_pending_notifications_task():
@@ -90,6 +93,7 @@ async def process_pending_notifications_task():
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     global service, background_task, event_bus, event_handlers, consul_registry
+    global stats_reconciler
     shutdown_manager.install_signal_handlers()
 
     # Initialize event bus first
@@ -170,6 +174,10 @@ async def lifespan(app: FastAPI):
     # 启动后台任务
     background_task = asyncio.create_task(process_pending_notifications_task())
 
+    # Keep the statistics counter rollups reconciled
+    stats_reconciler = RollupReconciler(service.repository.stat_rollups)
+    stats_reconciler.start()
+
     yield
 
     # 关闭时清理
@@ -190,6 +198,8 @@ async def lifespan(app: FastAPI):
     if event_bus:
         await event_bus.close()
         logger.info("Event bus closed")
+    if stats_reconciler:
+        await stats_reconciler.stop()
     if background_task:
         background_task.cancel()
         try:
@@ -199,6 +209,7 @@ async def lifespan(app: FastAPI):
 
     if service:
         await service.cleanup()
+    close_discovery_caches()
 
 
 # 创建FastAPI应用
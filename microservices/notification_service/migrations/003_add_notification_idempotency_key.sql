@@ -0,0 +1,16 @@
+-- Notification Service Migration: Add idempotency keys to notifications
+-- Version: 003
+-- Date: 2026-10-19
+-- Description: Callers may tag a notification with an idempotency key so a
+--              retried send (after a timeout or a lost response) returns the
+--              existing notification instead of creating a duplicate.
+
+ALTER TABLE notification.notifications
+    ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(255);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_idempotency_key
+    ON notification.notifications(idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+COMMENT ON COLUMN notification.notifications.idempotency_key IS
+    'Caller-supplied dedupe key; one notification per key.';
@@ -146,6 +146,7 @@ class Notification(BaseModel):
     # 元数据
     metadata: Dict[str, Any] = Field(default_factory=dict)
     tags: List[str] = Field(default_factory=list)
+    idempotency_key: Optional[str] = Field(None, description="幂等键")
 
     # 时间戳
     created_at: Optional[datetime] = None
@@ -191,7 +192,7 @@ class NotificationBatch(BaseModel):
     name: Optional[str] = Field(None, description="批次名称")
 
     # 配置
-    template_id: str = Field(..., description="模板ID")
+    template_id: Optional[str] = Field(None, description="模板ID")
     type: NotificationType = Field(..., description="通知类型")
     priority: NotificationPriority = NotificationPriority.NORMAL
 
@@ -268,13 +269,21 @@ class SendNotificationRequest(BaseModel):
     scheduled_at: Optional[datetime] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     tags: List[str] = Field(default_factory=list)
+    idempotency_key: Optional[str] = None
 
 
 class SendBatchRequest(BaseModel):
-    """批量发送请求"""
+    """
+    批量发送请求
+
+    Each recipient is a dict with ``user_id`` / ``email`` / ``phone`` and
+    optional ``variables``, ``subject``, ``content``, ``metadata`` and
+    ``idempotency_key``; ``subject`` / ``content`` are used when no
+    template is given.
+    """
 
     name: Optional[str] = None
-    template_id: str
+    template_id: Optional[str] = None
     type: NotificationType
     recipients: List[Dict[str, Any]]
     priority: NotificationPriority = NotificationPriority.NORMAL
@@ -345,10 +354,21 @@ class TemplateResponse(BaseModel):
     message: str = Field(default="Template processed")
 
 
+class BatchRecipientResult(BaseModel):
+    """批量发送中单个接收者的结果"""
+
+    index: int = Field(..., description="接收者在请求中的位置")
+    idempotency_key: Optional[str] = None
+    notification_id: Optional[str] = None
+    status: Optional[NotificationStatus] = None
+    error: Optional[str] = None
+
+
 class BatchResponse(BaseModel):
     """批量发送响应"""
 
     batch: NotificationBatch
+    results: List[BatchRecipientResult] = Field(default_factory=list)
     message: str = Field(default="Batch created")
 
 
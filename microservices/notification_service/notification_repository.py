@@ -12,6 +12,7 @@ from google.protobuf.struct_pb2 import Struct, ListValue
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.stat_rollups import CounterRollup, RollupSpec
 from .models import (
     Notification,
     NotificationTemplate,
@@ -90,6 +91,23 @@ class NotificationRepository:
         )
         self.schema = "notification"
 
+        # Dashboard counters (core.stat_rollups); reconciled by main.lifespan
+        self.notifications_rollup = CounterRollup(
+            self.db,
+            RollupSpec(
+                name="notifications",
+                source_table=f"{self.schema}.notifications",
+                time_column="created_at",
+                dimensions={"status": "status", "type": "type"},
+            ),
+            schema=self.schema,
+        )
+
+    @property
+    def stat_rollups(self) -> List[CounterRollup]:
+        """Counter rollups maintained for this repository's statistics"""
+        return [self.notifications_rollup]
+
     # ====================
     # 通知模板管理
     # ====================
@@ -310,7 +328,14 @@ class NotificationRepository:
     # ====================
 
     async def create_notification(self, notification: Notification) -> Notification:
-        """创建通知"""
+        """
+        创建通知
+
+        A notification with an ``idempotency_key`` that already exists is not
+        inserted again: the existing notification is returned instead (a
+        failed one is first re-queued as pending, so a retried send can still
+        be delivered). Callers detect this by the returned ``notification_id``.
+        """
         try:
             now = datetime.now(timezone.utc)
 
@@ -349,10 +374,16 @@ class NotificationRepository:
                 "max_retries": notification.max_retries,
                 "status": notification.status.value,
                 "error_message": notification.error_message,
+                "idempotency_key": notification.idempotency_key,
                 "created_at": now,
                 "updated_at": now,
             }
 
+            if notification.idempotency_key:
+                return await self._create_idempotent_notification(
+                    notification, notification_data
+                )
+
             async with self.db:
                 count = await self.db.insert_into(
                     "notifications", [notification_data], schema=self.schema
@@ -360,6 +391,13 @@ class NotificationRepository:
 
             if count is not None and count > 0:
                 notification.created_at = now
+                await self.notifications_rollup.increment(
+                    {
+                        "status": notification.status.value,
+                        "type": notification.type.value,
+                    },
+                    at=now,
+                )
                 return notification
 
             raise Exception("Failed to create notification")
@@ -368,6 +406,52 @@ class NotificationRepository:
             logger.error(f"Failed to create notification: {str(e)}")
             raise
 
+    async def _create_idempotent_notification(
+        self, notification: Notification, notification_data: Dict[str, Any]
+    ) -> Notification:
+        """Insert keyed by idempotency_key; returns the existing row on conflict"""
+        columns = ", ".join(notification_data)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(notification_data) + 1))
+        query = f"""
+            INSERT INTO {self.schema}.notifications ({columns})
+            VALUES ({placeholders})
+            ON CONFLICT (idempotency_key) WHERE idempotency_key IS NOT NULL
+            DO UPDATE SET
+                status = '{NotificationStatus.PENDING.value}',
+                error_message = NULL,
+                retry_count = notifications.retry_count + 1,
+                updated_at = EXCLUDED.updated_at
+            WHERE notifications.status = '{NotificationStatus.FAILED.value}'
+            RETURNING *
+        """
+        select_query = f"""
+            SELECT * FROM {self.schema}.notifications
+            WHERE idempotency_key = $1
+        """
+
+        async with self.db:
+            rows = await self.db.query(
+                query, list(notification_data.values()), schema=self.schema
+            )
+            if not rows:
+                rows = await self.db.query(
+                    select_query, [notification.idempotency_key], schema=self.schema
+                )
+
+        existing = self._parse_notification(rows[0]) if rows else None
+        if existing is None:
+            raise Exception("Failed to create notification")
+
+        if existing.notification_id == notification.notification_id:
+            await self.notifications_rollup.increment(
+                {
+                    "status": notification.status.value,
+                    "type": notification.type.value,
+                },
+                at=notification_data["created_at"],
+            )
+        return existing
+
     async def get_notification(self, notification_id: str) -> Optional[Notification]:
         """获取通知"""
         try:
@@ -1098,6 +1182,28 @@ class NotificationRepository:
         end_date: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """获取通知统计"""
+        if not user_id:
+            try:
+                snapshot = await self.notifications_rollup.snapshot(
+                    start_date, end_date
+                )
+                return {
+                    "total_sent": snapshot.total,
+                    "total_delivered": snapshot.count(
+                        "status", NotificationStatus.DELIVERED.value
+                    ),
+                    "total_failed": snapshot.count(
+                        "status", NotificationStatus.FAILED.value
+                    ),
+                    "total_pending": snapshot.count(
+                        "status", NotificationStatus.PENDING.value
+                    ),
+                    "by_type": snapshot.by("type"),
+                    "by_status": snapshot.by("status"),
+                }
+            except Exception as e:
+                logger.warning(f"Notification rollup unavailable, scanning rows: {e}")
+
         try:
             conditions = []
             params = []
@@ -1251,6 +1357,7 @@ class NotificationRepository:
             # Note: batch_id is in DB but not in Notification model
             notification.provider = data.get("provider")
             notification.provider_message_id = data.get("provider_message_id")
+            notification.idempotency_key = data.get("idempotency_key")
 
             # 解析时间字段
             if data.get("scheduled_at"):
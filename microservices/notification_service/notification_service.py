@@ -31,6 +31,7 @@ from .models import (
     NotificationResponse,
     TemplateResponse,
     BatchResponse,
+    BatchRecipientResult,
     NotificationStatus,
     NotificationType,
     TemplateStatus,
@@ -233,82 +234,119 @@ class NotificationService:
     async def send_notification(
         self, request: SendNotificationRequest
     ) -> NotificationResponse:
-        """发送单个通知"""
-        try:
-            # 生成通知ID
-            notification_id = (
-                f"ntf_{request.type.value}_{datetime.utcnow().timestamp()}"
-            )
+        """
+        发送单个通知
 
-            # 如果指定了模板，加载模板内容
+        A request whose ``idempotency_key`` was seen before returns the
+        existing notification instead of sending a second one.
+        """
+        try:
+            template = None
             if request.template_id:
                 template = await self.repository.get_template(request.template_id)
-                if template:
-                    # 使用模板内容，替换变量
-                    content = self._replace_template_variables(
-                        template.content, request.variables
-                    )
-                    html_content = None
-                    if template.html_content:
-                        html_content = self._replace_template_variables(
-                            template.html_content, request.variables
-                        )
-
-                    # 如果请求中没有指定主题，使用模板主题
-                    if not request.subject and template.subject:
-                        request.subject = self._replace_template_variables(
-                            template.subject, request.variables
-                        )
-                else:
-                    content = request.content or ""
-                    html_content = request.html_content
-            else:
-                content = request.content or ""
-                html_content = request.html_content
-
-            # 创建通知对象
-            notification = Notification(
-                notification_id=notification_id,
-                type=request.type,
-                priority=request.priority,
-                recipient_type=RecipientType.EMAIL
-                if request.recipient_email
-                else RecipientType.USER,
-                recipient_id=request.recipient_id,
-                recipient_email=request.recipient_email,
-                recipient_phone=request.recipient_phone,
-                template_id=request.template_id,
-                subject=request.subject,
-                content=content,
-                html_content=html_content,
-                variables=request.variables,
-                scheduled_at=request.scheduled_at,
-                metadata=request.metadata,
-                tags=request.tags,
-                status=NotificationStatus.PENDING,
-            )
+            notification = self._build_notification(request, template)
 
-            # 保存到数据库
+            # 保存到数据库（幂等键重复时返回已有通知）
             created_notification = await self.repository.create_notification(
                 notification
             )
+            duplicate = (
+                created_notification.notification_id != notification.notification_id
+            )
 
             # 如果没有设置计划时间，立即发送
-            if not request.scheduled_at or request.scheduled_at <= datetime.utcnow():
+            if created_notification.status == NotificationStatus.PENDING and (
+                not request.scheduled_at or request.scheduled_at <= datetime.utcnow()
+            ):
                 await self._process_notification(created_notification)
+                # 返回发送后的状态 (sent/delivered/failed)，调用方据此确认投递
+                created_notification = (
+                    await self.repository.get_notification(
+                        created_notification.notification_id
+                    )
+                    or created_notification
+                )
 
             return NotificationResponse(
                 notification=created_notification,
-                message="Notification created and queued for sending",
+                message="Duplicate request; existing notification returned"
+                if duplicate
+                else "Notification created and queued for sending",
             )
 
         except Exception as e:
             logger.error(f"Failed to send notification: {str(e)}")
             raise
 
+    def _build_notification(
+        self,
+        request: SendNotificationRequest,
+        template: Optional[NotificationTemplate],
+    ) -> Notification:
+        """根据请求（和模板）构建待发送的通知"""
+        # 生成通知ID
+        notification_id = f"ntf_{request.type.value}_{datetime.utcnow().timestamp()}"
+
+        # 如果指定了模板，加载模板内容
+        if template:
+            # 使用模板内容，替换变量
+            content = self._replace_template_variables(
+                template.content, request.variables
+            )
+            html_content = None
+            if template.html_content:
+                html_content = self._replace_template_variables(
+                    template.html_content, request.variables
+                )
+
+            # 如果请求中没有指定主题，使用模板主题
+            if not request.subject and template.subject:
+                request.subject = self._replace_template_variables(
+                    template.subject, request.variables
+                )
+        else:
+            content = request.content or ""
+            html_content = request.html_content
+
+        # 创建通知对象
+        return Notification(
+            notification_id=notification_id,
+            type=request.type,
+            priority=request.priority,
+            recipient_type=RecipientType.EMAIL
+            if request.recipient_email
+            else RecipientType.USER,
+            recipient_id=request.recipient_id,
+            recipient_email=request.recipient_email,
+            recipient_phone=request.recipient_phone,
+            template_id=request.template_id,
+            subject=request.subject,
+            content=content,
+            html_content=html_content,
+            variables=request.variables,
+            scheduled_at=request.scheduled_at,
+            metadata=request.metadata,
+            tags=request.tags,
+            idempotency_key=request.idempotency_key,
+            status=NotificationStatus.PENDING,
+        )
+
     async def send_batch(self, request: SendBatchRequest) -> BatchResponse:
-        """批量发送通知"""
+        """
+        批量发送通知
+
+        Every recipient's notification is created before returning, so the
+        response carries a per-recipient result (``pending`` once accepted,
+        or the existing notification's status for a repeated
+        ``idempotency_key``); delivery then continues in the background.
+        """
         try:
+            template = None
+            if request.template_id:
+                template = await self.repository.get_template(request.template_id)
+                if not template:
+                    raise ValueError(f"Template {request.template_id} not found")
+
             # 生成批次ID
             batch_id = f"batch_{datetime.utcnow().timestamp()}"
 
@@ -328,13 +366,64 @@ class NotificationService:
             # 保存批次
             created_batch = await self.repository.create_batch(batch)
 
-            # 如果没有设置计划时间，立即处理
-            if not request.scheduled_at or request.scheduled_at <= datetime.utcnow():
+            results: List[BatchRecipientResult] = []
+            queued: List[Notification] = []
+            for index, recipient in enumerate(request.recipients):
+                idempotency_key = recipient.get("idempotency_key")
+                try:
+                    notification_request = SendNotificationRequest(
+                        type=request.type,
+                        priority=request.priority,
+                        template_id=request.template_id,
+                        recipient_id=recipient.get("user_id"),
+                        recipient_email=recipient.get("email"),
+                        recipient_phone=recipient.get("phone"),
+                        subject=recipient.get("subject"),
+                        content=recipient.get("content"),
+                        variables=recipient.get("variables", {}),
+                        scheduled_at=request.scheduled_at,
+                        metadata={
+                            "batch_id": batch_id,
+                            **request.metadata,
+                            **recipient.get("metadata", {}),
+                        },
+                        idempotency_key=idempotency_key,
+                    )
+                    notification = await self.repository.create_notification(
+                        self._build_notification(notification_request, template)
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to create notification {index} of batch {batch_id}: {e}"
+                    )
+                    results.append(
+                        BatchRecipientResult(
+                            index=index, idempotency_key=idempotency_key, error=str(e)
+                        )
+                    )
+                    continue
+
+                results.append(
+                    BatchRecipientResult(
+                        index=index,
+                        idempotency_key=idempotency_key,
+                        notification_id=notification.notification_id,
+                        status=notification.status,
+                    )
+                )
+                if notification.status == NotificationStatus.PENDING:
+                    queued.append(notification)
+
+            # 如果没有设置计划时间，立即处理；计划发送的由后台任务处理
+            if queued and (
+                not request.scheduled_at or request.scheduled_at <= datetime.utcnow()
+            ):
                 # 异步处理批量发送
-                asyncio.create_task(self._process_batch(created_batch))
+                asyncio.create_task(self._process_batch(created_batch, queued))
 
             return BatchResponse(
                 batch=created_batch,
+                results=results,
                 message=f"Batch created with {len(request.recipients)} recipients",
             )
 
@@ -342,57 +431,35 @@ class NotificationService:
             logger.error(f"Failed to send batch: {str(e)}")
             raise
 
-    async def _process_batch(self, batch: NotificationBatch):
+    async def _process_batch(
+        self, batch: NotificationBatch, notifications: List[Notification]
+    ):
         """处理批量发送"""
         try:
             # 更新批次状态为开始
             await self.repository.update_batch_stats(batch.batch_id, sent_count=0)
 
-            # 获取模板
-            template = await self.repository.get_template(batch.template_id)
-            if not template:
-                logger.error(
-                    f"Template {batch.template_id} not found for batch {batch.batch_id}"
-                )
-                return
-
             sent_count = 0
             delivered_count = 0
             failed_count = 0
 
             # 处理每个接收者
-            for recipient in batch.recipients:
-                try:
-                    # 创建通知请求
-                    notification_request = SendNotificationRequest(
-                        type=batch.type,
-                        priority=batch.priority,
-                        template_id=batch.template_id,
-                        recipient_id=recipient.get("user_id"),
-                        recipient_email=recipient.get("email"),
-                        recipient_phone=recipient.get("phone"),
-                        variables=recipient.get("variables", {}),
-                        metadata={"batch_id": batch.batch_id, **batch.metadata},
-                    )
-
-                    # 发送通知
-                    response = await self.send_notification(notification_request)
-                    sent_count += 1
+            for notification in notifications:
+                # 发送通知（已被其他 worker 认领的会跳过）
+                await self._process_notification(notification)
+                sent_count += 1
 
-                    # 检查发送状态
-                    if response.notification.status == NotificationStatus.SENT:
-                        delivered_count += 1
-                    elif response.notification.status == NotificationStatus.FAILED:
-                        failed_count += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send to recipient in batch {batch.batch_id}: {str(e)}"
-                    )
+                # 检查发送状态
+                processed = await self.repository.get_notification(
+                    notification.notification_id
+                )
+                if processed and processed.status == NotificationStatus.SENT:
+                    delivered_count += 1
+                elif processed and processed.status == NotificationStatus.FAILED:
                     failed_count += 1
 
                 # 定期更新批次统计
-                if (sent_count + failed_count) % 10 == 0:
+                if sent_count % 10 == 0:
                     await self.repository.update_batch_stats(
                         batch.batch_id,
                         sent_count=sent_count,
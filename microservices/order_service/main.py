@@ -26,6 +26,8 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.stat_rollups import RollupReconciler
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 from .models import (
     OrderCreateRequest,
@@ -67,6 +69,7 @@ class OrderMicroservice:
     def __init__(self):
         self.order_service = None
         self.event_bus = None
+        self.stats_reconciler = None
 
     async def initialize(
         self,
@@ -96,6 +99,10 @@ class OrderMicroservice:
                 tax_client=tax_client,
                 fulfillment_client=fulfillment_client,
             )
+            self.stats_reconciler = RollupReconciler(
+                self.order_service.repository.stat_rollups
+            )
+            self.stats_reconciler.start()
             logger.info("Order microservice initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize order microservice: {e}")
@@ -104,6 +111,8 @@ class OrderMicroservice:
     async def shutdown(self):
         """Shutdown the microservice"""
         try:
+            if self.stats_reconciler:
+                await self.stats_reconciler.stop()
             if self.event_bus:
                 await self.event_bus.close()
                 logger.info("Event bus closed")
@@ -291,6 +300,7 @@ async def lifespan(app: FastAPI):
 
     except Exception as e:
         logger.error(f"❌ Error during cleanup: {e}")
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -0,0 +1,11 @@
+-- Order Service Migration: Trigram index for order search
+-- Version: 005
+-- Date: 2026-10-18
+-- Description: Serve order_id substring search (core.text_search) from a
+--              pg_trgm GIN index; order_type/status now match exactly and
+--              use the existing btree indexes
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_orders_order_id_trgm
+    ON orders.orders USING gin (order_id gin_trgm_ops);
@@ -5,7 +5,7 @@ Data access layer for order management operations using PostgresClient.
 """
 
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import uuid
 import logging
 from decimal import Decimal
@@ -18,6 +18,8 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.stat_rollups import CounterRollup, RollupSpec
+from core.text_search import TextSearch
 from .models import Order, OrderStatus, OrderType, PaymentStatus
 
 
@@ -78,8 +80,36 @@ class OrderRepository:
         self.schema = "orders"  # Using "orders" instead of "order" (reserved keyword)
         self.orders_table = "orders"
 
+        # Dashboard counters (core.stat_rollups); reconciled by main.lifespan.
+        # Orders change status long after creation, after the hot buckets
+        # were last reconciled, so the whole rollup is also recomputed hourly.
+        self.orders_rollup = CounterRollup(
+            self.db,
+            RollupSpec(
+                name="orders",
+                source_table=f'"{self.schema}".{self.orders_table}',
+                time_column="created_at",
+                dimensions={
+                    "status": "status",
+                    "order_type": "order_type",
+                    "completed_currency": (
+                        f"CASE WHEN status = '{OrderStatus.COMPLETED.value}' "
+                        "THEN currency END"
+                    ),
+                },
+                amount_column="total_amount",
+                full_reconcile_interval=3600.0,
+            ),
+            schema=self.schema,
+        )
+
         logger.info("OrderRepository initialized with PostgresClient")
 
+    @property
+    def stat_rollups(self) -> List[CounterRollup]:
+        """Counter rollups maintained for this repository's statistics"""
+        return [self.orders_rollup]
+
     async def create_order(
         self,
         user_id: str,
@@ -161,6 +191,14 @@ class OrderRepository:
                 )
 
             if count is not None and count > 0:
+                await self.orders_rollup.increment(
+                    {
+                        "status": OrderStatus.PENDING.value,
+                        "order_type": order_type.value,
+                    },
+                    at=now,
+                    amount=float(total_amount),
+                )
                 return await self.get_order(order_id)
 
             # If insert returns None/0, try to get the order anyway
@@ -347,25 +385,23 @@ class OrderRepository:
         try:
             conditions = []
             params = []
-            param_count = 0
 
-            # Add search conditions
-            param_count += 1
-            params.append(f"%{query}%")
-            search_condition = f"(order_id ILIKE ${param_count} OR order_type ILIKE ${param_count} OR status ILIKE ${param_count})"
-            conditions.append(search_condition)
+            # order_id 走 pg_trgm 索引 (子串/前缀); type/status 是枚举，只做等值匹配
+            search = TextSearch(
+                ("order_id",), query, exact_columns=("order_type", "status")
+            ).bind(params, ranked=True)
+            conditions.append(search.condition)
 
             if user_id:
-                param_count += 1
-                conditions.append(f"user_id = ${param_count}")
                 params.append(user_id)
+                conditions.append(f"user_id = ${len(params)}")
 
             where_clause = " AND ".join(conditions)
             sql_query = f"""
                 SELECT * FROM "{self.schema}".{self.orders_table}
                 WHERE {where_clause}
-                ORDER BY created_at DESC
-                LIMIT {limit}
+                ORDER BY {search.rank} DESC, created_at DESC
+                LIMIT {int(limit)}
             """
 
             async with self.db:
@@ -466,6 +502,11 @@ class OrderRepository:
 
     async def get_order_statistics(self) -> Dict[str, Any]:
         """Get order statistics"""
+        try:
+            return await self._get_order_statistics_from_rollup()
+        except Exception as e:
+            logger.warning(f"Order rollup unavailable, scanning orders: {e}")
+
         try:
             # Get total orders
             total_query = (
@@ -546,6 +587,39 @@ class OrderRepository:
             logger.error(f"Failed to get order statistics: {e}")
             raise
 
+    async def _get_order_statistics_from_rollup(self) -> Dict[str, Any]:
+        """Order statistics from the orders counter rollup"""
+        now = datetime.now(timezone.utc)
+        overall = await self.orders_rollup.snapshot()
+        recent_30d = await self.orders_rollup.snapshot(since=now - timedelta(days=30))
+        recent_7d = await self.orders_rollup.snapshot(since=now - timedelta(days=7))
+        recent_24h = await self.orders_rollup.snapshot(since=now - timedelta(hours=24))
+
+        by_status = overall.by("status")
+        by_type = overall.by("order_type")
+        revenue_by_currency = {
+            currency: Decimal(str(amount))
+            for currency, amount in overall.amount_by("completed_currency").items()
+        }
+        total_revenue = sum(revenue_by_currency.values(), Decimal(0))
+        total_orders = overall.total
+
+        return {
+            "total_orders": total_orders,
+            "orders_by_status": {
+                s.value: by_status.get(s.value, 0) for s in OrderStatus
+            },
+            "orders_by_type": {t.value: by_type.get(t.value, 0) for t in OrderType},
+            "total_revenue": float(total_revenue),
+            "revenue_by_currency": {
+                k: float(v) for k, v in revenue_by_currency.items()
+            },
+            "avg_order_value": float(total_revenue / max(total_orders, 1)),
+            "recent_orders_24h": recent_24h.total,
+            "recent_orders_7d": recent_7d.total,
+            "recent_orders_30d": recent_30d.total,
+        }
+
     @staticmethod
     def _normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize legacy item format to match OrderLineItem schema."""
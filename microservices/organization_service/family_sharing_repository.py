@@ -238,6 +238,21 @@ class FamilySharingRepository:
             logger.error(f"Failed to create member permission: {e}")
             raise
 
+    async def create_member_permissions(self, permissions: List[Dict[str, Any]]) -> int:
+        """批量创建成员权限（一次插入），返回插入行数"""
+        if not permissions:
+            return 0
+        try:
+            async with self.db:
+                count = await self.db.insert_into(
+                    self.permissions_table, permissions, schema=self.schema
+                )
+            return count or 0
+
+        except Exception as e:
+            logger.error(f"Failed to create member permissions: {e}")
+            raise
+
     async def get_member_permission(
         self, sharing_id: str, user_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -321,6 +336,29 @@ class FamilySharingRepository:
             logger.error(f"Failed to delete member permission: {e}")
             return False
 
+    async def delete_member_permissions(
+        self, sharing_id: str, user_ids: List[str]
+    ) -> int:
+        """批量删除成员权限，返回删除行数"""
+        if not user_ids:
+            return 0
+        try:
+            query = f"""
+                DELETE FROM {self.schema}.{self.permissions_table}
+                WHERE sharing_id = $1 AND user_id = ANY($2::text[])
+            """
+
+            async with self.db:
+                count = await self.db.execute(
+                    query, [sharing_id, list(user_ids)], schema=self.schema
+                )
+
+            return count or 0
+
+        except Exception as e:
+            logger.error(f"Failed to delete member permissions: {e}")
+            raise
+
     async def delete_sharing_member_permissions(self, sharing_id: str) -> bool:
         """删除共享的所有成员权限"""
         try:
@@ -147,13 +147,19 @@ class FamilySharingService:
 
             # 如果指定了共享成员，创建成员权限
             if request.shared_with_members:
-                for user_id in request.shared_with_members:
-                    permission_level = request.custom_permissions.get(
-                        user_id, request.default_permission
-                    )
-                    await self._grant_member_permission(
-                        sharing_id, user_id, permission_level, request.quota_settings
-                    )
+                await self.repository.create_member_permissions(
+                    [
+                        self._member_permission_row(
+                            sharing_id,
+                            user_id,
+                            request.custom_permissions.get(
+                                user_id, request.default_permission
+                            ),
+                            request.quota_settings,
+                        )
+                        for user_id in dict.fromkeys(request.shared_with_members)
+                    ]
+                )
 
             # 如果共享给所有成员，为当前所有成员创建权限
             if request.share_with_all_members:
@@ -623,15 +629,15 @@ class FamilySharingService:
         )
         return has_admin
 
-    async def _grant_member_permission(
-        self,
+    @staticmethod
+    def _member_permission_row(
         sharing_id: str,
         user_id: str,
         permission_level: SharingPermissionLevel,
         quota_settings: Optional[Dict[str, Any]] = None,
-    ) -> None:
-        """为成员授予共享权限"""
-        permission_data = {
+    ) -> Dict[str, Any]:
+        """构造成员权限行（批量插入用）"""
+        return {
             "permission_id": str(uuid.uuid4()),
             "sharing_id": sharing_id,
             "user_id": user_id,
@@ -645,7 +651,6 @@ class FamilySharingService:
             "created_at": datetime.utcnow().isoformat(),
             "updated_at": datetime.utcnow().isoformat(),
         }
-        await self.repository.create_member_permission(permission_data)
 
     async def _grant_all_members_permission(
         self,
@@ -658,10 +663,14 @@ class FamilySharingService:
         # 获取组织所有成员
         members = await self.repository.get_organization_members(organization_id)
 
-        for member in members:
-            await self._grant_member_permission(
-                sharing_id, member["user_id"], permission_level, quota_settings
-            )
+        await self.repository.create_member_permissions(
+            [
+                self._member_permission_row(
+                    sharing_id, member["user_id"], permission_level, quota_settings
+                )
+                for member in members
+            ]
+        )
 
     async def _sync_member_permissions(
         self, sharing_id: str, member_ids: List[str], custom_permissions: Dict[str, str]
@@ -674,15 +683,22 @@ class FamilySharingService:
         current_member_ids = {perm["user_id"] for perm in current_permissions}
 
         # 删除不在新列表中的成员权限
-        for user_id in current_member_ids - set(member_ids):
-            await self.repository.delete_member_permission(sharing_id, user_id)
+        await self.repository.delete_member_permissions(
+            sharing_id, list(current_member_ids - set(member_ids))
+        )
 
         # 添加新成员权限
-        for user_id in set(member_ids) - current_member_ids:
-            permission_level = custom_permissions.get(
-                user_id, SharingPermissionLevel.READ_WRITE
-            )
-            await self._grant_member_permission(sharing_id, user_id, permission_level)
+        await self.repository.create_member_permissions(
+            [
+                self._member_permission_row(
+                    sharing_id,
+                    user_id,
+                    custom_permissions.get(user_id, SharingPermissionLevel.READ_WRITE),
+                )
+                for user_id in dict.fromkeys(member_ids)
+                if user_id not in current_member_ids
+            ]
+        )
 
     async def _get_sharing_usage_stats(
         self, sharing_id: str, period_days: int = 30
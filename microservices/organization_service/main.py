@@ -44,6 +44,7 @@ from core.auth_dependencies import (
     require_auth_or_internal_service,
 )
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 from .routes_registry import get_routes_for_consul, SERVICE_METADATA
 from .models import (
@@ -51,6 +52,10 @@ from .models import (
     OrganizationUpdateRequest,
     OrganizationMemberAddRequest,
     OrganizationMemberUpdateRequest,
+    OrganizationMemberBulkAddRequest,
+    OrganizationMemberBulkUpdateRequest,
+    OrganizationMemberBulkRemoveRequest,
+    OrganizationMemberBulkResponse,
     OrganizationSwitchRequest,
     OrganizationResponse,
     OrganizationMemberResponse,
@@ -166,6 +171,8 @@ class OrganizationMicroservice:
                 except Exception as e:
                     logger.error(f"Failed to deregister from Consul: {e}")
 
+            if self.organization_service:
+                await self.organization_service.context_cache.close()
             if self.event_bus:
                 await self.event_bus.close()
             logger.info("Organization microservice shutdown completed")
@@ -208,6 +215,19 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to subscribe to events: {e}")
 
+        # Every replica drops its in-process user-context entries on
+        # membership/organization changes, so each needs its own copy of the
+        # events. A core subscription leaves no JetStream consumer behind
+        # when the replica goes away; a missed event is bounded by the
+        # cache's local TTL.
+        try:
+            await organization_microservice.event_bus.subscribe_ephemeral(
+                pattern="organization_service.organization.>",
+                handler=organization_microservice.organization_service.context_cache.handle_event,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to subscribe user-context invalidation: {e}")
+
     # Register with Consul
     logger.info("Service discovery via Consul agent sidecar")
 
@@ -222,6 +242,7 @@ async def lifespan(app: FastAPI):
         app.state.consul_registry.deregister()
 
     await organization_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -576,6 +597,91 @@ async def get_organization_members(
         )
 
 
+# Bulk routes are declared before /members/{member_user_id} so that "bulk" is
+# not matched as a member user ID
+
+
+@app.post(
+    "/api/v1/organization/organizations/{organization_id}/members/bulk",
+    response_model=OrganizationMemberBulkResponse,
+)
+async def bulk_add_organization_members(
+    organization_id: str = Path(..., description="组织ID"),
+    request: OrganizationMemberBulkAddRequest = ...,
+    user_id: str = Depends(require_auth_or_internal_service),
+    service: OrganizationService = Depends(get_organization_service),
+):
+    """批量添加组织成员"""
+    try:
+        return await service.bulk_add_organization_members(
+            organization_id, request, user_id
+        )
+    except OrganizationNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except OrganizationAccessDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except OrganizationValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except OrganizationServiceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@app.put(
+    "/api/v1/organization/organizations/{organization_id}/members/bulk",
+    response_model=OrganizationMemberBulkResponse,
+)
+async def bulk_update_organization_members(
+    organization_id: str = Path(..., description="组织ID"),
+    request: OrganizationMemberBulkUpdateRequest = ...,
+    user_id: str = Depends(require_auth_or_internal_service),
+    service: OrganizationService = Depends(get_organization_service),
+):
+    """批量更新组织成员"""
+    try:
+        return await service.bulk_update_organization_members(
+            organization_id, request, user_id
+        )
+    except OrganizationNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except OrganizationAccessDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except OrganizationValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except OrganizationServiceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@app.post(
+    "/api/v1/organization/organizations/{organization_id}/members/bulk-remove",
+    response_model=OrganizationMemberBulkResponse,
+)
+async def bulk_remove_organization_members(
+    organization_id: str = Path(..., description="组织ID"),
+    request: OrganizationMemberBulkRemoveRequest = ...,
+    user_id: str = Depends(require_auth_or_internal_service),
+    service: OrganizationService = Depends(get_organization_service),
+):
+    """批量移除组织成员"""
+    try:
+        return await service.bulk_remove_organization_members(
+            organization_id, request, user_id
+        )
+    except OrganizationNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except OrganizationAccessDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except OrganizationValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except OrganizationServiceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
 @app.put(
     "/api/v1/organization/organizations/{organization_id}/members/{member_user_id}",
     response_model=OrganizationMemberResponse,
@@ -746,13 +852,18 @@ async def list_all_organizations(
     search: Optional[str] = Query(None, description="搜索关键词"),
     plan: Optional[str] = Query(None, description="计划过滤"),
     status: Optional[str] = Query(None, description="状态过滤"),
+    cursor: Optional[str] = Query(None, description="上一页的 next_cursor (keyset 翻页)"),
     user_id: str = Depends(require_auth_or_internal_service),
     service: OrganizationService = Depends(get_organization_service),
 ):
     """获取所有组织列表（平台管理员）"""
     try:
         # TODO: 验证用户是否是平台管理员
-        return await service.list_all_organizations(limit, offset, search, plan, status)
+        return await service.list_all_organizations(
+            limit, offset, search, plan, status, cursor=cursor
+        )
+    except OrganizationValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except OrganizationServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -0,0 +1,17 @@
+-- Organization Service Migration: Trigram indexes for organization search
+-- Version: 005
+-- Date: 2026-10-18
+-- Description: Serve name/display_name substring search (core.text_search)
+--              from pg_trgm GIN indexes, and back keyset pagination of the
+--              organization listing
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_organizations_name_trgm
+    ON organization.organizations USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_organizations_display_name_trgm
+    ON organization.organizations USING gin (display_name gin_trgm_ops);
+
+-- Keyset pagination: ORDER BY created_at DESC, organization_id DESC
+CREATE INDEX IF NOT EXISTS idx_organizations_created_at_id
+    ON organization.organizations (created_at DESC, organization_id DESC);
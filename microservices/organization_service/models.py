@@ -135,6 +135,51 @@ class OrganizationMemberUpdateRequest(BaseModel):
         return v
 
 
+# Bulk member operations. Rows are validated one by one in the service so a
+# bad row is reported in ``errors`` instead of failing the whole batch; the
+# item models therefore take ``role`` as a plain string without validators.
+MAX_BULK_MEMBERS = 5000
+
+
+class BulkMemberAddItem(BaseModel):
+    """批量添加中的一行"""
+
+    user_id: str = Field(..., min_length=1, description="用户ID")
+    role: str = Field(default="member", description="成员角色")
+    permissions: Optional[List[str]] = Field(default=None, description="自定义权限")
+
+
+class BulkMemberUpdateItem(BaseModel):
+    """批量更新中的一行（None 表示不修改）"""
+
+    user_id: str = Field(..., min_length=1, description="用户ID")
+    role: Optional[str] = None
+    status: Optional[MemberStatus] = None
+    permissions: Optional[List[str]] = None
+
+
+class OrganizationMemberBulkAddRequest(BaseModel):
+    """批量添加组织成员请求"""
+
+    members: List[BulkMemberAddItem] = Field(
+        ..., min_length=1, max_length=MAX_BULK_MEMBERS
+    )
+
+
+class OrganizationMemberBulkUpdateRequest(BaseModel):
+    """批量更新组织成员请求"""
+
+    members: List[BulkMemberUpdateItem] = Field(
+        ..., min_length=1, max_length=MAX_BULK_MEMBERS
+    )
+
+
+class OrganizationMemberBulkRemoveRequest(BaseModel):
+    """批量移除组织成员请求"""
+
+    user_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_MEMBERS)
+
+
 class OrganizationSwitchRequest(BaseModel):
     """切换组织上下文请求"""
 
@@ -178,6 +223,24 @@ class OrganizationMemberResponse(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class BulkMemberError(BaseModel):
+    """批量操作中失败的一行"""
+
+    index: int = Field(..., description="请求中的行号（从0开始）")
+    user_id: Optional[str] = None
+    error: str
+
+
+class OrganizationMemberBulkResponse(BaseModel):
+    """批量成员操作结果"""
+
+    organization_id: str
+    operation: str  # "add" / "update" / "remove"
+    requested: int
+    succeeded: List[str] = Field(default_factory=list)
+    errors: List[BulkMemberError] = Field(default_factory=list)
+
+
 class OrganizationListResponse(BaseModel):
     """组织列表响应"""
 
@@ -185,6 +248,7 @@ class OrganizationListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None  # 传回 cursor 获取下一页 (keyset)
 
 
 class OrganizationMemberListResponse(BaseModel):
@@ -4,6 +4,7 @@ Organization Repository
 组织数据访问层，负责所有数据库操作
 """
 
+import json
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
@@ -18,6 +19,7 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.text_search import InvalidCursorError, Keyset, TextSearch
 from .models import (
     OrganizationPlan,
     OrganizationStatus,
@@ -47,6 +49,9 @@ logger = logging.getLogger(__name__)
 class OrganizationRepository:
     """组织数据仓库"""
 
+    # 管理员组织列表按 (created_at, organization_id) keyset 翻页
+    _listing_keyset = Keyset(("created_at", "organization_id"))
+
     def __init__(self, config: Optional[ConfigManager] = None):
         # 使用 config_manager 进行服务发现
         if config is None:
@@ -540,6 +545,124 @@ class OrganizationRepository:
             )
             return False
 
+    # ============ Bulk Member Operations ============
+    # 批量操作使用集合 SQL（jsonb_to_recordset / ANY），每批一条语句；
+    # 出错时抛出异常，由服务层整体报告失败
+
+    async def get_members_by_user_ids(
+        self, organization_id: str, user_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """批量获取成员关系（任意状态），按 user_id 索引"""
+        if not user_ids:
+            return {}
+        query = f"""
+            SELECT user_id, role, status, permissions
+            FROM {self.schema}.{self.org_members_table}
+            WHERE organization_id = $1 AND user_id = ANY($2::text[])
+        """
+        async with self.db:
+            result = await self.db.query(
+                query, [organization_id, list(user_ids)], schema=self.schema
+            )
+        return {row["user_id"]: row for row in result or []}
+
+    async def bulk_add_organization_members(
+        self, organization_id: str, members: List[Dict[str, Any]]
+    ) -> List[str]:
+        """批量添加成员；已移除的成员重新激活，活跃成员保持不变。返回成功的 user_id"""
+        if not members:
+            return []
+        rows = [
+            {
+                "user_id": m["user_id"],
+                "role": m["role"],
+                "permissions": m.get("permissions") or [],
+            }
+            for m in members
+        ]
+        query = f"""
+            INSERT INTO {self.schema}.{self.org_members_table} AS m
+                (organization_id, user_id, role, status, permissions)
+            SELECT $1, v.user_id, v.role, $3, COALESCE(v.permissions, '[]'::jsonb)
+            FROM jsonb_to_recordset($2::jsonb) AS v(user_id text, role text, permissions jsonb)
+            ON CONFLICT (organization_id, user_id) DO UPDATE
+                SET role = EXCLUDED.role,
+                    status = EXCLUDED.status,
+                    permissions = EXCLUDED.permissions,
+                    updated_at = NOW()
+                WHERE m.status = $4
+            RETURNING m.user_id
+        """
+        async with self.db:
+            result = await self.db.query(
+                query,
+                [
+                    organization_id,
+                    json.dumps(rows),
+                    MemberStatus.ACTIVE.value,
+                    MemberStatus.INACTIVE.value,
+                ],
+                schema=self.schema,
+            )
+        return [row["user_id"] for row in result or []]
+
+    async def bulk_update_organization_members(
+        self, organization_id: str, members: List[Dict[str, Any]]
+    ) -> List[str]:
+        """批量更新成员角色/状态/权限（None 字段不修改）。返回成功的 user_id"""
+        if not members:
+            return []
+        rows = [
+            {
+                "user_id": m["user_id"],
+                "role": m.get("role"),
+                "status": m.get("status"),
+                "permissions": m.get("permissions"),
+            }
+            for m in members
+        ]
+        query = f"""
+            UPDATE {self.schema}.{self.org_members_table} AS m
+            SET role = COALESCE(v.role, m.role),
+                status = COALESCE(v.status, m.status),
+                permissions = COALESCE(v.permissions, m.permissions),
+                updated_at = NOW()
+            FROM jsonb_to_recordset($2::jsonb)
+                AS v(user_id text, role text, status text, permissions jsonb)
+            WHERE m.organization_id = $1 AND m.user_id = v.user_id
+            RETURNING m.user_id
+        """
+        async with self.db:
+            result = await self.db.query(
+                query, [organization_id, json.dumps(rows)], schema=self.schema
+            )
+        return [row["user_id"] for row in result or []]
+
+    async def bulk_remove_organization_members(
+        self, organization_id: str, user_ids: List[str]
+    ) -> List[str]:
+        """批量移除成员（软删除）。返回成功的 user_id"""
+        if not user_ids:
+            return []
+        query = f"""
+            UPDATE {self.schema}.{self.org_members_table}
+            SET status = $3, updated_at = NOW()
+            WHERE organization_id = $1 AND user_id = ANY($2::text[]) AND status = $4
+            RETURNING user_id
+        """
+        async with self.db:
+            result = await self.db.query(
+                query,
+                [
+                    organization_id,
+                    list(user_ids),
+                    MemberStatus.INACTIVE.value,
+                    MemberStatus.ACTIVE.value,
+                ],
+                schema=self.schema,
+            )
+        return [row["user_id"] for row in result or []]
+
     async def get_organization_member(
         self, organization_id: str, user_id: str
     ) -> Optional[OrganizationMemberResponse]:
@@ -662,6 +785,33 @@ class OrganizationRepository:
             )
             return None
 
+    async def get_user_memberships(self, user_id: str) -> List[Dict[str, Any]]:
+        """获取用户的全部成员关系（任意状态，按加入时间排序）"""
+        try:
+            query = f"""
+                SELECT organization_id, role, permissions, status
+                FROM {self.schema}.{self.org_members_table}
+                WHERE user_id = $1
+                ORDER BY joined_at ASC, organization_id ASC
+            """
+
+            async with self.db:
+                result = await self.db.query(query, [user_id], schema=self.schema)
+
+            return [
+                {
+                    "organization_id": member["organization_id"],
+                    "role": member["role"],
+                    "permissions": member.get("permissions") or [],
+                    "status": member["status"],
+                }
+                for member in result or []
+            ]
+
+        except Exception as e:
+            logger.error(f"Error getting memberships for user {user_id}: {e}")
+            raise
+
     async def get_organization_member_count(self, organization_id: str) -> int:
         """获取组织成员数量"""
         try:
@@ -730,41 +880,42 @@ class OrganizationRepository:
         search: Optional[str] = None,
         plan_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[OrganizationResponse]:
-        """获取所有组织列表（平台管理员）"""
+        """获取所有组织列表（平台管理员）; 传入 cursor 时按 keyset 翻页并忽略 offset"""
         try:
             # 构建查询条件
             conditions = []
             params = []
-            param_count = 0
 
             if search:
-                param_count += 1
+                # pg_trgm GIN 索引支持的子串/前缀匹配
                 conditions.append(
-                    f"(name ILIKE ${param_count} OR display_name ILIKE ${param_count})"
+                    TextSearch(("name", "display_name"), search).bind(params).condition
                 )
-                params.append(f"%{search}%")
 
             if plan_filter:
-                param_count += 1
-                conditions.append(f"plan = ${param_count}")
                 params.append(plan_filter)
+                conditions.append(f"plan = ${len(params)}")
 
             if status_filter:
-                param_count += 1
-                conditions.append(f"status = ${param_count}")
                 params.append(status_filter)
+                conditions.append(f"status = ${len(params)}")
             else:
-                param_count += 1
-                conditions.append(f"status != ${param_count}")
                 params.append(OrganizationStatus.DELETED.value)
+                conditions.append(f"status != ${len(params)}")
+
+            after = self._listing_keyset.after(cursor, params)
+            if after:
+                conditions.append(after)
+                offset = 0
 
             where_clause = " AND ".join(conditions) if conditions else "1=1"
             query = f"""
                 SELECT * FROM {self.schema}.{self.organizations_table}
                 WHERE {where_clause}
-                ORDER BY created_at DESC
-                LIMIT {limit} OFFSET {offset}
+                ORDER BY {self._listing_keyset.order_by}
+                LIMIT {int(limit)} OFFSET {int(offset)}
             """
 
             async with self.db:
@@ -782,6 +933,12 @@ class OrganizationRepository:
 
             return organizations
 
+        except InvalidCursorError:
+            raise
         except Exception as e:
             logger.error(f"Error listing all organizations: {e}")
             return []
+
+    def listing_cursor(self, organization: OrganizationResponse) -> str:
+        """list_all_organizations 下一页的 cursor"""
+        return self._listing_keyset.cursor_for(organization)
@@ -9,18 +9,25 @@ Uses dependency injection for testability:
 """
 
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from datetime import datetime, timezone
 
+from core.text_search import InvalidCursorError
+
 # Import protocols (no I/O dependencies) - NOT the concrete repository!
 from .protocols import (
     OrganizationRepositoryProtocol,
 )
 from .models import (
+    BulkMemberError,
     OrganizationCreateRequest,
     OrganizationUpdateRequest,
     OrganizationMemberAddRequest,
     OrganizationMemberUpdateRequest,
+    OrganizationMemberBulkAddRequest,
+    OrganizationMemberBulkUpdateRequest,
+    OrganizationMemberBulkRemoveRequest,
+    OrganizationMemberBulkResponse,
     OrganizationResponse,
     OrganizationMemberResponse,
     OrganizationListResponse,
@@ -29,6 +36,7 @@ from .models import (
     OrganizationStatsResponse,
     OrganizationUsageResponse,
     OrganizationRole,
+    OrganizationStatus,
     MemberStatus,
 )
 from .role_validator import (
@@ -38,6 +46,7 @@ from .role_validator import (
     sorted_valid_roles,
     violated_assignment_rule,
 )
+from .user_context_cache import UserContextCache
 
 # Import event bus components
 from core.nats_client import Event
@@ -86,6 +95,7 @@ class OrganizationService:
         repository: Optional[OrganizationRepositoryProtocol] = None,
         event_bus=None,
         account_client=None,
+        context_cache: Optional[UserContextCache] = None,
     ):
         """
         Initialize service with injected dependencies.
@@ -94,10 +104,12 @@ class OrganizationService:
             repository: Repository (inject mock for testing)
             event_bus: Event bus for publishing events
             account_client: Account service client for user validation
+            context_cache: User context cache (in-process + Redis)
         """
         self.repository = repository  # Will be set by factory if None
         self.event_bus = event_bus
         self.account_client = account_client
+        self.context_cache = context_cache or UserContextCache()
 
     # ============ Organization Management ============
 
@@ -204,6 +216,8 @@ class OrganizationService:
                     f"Organization {organization_id} not found"
                 )
 
+            await self.context_cache.invalidate_organization(organization_id)
+
             # Publish organization.updated event
             if self.event_bus:
                 try:
@@ -257,6 +271,8 @@ class OrganizationService:
             success = await self.repository.delete_organization(organization_id)
 
             if success:
+                await self.context_cache.invalidate_organization(organization_id)
+
                 # Publish organization.deleted event
                 if self.event_bus:
                     try:
@@ -461,6 +477,8 @@ class OrganizationService:
             if not member:
                 raise OrganizationServiceError("Failed to add member")
 
+            await self.context_cache.invalidate_user(request.user_id)
+
             logger.info(
                 f"Member {request.user_id} added to organization {organization_id} with role {request.role}"
             )
@@ -602,9 +620,34 @@ class OrganizationService:
             if not member:
                 raise OrganizationServiceError("Failed to update member")
 
+            await self.context_cache.invalidate_user(member_user_id)
+
             logger.info(
                 f"Member {member_user_id} updated in organization {organization_id}"
             )
+
+            # Publish organization.member_updated event
+            if self.event_bus:
+                try:
+                    event = Event(
+                        event_type="organization.member_updated",
+                        source="organization_service",
+                        data={
+                            "organization_id": organization_id,
+                            "user_id": member_user_id,
+                            "updated_by": requesting_user_id,
+                            "updated_fields": list(
+                                request.model_dump(exclude_none=True).keys()
+                            ),
+                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                        },
+                    )
+                    await self.event_bus.publish_event(event)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to publish organization.member_updated event: {e}"
+                    )
+
             return member
 
         except Exception as e:
@@ -666,6 +709,7 @@ class OrganizationService:
             )
 
             if success:
+                await self.context_cache.invalidate_user(member_user_id)
                 logger.info(
                     f"Member {member_user_id} removed from organization {organization_id}"
                 )
@@ -766,37 +810,442 @@ class OrganizationService:
                 f"Failed to get organization members: {str(e)}"
             )
 
+    # ============ Bulk Member Management ============
+    # 批量接口：调用者角色只查一次，行级校验在内存中完成，写入为一条集合
+    # SQL，每批只发布一个聚合事件；单行失败记录在 errors 中，不影响其他行
+
+    async def _require_bulk_admin(
+        self, organization_id: str, requesting_user_id: str
+    ) -> str:
+        """校验调用者为活跃的 owner/admin，返回其角色"""
+        role_data = await self.repository.get_user_organization_role(
+            organization_id, requesting_user_id
+        )
+        role = role_data.get("role") if role_data else None
+        if (
+            role_data is None
+            or role_data.get("status") != MemberStatus.ACTIVE.value
+            or role not in ("owner", "admin")
+        ):
+            raise OrganizationAccessDeniedError(
+                f"User {requesting_user_id} does not have admin access"
+            )
+        return role
+
+    @staticmethod
+    def _bulk_role_error(assigner_role: str, target_role: str) -> Optional[str]:
+        """角色分配规则（同 _enforce_role_assignment），返回错误信息或 None"""
+        if not is_valid_org_role(target_role):
+            return (
+                f"Invalid org role '{target_role}'. Valid roles: "
+                f"{', '.join(sorted_valid_roles())}"
+            )
+        if not can_assign_org_role(assigner_role, target_role):
+            rule = violated_assignment_rule(assigner_role, target_role)
+            return (
+                f"Role '{assigner_role}' cannot assign role '{target_role}' "
+                f"(rule: {rule})"
+            )
+        return None
+
+    async def _publish_bulk_member_event(
+        self,
+        event_type: str,
+        organization_id: str,
+        requesting_user_id: str,
+        user_ids: List[str],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """使缓存失效并发布一个聚合事件"""
+        if not user_ids:
+            return
+        await self.context_cache.invalidate_users(user_ids)
+        if not self.event_bus:
+            return
+        try:
+            event = Event(
+                event_type=event_type,
+                source="organization_service",
+                data={
+                    "organization_id": organization_id,
+                    "user_ids": user_ids,
+                    "count": len(user_ids),
+                    "actor_user_id": requesting_user_id,
+                    **(extra or {}),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+            await self.event_bus.publish_event(event)
+        except Exception as e:
+            logger.error(f"Failed to publish {event_type} event: {e}")
+
+    @staticmethod
+    def _bulk_response(
+        organization_id: str,
+        operation: str,
+        requested: int,
+        succeeded: List[str],
+        errors: List[BulkMemberError],
+    ) -> OrganizationMemberBulkResponse:
+        return OrganizationMemberBulkResponse(
+            organization_id=organization_id,
+            operation=operation,
+            requested=requested,
+            succeeded=succeeded,
+            errors=sorted(errors, key=lambda e: e.index),
+        )
+
+    async def bulk_add_organization_members(
+        self,
+        organization_id: str,
+        request: OrganizationMemberBulkAddRequest,
+        requesting_user_id: str,
+    ) -> OrganizationMemberBulkResponse:
+        """批量添加组织成员（需要管理员权限）"""
+        try:
+            assigner_role = await self._require_bulk_admin(
+                organization_id, requesting_user_id
+            )
+            existing = await self.repository.get_members_by_user_ids(
+                organization_id, [item.user_id for item in request.members]
+            )
+
+            errors: List[BulkMemberError] = []
+            rows: List[Dict[str, Any]] = []
+            seen = set()
+            for index, item in enumerate(request.members):
+                if item.user_id in seen:
+                    error = "Duplicate user_id in request"
+                elif item.role == OrganizationRole.OWNER.value:
+                    error = "Cannot directly add owner role"
+                else:
+                    error = self._bulk_role_error(assigner_role, item.role)
+                if error is None and item.user_id in existing:
+                    if existing[item.user_id]["status"] != MemberStatus.INACTIVE.value:
+                        error = "User is already a member of the organization"
+                seen.add(item.user_id)
+                if error:
+                    errors.append(
+                        BulkMemberError(index=index, user_id=item.user_id, error=error)
+                    )
+                    continue
+                rows.append(
+                    {
+                        "index": index,
+                        "user_id": item.user_id,
+                        "role": item.role,
+                        "permissions": item.permissions or [],
+                    }
+                )
+
+            written = set(
+                await self.repository.bulk_add_organization_members(
+                    organization_id, rows
+                )
+            )
+            succeeded = []
+            for row in rows:
+                if row["user_id"] in written:
+                    succeeded.append(row["user_id"])
+                else:
+                    # Became a member between the lookup and the write
+                    errors.append(
+                        BulkMemberError(
+                            index=row["index"],
+                            user_id=row["user_id"],
+                            error="User is already a member of the organization",
+                        )
+                    )
+
+            logger.info(
+                f"Bulk add to organization {organization_id}: "
+                f"{len(succeeded)} added, {len(errors)} failed"
+            )
+            await self._publish_bulk_member_event(
+                "organization.members_bulk_added",
+                organization_id,
+                requesting_user_id,
+                succeeded,
+                {
+                    "members": [
+                        {"user_id": row["user_id"], "role": row["role"]}
+                        for row in rows
+                        if row["user_id"] in written
+                    ]
+                },
+            )
+            return self._bulk_response(
+                organization_id, "add", len(request.members), succeeded, errors
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Error bulk adding members to organization {organization_id}: {e}"
+            )
+            if isinstance(e, OrganizationServiceError):
+                raise
+            raise OrganizationServiceError(f"Failed to add members: {str(e)}")
+
+    async def bulk_update_organization_members(
+        self,
+        organization_id: str,
+        request: OrganizationMemberBulkUpdateRequest,
+        requesting_user_id: str,
+    ) -> OrganizationMemberBulkResponse:
+        """批量更新组织成员（需要管理员权限）"""
+        try:
+            assigner_role = await self._require_bulk_admin(
+                organization_id, requesting_user_id
+            )
+            existing = await self.repository.get_members_by_user_ids(
+                organization_id, [item.user_id for item in request.members]
+            )
+
+            errors: List[BulkMemberError] = []
+            rows: List[Dict[str, Any]] = []
+            seen = set()
+            for index, item in enumerate(request.members):
+                current = existing.get(item.user_id)
+                if item.user_id in seen:
+                    error = "Duplicate user_id in request"
+                elif current is None:
+                    error = "Member not found in organization"
+                elif assigner_role == "admin" and current["role"] in ("owner", "admin"):
+                    error = (
+                        "Admins cannot modify owners or other admins "
+                        f"(rule: {RoleAssignmentRule.ADMIN_CANNOT_ASSIGN_ADMIN_OR_OWNER})"
+                    )
+                elif item.role is not None:
+                    error = self._bulk_role_error(assigner_role, item.role)
+                else:
+                    error = None
+                seen.add(item.user_id)
+                if error:
+                    errors.append(
+                        BulkMemberError(index=index, user_id=item.user_id, error=error)
+                    )
+                    continue
+                rows.append(
+                    {
+                        "index": index,
+                        "user_id": item.user_id,
+                        "old_role": current["role"],
+                        "role": item.role,
+                        "status": item.status.value if item.status else None,
+                        "permissions": item.permissions,
+                    }
+                )
+
+            written = set(
+                await self.repository.bulk_update_organization_members(
+                    organization_id, rows
+                )
+            )
+            succeeded = []
+            for row in rows:
+                if row["user_id"] in written:
+                    succeeded.append(row["user_id"])
+                else:
+                    errors.append(
+                        BulkMemberError(
+                            index=row["index"],
+                            user_id=row["user_id"],
+                            error="Member not found in organization",
+                        )
+                    )
+
+            logger.info(
+                f"Bulk update in organization {organization_id}: "
+                f"{len(succeeded)} updated, {len(errors)} failed"
+            )
+            await self._publish_bulk_member_event(
+                "organization.members_bulk_updated",
+                organization_id,
+                requesting_user_id,
+                succeeded,
+                {
+                    "role_changes": [
+                        {
+                            "user_id": row["user_id"],
+                            "old_role": row["old_role"],
+                            "new_role": row["role"],
+                        }
+                        for row in rows
+                        if row["user_id"] in written
+                        and row["role"] is not None
+                        and row["role"] != row["old_role"]
+                    ]
+                },
+            )
+            return self._bulk_response(
+                organization_id, "update", len(request.members), succeeded, errors
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Error bulk updating members in organization {organization_id}: {e}"
+            )
+            if isinstance(e, OrganizationServiceError):
+                raise
+            raise OrganizationServiceError(f"Failed to update members: {str(e)}")
+
+    async def bulk_remove_organization_members(
+        self,
+        organization_id: str,
+        request: OrganizationMemberBulkRemoveRequest,
+        requesting_user_id: str,
+    ) -> OrganizationMemberBulkResponse:
+        """批量移除组织成员（需要管理员权限）"""
+        try:
+            assigner_role = await self._require_bulk_admin(
+                organization_id, requesting_user_id
+            )
+            existing = await self.repository.get_members_by_user_ids(
+                organization_id, request.user_ids
+            )
+
+            remaining_owners = None
+            errors: List[BulkMemberError] = []
+            to_remove: List[Dict[str, Any]] = []
+            seen = set()
+            for index, user_id in enumerate(request.user_ids):
+                current = existing.get(user_id)
+                error = None
+                if user_id in seen:
+                    error = "Duplicate user_id in request"
+                elif current is None or current["status"] != MemberStatus.ACTIVE.value:
+                    error = "Member not found in organization"
+                elif assigner_role == "admin" and current["role"] in ("owner", "admin"):
+                    error = "Admins cannot remove owners or other admins"
+                elif current["role"] == "owner":
+                    # 不能移除最后一个所有者
+                    if remaining_owners is None:
+                        remaining_owners = len(
+                            await self.repository.get_organization_members(
+                                organization_id, role_filter=OrganizationRole.OWNER
+                            )
+                        )
+                    if remaining_owners <= 1:
+                        error = "Cannot remove the last owner from organization"
+                    else:
+                        remaining_owners -= 1
+                seen.add(user_id)
+                if error:
+                    errors.append(
+                        BulkMemberError(index=index, user_id=user_id, error=error)
+                    )
+                    continue
+                to_remove.append({"index": index, "user_id": user_id})
+
+            removed = set(
+                await self.repository.bulk_remove_organization_members(
+                    organization_id, [row["user_id"] for row in to_remove]
+                )
+            )
+            succeeded = []
+            for row in to_remove:
+                if row["user_id"] in removed:
+                    succeeded.append(row["user_id"])
+                else:
+                    errors.append(
+                        BulkMemberError(
+                            index=row["index"],
+                            user_id=row["user_id"],
+                            error="Member not found in organization",
+                        )
+                    )
+
+            logger.info(
+                f"Bulk remove from organization {organization_id}: "
+                f"{len(succeeded)} removed, {len(errors)} failed"
+            )
+            await self._publish_bulk_member_event(
+                "organization.members_bulk_removed",
+                organization_id,
+                requesting_user_id,
+                succeeded,
+                {
+                    "members": [
+                        {"user_id": user_id, "role": existing[user_id]["role"]}
+                        for user_id in succeeded
+                    ]
+                },
+            )
+            return self._bulk_response(
+                organization_id, "remove", len(request.user_ids), succeeded, errors
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Error bulk removing members from organization {organization_id}: {e}"
+            )
+            if isinstance(e, OrganizationServiceError):
+                raise
+            raise OrganizationServiceError(f"Failed to remove members: {str(e)}")
+
     # ============ Context Switching ============
 
+    async def _get_user_memberships(self, user_id: str) -> List[Dict[str, Any]]:
+        """获取用户成员关系（经缓存）"""
+        return await self.context_cache.get_memberships(
+            user_id, lambda: self.repository.get_user_memberships(user_id)
+        )
+
+    async def _get_context_organization(
+        self, organization_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """获取上下文所需的组织字段（经缓存）"""
+
+        async def load() -> Optional[Dict[str, Any]]:
+            org = await self.repository.get_organization(organization_id)
+            if not org:
+                return None
+            # JSON-safe so the in-process and Redis tiers hold the same value
+            return {
+                "name": org.name,
+                "status": getattr(org.status, "value", org.status),
+                "credits_pool": (
+                    str(org.credits_pool) if org.credits_pool is not None else None
+                ),
+            }
+
+        return await self.context_cache.get_organization(organization_id, load)
+
+    def _organization_context(
+        self, membership: Dict[str, Any], org: Dict[str, Any]
+    ) -> OrganizationContextResponse:
+        return OrganizationContextResponse(
+            context_type="organization",
+            organization_id=membership["organization_id"],
+            organization_name=org["name"],
+            user_role=OrganizationRole(membership["role"]),
+            permissions=membership.get("permissions") or [],
+            credits_available=org.get("credits_pool"),
+        )
+
+    @staticmethod
+    def _individual_context() -> OrganizationContextResponse:
+        return OrganizationContextResponse(
+            context_type="individual",
+            organization_id=None,
+            organization_name=None,
+            user_role=None,
+            permissions=[],
+            credits_available=None,
+        )
+
     async def get_user_context(self, user_id: str) -> OrganizationContextResponse:
         """Get the user's current organization context (first org they belong to, or individual)."""
         try:
-            organizations_data = await self.repository.get_user_organizations(user_id)
-            if organizations_data:
-                org = organizations_data[0]
-                org_id = org.get("organization_id") or org.get("id")
-                role_data = await self.repository.get_user_organization_role(
-                    org_id, user_id
-                )
-                return OrganizationContextResponse(
-                    context_type="organization",
-                    organization_id=org_id,
-                    organization_name=org.get("name"),
-                    user_role=OrganizationRole(role_data["role"])
-                    if role_data
-                    else None,
-                    permissions=role_data.get("permissions", []) if role_data else [],
-                    credits_available=org.get("credits_pool"),
-                )
-            else:
-                return OrganizationContextResponse(
-                    context_type="individual",
-                    organization_id=None,
-                    organization_name=None,
-                    user_role=None,
-                    permissions=[],
-                    credits_available=None,
+            for membership in await self._get_user_memberships(user_id):
+                if membership["status"] != MemberStatus.ACTIVE.value:
+                    continue
+                org = await self._get_context_organization(
+                    membership["organization_id"]
                 )
+                if org and org["status"] != OrganizationStatus.DELETED.value:
+                    return self._organization_context(membership, org)
+            return self._individual_context()
         except Exception as e:
             logger.error(f"Error getting context for user {user_id}: {e}")
             if isinstance(e, OrganizationServiceError):
@@ -810,41 +1259,32 @@ class OrganizationService:
         try:
             if organization_id:
                 # 切换到组织上下文
-                role_data = await self.repository.get_user_organization_role(
-                    organization_id, user_id
+                membership = next(
+                    (
+                        m
+                        for m in await self._get_user_memberships(user_id)
+                        if m["organization_id"] == organization_id
+                    ),
+                    None,
                 )
-                if not role_data:
+                if not membership:
                     raise OrganizationAccessDeniedError(
                         f"User is not a member of organization {organization_id}"
                     )
 
-                if role_data["status"] != MemberStatus.ACTIVE.value:
+                if membership["status"] != MemberStatus.ACTIVE.value:
                     raise OrganizationAccessDeniedError("User membership is not active")
 
-                org = await self.repository.get_organization(organization_id)
+                org = await self._get_context_organization(organization_id)
                 if not org:
                     raise OrganizationNotFoundError(
                         f"Organization {organization_id} not found"
                     )
 
-                return OrganizationContextResponse(
-                    context_type="organization",
-                    organization_id=organization_id,
-                    organization_name=org.name,
-                    user_role=OrganizationRole(role_data["role"]),
-                    permissions=role_data["permissions"],
-                    credits_available=org.credits_pool,
-                )
+                return self._organization_context(membership, org)
             else:
                 # 切换到个人上下文
-                return OrganizationContextResponse(
-                    context_type="individual",
-                    organization_id=None,
-                    organization_name=None,
-                    user_role=None,
-                    permissions=[],
-                    credits_available=None,
-                )
+                return self._individual_context()
 
         except Exception as e:
             logger.error(f"Error switching context for user {user_id}: {e}")
@@ -976,11 +1416,12 @@ class OrganizationService:
         search: Optional[str] = None,
         plan_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> OrganizationListResponse:
         """获取所有组织列表（平台管理员）"""
         try:
             organizations = await self.repository.list_all_organizations(
-                limit, offset, search, plan_filter, status_filter
+                limit, offset, search, plan_filter, status_filter, cursor=cursor
             )
 
             return OrganizationListResponse(
@@ -988,8 +1429,15 @@ class OrganizationService:
                 total=len(organizations),
                 limit=limit,
                 offset=offset,
+                next_cursor=(
+                    self.repository.listing_cursor(organizations[-1])
+                    if len(organizations) == limit
+                    else None
+                ),
             )
 
+        except InvalidCursorError as e:
+            raise OrganizationValidationError(str(e))
         except Exception as e:
             logger.error(f"Error listing all organizations: {e}")
             raise OrganizationServiceError(f"Failed to list organizations: {str(e)}")
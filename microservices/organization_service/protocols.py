@@ -104,6 +104,30 @@ class OrganizationRepositoryProtocol(Protocol):
         """Remove member from organization"""
         ...
 
+    async def get_members_by_user_ids(
+        self, organization_id: str, user_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get memberships (any status) for many users, keyed by user_id"""
+        ...
+
+    async def bulk_add_organization_members(
+        self, organization_id: str, members: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Insert or reactivate members; returns the user_ids written"""
+        ...
+
+    async def bulk_update_organization_members(
+        self, organization_id: str, members: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Update role/status/permissions of many members; returns user_ids updated"""
+        ...
+
+    async def bulk_remove_organization_members(
+        self, organization_id: str, user_ids: List[str]
+    ) -> List[str]:
+        """Soft-delete active members; returns user_ids removed"""
+        ...
+
     async def get_organization_member(
         self, organization_id: str, user_id: str
     ) -> Optional[OrganizationMemberResponse]:
@@ -127,6 +151,10 @@ class OrganizationRepositoryProtocol(Protocol):
         """Get user role in organization"""
         ...
 
+    async def get_user_memberships(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get all memberships of a user (any status), in join order"""
+        ...
+
     async def get_organization_member_count(self, organization_id: str) -> int:
         """Get organization member count"""
         ...
@@ -141,9 +169,14 @@ class OrganizationRepositoryProtocol(Protocol):
         offset: int = 0,
         search: Optional[str] = None,
         plan_filter: Optional[str] = None,
-        status_filter: Optional[str] = None
+        status_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[OrganizationResponse]:
-        """List all organizations (admin)"""
+        """List all organizations (admin); ``cursor`` pages by keyset"""
+        ...
+
+    def listing_cursor(self, organization: OrganizationResponse) -> str:
+        """Cursor continuing list_all_organizations after ``organization``"""
         ...
 
 
@@ -185,6 +218,12 @@ class FamilySharingRepositoryProtocol(Protocol):
         """Create member permission"""
         ...
 
+    async def create_member_permissions(
+        self, permissions: List[Dict[str, Any]]
+    ) -> int:
+        """Create many member permissions (one insert)"""
+        ...
+
     async def get_member_permission(
         self, sharing_id: str, user_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -201,6 +240,12 @@ class FamilySharingRepositoryProtocol(Protocol):
         """Delete member permission"""
         ...
 
+    async def delete_member_permissions(
+        self, sharing_id: str, user_ids: List[str]
+    ) -> int:
+        """Delete many members' permissions for a sharing (one statement)"""
+        ...
+
     async def delete_sharing_member_permissions(self, sharing_id: str) -> bool:
         """Delete all member permissions for sharing"""
         ...
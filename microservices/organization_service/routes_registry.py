@@ -57,6 +57,18 @@ ORGANIZATION_SERVICE_ROUTES = [
         "auth_required": True,
         "description": "Organization member management"
     },
+    {
+        "path": "/api/v1/organization/organizations/{organization_id}/members/bulk",
+        "methods": ["POST", "PUT"],
+        "auth_required": True,
+        "description": "Bulk add/update organization members"
+    },
+    {
+        "path": "/api/v1/organization/organizations/{organization_id}/members/bulk-remove",
+        "methods": ["POST"],
+        "auth_required": True,
+        "description": "Bulk remove organization members"
+    },
     {
         "path": "/api/v1/organization/organizations/{organization_id}/members/{member_user_id}",
         "methods": ["PUT", "DELETE"],
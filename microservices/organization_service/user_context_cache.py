@@ -0,0 +1,180 @@
+"""
+User Context Cache
+
+Cached organization context for ``get_user_context`` / ``switch_user_context``,
+which most services call on every authenticated request. Two levels keep
+invalidation cheap:
+
+- ``user:{user_id}``: the user's memberships (organization, role, status,
+  permissions) in join order, loaded with one query
+- ``org:{organization_id}``: the organization fields the context needs
+  (name, status, credits pool), shared by every member
+
+A member change therefore drops one user entry and an organization change
+drops one organization entry, however many members it has.
+
+Each level is served from an in-process LRU (short TTL) in front of the
+shared Redis cache from :mod:`core.redis_cache`. The replica making a change
+deletes both tiers directly; other replicas drop their in-process copies when
+the matching ``organization.*`` event arrives (``handle_event``), and the
+local TTL bounds staleness if an event is missed. Without Redis the cache
+runs in-process only.
+
+A fill that loaded from the database before an invalidation must not store
+its (now stale) value afterwards: Redis fills are versioned per key
+(``RedisCache.set_if_version``, bumped on invalidation), and in-process fills
+are skipped when any local invalidation happened while they were loading.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.redis_cache import RedisCache, build_redis_cache
+
+logger = logging.getLogger(__name__)
+
+USER_CONTEXT_REDIS_TTL_SECONDS = 300
+USER_CONTEXT_LOCAL_TTL_SECONDS = 30.0
+
+# Events (published by this service) that change a cached user / organization
+USER_EVENTS = {
+    "organization.member_added",
+    "organization.member_updated",
+    "organization.member_removed",
+}
+BULK_USER_EVENTS = {
+    "organization.members_bulk_added",
+    "organization.members_bulk_updated",
+    "organization.members_bulk_removed",
+}
+ORGANIZATION_EVENTS = {
+    "organization.updated",
+    "organization.deleted",
+}
+
+
+class UserContextCache:
+    """In-process LRU over Redis for user memberships and organization summaries"""
+
+    def __init__(
+        self,
+        redis_cache: Optional[RedisCache] = None,
+        *,
+        local_ttl_seconds: float = USER_CONTEXT_LOCAL_TTL_SECONDS,
+        max_local_entries: int = 10000,
+    ):
+        self._redis: RedisCache = redis_cache or build_redis_cache(
+            "organization:user_context",
+            service_name="organization_service",
+            default_ttl=USER_CONTEXT_REDIS_TTL_SECONDS,
+        )
+        self.local_ttl = local_ttl_seconds
+        self.max_local_entries = max_local_entries
+        # key -> (expires_at, value)
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        # Bumped by every local invalidation; fills started earlier are dropped
+        self._generation = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_memberships(
+        self,
+        user_id: str,
+        loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        """Memberships of ``user_id``; ``loader`` runs on a miss in both tiers"""
+        return await self._get(f"user:{user_id}", loader)
+
+    async def get_organization(
+        self,
+        organization_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Context fields of an organization, or None if it does not exist"""
+        return await self._get(f"org:{organization_id}", loader)
+
+    async def _get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        local = self._local.get(key)
+        if local is not None:
+            if local[0] > time.monotonic():
+                self._local.move_to_end(key)
+                return local[1]
+            del self._local[key]
+
+        generation = self._generation
+        value = await self._redis.get(key)
+        if value is None:
+            version = await self._redis.get_version(key)
+            value = await loader()
+            if value is None:
+                # Nothing to cache (e.g. unknown organization)
+                return None
+            if version is not None:
+                await self._redis.set_if_version(key, value, version)
+        if generation == self._generation:
+            self._remember(key, value)
+        return value
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    async def invalidate_user(self, user_id: str) -> None:
+        """Drop a user's memberships from both tiers (after a member change)"""
+        await self._invalidate(f"user:{user_id}")
+
+    async def invalidate_users(self, user_ids: List[str]) -> None:
+        """Drop many users' memberships (after a bulk member change)"""
+        for start in range(0, len(user_ids), 100):
+            await asyncio.gather(
+                *(
+                    self._invalidate(f"user:{user_id}")
+                    for user_id in user_ids[start : start + 100]
+                )
+            )
+
+    async def invalidate_organization(self, organization_id: str) -> None:
+        """Drop an organization from both tiers (after an organization change)"""
+        await self._invalidate(f"org:{organization_id}")
+
+    async def _invalidate(self, key: str) -> None:
+        self._forget(key)
+        # Bump first so a fill that read the old row cannot store it
+        await self._redis.bump_version(key)
+        await self._redis.delete(key)
+
+    def _forget(self, key: str) -> None:
+        self._generation += 1
+        self._local.pop(key, None)
+
+    async def handle_event(self, event) -> None:
+        """Drop in-process entries changed on another replica
+
+        Redis was already updated by the replica that published the event.
+        """
+        event_type = event.type
+        data = event.data or {}
+        if event_type in USER_EVENTS and data.get("user_id"):
+            self._forget(f"user:{data['user_id']}")
+        elif event_type in BULK_USER_EVENTS:
+            for user_id in data.get("user_ids") or []:
+                self._forget(f"user:{user_id}")
+        elif event_type in ORGANIZATION_EVENTS and data.get("organization_id"):
+            self._forget(f"org:{data['organization_id']}")
+
+    async def close(self) -> None:
+        await self._redis.close()
+
+
+__all__ = ["UserContextCache"]
@@ -26,6 +26,7 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 from .models import (
     UpdateCampaignRequest,
@@ -239,6 +240,7 @@ async def lifespan(app: FastAPI):
 
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {e}")
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -17,6 +17,7 @@ from core.health import HealthCheck
 from core.metrics import setup_metrics
 from core.rate_limit_backend import build_rate_limit_backend
 from core.rate_limiter import RateLimitConfig, RateLimitMiddleware
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .payment_repository import PaymentRepository
@@ -258,6 +259,7 @@ async def lifespan(app: FastAPI):
         await event_bus.close()
 
     logger.info("Payment Service shutting down...")
+    close_discovery_caches()
 
 
 # 创建FastAPI应用
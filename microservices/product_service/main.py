@@ -18,6 +18,7 @@ from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.admin_audit import publish_admin_action
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from .routes_registry import get_routes_for_consul, SERVICE_METADATA
 
 from .product_repository import ProductRepository
@@ -212,6 +213,7 @@ async def lifespan(app: FastAPI):
         if repository:
             await repository.close()
             logger.info("Product service database connections closed")
+    close_discovery_caches()
 
 
 # 创建 FastAPI 应用
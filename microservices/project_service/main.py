@@ -22,6 +22,7 @@ from core.config_manager import ConfigManager
 from core.logger import setup_service_logger
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .models import (
@@ -115,6 +116,7 @@ async def lifespan(app: FastAPI):
     yield
     await shutdown_manager.shutdown_with_timeout()
     logger.info("Project Service shutting down")
+    close_discovery_caches()
 
 
 app = FastAPI(title="Project Service", version="1.0.0", lifespan=lifespan)
@@ -24,6 +24,7 @@ from core.logger import setup_service_logger
 from core.metrics import setup_metrics
 from core.nats_client import get_event_bus
 from core.rate_limiter import InMemoryBackend, RateLimitConfig, SlidingWindowCounter
+from core.discovery_cache import close_discovery_caches
 from isa_common.consul_client import ConsulRegistry
 
 from .factory import create_project_sharing_service
@@ -179,6 +180,7 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
     await project_sharing_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
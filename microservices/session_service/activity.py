@@ -0,0 +1,154 @@
+"""
+Session Activity Coalescer
+
+Turns per-message event publishing into periodic per-session events.
+Streaming agents append many messages per second to one session; publishing
+``session.message_sent`` and ``session.tokens_used`` inline for each of them
+put two NATS round trips on every append.
+
+- ``record`` only buffers the appended messages; it never awaits the bus
+- every ``flush_interval`` seconds each session with new messages gets one
+  ``session.activity`` event carrying those messages (oldest first) and,
+  if any tokens were used, one ``session.tokens_used`` event with the summed
+  tokens and cost
+- a session reaching ``max_batch`` buffered messages is flushed early, so
+  events stay bounded in size
+- ``stop`` flushes whatever is still buffered
+
+Usage:
+    coalescer = SessionActivityCoalescer(event_bus)
+    coalescer.start()
+    coalescer.record(session_id, user_id, messages)
+    await coalescer.stop()
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from core.metrics import create_counter
+
+from .events.publishers import publish_session_activity, publish_session_tokens_used
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = float(os.getenv("SESSION_ACTIVITY_FLUSH_SECONDS", "1.0"))
+DEFAULT_MAX_BATCH = int(os.getenv("SESSION_ACTIVITY_MAX_BATCH", "100"))
+
+SESSION_ACTIVITY_FLUSHES = create_counter(
+    "session_activity_flushes_total",
+    "session.activity events published",
+    ["reason"],
+)
+SESSION_ACTIVITY_MESSAGES = create_counter(
+    "session_activity_messages_total",
+    "Messages coalesced into session.activity events",
+    ["reason"],
+)
+
+
+@dataclass
+class _Pending:
+    user_id: str
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class SessionActivityCoalescer:
+    """Buffers appended messages per session and publishes them periodically"""
+
+    def __init__(
+        self,
+        event_bus,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.event_bus = event_bus
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, max_batch)
+        self._pending: Dict[str, _Pending] = {}
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, session_id: str, user_id: str, messages: List[Any]) -> None:
+        """Buffer messages (SessionMessage or MessageResponse) appended to a session"""
+        pending = self._pending.setdefault(session_id, _Pending(user_id=user_id))
+        for message in messages:
+            created_at = getattr(message, "created_at", None) or datetime.now(
+                timezone.utc
+            )
+            pending.messages.append(
+                {
+                    "message_id": str(message.message_id),
+                    "role": message.role,
+                    "content": message.content,
+                    "message_type": message.message_type or "chat",
+                    "tokens_used": message.tokens_used or 0,
+                    "cost_usd": float(message.cost_usd or 0.0),
+                    "timestamp": created_at,
+                }
+            )
+        if len(pending.messages) >= self.max_batch:
+            self._full.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="session-activity")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and publish anything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush(reason="shutdown")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(
+                        self._full.wait(), timeout=self.flush_interval
+                    )
+                    reason = "batch"
+                except asyncio.TimeoutError:
+                    reason = "interval"
+                await self.flush(reason=reason)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Session activity flush error: {e}", exc_info=True)
+                await asyncio.sleep(self.flush_interval)
+
+    async def flush(self, reason: str = "interval") -> int:
+        """Publish buffered activity; returns the number of sessions flushed"""
+        self._full.clear()
+        pending, self._pending = self._pending, {}
+        for session_id, entry in pending.items():
+            await self._publish(session_id, entry)
+            SESSION_ACTIVITY_FLUSHES.labels(reason=reason).inc()
+            SESSION_ACTIVITY_MESSAGES.labels(reason=reason).inc(len(entry.messages))
+        return len(pending)
+
+    async def _publish(self, session_id: str, entry: _Pending) -> None:
+        await publish_session_activity(
+            self.event_bus,
+            session_id=session_id,
+            user_id=entry.user_id,
+            messages=entry.messages,
+        )
+        tokens = sum(m["tokens_used"] for m in entry.messages)
+        if tokens > 0:
+            await publish_session_tokens_used(
+                self.event_bus,
+                session_id=session_id,
+                user_id=entry.user_id,
+                tokens_used=tokens,
+                cost_usd=sum(m["cost_usd"] for m in entry.messages),
+                message_id=entry.messages[-1]["message_id"],
+            )
+
+
+__all__ = ["SessionActivityCoalescer"]
@@ -7,16 +7,19 @@ Follows the standard event-driven architecture pattern.
 
 from .handlers import SessionEventHandlers
 from .models import (
+    SessionActivityEventData,
     SessionEndedEventData,
     SessionMessageSentEventData,
     SessionStartedEventData,
     SessionTokensUsedEventData,
+    create_session_activity_event_data,
     create_session_ended_event_data,
     create_session_message_sent_event_data,
     create_session_started_event_data,
     create_session_tokens_used_event_data,
 )
 from .publishers import (
+    publish_session_activity,
     publish_session_ended,
     publish_session_message_sent,
     publish_session_started,
@@ -31,13 +34,16 @@ __all__ = [
     "SessionEndedEventData",
     "SessionMessageSentEventData",
     "SessionTokensUsedEventData",
+    "SessionActivityEventData",
     "create_session_started_event_data",
     "create_session_ended_event_data",
     "create_session_message_sent_event_data",
     "create_session_tokens_used_event_data",
+    "create_session_activity_event_data",
     # Publishers
     "publish_session_started",
     "publish_session_ended",
     "publish_session_message_sent",
     "publish_session_tokens_used",
+    "publish_session_activity",
 ]
@@ -6,7 +6,7 @@ Event data models for session lifecycle events.
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -25,6 +25,7 @@ class SessionEventType(str, Enum):
     SESSION_ENDED = "session.ended"
     SESSION_MESSAGE_SENT = "session.message_sent"
     SESSION_TOKENS_USED = "session.tokens_used"
+    SESSION_ACTIVITY = "session.activity"
 
 
 class SessionSubscribedEventType(str, Enum):
@@ -155,6 +156,59 @@ class SessionTokensUsedEventData(BaseModel):
         }
 
 
+class SessionActivityMessage(BaseModel):
+    """A message included in a session.activity event"""
+
+    message_id: str = Field(..., description="Message ID")
+    role: str = Field(..., description="Message role (user/assistant/system)")
+    content: str = Field(..., description="Message content")
+    message_type: str = Field(default="chat", description="Message type")
+    tokens_used: int = Field(default=0, description="Tokens used in this message")
+    cost_usd: float = Field(default=0.0, description="Cost of this message in USD")
+    timestamp: datetime = Field(..., description="When the message was added")
+
+
+class SessionActivityEventData(BaseModel):
+    """
+    Event: session.activity
+    Coalesces the messages appended to a session during one flush interval,
+    replacing a session.message_sent event per message
+    """
+
+    session_id: str = Field(..., description="Session ID")
+    user_id: str = Field(..., description="User ID")
+    message_count: int = Field(..., description="Messages added in this interval")
+    tokens_used: int = Field(default=0, description="Tokens used in this interval")
+    cost_usd: float = Field(default=0.0, description="Cost in USD in this interval")
+    messages: List[SessionActivityMessage] = Field(
+        default_factory=list, description="Messages added, oldest first"
+    )
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "session_id": "session_12345",
+                "user_id": "user_67890",
+                "message_count": 2,
+                "tokens_used": 150,
+                "cost_usd": 0.015,
+                "messages": [
+                    {
+                        "message_id": "msg_98765",
+                        "role": "user",
+                        "content": "Hi",
+                        "message_type": "chat",
+                        "tokens_used": 0,
+                        "cost_usd": 0.0,
+                        "timestamp": "2025-11-16T10:02:00Z",
+                    }
+                ],
+                "timestamp": "2025-11-16T10:02:01Z",
+            }
+        }
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -230,3 +284,20 @@ def create_session_tokens_used_event_data(
         cost_usd=cost_usd,
         message_id=message_id,
     )
+
+
+def create_session_activity_event_data(
+    session_id: str,
+    user_id: str,
+    messages: List[Dict[str, Any]],
+) -> SessionActivityEventData:
+    """Create session activity event data from message dicts"""
+    activity = [SessionActivityMessage(**message) for message in messages]
+    return SessionActivityEventData(
+        session_id=session_id,
+        user_id=user_id,
+        message_count=len(activity),
+        tokens_used=sum(m.tokens_used for m in activity),
+        cost_usd=sum(m.cost_usd for m in activity),
+        messages=activity,
+    )
@@ -6,11 +6,12 @@ Following the standard event-driven architecture pattern.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from core.nats_client import Event
 
 from .models import (
+    create_session_activity_event_data,
     create_session_ended_event_data,
     create_session_message_sent_event_data,
     create_session_started_event_data,
@@ -202,3 +203,41 @@ async def publish_session_tokens_used(
 
     except Exception as e:
         logger.error(f"Failed to publish session.tokens_used: {e}")
+
+
+async def publish_session_activity(
+    event_bus,
+    session_id: str,
+    user_id: str,
+    messages: List[Dict[str, Any]],
+):
+    """
+    Publish session.activity event
+
+    Args:
+        event_bus: NATS event bus instance
+        session_id: Session ID
+        user_id: User ID
+        messages: Messages added since the last activity event, oldest first
+    """
+    try:
+        event_data = create_session_activity_event_data(
+            session_id=session_id,
+            user_id=user_id,
+            messages=messages,
+        )
+
+        event = Event(
+            event_type="session.activity",
+            source="session_service",
+            data=event_data.model_dump(mode="json"),
+        )
+
+        await event_bus.publish_event(event)
+        logger.info(
+            f"Published session.activity for session {session_id} "
+            f"({event_data.message_count} messages, {event_data.tokens_used} tokens)"
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to publish session.activity: {e}")
@@ -46,11 +46,18 @@ def create_session_service(
         from microservices.account_service.client import AccountServiceClient
         account_client = AccountServiceClient()
 
+    # Coalesce per-message events into periodic session.activity events
+    activity_coalescer = None
+    if event_bus is not None:
+        from .activity import SessionActivityCoalescer
+        activity_coalescer = SessionActivityCoalescer(event_bus)
+
     return SessionService(
         session_repo=session_repository,
         message_repo=message_repository,
         event_bus=event_bus,
         account_client=account_client,
+        activity_coalescer=activity_coalescer,
     )
 
 
@@ -24,10 +24,13 @@ from core.nats_client import get_event_bus
 from core.graceful_shutdown import GracefulShutdown, shutdown_middleware
 from core.metrics import setup_metrics
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
 from .models import (
+    MessageBatchCreateRequest,
+    MessageBatchResponse,
     MessageCreateRequest,
     MessageListResponse,
     MessageResponse,
@@ -77,6 +80,8 @@ class SessionMicroservice:
                 config=config_manager,
                 event_bus=event_bus,
             )
+            if self.session_service.activity_coalescer:
+                self.session_service.activity_coalescer.start()
             logger.info("Session microservice initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize session microservice: {e}")
@@ -93,6 +98,10 @@ class SessionMicroservice:
                 except Exception as e:
                     logger.error(f"❌ Failed to deregister from Consul: {e}")
 
+            # Publish buffered session activity before the bus closes
+            if self.session_service and self.session_service.activity_coalescer:
+                await self.session_service.activity_coalescer.stop()
+
             if self.event_bus:
                 await self.event_bus.close()
                 logger.info("Event bus closed")
@@ -175,6 +184,7 @@ async def lifespan(app: FastAPI):
     await shutdown_manager.wait_for_drain()
 
     await session_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -464,6 +474,24 @@ async def add_message(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@app.post("/api/v1/sessions/{session_id}/messages/batch", response_model=MessageBatchResponse)
+async def add_messages(
+    session_id: str,
+    request: MessageBatchCreateRequest,
+    user_id: Optional[str] = Query(None, description="User ID for authorization"),
+    session_service: SessionService = Depends(get_session_service),
+):
+    """Add a batch of messages to session in one write"""
+    try:
+        return await session_service.add_messages(session_id, request.messages, user_id)
+    except SessionNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except SessionValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except SessionServiceError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
 @app.get("/api/v1/sessions/{session_id}/messages", response_model=MessageListResponse)
 async def get_session_messages(
     session_id: str,
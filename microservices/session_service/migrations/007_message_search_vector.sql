@@ -0,0 +1,27 @@
+-- Session Service Migration: Stored search vector for message search
+-- Version: 007
+-- Date: 2026-10-18
+-- Description: Persist the english tsvector of session_messages.content as a
+--              generated column so search_messages matches and ranks against
+--              an index instead of re-tokenising every message of the user
+--              on each query. A trigram index serves short and
+--              punctuation-only queries that full-text search ignores.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+-- btree_gin lets user_id share a GIN index with the text columns
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- Maintained by Postgres on every INSERT/UPDATE of content
+ALTER TABLE session.session_messages
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+
+-- Full-text search: WHERE user_id = $1 AND search_vector @@ plainto_tsquery(...)
+CREATE INDEX IF NOT EXISTS idx_session_messages_user_search_vector
+    ON session.session_messages USING gin (user_id, search_vector);
+
+-- Short / special-character queries: WHERE user_id = $1 AND content ILIKE '%q%'
+CREATE INDEX IF NOT EXISTS idx_session_messages_user_content_trgm
+    ON session.session_messages USING gin (user_id, content gin_trgm_ops);
+
+COMMENT ON COLUMN session.session_messages.search_vector IS 'English tsvector of content (generated) for full-text search';
@@ -137,6 +137,14 @@ class MessageCreateRequest(BaseModel):
     cost_usd: float = Field(default=0.0, description="Cost in USD")
 
 
+class MessageBatchCreateRequest(BaseModel):
+    """Batch message create request"""
+
+    messages: List[MessageCreateRequest] = Field(
+        ..., min_length=1, max_length=100, description="Messages to append, in order"
+    )
+
+
 class MemoryCreateRequest(BaseModel):
     """Memory create request"""
 
@@ -205,6 +213,13 @@ class MessageResponse(BaseModel):
         from_attributes = True
 
 
+class MessageBatchResponse(BaseModel):
+    """Batch message create response"""
+
+    session_id: str
+    messages: List[MessageResponse]
+
+
 class MessageListResponse(BaseModel):
     """Message list response"""
 
@@ -126,6 +126,13 @@ class SessionMessageRepositoryProtocol(Protocol):
         """Create a new message"""
         ...
 
+    async def append_messages(
+        self, session_id: str, user_id: str, messages: List[Dict[str, Any]]
+    ) -> List[SessionMessage]:
+        """Insert messages and update session counters in one statement.
+        Returns the created messages; empty if the session does not exist for user_id."""
+        ...
+
     async def get_session_messages(self, session_id: str, limit: int = 100, offset: int = 0) -> List[SessionMessage]:
         """Get messages for a session with pagination"""
         ...
@@ -149,6 +156,10 @@ class SessionMessageRepositoryProtocol(Protocol):
         Returns (rows, total_count)."""
         ...
 
+    def search_cursor(self, row: Dict[str, Any]) -> str:
+        """Cursor continuing a search_messages result after ``row``"""
+        ...
+
 
 # ============================================================================
 # Service Client Protocols
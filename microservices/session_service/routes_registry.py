@@ -70,6 +70,12 @@ SERVICE_ROUTES = [
         "auth_required": True,
         "description": "Add message to session",
     },
+    {
+        "path": "/api/v1/sessions/{session_id}/messages/batch",
+        "methods": ["POST"],
+        "auth_required": True,
+        "description": "Add a batch of messages to session",
+    },
     {
         "path": "/api/v1/sessions/{session_id}/messages",
         "methods": ["GET"],
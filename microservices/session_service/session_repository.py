@@ -5,7 +5,9 @@ Data access layer for session management operations.
 Using supabase client for database operations.
 """
 
+import json
 import logging
+import re
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 import uuid
@@ -18,6 +20,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.text_search import (
+    MIN_TRIGRAM_LENGTH,
+    InvalidCursorError,
+    Keyset,
+    encode_cursor,
+    escape_like,
+)
 from .models import Session, SessionMessage
 
 
@@ -36,6 +45,27 @@ def _pg_min_pool() -> int:
 
 logger = logging.getLogger(__name__)
 
+# plainto_tsquery needs at least one word character to produce a query
+_WORD_RE = re.compile(r"\w")
+
+
+def _message_from_row(row: Dict[str, Any]) -> SessionMessage:
+    """Map a session_messages row to SessionMessage"""
+    return SessionMessage.model_validate(
+        {
+            "message_id": row.get("id"),
+            "session_id": row.get("session_id"),
+            "user_id": row.get("user_id"),
+            "role": row.get("role"),
+            "content": row.get("content"),
+            "message_type": row.get("message_type"),
+            "metadata": row.get("message_metadata") or {},
+            "tokens_used": row.get("tokens_used", 0),
+            "cost_usd": row.get("cost_usd", 0.0),
+            "created_at": row.get("created_at"),
+        }
+    )
+
 
 class SessionNotFoundException(Exception):
     """Session not found exception"""
@@ -460,6 +490,86 @@ class SessionMessageRepository:
             logger.error(f"Error creating message: {e}")
             return None
 
+    async def append_messages(
+        self, session_id: str, user_id: str, messages: List[Dict[str, Any]]
+    ) -> List[SessionMessage]:
+        """
+        追加消息并更新会话统计 (单条语句)
+
+        Inserts the batch and adds its count, tokens and cost to the session
+        row in one statement, so appends cost a single round trip and
+        concurrent appends never lose counter updates. Nothing is written
+        unless the session exists and belongs to ``user_id``.
+
+        Returns the created messages in order; empty if the session was not
+        found.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "role": message.get("role"),
+                    "content": message.get("content"),
+                    "message_type": message.get("message_type") or "chat",
+                    "message_metadata": message.get("metadata") or {},
+                    "tokens_used": message.get("tokens_used") or 0,
+                    "cost_usd": float(message.get("cost_usd") or 0.0),
+                    # Distinct timestamps keep the batch ordered in get_session_messages
+                    "created_at": (now + timedelta(microseconds=i)).isoformat(),
+                }
+                for i, message in enumerate(messages)
+            ]
+
+            query = f"""
+                WITH inserted AS (
+                    INSERT INTO {self.schema}.{self.messages_table} (
+                        id, session_id, user_id, role, content, message_type,
+                        message_metadata, tokens_used, cost_usd, created_at
+                    )
+                    SELECT r.id, $1, $2, r.role, r.content, r.message_type,
+                           r.message_metadata, r.tokens_used, r.cost_usd, r.created_at
+                    FROM jsonb_to_recordset($3::jsonb) AS r(
+                        id VARCHAR(36), role VARCHAR(50), content TEXT,
+                        message_type VARCHAR(50), message_metadata JSONB,
+                        tokens_used INTEGER, cost_usd DOUBLE PRECISION,
+                        created_at TIMESTAMPTZ
+                    )
+                    WHERE EXISTS (
+                        SELECT 1 FROM {self.schema}.sessions
+                        WHERE session_id = $1 AND user_id = $2
+                    )
+                    RETURNING *
+                ),
+                totals AS (
+                    SELECT COUNT(*) AS messages,
+                           COALESCE(SUM(tokens_used), 0) AS tokens,
+                           COALESCE(SUM(cost_usd), 0) AS cost
+                    FROM inserted
+                ),
+                updated AS (
+                    UPDATE {self.schema}.sessions s
+                    SET message_count = s.message_count + totals.messages,
+                        total_tokens = s.total_tokens + totals.tokens,
+                        total_cost = s.total_cost + totals.cost,
+                        last_activity = NOW(),
+                        updated_at = NOW()
+                    FROM totals
+                    WHERE s.session_id = $1 AND totals.messages > 0
+                )
+                SELECT * FROM inserted ORDER BY created_at
+            """
+            params = [session_id, user_id, json.dumps(rows)]
+
+            async with self.db:
+                results = await self.db.query(query, params, schema=self.schema)
+
+            return [_message_from_row(row) for row in results or []]
+
+        except Exception as e:
+            logger.error(f"Error appending messages to session {session_id}: {e}")
+            raise
+
     async def get_session_messages(self, session_id: str, limit: int = 100, offset: int = 0) -> List[SessionMessage]:
         """获取会话消息"""
         try:
@@ -508,97 +618,113 @@ class SessionMessageRepository:
         """
         Full-text search across all messages for a user.
 
-        Uses PostgreSQL ts_rank with plainto_tsquery for relevance ranking,
-        falling back to ILIKE for short or special-character queries.
+        Matches the stored, GIN-indexed ``search_vector`` column and ranks
+        with ts_rank on it, so no message is re-tokenised at query time.
+        Short or punctuation-only queries (which plainto_tsquery would drop)
+        fall back to a substring match served by the content trigram index.
+
+        Pages are keyset-paginated on (rank, created_at, id); snippets are
+        generated by ts_headline for the returned page only.
 
         Returns (rows, total_count) where each row contains message + session
-        columns and a generated snippet.
+        columns, the rank and a generated snippet.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is not from a previous page
         """
         try:
-            params: list = []
-            param_idx = 0
-
-            # Build the WHERE clause parts
-            param_idx += 1
-            user_param = f"${param_idx}"
-            params.append(user_id)
+            params: list = [user_id]
 
-            # Determine whether to use tsvector or ILIKE
             # plainto_tsquery ignores punctuation / very short tokens, so
             # fall back to ILIKE for queries shorter than 3 chars or that
             # contain only non-word characters.
-            use_fts = len(query.strip()) >= 3
+            use_fts = len(query) >= MIN_TRIGRAM_LENGTH and _WORD_RE.search(query) is not None
 
             if use_fts:
-                param_idx += 1
-                query_param = f"${param_idx}"
                 params.append(query)
-
-                search_condition = f"to_tsvector('english', m.content) @@ plainto_tsquery('english', {query_param})"
-                rank_expr = f"ts_rank(to_tsvector('english', m.content), plainto_tsquery('english', {query_param}))"
+                tsquery = "plainto_tsquery('english', $2)"
+                search_condition = f"m.search_vector @@ {tsquery}"
+                rank_expr = f"ts_rank(m.search_vector, {tsquery})::float8"
                 snippet_expr = (
-                    f"ts_headline('english', m.content, plainto_tsquery('english', {query_param}), "
+                    f"ts_headline('english', hit.content, {tsquery}, "
                     f"'StartSel=<<, StopSel=>>, MaxWords=35, MinWords=15')"
                 )
             else:
-                param_idx += 1
-                like_param = f"${param_idx}"
-                params.append(f"%{query}%")
-
-                search_condition = f"m.content ILIKE {like_param}"
-                rank_expr = "1"
-                snippet_expr = "substring(m.content from 1 for 200)"
-
-            # Cursor-based pagination: cursor is the ISO timestamp of the
-            # last result's created_at from the previous page.
-            cursor_condition = ""
-            if cursor:
-                param_idx += 1
-                cursor_param = f"${param_idx}"
-                params.append(cursor)
-                cursor_condition = f"AND m.created_at < {cursor_param}::timestamptz"
+                params.append(f"%{escape_like(query)}%")
+                search_condition = "m.content ILIKE $2"
+                rank_expr = "1::float8"
+                snippet_expr = "substring(hit.content from 1 for 200)"
+
+            # Hits only count when their session still exists; the check
+            # runs before LIMIT so a page is never short
+            session_exists = f"""EXISTS (
+                SELECT 1 FROM {self.schema}.sessions s
+                WHERE s.session_id = m.session_id
+            )"""
 
             # Count total matching messages (without cursor / limit)
             count_query = f"""
                 SELECT COUNT(*) AS cnt
                 FROM {self.schema}.{self.messages_table} m
-                WHERE m.user_id = {user_param}
+                WHERE m.user_id = $1
                   AND {search_condition}
+                  AND {session_exists}
             """
+            count_params = list(params)
+
+            keyset = Keyset((rank_expr, "m.created_at", "m.id::text"))
+            after = keyset.after(cursor, params)
+            cursor_condition = f"AND {after}" if after else ""
 
-            # Main search query — join with sessions to get session metadata
+            # Rank and page the matches first, then build snippets and join
+            # session metadata for the page only
             search_query = f"""
+                WITH hit AS (
+                    SELECT
+                        m.id::text   AS message_id,
+                        m.session_id,
+                        m.role,
+                        m.content,
+                        m.message_type,
+                        m.created_at AS message_created_at,
+                        {rank_expr}  AS rank
+                    FROM {self.schema}.{self.messages_table} m
+                    WHERE m.user_id = $1
+                      AND {search_condition}
+                      AND {session_exists}
+                      {cursor_condition}
+                    ORDER BY {keyset.order_by}
+                    LIMIT {int(limit)}
+                )
                 SELECT
-                    m.id            AS message_id,
-                    m.session_id,
-                    m.role,
-                    m.content,
-                    m.message_type,
-                    m.created_at    AS message_created_at,
+                    hit.*,
                     s.status        AS session_status,
                     s.session_summary,
                     s.message_count AS session_message_count,
                     s.created_at    AS session_created_at,
                     s.last_activity AS session_last_activity,
-                    {snippet_expr}  AS snippet,
-                    {rank_expr}     AS rank
-                FROM {self.schema}.{self.messages_table} m
-                JOIN {self.schema}.sessions s ON s.session_id = m.session_id
-                WHERE m.user_id = {user_param}
-                  AND {search_condition}
-                  {cursor_condition}
-                ORDER BY rank DESC, m.created_at DESC
-                LIMIT {limit}
+                    {snippet_expr}  AS snippet
+                FROM hit
+                JOIN {self.schema}.sessions s ON s.session_id = hit.session_id
+                ORDER BY hit.rank DESC, hit.message_created_at DESC, hit.message_id DESC
             """
 
             async with self.db:
-                count_result = await self.db.query_row(count_query, params[:2], schema=self.schema)
+                count_result = await self.db.query_row(count_query, count_params, schema=self.schema)
                 total = count_result["cnt"] if count_result else 0
 
                 rows = await self.db.query(search_query, params, schema=self.schema) or []
 
             return rows, total
 
+        except InvalidCursorError:
+            raise
         except Exception as e:
             logger.error(f"Error searching messages: {e}", exc_info=True)
             return [], 0
+
+    def search_cursor(self, row: Dict[str, Any]) -> str:
+        """Cursor continuing a ``search_messages`` result after ``row``"""
+        return encode_cursor(
+            [row["rank"], row["message_created_at"], row["message_id"]]
+        )
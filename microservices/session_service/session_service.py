@@ -12,11 +12,13 @@ Uses dependency injection for testability:
 import logging
 import os
 import sys
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from .models import (
+    MessageBatchResponse,
     MessageCreateRequest,
     MessageListResponse,
     MessageResponse,
@@ -50,9 +52,14 @@ if TYPE_CHECKING:
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from core.nats_client import Event
+from core.text_search import InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
+MAX_MESSAGE_BATCH = 100
+SESSION_OWNER_CACHE_TTL = float(os.getenv("SESSION_OWNER_CACHE_TTL_SECONDS", "30"))
+SESSION_OWNER_CACHE_SIZE = 10000
+
 
 class SessionService:
     """
@@ -73,6 +80,7 @@ class SessionService:
         event_bus: Optional[EventBusProtocol] = None,
         account_client: Optional[AccountClientProtocol] = None,
         config=None,
+        activity_coalescer=None,
     ):
         """
         Initialize service with injected dependencies.
@@ -83,6 +91,8 @@ class SessionService:
             event_bus: Event bus for publishing events
             account_client: Account service client for user validation
             config: Configuration manager (for backward compatibility)
+            activity_coalescer: SessionActivityCoalescer for message events;
+                per-message events are published inline when not set
         """
         # Store injected dependencies or create real ones lazily
         self._session_repo = session_repo
@@ -91,6 +101,9 @@ class SessionService:
         self._account_client = account_client
         self._config = config
         self._repos_initialized = False
+        self.activity_coalescer = activity_coalescer
+        # session_id -> (user_id, expires_at); owners never change
+        self._session_owners: Dict[str, Tuple[str, float]] = {}
 
     def _ensure_repos_initialized(self):
         """Lazy initialization of repositories if not injected"""
@@ -553,92 +566,153 @@ class SessionService:
         Returns:
             Created message response
         """
-        try:
-            # Verify session exists and authorize
-            session = await self.session_repo.get_by_session_id(session_id)
-            if not session:
-                raise SessionNotFoundError(f"Session not found: {session_id}")
+        batch = await self.add_messages(session_id, [request], user_id)
+        return batch.messages[0]
 
-            if user_id and session.user_id != user_id:
-                raise SessionNotFoundError(f"Session not found: {session_id}")
+    async def add_messages(
+        self,
+        session_id: str,
+        requests: List[MessageCreateRequest],
+        user_id: Optional[str] = None,
+    ) -> MessageBatchResponse:
+        """
+        Add a batch of messages to a session
 
-            # Validate message request
-            self._validate_message_create_request(request)
+        The messages and the session counters are written in one statement;
+        the session owner comes from a short-lived cache, and the write itself
+        re-checks that the session still exists for that owner.
 
-            # Prepare message data
-            message_data = {
-                "session_id": session_id,
-                "user_id": session.user_id,
-                "role": request.role,
-                "content": request.content,
-                "message_type": request.message_type,
-                "metadata": request.metadata or {},
-                "tokens_used": request.tokens_used,
-                "cost_usd": request.cost_usd,
-            }
+        Args:
+            session_id: Session ID
+            requests: Message creation requests, in order
+            user_id: Optional user ID for authorization
+
+        Returns:
+            Created messages, in request order
+        """
+        try:
+            if not requests:
+                raise SessionValidationError("At least one message is required")
+            if len(requests) > MAX_MESSAGE_BATCH:
+                raise SessionValidationError(f"At most {MAX_MESSAGE_BATCH} messages per batch")
+
+            owner_id = await self._get_session_owner(session_id, user_id)
+
+            # Validate message requests
+            for request in requests:
+                self._validate_message_create_request(request)
+
+            messages = await self.message_repo.append_messages(
+                session_id,
+                owner_id,
+                [
+                    {
+                        "role": request.role,
+                        "content": request.content,
+                        "message_type": request.message_type,
+                        "metadata": request.metadata or {},
+                        "tokens_used": request.tokens_used,
+                        "cost_usd": request.cost_usd,
+                    }
+                    for request in requests
+                ],
+            )
+            if not messages:
+                # Session was deleted since it was cached
+                self._session_owners.pop(session_id, None)
+                raise SessionNotFoundError(f"Session not found: {session_id}")
 
-            # Create message
-            message = await self.message_repo.create_message(message_data)
+            await self._publish_message_events(session_id, owner_id, messages)
+
+            return MessageBatchResponse(
+                session_id=session_id,
+                messages=[self._message_to_response(message) for message in messages],
+            )
 
-            if not message:
-                raise SessionServiceError("Failed to create message")
+        except (SessionNotFoundError, SessionValidationError):
+            raise
+        except Exception as e:
+            logger.error(f"Error adding messages to session {session_id}: {e}")
+            raise SessionServiceError(f"Failed to add message: {str(e)}")
 
-            # Update session metrics
-            await self.session_repo.increment_message_count(session_id, request.tokens_used, request.cost_usd)
+    async def _get_session_owner(self, session_id: str, user_id: Optional[str]) -> str:
+        """Owner of a session for the append path, cached for SESSION_OWNER_CACHE_TTL"""
+        now = time.monotonic()
+        cached = self._session_owners.get(session_id)
+        if cached and cached[1] > now:
+            owner_id = cached[0]
+        else:
+            session = await self.session_repo.get_by_session_id(session_id)
+            if not session:
+                raise SessionNotFoundError(f"Session not found: {session_id}")
+            owner_id = session.user_id
+            if len(self._session_owners) >= SESSION_OWNER_CACHE_SIZE:
+                self._session_owners = {
+                    sid: entry for sid, entry in self._session_owners.items() if entry[1] > now
+                }
+                if len(self._session_owners) >= SESSION_OWNER_CACHE_SIZE:
+                    self._session_owners.clear()
+            self._session_owners[session_id] = (owner_id, now + SESSION_OWNER_CACHE_TTL)
+
+        if user_id and owner_id != user_id:
+            raise SessionNotFoundError(f"Session not found: {session_id}")
+        return owner_id
+
+    async def _publish_message_events(
+        self, session_id: str, user_id: str, messages: List[SessionMessage]
+    ) -> None:
+        """Hand messages to the activity coalescer, or publish per-message events"""
+        if self.activity_coalescer is not None:
+            self.activity_coalescer.record(session_id, user_id, messages)
+            return
+        if not self.event_bus:
+            return
 
+        for message in messages:
             # Publish SESSION_MESSAGE_SENT event
-            if self.event_bus:
-                try:
-                    event = Event(
-                        event_type="session.message_sent",
-                        source="session_service",
-                        data={
-                            "session_id": session_id,
-                            "user_id": session.user_id,
-                            "message_id": message.message_id,
-                            "role": request.role,
-                            "content": request.content,  # Add message content for memory service
-                            "message_type": request.message_type,
-                            "tokens_used": request.tokens_used or 0,
-                            "cost_usd": float(request.cost_usd) if request.cost_usd else 0.0,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        },
-                    )
-                    await self.event_bus.publish_event(event)
-                    logger.info(f"Published session.message_sent event for session {session_id}")
-                except Exception as e:
-                    logger.error(f"Failed to publish session.message_sent event: {e}")
+            try:
+                event = Event(
+                    event_type="session.message_sent",
+                    source="session_service",
+                    data={
+                        "session_id": session_id,
+                        "user_id": user_id,
+                        "message_id": message.message_id,
+                        "role": message.role,
+                        "content": message.content,  # Add message content for memory service
+                        "message_type": message.message_type,
+                        "tokens_used": message.tokens_used or 0,
+                        "cost_usd": float(message.cost_usd) if message.cost_usd else 0.0,
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    },
+                )
+                await self.event_bus.publish_event(event)
+                logger.info(f"Published session.message_sent event for session {session_id}")
+            except Exception as e:
+                logger.error(f"Failed to publish session.message_sent event: {e}")
 
             # Publish SESSION_TOKENS_USED event if tokens were consumed
-            if self.event_bus and request.tokens_used and request.tokens_used > 0:
+            if message.tokens_used and message.tokens_used > 0:
                 try:
                     event = Event(
                         event_type="session.tokens_used",
                         source="session_service",
                         data={
                             "session_id": session_id,
-                            "user_id": session.user_id,
+                            "user_id": user_id,
                             "message_id": message.message_id,
-                            "tokens_used": request.tokens_used,
-                            "cost_usd": float(request.cost_usd) if request.cost_usd else 0.0,
+                            "tokens_used": message.tokens_used,
+                            "cost_usd": float(message.cost_usd) if message.cost_usd else 0.0,
                             "timestamp": datetime.now(timezone.utc).isoformat(),
                         },
                     )
                     await self.event_bus.publish_event(event)
                     logger.info(
-                        f"Published session.tokens_used event for session {session_id}: {request.tokens_used} tokens"
+                        f"Published session.tokens_used event for session {session_id}: {message.tokens_used} tokens"
                     )
                 except Exception as e:
                     logger.error(f"Failed to publish session.tokens_used event: {e}")
 
-            return self._message_to_response(message)
-
-        except (SessionNotFoundError, SessionValidationError):
-            raise
-        except Exception as e:
-            logger.error(f"Error adding message to session {session_id}: {e}")
-            raise SessionServiceError(f"Failed to add message: {str(e)}")
-
     async def get_session_messages(
         self,
         session_id: str,
@@ -706,7 +780,7 @@ class SessionService:
             user_id: User ID (auth-scoped — users can only search their own data)
             query: Search query string
             limit: Max results to return
-            cursor: Opaque cursor (ISO timestamp) for pagination
+            cursor: Opaque cursor (next_cursor of the previous page)
 
         Returns:
             SessionSearchResponse with grouped results per session
@@ -730,7 +804,6 @@ class SessionService:
 
             # Group hits by session
             sessions_map: Dict[str, SearchResultSession] = {}
-            last_created_at = None
 
             for row in rows:
                 sid = row["session_id"]
@@ -757,14 +830,11 @@ class SessionService:
                         created_at=row.get("message_created_at"),
                     )
                 )
-                last_created_at = row.get("message_created_at")
 
             # Build next cursor — only present when there may be more results
             next_cursor = None
-            if len(rows) == limit and last_created_at is not None:
-                next_cursor = (
-                    last_created_at.isoformat() if hasattr(last_created_at, "isoformat") else str(last_created_at)
-                )
+            if rows and len(rows) == limit:
+                next_cursor = self.message_repo.search_cursor(rows[-1])
 
             return SessionSearchResponse(
                 query=query,
@@ -775,6 +845,8 @@ class SessionService:
 
         except SessionValidationError:
             raise
+        except InvalidCursorError as e:
+            raise SessionValidationError(str(e))
         except Exception as e:
             logger.error(f"Error searching sessions for user {user_id}: {e}", exc_info=True)
             raise SessionServiceError(f"Failed to search sessions: {str(e)}")
@@ -37,6 +37,7 @@ from core.metrics import setup_metrics
 from core.nats_client import get_event_bus
 from core.rate_limit_backend import build_rate_limit_backend
 from core.rate_limiter import RateLimitConfig, RateLimitMiddleware
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -181,6 +182,7 @@ async def lifespan(app: FastAPI):
 
     if event_bus:
         await event_bus.close()
+    close_discovery_caches()
 
 
 # ==================== FastAPI 应用初始化 ====================
@@ -26,6 +26,7 @@ from isa_common.consul_client import ConsulRegistry
 
 from core.admin_audit import publish_admin_action
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from .models import (
     CreateSubscriptionRequest,
@@ -194,6 +195,7 @@ async def lifespan(app: FastAPI):
     shutdown_manager.initiate_shutdown()
     await shutdown_manager.wait_for_drain()
     await subscription_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
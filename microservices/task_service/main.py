@@ -4,6 +4,8 @@ Task Service - Main Application
 任务管理微服务主应用，提供待办事项、任务调度、日历管理等功能
 """
 
+import os
+import secrets
 from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
@@ -17,6 +19,7 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -35,6 +38,7 @@ from .models import (
 )
 from .routes_registry import SERVICE_METADATA, get_routes_for_consul
 from .task_repository import TaskRepository
+from .task_scheduler import TaskScheduler
 from .factory import create_task_service
 
 # 初始化配置
@@ -54,14 +58,23 @@ class TaskMicroservice:
         self.service = None
         self.repository = None
         self.consul_registry = None
+        self.scheduler = None
 
     async def initialize(self, event_bus=None, config_manager=None):
         self.repository = TaskRepository(config=config_manager)
         self.service = create_task_service(config=config_manager, event_bus=event_bus)
+        if os.getenv("TASK_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes"):
+            self.scheduler = TaskScheduler.from_env(
+                self.service, self.service.repository
+            )
+            self.scheduler.start()
+            logger.info(f"Embedded task scheduler started ({self.scheduler.owner})")
         logger.info("Task service initialized")
 
     async def shutdown(self):
         logger.info("Task service shutting down")
+        if self.scheduler:
+            await self.scheduler.stop()
 
 
 # Global instance
@@ -173,6 +186,7 @@ async def lifespan(app: FastAPI):
             logger.error(f"Error closing event bus: {e}")
 
     await microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -580,6 +594,13 @@ async def get_task_analytics(
 # ======================
 # Scheduler Endpoints
 # ======================
+# Legacy hooks for an external poller; the embedded TaskScheduler claims and
+# runs due tasks itself (set TASK_SCHEDULER_ENABLED=false to rely on these).
+
+
+def _scheduler_key_valid(key: Optional[str]) -> bool:
+    expected = os.getenv("TASK_SCHEDULER_INTERNAL_KEY", "internal_scheduler_key")
+    return bool(key) and secrets.compare_digest(key, expected)
 
 
 @app.get("/api/v1/scheduler/pending", response_model=List[TaskResponse])
@@ -589,7 +610,7 @@ async def get_pending_tasks(
 ):
     """获取待执行的任务（内部调度器使用）"""
     # 验证内部密钥
-    if x_internal_key != "internal_scheduler_key":  # 实际应该从环境变量读取
+    if not _scheduler_key_valid(x_internal_key):
         raise HTTPException(status_code=403, detail="Forbidden")
 
     try:
@@ -607,7 +628,7 @@ async def scheduler_execute_task(
 ):
     """调度器执行任务（内部使用）"""
     # 验证内部密钥
-    if x_internal_key != "internal_scheduler_key":
+    if not _scheduler_key_valid(x_internal_key):
         raise HTTPException(status_code=403, detail="Forbidden")
 
     try:
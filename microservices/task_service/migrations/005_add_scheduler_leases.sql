@@ -0,0 +1,23 @@
+-- Task Service Migration: Lease columns for the embedded scheduler
+-- Version: 005
+-- Date: 2026-10-18
+-- Description: Replicas claim due tasks with FOR UPDATE SKIP LOCKED and hold
+--              a lease while running them; an expired lease (crashed
+--              replica) makes the task claimable again.
+
+ALTER TABLE task.user_tasks
+    ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+-- Due-task scan: only scheduled, live rows, in the order they fall due
+CREATE INDEX IF NOT EXISTS idx_tasks_due
+    ON task.user_tasks(next_run_time)
+    WHERE status = 'scheduled' AND deleted_at IS NULL;
+
+-- Expired-lease scan
+CREATE INDEX IF NOT EXISTS idx_tasks_lease_expires
+    ON task.user_tasks(lease_expires_at)
+    WHERE status = 'running' AND lease_owner IS NOT NULL;
+
+COMMENT ON COLUMN task.user_tasks.lease_owner IS 'Scheduler replica currently running the task';
+COMMENT ON COLUMN task.user_tasks.lease_expires_at IS 'Lease end; renewed while the run is in progress';
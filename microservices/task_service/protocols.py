@@ -121,6 +121,32 @@ class TaskRepositoryProtocol(Protocol):
         """Update task execution statistics"""
         ...
 
+    async def claim_due_tasks(
+        self, owner: str, limit: int, lease_seconds: float
+    ) -> List[TaskResponse]:
+        """Lease due tasks to one scheduler replica (SKIP LOCKED)"""
+        ...
+
+    async def renew_task_leases(
+        self, owner: str, task_ids: List[str], lease_seconds: float
+    ) -> List[str]:
+        """Extend leases still held by owner; returns the renewed task IDs"""
+        ...
+
+    async def release_task_lease(
+        self,
+        task_id: str,
+        owner: str,
+        status: str,
+        next_run_time: Optional[datetime],
+    ) -> bool:
+        """Record a scheduled run's outcome and drop the lease"""
+        ...
+
+    async def get_scheduler_backlog(self) -> Dict[str, Any]:
+        """Count and oldest due time of unclaimed due tasks"""
+        ...
+
     async def create_execution_record(
         self, task_id: str, user_id: str, execution_data: Dict[str, Any]
     ) -> Optional[TaskExecutionResponse]:
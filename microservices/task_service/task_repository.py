@@ -423,6 +423,110 @@ class TaskRepository:
             logger.error(f"Failed to get pending tasks: {e}")
             return []
 
+    # ====================
+    # Embedded scheduler (task_scheduler.py)
+    # ====================
+
+    async def claim_due_tasks(
+        self, owner: str, limit: int, lease_seconds: float
+    ) -> List[TaskResponse]:
+        """以租约方式认领到期任务 (SKIP LOCKED, 多副本互不阻塞, 过期租约可重新认领)"""
+        table = f"{self.schema}.{self.table_name}"
+        query = f"""
+            UPDATE {table} AS t
+            SET status = 'running',
+                lease_owner = $1,
+                lease_expires_at = NOW() + make_interval(secs => $3),
+                updated_at = NOW()
+            WHERE t.id IN (
+                SELECT id FROM {table}
+                WHERE deleted_at IS NULL
+                  AND ((status = 'scheduled'
+                        AND (next_run_time IS NULL OR next_run_time <= NOW()))
+                       OR (status = 'running' AND lease_owner IS NOT NULL
+                           AND lease_expires_at < NOW()))
+                ORDER BY
+                    CASE priority
+                        WHEN 'urgent' THEN 0 WHEN 'high' THEN 1
+                        WHEN 'medium' THEN 2 ELSE 3
+                    END,
+                    next_run_time NULLS FIRST
+                LIMIT $2
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING t.*
+        """
+        async with self.db:
+            results = await self.db.query(
+                query, params=[owner, limit, float(lease_seconds)]
+            )
+        tasks = []
+        for data in results or []:
+            task = self._parse_task(data)
+            if task:
+                tasks.append(task)
+        return tasks
+
+    async def renew_task_leases(
+        self, owner: str, task_ids: List[str], lease_seconds: float
+    ) -> List[str]:
+        """延长仍由本副本持有的租约，返回续约成功的任务ID"""
+        if not task_ids:
+            return []
+        query = f"""
+            UPDATE {self.schema}.{self.table_name}
+            SET lease_expires_at = NOW() + make_interval(secs => $3)
+            WHERE task_id = ANY($1::text[]) AND lease_owner = $2
+              AND status = 'running'
+            RETURNING task_id
+        """
+        async with self.db:
+            results = await self.db.query(
+                query, params=[task_ids, owner, float(lease_seconds)]
+            )
+        return [row["task_id"] for row in results or []]
+
+    async def release_task_lease(
+        self,
+        task_id: str,
+        owner: str,
+        status: str,
+        next_run_time: Optional[datetime],
+    ) -> bool:
+        """记录调度结果 (状态/下次执行时间) 并释放租约"""
+        if next_run_time is not None and next_run_time.tzinfo is None:
+            next_run_time = next_run_time.replace(tzinfo=timezone.utc)
+        query = f"""
+            UPDATE {self.schema}.{self.table_name}
+            SET status = $3,
+                next_run_time = $4,
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                updated_at = NOW()
+            WHERE task_id = $1 AND lease_owner = $2
+        """
+        async with self.db:
+            count = await self.db.execute(
+                query, params=[task_id, owner, status, next_run_time]
+            )
+        return count is not None and count > 0
+
+    async def get_scheduler_backlog(self) -> Dict[str, Any]:
+        """到期未认领任务数及最早到期时间 (队列深度/延迟指标)"""
+        query = f"""
+            SELECT COUNT(*) AS due, MIN(COALESCE(next_run_time, updated_at)) AS oldest_due_at
+            FROM {self.schema}.{self.table_name}
+            WHERE status = 'scheduled' AND deleted_at IS NULL
+              AND (next_run_time IS NULL OR next_run_time <= NOW())
+        """
+        async with self.db:
+            row = await self.db.query_row(query, params=[])
+        row = row or {}
+        return {
+            "due": int(row.get("due") or 0),
+            "oldest_due_at": row.get("oldest_due_at"),
+        }
+
     # ====================
     # Task Executions
     # ====================
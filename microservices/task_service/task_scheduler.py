@@ -0,0 +1,287 @@
+"""
+Task Scheduler
+
+Runs due tasks inside task_service instead of an external poller calling
+``/api/v1/scheduler/pending`` and then ``/scheduler/execute/{task_id}``
+once per task:
+
+- each replica claims due tasks in batches with a lease
+  (``FOR UPDATE SKIP LOCKED``), so replicas share the work without running
+  a task twice; a crashed replica's tasks become claimable again once their
+  lease expires
+- up to ``workers`` tasks run at once; leases of running tasks are renewed
+  every ``lease_seconds / 3``, and a run whose lease was lost is cancelled
+- after a run, recurring schedules get their next ``next_run_time`` and go
+  back to ``scheduled`` (also after a failure, so one bad run does not stop
+  a daily task); one-off tasks end ``completed`` or ``failed``
+- due-but-unclaimed queue depth and the age of the oldest due task are
+  exported as gauges
+
+Usage:
+    scheduler = TaskScheduler(service, repository)
+    scheduler.start()
+    ...
+    await scheduler.stop()
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from core.metrics import create_counter, create_gauge, create_histogram
+
+from .models import TaskResponse, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+TASK_SCHEDULER_RUNS = create_counter(
+    "task_scheduler_runs_total",
+    "Scheduled task runs",
+    ["task_type", "status"],
+)
+TASK_SCHEDULER_DURATION_SECONDS = create_histogram(
+    "task_scheduler_run_duration_seconds",
+    "Duration of one scheduled task run",
+    ["task_type"],
+    buckets=[0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300],
+)
+TASK_SCHEDULER_LAG_SECONDS = create_histogram(
+    "task_scheduler_lag_seconds",
+    "Delay between a task falling due and starting",
+    ["task_type"],
+    buckets=[1, 5, 15, 60, 300, 900, 3600],
+)
+TASK_SCHEDULER_QUEUE_DEPTH = create_gauge(
+    "task_scheduler_queue_depth",
+    "Due tasks not yet claimed by any replica",
+)
+TASK_SCHEDULER_OLDEST_DUE_SECONDS = create_gauge(
+    "task_scheduler_oldest_due_seconds",
+    "Age of the oldest due, unclaimed task",
+)
+
+
+def _epoch(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TaskScheduler:
+    """Lease-based scheduler for one task_service replica."""
+
+    def __init__(
+        self,
+        service,
+        repository,
+        *,
+        workers: int = 8,
+        batch_size: int = 50,
+        poll_interval_seconds: float = 5.0,
+        lease_seconds: float = 300.0,
+        owner: Optional[str] = None,
+    ):
+        """
+        Args:
+            service: TaskService (``run_scheduled_task``, ``next_run_time_after_run``)
+            repository: TaskRepository with the claim/renew/release methods
+            workers: Max tasks running at once on this replica
+            batch_size: Max tasks claimed per query
+            poll_interval_seconds: How often to look for due tasks when idle
+            lease_seconds: Lease length; renewed while the task runs
+            owner: Replica id recorded on leases
+        """
+        self.service = service
+        self.repository = repository
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = (
+            owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+
+        self._running: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._maintenance: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, service, repository) -> "TaskScheduler":
+        """Scheduler configured from TASK_SCHEDULER_* environment variables"""
+        return cls(
+            service,
+            repository,
+            workers=int(os.getenv("TASK_SCHEDULER_WORKERS", "8")),
+            batch_size=int(os.getenv("TASK_SCHEDULER_BATCH_SIZE", "50")),
+            poll_interval_seconds=float(os.getenv("TASK_SCHEDULER_POLL_SECONDS", "5")),
+            lease_seconds=float(os.getenv("TASK_SCHEDULER_LEASE_SECONDS", "300")),
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="task-scheduler")
+            self._maintenance = asyncio.create_task(
+                self._maintain(), name="task-scheduler-leases"
+            )
+
+    async def stop(self) -> None:
+        """Stop claiming; running tasks are cancelled and their leases expire."""
+        tasks = list(self._running.values())
+        for loop_task in (self._task, self._maintenance):
+            if loop_task is not None:
+                tasks.append(loop_task)
+        self._task = self._maintenance = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running.clear()
+
+    # ------------------------------------------------------------------
+    # Claiming
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                free = min(self.batch_size, self.workers - len(self._running))
+                claimed = await self._claim(free) if free > 0 else 0
+                if self._running and (free <= 0 or claimed == free):
+                    # Saturated: more may be due, claim again as soon as a slot frees
+                    await asyncio.wait(
+                        list(self._running.values()),
+                        timeout=self.poll_interval,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                else:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task scheduler loop error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self, limit: int) -> int:
+        tasks = await self.repository.claim_due_tasks(
+            owner=self.owner, limit=limit, lease_seconds=self.lease_seconds
+        )
+        for task in tasks:
+            runner = asyncio.create_task(self._run_claimed(task))
+            self._running[task.task_id] = runner
+            runner.add_done_callback(
+                lambda _, task_id=task.task_id: self._running.pop(task_id, None)
+            )
+        return len(tasks)
+
+    async def run_once(self) -> int:
+        """Claim up to ``workers`` due tasks and run them; returns the count."""
+        tasks = await self.repository.claim_due_tasks(
+            owner=self.owner,
+            limit=min(self.batch_size, self.workers),
+            lease_seconds=self.lease_seconds,
+        )
+        await asyncio.gather(*(self._run_claimed(task) for task in tasks))
+        return len(tasks)
+
+    # ------------------------------------------------------------------
+    # One run
+    # ------------------------------------------------------------------
+
+    async def _run_claimed(self, task: TaskResponse) -> str:
+        """Run a claimed task and release its lease; returns the final status"""
+        task_type = getattr(task.task_type, "value", task.task_type)
+        due = _epoch(task.next_run_time)
+        if due is not None:
+            TASK_SCHEDULER_LAG_SECONDS.labels(task_type=task_type).observe(
+                max(0.0, time.time() - due)
+            )
+
+        started = time.monotonic()
+        try:
+            success = await self.service.run_scheduled_task(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scheduled task {task.task_id} failed: {e}", exc_info=True)
+            success = False
+        TASK_SCHEDULER_DURATION_SECONDS.labels(task_type=task_type).observe(
+            time.monotonic() - started
+        )
+
+        next_run_time = self.service.next_run_time_after_run(task)
+        if next_run_time is not None:
+            status = TaskStatus.SCHEDULED.value
+        else:
+            status = TaskStatus.COMPLETED.value if success else TaskStatus.FAILED.value
+        TASK_SCHEDULER_RUNS.labels(
+            task_type=task_type, status="success" if success else "error"
+        ).inc()
+
+        try:
+            released = await self.repository.release_task_lease(
+                task.task_id, self.owner, status, next_run_time
+            )
+            if not released:
+                logger.warning(
+                    f"Lease on task {task.task_id} was lost before the run finished"
+                )
+        except Exception as e:
+            # The lease expires and another replica re-runs the task
+            logger.error(f"Failed to release lease on task {task.task_id}: {e}")
+        return status
+
+    # ------------------------------------------------------------------
+    # Leases and metrics
+    # ------------------------------------------------------------------
+
+    async def _maintain(self) -> None:
+        interval = max(1.0, min(self.lease_seconds / 3, 30.0))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.renew_leases()
+                await self.report_backlog()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task scheduler maintenance failed: {e}")
+
+    async def renew_leases(self) -> None:
+        """Extend leases of running tasks; cancel runs whose lease was lost"""
+        task_ids = list(self._running)
+        if not task_ids:
+            return
+        renewed = set(
+            await self.repository.renew_task_leases(
+                self.owner, task_ids, self.lease_seconds
+            )
+        )
+        for task_id in task_ids:
+            runner = self._running.get(task_id)
+            if task_id not in renewed and runner is not None and not runner.done():
+                logger.warning(f"Lost lease on task {task_id}; cancelling this run")
+                runner.cancel()
+
+    async def report_backlog(self) -> Dict[str, Any]:
+        backlog = await self.repository.get_scheduler_backlog()
+        TASK_SCHEDULER_QUEUE_DEPTH.set(backlog["due"])
+        oldest = _epoch(backlog.get("oldest_due_at"))
+        TASK_SCHEDULER_OLDEST_DUE_SECONDS.set(
+            max(0.0, time.time() - oldest) if oldest is not None else 0.0
+        )
+        return backlog
+
+
+__all__ = ["TaskScheduler"]
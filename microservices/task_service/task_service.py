@@ -39,6 +39,9 @@ class ServiceError(Exception):
 
 logger = logging.getLogger(__name__)
 
+# 执行后需要计算下次执行时间的调度类型
+RECURRING_SCHEDULE_TYPES = ("daily", "weekly", "monthly", "cron")
+
 
 class TaskExecutionError(Exception):
     """任务执行错误"""
@@ -545,14 +548,24 @@ class TaskService:
             )
 
     async def _execute_task_async(
-        self, task: TaskResponse, execution_record: TaskExecutionResponse
-    ):
-        """异步执行任务"""
+        self,
+        task: TaskResponse,
+        execution_record: TaskExecutionResponse,
+        manage_status: bool = True,
+    ) -> bool:
+        """
+        异步执行任务
+
+        manage_status=False 时任务状态由调用方 (调度器租约) 负责; 返回是否成功
+        """
         try:
             # 更新任务状态为运行中
-            await self.repository.update_task(
-                task.task_id, task.user_id, {"status": TaskStatus.RUNNING.value}
-            )
+            if manage_status:
+                await self.repository.update_task(
+                    task.task_id,
+                    {"status": TaskStatus.RUNNING.value},
+                    user_id=task.user_id,
+                )
 
             # 获取任务执行器
             executor = self.task_executors.get(TaskType(task.task_type))
@@ -573,10 +586,10 @@ class TaskService:
 
             # 更新执行记录
             execution_result = {
-                "success": True,
+                "status": "completed",
                 "result": result,
                 "credits_consumed": credits_consumed,
-                "started_at": start_time.isoformat(),
+                "duration_ms": int((end_time - start_time).total_seconds() * 1000),
             }
 
             await self.repository.update_execution_record(
@@ -585,17 +598,18 @@ class TaskService:
 
             # 更新任务执行信息
             await self.repository.update_task_execution_info(
-                task.task_id, execution_result
+                task.task_id, True, credits_consumed
             )
 
             # 更新任务状态
-            new_status = TaskStatus.COMPLETED.value
-            if task.schedule:  # 如果有调度，设置为已调度状态
-                new_status = TaskStatus.SCHEDULED.value
+            if manage_status:
+                new_status = TaskStatus.COMPLETED.value
+                if task.schedule:  # 如果有调度，设置为已调度状态
+                    new_status = TaskStatus.SCHEDULED.value
 
-            await self.repository.update_task(
-                task.task_id, task.user_id, {"status": new_status}
-            )
+                await self.repository.update_task(
+                    task.task_id, {"status": new_status}, user_id=task.user_id
+                )
 
             # 发送执行完成通知
             await self._send_execution_notification(
@@ -642,16 +656,16 @@ class TaskService:
                     logger.error(f"Failed to publish task.completed event: {e}")
 
             logger.info(f"Task executed successfully: {task.task_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Task execution failed: {task.task_id} - {e}")
 
             # 更新执行记录为失败
             execution_result = {
-                "success": False,
-                "error": str(e),
+                "status": "failed",
+                "error_message": str(e),
                 "credits_consumed": 0,
-                "started_at": execution_record.started_at.isoformat(),
             }
 
             await self.repository.update_execution_record(
@@ -659,14 +673,15 @@ class TaskService:
             )
 
             # 更新任务执行信息
-            await self.repository.update_task_execution_info(
-                task.task_id, execution_result
-            )
+            await self.repository.update_task_execution_info(task.task_id, False, 0)
 
             # 更新任务状态为失败
-            await self.repository.update_task(
-                task.task_id, task.user_id, {"status": TaskStatus.FAILED.value}
-            )
+            if manage_status:
+                await self.repository.update_task(
+                    task.task_id,
+                    {"status": TaskStatus.FAILED.value},
+                    user_id=task.user_id,
+                )
 
             # Publish task.failed event
             if self.event_bus:
@@ -704,6 +719,28 @@ class TaskService:
                     "error": str(e),
                 },
             )
+            return False
+
+    async def run_scheduled_task(self, task: TaskResponse) -> bool:
+        """执行调度器认领的任务 (状态和租约由调度器负责); 返回是否成功"""
+        execution_record = await self.repository.create_execution_record(
+            task_id=task.task_id,
+            user_id=task.user_id,
+            execution_data={"trigger_type": "scheduler"},
+        )
+        if not execution_record:
+            logger.error(f"Failed to create execution record for {task.task_id}")
+            return False
+        return await self._execute_task_async(
+            task, execution_record, manage_status=False
+        )
+
+    def next_run_time_after_run(self, task: TaskResponse) -> Optional[datetime]:
+        """周期任务的下次执行时间; 一次性任务返回 None"""
+        schedule = task.schedule or {}
+        if schedule.get("type") not in RECURRING_SCHEDULE_TYPES:
+            return None
+        return self._calculate_next_run_time(schedule)
 
     async def get_pending_tasks(self, limit: int = 50) -> List[TaskResponse]:
         """获取待执行的任务（供调度器使用）"""
@@ -60,6 +60,8 @@ from .realtime import (
     RealtimeUnsupportedFilterError,
 )
 from .events.handlers import TelemetryEventHandler
+from core.stat_rollups import RollupReconciler
+from core.discovery_cache import close_discovery_caches
 from .routes_registry import get_routes_for_consul, SERVICE_METADATA
 
 # Initialize configuration
@@ -79,12 +81,17 @@ class TelemetryMicroservice:
         self.service = None
         self.event_bus = None
         self.consul_registry = None
+        self.stats_reconciler = None
 
     async def initialize(self, event_bus=None):
         self.event_bus = event_bus
         self.service = TelemetryService(event_bus=event_bus, config=config_manager)
         logger.info("Telemetry service initialized")
 
+        # Keep the statistics counter rollups reconciled
+        self.stats_reconciler = RollupReconciler(self.service.repository.stat_rollups)
+        self.stats_reconciler.start()
+
         # Consul service registration
         if config.consul_enabled:
             try:
@@ -117,6 +124,9 @@ class TelemetryMicroservice:
                 self.consul_registry = None
 
     async def shutdown(self):
+        if self.stats_reconciler:
+            await self.stats_reconciler.stop()
+
         # Consul deregistration
         if self.consul_registry:
             try:
@@ -220,6 +230,7 @@ async def lifespan(app: FastAPI):
     except Exception as exc:  # pragma: no cover — defensive
         logger.warning(f"WebSocket drain failed during shutdown: {exc}")
     await shutdown_manager.wait_for_drain()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -18,6 +18,7 @@ sys.path.append(
 
 from isa_common import AsyncPostgresClient
 from core.config_manager import ConfigManager
+from core.stat_rollups import CounterRollup, RollupSpec
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.struct_pb2 import ListValue, Struct
 
@@ -75,9 +76,31 @@ class TelemetryRepository:
         self.stats_table = "telemetry_stats"
         self.realtime_subscriptions_table = "real_time_subscriptions"
 
+        # Dashboard counters (core.stat_rollups); reconciled by main.lifespan.
+        # One row per device/metric per day is far smaller than the raw
+        # data points the distinct counts used to scan; devices are only
+        # counted, so stats reads do not return one row per device.
+        self.data_rollup = CounterRollup(
+            self.db,
+            RollupSpec(
+                name="telemetry_data",
+                source_table=f"{self.schema}.{self.data_table}",
+                time_column="time",
+                dimensions={"device_id": "device_id", "metric_name": "metric_name"},
+                hot_buckets=1,
+                count_only=("device_id",),
+            ),
+            schema=self.schema,
+        )
+
         # Ensure schema and tables exist
         self._ensure_schema()
 
+    @property
+    def stat_rollups(self) -> List[CounterRollup]:
+        """Counter rollups maintained for this repository's statistics"""
+        return [self.data_rollup]
+
     def _ensure_schema(self):
         """Ensure telemetry schema and tables exist
 
@@ -102,14 +125,29 @@ class TelemetryRepository:
         try:
             ingested_count = 0
             failed_count = 0
+            ingested = []
 
             for data_point in data_points:
                 success = await self.ingest_single_point(device_id, data_point)
                 if success:
                     ingested_count += 1
+                    ingested.append(
+                        (
+                            {
+                                "device_id": device_id,
+                                "metric_name": data_point.metric_name,
+                            },
+                            data_point.timestamp,
+                            1,
+                            0.0,
+                        )
+                    )
                 else:
                     failed_count += 1
 
+            if ingested:
+                await self.data_rollup.increment_many(ingested)
+
             return {
                 "success": True,
                 "ingested_count": ingested_count,
@@ -627,6 +665,29 @@ class TelemetryRepository:
 
     async def get_global_stats(self) -> Dict[str, Any]:
         """Get global telemetry statistics"""
+        try:
+            snapshot = await self.data_rollup.snapshot()
+            alerts_query = f"""
+                SELECT COUNT(*) as active_alerts
+                FROM {self.schema}.{self.alerts_table}
+                WHERE status = $1
+            """
+            async with self.db:
+                alerts_results = await self.db.query(
+                    alerts_query, ["active"], schema=self.schema
+                )
+
+            return {
+                "total_devices": snapshot.distinct("device_id"),
+                "total_points": snapshot.total,
+                "total_metrics": snapshot.distinct("metric_name"),
+                "active_alerts": (
+                    alerts_results[0]["active_alerts"] if alerts_results else 0
+                ),
+            }
+        except Exception as e:
+            logger.warning(f"Telemetry rollup unavailable, scanning data: {e}")
+
         try:
             # Total devices
             devices_query = f"""
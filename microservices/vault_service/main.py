@@ -28,6 +28,7 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from isa_common.consul_client import ConsulRegistry
 
@@ -258,6 +259,7 @@ async def lifespan(app: FastAPI):
                 logger.error(f"❌ Failed to deregister from Consul: {e}")
 
         logger.info("Vault Service shutting down...")
+    close_discovery_caches()
 
 
 # Create FastAPI application
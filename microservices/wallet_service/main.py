@@ -27,6 +27,7 @@ from core.metrics import setup_metrics
 from core.logger import setup_service_logger
 from core.nats_client import get_event_bus
 from core.health import HealthCheck
+from core.discovery_cache import close_discovery_caches
 
 from .models import (
     ConsumeRequest,
@@ -202,6 +203,7 @@ async def lifespan(app: FastAPI):
         logger.info("Event bus closed")
 
     await wallet_microservice.shutdown()
+    close_discovery_caches()
 
 
 # Create FastAPI application
@@ -0,0 +1,12 @@
+-- Wallet Service Migration: Reverse 004_add_wallet_daily_stats
+-- Version: 004 (downgrade)
+-- Date: 2026-10-18
+-- Description: Drop the daily statistics rollup and its maintenance trigger.
+
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats ON wallet.transactions;
+
+DROP FUNCTION IF EXISTS wallet.apply_transaction_to_daily_stats();
+
+DROP INDEX IF EXISTS wallet.idx_wallet_daily_stats_user_date;
+
+DROP TABLE IF EXISTS wallet.wallet_daily_stats;
@@ -0,0 +1,139 @@
+-- Wallet Service Migration: Add daily per-wallet statistics rollup
+-- Version: 004
+-- Date: 2026-10-18
+-- Description: WalletRepository.get_statistics used to pull at most 100
+--              transactions and sum them in Python, which was both slow
+--              and wrong for active wallets. Statistics are now served from
+--              a per-wallet, per-UTC-day rollup maintained by an AFTER INSERT
+--              trigger on wallet.transactions, so reads stay O(days) no
+--              matter how many transactions a wallet has. Partial days at
+--              the edges of a requested range are still aggregated from the
+--              raw transactions table (idx_transactions_wallet_created).
+
+CREATE TABLE IF NOT EXISTS wallet.wallet_daily_stats (
+    wallet_id VARCHAR(255) NOT NULL,
+    stat_date DATE NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    total_deposits DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_withdrawals DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_consumed DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_refunded DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_transfers_in DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_transfers_out DOUBLE PRECISION NOT NULL DEFAULT 0,
+    transaction_count BIGINT NOT NULL DEFAULT 0,
+    blockchain_transactions BIGINT NOT NULL DEFAULT 0,
+    total_gas_fees DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (wallet_id, stat_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_wallet_daily_stats_user_date
+    ON wallet.wallet_daily_stats(user_id, stat_date);
+
+-- Transfer direction: an explicit metadata.direction wins; otherwise the
+-- outgoing leg is the one that carries to_wallet_id (see
+-- WalletRepository.transfer).
+CREATE OR REPLACE FUNCTION wallet.apply_transaction_to_daily_stats()
+RETURNS TRIGGER AS $$
+DECLARE
+    is_transfer_in BOOLEAN;
+BEGIN
+    is_transfer_in := NEW.transaction_type = 'transfer' AND COALESCE(
+        NEW.metadata->>'direction' = 'in',
+        NEW.to_wallet_id IS NULL
+    );
+
+    INSERT INTO wallet.wallet_daily_stats AS s (
+        wallet_id,
+        stat_date,
+        user_id,
+        total_deposits,
+        total_withdrawals,
+        total_consumed,
+        total_refunded,
+        total_transfers_in,
+        total_transfers_out,
+        transaction_count,
+        blockchain_transactions,
+        total_gas_fees,
+        updated_at
+    ) VALUES (
+        NEW.wallet_id,
+        (COALESCE(NEW.created_at, NOW()) AT TIME ZONE 'UTC')::date,
+        NEW.user_id,
+        CASE WHEN NEW.transaction_type = 'deposit' THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.transaction_type = 'withdraw' THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.transaction_type = 'consume' THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.transaction_type = 'refund' THEN NEW.amount ELSE 0 END,
+        CASE WHEN is_transfer_in THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.transaction_type = 'transfer' AND NOT is_transfer_in THEN NEW.amount ELSE 0 END,
+        1,
+        CASE WHEN NEW.blockchain_txn_hash IS NOT NULL THEN 1 ELSE 0 END,
+        COALESCE(NEW.fee_amount, 0),
+        NOW()
+    )
+    ON CONFLICT (wallet_id, stat_date) DO UPDATE SET
+        total_deposits = s.total_deposits + EXCLUDED.total_deposits,
+        total_withdrawals = s.total_withdrawals + EXCLUDED.total_withdrawals,
+        total_consumed = s.total_consumed + EXCLUDED.total_consumed,
+        total_refunded = s.total_refunded + EXCLUDED.total_refunded,
+        total_transfers_in = s.total_transfers_in + EXCLUDED.total_transfers_in,
+        total_transfers_out = s.total_transfers_out + EXCLUDED.total_transfers_out,
+        transaction_count = s.transaction_count + 1,
+        blockchain_transactions = s.blockchain_transactions + EXCLUDED.blockchain_transactions,
+        total_gas_fees = s.total_gas_fees + EXCLUDED.total_gas_fees,
+        updated_at = NOW();
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats ON wallet.transactions;
+CREATE TRIGGER wallet_transactions_daily_stats
+    AFTER INSERT ON wallet.transactions
+    FOR EACH ROW
+    EXECUTE FUNCTION wallet.apply_transaction_to_daily_stats();
+
+-- Backfill from existing history. Rebuilt from scratch so the migration is
+-- safe to re-run.
+TRUNCATE wallet.wallet_daily_stats;
+
+INSERT INTO wallet.wallet_daily_stats (
+    wallet_id,
+    stat_date,
+    user_id,
+    total_deposits,
+    total_withdrawals,
+    total_consumed,
+    total_refunded,
+    total_transfers_in,
+    total_transfers_out,
+    transaction_count,
+    blockchain_transactions,
+    total_gas_fees
+)
+SELECT
+    t.wallet_id,
+    (t.created_at AT TIME ZONE 'UTC')::date,
+    MAX(t.user_id),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'deposit'), 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'withdraw'), 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'consume'), 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'refund'), 0),
+    COALESCE(SUM(t.amount) FILTER (
+        WHERE t.transaction_type = 'transfer'
+          AND COALESCE(t.metadata->>'direction' = 'in', t.to_wallet_id IS NULL)
+    ), 0),
+    COALESCE(SUM(t.amount) FILTER (
+        WHERE t.transaction_type = 'transfer'
+          AND NOT COALESCE(t.metadata->>'direction' = 'in', t.to_wallet_id IS NULL)
+    ), 0),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE t.blockchain_txn_hash IS NOT NULL),
+    COALESCE(SUM(t.fee_amount), 0)
+FROM wallet.transactions t
+GROUP BY t.wallet_id, (t.created_at AT TIME ZONE 'UTC')::date;
+
+COMMENT ON TABLE wallet.wallet_daily_stats IS
+    'Per-wallet, per-UTC-day transaction rollup backing wallet statistics.';
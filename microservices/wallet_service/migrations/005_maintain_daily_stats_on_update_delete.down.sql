@@ -0,0 +1,11 @@
+-- Wallet Service Migration: Reverse 005_maintain_daily_stats_on_update_delete
+-- Version: 005 (downgrade)
+-- Date: 2026-10-19
+-- Description: Drop the update/delete/truncate triggers. The shared trigger
+--              function keeps handling INSERT, as in migration 004.
+
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats_truncate ON wallet.transactions;
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats_delete ON wallet.transactions;
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats_update ON wallet.transactions;
+
+DROP FUNCTION IF EXISTS wallet.clear_daily_stats();
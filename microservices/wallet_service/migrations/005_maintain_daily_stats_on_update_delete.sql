@@ -0,0 +1,164 @@
+-- Wallet Service Migration: Keep daily statistics in step with updates and deletes
+-- Version: 005
+-- Date: 2026-10-19
+-- Description: Migration 004 maintained wallet.wallet_daily_stats from an
+--              AFTER INSERT trigger only, so correcting, moving or deleting
+--              a transaction left the rollup wrong forever. A row's
+--              contribution is now added on INSERT, removed on DELETE and
+--              swapped on UPDATE of any column the rollup reads; TRUNCATE
+--              empties the rollup. The rollup is rebuilt once at the end in
+--              case it has already drifted.
+
+-- Add (sign = 1) or remove (sign = -1) one transaction's contribution.
+-- Transfer direction: an explicit metadata.direction wins; otherwise the
+-- outgoing leg is the one that carries to_wallet_id (see
+-- WalletRepository.transfer).
+CREATE OR REPLACE FUNCTION wallet.add_transaction_to_daily_stats(
+    t wallet.transactions,
+    sign INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    is_transfer_in BOOLEAN;
+BEGIN
+    is_transfer_in := t.transaction_type = 'transfer' AND COALESCE(
+        t.metadata->>'direction' = 'in',
+        t.to_wallet_id IS NULL
+    );
+
+    INSERT INTO wallet.wallet_daily_stats AS s (
+        wallet_id,
+        stat_date,
+        user_id,
+        total_deposits,
+        total_withdrawals,
+        total_consumed,
+        total_refunded,
+        total_transfers_in,
+        total_transfers_out,
+        transaction_count,
+        blockchain_transactions,
+        total_gas_fees,
+        updated_at
+    ) VALUES (
+        t.wallet_id,
+        (COALESCE(t.created_at, NOW()) AT TIME ZONE 'UTC')::date,
+        t.user_id,
+        sign * CASE WHEN t.transaction_type = 'deposit' THEN t.amount ELSE 0 END,
+        sign * CASE WHEN t.transaction_type = 'withdraw' THEN t.amount ELSE 0 END,
+        sign * CASE WHEN t.transaction_type = 'consume' THEN t.amount ELSE 0 END,
+        sign * CASE WHEN t.transaction_type = 'refund' THEN t.amount ELSE 0 END,
+        sign * CASE WHEN is_transfer_in THEN t.amount ELSE 0 END,
+        sign * CASE WHEN t.transaction_type = 'transfer' AND NOT is_transfer_in THEN t.amount ELSE 0 END,
+        sign,
+        sign * CASE WHEN t.blockchain_txn_hash IS NOT NULL THEN 1 ELSE 0 END,
+        sign * COALESCE(t.fee_amount, 0),
+        NOW()
+    )
+    ON CONFLICT (wallet_id, stat_date) DO UPDATE SET
+        total_deposits = s.total_deposits + EXCLUDED.total_deposits,
+        total_withdrawals = s.total_withdrawals + EXCLUDED.total_withdrawals,
+        total_consumed = s.total_consumed + EXCLUDED.total_consumed,
+        total_refunded = s.total_refunded + EXCLUDED.total_refunded,
+        total_transfers_in = s.total_transfers_in + EXCLUDED.total_transfers_in,
+        total_transfers_out = s.total_transfers_out + EXCLUDED.total_transfers_out,
+        transaction_count = s.transaction_count + EXCLUDED.transaction_count,
+        blockchain_transactions = s.blockchain_transactions + EXCLUDED.blockchain_transactions,
+        total_gas_fees = s.total_gas_fees + EXCLUDED.total_gas_fees,
+        updated_at = NOW();
+
+    -- A day whose last transaction went away has nothing left to report
+    DELETE FROM wallet.wallet_daily_stats
+    WHERE wallet_id = t.wallet_id
+      AND stat_date = (COALESCE(t.created_at, NOW()) AT TIME ZONE 'UTC')::date
+      AND transaction_count <= 0;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION wallet.apply_transaction_to_daily_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM wallet.add_transaction_to_daily_stats(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM wallet.add_transaction_to_daily_stats(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION wallet.clear_daily_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM wallet.wallet_daily_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Status/confirmation updates do not touch the rollup
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats_update ON wallet.transactions;
+CREATE TRIGGER wallet_transactions_daily_stats_update
+    AFTER UPDATE ON wallet.transactions
+    FOR EACH ROW
+    WHEN ((OLD.wallet_id, OLD.user_id, OLD.transaction_type, OLD.amount,
+           OLD.created_at, OLD.to_wallet_id, OLD.metadata,
+           OLD.blockchain_txn_hash, OLD.fee_amount)
+          IS DISTINCT FROM
+          (NEW.wallet_id, NEW.user_id, NEW.transaction_type, NEW.amount,
+           NEW.created_at, NEW.to_wallet_id, NEW.metadata,
+           NEW.blockchain_txn_hash, NEW.fee_amount))
+    EXECUTE FUNCTION wallet.apply_transaction_to_daily_stats();
+
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats_delete ON wallet.transactions;
+CREATE TRIGGER wallet_transactions_daily_stats_delete
+    AFTER DELETE ON wallet.transactions
+    FOR EACH ROW
+    EXECUTE FUNCTION wallet.apply_transaction_to_daily_stats();
+
+DROP TRIGGER IF EXISTS wallet_transactions_daily_stats_truncate ON wallet.transactions;
+CREATE TRIGGER wallet_transactions_daily_stats_truncate
+    AFTER TRUNCATE ON wallet.transactions
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION wallet.clear_daily_stats();
+
+-- Rebuild once: updates and deletes before this migration were not applied
+LOCK TABLE wallet.transactions IN SHARE MODE;
+
+TRUNCATE wallet.wallet_daily_stats;
+
+INSERT INTO wallet.wallet_daily_stats (
+    wallet_id,
+    stat_date,
+    user_id,
+    total_deposits,
+    total_withdrawals,
+    total_consumed,
+    total_refunded,
+    total_transfers_in,
+    total_transfers_out,
+    transaction_count,
+    blockchain_transactions,
+    total_gas_fees
+)
+SELECT
+    t.wallet_id,
+    (t.created_at AT TIME ZONE 'UTC')::date,
+    MAX(t.user_id),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'deposit'), 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'withdraw'), 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'consume'), 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.transaction_type = 'refund'), 0),
+    COALESCE(SUM(t.amount) FILTER (
+        WHERE t.transaction_type = 'transfer'
+          AND COALESCE(t.metadata->>'direction' = 'in', t.to_wallet_id IS NULL)
+    ), 0),
+    COALESCE(SUM(t.amount) FILTER (
+        WHERE t.transaction_type = 'transfer'
+          AND NOT COALESCE(t.metadata->>'direction' = 'in', t.to_wallet_id IS NULL)
+    ), 0),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE t.blockchain_txn_hash IS NOT NULL),
+    COALESCE(SUM(t.fee_amount), 0)
+FROM wallet.transactions t
+GROUP BY t.wallet_id, (t.created_at AT TIME ZONE 'UTC')::date;
@@ -179,6 +179,15 @@ class WalletRepositoryProtocol(Protocol):
         """Get wallet statistics"""
         ...
 
+    async def get_user_statistics(
+        self,
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[WalletBalance, WalletStatistics]]:
+        """Get statistics for every wallet a user owns"""
+        ...
+
     async def anonymize_user_transactions(self, user_id: str) -> int:
         """Anonymize user transactions for GDPR compliance"""
         ...
@@ -49,6 +49,92 @@ def _pg_min_pool() -> int:
 logger = logging.getLogger(__name__)
 
 
+# Transfer direction mirrors migration 004: an explicit metadata.direction
+# wins, otherwise the outgoing leg is the one that carries to_wallet_id.
+_TRANSFER_IN = (
+    "transaction_type = 'transfer' "
+    "AND COALESCE(metadata->>'direction' = 'in', to_wallet_id IS NULL)"
+)
+
+_TRANSACTION_AGGREGATES = f"""
+    COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'deposit'), 0) AS total_deposits,
+    COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'withdraw'), 0) AS total_withdrawals,
+    COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'consume'), 0) AS total_consumed,
+    COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'refund'), 0) AS total_refunded,
+    COALESCE(SUM(amount) FILTER (WHERE {_TRANSFER_IN}), 0) AS total_transfers_in,
+    COALESCE(SUM(amount) FILTER (
+        WHERE transaction_type = 'transfer' AND NOT ({_TRANSFER_IN})
+    ), 0) AS total_transfers_out,
+    COUNT(*) AS transaction_count,
+    COUNT(*) FILTER (WHERE blockchain_txn_hash IS NOT NULL) AS blockchain_transactions,
+    COALESCE(SUM(fee_amount), 0) AS total_gas_fees
+"""
+
+_ROLLUP_AGGREGATES = """
+    SUM(total_deposits) AS total_deposits,
+    SUM(total_withdrawals) AS total_withdrawals,
+    SUM(total_consumed) AS total_consumed,
+    SUM(total_refunded) AS total_refunded,
+    SUM(total_transfers_in) AS total_transfers_in,
+    SUM(total_transfers_out) AS total_transfers_out,
+    SUM(transaction_count) AS transaction_count,
+    SUM(blockchain_transactions) AS blockchain_transactions,
+    SUM(total_gas_fees) AS total_gas_fees
+"""
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC, matching how created_at is written."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _plan_statistics_range(
+    start_date: Optional[datetime], end_date: Optional[datetime]
+) -> List[Tuple[str, Any, Any, bool]]:
+    """Split a statistics range into rollup days and raw-transaction edges.
+
+    Returns ``(kind, lower, upper, upper_inclusive)`` tuples where ``kind``
+    is ``"rollup"`` (bounds are dates, upper exclusive) or ``"raw"`` (bounds
+    are timestamps). ``end_date`` is inclusive, as in ``get_transactions``.
+    """
+    start = _as_utc(start_date) if start_date else None
+    end = _as_utc(end_date) if end_date else None
+
+    first_full_day = None
+    if start is not None:
+        first_full_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        if first_full_day < start:
+            first_full_day += timedelta(days=1)
+
+    last_partial_day = None
+    if end is not None:
+        last_partial_day = end.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if (
+        first_full_day is not None
+        and last_partial_day is not None
+        and first_full_day >= last_partial_day
+    ):
+        # No whole day inside the range -- a single indexed range scan.
+        return [("raw", start, end, True)]
+
+    plan: List[Tuple[str, Any, Any, bool]] = [
+        (
+            "rollup",
+            first_full_day.date() if first_full_day else None,
+            last_partial_day.date() if last_partial_day else None,
+            False,
+        )
+    ]
+    if start is not None and first_full_day > start:
+        plan.append(("raw", start, first_full_day, False))
+    if end is not None:
+        plan.append(("raw", last_partial_day, end, True))
+    return plan
+
+
 class WalletRepository:
     """Repository for wallet operations"""
 
@@ -81,6 +167,7 @@ class WalletRepository:
         self.wallets_table = "wallets"
         self.transactions_table = "transactions"
         self.event_processing_claims_table = "event_processing_claims"
+        self.daily_stats_table = "wallet_daily_stats"
 
         logger.info("WalletRepository initialized with PostgresClient")
 
@@ -755,75 +842,146 @@ class WalletRepository:
     ) -> Optional[WalletStatistics]:
         """Get wallet statistics"""
         try:
-            # Get wallet
             wallet = await self.get_wallet(wallet_id)
             if not wallet:
                 return None
 
-            # Get transactions for statistics
-            # Note: TransactionFilter.limit has max value of 100
-            # For accurate statistics, we should fetch in batches if needed
-            filter_params = TransactionFilter(
-                wallet_id=wallet_id,
-                start_date=start_date,
-                end_date=end_date,
-                limit=100,  # Max allowed by TransactionFilter validation
+            stats = await self.get_statistics_for_wallets(
+                [wallet_id], start_date, end_date
             )
-            transactions = await self.get_transactions(filter_params)
-
-            # Calculate statistics
-            stats = {
-                "total_deposits": Decimal(0),
-                "total_withdrawals": Decimal(0),
-                "total_consumed": Decimal(0),
-                "total_refunded": Decimal(0),
-                "total_transfers_in": Decimal(0),
-                "total_transfers_out": Decimal(0),
-                "transaction_count": len(transactions),
-                "blockchain_transactions": 0,
-                "total_gas_fees": Decimal(0),
-            }
-
-            for tx in transactions:
-                if tx.transaction_type == TransactionType.DEPOSIT:
-                    stats["total_deposits"] += tx.amount
-                elif tx.transaction_type == TransactionType.WITHDRAW:
-                    stats["total_withdrawals"] += tx.amount
-                elif tx.transaction_type == TransactionType.CONSUME:
-                    stats["total_consumed"] += tx.amount
-                elif tx.transaction_type == TransactionType.REFUND:
-                    stats["total_refunded"] += tx.amount
-                elif tx.transaction_type == TransactionType.TRANSFER:
-                    if tx.metadata and tx.metadata.get("direction") == "in":
-                        stats["total_transfers_in"] += tx.amount
-                    else:
-                        stats["total_transfers_out"] += tx.amount
-
-                if tx.blockchain_tx_hash:
-                    stats["blockchain_transactions"] += 1
-                if tx.gas_fee:
-                    stats["total_gas_fees"] += tx.gas_fee
-
-            return WalletStatistics(
-                wallet_id=wallet_id,
-                user_id=wallet.user_id,
-                current_balance=wallet.balance,
-                total_deposits=stats["total_deposits"],
-                total_withdrawals=stats["total_withdrawals"],
-                total_consumed=stats["total_consumed"],
-                total_refunded=stats["total_refunded"],
-                total_transfers_in=stats["total_transfers_in"],
-                total_transfers_out=stats["total_transfers_out"],
-                transaction_count=stats["transaction_count"],
-                blockchain_transactions=stats["blockchain_transactions"],
-                total_gas_fees=stats["total_gas_fees"],
-                period_start=start_date,
-                period_end=end_date,
+            return self._build_wallet_statistics(
+                wallet, stats.get(wallet_id), start_date, end_date
             )
         except Exception as e:
             logger.error(f"Error calculating statistics: {e}")
             return None
 
+    async def get_user_statistics(
+        self,
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> List[Tuple[WalletBalance, WalletStatistics]]:
+        """Get statistics for every wallet a user owns in one aggregate query"""
+        try:
+            wallets = await self.get_user_wallets(user_id)
+            if not wallets:
+                return []
+
+            stats = await self.get_statistics_for_wallets(
+                [w.wallet_id for w in wallets], start_date, end_date
+            )
+            return [
+                (
+                    wallet,
+                    self._build_wallet_statistics(
+                        wallet, stats.get(wallet.wallet_id), start_date, end_date
+                    ),
+                )
+                for wallet in wallets
+            ]
+        except Exception as e:
+            logger.error(f"Error calculating user statistics: {e}")
+            return []
+
+    async def get_statistics_for_wallets(
+        self,
+        wallet_ids: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Aggregate transaction statistics per wallet in SQL.
+
+        Whole UTC days inside the range are read from the
+        ``wallet_daily_stats`` rollup (migrations 004-005, kept in step with
+        inserts, updates and deletes by triggers); the partial days at
+        either edge are aggregated from raw transactions. The cost is
+        therefore bounded by the number of days in the range rather than
+        the number of transactions.
+        """
+        if not wallet_ids:
+            return {}
+
+        params: List[Any] = [list(wallet_ids)]
+
+        def bind(value: Any) -> str:
+            params.append(value)
+            return f"${len(params)}"
+
+        parts = []
+        for kind, lower, upper, upper_inclusive in _plan_statistics_range(
+            start_date, end_date
+        ):
+            conditions = ["wallet_id = ANY($1)"]
+            if kind == "rollup":
+                if lower is not None:
+                    conditions.append(f"stat_date >= {bind(lower)}")
+                if upper is not None:
+                    conditions.append(f"stat_date < {bind(upper)}")
+                parts.append(
+                    f"""
+                    SELECT wallet_id, {_ROLLUP_AGGREGATES}
+                    FROM {self.schema}.{self.daily_stats_table}
+                    WHERE {" AND ".join(conditions)}
+                    GROUP BY wallet_id
+                    """
+                )
+            else:
+                if lower is not None:
+                    conditions.append(f"created_at >= {bind(lower)}")
+                if upper is not None:
+                    op = "<=" if upper_inclusive else "<"
+                    conditions.append(f"created_at {op} {bind(upper)}")
+                parts.append(
+                    f"""
+                    SELECT wallet_id, {_TRANSACTION_AGGREGATES}
+                    FROM {self.schema}.{self.transactions_table}
+                    WHERE {" AND ".join(conditions)}
+                    GROUP BY wallet_id
+                    """
+                )
+
+        query = f"""
+            SELECT wallet_id, {_ROLLUP_AGGREGATES}
+            FROM ({" UNION ALL ".join(parts)}) AS combined
+            GROUP BY wallet_id
+        """
+
+        async with self.db:
+            results = await self.db.query(query, params, schema=self.schema)
+
+        return {row["wallet_id"]: row for row in results or []}
+
+    def _build_wallet_statistics(
+        self,
+        wallet: WalletBalance,
+        row: Optional[Dict[str, Any]],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> WalletStatistics:
+        """Convert an aggregate row into a WalletStatistics model"""
+        row = row or {}
+
+        def amount(column: str) -> Decimal:
+            return Decimal(str(row.get(column) or 0))
+
+        return WalletStatistics(
+            wallet_id=wallet.wallet_id,
+            user_id=wallet.user_id,
+            current_balance=wallet.balance,
+            total_deposits=amount("total_deposits"),
+            total_withdrawals=amount("total_withdrawals"),
+            total_consumed=amount("total_consumed"),
+            total_refunded=amount("total_refunded"),
+            total_transfers_in=amount("total_transfers_in"),
+            total_transfers_out=amount("total_transfers_out"),
+            transaction_count=int(row.get("transaction_count") or 0),
+            blockchain_transactions=int(row.get("blockchain_transactions") or 0),
+            total_gas_fees=amount("total_gas_fees"),
+            period_start=start_date,
+            period_end=end_date,
+        )
+
     async def _create_transaction(
         self,
         transaction_data: TransactionCreate,
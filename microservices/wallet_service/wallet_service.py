@@ -595,7 +595,9 @@ class WalletService:
     ) -> Dict[str, Any]:
         """Get aggregated statistics for all user wallets"""
         try:
-            wallets = await self.repository.get_user_wallets(user_id)
+            wallet_stats = await self.repository.get_user_statistics(
+                user_id, start_date, end_date
+            )
 
             total_stats = {
                 "total_balance": Decimal(0),
@@ -607,26 +609,22 @@ class WalletService:
                 "wallets": [],
             }
 
-            for wallet in wallets:
-                stats = await self.repository.get_statistics(
-                    wallet.wallet_id, start_date, end_date
+            for wallet, stats in wallet_stats:
+                total_stats["total_balance"] += wallet.balance
+                total_stats["total_deposits"] += stats.total_deposits
+                total_stats["total_withdrawals"] += stats.total_withdrawals
+                total_stats["total_consumed"] += stats.total_consumed
+                total_stats["total_refunded"] += stats.total_refunded
+                total_stats["transaction_count"] += stats.transaction_count
+                total_stats["wallets"].append(
+                    {
+                        "wallet_id": wallet.wallet_id,
+                        "wallet_type": wallet.wallet_type.value,
+                        "currency": wallet.currency,
+                        "balance": float(wallet.balance),
+                        "statistics": stats.model_dump(),
+                    }
                 )
-                if stats:
-                    total_stats["total_balance"] += wallet.balance
-                    total_stats["total_deposits"] += stats.total_deposits
-                    total_stats["total_withdrawals"] += stats.total_withdrawals
-                    total_stats["total_consumed"] += stats.total_consumed
-                    total_stats["total_refunded"] += stats.total_refunded
-                    total_stats["transaction_count"] += stats.transaction_count
-                    total_stats["wallets"].append(
-                        {
-                            "wallet_id": wallet.wallet_id,
-                            "wallet_type": wallet.wallet_type.value,
-                            "currency": wallet.currency,
-                            "balance": float(wallet.balance),
-                            "statistics": stats.model_dump(),
-                        }
-                    )
 
             return total_stats
 
@@ -0,0 +1,289 @@
+"""
+Weather Cache
+
+Two-tier cache for provider responses. Photo frames all poll weather at the
+top of the hour, so a popular city used to send one provider request per
+concurrent caller until the first response landed in the cache.
+
+- tier 1 is an in-process LRU; tier 2 is the repository cache (Redis, then
+  the weather_cache table), shared across replicas
+- concurrent misses for one key share a single provider fetch (single-flight)
+- entries are fresh for ``ttl`` and may then be served stale for up to
+  ``stale_ttl`` more while one background task refreshes them; a failed
+  refresh keeps serving the stale value until it runs out
+- keys use ``normalize_location``: names are case/whitespace-folded and
+  coordinates are bucketed by geohash, so nearby frames share an entry
+
+Tier-2 values are stored as ``{"data": ..., "fetched_at": epoch}`` and kept
+for ``ttl + stale_ttl``; plain values written before this format are
+treated as fresh.
+
+Usage:
+    cache = WeatherCache(repository)
+    data, cached = await cache.get_or_fetch(key, fetch, ttl=900, stale_ttl=3600)
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from core.metrics import create_counter
+
+logger = logging.getLogger(__name__)
+
+WEATHER_CACHE_LOOKUPS = create_counter(
+    "weather_cache_lookups_total",
+    "Weather cache lookups by outcome",
+    ["kind", "result"],
+)
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# 5 characters is a ~4.9km x 4.9km cell; weather does not vary inside it
+GEOHASH_PRECISION = 5
+
+_COORDINATES_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def geohash_encode(
+    latitude: float, longitude: float, precision: int = GEOHASH_PRECISION
+) -> str:
+    """Geohash of a point"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def geohash_center(geohash: str) -> Tuple[float, float]:
+    """(latitude, longitude) at the center of a geohash cell"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def parse_coordinates(location: str) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) if ``location`` is "lat,lon", else None"""
+    match = _COORDINATES_RE.match(location)
+    if not match:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+        return latitude, longitude
+    return None
+
+
+def normalize_location(location: str) -> str:
+    """
+    Cache key form of a location.
+
+    "lat,lon" becomes "geo:<geohash>"; names are lower-cased with runs of
+    whitespace collapsed and no spaces around commas ("New  York , US" ->
+    "new york,us").
+    """
+    coordinates = parse_coordinates(location)
+    if coordinates:
+        return f"geo:{geohash_encode(*coordinates)}"
+    name = " ".join(location.split()).lower()
+    return re.sub(r"\s*,\s*", ",", name)
+
+
+def provider_location(location: str) -> str:
+    """
+    Location to send the provider for a request.
+
+    Coordinates are replaced by their geohash cell center, so the one fetch
+    shared by a cell does not depend on which caller triggered it.
+    """
+    key = normalize_location(location)
+    if key.startswith("geo:"):
+        latitude, longitude = geohash_center(key[4:])
+        return f"{latitude:.4f},{longitude:.4f}"
+    return location.strip()
+
+
+@dataclass
+class _Entry:
+    data: Dict[str, Any]
+    fresh_until: float
+    stale_until: float
+
+
+class WeatherCache:
+    """In-process LRU over the repository cache, with single-flight and SWR"""
+
+    def __init__(self, repository, max_entries: int = 2048):
+        self.repository = repository
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        ttl: float,
+        stale_ttl: float = 0,
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Cached value for ``key``, fetching it on a miss.
+
+        Returns (data, cached); data is None if ``fetch`` failed and there
+        is nothing to serve.
+        """
+        kind = key.split(":", 2)[1] if key.count(":") >= 2 else "other"
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        if entry is None or now >= entry.fresh_until:
+            # Another replica may already have refreshed it
+            loaded = await self._load(key, ttl, stale_ttl)
+            if loaded is not None and (
+                entry is None or loaded.fresh_until > entry.fresh_until
+            ):
+                entry = loaded
+                self._remember(key, entry)
+
+        if entry is not None and now < entry.fresh_until:
+            WEATHER_CACHE_LOOKUPS.labels(kind=kind, result="hit").inc()
+            return entry.data, True
+        if entry is not None and now < entry.stale_until:
+            WEATHER_CACHE_LOOKUPS.labels(kind=kind, result="stale").inc()
+            self._refresh_in_background(key, fetch, ttl, stale_ttl)
+            return entry.data, True
+
+        WEATHER_CACHE_LOOKUPS.labels(kind=kind, result="miss").inc()
+        return await self._fetch_once(key, fetch, ttl, stale_ttl), False
+
+    async def close(self) -> None:
+        """Cancel in-flight fetches"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        # Tasks cancelled before they started never resolve their future
+        for future in self._inflight.values():
+            future.cancel()
+        self._inflight.clear()
+
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: str, ttl: float, stale_ttl: float) -> Optional[_Entry]:
+        """Tier-2 lookup"""
+        try:
+            payload = await self.repository.get_cached_weather(key)
+        except Exception as e:
+            logger.warning(f"Weather cache read failed for {key}: {e}")
+            return None
+        if isinstance(payload, str):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                return None
+        if not isinstance(payload, dict):
+            return None
+        if "data" in payload and "fetched_at" in payload:
+            fetched_at = float(payload["fetched_at"])
+            return _Entry(
+                payload["data"], fetched_at + ttl, fetched_at + ttl + stale_ttl
+            )
+        # Plain value from before envelopes; the repository TTL bounds its age
+        now = time.time()
+        return _Entry(payload, now + ttl, now + ttl)
+
+    async def _fetch_once(self, key, fetch, ttl, stale_ttl) -> Optional[Dict[str, Any]]:
+        """Fetch ``key`` from the provider; concurrent callers share one fetch"""
+        future = self._inflight.get(key) or self._start_fetch(
+            key, fetch, ttl, stale_ttl
+        )
+        # A cancelled caller must not cancel the fetch other callers wait on
+        return await asyncio.shield(future)
+
+    def _refresh_in_background(self, key, fetch, ttl, stale_ttl) -> None:
+        if key not in self._inflight:
+            self._start_fetch(key, fetch, ttl, stale_ttl)
+
+    def _start_fetch(self, key, fetch, ttl, stale_ttl) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        # Retrieve the outcome even when nobody waits (background refresh)
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+
+        async def run():
+            try:
+                data = await fetch()
+                if data is not None:
+                    await self._store(key, data, ttl, stale_ttl)
+                future.set_result(data)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                logger.warning(f"Weather fetch failed for {key}: {e}")
+                future.set_exception(e)
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return future
+
+    async def _store(
+        self, key: str, data: Dict[str, Any], ttl: float, stale_ttl: float
+    ) -> None:
+        now = time.time()
+        self._remember(key, _Entry(data, now + ttl, now + ttl + stale_ttl))
+        try:
+            await self.repository.set_cached_weather(
+                key, {"data": data, "fetched_at": now}, int(ttl + stale_ttl)
+            )
+        except Exception as e:
+            logger.warning(f"Weather cache write failed for {key}: {e}")
+
+
+__all__ = [
+    "WeatherCache",
+    "geohash_center",
+    "geohash_encode",
+    "normalize_location",
+    "parse_coordinates",
+    "provider_location",
+]
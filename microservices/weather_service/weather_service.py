@@ -8,8 +8,14 @@ import httpx
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from .weather_cache import (
+    WeatherCache,
+    normalize_location,
+    parse_coordinates,
+    provider_location,
+)
 from .weather_repository import WeatherRepository
 from .models import (
     WeatherCurrentRequest,
@@ -32,7 +38,10 @@ class WeatherService:
     """天气服务业务逻辑"""
 
     def __init__(self, event_bus=None):
-        self.repository = WeatherRepository()
+        self.cache = WeatherCache(
+            WeatherRepository(),
+            max_entries=int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "2048")),
+        )
         self.event_bus = event_bus
 
         # Load API keys from environment
@@ -43,6 +52,8 @@ class WeatherService:
         self.current_weather_ttl = int(os.getenv("WEATHER_CACHE_TTL", "900"))  # 15 min
         self.forecast_ttl = int(os.getenv("FORECAST_CACHE_TTL", "1800"))  # 30 min
         self.alerts_ttl = int(os.getenv("ALERTS_CACHE_TTL", "600"))  # 10 min
+        # How long past its TTL an entry may be served while it is refreshed
+        self.stale_ttl = int(os.getenv("WEATHER_CACHE_STALE_TTL", "3600"))  # 1 hour
 
         # Default provider
         self.default_provider = os.getenv(
@@ -52,8 +63,17 @@ class WeatherService:
         # HTTP client
         self.http_client = httpx.AsyncClient(timeout=30.0)
 
+    @property
+    def repository(self) -> WeatherRepository:
+        return self.cache.repository
+
+    @repository.setter
+    def repository(self, repository: WeatherRepository) -> None:
+        self.cache.repository = repository
+
     async def close(self):
         """Close HTTP client"""
+        await self.cache.close()
         await self.http_client.aclose()
 
     # =============================================================================
@@ -65,53 +85,53 @@ class WeatherService:
     ) -> Optional[WeatherCurrentResponse]:
         """获取当前天气"""
         try:
-            cache_key = f"weather:current:{request.location}:{request.units}"
+            cache_key = f"weather:current:{normalize_location(request.location)}:{request.units}"
 
-            # Check cache
-            cached = await self.repository.get_cached_weather(cache_key)
-            if cached:
-                cached["cached"] = True
-                return WeatherCurrentResponse(**cached)
+            async def fetch() -> Optional[Dict[str, Any]]:
+                weather_data = await self._fetch_current_weather(
+                    provider_location(request.location), request.units
+                )
+                if not weather_data:
+                    return None
+                await self._publish_weather_fetched(request, weather_data)
+                return WeatherCurrentResponse(**weather_data).model_dump(
+                    mode="json", exclude={"cached"}
+                )
 
-            # Fetch from API
-            weather_data = await self._fetch_current_weather(
-                request.location, request.units
+            data, cached = await self.cache.get_or_fetch(
+                cache_key, fetch, self.current_weather_ttl, self.stale_ttl
             )
-
-            if not weather_data:
+            if not data:
                 return None
-
-            # Cache the result
-            await self.repository.set_cached_weather(
-                cache_key, weather_data, self.current_weather_ttl
-            )
-
-            # Publish weather data fetched event
-            if self.event_bus:
-                try:
-                    event = Event(
-                        event_type="weather.data.fetched",
-                        source="weather_service",
-                        data={
-                            "location": request.location,
-                            "temperature": weather_data.get("temperature"),
-                            "condition": weather_data.get("condition"),
-                            "units": request.units,
-                            "provider": self.default_provider,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-                    await self.event_bus.publish_event(event)
-                except Exception as e:
-                    logger.error(f"Failed to publish weather.data.fetched event: {e}")
-
-            weather_data["cached"] = False
-            return WeatherCurrentResponse(**weather_data)
+            return WeatherCurrentResponse(**{**data, "cached": cached})
 
         except Exception as e:
             logger.error(f"Failed to get current weather: {e}")
             return None
 
+    async def _publish_weather_fetched(
+        self, request: WeatherCurrentRequest, weather_data: Dict[str, Any]
+    ) -> None:
+        """发布天气数据获取事件"""
+        if not self.event_bus:
+            return
+        try:
+            event = Event(
+                event_type="weather.data.fetched",
+                source="weather_service",
+                data={
+                    "location": request.location,
+                    "temperature": weather_data.get("temperature"),
+                    "condition": weather_data.get("condition"),
+                    "units": request.units,
+                    "provider": self.default_provider,
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+            )
+            await self.event_bus.publish_event(event)
+        except Exception as e:
+            logger.error(f"Failed to publish weather.data.fetched event: {e}")
+
     async def _fetch_current_weather(
         self, location: str, units: str = "metric"
     ) -> Optional[Dict[str, Any]]:
@@ -134,7 +154,11 @@ class WeatherService:
                 return None
 
             url = "https://api.openweathermap.org/data/2.5/weather"
-            params = {"q": location, "appid": self.openweather_api_key, "units": units}
+            params = {
+                **self._openweathermap_location(location),
+                "appid": self.openweather_api_key,
+                "units": units,
+            }
 
             response = await self.http_client.get(url, params=params)
             response.raise_for_status()
@@ -160,6 +184,14 @@ class WeatherService:
             logger.error(f"Error fetching weather: {e}")
             return None
 
+    @staticmethod
+    def _openweathermap_location(location: str) -> Dict[str, Any]:
+        """OpenWeatherMap的地点参数 (坐标用lat/lon)"""
+        coordinates = parse_coordinates(location)
+        if coordinates:
+            return {"lat": coordinates[0], "lon": coordinates[1]}
+        return {"q": location}
+
     async def _fetch_weatherapi_current(
         self, location: str
     ) -> Optional[Dict[str, Any]]:
@@ -201,27 +233,24 @@ class WeatherService:
     ) -> Optional[WeatherForecastResponse]:
         """获取天气预报"""
         try:
-            cache_key = f"weather:forecast:{request.location}:{request.days}"
-
-            # Check cache
-            cached = await self.repository.get_cached_weather(cache_key)
-            if cached:
-                cached["cached"] = True
-                return WeatherForecastResponse(**cached)
+            cache_key = f"weather:forecast:{normalize_location(request.location)}:{request.days}"
 
-            # Fetch from API
-            forecast_data = await self._fetch_forecast(request.location, request.days)
-
-            if not forecast_data:
-                return None
+            async def fetch() -> Optional[Dict[str, Any]]:
+                forecast_data = await self._fetch_forecast(
+                    provider_location(request.location), request.days
+                )
+                if not forecast_data:
+                    return None
+                return WeatherForecastResponse(**forecast_data).model_dump(
+                    mode="json", exclude={"cached"}
+                )
 
-            # Cache the result
-            await self.repository.set_cached_weather(
-                cache_key, forecast_data, self.forecast_ttl
+            data, cached = await self.cache.get_or_fetch(
+                cache_key, fetch, self.forecast_ttl, self.stale_ttl
             )
-
-            forecast_data["cached"] = False
-            return WeatherForecastResponse(**forecast_data)
+            if not data:
+                return None
+            return WeatherForecastResponse(**{**data, "cached": cached})
 
         except Exception as e:
             logger.error(f"Failed to get forecast: {e}")
@@ -251,7 +280,7 @@ class WeatherService:
 
             url = "https://api.openweathermap.org/data/2.5/forecast"
             params = {
-                "q": location,
+                **self._openweathermap_location(location),
                 "appid": self.openweather_api_key,
                 "units": "metric",
                 "cnt": cnt,
@@ -320,39 +349,24 @@ class WeatherService:
     async def get_weather_alerts(self, location: str) -> WeatherAlertResponse:
         """获取天气预警"""
         try:
-            # Check database for active alerts
-            alerts = await self.repository.get_active_alerts(location)
-
-            # Also fetch from API if configured
-            # (OpenWeatherMap One Call API supports alerts)
-
-            alert_objects = (
-                [WeatherAlert(**alert) for alert in alerts] if alerts else []
-            )
-
-            # Publish weather alert event if alerts exist
-            if alert_objects and self.event_bus:
-                try:
-                    event = Event(
-                        event_type="weather.alert.created",
-                        source="weather_service",
-                        data={
-                            "location": location,
-                            "alert_count": len(alert_objects),
-                            "alerts": [
-                                {
-                                    "severity": a.severity,
-                                    "alert_type": a.alert_type,
-                                    "headline": a.headline,
-                                }
-                                for a in alert_objects
-                            ],
-                            "timestamp": datetime.utcnow().isoformat(),
-                        },
-                    )
-                    await self.event_bus.publish_event(event)
-                except Exception as e:
-                    logger.error(f"Failed to publish weather.alert.created event: {e}")
+            # Alerts are looked up by exact location, so they are cached by
+            # it too: a normalized key would hand one spelling's alerts to
+            # another. They are never served stale.
+            lookup = location.strip()
+            cache_key = f"weather:alerts:{lookup}"
+
+            async def fetch() -> Dict[str, Any]:
+                # Check database for active alerts
+                # (OpenWeatherMap One Call API also supports alerts)
+                alerts = await self.repository.get_active_alerts(lookup)
+                alert_objects = [WeatherAlert(**alert) for alert in alerts or []]
+                # Publish once per refresh, not on every poll
+                if alert_objects:
+                    await self._publish_alerts_created(location, alert_objects)
+                return {"alerts": [a.model_dump(mode="json") for a in alert_objects]}
+
+            data, _ = await self.cache.get_or_fetch(cache_key, fetch, self.alerts_ttl)
+            alert_objects = [WeatherAlert(**a) for a in (data or {}).get("alerts", [])]
 
             return WeatherAlertResponse(
                 alerts=alert_objects, location=location, checked_at=datetime.utcnow()
@@ -364,6 +378,34 @@ class WeatherService:
                 alerts=[], location=location, checked_at=datetime.utcnow()
             )
 
+    async def _publish_alerts_created(
+        self, location: str, alert_objects: List[WeatherAlert]
+    ) -> None:
+        """发布天气预警事件"""
+        if not self.event_bus:
+            return
+        try:
+            event = Event(
+                event_type="weather.alert.created",
+                source="weather_service",
+                data={
+                    "location": location,
+                    "alert_count": len(alert_objects),
+                    "alerts": [
+                        {
+                            "severity": a.severity,
+                            "alert_type": a.alert_type,
+                            "headline": a.headline,
+                        }
+                        for a in alert_objects
+                    ],
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+            )
+            await self.event_bus.publish_event(event)
+        except Exception as e:
+            logger.error(f"Failed to publish weather.alert.created event: {e}")
+
     # =============================================================================
     # Favorite Locations
     # =============================================================================
@@ -251,9 +251,10 @@ class MockAccountRepository:
         offset: int = 0,
         is_active: Optional[bool] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[User]:
         """List accounts with pagination"""
-        self._log_call("list_accounts", limit=limit, offset=offset, is_active=is_active, search=search)
+        self._log_call("list_accounts", limit=limit, offset=offset, is_active=is_active, search=search, cursor=cursor)
 
         results = []
         for user in self._data.values():
@@ -271,6 +272,10 @@ class MockAccountRepository:
         # Apply pagination
         return results[offset:offset + limit]
 
+    def listing_cursor(self, user: User) -> str:
+        """Cursor continuing a listing after ``user``"""
+        return user.user_id
+
     async def search_accounts(self, query: str, limit: int = 50) -> List[User]:
         """Search accounts by name or email"""
         self._log_call("search_accounts", query=query, limit=limit)
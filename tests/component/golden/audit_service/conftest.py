@@ -20,8 +20,10 @@ class MockAuditRepository:
     def __init__(self):
         self.check_connection = AsyncMock(return_value=True)
         self.create_audit_event = AsyncMock()
+        self.create_audit_events = AsyncMock(return_value=True)
         self.get_audit_events = AsyncMock(return_value=[])
         self.query_audit_events = AsyncMock(return_value=[])
+        self.count_audit_events = AsyncMock(return_value=(0, False))
         self.get_user_activities = AsyncMock(return_value=[])
         self.get_user_activity_summary = AsyncMock(return_value={})
         self.create_security_event = AsyncMock()
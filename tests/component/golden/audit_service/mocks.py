@@ -4,7 +4,7 @@ Mock Audit Repository for Component Testing
 Implements AuditRepositoryProtocol for testing AuditService without database.
 """
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from microservices.audit_service.models import (
     AuditEvent, SecurityEvent, EventType, EventSeverity, EventStatus, AuditCategory
@@ -171,6 +171,17 @@ class MockAuditRepository(AuditRepositoryProtocol):
         self._update_stats()
         return event
 
+    async def create_audit_events(self, events: List[AuditEvent]) -> bool:
+        """Insert a batch of audit events"""
+        self._record_call("create_audit_events", count=len(events))
+        self._check_error()
+
+        for event in events:
+            if event.id:
+                self._events[event.id] = event
+        self._update_stats()
+        return True
+
     async def get_audit_events(
         self,
         user_id: Optional[str] = None,
@@ -210,9 +221,11 @@ class MockAuditRepository(AuditRepositoryProtocol):
         events.sort(key=lambda e: e.timestamp, reverse=True)
         return events[offset:offset + limit]
 
-    async def query_audit_events(self, query: Dict[str, Any]) -> List[AuditEvent]:
+    async def query_audit_events(
+        self, query: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[AuditEvent]:
         """Query audit events"""
-        self._record_call("query_audit_events", query=query)
+        self._record_call("query_audit_events", query=query, limit=limit)
         self._check_error()
 
         # Handle both dict and Pydantic model
@@ -231,10 +244,29 @@ class MockAuditRepository(AuditRepositoryProtocol):
             event_type=query_dict.get('event_type'),
             start_time=query_dict.get('start_time'),
             end_time=query_dict.get('end_time'),
-            limit=query_dict.get('limit', 100),
+            limit=limit if limit is not None else query_dict.get('limit', 100),
             offset=query_dict.get('offset', 0)
         )
 
+    async def count_audit_events(
+        self, query: Dict[str, Any], mode: str = "estimated"
+    ) -> Tuple[Optional[int], bool]:
+        """Count matching audit events"""
+        self._record_call("count_audit_events", query=query, mode=mode)
+        self._check_error()
+        if mode == "none":
+            return None, False
+        return len(await self.query_audit_events(query, limit=len(self._events) or 1)), False
+
+    async def stream_audit_events(
+        self, query: Dict[str, Any], batch_size: int = 1000
+    ) -> AsyncIterator[AuditEvent]:
+        """Stream all matching audit events"""
+        self._record_call("stream_audit_events", query=query)
+        self._check_error()
+        for event in await self.query_audit_events(query, limit=len(self._events) or 1):
+            yield event
+
     async def get_user_activities(
         self,
         user_id: str,
@@ -372,19 +372,19 @@ class TestAuditServiceCleanupGolden:
 class TestAuditServiceErrorHandlingGolden:
     """Golden: AuditService error handling current behavior"""
 
-    async def test_query_events_returns_empty_on_error(self, mock_repo):
-        """GOLDEN: query_events returns empty response on error"""
+    async def test_query_events_raises_on_error(self, mock_repo):
+        """GOLDEN: query_events raises instead of returning an empty page"""
         from microservices.audit_service.audit_service import AuditService
         from microservices.audit_service.models import AuditQueryRequest
+        from microservices.audit_service.protocols import AuditServiceError
 
         mock_repo.set_error(Exception("Database error"))
 
         service = AuditService(repository=mock_repo)
         query = AuditQueryRequest()
 
-        result = await service.query_events(query)
-
-        assert len(result.events) == 0
+        with pytest.raises(AuditServiceError):
+            await service.query_events(query)
 
     async def test_get_statistics_returns_defaults_on_error(self, mock_repo):
         """GOLDEN: get_service_statistics returns defaults on error"""
@@ -5,7 +5,7 @@ These mocks implement the protocols defined in device_service.protocols
 without requiring actual I/O dependencies.
 """
 from typing import Any, Dict, List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from microservices.device_service.models import (
     DeviceResponse,
     DeviceGroupResponse,
@@ -33,6 +33,13 @@ class MockDeviceRepository:
             "get_device_group_by_id": 0,
             "create_device_command": 0,
             "update_command_status": 0,
+            "list_group_device_ids": 0,
+            "bulk_create_device_commands": 0,
+            "bulk_update_command_status": 0,
+            "bulk_acknowledge_commands": 0,
+            "get_command_batch_summary": 0,
+            "get_command_batch_updates": 0,
+            "expire_command_batch": 0,
             "check_connection": 0,
         }
 
@@ -203,6 +210,167 @@ class MockDeviceRepository:
 
         return True
 
+    async def list_group_device_ids(self, group_id: str) -> List[str]:
+        """IDs of commandable devices in a group and its subgroups"""
+        self.call_count["list_group_device_ids"] += 1
+
+        group_ids = {group_id}
+        while True:
+            children = {
+                g.group_id for g in self.device_groups.values()
+                if g.parent_group_id in group_ids
+            } - group_ids
+            if not children:
+                break
+            group_ids |= children
+        return [
+            d.device_id for d in self.devices.values()
+            if d.group_id in group_ids and d.status != DeviceStatus.DECOMMISSIONED
+        ]
+
+    async def bulk_create_device_commands(
+        self, commands: List[Dict[str, Any]], chunk_size: int = 1000
+    ) -> int:
+        """Insert many pending commands"""
+        self.call_count["bulk_create_device_commands"] += 1
+
+        now = datetime.now(timezone.utc)
+        for command in commands:
+            self.commands[command["command_id"]] = {
+                **command, "status": "pending", "created_at": now,
+            }
+        return len(commands)
+
+    async def bulk_update_command_status(
+        self,
+        command_ids: List[str],
+        status: str,
+        error_message: Optional[str] = None,
+    ) -> int:
+        """Set the dispatch outcome of many pending commands"""
+        if not command_ids:
+            return 0
+        self.call_count["bulk_update_command_status"] += 1
+
+        updated = 0
+        now = datetime.now(timezone.utc)
+        for command_id in command_ids:
+            command = self.commands.get(command_id)
+            if not command or command["status"] != "pending":
+                continue
+            command["status"] = status
+            if status == "sent":
+                command["sent_at"] = now
+            else:
+                command["completed_at"] = now
+            if error_message:
+                command["error_message"] = error_message
+            updated += 1
+        return updated
+
+    async def bulk_acknowledge_commands(
+        self, device_id: str, acks: List[Dict[str, Any]]
+    ) -> int:
+        """Apply a device's command acknowledgements"""
+        self.call_count["bulk_acknowledge_commands"] += 1
+
+        updated = 0
+        now = datetime.now(timezone.utc)
+        for ack in acks:
+            command = self.commands.get(ack["command_id"])
+            if (
+                not command
+                or command["device_id"] != device_id
+                or command["status"] in ("executed", "failed", "timeout")
+            ):
+                continue
+            command["status"] = ack["status"]
+            command["acknowledged_at"] = command.get("acknowledged_at") or now
+            if ack["status"] != "acknowledged":
+                command["completed_at"] = now
+            if ack.get("result") is not None:
+                command["result"] = ack["result"]
+            if ack.get("error_message"):
+                command["error_message"] = ack["error_message"]
+            updated += 1
+        return updated
+
+    def _batch_commands(self, batch_id: str) -> List[Dict[str, Any]]:
+        return [c for c in self.commands.values() if c.get("batch_id") == batch_id]
+
+    async def get_command_batch_summary(
+        self, batch_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Progress of a command batch"""
+        self.call_count["get_command_batch_summary"] += 1
+
+        commands = self._batch_commands(batch_id)
+        if not commands:
+            return None
+        summary = {
+            "batch_id": batch_id,
+            "user_id": commands[0]["user_id"],
+            "group_id": commands[0].get("group_id"),
+            "command": commands[0]["command"],
+            "total": len(commands),
+            "awaiting": sum(
+                1 for c in commands
+                if c["require_ack"] and c["status"] in ("pending", "sent")
+            ),
+            "deadline": min(c["created_at"] for c in commands)
+            + timedelta(seconds=max(c["timeout"] for c in commands)),
+        }
+        for status in ("pending", "sent", "acknowledged", "executed", "failed", "timeout"):
+            summary[status] = sum(1 for c in commands if c["status"] == status)
+        return summary
+
+    async def get_command_batch_updates(
+        self,
+        batch_id: str,
+        exclude_command_ids: List[str],
+        after_command_id: str = "",
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Acknowledged / finished commands of a batch not in exclude_command_ids"""
+        self.call_count["get_command_batch_updates"] += 1
+
+        excluded = set(exclude_command_ids)
+        updates = []
+        for command in self._batch_commands(batch_id):
+            if (
+                command["status"] not in ("acknowledged", "executed", "failed", "timeout")
+                or command["command_id"] in excluded
+                or command["command_id"] <= after_command_id
+            ):
+                continue
+            stamps = [
+                t for t in (command.get("acknowledged_at"), command.get("completed_at"))
+                if t is not None
+            ]
+            updates.append({
+                "command_id": command["command_id"],
+                "device_id": command["device_id"],
+                "status": command["status"],
+                "result": command.get("result"),
+                "error_message": command.get("error_message"),
+                "updated_at": max(stamps) if stamps else None,
+            })
+        updates.sort(key=lambda u: u["command_id"])
+        return updates[:limit]
+
+    async def expire_command_batch(self, batch_id: str) -> int:
+        """Mark a batch's unacknowledged commands as timed out"""
+        self.call_count["expire_command_batch"] += 1
+
+        expired = 0
+        now = datetime.now(timezone.utc)
+        for command in self._batch_commands(batch_id):
+            if command["require_ack"] and command["status"] in ("pending", "sent"):
+                command["status"] = "timeout"
+                command["completed_at"] = now
+                expired += 1
+        return expired
+
     async def check_connection(self) -> bool:
         """Check database connection"""
         self.call_count["check_connection"] += 1
@@ -251,10 +419,12 @@ class MockMQTTCommandClient:
     def __init__(self):
         self.connected = False
         self.sent_commands: List[Dict[str, Any]] = []
+        self.failing_device_ids: set = set()
         self.call_count = {
             "connect": 0,
             "disconnect": 0,
             "send_device_command": 0,
+            "send_device_commands": 0,
             "is_connected": 0,
         }
 
@@ -275,12 +445,13 @@ class MockMQTTCommandClient:
         parameters: Dict[str, Any],
         timeout: int = 30,
         priority: int = 1,
-        require_ack: bool = True
+        require_ack: bool = True,
+        command_id: Optional[str] = None,
     ) -> Optional[str]:
         """Send command to device via MQTT"""
         self.call_count["send_device_command"] += 1
 
-        command_id = f"cmd_{len(self.sent_commands) + 1}"
+        command_id = command_id or f"cmd_{len(self.sent_commands) + 1}"
         self.sent_commands.append({
             "command_id": command_id,
             "device_id": device_id,
@@ -293,6 +464,28 @@ class MockMQTTCommandClient:
 
         return command_id
 
+    async def send_device_commands(
+        self,
+        commands: List[Dict[str, Any]],
+        batch_size: int = 500,
+        max_concurrency: int = 8,
+    ) -> Dict[str, bool]:
+        """Send many commands; returns command_id -> published"""
+        self.call_count["send_device_commands"] += 1
+
+        published = {}
+        for command in commands:
+            ok = command["device_id"] not in self.failing_device_ids
+            if ok:
+                self.sent_commands.append({
+                    key: command.get(key) for key in (
+                        "command_id", "device_id", "command", "parameters",
+                        "timeout", "priority", "require_ack",
+                    )
+                })
+            published[command["command_id"]] = ok
+        return published
+
     def is_connected(self) -> bool:
         """Check if MQTT client is connected"""
         self.call_count["is_connected"] += 1
@@ -160,6 +160,20 @@ class MockDocumentRepository:
 
         return self._documents.get(doc_id)
 
+    async def get_documents_by_ids(
+        self, doc_ids: List[str]
+    ) -> Dict[str, KnowledgeDocument]:
+        """Get many documents by ID"""
+        self._log_call("get_documents_by_ids", doc_ids=list(doc_ids))
+        if self._error:
+            raise self._error
+
+        return {
+            doc_id: self._documents[doc_id]
+            for doc_id in doc_ids
+            if doc_id in self._documents
+        }
+
     async def list_user_documents(
         self,
         user_id: str,
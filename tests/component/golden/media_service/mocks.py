@@ -34,6 +34,7 @@ class MockMediaRepository:
         self.get_photo_version = AsyncMock(return_value=None)
         self.list_photo_versions = AsyncMock(return_value=[])
         self.delete_photo_version = AsyncMock(return_value=True)
+        self.get_current_versions = AsyncMock(return_value={})
 
         # Photo Metadata methods - create returns input
         self.create_or_update_metadata = AsyncMock(side_effect=lambda x: x)
@@ -45,11 +46,14 @@ class MockMediaRepository:
         self.list_user_playlists = AsyncMock(return_value=[])
         self.update_playlist = AsyncMock()  # Set return_value in test
         self.delete_playlist = AsyncMock(return_value=True)
+        self.get_playlists_by_ids = AsyncMock(return_value={})
 
         # Rotation Schedule methods - create returns input
         self.create_rotation_schedule = AsyncMock(side_effect=lambda x: x)
         self.get_rotation_schedule = AsyncMock(return_value=None)
         self.list_frame_schedules = AsyncMock(return_value=[])
+        self.list_active_schedules = AsyncMock(return_value=[])
+        self.claim_prefetch_pass = AsyncMock(return_value=True)
         self.update_schedule_status = AsyncMock()
         self.delete_rotation_schedule = AsyncMock(return_value=True)
 
@@ -59,6 +63,11 @@ class MockMediaRepository:
         self.get_frame_cache = AsyncMock(return_value=None)
         self.list_frame_cache = AsyncMock(return_value=[])
         self.update_cache_status = AsyncMock()
+        self.increment_cache_hit = AsyncMock(return_value=True)
+        self.bulk_create_photo_cache = AsyncMock(
+            side_effect=lambda entries: [e.cache_id for e in entries]
+        )
+        self.delete_photo_caches = AsyncMock(side_effect=lambda ids: len(ids))
 
         # Health check
         self.check_connection = AsyncMock(return_value=True)
@@ -339,6 +339,40 @@ class TestNotificationServiceSendGolden:
 
         assert result.notification is not None
 
+    async def test_send_notification_with_seen_idempotency_key_returns_existing(
+        self, notification_service, mock_notification_repository
+    ):
+        """GOLDEN: a repeated idempotency_key returns the existing notification"""
+        from microservices.notification_service.models import (
+            Notification,
+            NotificationStatus,
+            NotificationType,
+            SendNotificationRequest,
+        )
+
+        existing = Notification(
+            notification_id="ntf_existing",
+            type=NotificationType.IN_APP,
+            content="Hi",
+            status=NotificationStatus.SENT,
+            idempotency_key="k1",
+        )
+        mock_notification_repository.create_notification.side_effect = None
+        mock_notification_repository.create_notification.return_value = existing
+
+        request = SendNotificationRequest(
+            type=NotificationType.IN_APP,
+            recipient_id="usr_1",
+            content="Hi",
+            idempotency_key="k1",
+        )
+
+        result = await notification_service.send_notification(request)
+
+        assert result.notification.notification_id == "ntf_existing"
+        assert result.notification.status == NotificationStatus.SENT
+        mock_notification_repository.claim_notification.assert_not_awaited()
+
 
 # =============================================================================
 # Batch Notifications - Current Behavior
@@ -386,6 +420,33 @@ class TestNotificationServiceBatchGolden:
         assert isinstance(result, BatchResponse)
         assert result.batch is not None
 
+    async def test_send_batch_reports_each_recipient(
+        self, notification_service, mock_notification_repository
+    ):
+        """GOLDEN: send_batch returns one result per recipient"""
+        from microservices.notification_service.models import (
+            NotificationStatus,
+            NotificationType,
+            SendBatchRequest,
+        )
+
+        request = SendBatchRequest(
+            type=NotificationType.IN_APP,
+            recipients=[
+                {"user_id": "usr_1", "content": "Hi", "idempotency_key": "k1"},
+                {"email": "not-an-email", "content": "Hi", "idempotency_key": "k2"},
+            ],
+        )
+
+        result = await notification_service.send_batch(request)
+
+        first, second = result.results
+        assert (first.index, first.idempotency_key) == (0, "k1")
+        assert first.status == NotificationStatus.PENDING
+        assert first.notification_id is not None
+        assert (second.index, second.status) == (1, None)
+        assert second.error
+
 
 # =============================================================================
 # User Notifications - Current Behavior
@@ -300,6 +300,110 @@ class MockOrganizationRepository:
 
         return False
 
+    def _find_member(self, organization_id: str, user_id: str) -> Optional[Dict]:
+        for member in self._members.get(organization_id, []):
+            if member["user_id"] == user_id:
+                return member
+        return None
+
+    async def get_members_by_user_ids(
+        self, organization_id: str, user_ids: List[str]
+    ) -> Dict[str, Dict]:
+        """Get memberships (any status) for many users, keyed by user_id"""
+        self._log_call(
+            "get_members_by_user_ids",
+            organization_id=organization_id,
+            user_ids=list(user_ids),
+        )
+
+        if self._error:
+            raise self._error
+
+        return {
+            member["user_id"]: dict(member)
+            for member in self._members.get(organization_id, [])
+            if member["user_id"] in set(user_ids)
+        }
+
+    async def bulk_add_organization_members(
+        self, organization_id: str, members: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Add many members; inactive memberships are reactivated"""
+        self._log_call(
+            "bulk_add_organization_members",
+            organization_id=organization_id,
+            members=members,
+        )
+
+        if self._error:
+            raise self._error
+
+        added = []
+        for item in members:
+            member = self._find_member(organization_id, item["user_id"])
+            if member is None:
+                self.set_member(
+                    organization_id,
+                    item["user_id"],
+                    role=item["role"],
+                    permissions=item.get("permissions"),
+                )
+            elif member["status"] == "inactive":
+                member.update(
+                    role=item["role"],
+                    status="active",
+                    permissions=item.get("permissions") or [],
+                )
+            else:
+                continue
+            added.append(item["user_id"])
+        return added
+
+    async def bulk_update_organization_members(
+        self, organization_id: str, members: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Update many members; None fields are left unchanged"""
+        self._log_call(
+            "bulk_update_organization_members",
+            organization_id=organization_id,
+            members=members,
+        )
+
+        if self._error:
+            raise self._error
+
+        updated = []
+        for item in members:
+            member = self._find_member(organization_id, item["user_id"])
+            if member is None:
+                continue
+            for key in ("role", "status", "permissions"):
+                if item.get(key) is not None:
+                    member[key] = item[key]
+            updated.append(item["user_id"])
+        return updated
+
+    async def bulk_remove_organization_members(
+        self, organization_id: str, user_ids: List[str]
+    ) -> List[str]:
+        """Soft-remove many active members"""
+        self._log_call(
+            "bulk_remove_organization_members",
+            organization_id=organization_id,
+            user_ids=list(user_ids),
+        )
+
+        if self._error:
+            raise self._error
+
+        removed = []
+        for user_id in user_ids:
+            member = self._find_member(organization_id, user_id)
+            if member is not None and member["status"] == "active":
+                member["status"] = "inactive"
+                removed.append(user_id)
+        return removed
+
     async def get_organization_members(
         self,
         organization_id: str,
@@ -363,6 +467,30 @@ class MockOrganizationRepository:
 
         return None
 
+    async def get_user_memberships(self, user_id: str) -> List[Dict]:
+        """Get all memberships of a user (any status), in join order"""
+        self._log_call("get_user_memberships", user_id=user_id)
+
+        if self._error:
+            raise self._error
+
+        memberships = [
+            member
+            for members in self._members.values()
+            for member in members
+            if member["user_id"] == user_id
+        ]
+        memberships.sort(key=lambda m: m["joined_at"])
+        return [
+            {
+                "organization_id": m["organization_id"],
+                "role": m["role"],
+                "permissions": m.get("permissions", []),
+                "status": m["status"],
+            }
+            for m in memberships
+        ]
+
     async def get_organization_stats(self, organization_id: str) -> Dict[str, Any]:
         """Get organization statistics"""
         self._log_call("get_organization_stats", organization_id=organization_id)
@@ -388,6 +516,10 @@ class MockOrganizationRepository:
             "created_at": org["created_at"],
         }
 
+    def listing_cursor(self, organization: OrganizationResponse) -> str:
+        """Cursor continuing a listing after ``organization``"""
+        return organization.organization_id
+
     async def list_all_organizations(
         self,
         limit: int = 100,
@@ -395,6 +527,7 @@ class MockOrganizationRepository:
         search: Optional[str] = None,
         plan_filter: Optional[str] = None,
         status_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[OrganizationResponse]:
         """List all organizations with filters"""
         self._log_call(
@@ -404,6 +537,7 @@ class MockOrganizationRepository:
             search=search,
             plan_filter=plan_filter,
             status_filter=status_filter,
+            cursor=cursor,
         )
 
         results = []
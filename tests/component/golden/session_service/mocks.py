@@ -188,6 +188,7 @@ class MockSessionMessageRepository:
         self._messages: Dict[str, Dict] = {}
         self._message_by_session: Dict[str, List[str]] = {}
         self.create_message = AsyncMock(side_effect=self._create_message)
+        self.append_messages = AsyncMock(side_effect=self._append_messages)
         self.get_session_messages = AsyncMock(side_effect=self._get_session_messages)
 
     async def _create_message(self, message_data: Dict[str, Any]) -> Any:
@@ -227,6 +228,17 @@ class MockSessionMessageRepository:
 
         return message
 
+    async def _append_messages(
+        self, session_id: str, user_id: str, messages: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """Mock batch append (messages + session counters)"""
+        return [
+            await self._create_message(
+                {**message, "session_id": session_id, "user_id": user_id}
+            )
+            for message in messages
+        ]
+
     async def _get_session_messages(
         self, session_id: str, limit: int = 100, offset: int = 0
     ) -> List[Any]:
@@ -613,8 +613,10 @@ class TestMessageAdd:
         # Act
         await session_service.add_message(session.session_id, message_request, user_id)
 
-        # Verify increment_message_count was called
-        mock_session_repository.increment_message_count.assert_called()
+        # Message insert and counter update go through one repository call
+        mock_message_repository.append_messages.assert_called_once()
+        appended = mock_message_repository.append_messages.call_args.args[2]
+        assert appended[0]["tokens_used"] == 100
 
     async def test_add_message_to_nonexistent_session_raises_error(
         self, session_service
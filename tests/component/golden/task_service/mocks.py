@@ -36,6 +36,7 @@ class MockTaskRepository:
         self._call_log: List[Dict] = []
         self._id_counter: int = 1
         self._execution_counter: int = 1
+        self._leases: Dict[str, tuple] = {}  # task_id -> (owner, expires_at)
 
     def set_task(
         self,
@@ -378,6 +379,79 @@ class MockTaskRepository:
         self._tasks[task_id] = TaskResponse(**updated_data)
         return True
 
+    async def claim_due_tasks(
+        self, owner: str, limit: int, lease_seconds: float
+    ) -> List[TaskResponse]:
+        """Lease due tasks (scheduled and due, or running with an expired lease)"""
+        self._log_call("claim_due_tasks", owner=owner, limit=limit)
+        if self._error:
+            raise self._error
+
+        now = datetime.now(timezone.utc)
+        leases = self._leases
+        claimed = []
+        for task in self._tasks.values():
+            if len(claimed) >= limit:
+                break
+            if task.deleted_at is not None:
+                continue
+            due = task.status == TaskStatus.SCHEDULED and (
+                task.next_run_time is None or task.next_run_time <= now
+            )
+            lease = leases.get(task.task_id)
+            expired = task.status == TaskStatus.RUNNING and lease and lease[1] < now
+            if due or expired:
+                leases[task.task_id] = (owner, now + timedelta(seconds=lease_seconds))
+                self._tasks[task.task_id] = task.copy(update={"status": TaskStatus.RUNNING})
+                claimed.append(self._tasks[task.task_id])
+        return claimed
+
+    async def renew_task_leases(
+        self, owner: str, task_ids: List[str], lease_seconds: float
+    ) -> List[str]:
+        """Extend leases still held by owner"""
+        self._log_call("renew_task_leases", owner=owner, task_ids=task_ids)
+        leases = self._leases
+        expires = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+        renewed = []
+        for task_id in task_ids:
+            if leases.get(task_id, (None,))[0] == owner:
+                leases[task_id] = (owner, expires)
+                renewed.append(task_id)
+        return renewed
+
+    async def release_task_lease(
+        self, task_id: str, owner: str, status: str, next_run_time: Optional[datetime]
+    ) -> bool:
+        """Record a scheduled run's outcome and drop the lease"""
+        self._log_call(
+            "release_task_lease",
+            task_id=task_id,
+            owner=owner,
+            status=status,
+            next_run_time=next_run_time,
+        )
+        leases = self._leases
+        if leases.get(task_id, (None,))[0] != owner:
+            return False
+        del leases[task_id]
+        self._tasks[task_id] = self._tasks[task_id].copy(
+            update={"status": TaskStatus(status), "next_run_time": next_run_time}
+        )
+        return True
+
+    async def get_scheduler_backlog(self) -> Dict[str, Any]:
+        """Count and oldest due time of unclaimed due tasks"""
+        now = datetime.now(timezone.utc)
+        due = [
+            task.next_run_time or task.updated_at
+            for task in self._tasks.values()
+            if task.deleted_at is None
+            and task.status == TaskStatus.SCHEDULED
+            and (task.next_run_time is None or task.next_run_time <= now)
+        ]
+        return {"due": len(due), "oldest_due_at": min(due) if due else None}
+
     async def create_execution_record(
         self, task_id: str, user_id: str, execution_data: Dict[str, Any]
     ) -> Optional[TaskExecutionResponse]:
@@ -437,6 +511,8 @@ class MockTaskRepository:
         now = datetime.now(timezone.utc)
         updated_data = execution.dict()
         updated_data.update(updates)
+        if updates.get("status") in ("completed", "failed", "cancelled"):
+            updated_data["completed_at"] = now
         if updates.get("success"):
             updated_data["status"] = TaskStatus.COMPLETED
             updated_data["completed_at"] = now
@@ -8,6 +8,7 @@ import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, patch
 
+from microservices.weather_service.weather_cache import normalize_location
 from tests.contracts.weather.data_contract import WeatherTestDataFactory
 
 pytestmark = [pytest.mark.component, pytest.mark.golden, pytest.mark.asyncio]
@@ -126,7 +127,7 @@ class TestWeatherServiceGetForecast:
         # Arrange
         location = WeatherTestDataFactory.make_location()
         days = 5
-        cache_key = f"weather:forecast:{location}:{days}"
+        cache_key = f"weather:forecast:{normalize_location(location)}:{days}"
 
         cached_forecast = {
             "location": location,
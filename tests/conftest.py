@@ -23,6 +23,10 @@ import pytest
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
+# No Consul watcher threads in tests: core.discovery_cache falls back to
+# fetching on lookup (tests that need watchers pass watch=True)
+os.environ.setdefault("DISCOVERY_WATCH", "false")
+
 # Import shared fixtures from tests/fixtures
 from tests.fixtures import (
     # Common
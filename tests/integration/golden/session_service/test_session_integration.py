@@ -644,15 +644,14 @@ class TestMessageOperations:
 
         GIVEN: An active session
         WHEN: add_message is called
-        THEN: Message is created and metrics are updated
+        THEN: Message is created and metrics are updated in one write
         """
         # Arrange
         request_contract = SessionTestDataFactory.make_message_create_request()
         request = MessageCreateRequest(**request_contract.model_dump())
 
         mock_session_repository.get_by_session_id.return_value = sample_session
-        mock_message_repository.create_message.return_value = sample_message
-        mock_session_repository.increment_message_count.return_value = True
+        mock_message_repository.append_messages.return_value = [sample_message]
 
         # Act
         result = await session_service.add_message(
@@ -664,8 +663,9 @@ class TestMessageOperations:
         # Assert
         assert result.message_id == sample_message.message_id
         assert result.session_id == sample_session.session_id
-        mock_message_repository.create_message.assert_called_once()
-        mock_session_repository.increment_message_count.assert_called_once()
+        # Message insert and session counters are one repository call
+        mock_message_repository.append_messages.assert_called_once()
+        mock_session_repository.increment_message_count.assert_not_called()
 
     async def test_add_message_validates_role(
         self, session_service, mock_session_repository, sample_session
@@ -734,8 +734,7 @@ class TestMessageOperations:
         request = MessageCreateRequest(**request_contract.model_dump())
 
         mock_session_repository.get_by_session_id.return_value = sample_session
-        mock_message_repository.create_message.return_value = sample_message
-        mock_session_repository.increment_message_count.return_value = True
+        mock_message_repository.append_messages.return_value = [sample_message]
 
         # Act
         await session_service.add_message(sample_session.session_id, request)
@@ -764,8 +763,7 @@ class TestMessageOperations:
         sample_message.tokens_used = 0
         sample_message.cost_usd = 0.0
         mock_session_repository.get_by_session_id.return_value = sample_session
-        mock_message_repository.create_message.return_value = sample_message
-        mock_session_repository.increment_message_count.return_value = True
+        mock_message_repository.append_messages.return_value = [sample_message]
 
         # Act
         await session_service.add_message(sample_session.session_id, request)
@@ -1,15 +1,20 @@
+import json
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from core.redis_cache import RedisCache
 from microservices.auth_service.api_key_repository import ApiKeyRepository
 
 pytestmark = [pytest.mark.integration, pytest.mark.tdd, pytest.mark.asyncio]
 
 
 class MemoryApiKeyDb:
+    """In-memory stand-in for the auth.api_keys table."""
+
     def __init__(self):
-        self.organizations = {}
+        self.keys = {}
+        self.lookups = 0
 
     async def __aenter__(self):
         return self
@@ -19,44 +24,74 @@ class MemoryApiKeyDb:
 
     async def query_row(self, query, params=None):
         params = params or []
-        organization_id = params[0] if params else None
-        api_keys = self.organizations.get(organization_id)
-        if api_keys is None:
+        sql = " ".join(query.split())
+        if "WHERE key_hash = $1" in sql:
+            self.lookups += 1
+            return next(
+                (dict(k) for k in self.keys.values() if k["key_hash"] == params[0]),
+                None,
+            )
+        key = self.keys.get(params[1])
+        if key is None or key["organization_id"] != params[0]:
             return None
-        return {"organization_id": organization_id, "api_keys": api_keys}
+        if sql.startswith("UPDATE") and "is_active = FALSE" in sql:
+            key.update(is_active=False, revoked_at=params[2])
+        elif sql.startswith("UPDATE"):
+            key["rate_limits"] = json.loads(params[2])
+        elif sql.startswith("DELETE"):
+            del self.keys[params[1]]
+        return dict(key)
 
     async def query(self, query, params=None):
         return [
-            {"organization_id": organization_id, "api_keys": api_keys}
-            for organization_id, api_keys in self.organizations.items()
+            dict(k) for k in self.keys.values() if k["organization_id"] == params[0]
         ]
 
     async def execute(self, query, params=None):
-        params = params or []
         if query.strip().startswith("INSERT"):
-            organization_id = params[0]
-            self.organizations.setdefault(organization_id, [])
+            key_id, organization_id, key_hash, name, project_id = params[:5]
+            expires_at, rate_limits, metadata, created_at = params[5:]
+            self.keys[key_id] = {
+                "key_id": key_id,
+                "organization_id": organization_id,
+                "key_hash": key_hash,
+                "name": name,
+                "project_id": project_id,
+                "is_active": True,
+                "expires_at": expires_at,
+                "rate_limits": rate_limits,
+                "metadata": metadata,
+                "created_at": created_at,
+                "last_used": None,
+                "revoked_at": None,
+            }
             return 1
-
         if query.strip().startswith("UPDATE"):
-            api_keys = params[0]
-            organization_id = params[-1]
-            self.organizations[organization_id] = api_keys
+            for row in json.loads(params[0]):
+                if row["key_id"] in self.keys:
+                    self.keys[row["key_id"]]["last_used"] = row["last_used"]
             return 1
-
         return 0
 
 
-@pytest.fixture
-def repository():
+def make_repository(db=None):
     repo = object.__new__(ApiKeyRepository)
     repo.organization_service_client = None
-    repo.db = MemoryApiKeyDb()
+    repo.db = db or MemoryApiKeyDb()
     repo.schema = "auth"
-    repo.organizations_table = "organizations"
+    repo.api_keys_table = "api_keys"
+    repo._key_cache = RedisCache("auth:api_key")
+    repo._local_keys = {}
+    repo._last_used = {}
+    repo._flush_task = None
     return repo
 
 
+@pytest.fixture
+def repository():
+    return make_repository()
+
+
 async def test_project_scoped_key_lifecycle_round_trips_metadata(repository):
     expires_at = datetime.now(timezone.utc) + timedelta(days=30)
     created = await repository.create_api_key(
@@ -123,19 +158,21 @@ async def test_project_scoped_key_lifecycle_round_trips_metadata(repository):
 
 async def test_legacy_org_scoped_keys_remain_readable(repository):
     api_key = "isa_legacy"
-    repository.db.organizations["org_1"] = [
-        {
-            "key_id": "key_legacy",
-            "name": "Legacy key",
-            "key_hash": repository._hash_api_key(api_key),
-            "permissions": ["read:data"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "created_by": "usr_1",
-            "expires_at": None,
-            "is_active": True,
-            "last_used": None,
-        }
-    ]
+    # Shape of a pre-project key after the backfill from organizations.api_keys
+    repository.db.keys["key_legacy"] = {
+        "key_id": "key_legacy",
+        "organization_id": "org_1",
+        "key_hash": repository._hash_api_key(api_key),
+        "name": "Legacy key",
+        "project_id": None,
+        "is_active": True,
+        "expires_at": None,
+        "rate_limits": {},
+        "metadata": {"permissions": ["read:data"], "created_by": "usr_1"},
+        "created_at": datetime.now(timezone.utc),
+        "last_used": None,
+        "revoked_at": None,
+    }
 
     listed = await repository.get_organization_api_keys("org_1")
     assert listed[0]["owner_type"] == "organization"
@@ -147,3 +184,25 @@ async def test_legacy_org_scoped_keys_remain_readable(repository):
     assert verified["owner_type"] == "organization"
     assert verified["project_id"] is None
     assert verified["scopes"] == ["read:data"]
+
+
+async def test_validation_is_cached_and_last_used_is_batched(repository):
+    created = await repository.create_api_key(organization_id="org_1", name="Batch")
+
+    for _ in range(5):
+        assert (await repository.validate_api_key(created["api_key"]))["valid"] is True
+
+    assert repository.db.lookups == 1
+    assert repository.db.keys[created["key_id"]]["last_used"] is None
+    assert await repository.flush_last_used() == 1
+    assert repository.db.keys[created["key_id"]]["last_used"] is not None
+    assert await repository.flush_last_used() == 0
+
+
+async def test_revoke_invalidates_cached_key(repository):
+    created = await repository.create_api_key(organization_id="org_1", name="Revoke")
+    assert (await repository.validate_api_key(created["api_key"]))["valid"] is True
+
+    assert await repository.revoke_api_key("org_1", created["key_id"]) is True
+    assert (await repository.validate_api_key(created["api_key"]))["valid"] is False
+    assert await repository.revoke_api_key("org_2", created["key_id"]) is False
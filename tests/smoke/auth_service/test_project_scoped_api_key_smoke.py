@@ -2,10 +2,9 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from microservices.auth_service.api_key_repository import ApiKeyRepository
 from microservices.auth_service.api_key_service import ApiKeyService
 from tests.integration.tdd.auth_service.test_project_scoped_api_keys import (
-    MemoryApiKeyDb,
+    make_repository,
 )
 
 pytestmark = [pytest.mark.smoke, pytest.mark.asyncio]
@@ -18,12 +17,7 @@ class AllowingProjectAccess:
 
 @pytest.fixture
 def repository():
-    repo = object.__new__(ApiKeyRepository)
-    repo.organization_service_client = None
-    repo.db = MemoryApiKeyDb()
-    repo.schema = "auth"
-    repo.organizations_table = "organizations"
-    return repo
+    return make_repository()
 
 
 async def test_project_scoped_api_key_create_verify_list_revoke_smoke(repository):
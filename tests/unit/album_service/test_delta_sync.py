@@ -0,0 +1,236 @@
+"""
+Unit tests for delta album-to-frame sync.
+
+A frame receives the whole album once, then only the net photo changes
+since its sync cursor, as manifest parts of at most ``manifest_batch_size``
+photo IDs. The cursor advances only when every part was published.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from microservices.album_service.album_service import AlbumService, _net_changes
+from microservices.album_service.models import (
+    Album,
+    AlbumSyncRequest,
+    AlbumSyncStatus,
+    SyncStatus,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeRepository:
+    """One album, its change log and per-frame sync rows"""
+
+    def __init__(self, photo_ids):
+        self.photo_ids = list(photo_ids)
+        self.changes = []
+        self.statuses = {}
+        self.calls = []
+
+    def change(self, photo_id, change_type):
+        if change_type == "added":
+            self.photo_ids.append(photo_id)
+        else:
+            self.photo_ids.remove(photo_id)
+        self.changes.append(
+            {
+                "change_id": len(self.changes) + 1,
+                "photo_id": photo_id,
+                "change_type": change_type,
+            }
+        )
+
+    async def get_album_by_id(self, album_id, user_id=None):
+        return Album(
+            album_id=album_id,
+            name="Family",
+            user_id="usr_1",
+            photo_count=len(self.photo_ids),
+        )
+
+    async def get_album_sync_status(self, album_id, frame_id):
+        return self.statuses.get(frame_id)
+
+    async def update_album_sync_status(self, album_id, frame_id, user_id, status_data):
+        current = self.statuses.get(frame_id)
+        fields = (
+            current.model_dump()
+            if current
+            else {
+                "album_id": album_id,
+                "user_id": user_id,
+                "frame_id": frame_id,
+            }
+        )
+        fields.update(status_data)
+        self.statuses[frame_id] = AlbumSyncStatus.model_validate(fields)
+        return True
+
+    async def get_album_changes(self, album_id, after_change_id, limit=1000):
+        self.calls.append("get_album_changes")
+        return [c for c in self.changes if c["change_id"] > after_change_id][:limit]
+
+    async def get_latest_album_change_id(self, album_id):
+        return self.changes[-1]["change_id"] if self.changes else 0
+
+    async def get_album_photo_ids(self, album_id):
+        self.calls.append("get_album_photo_ids")
+        return list(self.photo_ids)
+
+    async def prune_album_changes(self, album_id):
+        self.calls.append("prune_album_changes")
+        return 0
+
+
+class _Publisher:
+    def __init__(self, fail_on_part=None):
+        self.manifests = []
+        self.fail_on_part = fail_on_part
+
+    async def publish_album_manifest(self, album_id, frame_id, manifest):
+        if manifest["part"] == self.fail_on_part:
+            return False
+        self.manifests.append(manifest)
+        return True
+
+
+class _EventBus:
+    def __init__(self):
+        self.events = []
+
+    async def publish_event(self, event):
+        self.events.append(event)
+
+
+def _service(repository, publisher=None, batch_size=500):
+    return AlbumService(
+        repository=repository,
+        event_bus=_EventBus(),
+        mqtt_publisher=publisher if publisher is not None else _Publisher(),
+        manifest_batch_size=batch_size,
+    )
+
+
+async def _sync(service, frame_id="frame_1"):
+    return await service.sync_album_to_frame(
+        "album_1", "usr_1", AlbumSyncRequest(frame_id=frame_id)
+    )
+
+
+def test_net_changes_keep_each_photos_last_operation():
+    changes = [
+        {"change_id": 1, "photo_id": "a", "change_type": "added"},
+        {"change_id": 2, "photo_id": "b", "change_type": "removed"},
+        {"change_id": 3, "photo_id": "a", "change_type": "removed"},
+        {"change_id": 4, "photo_id": "b", "change_type": "added"},
+        {"change_id": 5, "photo_id": "c", "change_type": "removed"},
+    ]
+
+    assert _net_changes(changes) == (["b"], ["a", "c"])
+
+
+@pytest.mark.asyncio
+async def test_first_sync_sends_the_full_album_in_parts():
+    repository = _FakeRepository([f"p{i}" for i in range(5)])
+    repository.change("p5", "added")
+    service = _service(repository, batch_size=2)
+
+    result = await _sync(service)
+
+    manifests = service.mqtt_publisher.manifests
+    assert [m["part"] for m in manifests] == [1, 2, 3]
+    assert {m["parts"] for m in manifests} == {3}
+    assert [p for m in manifests for p in m["added"]] == repository.photo_ids
+    assert {m["mode"] for m in manifests} == {"full"}
+    assert result.sync_mode == "full"
+    assert result.sync_version == 1
+    assert result.sync_status == SyncStatus.IN_PROGRESS
+    assert repository.statuses["frame_1"].sync_cursor == 1
+    [event] = service.event_bus.events
+    assert event.data["sync_mode"] == "full"
+    assert event.data["added_photos"] == 6
+
+
+@pytest.mark.asyncio
+async def test_next_sync_sends_only_the_delta():
+    repository = _FakeRepository([f"p{i}" for i in range(100)])
+    service = _service(repository)
+    await _sync(service)
+    service.mqtt_publisher.manifests.clear()
+
+    repository.change("new_1", "added")
+    repository.change("p3", "removed")
+    repository.change("new_2", "added")
+    repository.change("new_2", "removed")
+    result = await _sync(service)
+
+    [manifest] = service.mqtt_publisher.manifests
+    assert manifest["mode"] == "delta"
+    assert manifest["added"] == ["new_1"]
+    assert manifest["removed"] == ["p3", "new_2"]
+    assert (manifest["from_cursor"], manifest["to_cursor"]) == (0, 4)
+    assert result.sync_version == 2
+    assert repository.statuses["frame_1"].sync_cursor == 4
+    assert "prune_album_changes" in repository.calls
+
+
+@pytest.mark.asyncio
+async def test_up_to_date_frame_gets_no_manifest():
+    repository = _FakeRepository(["a", "b"])
+    service = _service(repository)
+    await _sync(service)
+    service.mqtt_publisher.manifests.clear()
+
+    result = await _sync(service)
+
+    assert service.mqtt_publisher.manifests == []
+    assert result.sync_status == SyncStatus.COMPLETED
+    assert result.sync_version == 1
+
+
+@pytest.mark.asyncio
+async def test_delta_larger_than_the_album_falls_back_to_full():
+    repository = _FakeRepository(["a", "b"])
+    service = _service(repository)
+    await _sync(service)
+    service.mqtt_publisher.manifests.clear()
+
+    for photo_id in ("c", "d", "e"):
+        repository.change(photo_id, "added")
+    repository.change("a", "removed")
+    await _sync(service)
+
+    [manifest] = service.mqtt_publisher.manifests
+    assert manifest["mode"] == "full"
+    assert manifest["added"] == ["b", "c", "d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_failed_part_keeps_the_cursor():
+    repository = _FakeRepository(["a", "b", "c"])
+    service = _service(repository, _Publisher(fail_on_part=2), batch_size=2)
+
+    result = await _sync(service)
+
+    assert result.sync_status == SyncStatus.FAILED
+    assert result.sync_version == 0
+    assert repository.statuses["frame_1"].sync_cursor is None
+    assert "prune_album_changes" not in repository.calls
+
+
+def test_change_log_writes_lock_each_album_before_drawing_change_ids():
+    from microservices.album_service.album_repository import AlbumRepository
+
+    repo = object.__new__(AlbumRepository)
+    repo.schema = "album"
+    repo.changes_table = "album_photo_changes"
+    repo.sync_status_table = "album_sync_status"
+
+    sql = repo._log_changes_sql("removed", "removed", "album_id")
+
+    assert "pg_advisory_xact_lock" in sql
+    assert "ORDER BY 1" in sql.split("CROSS JOIN LATERAL")[0]
@@ -0,0 +1,148 @@
+"""Unit tests for monthly audit_events partitions and partition-drop retention."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from microservices.audit_service.audit_query import AuditCursor, keyset_condition
+from microservices.audit_service.audit_repository import (
+    AuditRepository,
+    _partition_bounds,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+UTC = timezone.utc
+
+
+def _month_name(dt: datetime) -> str:
+    return f"audit_events_p{dt.year:04d}{dt.month:02d}"
+
+
+class _FakeAsyncDB:
+    def __init__(
+        self, partitions: List[str], default_deleted: int = 0, fail_drop: bool = False
+    ):
+        self.partitions = partitions
+        self.default_deleted = default_deleted
+        self.fail_drop = fail_drop
+        self.transactions: List[List[Dict[str, Any]]] = []
+        self.executes: List[Dict[str, Any]] = []
+        self.query_rows: List[Dict[str, Any]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def query(self, sql, params=None, schema="public"):
+        return [
+            {"partition_name": name, "estimated_rows": 100} for name in self.partitions
+        ]
+
+    async def query_row(self, sql, params=None, schema="public"):
+        self.query_rows.append(
+            {"sql": " ".join(sql.split()), "params": list(params or [])}
+        )
+        return {"created": 2}
+
+    async def execute_in_transaction(self, operations, schema="public"):
+        self.transactions.append(operations)
+        return not self.fail_drop
+
+    async def execute(self, sql, params=None, schema="public"):
+        self.executes.append(
+            {"sql": " ".join(sql.split()), "params": list(params or [])}
+        )
+        return self.default_deleted
+
+
+def _repository(db) -> AuditRepository:
+    repo = object.__new__(AuditRepository)
+    repo.db = db
+    repo.schema = "audit"
+    repo.audit_events_table = "audit_events"
+    return repo
+
+
+class TestPartitionBounds:
+    def test_month_bounds(self):
+        assert _partition_bounds("audit_events_p202603") == (
+            datetime(2026, 3, 1, tzinfo=UTC),
+            datetime(2026, 4, 1, tzinfo=UTC),
+        )
+
+    def test_december_rolls_into_next_year(self):
+        assert _partition_bounds("audit_events_p202612")[1] == datetime(
+            2027, 1, 1, tzinfo=UTC
+        )
+
+    def test_default_partition_is_not_monthly(self):
+        assert _partition_bounds("audit_events_default") is None
+
+
+class TestCleanupOldEvents:
+    async def test_only_partitions_wholly_past_retention_are_dropped(self):
+        now = datetime.now(UTC)
+        old = now - timedelta(days=500)
+        boundary = now - timedelta(days=365)
+        db = _FakeAsyncDB(
+            partitions=[
+                _month_name(now),
+                "audit_events_default",
+                _month_name(boundary),
+                _month_name(old),
+            ],
+            default_deleted=3,
+        )
+
+        removed = await _repository(db).cleanup_old_events(retention_days=365)
+
+        dropped = [ops[1]["sql"] for ops in db.transactions]
+        assert dropped == [f"DROP TABLE audit.{_month_name(old)}"]
+        assert db.transactions[0][0]["sql"].startswith(
+            "ALTER TABLE audit.audit_events DETACH PARTITION"
+        )
+        assert "DELETE FROM audit.audit_events_default" in db.executes[0]["sql"]
+        assert removed == 100 + 3
+
+    async def test_failed_drop_stops_the_run(self):
+        now = datetime.now(UTC)
+        db = _FakeAsyncDB(
+            partitions=[
+                _month_name(now - timedelta(days=800)),
+                _month_name(now - timedelta(days=700)),
+            ],
+            fail_drop=True,
+        )
+
+        removed = await _repository(db).cleanup_old_events(retention_days=365)
+
+        assert len(db.transactions) == 1
+        assert removed == 0
+
+
+class TestEnsurePartitions:
+    async def test_calls_partition_function(self):
+        db = _FakeAsyncDB(partitions=[])
+        assert await _repository(db).ensure_partitions(months_ahead=3) == 2
+        assert (
+            "audit.create_audit_event_partitions(CURRENT_DATE, $1)"
+            in db.query_rows[0]["sql"]
+        )
+        assert db.query_rows[0]["params"] == [3]
+
+
+class TestKeysetPruning:
+    def test_keyset_adds_prunable_timestamp_bound(self):
+        cursor = AuditCursor(datetime(2026, 3, 1, tzinfo=UTC), "evt_1")
+        assert keyset_condition(cursor, "DESC", 4) == (
+            "event_timestamp <= $4 AND (event_timestamp, event_id) < ($4, $5)"
+        )
+        assert keyset_condition(cursor, "ASC", 1).startswith("event_timestamp >= $1")
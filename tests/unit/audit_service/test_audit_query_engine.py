@@ -0,0 +1,323 @@
+"""Unit tests for the keyset-paginated audit event query engine.
+
+Covers filter pushdown, the cursor codec, the repository SQL shape (keyset
+vs offset, count modes, batched streaming) against a fake DB, and the
+service's paging metadata.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock
+
+import pytest
+
+from microservices.audit_service.audit_query import (
+    AuditCursor,
+    InvalidCursorError,
+    build_event_filters,
+    resolve_cursor,
+)
+from microservices.audit_service.audit_repository import AuditRepository
+from microservices.audit_service.audit_service import AuditService
+from microservices.audit_service.models import (
+    AuditCategory,
+    AuditEvent,
+    AuditQueryRequest,
+    EventSeverity,
+    EventStatus,
+    EventType,
+)
+from microservices.audit_service.protocols import (
+    AuditServiceError,
+    AuditValidationError,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+UTC = timezone.utc
+T0 = datetime(2026, 3, 1, 12, tzinfo=UTC)
+
+
+def _row(i: int) -> Dict[str, Any]:
+    return {
+        "event_id": f"evt_{i:04d}",
+        "event_type": EventType.USER_LOGIN.value,
+        "event_category": AuditCategory.AUTHENTICATION.value,
+        "event_severity": EventSeverity.LOW.value,
+        "event_status": "success",
+        "action": "login",
+        "user_id": "usr_1",
+        "event_timestamp": T0 - timedelta(minutes=i),
+    }
+
+
+class _FakeAsyncDB:
+    """Serves audit rows in order and records every statement."""
+
+    def __init__(self, rows=None, plan_rows=None, count=None):
+        self.rows = rows or []
+        self.plan_rows = plan_rows
+        self.count = count
+        self.queries: List[Dict[str, Any]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def query(self, sql, params=None, schema="public"):
+        sql = " ".join(sql.split())
+        params = list(params or [])
+        self.queries.append({"sql": sql, "params": params})
+        rows = self.rows
+        if "(event_timestamp, event_id) <" in sql:
+            ts, event_id = params[-3], params[-2]
+            rows = [
+                r
+                for r in rows
+                if (r["event_timestamp"], r["event_id"]) < (ts, event_id)
+            ]
+        return (
+            rows[: params[-1]]
+            if "OFFSET" not in sql
+            else rows[params[-1] :][: params[-2]]
+        )
+
+    async def query_row(self, sql, params=None, schema="public"):
+        sql = " ".join(sql.split())
+        self.queries.append({"sql": sql, "params": list(params or [])})
+        if sql.startswith("EXPLAIN"):
+            return {"QUERY PLAN": f'[{{"Plan": {{"Plan Rows": {self.plan_rows}}}}}]'}
+        return {"count": self.count}
+
+
+def _repository(db: _FakeAsyncDB) -> AuditRepository:
+    repo = object.__new__(AuditRepository)
+    repo.db = db
+    repo.schema = "audit"
+    repo.audit_events_table = "audit_events"
+    return repo
+
+
+class TestBuildEventFilters:
+    def test_every_filter_is_pushed_down(self):
+        query = AuditQueryRequest(
+            event_types=[EventType.USER_LOGIN, EventType.USER_LOGOUT],
+            categories=[AuditCategory.SECURITY],
+            severities=[EventSeverity.HIGH],
+            user_id="usr_1",
+            organization_id="org_1",
+            resource_type="document",
+            ip_address="10.0.0.1",
+            start_time=T0 - timedelta(days=1),
+            end_time=T0,
+            failure_only=True,
+            tags=["pii"],
+        )
+
+        conditions, params = build_event_filters(query)
+
+        assert conditions == [
+            "event_type = ANY($1)",
+            "event_category = ANY($2)",
+            "event_severity = ANY($3)",
+            "user_id = $4",
+            "organization_id = $5",
+            "resource_type = $6",
+            "ip_address = $7",
+            "event_timestamp >= $8",
+            "event_timestamp <= $9",
+            "event_status = ANY($10)",
+            "tags && $11::text[]",
+        ]
+        assert params[0] == [EventType.USER_LOGIN.value, EventType.USER_LOGOUT.value]
+        assert params[9] == ["failure", "error"]
+
+    def test_empty_query_has_no_predicates(self):
+        assert build_event_filters(AuditQueryRequest()) == ([], [])
+
+
+class TestAuditCursor:
+    def test_round_trip(self):
+        cursor = AuditCursor(T0, "evt_1", "desc")
+        assert AuditCursor.decode(cursor.encode()) == cursor
+
+    def test_garbage_is_rejected(self):
+        with pytest.raises(InvalidCursorError):
+            AuditCursor.decode("not-a-cursor")
+
+    def test_cursor_must_match_sort_order(self):
+        token = AuditCursor(T0, "evt_1", "desc").encode()
+        with pytest.raises(InvalidCursorError):
+            resolve_cursor(AuditQueryRequest(cursor=token, sort_order="asc"))
+
+
+class TestRepositoryQuery:
+    async def test_cursor_uses_keyset_predicate_not_offset(self):
+        db = _FakeAsyncDB(rows=[_row(i) for i in range(5)])
+        repo = _repository(db)
+        token = AuditCursor(_row(1)["event_timestamp"], "evt_0001", "desc").encode()
+
+        events = await repo.query_audit_events(
+            AuditQueryRequest(user_id="usr_1", cursor=token, offset=50, limit=2)
+        )
+
+        sql = db.queries[0]["sql"]
+        assert "(event_timestamp, event_id) < ($2, $3)" in sql
+        assert "OFFSET" not in sql
+        assert "ORDER BY event_timestamp DESC, event_id DESC" in sql
+        assert [e.id for e in events] == ["evt_0002", "evt_0003"]
+
+    async def test_limit_override_and_legacy_offset(self):
+        db = _FakeAsyncDB(rows=[_row(i) for i in range(5)])
+        events = await _repository(db).query_audit_events(
+            AuditQueryRequest(offset=1, limit=2), limit=3
+        )
+        assert "OFFSET $2" in db.queries[0]["sql"]
+        assert [e.id for e in events] == ["evt_0001", "evt_0002", "evt_0003"]
+
+    async def test_legacy_default_values_are_readable(self):
+        legacy = dict(_row(0), event_severity="info", event_status="completed")
+        db = _FakeAsyncDB(rows=[legacy, _row(1)])
+        events = await _repository(db).query_audit_events(AuditQueryRequest())
+        assert [e.id for e in events] == ["evt_0000", "evt_0001"]
+        assert (events[0].severity, events[0].status) == (
+            EventSeverity.LOW,
+            EventStatus.SUCCESS,
+        )
+
+    async def test_unreadable_row_fails_the_page(self):
+        bad = dict(_row(0), event_severity="bogus")
+        db = _FakeAsyncDB(rows=[bad, _row(1)])
+        with pytest.raises(ValueError, match="evt_0000"):
+            await _repository(db).query_audit_events(AuditQueryRequest())
+
+
+class TestRepositoryCount:
+    async def test_large_estimate_skips_exact_count(self):
+        db = _FakeAsyncDB(plan_rows=2_500_000, count=1)
+        assert await _repository(db).count_audit_events(AuditQueryRequest()) == (
+            2_500_000,
+            True,
+        )
+        assert len(db.queries) == 1
+
+    async def test_small_estimate_upgrades_to_exact(self):
+        db = _FakeAsyncDB(plan_rows=40, count=37)
+        assert await _repository(db).count_audit_events(AuditQueryRequest()) == (
+            37,
+            False,
+        )
+
+    async def test_none_mode_does_not_query(self):
+        db = _FakeAsyncDB()
+        assert await _repository(db).count_audit_events(
+            AuditQueryRequest(), mode="none"
+        ) == (None, False)
+        assert db.queries == []
+
+
+class TestRepositoryStream:
+    async def test_streams_all_rows_in_keyset_batches(self):
+        db = _FakeAsyncDB(rows=[_row(i) for i in range(5)])
+        repo = _repository(db)
+
+        ids = [
+            e.id
+            async for e in repo.stream_audit_events(
+                AuditQueryRequest(limit=1), batch_size=2
+            )
+        ]
+
+        assert ids == [f"evt_{i:04d}" for i in range(5)]
+        assert len(db.queries) == 3
+        assert "(event_timestamp, event_id) <" not in db.queries[0]["sql"]
+        assert "(event_timestamp, event_id) <" in db.queries[1]["sql"]
+
+    async def test_unreadable_row_fails_the_export(self):
+        rows = [_row(i) for i in range(3)]
+        rows[1]["event_severity"] = "bogus"
+        repo = _repository(_FakeAsyncDB(rows=rows))
+
+        ids = []
+        with pytest.raises(ValueError, match="evt_0001"):
+            async for event in repo.stream_audit_events(
+                AuditQueryRequest(), batch_size=10
+            ):
+                ids.append(event.id)
+
+        assert ids == []
+
+
+def _event(i: int) -> AuditEvent:
+    return AuditEvent(
+        id=f"evt_{i}",
+        event_type=EventType.USER_LOGIN,
+        category=AuditCategory.AUTHENTICATION,
+        action="login",
+        timestamp=T0 - timedelta(minutes=i),
+    )
+
+
+class TestServiceQueryEvents:
+    def _service(self, events, count=(100, False)) -> AuditService:
+        repo = AsyncMock()
+        repo.query_audit_events.return_value = events
+        repo.count_audit_events.return_value = count
+        return AuditService(repository=repo)
+
+    async def test_extra_row_sets_next_cursor(self):
+        service = self._service([_event(i) for i in range(3)])
+
+        result = await service.query_events(AuditQueryRequest(limit=2))
+
+        service.repository.query_audit_events.assert_awaited_once()
+        assert service.repository.query_audit_events.call_args.kwargs["limit"] == 3
+        assert len(result.events) == 2
+        assert result.total_count == 100
+        assert result.page_info["has_more"] is True
+        cursor = AuditCursor.decode(result.page_info["next_cursor"])
+        assert cursor.event_id == "evt_1"
+
+    async def test_last_page_has_no_cursor(self):
+        service = self._service([_event(0)], count=(None, False))
+        result = await service.query_events(
+            AuditQueryRequest(limit=2, count_mode="none")
+        )
+        assert result.page_info["has_more"] is False
+        assert result.page_info["next_cursor"] is None
+        assert result.total_count == 1
+
+    async def test_repository_error_is_not_an_empty_page(self):
+        service = self._service([])
+        service.repository.query_audit_events.side_effect = ValueError("bad row")
+        with pytest.raises(AuditServiceError):
+            await service.query_events(AuditQueryRequest())
+
+    async def test_invalid_cursor_is_a_validation_error(self):
+        service = self._service([])
+        with pytest.raises(AuditValidationError):
+            await service.query_events(AuditQueryRequest(cursor="bogus"))
+
+    async def test_export_yields_ndjson_lines(self):
+        repo = AsyncMock()
+
+        async def stream(query):
+            for i in range(2):
+                yield _event(i)
+
+        repo.stream_audit_events = stream
+        service = AuditService(repository=repo)
+
+        lines = [
+            line async for line in await service.export_events(AuditQueryRequest())
+        ]
+
+        assert len(lines) == 2
+        assert all(line.endswith("\n") for line in lines)
+        assert '"id":"evt_0"' in lines[0]
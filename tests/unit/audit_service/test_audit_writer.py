@@ -0,0 +1,199 @@
+"""Unit tests for the buffered audit writer and the batch insert it drives."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from microservices.audit_service.audit_repository import AuditRepository
+from microservices.audit_service.audit_writer import BufferedAuditWriter
+from microservices.audit_service.models import AuditCategory, AuditEvent, EventType
+from microservices.audit_service.protocols import AuditServiceError
+
+
+pytestmark = pytest.mark.unit
+
+
+def _event(i: int) -> AuditEvent:
+    return AuditEvent(
+        id=f"evt_{i}",
+        event_type=EventType.USER_LOGIN,
+        category=AuditCategory.AUTHENTICATION,
+        action="login",
+        tags=["auth"],
+        timestamp=datetime(2026, 3, 1, 12, tzinfo=timezone.utc),
+    )
+
+
+class _RecordingRepository:
+    def __init__(self, results=None, gate: asyncio.Event = None):
+        self.batches: List[List[str]] = []
+        self.results = list(results or [])
+        self.gate = gate
+
+    async def create_audit_events(self, events):
+        if self.gate:
+            await self.gate.wait()
+        self.batches.append([e.id for e in events])
+        return self.results.pop(0) if self.results else True
+
+
+class TestBufferedAuditWriter:
+    async def test_concurrent_submits_share_one_flush(self):
+        repo = _RecordingRepository()
+        writer = BufferedAuditWriter(repo, max_batch_size=10, flush_interval=0.05)
+        writer.start()
+
+        stored = await asyncio.gather(*(writer.submit(_event(i)) for i in range(5)))
+        await writer.stop()
+
+        assert [e.id for e in stored] == [f"evt_{i}" for i in range(5)]
+        assert repo.batches == [[f"evt_{i}" for i in range(5)]]
+
+    async def test_full_batch_flushes_without_waiting_for_interval(self):
+        repo = _RecordingRepository()
+        writer = BufferedAuditWriter(
+            repo, max_batch_size=3, max_pending=10, flush_interval=30
+        )
+        writer.start()
+
+        await asyncio.wait_for(
+            asyncio.gather(*(writer.submit(_event(i)) for i in range(6))), timeout=1
+        )
+        await writer.stop()
+
+        assert repo.batches == [
+            ["evt_0", "evt_1", "evt_2"],
+            ["evt_3", "evt_4", "evt_5"],
+        ]
+
+    async def test_failed_flush_fails_every_caller(self):
+        repo = _RecordingRepository(results=[False])
+        writer = BufferedAuditWriter(
+            repo, max_batch_size=10, flush_interval=0.01, max_retry_delay=0
+        )
+        writer.start()
+
+        results = await asyncio.gather(
+            writer.submit(_event(1)), writer.submit(_event(2)), return_exceptions=True
+        )
+        await writer.stop()
+
+        assert all(isinstance(r, AuditServiceError) for r in results)
+
+    async def test_full_buffer_blocks_submitters(self):
+        gate = asyncio.Event()
+        repo = _RecordingRepository(gate=gate)
+        writer = BufferedAuditWriter(
+            repo, max_batch_size=2, max_pending=2, flush_interval=0.01
+        )
+        writer.start()
+
+        first = [asyncio.create_task(writer.submit(_event(i))) for i in range(2)]
+        await asyncio.sleep(0.05)
+        blocked = asyncio.create_task(writer.submit(_event(2)))
+        await asyncio.sleep(0.05)
+        assert writer.pending == 0 and not blocked.done()
+
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(*first, blocked), timeout=1)
+        await writer.stop()
+        assert repo.batches == [["evt_0", "evt_1"], ["evt_2"]]
+
+    async def test_stop_flushes_buffer_and_rejects_new_events(self):
+        repo = _RecordingRepository()
+        writer = BufferedAuditWriter(repo, max_batch_size=100, flush_interval=30)
+        writer.start()
+
+        pending = asyncio.create_task(writer.submit(_event(1)))
+        await asyncio.sleep(0)
+        await writer.stop()
+
+        assert (await pending).id == "evt_1"
+        with pytest.raises(AuditServiceError):
+            await writer.submit(_event(2))
+
+
+class _FakeAsyncDB:
+    """Returns the submitted rows as inserted unless ``existing`` or failing."""
+
+    def __init__(self, fail=False, existing=()):
+        self.fail = fail
+        self.existing = set(existing)
+        self.queries: List[Dict[str, Any]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def query(self, sql, params=None, schema="public"):
+        self.queries.append(
+            {"sql": " ".join(sql.split()), "params": list(params or [])}
+        )
+        if self.fail:
+            return None
+        rows = json.loads(params[0])
+        return [
+            {"event_id": r["event_id"]}
+            for r in rows
+            if r["event_id"] not in self.existing
+        ]
+
+
+def _repository(db) -> AuditRepository:
+    repo = object.__new__(AuditRepository)
+    repo.db = db
+    repo.schema = "audit"
+    repo.audit_events_table = "audit_events"
+    repo.events_rollup = MagicMock(increment_many=AsyncMock(return_value=True))
+    return repo
+
+
+class TestCreateAuditEvents:
+    async def test_batch_is_one_idempotent_statement(self):
+        db = _FakeAsyncDB()
+        repo = _repository(db)
+
+        assert await repo.create_audit_events([_event(1), _event(2)]) is True
+
+        assert len(db.queries) == 1
+        sql = db.queries[0]["sql"]
+        assert "jsonb_to_recordset($1::jsonb)" in sql
+        assert (
+            "ON CONFLICT (event_id, event_timestamp) DO NOTHING RETURNING event_id"
+            in sql
+        )
+        rows = json.loads(db.queries[0]["params"][0])
+        assert [r["event_id"] for r in rows] == ["evt_1", "evt_2"]
+        assert rows[0]["tags"] == ["auth"]
+        repo.events_rollup.increment_many.assert_awaited_once()
+
+    async def test_redelivered_events_are_not_counted_twice(self):
+        repo = _repository(_FakeAsyncDB(existing={"evt_1"}))
+
+        assert await repo.create_audit_events([_event(1), _event(2)]) is True
+
+        [counted] = repo.events_rollup.increment_many.await_args.args
+        assert len(list(counted)) == 1
+
+    async def test_fully_redelivered_batch_is_not_counted(self):
+        repo = _repository(_FakeAsyncDB(existing={"evt_1"}))
+        assert await repo.create_audit_events([_event(1)]) is True
+        repo.events_rollup.increment_many.assert_not_awaited()
+
+    async def test_database_error_reports_failure(self):
+        repo = _repository(_FakeAsyncDB(fail=True))
+        assert await repo.create_audit_events([_event(1)]) is False
+        repo.events_rollup.increment_many.assert_not_awaited()
+
+    async def test_empty_batch_is_a_no_op(self):
+        db = _FakeAsyncDB()
+        assert await _repository(db).create_audit_events([]) is True
+        assert db.queries == []
@@ -0,0 +1,160 @@
+"""Unit tests for the off-loop password hashing pool.
+
+Covers hashing off the event loop, admission control and rehash-on-login
+when the bcrypt cost changes.
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("bcrypt")
+
+from microservices.auth_service import password_hasher as hasher_module
+from microservices.auth_service.auth_service import AuthenticationService
+from microservices.auth_service.password_hasher import (
+    PasswordHasher,
+    PasswordHasherBusy,
+)
+from microservices.auth_service.password_utils import (
+    hash_password,
+    password_needs_rehash,
+)
+
+pytestmark = pytest.mark.unit
+
+# Lowest bcrypt cost keeps the suite fast
+ROUNDS = 4
+
+
+@pytest.fixture
+async def hasher():
+    hasher = PasswordHasher(max_workers=2, max_queue=4, rounds=ROUNDS)
+    yield hasher
+    await hasher.close()
+
+
+@pytest.mark.asyncio
+class TestPasswordHasher:
+    async def test_hash_and_verify_round_trip(self, hasher):
+        password_hash = await hasher.hash("Secret#123")
+
+        assert password_hash.startswith("$2b$04$")
+        assert await hasher.verify("Secret#123", password_hash) is True
+        assert await hasher.verify("wrong", password_hash) is False
+        assert hasher.pending == 0
+
+    async def test_work_runs_off_the_event_loop(self, hasher, monkeypatch):
+        threads = []
+
+        def fake_verify(password, password_hash):
+            threads.append(threading.current_thread().name)
+            return True
+
+        monkeypatch.setattr(
+            hasher_module.password_utils, "verify_password", fake_verify
+        )
+        await hasher.verify("x", "y")
+
+        assert threads and threads[0].startswith("password-hash")
+
+    async def test_full_queue_sheds_load(self, hasher, monkeypatch):
+        release = threading.Event()
+
+        def blocked_verify(password, password_hash):
+            release.wait(5)
+            return True
+
+        monkeypatch.setattr(
+            hasher_module.password_utils, "verify_password", blocked_verify
+        )
+        running = [asyncio.create_task(hasher.verify("x", "y")) for _ in range(4)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusy) as excinfo:
+            await hasher.verify("x", "y")
+        assert excinfo.value.retry_after >= 1
+
+        release.set()
+        assert await asyncio.gather(*running) == [True] * 4
+        assert hasher.pending == 0
+
+    async def test_cancelled_caller_keeps_its_slot_until_the_job_ends(
+        self, hasher, monkeypatch
+    ):
+        release = threading.Event()
+        monkeypatch.setattr(
+            hasher_module.password_utils, "verify_password", lambda *_: release.wait(5)
+        )
+        task = asyncio.create_task(hasher.verify("x", "y"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert hasher.pending == 1
+        release.set()
+        for _ in range(100):
+            if hasher.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.pending == 0
+
+    async def test_rehash_is_deferred_when_busy(self, hasher):
+        hasher._pending = 2
+        assert hasher.rehash_in_background("x", AsyncMock()) is False
+
+
+class TestNeedsRehash:
+    def test_cost_mismatch(self):
+        password_hash = hash_password("Secret#123", rounds=ROUNDS)
+        assert password_needs_rehash(password_hash, ROUNDS) is False
+        assert password_needs_rehash(password_hash, ROUNDS + 1) is True
+
+    def test_unknown_format_is_left_alone(self):
+        assert password_needs_rehash("not-a-bcrypt-hash", 12) is False
+
+
+@pytest.mark.asyncio
+class TestLoginIntegration:
+    def _service(self, repo, hasher):
+        return AuthenticationService(
+            jwt_manager=None, auth_repository=repo, password_hasher=hasher
+        )
+
+    async def test_login_upgrades_old_cost_hash(self):
+        hasher = PasswordHasher(max_workers=1, max_queue=4, rounds=ROUNDS + 1)
+        old_hash = hash_password("Secret#123", rounds=ROUNDS)
+        repo = AsyncMock()
+        repo.get_user_for_login.return_value = {
+            "user_id": "usr_1",
+            "email": "a@example.com",
+            "password_hash": old_hash,
+            "is_active": True,
+        }
+        service = self._service(repo, hasher)
+        service.generate_token_pair = AsyncMock(return_value={"success": False})
+
+        await service.login("a@example.com", "Secret#123")
+        await hasher.close()
+
+        repo.set_password_hash.assert_awaited_once()
+        user_id, new_hash = repo.set_password_hash.await_args.args
+        assert user_id == "usr_1" and new_hash.startswith("$2b$05$")
+
+    async def test_shed_login_reports_retry_after(self):
+        hasher = PasswordHasher(max_workers=1, max_queue=1, rounds=ROUNDS)
+        hasher._pending = 1
+        repo = AsyncMock()
+        repo.get_user_for_login.return_value = {
+            "user_id": "usr_1",
+            "email": "a@example.com",
+            "password_hash": hash_password("Secret#123", rounds=ROUNDS),
+        }
+
+        result = await self._service(repo, hasher).login("a@example.com", "Secret#123")
+
+        assert result["success"] is False
+        assert result["retry_after"] >= 1
+        repo.update_last_login.assert_not_called()
@@ -1,5 +1,6 @@
 import pytest
 
+from core.rate_limiter import InMemoryBackend, RateLimitConfig
 from microservices.auth_service.rate_limit_state import (
     RequestRateLimitExceeded,
     RequestRateLimiter,
@@ -215,10 +216,31 @@ class _FakeRedis:
     def __init__(self, fail: bool = False):
         self.fail = fail
         self.store = {}
+        # Stands in for the acquire Lua script; shared like a Redis server
+        self.scripts = InMemoryBackend()
 
     def pipeline(self):
         return _FakeRedisPipeline(self.store, self.fail)
 
+    def register_script(self, script):
+        async def run(keys, args):
+            if self.fail:
+                raise ConnectionError("redis unavailable")
+            configs = [
+                RateLimitConfig(int(args[i + 1]), args[i + 2], args[i])
+                for i in range(2, len(args), 3)
+            ]
+            results = await self.scripts.acquire(
+                list(zip(keys, configs)), consume=args[0] == "1"
+            )
+            return [
+                v
+                for r in results
+                for v in (int(r.allowed), r.remaining, r.retry_after * 1000)
+            ]
+
+        return run
+
     async def ttl(self, key):
         return 60 if key in self.store else -2
 
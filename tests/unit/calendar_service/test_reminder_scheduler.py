@@ -0,0 +1,375 @@
+"""Unit tests for the calendar reminder scheduler.
+
+An in-memory repository reproduces the claim/lease semantics of the SQL in
+CalendarRepository so several scheduler instances (replicas) can share it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from microservices.calendar_service.reminder_scheduler import ReminderScheduler
+
+
+pytestmark = pytest.mark.unit
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class _FakeReminderRepository:
+    def __init__(self):
+        self.rows = {}
+        self._ids = itertools.count(1)
+
+    async def replace_event_reminders(
+        self, event_id, user_id, title, start_time, minutes_before
+    ):
+        for rid, row in list(self.rows.items()):
+            if (
+                row["event_id"] == event_id
+                and row["status"] in ("pending", "claimed")
+                and not (
+                    row["event_start"] == start_time
+                    and row["minutes_before"] in minutes_before
+                )
+            ):
+                del self.rows[rid]
+        result = []
+        for minutes in minutes_before:
+            remind_at = start_time - timedelta(minutes=minutes)
+            if remind_at <= _now():
+                continue
+            existing = next(
+                (
+                    r
+                    for r in self.rows.values()
+                    if (r["event_id"], r["event_start"], r["minutes_before"])
+                    == (event_id, start_time, minutes)
+                ),
+                None,
+            )
+            if existing is None:
+                existing = {
+                    "reminder_id": next(self._ids),
+                    "event_id": event_id,
+                    "user_id": user_id,
+                    "event_start": start_time,
+                    "minutes_before": minutes,
+                    "remind_at": remind_at,
+                    "status": "pending",
+                    "claimed_by": None,
+                    "claim_expires_at": None,
+                    "attempts": 0,
+                }
+                self.rows[existing["reminder_id"]] = existing
+            existing["title"] = title
+            result.append(dict(existing))
+        return result
+
+    async def delete_event_reminders(self, event_id):
+        doomed = [
+            rid
+            for rid, r in self.rows.items()
+            if r["event_id"] == event_id and r["status"] in ("pending", "claimed")
+        ]
+        for rid in doomed:
+            del self.rows[rid]
+        return len(doomed)
+
+    def _claimable(self, row):
+        return row["status"] == "pending" or (
+            row["status"] == "claimed" and row["claim_expires_at"] < _now()
+        )
+
+    async def get_pending_reminders(self, until, limit=50000):
+        rows = [
+            r
+            for r in self.rows.values()
+            if r["remind_at"] <= until and self._claimable(r)
+        ]
+        return [dict(r) for r in sorted(rows, key=lambda r: r["remind_at"])[:limit]]
+
+    async def claim_reminders(self, reminder_ids, owner, ttl_seconds):
+        won = []
+        for rid in reminder_ids:
+            row = self.rows.get(rid)
+            if (
+                row
+                and row["remind_at"] <= _now() + timedelta(seconds=5)
+                and self._claimable(row)
+            ):
+                row.update(
+                    status="claimed",
+                    claimed_by=owner,
+                    claim_expires_at=_now() + timedelta(seconds=ttl_seconds),
+                )
+                won.append(dict(row))
+        return won
+
+    async def complete_reminders(self, reminder_ids, owner):
+        for rid in reminder_ids:
+            if self.rows[rid]["claimed_by"] == owner:
+                self.rows[rid].update(
+                    status="sent", attempts=self.rows[rid]["attempts"] + 1
+                )
+        return len(reminder_ids)
+
+    async def release_reminders(self, reminder_ids, owner, retry_at, max_attempts):
+        released = []
+        for rid in reminder_ids:
+            row = self.rows[rid]
+            if row["claimed_by"] != owner:
+                continue
+            row["attempts"] += 1
+            row.update(
+                status="failed" if row["attempts"] >= max_attempts else "pending",
+                remind_at=retry_at,
+                claimed_by=None,
+                claim_expires_at=None,
+            )
+            released.append(dict(row))
+        return released
+
+
+class _FakeNotifier:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def send_reminders(self, reminders):
+        if self.fail:
+            raise ConnectionError("notification_service unavailable")
+        self.batches.append([r["reminder_id"] for r in reminders])
+        return [r["reminder_id"] for r in reminders]
+
+    @property
+    def sent(self):
+        return [rid for batch in self.batches for rid in batch]
+
+
+def _event(event_id, start_time, reminders, title="Standup"):
+    return SimpleNamespace(
+        event_id=event_id,
+        user_id="user_1",
+        title=title,
+        start_time=start_time,
+        reminders=reminders,
+    )
+
+
+async def _make_due(repo):
+    """Pull every stored reminder's due time into the past."""
+    for row in repo.rows.values():
+        row["remind_at"] = _now() - timedelta(seconds=1)
+
+
+class TestIncrementalRefresh:
+    async def test_event_change_reschedules_only_that_event(self):
+        repo, notifier = _FakeReminderRepository(), _FakeNotifier()
+        scheduler = ReminderScheduler(repo, notifier, horizon_seconds=3600)
+        start = _now() + timedelta(minutes=30)
+
+        await scheduler.on_event_changed(_event("evt_1", start, [10, 15]))
+        await scheduler.on_event_changed(_event("evt_2", start, [5]))
+        assert scheduler.pending == 3
+
+        await scheduler.on_event_changed(_event("evt_1", start, [10]))
+        assert sorted(r["minutes_before"] for r in repo.rows.values()) == [5, 10]
+        assert scheduler.pending == 2
+
+        await scheduler.on_event_deleted("evt_2")
+        assert scheduler.pending == 1
+        assert [r["event_id"] for r in repo.rows.values()] == ["evt_1"]
+
+    async def test_reminders_beyond_horizon_stay_in_the_database(self):
+        repo = _FakeReminderRepository()
+        scheduler = ReminderScheduler(repo, _FakeNotifier(), horizon_seconds=600)
+        await scheduler.on_event_changed(
+            _event("evt_1", _now() + timedelta(days=2), [15])
+        )
+        assert scheduler.pending == 0
+        assert len(repo.rows) == 1
+
+    async def test_past_offsets_are_not_created(self):
+        repo = _FakeReminderRepository()
+        scheduler = ReminderScheduler(repo, _FakeNotifier())
+        await scheduler.on_event_changed(
+            _event("evt_1", _now() + timedelta(minutes=5), [1, 60])
+        )
+        assert [r["minutes_before"] for r in repo.rows.values()] == [1]
+
+
+class TestDispatch:
+    async def test_due_reminders_go_out_in_one_batch(self):
+        repo, notifier = _FakeReminderRepository(), _FakeNotifier()
+        scheduler = ReminderScheduler(repo, notifier, horizon_seconds=3600)
+        for n in range(5):
+            await scheduler.on_event_changed(
+                _event(f"evt_{n}", _now() + timedelta(hours=1), [30])
+            )
+        await _make_due(repo)
+        await scheduler._load(_now().timestamp())
+
+        due = scheduler._pop_due(_now().timestamp())
+        assert await scheduler.dispatch(due) == 5
+        assert len(notifier.batches) == 1
+        assert {r["status"] for r in repo.rows.values()} == {"sent"}
+
+    async def test_replicas_never_double_fire(self):
+        repo, notifier = _FakeReminderRepository(), _FakeNotifier()
+        replicas = [
+            ReminderScheduler(repo, notifier, horizon_seconds=3600, owner=f"pod-{n}")
+            for n in range(3)
+        ]
+        for n in range(20):
+            await replicas[0].on_event_changed(
+                _event(f"evt_{n}", _now() + timedelta(hours=1), [30])
+            )
+        await _make_due(repo)
+
+        for replica in replicas:
+            await replica._load(_now().timestamp())
+        await asyncio.gather(
+            *(r.dispatch(r._pop_due(_now().timestamp())) for r in replicas)
+        )
+        assert sorted(notifier.sent) == sorted(repo.rows)
+
+    async def test_failed_delivery_is_retried_then_marked_failed(self):
+        repo, notifier = _FakeReminderRepository(), _FakeNotifier(fail=True)
+        scheduler = ReminderScheduler(
+            repo, notifier, horizon_seconds=3600, retry_delay_seconds=0, max_attempts=2
+        )
+        await scheduler.on_event_changed(
+            _event("evt_1", _now() + timedelta(hours=1), [30])
+        )
+        await _make_due(repo)
+        await scheduler._load(_now().timestamp())
+
+        assert await scheduler.dispatch(scheduler._pop_due(_now().timestamp())) == 0
+        (row,) = repo.rows.values()
+        assert (row["status"], row["attempts"]) == ("pending", 1)
+        assert scheduler.pending == 1
+
+        await scheduler.dispatch(scheduler._pop_due(_now().timestamp() + 1))
+        assert (row["status"], row["attempts"]) == ("failed", 2)
+
+    async def test_expired_claim_is_picked_up_by_another_replica(self):
+        repo, notifier = _FakeReminderRepository(), _FakeNotifier()
+        crashed = ReminderScheduler(
+            repo, notifier, horizon_seconds=3600, owner="crashed"
+        )
+        survivor = ReminderScheduler(
+            repo, notifier, horizon_seconds=3600, owner="survivor"
+        )
+        await crashed.on_event_changed(
+            _event("evt_1", _now() + timedelta(hours=1), [30])
+        )
+        await _make_due(repo)
+        (rid,) = repo.rows
+        await repo.claim_reminders([rid], owner="crashed", ttl_seconds=-1)
+
+        await survivor._load(_now().timestamp())
+        assert await survivor.dispatch(survivor._pop_due(_now().timestamp())) == 1
+        assert repo.rows[rid]["claimed_by"] == "survivor"
+
+
+class TestLoop:
+    async def test_loop_wakes_when_a_new_reminder_is_due(self):
+        repo, notifier = _FakeReminderRepository(), _FakeNotifier()
+        scheduler = ReminderScheduler(repo, notifier, horizon_seconds=3600)
+        scheduler.start()
+        try:
+            await asyncio.sleep(0.01)
+            start = _now() + timedelta(minutes=1, milliseconds=100)
+            await scheduler.on_event_changed(_event("evt_1", start, [1]))
+            for _ in range(100):
+                if notifier.sent:
+                    break
+                await asyncio.sleep(0.01)
+            assert notifier.sent == list(repo.rows)
+        finally:
+            await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_notification_client_sends_one_keyed_batch():
+    import httpx
+
+    from microservices.calendar_service.clients.notification_client import (
+        NotificationClient,
+    )
+
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        status = {"u1": "delivered", "u2": "failed", "u3": "pending"}
+        results = [
+            {
+                "index": i,
+                "idempotency_key": r["idempotency_key"],
+                "status": status.get(r["user_id"]),
+            }
+            for i, r in enumerate(body["recipients"])
+        ]
+        return httpx.Response(200, json={"batch": {}, "results": results})
+
+    notifier = NotificationClient(base_url="http://notifications")
+    notifier._client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    reminders = [
+        {
+            "reminder_id": i,
+            "event_id": f"evt_{i}",
+            "user_id": user_id,
+            "title": "Standup",
+            "event_start": _now() + timedelta(minutes=10),
+            "minutes_before": 10,
+        }
+        for i, user_id in enumerate(["u1", "u2", "u3", "u4"], start=1)
+    ]
+
+    accepted = await notifier.send_reminders(reminders)
+    await notifier.close()
+
+    # Queued ("pending") counts as accepted; failed and missing are retried
+    assert accepted == [1, 3]
+    [body] = requests
+    assert "template_id" not in body
+    assert [r["idempotency_key"] for r in body["recipients"]] == [
+        f"calendar_reminder:{i}" for i in range(1, 5)
+    ]
+    assert all("Standup" in r["content"] for r in body["recipients"])
+
+
+@pytest.mark.asyncio
+async def test_notification_client_retries_everything_when_the_batch_fails():
+    import httpx
+
+    from microservices.calendar_service.clients.notification_client import (
+        NotificationClient,
+    )
+
+    notifier = NotificationClient(base_url="http://notifications")
+    notifier._client.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503))
+    )
+    reminder = {
+        "reminder_id": 1,
+        "event_id": "evt_1",
+        "user_id": "u1",
+        "title": "Standup",
+        "event_start": _now() + timedelta(minutes=10),
+        "minutes_before": 10,
+    }
+
+    assert await notifier.send_reminders([reminder]) == []
+    await notifier.close()
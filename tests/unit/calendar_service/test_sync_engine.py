@@ -0,0 +1,347 @@
+"""Unit tests for the calendar sync engine.
+
+An in-memory repository mirrors the claim and bulk-write semantics of the
+SQL in CalendarRepository; provider clients are stubs returning canned
+ProviderSyncResults.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from microservices.calendar_service.calendar_service import CalendarService
+from microservices.calendar_service.clients.provider_models import (
+    ProviderCalendarEvent,
+    ProviderSyncResult,
+    SyncTokenExpiredError,
+)
+from microservices.calendar_service.sync_engine import CalendarSyncEngine
+
+
+pytestmark = pytest.mark.unit
+
+GOOGLE = "google_calendar"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _event(external_id, title="Planning", days=1):
+    start = _now() + timedelta(days=days)
+    return ProviderCalendarEvent(
+        external_event_id=external_id,
+        title=title,
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+    )
+
+
+class _FakeSyncRepository:
+    def __init__(self):
+        self.status = {}
+        self.events = {}  # (user_id, provider, external_id) -> event dict
+        self.upsert_calls = []
+
+    def add_due(self, user_id, provider=GOOGLE, **fields):
+        self.status[(user_id, provider)] = {
+            "user_id": user_id,
+            "provider": provider,
+            "sync_token": None,
+            "next_sync_at": _now() - timedelta(seconds=1),
+            "claim_expires_at": None,
+            "consecutive_failures": 0,
+            "status": "active",
+            **fields,
+        }
+
+    async def get_sync_status(self, user_id, provider=None):
+        return self.status.get((user_id, provider))
+
+    async def claim_due_syncs(self, owner, limit, ttl_seconds):
+        now = _now()
+        due = sorted(
+            (
+                row
+                for row in self.status.values()
+                if row["status"] != "disabled"
+                and row["next_sync_at"] <= now
+                and (row["claim_expires_at"] is None or row["claim_expires_at"] < now)
+            ),
+            key=lambda row: row["next_sync_at"],
+        )[:limit]
+        for row in due:
+            row.update(
+                claimed_by=owner, claim_expires_at=now + timedelta(seconds=ttl_seconds)
+            )
+        return [dict(row) for row in due]
+
+    async def complete_sync(
+        self,
+        user_id,
+        provider,
+        *,
+        status,
+        next_sync_at,
+        synced_count=0,
+        sync_token=None,
+        error_message=None,
+        failed=False,
+    ):
+        row = self.status.setdefault(
+            (user_id, provider),
+            {
+                "user_id": user_id,
+                "provider": provider,
+                "sync_token": None,
+                "consecutive_failures": 0,
+            },
+        )
+        row.update(
+            status=status,
+            next_sync_at=next_sync_at,
+            synced_events_count=synced_count,
+            sync_token=sync_token or row["sync_token"],
+            error_message=error_message,
+            consecutive_failures=row["consecutive_failures"] + 1 if failed else 0,
+            claimed_by=None,
+            claim_expires_at=None,
+        )
+        return True
+
+    async def bulk_upsert_external_events(self, user_id, provider, events):
+        self.upsert_calls.append(len(events))
+        written = 0
+        for event in events:
+            key = (user_id, provider, event["external_event_id"])
+            if self.events.get(key) != event:
+                self.events[key] = event
+                written += 1
+        return written
+
+    async def delete_external_events(self, user_id, provider, external_event_ids):
+        doomed = [
+            k
+            for k in self.events
+            if k[:2] == (user_id, provider) and k[2] in external_event_ids
+        ]
+        for key in doomed:
+            del self.events[key]
+        return len(doomed)
+
+    async def prune_external_events(
+        self, user_id, provider, keep, window_start, window_end
+    ):
+        doomed = [
+            k
+            for k, e in self.events.items()
+            if k[:2] == (user_id, provider)
+            and k[2] not in keep
+            and e["end_time"] >= window_start
+            and e["start_time"] <= window_end
+        ]
+        for key in doomed:
+            del self.events[key]
+        return len(doomed)
+
+    def external_ids(self, user_id):
+        return sorted(k[2] for k in self.events if k[0] == user_id)
+
+
+class _StubProvider:
+    """Serves queued results; records the sync token sent with each call."""
+
+    def __init__(self, *results, delay=0.0):
+        self.results = list(results)
+        self.calls = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def list_events(self, credentials, *, sync_token=None):
+        self.calls.append(sync_token)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        finally:
+            self.active -= 1
+
+
+class _Credentials:
+    def __init__(self, known=("user_1",)):
+        self.known = set(known)
+
+    async def get_credentials(self, user_id, provider):
+        return {"access_token": f"token-{user_id}"} if user_id in self.known else None
+
+
+def _engine(repo, client, **kwargs):
+    kwargs.setdefault("credentials_provider", _Credentials())
+    return CalendarSyncEngine(repo, {GOOGLE: client}, **kwargs)
+
+
+class TestIncrementalSync:
+    async def test_first_sync_is_full_then_delta_uses_stored_token(self):
+        repo = _FakeSyncRepository()
+        client = _StubProvider(
+            ProviderSyncResult(events=[_event("a"), _event("b")], sync_token="t1"),
+            ProviderSyncResult(
+                events=[_event("b", title="Moved")],
+                sync_token="t2",
+                deleted_event_ids=["a"],
+            ),
+        )
+        engine = _engine(repo, client)
+
+        first = await engine.sync_user("user_1", GOOGLE)
+        assert (first.mode, first.upserted, first.sync_token) == ("full", 2, "t1")
+
+        second = await engine.sync_user("user_1", GOOGLE)
+        assert client.calls == [None, "t1"]
+        assert (second.mode, second.upserted, second.deleted) == ("delta", 1, 1)
+        assert repo.external_ids("user_1") == ["b"]
+        assert repo.status[("user_1", GOOGLE)]["sync_token"] == "t2"
+
+    async def test_unchanged_events_are_not_rewritten(self):
+        repo = _FakeSyncRepository()
+        same = _event("a")
+        client = _StubProvider(
+            ProviderSyncResult(events=[same], sync_token="t1"),
+            ProviderSyncResult(events=[same], sync_token="t2"),
+        )
+        engine = _engine(repo, client)
+        await engine.sync_user("user_1", GOOGLE)
+        run = await engine.sync_user("user_1", GOOGLE)
+        assert (run.upserted, run.unchanged, run.synced_events) == (0, 1, 1)
+
+    async def test_upserts_are_batched(self):
+        repo = _FakeSyncRepository()
+        events = [_event(f"e{n}") for n in range(1200)]
+        engine = _engine(
+            repo, _StubProvider(ProviderSyncResult(events=events)), batch_size=500
+        )
+        run = await engine.sync_user("user_1", GOOGLE)
+        assert run.upserted == 1200
+        assert repo.upsert_calls == [500, 500, 200]
+
+    async def test_expired_token_falls_back_to_full_sync_and_prunes(self):
+        repo = _FakeSyncRepository()
+        client = _StubProvider(
+            ProviderSyncResult(events=[_event("a"), _event("b")], sync_token="t1"),
+            SyncTokenExpiredError("gone"),
+            ProviderSyncResult(events=[_event("b")], sync_token="fresh"),
+        )
+        engine = _engine(repo, client)
+        await engine.sync_user("user_1", GOOGLE)
+        repo.events[("user_1", GOOGLE, "past")] = {
+            "external_event_id": "past",
+            "start_time": _now() - timedelta(days=30),
+            "end_time": _now() - timedelta(days=30, hours=-1),
+        }
+
+        run = await engine.sync_user("user_1", GOOGLE)
+        assert client.calls == [None, "t1", None]
+        assert (run.mode, run.deleted, run.sync_token) == ("full", 1, "fresh")
+        # History outside the provider's sync window is kept
+        assert repo.external_ids("user_1") == ["b", "past"]
+
+
+class TestScheduling:
+    async def test_due_syncs_run_concurrently_within_provider_limit(self):
+        repo = _FakeSyncRepository()
+        users = [f"user_{n}" for n in range(6)]
+        for user in users:
+            repo.add_due(user)
+        client = _StubProvider(
+            ProviderSyncResult(events=[_event("a")], sync_token="t"), delay=0.02
+        )
+        engine = _engine(
+            repo,
+            client,
+            credentials_provider=_Credentials(users),
+            workers=6,
+            provider_limits={GOOGLE: (1000.0, 3)},
+        )
+
+        assert await engine.run_once() == 6
+        assert client.max_active == 3
+        assert all(repo.status[(u, GOOGLE)]["next_sync_at"] > _now() for u in users)
+        assert await engine.run_once() == 0
+
+    async def test_failures_back_off_exponentially(self):
+        repo = _FakeSyncRepository()
+        repo.add_due("user_1")
+        engine = _engine(
+            repo,
+            _StubProvider(RuntimeError("Google Calendar API returned 500")),
+            retry_base_seconds=60,
+            max_backoff_seconds=300,
+        )
+        delays = []
+        for _ in range(4):
+            before = _now()
+            assert await engine.run_once() == 1
+            row = repo.status[("user_1", GOOGLE)]
+            delays.append((row["next_sync_at"] - before).total_seconds())
+            row["next_sync_at"] = _now() - timedelta(seconds=1)
+
+        assert row["status"] == "error" and row["consecutive_failures"] == 4
+        assert 48 <= delays[0] <= 60 and 96 <= delays[1] <= 120
+        assert delays[3] <= 300
+
+    async def test_missing_credentials_is_recorded_as_error(self):
+        repo = _FakeSyncRepository()
+        repo.add_due("user_without_tokens")
+        client = _StubProvider(ProviderSyncResult(events=[]))
+        await _engine(repo, client).run_once()
+        assert client.calls == []
+        assert (
+            "credentials"
+            in repo.status[("user_without_tokens", GOOGLE)]["error_message"]
+        )
+
+    async def test_background_loop_picks_up_due_syncs(self):
+        repo = _FakeSyncRepository()
+        repo.add_due("user_1")
+        engine = _engine(
+            repo,
+            _StubProvider(ProviderSyncResult(events=[_event("a")])),
+            poll_interval_seconds=0.01,
+        )
+        engine.start()
+        try:
+            for _ in range(100):
+                if repo.external_ids("user_1"):
+                    break
+                await asyncio.sleep(0.01)
+            assert repo.external_ids("user_1") == ["a"]
+        finally:
+            await engine.stop()
+
+
+class TestServiceIntegration:
+    async def test_on_demand_sync_uses_request_credentials(self):
+        repo = _FakeSyncRepository()
+        client = _StubProvider(
+            ProviderSyncResult(events=[_event("a")], sync_token="t1")
+        )
+        engine = _engine(repo, client, credentials_provider=None)
+        service = CalendarService(repository=repo, sync_engine=engine)
+
+        result = await service.sync_with_external_calendar(
+            "user_9", GOOGLE, credentials={"access_token": "x"}
+        )
+        assert (result.status, result.synced_events, result.sync_token) == (
+            "success",
+            1,
+            "t1",
+        )
+        assert repo.status[("user_9", GOOGLE)]["next_sync_at"] > _now()
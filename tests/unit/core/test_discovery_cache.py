@@ -0,0 +1,215 @@
+"""Unit tests for core.discovery_cache.
+
+A fake Consul health endpoint stands in for the agent: plain calls answer
+immediately, blocking calls (``index``/``wait``) park until the test
+publishes a change or injects an outage.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.discovery_cache import DiscoveryCache, _cache_key, get_discovery_cache
+
+
+pytestmark = pytest.mark.unit
+
+
+def _service(sid, address="10.0.0.1", port=8000, tags=None):
+    return {
+        "Service": {"ID": sid, "Address": address, "Port": port, "Tags": tags or []}
+    }
+
+
+class _FakeHealth:
+    def __init__(self, services):
+        self.services = services
+        self.index = 10
+        self.calls = []
+        self.fail = False
+        self.changed = threading.Condition()
+
+    def service(self, name, passing=True, index=None, wait=None):
+        self.calls.append({"name": name, "index": index, "wait": wait})
+        if self.fail:
+            raise ConnectionError("consul unreachable")
+        if index:
+            with self.changed:
+                self.changed.wait_for(
+                    lambda: self.index > index or self.fail, timeout=0.5
+                )
+            if self.fail:
+                raise ConnectionError("consul unreachable")
+        return self.index, list(self.services)
+
+    def publish(self, services):
+        with self.changed:
+            self.services = services
+            self.index += 1
+            self.changed.notify_all()
+
+    def outage(self):
+        with self.changed:
+            self.fail = True
+            self.changed.notify_all()
+
+
+def _cache(health, **kwargs):
+    registry = SimpleNamespace(consul=SimpleNamespace(health=health))
+    kwargs.setdefault("watch", True)
+    kwargs.setdefault("retry_base", 0.01)
+    kwargs.setdefault("retry_max", 0.02)
+    return DiscoveryCache(registry, **kwargs)
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestDiscoveryCache:
+    def test_only_first_lookup_queries_consul(self):
+        health = _FakeHealth([_service("a-1")])
+        cache = _cache(health)
+        try:
+            assert cache.get_endpoint("account_service") == "http://10.0.0.1:8000"
+            for _ in range(20):
+                cache.get_instances("account_service")
+            assert len([c for c in health.calls if c["index"] is None]) == 1
+            assert cache.staleness("account_service") is not None
+        finally:
+            cache.close()
+
+    def test_watcher_swaps_in_changes(self):
+        health = _FakeHealth([_service("a-1")])
+        cache = _cache(health)
+        try:
+            cache.get_instances("account_service")
+            assert _wait_until(lambda: any(c["index"] == 10 for c in health.calls))
+
+            health.publish([_service("a-1"), _service("a-2", address="10.0.0.2")])
+
+            assert _wait_until(lambda: len(cache.get_instances("account_service")) == 2)
+            assert any(c["wait"] == "30s" for c in health.calls if c["index"])
+        finally:
+            cache.close()
+
+    def test_outage_serves_last_known_instances(self):
+        health = _FakeHealth([_service("a-1")])
+        cache = _cache(health)
+        try:
+            cache.get_instances("account_service")
+            health.outage()
+
+            assert _wait_until(lambda: cache.status()["account_service"]["errors"] > 0)
+            assert [i["id"] for i in cache.get_instances("account_service")] == ["a-1"]
+            assert (
+                cache.status()["account_service"]["last_error"] == "consul unreachable"
+            )
+        finally:
+            cache.close()
+
+    def test_cold_failure_is_filled_in_by_watcher(self):
+        health = _FakeHealth([_service("a-1")])
+        health.fail = True
+        cache = _cache(health)
+        try:
+            assert cache.get_endpoint("account_service") is None
+            health.fail = False
+            assert _wait_until(
+                lambda: cache.get_endpoint("account_service") is not None
+            )
+        finally:
+            cache.close()
+
+    async def test_async_lookup(self):
+        health = _FakeHealth([_service("a-1", port=9000)])
+        cache = _cache(health)
+        try:
+            assert (
+                await cache.get_endpoint_async("account_service")
+                == "http://10.0.0.1:9000"
+            )
+        finally:
+            cache.close()
+
+    def test_strategies(self):
+        health = _FakeHealth(
+            [_service("a-1"), _service("a-2", address="10.0.0.2", tags=["preferred"])]
+        )
+        cache = _cache(health)
+        try:
+            assert {cache.get_endpoint("svc", "round_robin") for _ in range(2)} == {
+                "http://10.0.0.1:8000",
+                "http://10.0.0.2:8000",
+            }
+            assert cache.get_endpoint("svc") == "http://10.0.0.2:8000"
+        finally:
+            cache.close()
+
+
+class TestUnwatchedCache:
+    def _watchers(self):
+        return [
+            t for t in threading.enumerate() if t.name.startswith("discovery-watch-")
+        ]
+
+    def test_lookups_refetch_after_the_refresh_interval(self):
+        health = _FakeHealth([_service("a-1")])
+        cache = _cache(health, watch=False, refresh_interval=0.05)
+        before = self._watchers()
+
+        cache.get_instances("account_service")
+        cache.get_instances("account_service")
+        assert len(health.calls) == 1
+        assert self._watchers() == before
+
+        health.publish([_service("a-1"), _service("a-2", address="10.0.0.2")])
+        time.sleep(0.06)
+
+        assert len(cache.get_instances("account_service")) == 2
+        assert [c["index"] for c in health.calls] == [None, None]
+
+    def test_failed_refresh_keeps_last_known_instances(self):
+        health = _FakeHealth([_service("a-1")])
+        cache = _cache(health, watch=False, refresh_interval=0)
+        cache.get_instances("account_service")
+        health.fail = True
+
+        assert [i["id"] for i in cache.get_instances("account_service")] == ["a-1"]
+        assert cache.status()["account_service"]["last_error"] == "consul unreachable"
+
+    def test_watching_follows_the_configured_consul_host(self, monkeypatch):
+        health = _FakeHealth([])
+        monkeypatch.delenv("DISCOVERY_WATCH", raising=False)
+        monkeypatch.delenv("CONSUL_HOST", raising=False)
+        assert _cache(health, watch=None).watch is False
+
+        monkeypatch.setenv("CONSUL_HOST", "consul.internal")
+        assert _cache(health, watch=None).watch is True
+
+        monkeypatch.setenv("DISCOVERY_WATCH", "false")
+        assert _cache(health, watch=None).watch is False
+
+
+class TestSharedCache:
+    def test_registries_for_same_agent_share_a_cache(self):
+        def registry(uri):
+            return SimpleNamespace(
+                consul=SimpleNamespace(http=SimpleNamespace(base_uri=uri))
+            )
+
+        a, b = registry("http://consul-test:8500"), registry("http://consul-test:8500")
+        assert _cache_key(a) == "http://consul-test:8500"
+        assert get_discovery_cache(a) is get_discovery_cache(b)
+        assert get_discovery_cache(
+            registry("http://other:8500")
+        ) is not get_discovery_cache(a)
@@ -0,0 +1,179 @@
+"""Unit tests for core.load_balancer."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+import httpx
+import pytest
+
+from core.load_balancer import BalancedTransport, LoadBalancer, param_affinity
+
+
+pytestmark = pytest.mark.unit
+
+
+def _instance(iid, address="10.0.0.1", port=8000, tags=None):
+    return {"id": iid, "address": address, "port": port, "tags": tags or []}
+
+
+INSTANCES = [_instance(f"m-{n}", address=f"10.0.0.{n}") for n in range(1, 5)]
+
+
+def _load(balancer, instance, in_flight=0, ewma=None):
+    stats = balancer.stats("svc", instance)
+    stats.in_flight = in_flight
+    stats.ewma = ewma
+
+
+class TestChoose:
+    def test_empty_and_single(self):
+        balancer = LoadBalancer()
+        assert balancer.choose("svc", []) is None
+        assert balancer.choose("svc", INSTANCES[:1]) == INSTANCES[0]
+
+    def test_p2c_never_picks_the_hottest_instance(self):
+        balancer = LoadBalancer()
+        for instance in INSTANCES:
+            _load(balancer, instance, in_flight=1, ewma=0.01)
+        _load(balancer, INSTANCES[0], in_flight=50, ewma=0.5)
+
+        picks = Counter(balancer.choose("svc", INSTANCES)["id"] for _ in range(400))
+        assert picks["m-1"] == 0
+        assert set(picks) == {"m-2", "m-3", "m-4"}
+
+    def test_new_instance_scores_at_service_mean(self):
+        balancer = LoadBalancer(default_latency=10.0)
+        _load(balancer, INSTANCES[0], ewma=0.02)
+        _load(balancer, INSTANCES[1], ewma=0.04)
+        assert balancer._score("svc", INSTANCES[2]) == pytest.approx(0.03)
+
+    def test_least_connections(self):
+        balancer = LoadBalancer()
+        for n, instance in enumerate(INSTANCES):
+            _load(balancer, instance, in_flight=n + 1)
+        assert balancer.choose("svc", INSTANCES, "least_connections") == INSTANCES[0]
+
+    def test_round_robin_survives_list_changes(self):
+        balancer = LoadBalancer()
+        first = balancer.choose("svc", INSTANCES, "round_robin")
+        second = balancer.choose("svc", INSTANCES + [_instance("m-9")], "round_robin")
+        assert (first["id"], second["id"]) == ("m-1", "m-2")
+
+    def test_health_weighted_prefers_tagged_instances(self):
+        balancer = LoadBalancer()
+        instances = INSTANCES[:2] + [_instance("m-p", tags=["preferred"])]
+        assert balancer.choose("svc", instances, "health_weighted")["id"] == "m-p"
+
+    def test_sticky_only_moves_keys_of_removed_instance(self):
+        balancer = LoadBalancer()
+        keys = [f"user-{n}" for n in range(200)]
+        before = {k: balancer.choose("svc", INSTANCES, "sticky", k)["id"] for k in keys}
+        after = {
+            k: balancer.choose("svc", INSTANCES[1:], "sticky", k)["id"] for k in keys
+        }
+
+        moved = {k for k in keys if before[k] != after[k]}
+        assert moved == {k for k in keys if before[k] == "m-1"}
+        assert len(set(before.values())) == 4
+
+
+class TestOutlierEjection:
+    def test_failing_instance_is_skipped_until_recovery(self):
+        balancer = LoadBalancer(failure_threshold=2, ejection_seconds=60)
+        for _ in range(2):
+            lease = balancer.acquire("svc", INSTANCES[0])
+            balancer.release(lease, success=False)
+
+        assert balancer.snapshot("svc")["m-1"]["breaker"] == "open"
+        picks = {balancer.choose("svc", INSTANCES[:2])["id"] for _ in range(50)}
+        assert picks == {"m-2"}
+
+    def test_all_ejected_fails_open(self):
+        balancer = LoadBalancer(failure_threshold=1, ejection_seconds=60)
+        balancer.release(balancer.acquire("svc", INSTANCES[0]), success=False)
+        assert balancer.choose("svc", INSTANCES[:1]) == INSTANCES[0]
+
+    def test_release_tracks_in_flight_and_latency(self):
+        balancer = LoadBalancer()
+        lease = balancer.acquire("svc", INSTANCES[0])
+        assert balancer.snapshot("svc")["m-1"]["in_flight"] == 1
+        balancer.release(lease, success=True)
+        snapshot = balancer.snapshot("svc")["m-1"]
+        assert snapshot["in_flight"] == 0
+        assert snapshot["ewma_ms"] is not None
+
+    def test_cancelled_lease_records_no_outcome(self):
+        balancer = LoadBalancer(failure_threshold=1)
+        balancer.release(balancer.acquire("svc", INSTANCES[0]), success=None)
+        assert balancer.snapshot("svc")["m-1"] == {
+            "in_flight": 0,
+            "ewma_ms": None,
+            "breaker": "closed",
+        }
+
+
+class TestBalancedTransport:
+    def _transport(self, handler, **kwargs):
+        async def resolver(name):
+            return INSTANCES[:2]
+
+        return BalancedTransport(
+            "svc",
+            resolver=resolver,
+            balancer=LoadBalancer(failure_threshold=1, ejection_seconds=60),
+            transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+
+    async def test_rewrites_request_to_chosen_instance(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.host)
+            return httpx.Response(200)
+
+        transport = self._transport(
+            handler, strategy="sticky", affinity=param_affinity("user_id")
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(5):
+                await client.get(
+                    "http://memory:8223/api/v1/memories", params={"user_id": "u1"}
+                )
+            await client.post(
+                "http://memory:8223/api/v1/memories", json={"user_id": "u1"}
+            )
+
+        assert len(set(seen)) == 1 and seen[0] in {"10.0.0.1", "10.0.0.2"}
+
+    async def test_server_errors_eject_instance(self):
+        def handler(request):
+            return httpx.Response(503 if request.url.host == "10.0.0.1" else 200)
+
+        transport = self._transport(handler, strategy="round_robin")
+        async with httpx.AsyncClient(transport=transport) as client:
+            statuses = [
+                (await client.get("http://svc/x")).status_code for _ in range(6)
+            ]
+
+        assert statuses.count(503) == 1
+        assert transport.balancer.snapshot("svc")["m-1"]["breaker"] == "open"
+
+    async def test_falls_back_to_configured_url_without_instances(self):
+        async def resolver(name):
+            return []
+
+        transport = BalancedTransport(
+            "svc",
+            resolver=resolver,
+            transport=httpx.MockTransport(
+                lambda r: httpx.Response(200, text=r.url.host)
+            ),
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            assert (await client.get("http://fallback:8000/x")).text == "fallback"
+
+    def test_rejects_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            BalancedTransport("svc", strategy="fastest")
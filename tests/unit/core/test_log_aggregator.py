@@ -0,0 +1,173 @@
+"""Unit tests for core.log_aggregator's indexed log reads."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.log_aggregator import INDEX_FILE_NAME, LogAggregator, LogIndex
+
+
+pytestmark = pytest.mark.unit
+
+
+def _json_line(ts, level="INFO", message="ok", service="billing_service"):
+    return json.dumps(
+        {
+            "timestamp": ts.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+            + "Z",
+            "service": service,
+            "level": level,
+            "message": message,
+            "logger": "billing_service.api",
+        }
+    )
+
+
+def _traditional_line(ts, level="INFO", message="ok"):
+    return (
+        f"{ts.strftime('%Y-%m-%d %H:%M:%S')},000 - billing.worker - {level} - {message}"
+    )
+
+
+def _write(path, lines, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    now = datetime.now()
+    old = [_json_line(now - timedelta(hours=30, minutes=n)) for n in range(300)]
+    recent = [
+        _json_line(
+            now - timedelta(minutes=300 - n),
+            level="ERROR" if n % 10 == 0 else "INFO",
+            message=f"db timeout {n % 3}" if n % 10 == 0 else "ok",
+        )
+        for n in range(300)
+    ]
+    _write(tmp_path / "billing_service.log", sorted(old) + recent)
+    _write(
+        tmp_path / "billing_service_worker.log",
+        [_traditional_line(now - timedelta(minutes=30), "WARNING", "slow job")],
+    )
+    return tmp_path
+
+
+def _aggregator(log_dir, stride=2048):
+    aggregator = LogAggregator(str(log_dir))
+    aggregator.index.stride = stride
+    return aggregator
+
+
+class TestLogIndex:
+    async def test_metrics_match_a_full_scan(self, log_dir):
+        aggregator = _aggregator(log_dir)
+        metrics = await aggregator.generate_metrics(hours_back=24)
+
+        assert metrics.total_logs == 301
+        assert metrics.error_count == 30
+        assert metrics.warning_count == 1
+        assert metrics.service_distribution == {"billing_service": 300, "billing": 1}
+        assert {e["message"] for e in metrics.top_errors} == {
+            "db timeout 0",
+            "db timeout 1",
+            "db timeout 2",
+        }
+        assert sum(e["count"] for e in metrics.top_errors) == 30
+
+    async def test_time_range_reads_skip_old_blocks(self, log_dir, monkeypatch):
+        aggregator = _aggregator(log_dir)
+        index = aggregator.index.refresh(log_dir / "billing_service.log", "billing")
+        assert len(index.blocks) > 10
+
+        scanned = []
+        original = aggregator.index._scan
+
+        def counting_scan(path, service, blocks):
+            scanned.extend(blocks)
+            return original(path, service, blocks)
+
+        monkeypatch.setattr(aggregator.index, "_scan", counting_scan)
+        entries = [
+            e async for e in aggregator.read_service_logs("billing", hours_back=1)
+        ]
+
+        assert len(entries) == 60
+        assert len(scanned) < len(index.blocks) / 3
+
+    async def test_search_filters_by_level_in_time_order(self, log_dir):
+        aggregator = _aggregator(log_dir)
+        errors = await aggregator.search_logs("timeout", level="ERROR", limit=5)
+        assert [e.message for e in errors] == [
+            f"db timeout {n % 3}" for n in range(0, 50, 10)
+        ]
+        stamps = [e.timestamp for e in errors]
+        assert stamps == sorted(stamps)
+
+    async def test_index_is_persisted_and_extended_incrementally(self, log_dir):
+        await _aggregator(log_dir).generate_metrics()
+        assert (log_dir / INDEX_FILE_NAME).exists()
+
+        _write(
+            log_dir / "billing_service.log",
+            [_json_line(datetime.now(), "ERROR", "new")],
+            "a",
+        )
+        reopened = _aggregator(log_dir)
+        size_before = reopened.index._files["billing_service.log"].size
+
+        metrics = await reopened.generate_metrics()
+        assert reopened.index._files["billing_service.log"].size > size_before
+        assert metrics.error_count == 31
+
+    def test_rotation_rebuilds_the_file_index(self, log_dir):
+        index = LogIndex(log_dir, persist=False)
+        path = log_dir / "billing_service.log"
+        index.refresh(path, "billing")
+
+        path.unlink()
+        _write(path, [_json_line(datetime.now())])
+        rebuilt = index.refresh(path, "billing")
+        assert sum(b.total for b in rebuilt.blocks) == 1
+
+    def test_partial_trailing_line_waits_for_newline(self, tmp_path):
+        path = tmp_path / "api_service.log"
+        line = _json_line(datetime.now())
+        path.write_text(line[:20], encoding="utf-8")
+        index = LogIndex(tmp_path, persist=False)
+        assert index.refresh(path, "api").size == 0
+
+        path.write_text(line + "\n", encoding="utf-8")
+        assert sum(b.total for b in index.refresh(path, "api").blocks) == 1
+
+
+class TestTail:
+    async def test_tail_returns_only_new_lines_per_consumer(self, log_dir):
+        aggregator = _aggregator(log_dir)
+        assert len(await aggregator.tail_service_logs("billing", "alerts")) == 601
+
+        _write(
+            log_dir / "billing_service.log",
+            [_json_line(datetime.now(), "ERROR", "fresh")],
+            "a",
+        )
+        fresh = await aggregator.tail_service_logs("billing", "alerts")
+        assert [e.message for e in fresh] == ["fresh"]
+
+        reopened = _aggregator(log_dir)
+        assert await reopened.tail_service_logs("billing", "alerts") == []
+        assert len(await reopened.tail_service_logs("billing", "other")) == 602
+
+
+class TestServiceHealth:
+    async def test_health_from_block_counts(self, log_dir):
+        health = await _aggregator(log_dir).get_service_health("billing")
+        assert health.total_logs_1h == 60
+        assert health.error_count_1h == 5
+        assert health.status == "degraded"
+        assert (datetime.now() - health.last_log_time) < timedelta(minutes=5)
@@ -0,0 +1,171 @@
+"""Unit tests for core.log_shipper."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+import time
+
+import httpx
+import pytest
+
+from core.log_shipper import LokiShipper, QueuedLokiHandler
+
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeLoki:
+    """Collects pushed streams; ``status`` controls the response."""
+
+    def __init__(self, status=204):
+        self.status = status
+        self.requests = []
+        self.lines = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, request):
+        self.release.wait(2)
+        self.requests.append(request)
+        if self.status >= 300:
+            return httpx.Response(self.status)
+        body = json.loads(gzip.decompress(request.content))
+        for stream in body["streams"]:
+            self.lines.extend(
+                (stream["stream"]["severity"], v[1]) for v in stream["values"]
+            )
+        return httpx.Response(self.status)
+
+
+def _shipper(loki, **kwargs):
+    kwargs.setdefault("flush_interval", 0.01)
+    kwargs.setdefault("retry_base", 0.01)
+    kwargs.setdefault("retry_max", 0.02)
+    return LokiShipper(
+        "http://loki/loki/api/v1/push",
+        {"service": "billing"},
+        client=httpx.Client(transport=httpx.MockTransport(loki)),
+        **kwargs,
+    )
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _submit(shipper, line, levelno=logging.INFO):
+    return shipper.submit(
+        line, logging.getLevelName(levelno).lower(), levelno, time.time()
+    )
+
+
+class TestLokiShipper:
+    def test_batches_compressed_pushes(self):
+        loki = _FakeLoki()
+        shipper = _shipper(loki, batch_size=50, start=False)
+        for n in range(120):
+            _submit(shipper, f"line {n}", logging.ERROR if n == 7 else logging.INFO)
+        shipper.start()
+        try:
+            assert _wait_until(lambda: len(loki.lines) == 120)
+            assert len(loki.requests) == 3
+            assert loki.requests[0].headers["Content-Encoding"] == "gzip"
+            assert ("error", "line 7") in loki.lines
+            assert shipper.stats()["shipped"] == 120
+        finally:
+            shipper.close()
+
+    def test_recovers_after_outage_instead_of_disabling(self):
+        loki = _FakeLoki(status=503)
+        shipper = _shipper(loki)
+        try:
+            _submit(shipper, "during outage")
+            assert _wait_until(lambda: len(loki.requests) >= 3)
+            assert shipper.stats()["failing"]
+
+            loki.status = 204
+            assert _wait_until(lambda: loki.lines == [("info", "during outage")])
+            _submit(shipper, "after outage")
+            assert _wait_until(lambda: ("info", "after outage") in loki.lines)
+            assert not shipper.stats()["failing"]
+        finally:
+            shipper.close()
+
+    def test_rejected_batch_is_dropped_not_retried(self):
+        loki = _FakeLoki(status=400)
+        shipper = _shipper(loki)
+        try:
+            _submit(shipper, "malformed")
+            assert _wait_until(lambda: shipper.stats()["dropped"].get("rejected") == 1)
+            time.sleep(0.05)
+            assert len(loki.requests) == 1
+        finally:
+            shipper.close()
+
+    def test_full_queue_keeps_warnings_and_drops_oldest(self):
+        shipper = _shipper(_FakeLoki(), max_queue=3, sample_above=1.0, start=False)
+        for n in range(3):
+            _submit(shipper, f"info {n}")
+        assert _submit(shipper, "warn", logging.WARNING)
+        assert [line for *_, line in shipper._queue] == ["info 1", "info 2", "warn"]
+        assert shipper.stats()["dropped"] == {"overflow": 1}
+        shipper.close()
+
+    def test_drop_newest_policy(self):
+        shipper = _shipper(
+            _FakeLoki(),
+            max_queue=2,
+            sample_above=1.0,
+            overflow="drop_newest",
+            start=False,
+        )
+        _submit(shipper, "a")
+        _submit(shipper, "b")
+        assert not _submit(shipper, "c")
+        assert [line for *_, line in shipper._queue] == ["a", "b"]
+        shipper.close()
+
+    def test_samples_low_severity_when_nearly_full(self):
+        shipper = _shipper(
+            _FakeLoki(), max_queue=10, sample_above=0.5, sample_rate=0.0, start=False
+        )
+        for n in range(8):
+            _submit(shipper, f"info {n}")
+        _submit(shipper, "error", logging.ERROR)
+        assert len(shipper._queue) == 6
+        assert shipper.stats()["dropped"] == {"sampled": 3}
+        shipper.close()
+
+    def test_rejects_unknown_overflow_policy(self):
+        with pytest.raises(ValueError):
+            _shipper(_FakeLoki(), overflow="block", start=False)
+
+
+class TestQueuedLokiHandler:
+    def test_emit_does_not_wait_for_loki(self):
+        loki = _FakeLoki()
+        loki.release.clear()  # every push hangs until released
+        shipper = _shipper(loki, batch_size=1)
+        log = logging.getLogger("test_log_shipper.handler")
+        log.propagate = False
+        handler = QueuedLokiHandler(shipper, level=logging.INFO)
+        log.addHandler(handler)
+        try:
+            started = time.monotonic()
+            for n in range(100):
+                log.warning("request %d", n)
+            assert time.monotonic() - started < 0.5
+            loki.release.set()
+            assert _wait_until(lambda: len(loki.lines) == 100)
+            assert loki.lines[0] == ("warning", "request 0")
+        finally:
+            log.removeHandler(handler)
+            handler.close()
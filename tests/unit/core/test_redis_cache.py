@@ -2,8 +2,8 @@
 L1 Unit Tests — core.redis_cache.
 
 Verifies the cache wrapper contract (get / set / delete / delete_pattern,
-namespace prefixing, miss-on-disconnect fallback, multi-replica
-visibility) using fakeredis to stay hermetic.
+versioned writes, namespace prefixing, miss-on-disconnect fallback,
+multi-replica visibility) using fakeredis to stay hermetic.
 
 Issue #347 — shared Redis cache for compliance / membership / authorization.
 """
@@ -315,6 +315,43 @@ async def test_get_or_load_runs_loader_when_redis_down():
     assert calls["n"] == 1
 
 
+# ----------------------------------------------------------------------
+# Versioned writes
+# ----------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_set_if_version_writes_when_not_bumped():
+    cache = RedisCache("ctx", client=_make_fake())
+
+    version = await cache.get_version("key")
+    assert version == ""
+    assert await cache.set_if_version("key", {"v": 1}, version) is True
+    assert await cache.get("key") == {"v": 1}
+
+
+@pytest.mark.asyncio
+async def test_set_if_version_skips_after_a_bump():
+    cache = RedisCache("ctx", client=_make_fake())
+    version = await cache.get_version("key")
+
+    assert await cache.bump_version("key") is True
+    assert await cache.set_if_version("key", {"v": "stale"}, version) is False
+    assert await cache.get("key") is None
+
+    version = await cache.get_version("key")
+    assert version == "1"
+    assert await cache.set_if_version("key", {"v": "fresh"}, version) is True
+
+
+@pytest.mark.asyncio
+async def test_get_version_is_none_when_redis_down():
+    cache = RedisCache("ctx", client=_FlakyClient())
+
+    assert await cache.get_version("key") is None
+    assert await cache.set_if_version("key", {"v": 1}, "") is False
+
+
 # ----------------------------------------------------------------------
 # Builder
 # ----------------------------------------------------------------------
@@ -0,0 +1,315 @@
+"""Unit tests for core.stat_rollups.
+
+The rollups replace full-table COUNT scans behind the services' statistics
+endpoints. These tests pin the range planning, the write/reconcile SQL
+shape and the way snapshots combine rollup buckets with raw edge ranges,
+against a fake DB.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from core.stat_rollups import (
+    TOTAL_DIMENSION,
+    CounterRollup,
+    RollupReconciler,
+    RollupSnapshot,
+    RollupSpec,
+    _plan_range,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+UTC = timezone.utc
+
+
+class _FakeAsyncDB:
+    """Records calls; returns rollup rows or edge rows by query shape."""
+
+    def __init__(self, rollup_rows=None, edge_rows=None, fail=False, distinct_count=0):
+        self.rollup_rows = rollup_rows or []
+        self.distinct_count = distinct_count
+        self.edge_rows = edge_rows or []
+        self.fail = fail
+        self.queries: List[Dict[str, Any]] = []
+        self.executes: List[Dict[str, Any]] = []
+        self.transactions: List[List[Dict[str, Any]]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def query(self, sql, params=None, schema="public"):
+        sql = " ".join(sql.split())
+        self.queries.append({"sql": sql, "params": list(params or [])})
+        if self.fail:
+            return None
+        if "GROUPING SETS" in sql:
+            return self.edge_rows
+        if "COUNT(DISTINCT" in sql:
+            return [{"distinct_count": self.distinct_count}]
+        return self.rollup_rows
+
+    async def execute(self, sql, params=None, schema="public"):
+        if self.fail:
+            raise RuntimeError("connection refused")
+        self.executes.append(
+            {"sql": " ".join(sql.split()), "params": list(params or [])}
+        )
+        return 1
+
+    async def execute_in_transaction(self, operations, schema="public"):
+        self.transactions.append(operations)
+        return True
+
+
+def _rollup(db, **overrides) -> CounterRollup:
+    spec = dict(
+        name="events",
+        source_table="event.events",
+        time_column="timestamp",
+        dimensions={"status": "status", "event_type": "event_type"},
+    )
+    spec.update(overrides)
+    return CounterRollup(db, RollupSpec(**spec), schema="event")
+
+
+def _row(dimension, value, count, amount=0.0):
+    return {
+        "dimension": dimension,
+        "dimension_value": value,
+        "event_count": count,
+        "amount_total": amount,
+    }
+
+
+class TestPlanRange:
+    def test_unbounded_range_reads_all_buckets(self):
+        assert _plan_range(None, None) == ((None, None), [])
+
+    def test_partial_days_become_edges(self):
+        start = datetime(2026, 3, 1, 15, tzinfo=UTC)
+        end = datetime(2026, 3, 10, 8, tzinfo=UTC)
+        bucket_range, edges = _plan_range(start, end)
+        assert bucket_range == (
+            datetime(2026, 3, 2, tzinfo=UTC),
+            datetime(2026, 3, 10, tzinfo=UTC),
+        )
+        assert edges == [
+            (start, datetime(2026, 3, 2, tzinfo=UTC), False),
+            (datetime(2026, 3, 10, tzinfo=UTC), end, True),
+        ]
+
+    def test_range_inside_one_bucket_is_a_single_edge(self):
+        start = datetime(2026, 3, 1, 1, tzinfo=UTC)
+        end = datetime(2026, 3, 1, 23, tzinfo=UTC)
+        assert _plan_range(start, end) == (None, [(start, end, True)])
+
+    def test_open_ended_since_has_no_upper_edge(self):
+        bucket_range, edges = _plan_range(datetime(2026, 3, 1, tzinfo=UTC), None)
+        assert bucket_range == (datetime(2026, 3, 1, tzinfo=UTC), None)
+        assert edges == []
+
+
+class TestRollupSnapshot:
+    def test_accessors(self):
+        snapshot = RollupSnapshot()
+        snapshot._add(TOTAL_DIMENSION, "", 5, 50.0)
+        snapshot._add("status", "ok", 3, 30.0)
+        snapshot._add("status", "failed", 2, 20.0)
+        snapshot._add("status", "ok", 1, 5.0)
+        snapshot._add("user", "u1", 0, 0)
+
+        assert snapshot.total == 5
+        assert snapshot.count("status", "ok") == 4
+        assert snapshot.count("status", "missing") == 0
+        assert snapshot.by("status") == {"ok": 4, "failed": 2}
+        assert snapshot.distinct("status") == 2
+        assert snapshot.distinct("user") == 0
+        assert snapshot.amount("status", "ok") == 35.0
+        assert snapshot.amount_by("status") == {"ok": 35.0, "failed": 20.0}
+
+
+class TestIncrement:
+    async def test_increment_many_is_one_coalesced_upsert(self):
+        db = _FakeAsyncDB()
+        rollup = _rollup(db)
+        at = datetime(2026, 3, 1, 12, tzinfo=UTC)
+
+        ok = await rollup.increment_many(
+            [
+                ({"status": "ok", "event_type": "click"}, at, 1, 0.0),
+                ({"status": "ok", "event_type": None}, at, 2, 0.0),
+            ]
+        )
+
+        assert ok is True
+        assert len(db.executes) == 1
+        sql = db.executes[0]["sql"]
+        assert "INSERT INTO event.stat_rollups" in sql
+        assert "unnest(" in sql
+        name, dimensions, values, buckets, counts, _ = db.executes[0]["params"]
+        assert name == "events"
+        rows = dict(zip(zip(dimensions, values), counts))
+        assert rows == {
+            (TOTAL_DIMENSION, ""): 3,
+            ("status", "ok"): 3,
+            ("event_type", "click"): 1,
+        }
+        assert set(buckets) == {datetime(2026, 3, 1, tzinfo=UTC)}
+
+    async def test_increment_never_raises(self):
+        rollup = _rollup(_FakeAsyncDB(fail=True))
+        assert await rollup.increment({"status": "ok"}) is False
+
+
+class TestReconcile:
+    async def test_hot_reconcile_is_scoped_and_locked(self):
+        db = _FakeAsyncDB()
+        rollup = _rollup(db)
+
+        assert (
+            await rollup.reconcile(datetime(2026, 3, 1, 9, tzinfo=UTC), min_age=30)
+            is True
+        )
+
+        gate, delete, insert, marker = db.transactions[0]
+        assert "pg_try_advisory_xact_lock" in gate["sql"]
+        assert gate["params"][1:] == ["events#hot", 30.0]
+        assert "bucket_start >= $2" in delete["sql"]
+        assert delete["params"] == ["events", datetime(2026, 3, 1, tzinfo=UTC)]
+        assert "GROUPING SETS" in insert["sql"]
+        assert "timestamp >= $2" in insert["sql"]
+        # Nothing is rewritten unless the gate (lock + freshness) passed
+        for op in (delete, insert, marker):
+            assert "current_setting('stat_rollups.run', true) = 'true'" in op["sql"]
+        assert marker["params"] == [["events#hot"]]
+
+    async def test_full_reconcile_rebuilds_every_bucket(self):
+        db = _FakeAsyncDB()
+        await _rollup(db).reconcile()
+        gate, delete, insert, marker = db.transactions[0]
+        assert "bucket_start" not in delete["sql"]
+        assert delete["params"] == ["events"]
+        assert gate["params"][1:] == ["events#full", 0.0]
+        assert marker["params"] == [["events#full", "events#hot"]]
+
+
+class TestSnapshot:
+    async def test_combines_rollup_buckets_with_edge_scans(self):
+        db = _FakeAsyncDB(
+            rollup_rows=[_row(TOTAL_DIMENSION, "", 100), _row("status", "ok", 90)],
+            edge_rows=[_row(TOTAL_DIMENSION, "", 2), _row("status", "ok", 1)],
+        )
+        rollup = _rollup(db)
+
+        snapshot = await rollup.snapshot(
+            datetime(2026, 3, 1, 15, tzinfo=UTC), datetime(2026, 3, 10, 8, tzinfo=UTC)
+        )
+
+        assert len(db.queries) == 3
+        assert "FROM event.stat_rollups" in db.queries[0]["sql"]
+        assert snapshot.total == 104
+        assert snapshot.count("status", "ok") == 92
+
+    async def test_rollup_without_time_column_ignores_range(self):
+        db = _FakeAsyncDB(rollup_rows=[_row("user", "u1", 3), _row("user", "u2", 1)])
+        rollup = _rollup(db, time_column=None, dimensions={"user": "target_id"})
+
+        snapshot = await rollup.snapshot(datetime(2026, 3, 1, 15, tzinfo=UTC))
+
+        assert len(db.queries) == 1
+        assert db.queries[0]["params"] == ["events"]
+        assert snapshot.distinct("user") == 2
+
+    async def test_count_only_dimension_is_counted_in_the_database(self):
+        db = _FakeAsyncDB(
+            rollup_rows=[_row(TOTAL_DIMENSION, "", 100), _row("status", "ok", 90)],
+            distinct_count=42,
+        )
+        rollup = _rollup(
+            db,
+            dimensions={"status": "status", "device": "device_id"},
+            count_only=("device",),
+        )
+
+        snapshot = await rollup.snapshot(
+            datetime(2026, 3, 1, 15, tzinfo=UTC), datetime(2026, 3, 10, 8, tzinfo=UTC)
+        )
+
+        buckets, lower, upper, distinct = db.queries
+        assert "dimension <> ALL(" in buckets["sql"] and ["device"] in buckets["params"]
+        assert "device_id" not in lower["sql"] and "device_id" not in upper["sql"]
+        assert distinct["sql"].count("UNION ALL") == 2
+        assert "(device_id)::text" in distinct["sql"]
+        assert snapshot.distinct("device") == 42
+        assert snapshot.by("device") == {}
+
+    async def test_database_error_raises_for_fallback(self):
+        rollup = _rollup(_FakeAsyncDB(fail=True))
+        with pytest.raises(RuntimeError):
+            await rollup.snapshot()
+
+
+class _RecordingRollup:
+    def __init__(self, name, time_column="created_at", interval=None, empty=False):
+        self.spec = RollupSpec(
+            name=name,
+            source_table="t",
+            dimensions={},
+            time_column=time_column,
+            full_reconcile_interval=interval,
+        )
+        self.empty = empty
+        self.calls: List[Any] = []
+
+    async def is_empty(self):
+        return self.empty
+
+    async def reconcile(self, min_age=None):
+        self.calls.append(("full", min_age))
+        return True
+
+    async def reconcile_hot(self, min_age=None):
+        self.calls.append(("hot", min_age))
+        return True
+
+
+class TestRollupReconciler:
+    async def test_default_is_hot_only(self):
+        timed = _RecordingRollup("timed")
+        untimed = _RecordingRollup("untimed", time_column=None)
+        reconciler = RollupReconciler([timed, untimed], hot_interval=60.0)
+
+        await reconciler.run_once()
+        await reconciler.run_once()
+
+        assert timed.calls == [("hot", 30.0), ("hot", 30.0)]
+        # Single-bucket rollups wait for their (default hourly) full pass
+        assert untimed.calls == []
+
+    async def test_empty_rollup_is_populated_once(self):
+        rollup = _RecordingRollup("fresh", empty=True)
+        reconciler = RollupReconciler([rollup], hot_interval=60.0)
+
+        await reconciler.run_once()
+        await reconciler.run_once()
+
+        assert rollup.calls == [("full", None), ("hot", 30.0)]
+
+    async def test_full_pass_repeats_after_interval_with_freshness_guard(self):
+        rollup = _RecordingRollup("short", interval=0.0)
+        reconciler = RollupReconciler([rollup])
+
+        await reconciler.run_once()
+        await reconciler.run_once()
+
+        assert rollup.calls == [("full", 0.0), ("full", 0.0)]
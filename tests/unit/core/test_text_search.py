@@ -0,0 +1,112 @@
+"""Unit tests for core.text_search.
+
+TextSearch and Keyset only build SQL fragments and bind parameters; these
+tests pin the pattern choice, wildcard escaping, the parameter numbering
+repositories rely on when splicing fragments into their own queries, and
+the cursor round trip.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from core.text_search import (
+    InvalidCursorError,
+    Keyset,
+    TextSearch,
+    decode_cursor,
+    encode_cursor,
+    escape_like,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestTextSearch:
+    def test_long_term_matches_substring(self):
+        params = ["org_1"]
+        search = TextSearch(("name", "email"), "  Alice ").bind(params)
+        assert params == ["org_1", "%alice%"]
+        assert search.condition == "(name ILIKE $2 OR email ILIKE $2)"
+        assert search.rank == ""
+
+    def test_short_term_matches_prefix(self):
+        params = []
+        TextSearch(("name",), "al").bind(params)
+        assert params == ["al%"]
+
+    def test_wildcards_are_escaped(self):
+        assert escape_like(r"50%_off\x") == r"50\%\_off\\x"
+        params = []
+        TextSearch(("name",), "100%").bind(params)
+        assert params == [r"%100\%%"]
+
+    def test_fuzzy_and_exact_columns_share_raw_param(self):
+        params = []
+        search = TextSearch(
+            ("order_id",), "Paid", fuzzy=True, exact_columns=("status",)
+        ).bind(params)
+        assert params == ["%paid%", "paid"]
+        assert search.condition == (
+            "(order_id ILIKE $1 OR order_id % $2 OR lower(status) = $2)"
+        )
+
+    def test_fuzzy_is_skipped_for_prefix_terms(self):
+        params = []
+        search = TextSearch(("name",), "ab", fuzzy=True).bind(params)
+        assert params == ["ab%"]
+        assert "%" not in search.condition.replace("ILIKE", "")
+
+    def test_ranked_binds_only_what_rank_references(self):
+        params = []
+        search = TextSearch(("name", "display_name"), "acme").bind(params, ranked=True)
+        assert params == ["%acme%", "acme", "acme%"]
+        assert search.rank.startswith("(GREATEST(") and search.rank.endswith("::float8")
+        assert "similarity(display_name, $2)" in search.rank
+
+
+class TestKeyset:
+    keyset = Keyset(("created_at", "user_id"))
+
+    def test_first_page_has_no_seek(self):
+        params = []
+        assert self.keyset.after(None, params) is None
+        assert params == []
+        assert self.keyset.order_by == "created_at DESC, user_id DESC"
+
+    def test_cursor_round_trip_seeks_past_last_row(self):
+        created = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+        cursor = self.keyset.cursor_for({"created_at": created, "user_id": "u_9"})
+
+        params = [True]
+        assert self.keyset.after(cursor, params) == "(created_at, user_id) < ($2, $3)"
+        assert params == [True, created, "u_9"]
+
+    def test_cursor_from_attributes_with_names(self):
+        class Row:
+            created_at = datetime(2026, 1, 1)
+            organization_id = "org_1"
+
+        keyset = Keyset(
+            ("o.created_at", "o.organization_id"),
+            names=("created_at", "organization_id"),
+        )
+        assert decode_cursor(keyset.cursor_for(Row()), 2) == [
+            datetime(2026, 1, 1),
+            "org_1",
+        ]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not base64!",
+            encode_cursor(["only-one"]),
+            encode_cursor([{"dt": "nope"}, "x"]),
+        ],
+    )
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            self.keyset.after(cursor, [])
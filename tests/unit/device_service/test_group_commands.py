@@ -0,0 +1,226 @@
+"""
+Unit tests for device command fan-out.
+
+A group / bulk command writes all of its command rows in one statement,
+publishes them through one MQTT session in concurrent batches and records
+the outcome with one status update per result, regardless of device count.
+Acknowledgements are streamed back per command until none is outstanding.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from microservices.device_service.device_service import DeviceService
+from tests.component.golden.device_service.mocks import (
+    MockDeviceRepository,
+    MockEventBus,
+    MockMQTTCommandClient,
+)
+
+
+pytestmark = pytest.mark.unit
+
+COMMAND = {
+    "command": "reboot",
+    "parameters": {"delay": 0},
+    "timeout": 30,
+    "priority": 5,
+    "require_ack": True,
+}
+
+
+async def _setup(device_count=3, connected=True):
+    repository = MockDeviceRepository()
+    await repository.create_device_group(
+        {"group_id": "grp_root", "user_id": "usr_1", "group_name": "Home"}
+    )
+    await repository.create_device_group(
+        {
+            "group_id": "grp_child",
+            "user_id": "usr_1",
+            "group_name": "Kitchen",
+            "parent_group_id": "grp_root",
+        }
+    )
+    for i in range(device_count):
+        await repository.create_device(
+            {
+                "device_id": f"dev_{i}",
+                "user_id": "usr_1",
+                "device_name": f"Device {i}",
+                "group_id": "grp_child" if i % 2 else "grp_root",
+            }
+        )
+    mqtt = MockMQTTCommandClient()
+    mqtt.connected = connected
+    service = DeviceService(
+        repository=repository, event_bus=MockEventBus(), mqtt_client=mqtt
+    )
+    return service, repository, mqtt
+
+
+@pytest.mark.asyncio
+async def test_group_command_uses_one_insert_one_publish_and_one_update():
+    service, repository, mqtt = await _setup(device_count=50)
+
+    batch = await service.send_group_command("grp_root", "usr_1", COMMAND)
+
+    assert (batch.total, batch.sent, batch.failed) == (50, 50, 0)
+    assert batch.status == "sent"
+    assert repository.call_count["bulk_create_device_commands"] == 1
+    assert repository.call_count["bulk_update_command_status"] == 1
+    assert repository.call_count["create_device_command"] == 0
+    assert mqtt.call_count["send_device_commands"] == 1
+    assert mqtt.call_count["send_device_command"] == 0
+    assert {c["command_id"] for c in mqtt.sent_commands} == set(repository.commands)
+    assert {c["status"] for c in repository.commands.values()} == {"sent"}
+    [event] = service.event_bus.published_events
+    assert event.type == "device.commands_sent"
+    assert event.data["batch_id"] == batch.batch_id
+
+
+@pytest.mark.asyncio
+async def test_partial_publish_failure_marks_only_failed_devices():
+    service, repository, mqtt = await _setup(device_count=4)
+    mqtt.failing_device_ids = {"dev_2"}
+
+    batch, results = await service.send_commands(
+        ["dev_0", "dev_1", "dev_2", "dev_3", "dev_1"], "usr_1", COMMAND
+    )
+
+    assert (batch.total, batch.sent, batch.failed) == (4, 3, 1)
+    assert batch.failed_device_ids == ["dev_2"]
+    assert results["dev_2"]["status"] == "failed"
+    assert repository.commands[results["dev_2"]["command_id"]]["status"] == "failed"
+    assert repository.commands[results["dev_0"]["command_id"]]["status"] == "sent"
+    assert repository.call_count["bulk_update_command_status"] == 2
+
+
+@pytest.mark.asyncio
+async def test_disconnected_mqtt_simulates_the_batch():
+    service, repository, mqtt = await _setup(device_count=2, connected=False)
+
+    batch, results = await service.send_commands(["dev_0", "dev_1"], "usr_1", COMMAND)
+
+    assert batch.status == "simulated"
+    assert {r["status"] for r in results.values()} == {"simulated"}
+    assert mqtt.sent_commands == []
+    assert {c["status"] for c in repository.commands.values()} == {"sent"}
+
+
+@pytest.mark.asyncio
+async def test_acks_are_scoped_to_the_reporting_device():
+    service, repository, _ = await _setup(device_count=2)
+    _, results = await service.send_commands(["dev_0", "dev_1"], "usr_1", COMMAND)
+
+    updated = await service.acknowledge_commands(
+        "dev_0",
+        [
+            {"command_id": results["dev_0"]["command_id"], "status": "executed"},
+            {"command_id": results["dev_1"]["command_id"], "status": "executed"},
+        ],
+    )
+
+    assert updated == 1
+    assert repository.commands[results["dev_1"]["command_id"]]["status"] == "sent"
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_acks_then_expires_the_rest():
+    service, repository, _ = await _setup(device_count=3)
+    batch, results = await service.send_commands(
+        ["dev_0", "dev_1", "dev_2"], "usr_1", COMMAND
+    )
+    await service.acknowledge_commands(
+        "dev_0",
+        [
+            {
+                "command_id": results["dev_0"]["command_id"],
+                "status": "executed",
+                "result": {"ok": True},
+            }
+        ],
+    )
+    for command in repository.commands.values():
+        command["created_at"] -= timedelta(seconds=COMMAND["timeout"] + 1)
+
+    items = [
+        item
+        async for item in service.stream_command_batch(batch.batch_id, poll_interval=0)
+    ]
+
+    first, *acks, last = items
+    assert first["type"] == "summary" and first["awaiting"] == 2
+    assert [(a["device_id"], a["status"]) for a in acks[:1]] == [("dev_0", "executed")]
+    assert acks[0]["result"] == {"ok": True}
+    assert sorted(a["device_id"] for a in acks[1:]) == ["dev_1", "dev_2"]
+    assert {a["status"] for a in acks[1:]} == {"timeout"}
+    assert last["done"] is True
+    assert (last["executed"], last["timeout"], last["awaiting"]) == (1, 2, 0)
+    assert repository.call_count["expire_command_batch"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_of_unknown_batch_is_empty():
+    service, _, _ = await _setup(device_count=0)
+
+    assert [i async for i in service.stream_command_batch("missing")] == []
+
+
+@pytest.mark.asyncio
+async def test_stream_picks_up_an_ack_stamped_before_the_last_streamed_one():
+    service, repository, _ = await _setup(device_count=2)
+    batch, results = await service.send_commands(["dev_0", "dev_1"], "usr_1", COMMAND)
+    late_id = results["dev_1"]["command_id"]
+    polls = 0
+
+    async def ack_late_with_an_old_stamp(*_args, **_kwargs):
+        nonlocal polls
+        polls += 1
+        if polls == 1:
+            await service.acknowledge_commands(
+                "dev_1", [{"command_id": late_id, "status": "executed"}]
+            )
+            # Committed after dev_0's ack but stamped before it
+            repository.commands[late_id]["completed_at"] -= timedelta(minutes=5)
+
+    await service.acknowledge_commands(
+        "dev_0", [{"command_id": results["dev_0"]["command_id"], "status": "executed"}]
+    )
+    stream = service.stream_command_batch(batch.batch_id, poll_interval=0)
+    items = []
+    async for item in stream:
+        items.append(item)
+        if item["type"] == "ack" and item["device_id"] == "dev_0":
+            await ack_late_with_an_old_stamp()
+
+    acked = [(i["device_id"], i["status"]) for i in items if i["type"] == "ack"]
+    assert acked == [("dev_0", "executed"), ("dev_1", "executed")]
+    assert items[-1]["done"] is True
+
+
+@pytest.mark.asyncio
+async def test_failed_expiry_waits_for_the_next_poll():
+    service, repository, _ = await _setup(device_count=1)
+    batch, _ = await service.send_commands(["dev_0"], "usr_1", COMMAND)
+    for command in repository.commands.values():
+        command["created_at"] -= timedelta(seconds=COMMAND["timeout"] + 1)
+
+    async def fail(batch_id):
+        repository.call_count["expire_command_batch"] += 1
+        raise RuntimeError("db down")
+
+    repository.expire_command_batch = fail
+    items = [
+        item
+        async for item in service.stream_command_batch(
+            batch.batch_id, poll_interval=0.01, max_wait=0.05
+        )
+    ]
+
+    assert items[-1]["done"] is False
+    # Roughly one attempt per poll interval, not a tight retry loop
+    assert 1 <= repository.call_count["expire_command_batch"] <= 10
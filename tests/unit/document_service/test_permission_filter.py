@@ -0,0 +1,247 @@
+"""Unit tests for batched permission filtering in semantic search.
+
+Covers the in-memory ACL rules, the per-user authorization cache and the
+over-fetch/refill loop in DocumentService.semantic_search_secure.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from microservices.document_service.document_service import DocumentService
+from microservices.document_service.models import (
+    AccessLevel,
+    ChunkingStrategy,
+    DocumentStatus,
+    DocumentType,
+    KnowledgeDocument,
+    SemanticSearchRequest,
+)
+from microservices.document_service.permission_filter import DocumentPermissionFilter
+
+pytestmark = pytest.mark.unit
+
+
+def _document(doc_id, owner="owner", access_level=AccessLevel.PRIVATE, **acl):
+    now = datetime.now(timezone.utc)
+    return KnowledgeDocument(
+        doc_id=doc_id,
+        user_id=owner,
+        title=f"Title {doc_id}",
+        doc_type=DocumentType.PDF,
+        file_id=f"file_{doc_id}",
+        file_size=1024,
+        status=DocumentStatus.INDEXED,
+        chunking_strategy=ChunkingStrategy.SEMANTIC,
+        access_level=access_level,
+        allowed_users=acl.get("allowed_users", []),
+        allowed_groups=[],
+        denied_users=acl.get("denied_users", []),
+        collection_name=f"user_{owner}",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class _AuthClient:
+    def __init__(self, allowed=(), fail=False):
+        self.allowed = set(allowed)
+        self.fail = fail
+        self.calls = []
+
+    async def check_permission(self, user_id, resource_type, resource_id, action):
+        self.calls.append(resource_id)
+        if self.fail:
+            raise RuntimeError("authorization service down")
+        return resource_id in self.allowed
+
+
+class _Repository:
+    def __init__(self, documents):
+        self.documents = {doc.doc_id: doc for doc in documents}
+        self.batch_calls = []
+
+    async def get_documents_by_ids(self, doc_ids):
+        self.batch_calls.append(list(doc_ids))
+        return {i: self.documents[i] for i in doc_ids if i in self.documents}
+
+    async def get_document_by_id(self, doc_id):
+        raise AssertionError("search must not load documents one by one")
+
+
+class _DigitalClient:
+    def __init__(self, hits):
+        self.hits = hits
+        self.requested = []
+
+    def is_enabled(self):
+        return True
+
+    async def search_content(self, user_id, query, collection_name, top_k=10):
+        self.requested.append(top_k)
+        return {"results": self.hits[:top_k]}
+
+
+def _hit(n, doc_id, score=0.9):
+    return {
+        "id": f"chunk_{n}",
+        "text": f"text {n}",
+        "score": score,
+        "metadata": {"doc_id": doc_id},
+    }
+
+
+@pytest.mark.asyncio
+class TestDocumentPermissionFilter:
+    async def test_row_rules_need_no_remote_calls(self):
+        auth = _AuthClient()
+        documents = [
+            _document("own", owner="alice"),
+            _document("public", access_level=AccessLevel.PUBLIC),
+            _document(
+                "denied", access_level=AccessLevel.PUBLIC, denied_users=["alice"]
+            ),
+            _document("shared", allowed_users=["alice"]),
+            _document("private"),
+        ]
+
+        readable = await DocumentPermissionFilter(auth).readable("alice", documents)
+
+        assert readable == {"own", "public", "shared"}
+        assert auth.calls == []
+
+    async def test_team_decisions_are_cached_per_user(self):
+        auth = _AuthClient(allowed={"team_a"})
+        permission_filter = DocumentPermissionFilter(auth)
+        documents = [
+            _document("team_a", access_level=AccessLevel.TEAM),
+            _document("team_b", access_level=AccessLevel.TEAM),
+        ]
+
+        first = await permission_filter.readable("alice", documents)
+        second = await permission_filter.readable("alice", documents)
+        await permission_filter.readable("bob", documents)
+
+        assert first == second == {"team_a"}
+        assert sorted(auth.calls) == ["team_a", "team_a", "team_b", "team_b"]
+
+    async def test_invalidate_forgets_cached_decision(self):
+        auth = _AuthClient()
+        permission_filter = DocumentPermissionFilter(auth)
+        document = _document("team_a", access_level=AccessLevel.TEAM)
+
+        assert await permission_filter.readable("alice", [document]) == set()
+        auth.allowed.add("team_a")
+        permission_filter.invalidate_document("team_a")
+
+        assert await permission_filter.readable("alice", [document]) == {"team_a"}
+
+    async def test_expired_decisions_are_rechecked(self):
+        auth = _AuthClient(allowed={"team_a"})
+        permission_filter = DocumentPermissionFilter(auth, cache_ttl_seconds=0)
+        document = _document("team_a", access_level=AccessLevel.TEAM)
+
+        await permission_filter.readable("alice", [document])
+        await permission_filter.readable("alice", [document])
+
+        assert auth.calls == ["team_a", "team_a"]
+
+    async def test_failed_checks_deny_without_caching(self):
+        auth = _AuthClient(allowed={"team_a"}, fail=True)
+        permission_filter = DocumentPermissionFilter(auth)
+        document = _document("team_a", access_level=AccessLevel.TEAM)
+
+        assert await permission_filter.readable("alice", [document]) == set()
+        auth.fail = False
+        assert await permission_filter.readable("alice", [document]) == {"team_a"}
+
+    async def test_user_cache_is_bounded(self):
+        permission_filter = DocumentPermissionFilter(_AuthClient(), max_cached_users=2)
+        document = _document("team_a", access_level=AccessLevel.TEAM)
+
+        for user_id in ("a", "b", "c"):
+            await permission_filter.readable(user_id, [document])
+
+        assert list(permission_filter._decisions) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+class TestSemanticSearchFiltering:
+    def _service(self, documents, hits, auth=None):
+        return DocumentService(
+            repository=_Repository(documents),
+            auth_client=auth or _AuthClient(),
+            digital_client=_DigitalClient(hits),
+        )
+
+    async def test_one_batch_query_per_round(self):
+        documents = [_document(f"doc_{i}", owner="alice") for i in range(5)]
+        hits = [_hit(i, f"doc_{i}") for i in range(5)]
+        service = self._service(documents, hits)
+
+        result = await service.semantic_search_secure(
+            SemanticSearchRequest(query="q", top_k=5), "alice"
+        )
+
+        assert [item.doc_id for item in result.results] == [
+            f"doc_{i}" for i in range(5)
+        ]
+        assert len(service.repo.batch_calls) == 1
+
+    async def test_filtered_hits_are_refilled(self):
+        documents = [_document(f"hidden_{i}") for i in range(4)] + [
+            _document(f"mine_{i}", owner="alice") for i in range(3)
+        ]
+        hits = [_hit(i, f"hidden_{i}") for i in range(4)] + [
+            _hit(10 + i, f"mine_{i}") for i in range(3)
+        ]
+        service = self._service(documents, hits)
+
+        result = await service.semantic_search_secure(
+            SemanticSearchRequest(query="q", top_k=2), "alice"
+        )
+
+        assert [item.doc_id for item in result.results] == ["mine_0", "mine_1"]
+        assert service.digital_client.requested == [4, 8]
+        # Second round only resolves chunks not seen in the first
+        assert service.repo.batch_calls[1] == ["mine_0", "mine_1", "mine_2"]
+
+    async def test_stops_when_collection_is_exhausted(self):
+        service = self._service([_document("hidden")], [_hit(0, "hidden")])
+
+        result = await service.semantic_search_secure(
+            SemanticSearchRequest(query="q", top_k=3), "alice"
+        )
+
+        assert result.results == []
+        assert service.digital_client.requested == [6]
+
+
+class _RowsDb:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def query(self, sql, params=None, schema=None):
+        return [dict(row) for row in self.rows]
+
+
+@pytest.mark.asyncio
+async def test_unreadable_row_does_not_hide_the_batch():
+    from microservices.document_service.document_repository import DocumentRepository
+
+    good = _document("good").model_dump()
+    bad = dict(_document("bad").model_dump(), access_level="not-a-level")
+    repo = object.__new__(DocumentRepository)
+    repo.db = _RowsDb([bad, good])
+    repo.schema = "document"
+    repo.documents_table = "knowledge_documents"
+
+    documents = await repo.get_documents_by_ids(["bad", "good"])
+
+    assert list(documents) == ["good"]
@@ -466,7 +466,7 @@ class TestSwitchUserContextValidation:
         from microservices.organization_service.organization_service import OrganizationAccessDeniedError
 
         service = self._create_service()
-        service.repository.get_user_organization_role = AsyncMock(return_value=None)
+        service.repository.get_user_memberships = AsyncMock(return_value=[])
 
         with pytest.raises(OrganizationAccessDeniedError) as exc_info:
             await service.switch_user_context("usr_123", organization_id="org_123")
@@ -479,8 +479,15 @@ class TestSwitchUserContextValidation:
         from microservices.organization_service.organization_service import OrganizationAccessDeniedError
 
         service = self._create_service()
-        service.repository.get_user_organization_role = AsyncMock(
-            return_value={"role": "member", "status": "suspended", "permissions": []}
+        service.repository.get_user_memberships = AsyncMock(
+            return_value=[
+                {
+                    "organization_id": "org_123",
+                    "role": "member",
+                    "status": "suspended",
+                    "permissions": [],
+                }
+            ]
         )
 
         with pytest.raises(OrganizationAccessDeniedError) as exc_info:
@@ -0,0 +1,330 @@
+"""
+Unit tests for frame photo prefetching.
+
+Covers the rotation model (slots, looping, shuffle, time windows), the
+schedule-aware eviction order, MediaService.prefetch_frame's batched
+repository usage and on-demand caching racing the prefetcher.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from microservices.media_service.media_service import (
+    MediaNotFoundError,
+    MediaService,
+    MediaValidationError,
+)
+from microservices.media_service.models import (
+    CacheStatus,
+    PhotoCache,
+    Playlist,
+    RotationSchedule,
+    ScheduleType,
+)
+from microservices.media_service.prefetch_planner import (
+    plan_frame,
+    select_evictions,
+    upcoming_photos,
+)
+from tests.component.golden.media_service.mocks import MockEventBus, MockMediaRepository
+
+pytestmark = pytest.mark.unit
+
+ANCHOR = datetime(2026, 1, 5, 0, 0, tzinfo=timezone.utc)  # a Monday
+
+
+def _schedule(schedule_id="sch_1", interval=60, **fields):
+    return RotationSchedule(
+        schedule_id=schedule_id,
+        user_id="usr_1",
+        frame_id=fields.pop("frame_id", "frame_1"),
+        playlist_id=fields.pop("playlist_id", "pl_1"),
+        rotation_interval=interval,
+        created_at=ANCHOR,
+        **fields,
+    )
+
+
+def _playlist(photo_ids, playlist_id="pl_1", **fields):
+    return Playlist(
+        playlist_id=playlist_id,
+        name="Family",
+        user_id="usr_1",
+        photo_ids=photo_ids,
+        **fields,
+    )
+
+
+def _entry(photo_id, status=CacheStatus.CACHED, last_used_minutes=0, **fields):
+    return PhotoCache(
+        cache_id=f"cache_{photo_id}",
+        user_id="usr_1",
+        frame_id="frame_1",
+        photo_id=photo_id,
+        cache_status=status,
+        last_accessed_at=ANCHOR - timedelta(minutes=last_used_minutes),
+        **fields,
+    )
+
+
+class TestUpcomingPhotos:
+    def test_slots_follow_the_rotation_interval(self):
+        now = ANCHOR + timedelta(seconds=150)  # inside slot 2
+
+        planned = upcoming_photos(_schedule(), _playlist(["a", "b", "c"]), now, 4)
+
+        assert [p.photo_id for p in planned] == ["c", "a", "b", "c"]
+        assert planned[0].display_at == now
+        assert planned[1].display_at == ANCHOR + timedelta(seconds=180)
+
+    def test_no_loop_stops_at_the_end(self):
+        playlist = _playlist(["a", "b", "c"], loop=False)
+
+        planned = upcoming_photos(
+            _schedule(), playlist, ANCHOR + timedelta(seconds=60), 5
+        )
+
+        assert [p.photo_id for p in planned] == ["b", "c"]
+
+    def test_shuffle_is_deterministic_per_cycle(self):
+        schedule = _schedule(shuffle=True)
+        playlist = _playlist([f"p{i}" for i in range(10)])
+
+        first = upcoming_photos(schedule, playlist, ANCHOR, 10)
+        again = upcoming_photos(schedule, playlist, ANCHOR, 10)
+
+        assert first == again
+        assert sorted(p.photo_id for p in first) == sorted(playlist.photo_ids)
+
+    def test_time_based_schedule_waits_for_its_window(self):
+        schedule = _schedule(
+            interval=3600,
+            schedule_type=ScheduleType.TIME_BASED,
+            start_time="08:00:00",
+            end_time="10:00",
+            days_of_week=[1],  # Tuesday
+        )
+        now = ANCHOR + timedelta(hours=9)  # Monday 09:00
+
+        planned = upcoming_photos(schedule, _playlist(["a", "b", "c"]), now, 3)
+
+        tuesday_8am = ANCHOR + timedelta(days=1, hours=8)
+        assert [p.display_at for p in planned] == [
+            tuesday_8am,
+            tuesday_8am + timedelta(hours=1),
+            tuesday_8am + timedelta(days=7),
+        ]
+
+    def test_overnight_window_that_is_already_open_is_used(self):
+        schedule = _schedule(
+            interval=3600,
+            schedule_type=ScheduleType.TIME_BASED,
+            start_time="22:00",
+            end_time="06:00",
+            days_of_week=[0],  # Monday night
+        )
+        now = ANCHOR + timedelta(days=1, hours=2)  # Tuesday 02:00
+
+        planned = upcoming_photos(schedule, _playlist(["a", "b", "c"]), now, 2)
+
+        assert [p.display_at for p in planned] == [now, now + timedelta(hours=1)]
+
+    def test_overnight_window_of_an_inactive_day_is_skipped(self):
+        schedule = _schedule(
+            interval=3600,
+            schedule_type=ScheduleType.TIME_BASED,
+            start_time="22:00",
+            end_time="06:00",
+            days_of_week=[1],  # Tuesday night only
+        )
+        now = ANCHOR + timedelta(days=1, hours=2)  # Tuesday 02:00
+
+        [first] = upcoming_photos(schedule, _playlist(["a"]), now, 1)
+
+        assert first.display_at == ANCHOR + timedelta(days=1, hours=22)
+
+    def test_event_based_and_inactive_schedules_are_not_planned(self):
+        playlist = _playlist(["a"])
+
+        assert (
+            upcoming_photos(
+                _schedule(schedule_type=ScheduleType.EVENT_BASED), playlist, ANCHOR, 3
+            )
+            == []
+        )
+        assert upcoming_photos(_schedule(is_active=False), playlist, ANCHOR, 3) == []
+
+
+class TestPlanAndEvict:
+    def test_frame_plan_merges_schedules_without_duplicates(self):
+        schedules = [
+            _schedule("sch_1", interval=60),
+            _schedule("sch_2", interval=90, playlist_id="pl_2"),
+        ]
+        playlists = {
+            "pl_1": _playlist(["a", "b"]),
+            "pl_2": _playlist(["b", "z"], playlist_id="pl_2"),
+        }
+
+        planned = plan_frame(schedules, playlists, ANCHOR, 3)
+
+        assert [p.photo_id for p in planned] == ["a", "b", "z"]
+
+    def test_planned_photos_are_never_evicted(self):
+        entries = [
+            _entry("old", last_used_minutes=60),
+            _entry("next", last_used_minutes=120),
+            _entry("recent", last_used_minutes=1),
+            _entry("broken", status=CacheStatus.FAILED),
+        ]
+
+        evicted = select_evictions(entries, ["next"], capacity=2, now=ANCHOR)
+
+        assert [e.photo_id for e in evicted] == ["broken", "old"]
+
+
+@pytest.mark.asyncio
+class TestPrefetchFrame:
+    def _service(self, cached=()):
+        repository = MockMediaRepository()
+        repository.list_frame_schedules.return_value = [_schedule()]
+        repository.get_playlists_by_ids.return_value = {
+            "pl_1": _playlist(["a", "b", "c", "d"])
+        }
+        repository.list_frame_cache.return_value = [_entry(p) for p in cached]
+        repository.get_current_versions.return_value = {"b": "ver_b"}
+        return MediaService(
+            repository=repository,
+            event_bus=MockEventBus(),
+            storage_client=object(),
+            device_client=object(),
+            frame_cache_capacity=10,
+        )
+
+    async def test_missing_photos_are_created_in_one_batch(self):
+        service = self._service(cached=["a"])
+
+        result = await service.prefetch_frame(
+            "frame_1", "usr_1", lookahead=3, now=ANCHOR
+        )
+
+        repository = service.repository
+        [entries] = repository.bulk_create_photo_cache.call_args.args
+        assert [(e.photo_id, e.version_id) for e in entries] == [
+            ("b", "ver_b"),
+            ("c", None),
+        ]
+        assert all(e.cache_status == CacheStatus.PENDING for e in entries)
+        repository.get_current_versions.assert_awaited_once_with(["b", "c"], "usr_1")
+        assert result.created == 2
+        assert [p.photo_id for p in result.planned] == ["a", "b", "c"]
+
+        [event] = service.event_bus.published_events
+        assert event.type == "media.frame.prefetch_planned"
+        assert [e["photo_id"] for e in event.data["entries"]] == ["b", "c"]
+
+    async def test_fully_cached_frame_publishes_nothing(self):
+        service = self._service(cached=["a", "b"])
+
+        result = await service.prefetch_frame(
+            "frame_1", "usr_1", lookahead=2, now=ANCHOR
+        )
+
+        assert result.created == 0
+        assert service.event_bus.published_events == []
+
+
+@pytest.mark.asyncio
+class TestPrefetchAllFrames:
+    def _service(self, schedules):
+        repository = MockMediaRepository()
+
+        async def page(after=None, limit=1000):
+            keyed = sorted(
+                schedules, key=lambda s: (s.frame_id, s.user_id, s.schedule_id)
+            )
+            if after is not None:
+                keyed = [
+                    s for s in keyed if (s.frame_id, s.user_id, s.schedule_id) > after
+                ]
+            return keyed[:limit]
+
+        repository.list_active_schedules.side_effect = page
+        repository.get_playlists_by_ids.return_value = {"pl_1": _playlist(["a"])}
+        return MediaService(
+            repository=repository,
+            event_bus=MockEventBus(),
+            storage_client=object(),
+            device_client=object(),
+        )
+
+    async def test_frames_split_across_pages_are_planned_once_with_all_schedules(self):
+        schedules = [
+            _schedule(f"sch_{i}", frame_id=f"frame_{i // 2}") for i in range(5)
+        ]
+        service = self._service(schedules)
+        service._prefetch_schedules = AsyncMock()
+
+        planned = await service.prefetch_all_frames(now=ANCHOR, page_size=3)
+
+        assert planned == 3
+        calls = {
+            c.args[0]: [s.schedule_id for s in c.args[2]]
+            for c in service._prefetch_schedules.await_args_list
+        }
+        assert calls == {
+            "frame_0": ["sch_0", "sch_1"],
+            "frame_1": ["sch_2", "sch_3"],
+            "frame_2": ["sch_4"],
+        }
+
+    async def test_unclaimed_pass_plans_nothing(self):
+        service = self._service([_schedule()])
+        service.repository.claim_prefetch_pass.return_value = False
+
+        planned = await service.prefetch_all_frames(now=ANCHOR, min_interval=270)
+
+        assert planned == 0
+        service.repository.claim_prefetch_pass.assert_awaited_once_with(270)
+        service.repository.list_active_schedules.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestFrameCacheRaces:
+    def _service(self):
+        return MediaService(
+            repository=MockMediaRepository(),
+            event_bus=MockEventBus(),
+            storage_client=object(),
+            device_client=object(),
+        )
+
+    async def test_request_losing_to_the_prefetcher_gets_its_entry(self):
+        service = self._service()
+        prefetched = _entry("a", status=CacheStatus.DOWNLOADING)
+        service.repository.create_photo_cache.side_effect = None
+        service.repository.create_photo_cache.return_value = prefetched
+
+        response = await service.cache_photo_for_frame("frame_1", "a", "usr_1")
+
+        assert response.cache_id == prefetched.cache_id
+        assert service.event_bus.published_events == []
+
+    async def test_refused_transition_is_a_conflict_not_a_server_error(self):
+        service = self._service()
+        service.repository.update_cache_status.return_value = None
+        service.repository.get_photo_cache.return_value = _entry(
+            "a", status=CacheStatus.FAILED
+        )
+
+        with pytest.raises(MediaValidationError):
+            await service.update_cache_status("cache_a", CacheStatus.PENDING)
+
+    async def test_transition_of_a_missing_entry_is_not_found(self):
+        service = self._service()
+        service.repository.update_cache_status.return_value = None
+
+        with pytest.raises(MediaNotFoundError):
+            await service.update_cache_status("cache_a", CacheStatus.PENDING)
@@ -0,0 +1,244 @@
+"""
+Unit tests for bulk organization member operations.
+
+Each batch must cost one caller-role lookup, one membership lookup and one
+set-based write, report per-row failures without aborting the batch, and
+publish a single aggregated event.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from microservices.organization_service.models import (
+    BulkMemberAddItem,
+    BulkMemberUpdateItem,
+    OrganizationMemberBulkAddRequest,
+    OrganizationMemberBulkRemoveRequest,
+    OrganizationMemberBulkUpdateRequest,
+)
+from microservices.organization_service.organization_service import (
+    OrganizationAccessDeniedError,
+    OrganizationService,
+)
+from microservices.organization_service.user_context_cache import UserContextCache
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+class _FakeRepository:
+    """In-memory memberships of one organization, recording every call"""
+
+    def __init__(self):
+        self.members = {}
+        self.calls = []
+
+    def add_member(self, user_id, role="member", status="active"):
+        self.members[user_id] = {
+            "user_id": user_id,
+            "role": role,
+            "status": status,
+            "permissions": [],
+        }
+
+    async def get_user_organization_role(self, organization_id, user_id):
+        self.calls.append("get_user_organization_role")
+        member = self.members.get(user_id)
+        return dict(member) if member else None
+
+    async def get_members_by_user_ids(self, organization_id, user_ids):
+        self.calls.append("get_members_by_user_ids")
+        return {u: dict(self.members[u]) for u in user_ids if u in self.members}
+
+    async def get_organization_members(self, organization_id, role_filter=None, **_):
+        self.calls.append("get_organization_members")
+        return [
+            SimpleNamespace(**m)
+            for m in self.members.values()
+            if m["status"] == "active" and m["role"] == role_filter.value
+        ]
+
+    async def bulk_add_organization_members(self, organization_id, rows):
+        self.calls.append("bulk_add_organization_members")
+        for row in rows:
+            self.add_member(row["user_id"], row["role"])
+        return [row["user_id"] for row in rows]
+
+    async def bulk_update_organization_members(self, organization_id, rows):
+        self.calls.append("bulk_update_organization_members")
+        for row in rows:
+            for key in ("role", "status", "permissions"):
+                if row[key] is not None:
+                    self.members[row["user_id"]][key] = row[key]
+        return [row["user_id"] for row in rows]
+
+    async def bulk_remove_organization_members(self, organization_id, user_ids):
+        self.calls.append("bulk_remove_organization_members")
+        for user_id in user_ids:
+            self.members[user_id]["status"] = "inactive"
+        return list(user_ids)
+
+
+class _EventBus:
+    def __init__(self):
+        self.events = []
+
+    async def publish_event(self, event):
+        self.events.append(event)
+
+
+class _ContextCache(UserContextCache):
+    def __init__(self):
+        self.invalidated = []
+
+    async def invalidate_users(self, user_ids):
+        self.invalidated.extend(user_ids)
+
+
+def _service(repository):
+    return OrganizationService(
+        repository=repository, event_bus=_EventBus(), context_cache=_ContextCache()
+    )
+
+
+def _repository():
+    repository = _FakeRepository()
+    repository.add_member("usr_owner", role="owner")
+    repository.add_member("usr_admin", role="admin")
+    repository.add_member("usr_1")
+    repository.add_member("usr_gone", status="inactive")
+    return repository
+
+
+# ----------------------------------------------------------------------
+# Add
+# ----------------------------------------------------------------------
+
+
+async def test_bulk_add_is_one_write_with_per_row_errors():
+    repository = _repository()
+    service = _service(repository)
+    request = OrganizationMemberBulkAddRequest(
+        members=[BulkMemberAddItem(user_id=f"usr_new_{i}") for i in range(50)]
+        + [
+            BulkMemberAddItem(user_id="usr_1"),
+            BulkMemberAddItem(user_id="usr_gone", role="viewer"),
+            BulkMemberAddItem(user_id="usr_boss", role="owner"),
+            BulkMemberAddItem(user_id="usr_new_0"),
+        ]
+    )
+
+    result = await service.bulk_add_organization_members("org_1", request, "usr_owner")
+
+    assert len(result.succeeded) == 51
+    assert "usr_gone" in result.succeeded
+    assert [(e.index, e.user_id) for e in result.errors] == [
+        (50, "usr_1"),
+        (52, "usr_boss"),
+        (53, "usr_new_0"),
+    ]
+    assert repository.calls == [
+        "get_user_organization_role",
+        "get_members_by_user_ids",
+        "bulk_add_organization_members",
+    ]
+    [event] = service.event_bus.events
+    assert event.type == "organization.members_bulk_added"
+    assert len(event.data["user_ids"]) == 51
+    assert service.context_cache.invalidated == result.succeeded
+
+
+async def test_admin_cannot_bulk_add_admins():
+    repository = _repository()
+    service = _service(repository)
+    request = OrganizationMemberBulkAddRequest(
+        members=[
+            BulkMemberAddItem(user_id="usr_a", role="admin"),
+            BulkMemberAddItem(user_id="usr_b"),
+        ]
+    )
+
+    result = await service.bulk_add_organization_members("org_1", request, "usr_admin")
+
+    assert result.succeeded == ["usr_b"]
+    assert "admin_cannot_assign_admin_or_owner" in result.errors[0].error
+
+
+async def test_non_admin_is_rejected_before_any_write():
+    repository = _repository()
+    service = _service(repository)
+    request = OrganizationMemberBulkAddRequest(
+        members=[BulkMemberAddItem(user_id="usr_x")]
+    )
+
+    with pytest.raises(OrganizationAccessDeniedError):
+        await service.bulk_add_organization_members("org_1", request, "usr_1")
+    assert repository.calls == ["get_user_organization_role"]
+    assert service.event_bus.events == []
+
+
+# ----------------------------------------------------------------------
+# Update / remove
+# ----------------------------------------------------------------------
+
+
+async def test_bulk_update_reports_missing_and_protected_members():
+    repository = _repository()
+    service = _service(repository)
+    request = OrganizationMemberBulkUpdateRequest(
+        members=[
+            BulkMemberUpdateItem(user_id="usr_1", role="viewer"),
+            BulkMemberUpdateItem(user_id="usr_owner", role="member"),
+            BulkMemberUpdateItem(user_id="usr_nobody", role="member"),
+        ]
+    )
+
+    result = await service.bulk_update_organization_members(
+        "org_1", request, "usr_admin"
+    )
+
+    assert result.succeeded == ["usr_1"]
+    assert [e.user_id for e in result.errors] == ["usr_owner", "usr_nobody"]
+    assert repository.members["usr_1"]["role"] == "viewer"
+    [event] = service.event_bus.events
+    assert event.data["role_changes"] == [
+        {"user_id": "usr_1", "old_role": "member", "new_role": "viewer"}
+    ]
+
+
+async def test_bulk_remove_keeps_the_last_owner():
+    repository = _repository()
+    repository.add_member("usr_owner_2", role="owner")
+    service = _service(repository)
+    request = OrganizationMemberBulkRemoveRequest(
+        user_ids=["usr_owner", "usr_owner_2", "usr_1", "usr_gone"]
+    )
+
+    result = await service.bulk_remove_organization_members(
+        "org_1", request, "usr_owner"
+    )
+
+    assert result.succeeded == ["usr_owner", "usr_1"]
+    assert [(e.index, e.user_id) for e in result.errors] == [
+        (1, "usr_owner_2"),
+        (3, "usr_gone"),
+    ]
+    assert repository.calls.count("get_organization_members") == 1
+    assert repository.calls.count("bulk_remove_organization_members") == 1
+
+
+async def test_nothing_succeeded_publishes_nothing():
+    repository = _repository()
+    service = _service(repository)
+    request = OrganizationMemberBulkRemoveRequest(user_ids=["usr_nobody"])
+
+    result = await service.bulk_remove_organization_members(
+        "org_1", request, "usr_owner"
+    )
+
+    assert result.succeeded == []
+    assert service.event_bus.events == []
+    assert service.context_cache.invalidated == []
@@ -0,0 +1,265 @@
+"""
+Unit tests for the organization user-context cache.
+
+Verifies that get_user_context / switch_user_context are served from the
+in-process and Redis tiers, and that member and organization changes
+invalidate exactly the affected entries.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from core.nats_client import Event
+from core.redis_cache import RedisCache
+from microservices.organization_service.models import (
+    OrganizationMemberUpdateRequest,
+    OrganizationUpdateRequest,
+)
+from microservices.organization_service.organization_service import (
+    OrganizationAccessDeniedError,
+    OrganizationService,
+)
+from microservices.organization_service.user_context_cache import UserContextCache
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+class _FakeRepository:
+    """Counts the reads the context cache is meant to save"""
+
+    def __init__(self):
+        self.organizations = {}
+        self.members = []
+        self.calls = []
+
+    def add_org(self, organization_id, name, credits_pool="100", status="active"):
+        self.organizations[organization_id] = {
+            "name": name,
+            "status": status,
+            "credits_pool": Decimal(credits_pool),
+        }
+
+    def add_member(self, organization_id, user_id, role="member", status="active"):
+        self.members.append(
+            {
+                "organization_id": organization_id,
+                "user_id": user_id,
+                "role": role,
+                "status": status,
+                "permissions": [],
+            }
+        )
+
+    def _member(self, organization_id, user_id):
+        return next(
+            (
+                m
+                for m in self.members
+                if m["organization_id"] == organization_id and m["user_id"] == user_id
+            ),
+            None,
+        )
+
+    async def get_user_memberships(self, user_id):
+        self.calls.append("get_user_memberships")
+        return [
+            {k: m[k] for k in ("organization_id", "role", "status", "permissions")}
+            for m in self.members
+            if m["user_id"] == user_id
+        ]
+
+    async def get_organization(self, organization_id):
+        self.calls.append("get_organization")
+        org = self.organizations.get(organization_id)
+        return SimpleNamespace(**org) if org else None
+
+    async def get_user_organization_role(self, organization_id, user_id):
+        member = self._member(organization_id, user_id)
+        return dict(member) if member else None
+
+    async def update_organization(self, organization_id, update_data):
+        self.organizations[organization_id].update(update_data)
+        return SimpleNamespace(**self.organizations[organization_id])
+
+    async def update_organization_member(self, organization_id, user_id, update_data):
+        member = self._member(organization_id, user_id)
+        member.update(update_data)
+        return member
+
+    async def remove_organization_member(self, organization_id, user_id):
+        self.members.remove(self._member(organization_id, user_id))
+        return True
+
+
+def _redis(server=None) -> RedisCache:
+    client = fakeredis.aioredis.FakeRedis(
+        server=server or fakeredis.FakeServer(), decode_responses=False
+    )
+    return RedisCache("organization:user_context", client=client)
+
+
+def _service(repository, server=None) -> OrganizationService:
+    return OrganizationService(
+        repository=repository, context_cache=UserContextCache(_redis(server))
+    )
+
+
+def _repository() -> _FakeRepository:
+    repository = _FakeRepository()
+    repository.add_org("org_1", "Acme")
+    repository.add_member("org_1", "usr_owner", role="owner")
+    repository.add_member("org_1", "usr_1")
+    return repository
+
+
+# ----------------------------------------------------------------------
+# Reads
+# ----------------------------------------------------------------------
+
+
+async def test_repeated_context_reads_hit_the_repository_once():
+    repository = _repository()
+    service = _service(repository)
+
+    for _ in range(3):
+        context = await service.get_user_context("usr_1")
+        await service.switch_user_context("usr_1", "org_1")
+
+    assert context.organization_id == "org_1"
+    assert context.organization_name == "Acme"
+    assert context.credits_available == Decimal("100")
+    assert repository.calls == ["get_user_memberships", "get_organization"]
+
+
+async def test_redis_tier_is_shared_between_replicas():
+    repository = _repository()
+    server = fakeredis.FakeServer()
+    await _service(repository, server).get_user_context("usr_1")
+    repository.calls.clear()
+
+    context = await _service(repository, server).get_user_context("usr_1")
+
+    assert context.organization_name == "Acme"
+    assert context.credits_available == Decimal("100")
+    assert repository.calls == []
+
+
+async def test_context_skips_inactive_and_deleted_organizations():
+    repository = _FakeRepository()
+    repository.add_org("org_gone", "Gone", status="deleted")
+    repository.add_org("org_live", "Live")
+    repository.add_member("org_gone", "usr_1")
+    repository.add_member("org_live", "usr_1", status="suspended")
+    service = _service(repository)
+
+    assert (await service.get_user_context("usr_1")).context_type == "individual"
+    with pytest.raises(OrganizationAccessDeniedError):
+        await service.switch_user_context("usr_1", "org_live")
+
+
+# ----------------------------------------------------------------------
+# Invalidation
+# ----------------------------------------------------------------------
+
+
+async def test_member_changes_invalidate_the_member():
+    repository = _repository()
+    service = _service(repository)
+    await service.get_user_context("usr_1")
+
+    await service.update_organization_member(
+        "org_1", "usr_1", OrganizationMemberUpdateRequest(role="admin"), "usr_owner"
+    )
+    assert (await service.get_user_context("usr_1")).user_role.value == "admin"
+
+    await service.remove_organization_member("org_1", "usr_1", "usr_owner")
+    assert (await service.get_user_context("usr_1")).context_type == "individual"
+
+
+async def test_organization_update_reaches_every_member():
+    repository = _repository()
+    service = _service(repository)
+    await service.get_user_context("usr_1")
+    await service.get_user_context("usr_owner")
+
+    await service.update_organization(
+        "org_1", OrganizationUpdateRequest(name="Acme Corp"), "usr_owner"
+    )
+    repository.calls.clear()
+
+    assert (await service.get_user_context("usr_1")).organization_name == "Acme Corp"
+    assert (
+        await service.get_user_context("usr_owner")
+    ).organization_name == "Acme Corp"
+    # Memberships stayed cached; only the organization entry was reloaded
+    assert repository.calls == ["get_organization"]
+
+
+async def test_events_drop_other_replicas_local_entries():
+    cache = UserContextCache(_redis())
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return []
+
+    await cache.get_memberships("usr_1", load)
+    await cache._redis.delete("user:usr_1")  # the publishing replica's write
+    await cache.handle_event(
+        Event(
+            event_type="organization.member_removed",
+            source="organization_service",
+            data={"organization_id": "org_1", "user_id": "usr_1"},
+        )
+    )
+    await cache.get_memberships("usr_1", load)
+
+    assert len(loads) == 2
+
+
+async def test_fill_racing_an_invalidation_does_not_store_the_stale_value():
+    server = fakeredis.FakeServer()
+    reader, writer = UserContextCache(_redis(server)), UserContextCache(_redis(server))
+    memberships = [{"organization_id": "org_1", "role": "member"}]
+
+    async def stale_load():
+        stale = [dict(m) for m in memberships]
+        # Another replica commits a change and invalidates mid-load
+        memberships[0]["role"] = "admin"
+        await writer.invalidate_user("usr_1")
+        await reader.handle_event(
+            Event(
+                event_type="organization.member_updated",
+                source="organization_service",
+                data={"organization_id": "org_1", "user_id": "usr_1"},
+            )
+        )
+        return stale
+
+    async def load():
+        return [dict(m) for m in memberships]
+
+    assert (await reader.get_memberships("usr_1", stale_load))[0]["role"] == "member"
+
+    assert (await reader.get_memberships("usr_1", load))[0]["role"] == "admin"
+    fresh = UserContextCache(_redis(server))
+    assert (await fresh.get_memberships("usr_1", load))[0]["role"] == "admin"
+
+
+async def test_local_tier_is_bounded():
+    cache = UserContextCache(_redis(), max_local_entries=2)
+
+    async def load():
+        return []
+
+    for user_id in ("a", "b", "c"):
+        await cache.get_memberships(user_id, load)
+
+    assert list(cache._local) == ["user:b", "user:c"]
@@ -0,0 +1,184 @@
+"""Unit tests for the session message append path.
+
+Covers the cached owner lookup in SessionService.add_messages and the
+coalescing of per-message events into session.activity events.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from microservices.session_service.activity import SessionActivityCoalescer
+from microservices.session_service.models import MessageCreateRequest
+from microservices.session_service.protocols import (
+    SessionNotFoundError,
+    SessionValidationError,
+)
+from microservices.session_service.session_service import SessionService
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+class _EventBus:
+    def __init__(self):
+        self.events = []
+
+    async def publish_event(self, event):
+        self.events.append(event)
+
+    def types(self):
+        return [e.type for e in self.events]
+
+
+class _SessionRepo:
+    def __init__(self, owners):
+        self.owners = owners
+        self.lookups = 0
+
+    async def get_by_session_id(self, session_id):
+        self.lookups += 1
+        owner = self.owners.get(session_id)
+        return SimpleNamespace(session_id=session_id, user_id=owner) if owner else None
+
+
+class _MessageRepo:
+    def __init__(self, owners):
+        self.owners = owners
+        self.calls = 0
+
+    async def append_messages(self, session_id, user_id, messages):
+        self.calls += 1
+        if self.owners.get(session_id) != user_id:
+            return []
+        return [
+            SimpleNamespace(
+                message_id=f"m{self.calls}-{i}",
+                session_id=session_id,
+                user_id=user_id,
+                created_at=datetime.now(timezone.utc),
+                **message,
+            )
+            for i, message in enumerate(messages)
+        ]
+
+
+def _request(content="hello", tokens=0):
+    return MessageCreateRequest(
+        role="user", content=content, tokens_used=tokens, cost_usd=tokens / 1000
+    )
+
+
+def _service(owners, coalescer=None, event_bus=None):
+    session_repo, message_repo = _SessionRepo(owners), _MessageRepo(owners)
+    service = SessionService(
+        session_repo=session_repo,
+        message_repo=message_repo,
+        event_bus=event_bus,
+        account_client=object(),
+        activity_coalescer=coalescer,
+    )
+    return service, session_repo, message_repo
+
+
+class TestAddMessages:
+    async def test_batch_is_one_write_and_owner_is_cached(self):
+        service, session_repo, message_repo = _service({"s1": "u1"})
+
+        batch = await service.add_messages("s1", [_request("a"), _request("b")], "u1")
+        await service.add_message("s1", _request("c"), "u1")
+
+        assert [m.content for m in batch.messages] == ["a", "b"]
+        assert message_repo.calls == 2
+        assert session_repo.lookups == 1
+
+    async def test_wrong_user_is_not_found_even_when_cached(self):
+        service, _, _ = _service({"s1": "u1"})
+        await service.add_message("s1", _request(), "u1")
+        with pytest.raises(SessionNotFoundError):
+            await service.add_message("s1", _request(), "intruder")
+
+    async def test_deleted_session_drops_cached_owner(self):
+        owners = {"s1": "u1"}
+        service, session_repo, _ = _service(owners)
+        await service.add_message("s1", _request(), "u1")
+        del owners["s1"]
+
+        with pytest.raises(SessionNotFoundError):
+            await service.add_message("s1", _request(), "u1")
+        with pytest.raises(SessionNotFoundError):
+            await service.add_message("s1", _request(), "u1")
+        assert session_repo.lookups == 2
+
+    async def test_batch_is_validated_before_writing(self):
+        service, _, message_repo = _service({"s1": "u1"})
+        with pytest.raises(SessionValidationError):
+            await service.add_messages("s1", [_request("ok"), _request("   ")], "u1")
+        with pytest.raises(SessionValidationError):
+            await service.add_messages("s1", [], "u1")
+        assert message_repo.calls == 0
+
+    async def test_events_go_to_coalescer_not_bus(self):
+        bus = _EventBus()
+        coalescer = SessionActivityCoalescer(bus, flush_interval=60)
+        service, _, _ = _service({"s1": "u1"}, coalescer=coalescer, event_bus=bus)
+
+        await service.add_messages(
+            "s1", [_request("a", tokens=10), _request("b", tokens=5)], "u1"
+        )
+        assert bus.events == []
+
+        await coalescer.flush()
+        assert bus.types() == ["session.activity", "session.tokens_used"]
+        activity, tokens = bus.events
+        assert [m["content"] for m in activity.data["messages"]] == ["a", "b"]
+        assert tokens.data["tokens_used"] == 15
+
+
+class TestActivityCoalescer:
+    def _message(self, message_id, tokens=0):
+        return SimpleNamespace(
+            message_id=message_id,
+            role="assistant",
+            content=f"content {message_id}",
+            message_type="chat",
+            tokens_used=tokens,
+            cost_usd=0.0,
+            created_at=datetime.now(timezone.utc),
+        )
+
+    async def test_one_event_per_session_per_flush(self):
+        bus = _EventBus()
+        coalescer = SessionActivityCoalescer(bus, flush_interval=60)
+        for n in range(5):
+            coalescer.record("s1", "u1", [self._message(f"a{n}")])
+        coalescer.record("s2", "u2", [self._message("b0")])
+
+        assert await coalescer.flush() == 2
+        assert bus.types() == ["session.activity", "session.activity"]
+        assert bus.events[0].data["message_count"] == 5
+        assert await coalescer.flush() == 0
+
+    async def test_full_batch_flushes_early(self):
+        bus = _EventBus()
+        coalescer = SessionActivityCoalescer(bus, flush_interval=60, max_batch=3)
+        coalescer.start()
+        try:
+            coalescer.record("s1", "u1", [self._message(f"m{n}") for n in range(3)])
+            for _ in range(100):
+                if bus.events:
+                    break
+                await asyncio.sleep(0.01)
+            assert bus.types() == ["session.activity"]
+        finally:
+            await coalescer.stop()
+
+    async def test_stop_flushes_pending(self):
+        bus = _EventBus()
+        coalescer = SessionActivityCoalescer(bus, flush_interval=60)
+        coalescer.start()
+        coalescer.record("s1", "u1", [self._message("m0", tokens=7)])
+        await coalescer.stop()
+        assert bus.types() == ["session.activity", "session.tokens_used"]
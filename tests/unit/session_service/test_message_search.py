@@ -0,0 +1,111 @@
+"""Unit tests for ranked message search pagination in SessionService."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from core.text_search import InvalidCursorError, decode_cursor, encode_cursor
+from microservices.session_service.protocols import SessionValidationError
+from microservices.session_service.session_service import SessionService
+
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+def _row(message_id, session_id="sess_1", rank=0.5):
+    return {
+        "message_id": message_id,
+        "session_id": session_id,
+        "role": "user",
+        "content": "deploy the search index",
+        "message_type": "chat",
+        "message_created_at": datetime(2026, 10, 1, tzinfo=timezone.utc),
+        "rank": rank,
+        "snippet": "deploy the <<search>> index",
+        "session_status": "active",
+        "session_summary": "",
+        "session_message_count": 3,
+    }
+
+
+class _MessageRepo:
+    def __init__(self, rows, error=None):
+        self.rows = rows
+        self.error = error
+        self.calls = []
+
+    async def search_messages(self, user_id, query, limit=20, cursor=None):
+        self.calls.append(cursor)
+        if self.error:
+            raise self.error
+        return self.rows[:limit], len(self.rows)
+
+    def search_cursor(self, row):
+        return encode_cursor(
+            [row["rank"], row["message_created_at"], row["message_id"]]
+        )
+
+
+def _service(repo):
+    return SessionService(session_repo=object(), message_repo=repo)
+
+
+async def test_full_page_returns_keyset_cursor_of_last_hit():
+    repo = _MessageRepo([_row("m1", rank=0.9), _row("m2", "sess_2", rank=0.4)])
+    result = await _service(repo).search_sessions("user_1", " search ", limit=2)
+
+    assert [s.session_id for s in result.results] == ["sess_1", "sess_2"]
+    assert result.results[0].hits[0].snippet == "deploy the <<search>> index"
+    rank, created_at, message_id = decode_cursor(result.next_cursor, 3)
+    assert (rank, message_id) == (0.4, "m2")
+    assert created_at == datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+async def test_short_page_has_no_cursor():
+    result = await _service(_MessageRepo([_row("m1")])).search_sessions(
+        "user_1", "q", limit=5
+    )
+    assert result.next_cursor is None and result.total_hits == 1
+
+
+async def test_invalid_cursor_is_a_validation_error():
+    repo = _MessageRepo([], error=InvalidCursorError("Malformed cursor"))
+    with pytest.raises(SessionValidationError):
+        await _service(repo).search_sessions("user_1", "deploy", cursor="junk")
+
+
+class _RecordingDb:
+    def __init__(self):
+        self.queries = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def query_row(self, sql, params=None, schema=None):
+        self.queries.append(sql)
+        return {"cnt": 0}
+
+    async def query(self, sql, params=None, schema=None):
+        self.queries.append(sql)
+        return []
+
+
+async def test_hits_of_deleted_sessions_are_filtered_before_the_page_limit():
+    from microservices.session_service.session_repository import (
+        SessionMessageRepository,
+    )
+
+    repo = object.__new__(SessionMessageRepository)
+    repo.db = _RecordingDb()
+    repo.schema = "session"
+    repo.messages_table = "session_messages"
+
+    await repo.search_messages("user_1", "deploy", limit=5)
+
+    count_sql, search_sql = repo.db.queries
+    assert "EXISTS" in count_sql
+    hit_cte = search_sql[: search_sql.index("LIMIT")]
+    assert "session.sessions s" in hit_cte and "EXISTS" in hit_cte
@@ -0,0 +1,249 @@
+"""Unit tests for the embedded task scheduler.
+
+An in-memory repository mirrors the lease semantics of the SQL in
+TaskRepository (claim due or lease-expired rows, renew/release only by the
+lease owner); the service is a stub recording which tasks ran.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from microservices.task_service.task_scheduler import TaskScheduler
+from microservices.task_service.task_service import TaskService
+
+
+pytestmark = pytest.mark.unit
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class _FakeTaskRepository:
+    def __init__(self):
+        self.rows = {}
+
+    def add(
+        self, task_id, status="scheduled", next_run_time=None, schedule=None, **fields
+    ):
+        self.rows[task_id] = {
+            "task_id": task_id,
+            "task_type": "custom",
+            "status": status,
+            "next_run_time": next_run_time or _now() - timedelta(seconds=1),
+            "schedule": schedule,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            **fields,
+        }
+
+    async def claim_due_tasks(self, owner, limit, lease_seconds):
+        now = _now()
+        due = [
+            row
+            for row in self.rows.values()
+            if (row["status"] == "scheduled" and row["next_run_time"] <= now)
+            or (
+                row["status"] == "running"
+                and row["lease_owner"]
+                and row["lease_expires_at"] < now
+            )
+        ][:limit]
+        for row in due:
+            row.update(
+                status="running",
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+        return [SimpleNamespace(**row) for row in due]
+
+    async def renew_task_leases(self, owner, task_ids, lease_seconds):
+        renewed = []
+        for task_id in task_ids:
+            row = self.rows[task_id]
+            if row["lease_owner"] == owner and row["status"] == "running":
+                row["lease_expires_at"] = _now() + timedelta(seconds=lease_seconds)
+                renewed.append(task_id)
+        return renewed
+
+    async def release_task_lease(self, task_id, owner, status, next_run_time):
+        row = self.rows[task_id]
+        if row["lease_owner"] != owner:
+            return False
+        row.update(
+            status=status,
+            next_run_time=next_run_time,
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+        return True
+
+    async def get_scheduler_backlog(self):
+        due = [
+            row["next_run_time"]
+            for row in self.rows.values()
+            if row["status"] == "scheduled" and row["next_run_time"] <= _now()
+        ]
+        return {"due": len(due), "oldest_due_at": min(due) if due else None}
+
+
+class _FakeService:
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.runs = []
+        self.active = 0
+        self.max_active = 0
+
+    async def run_scheduled_task(self, task):
+        self.runs.append(task.task_id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if task.task_id in self.fail:
+            raise RuntimeError("executor failed")
+        return True
+
+    def next_run_time_after_run(self, task):
+        if task.schedule and task.schedule.get("type") == "daily":
+            return _now() + timedelta(days=1)
+        return None
+
+
+@pytest.mark.asyncio
+class TestClaiming:
+    async def test_replicas_never_run_a_task_twice(self):
+        repository, service = _FakeTaskRepository(), _FakeService(delay=0.01)
+        for i in range(20):
+            repository.add(f"task_{i}")
+        schedulers = [
+            TaskScheduler(service, repository, workers=8, owner=f"replica-{n}")
+            for n in range(3)
+        ]
+
+        while sum(await asyncio.gather(*(s.run_once() for s in schedulers))):
+            pass
+
+        assert sorted(service.runs) == sorted(repository.rows)
+        assert len(service.runs) == len(set(service.runs))
+
+    async def test_expired_lease_is_reclaimed(self):
+        repository, service = _FakeTaskRepository(), _FakeService()
+        repository.add(
+            "orphan",
+            status="running",
+            lease_owner="crashed-replica",
+            lease_expires_at=_now() - timedelta(seconds=1),
+        )
+        repository.add(
+            "busy",
+            status="running",
+            lease_owner="live-replica",
+            lease_expires_at=_now() + timedelta(minutes=5),
+        )
+
+        await TaskScheduler(service, repository, owner="me").run_once()
+
+        assert service.runs == ["orphan"]
+
+    async def test_future_tasks_are_not_claimed(self):
+        repository, service = _FakeTaskRepository(), _FakeService()
+        repository.add("later", next_run_time=_now() + timedelta(hours=1))
+
+        assert await TaskScheduler(service, repository).run_once() == 0
+
+
+@pytest.mark.asyncio
+class TestOutcome:
+    async def test_recurring_task_is_rescheduled_even_after_failure(self):
+        repository, service = _FakeTaskRepository(), _FakeService(fail={"daily"})
+        repository.add("daily", schedule={"type": "daily", "run_time": "09:00"})
+
+        await TaskScheduler(service, repository).run_once()
+
+        row = repository.rows["daily"]
+        assert row["status"] == "scheduled"
+        assert row["next_run_time"] > _now()
+        assert row["lease_owner"] is None
+
+    async def test_one_off_tasks_complete_or_fail(self):
+        repository, service = _FakeTaskRepository(), _FakeService(fail={"bad"})
+        repository.add("good")
+        repository.add("bad")
+
+        await TaskScheduler(service, repository).run_once()
+
+        assert repository.rows["good"]["status"] == "completed"
+        assert repository.rows["bad"]["status"] == "failed"
+        assert repository.rows["good"]["next_run_time"] is None
+
+
+@pytest.mark.asyncio
+class TestLoop:
+    async def test_background_loop_bounds_concurrency(self):
+        repository, service = _FakeTaskRepository(), _FakeService(delay=0.02)
+        for i in range(12):
+            repository.add(f"task_{i}")
+        scheduler = TaskScheduler(
+            service, repository, workers=3, batch_size=2, poll_interval_seconds=0.01
+        )
+
+        scheduler.start()
+        for _ in range(200):
+            if all(row["status"] == "completed" for row in repository.rows.values()):
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert len(service.runs) == 12
+        assert service.max_active <= 3
+
+    async def test_lost_lease_cancels_the_run(self):
+        repository, service = _FakeTaskRepository(), _FakeService(delay=10)
+        repository.add("slow")
+        scheduler = TaskScheduler(service, repository, owner="me")
+
+        await scheduler._claim(1)
+        await asyncio.sleep(0)
+        repository.rows["slow"]["lease_owner"] = "someone-else"
+        runner = scheduler._running["slow"]
+        await scheduler.renew_leases()
+
+        with pytest.raises(asyncio.CancelledError):
+            await runner
+        # The new owner's lease is left alone
+        assert repository.rows["slow"]["lease_owner"] == "someone-else"
+        await scheduler.stop()
+
+    async def test_backlog_reports_due_tasks(self):
+        repository = _FakeTaskRepository()
+        repository.add("a", next_run_time=_now() - timedelta(minutes=5))
+        repository.add("b", next_run_time=_now() + timedelta(minutes=5))
+
+        backlog = await TaskScheduler(_FakeService(), repository).report_backlog()
+
+        assert backlog["due"] == 1
+
+
+class TestNextRunTime:
+    def _service(self):
+        # Only the schedule helpers are exercised; skip I/O setup
+        return TaskService.__new__(TaskService)
+
+    def test_recurring_schedule_moves_forward(self):
+        task = SimpleNamespace(schedule={"type": "daily", "run_time": "09:00"})
+        next_run = self._service().next_run_time_after_run(task)
+        assert next_run is not None and next_run > datetime.utcnow()
+
+    def test_one_off_schedule_has_no_next_run(self):
+        for schedule in (None, {"type": "once", "run_time": "2026-01-01T09:00:00"}):
+            task = SimpleNamespace(schedule=schedule)
+            assert self._service().next_run_time_after_run(task) is None
@@ -94,3 +94,105 @@ class TestConsumerNameSanitization:
         from core.nats_client import NATSEventBus
 
         assert NATSEventBus._sanitize_consumer_name(">>>") == "consumer"
+
+
+class _FakeDelivery:
+    def __init__(self, last=False):
+        self.is_last_delivery = last
+        self.calls = []
+
+    async def ack(self):
+        self.calls.append("ack")
+
+    async def nak(self, delay=None):
+        self.calls.append(("nak", delay))
+
+    async def term(self):
+        self.calls.append("term")
+
+
+class TestAckAfterHandler:
+    """Explicit-ack mode settles each message from its handler's outcome."""
+
+    def _bus(self):
+        from core.nats_client import NATSEventBus
+
+        bus = object.__new__(NATSEventBus)
+        bus._client = MagicMock()
+        return bus
+
+    def _msg(self, delivery, data=None):
+        import json
+
+        body = data or {"type": "user.created", "source": "account", "data": {"id": 1}}
+        return {"subject": "account.user.created", "sequence": 7, "data": json.dumps(body).encode(), "delivery": delivery}
+
+    @pytest.mark.asyncio
+    async def test_acks_after_successful_handler(self):
+        delivery = _FakeDelivery()
+        handler = AsyncMock()
+        await self._bus()._handle_and_ack(self._msg(delivery), "*.*", handler, 5.0)
+        handler.assert_awaited_once()
+        assert delivery.calls == ["ack"]
+
+    @pytest.mark.asyncio
+    async def test_naks_when_handler_raises(self):
+        delivery = _FakeDelivery()
+        handler = AsyncMock(side_effect=RuntimeError("db down"))
+        await self._bus()._handle_and_ack(self._msg(delivery), "*.*", handler, 2.5)
+        assert delivery.calls == [("nak", 2.5)]
+
+    @pytest.mark.asyncio
+    async def test_last_delivery_is_terminated_instead_of_nak(self):
+        delivery = _FakeDelivery(last=True)
+        handler = AsyncMock(side_effect=RuntimeError("db down"))
+        await self._bus()._handle_and_ack(self._msg(delivery), "*.*", handler, 2.5)
+        assert delivery.calls == ["term"]
+
+    @pytest.mark.asyncio
+    async def test_unparseable_message_is_terminated(self):
+        delivery = _FakeDelivery()
+        msg = {"subject": "x.y", "sequence": 1, "data": b"not json", "delivery": delivery}
+        handler = AsyncMock()
+        await self._bus()._handle_and_ack(msg, "*.*", handler, 5.0)
+        handler.assert_not_awaited()
+        assert delivery.calls == ["term"]
+
+    @pytest.mark.asyncio
+    async def test_missing_delivery_handle_is_logged(self, caplog):
+        msg = self._msg(None)
+        msg["_msg"] = MagicMock()
+        handler = AsyncMock()
+        with caplog.at_level("ERROR", logger="core.nats_client"):
+            await self._bus()._handle_and_ack(msg, "*.*", handler, 5.0)
+        handler.assert_awaited_once()
+        assert "no 'delivery' handle" in caplog.text
+
+
+class TestEphemeralSubscription:
+    """Core NATS subscriptions create no JetStream consumer."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_the_handler_without_a_consumer(self):
+        import json
+
+        from core.nats_client import NATSEventBus
+
+        body = {"type": "organization.member_added", "source": "organization_service", "data": {"id": 1}}
+
+        async def messages(subject):
+            yield {"subject": "organization_service.organization.member_added", "sequence": 0, "data": json.dumps(body).encode()}
+
+        bus = object.__new__(NATSEventBus)
+        bus._client = MagicMock()
+        bus._client.subscribe = messages
+        bus._is_connected = True
+        bus._subscriptions = {}
+        bus._subscription_tasks = []
+        handler = AsyncMock()
+
+        assert await bus.subscribe_ephemeral("organization_service.organization.>", handler) == "organization_service.organization.>"
+        await asyncio.gather(*bus._subscription_tasks)
+
+        handler.assert_awaited_once()
+        bus._client.create_consumer.assert_not_called()
@@ -10,7 +10,15 @@ import time
 
 import pytest
 
-from core.rate_limiter import InMemoryBackend, RateLimitConfig, SlidingWindowCounter
+from core.rate_limiter import (
+    GCRA,
+    SLIDING_LOG,
+    SLIDING_WINDOW,
+    InMemoryBackend,
+    RateLimitConfig,
+    RedisBackend,
+    SlidingWindowCounter,
+)
 
 
 class TestSlidingWindowCounter:
@@ -119,3 +127,101 @@ class TestInMemoryBackend:
         await asyncio.sleep(0.02)
         count = await backend.increment("key", window=0.01)
         assert count == 1  # Old entries expired
+
+
+def _backends():
+    backends = [pytest.param(InMemoryBackend, id="memory")]
+    try:
+        import fakeredis.aioredis
+        import lupa  # noqa: F401  (fakeredis needs it for EVAL)
+
+        backends.append(
+            pytest.param(
+                lambda: RedisBackend(
+                    fakeredis.aioredis.FakeRedis(decode_responses=True)
+                ),
+                id="redis",
+            )
+        )
+    except ImportError:
+        pass
+    return backends
+
+
+@pytest.mark.parametrize("make_backend", _backends())
+class TestAlgorithms:
+    """GCRA, sliding-window counter and multi-limit checks on each backend"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("algorithm", [SLIDING_LOG, SLIDING_WINDOW, GCRA])
+    async def test_limit_is_enforced(self, make_backend, algorithm):
+        counter = SlidingWindowCounter(make_backend())
+        config = RateLimitConfig(requests=3, window_seconds=60, algorithm=algorithm)
+
+        results = [await counter.check("key", config) for _ in range(4)]
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert [info["remaining"] for _, info in results] == [2, 1, 0, 0]
+        assert 0 < results[-1][1]["retry_after"] <= 60
+
+    @pytest.mark.asyncio
+    async def test_gcra_refills_gradually(self, make_backend):
+        counter = SlidingWindowCounter(make_backend())
+        config = RateLimitConfig(requests=2, window_seconds=0.1, algorithm=GCRA)
+        for _ in range(2):
+            await counter.check("key", config)
+        assert (await counter.check("key", config))[0] is False
+
+        await asyncio.sleep(0.06)  # one emission interval (0.05s)
+        assert (await counter.check("key", config))[0] is True
+        assert (await counter.check("key", config))[0] is False
+
+    @pytest.mark.asyncio
+    async def test_check_many_counts_only_admitted_requests(self, make_backend):
+        counter = SlidingWindowCounter(make_backend())
+        limits = [
+            ("per-second", RateLimitConfig(10, 1, GCRA)),
+            ("per-day", RateLimitConfig(2, 86_400, SLIDING_WINDOW)),
+        ]
+
+        outcomes = [await counter.check_many(limits) for _ in range(3)]
+
+        assert [allowed for allowed, _ in outcomes] == [True, True, False]
+        rejected = outcomes[-1][1]
+        assert rejected[0].allowed and not rejected[1].allowed
+        # The rejected request did not use up per-second capacity
+        per_second, per_day = await counter.peek(limits)
+        assert per_second.remaining == 8
+        assert per_day.remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_limit_rejects(self, make_backend):
+        counter = SlidingWindowCounter(make_backend())
+        allowed, info = await counter.check("key", RateLimitConfig(0, 10, GCRA))
+        assert allowed is False and info["retry_after"] == 10
+
+
+class TestSlidingWindowEstimate:
+    """The previous window is weighted by its remaining overlap"""
+
+    @pytest.mark.asyncio
+    async def test_previous_window_counts_partially(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("core.rate_limiter.time.monotonic", lambda: clock[0])
+        counter = SlidingWindowCounter(InMemoryBackend())
+        config = RateLimitConfig(
+            requests=10, window_seconds=100, algorithm=SLIDING_WINDOW
+        )
+
+        for _ in range(10):
+            await counter.check("key", config)
+        clock[0] = 1175.0  # 75% into the next window: 10 * 0.25 still counts
+
+        allowed, info = await counter.check("key", config)
+        assert allowed is True
+        assert info["remaining"] == 6
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        RateLimitConfig(algorithm="leaky")
@@ -0,0 +1,188 @@
+"""Unit tests for SQL-side wallet statistics backed by the daily rollup.
+
+``WalletRepository.get_statistics`` used to sum at most 100 transactions in
+Python. It now issues one grouped aggregate that reads whole days from
+``wallet.wallet_daily_stats`` and only the partial edge days from
+``wallet.transactions``. These tests pin the range planning and the SQL
+shape against a fake DB.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from microservices.wallet_service.models import WalletBalance, WalletType
+from microservices.wallet_service.wallet_repository import (
+    WalletRepository,
+    _plan_statistics_range,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+UTC = timezone.utc
+
+
+class _FakeAsyncDB:
+    """Records queries and returns canned aggregate rows."""
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None):
+        self.rows = rows or []
+        self.queries: List[Dict[str, Any]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def query(self, sql, params=None, schema="public"):
+        self.queries.append(
+            {"sql": " ".join(sql.split()), "params": list(params or [])}
+        )
+        return self.rows
+
+
+def _wallet(wallet_id: str = "w1", balance: str = "50") -> WalletBalance:
+    return WalletBalance(
+        wallet_id=wallet_id,
+        user_id="user_1",
+        balance=Decimal(balance),
+        locked_balance=Decimal(0),
+        available_balance=Decimal(balance),
+        currency="USD",
+        wallet_type=WalletType.FIAT,
+        last_updated=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+
+def _build_repository(rows=None, wallets=None) -> WalletRepository:
+    repo = object.__new__(WalletRepository)
+    repo.db = _FakeAsyncDB(rows)
+    repo.schema = "wallet"
+    repo.transactions_table = "transactions"
+    repo.daily_stats_table = "wallet_daily_stats"
+    wallets = {w.wallet_id: w for w in (wallets or [_wallet()])}
+
+    async def get_wallet(wallet_id):
+        return wallets.get(wallet_id)
+
+    async def get_user_wallets(user_id, wallet_type=None):
+        return list(wallets.values())
+
+    repo.get_wallet = get_wallet
+    repo.get_user_wallets = get_user_wallets
+    return repo
+
+
+class TestPlanStatisticsRange:
+    def test_unbounded_range_reads_only_rollup(self):
+        assert _plan_statistics_range(None, None) == [("rollup", None, None, False)]
+
+    def test_midnight_aligned_range_has_only_tail_edge(self):
+        plan = _plan_statistics_range(
+            datetime(2026, 3, 1, tzinfo=UTC), datetime(2026, 3, 31, tzinfo=UTC)
+        )
+        assert plan == [
+            ("rollup", date(2026, 3, 1), date(2026, 3, 31), False),
+            (
+                "raw",
+                datetime(2026, 3, 31, tzinfo=UTC),
+                datetime(2026, 3, 31, tzinfo=UTC),
+                True,
+            ),
+        ]
+
+    def test_partial_days_are_read_from_transactions(self):
+        start = datetime(2026, 3, 1, 15, 30, tzinfo=UTC)
+        end = datetime(2026, 3, 10, 8, 0, tzinfo=UTC)
+        plan = _plan_statistics_range(start, end)
+        assert plan == [
+            ("rollup", date(2026, 3, 2), date(2026, 3, 10), False),
+            ("raw", start, datetime(2026, 3, 2, tzinfo=UTC), False),
+            ("raw", datetime(2026, 3, 10, tzinfo=UTC), end, True),
+        ]
+
+    def test_range_within_one_day_is_a_single_raw_scan(self):
+        start = datetime(2026, 3, 1, 1, tzinfo=UTC)
+        end = datetime(2026, 3, 1, 23, tzinfo=UTC)
+        assert _plan_statistics_range(start, end) == [("raw", start, end, True)]
+
+    def test_naive_datetimes_are_treated_as_utc(self):
+        plan = _plan_statistics_range(datetime(2026, 3, 1, 12), None)
+        assert plan[0] == ("rollup", date(2026, 3, 2), None, False)
+        assert plan[1][1] == datetime(2026, 3, 1, 12, tzinfo=UTC)
+
+
+class TestGetStatistics:
+    async def test_statistics_come_from_one_aggregate_query(self):
+        repo = _build_repository(
+            rows=[
+                {
+                    "wallet_id": "w1",
+                    "total_deposits": 1200.5,
+                    "total_withdrawals": 100.0,
+                    "total_consumed": 300.25,
+                    "total_refunded": 0,
+                    "total_transfers_in": 10.0,
+                    "total_transfers_out": 20.0,
+                    "transaction_count": 5000,
+                    "blockchain_transactions": 2,
+                    "total_gas_fees": 0.5,
+                }
+            ]
+        )
+
+        stats = await repo.get_statistics(
+            "w1",
+            datetime(2026, 3, 1, 15, tzinfo=UTC),
+            datetime(2026, 3, 10, 8, tzinfo=UTC),
+        )
+
+        assert len(repo.db.queries) == 1
+        sql = repo.db.queries[0]["sql"]
+        assert "FROM wallet.wallet_daily_stats" in sql
+        assert "FROM wallet.transactions" in sql
+        assert "LIMIT" not in sql
+        assert repo.db.queries[0]["params"][0] == ["w1"]
+
+        assert stats.transaction_count == 5000
+        assert stats.total_deposits == Decimal("1200.5")
+        assert stats.total_consumed == Decimal("300.25")
+        assert stats.total_transfers_in == Decimal("10.0")
+        assert stats.total_gas_fees == Decimal("0.5")
+        assert stats.current_balance == Decimal("50")
+
+    async def test_wallet_without_activity_has_zero_statistics(self):
+        repo = _build_repository(rows=[])
+        stats = await repo.get_statistics("w1")
+        assert stats.transaction_count == 0
+        assert stats.total_deposits == Decimal(0)
+
+    async def test_missing_wallet_returns_none(self):
+        repo = _build_repository()
+        assert await repo.get_statistics("unknown") is None
+        assert repo.db.queries == []
+
+
+class TestGetUserStatistics:
+    async def test_all_wallets_aggregated_in_one_query(self):
+        wallets = [_wallet("w1", "10"), _wallet("w2", "20")]
+        repo = _build_repository(
+            rows=[{"wallet_id": "w2", "total_deposits": 7, "transaction_count": 3}],
+            wallets=wallets,
+        )
+
+        result = await repo.get_user_statistics("user_1")
+
+        assert len(repo.db.queries) == 1
+        assert repo.db.queries[0]["params"][0] == ["w1", "w2"]
+        by_id = {wallet.wallet_id: stats for wallet, stats in result}
+        assert by_id["w1"].transaction_count == 0
+        assert by_id["w2"].transaction_count == 3
+        assert by_id["w2"].total_deposits == Decimal("7")
@@ -0,0 +1,273 @@
+"""Unit tests for the two-tier weather cache.
+
+Covers single-flight fetches, stale-while-revalidate refreshes, the
+in-process LRU and location normalization.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from microservices.weather_service.weather_cache import (
+    WeatherCache,
+    geohash_center,
+    geohash_encode,
+    normalize_location,
+    provider_location,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Repository:
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.reads = 0
+        self.writes = []
+
+    async def get_cached_weather(self, key):
+        self.reads += 1
+        return self.values.get(key)
+
+    async def set_cached_weather(self, key, data, ttl_seconds=900):
+        self.writes.append((key, ttl_seconds))
+        self.values[key] = data
+        return True
+
+
+class _Provider:
+    def __init__(self, result=None, delay=0.01, error=None):
+        self.result = result or {"temperature": 20}
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return dict(self.result)
+
+
+async def _drain(cache):
+    await asyncio.gather(*list(cache._tasks), return_exceptions=True)
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    async def test_concurrent_misses_share_one_fetch(self):
+        repository, provider = _Repository(), _Provider()
+        cache = WeatherCache(repository)
+
+        results = await asyncio.gather(
+            *[
+                cache.get_or_fetch("weather:current:london:metric", provider, ttl=60)
+                for _ in range(20)
+            ]
+        )
+
+        assert provider.calls == 1
+        assert all(r == ({"temperature": 20}, False) for r in results)
+        assert repository.writes == [("weather:current:london:metric", 60)]
+
+    async def test_second_call_is_served_from_memory(self):
+        repository, provider = _Repository(), _Provider()
+        cache = WeatherCache(repository)
+
+        await cache.get_or_fetch("weather:current:paris:metric", provider, ttl=60)
+        data, cached = await cache.get_or_fetch(
+            "weather:current:paris:metric", provider, ttl=60
+        )
+
+        assert (data, cached) == ({"temperature": 20}, True)
+        assert provider.calls == 1
+        assert repository.reads == 1
+
+    async def test_failed_fetch_reaches_all_waiters(self):
+        cache = WeatherCache(_Repository())
+        provider = _Provider(error=RuntimeError("provider down"))
+
+        results = await asyncio.gather(
+            *[
+                cache.get_or_fetch("weather:current:oslo:metric", provider, ttl=60)
+                for _ in range(3)
+            ],
+            return_exceptions=True,
+        )
+
+        assert provider.calls == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+class TestStaleWhileRevalidate:
+    def _stale(self, key, age, value=None):
+        return _Repository(
+            {
+                key: {
+                    "data": value or {"temperature": 10},
+                    "fetched_at": time.time() - age,
+                }
+            }
+        )
+
+    async def test_stale_value_is_served_while_one_refresh_runs(self):
+        key = "weather:forecast:rome:5"
+        repository = self._stale(key, age=120)
+        provider = _Provider(result={"temperature": 30})
+        cache = WeatherCache(repository)
+
+        first = await cache.get_or_fetch(key, provider, ttl=60, stale_ttl=600)
+        second = await cache.get_or_fetch(key, provider, ttl=60, stale_ttl=600)
+        assert first == second == ({"temperature": 10}, True)
+
+        await _drain(cache)
+        assert provider.calls == 1
+        assert await cache.get_or_fetch(key, provider, ttl=60, stale_ttl=600) == (
+            {"temperature": 30},
+            True,
+        )
+        assert repository.writes == [(key, 660)]
+
+    async def test_failed_refresh_keeps_serving_stale(self):
+        key = "weather:current:bern:metric"
+        cache = WeatherCache(self._stale(key, age=120))
+        provider = _Provider(error=RuntimeError("timeout"))
+
+        await cache.get_or_fetch(key, provider, ttl=60, stale_ttl=600)
+        await _drain(cache)
+
+        assert await cache.get_or_fetch(key, provider, ttl=60, stale_ttl=600) == (
+            {"temperature": 10},
+            True,
+        )
+
+    async def test_expired_entry_is_fetched_inline(self):
+        key = "weather:current:lima:metric"
+        cache = WeatherCache(self._stale(key, age=1000))
+        provider = _Provider(result={"temperature": 25})
+
+        assert await cache.get_or_fetch(key, provider, ttl=60, stale_ttl=600) == (
+            {"temperature": 25},
+            False,
+        )
+
+    async def test_plain_legacy_value_is_fresh(self):
+        key = "weather:current:kyiv:metric"
+        cache = WeatherCache(_Repository({key: {"temperature": 5}}))
+        provider = _Provider()
+
+        assert await cache.get_or_fetch(key, provider, ttl=60) == (
+            {"temperature": 5},
+            True,
+        )
+        assert provider.calls == 0
+
+
+@pytest.mark.asyncio
+class TestMemoryTier:
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = WeatherCache(_Repository(), max_entries=2)
+        for city in ("a", "b"):
+            await cache.get_or_fetch(
+                f"weather:current:{city}:metric", _Provider(), ttl=60
+            )
+        await cache.get_or_fetch("weather:current:a:metric", _Provider(), ttl=60)
+        await cache.get_or_fetch("weather:current:c:metric", _Provider(), ttl=60)
+
+        assert list(cache._entries) == [
+            "weather:current:a:metric",
+            "weather:current:c:metric",
+        ]
+
+    async def test_close_cancels_background_refresh(self):
+        key = "weather:current:doha:metric"
+        cache = WeatherCache(
+            _Repository({key: {"data": {}, "fetched_at": time.time() - 120}})
+        )
+
+        await cache.get_or_fetch(key, _Provider(delay=10), ttl=60, stale_ttl=600)
+        assert cache._tasks
+        await cache.close()
+        assert not cache._tasks and not cache._inflight
+
+
+class TestLocationNormalization:
+    def test_names_fold_case_and_whitespace(self):
+        assert (
+            normalize_location("  New   York , US ")
+            == normalize_location("new york,us")
+            == "new york,us"
+        )
+
+    def test_nearby_coordinates_share_a_geohash_cell(self):
+        assert normalize_location("51.5074,-0.1278") == normalize_location(
+            "51.5080, -0.1270"
+        )
+        assert normalize_location("51.5074,-0.1278") != normalize_location(
+            "48.8566,2.3522"
+        )
+        assert normalize_location("51.5074,-0.1278").startswith("geo:")
+
+    def test_out_of_range_coordinates_are_names(self):
+        assert normalize_location("95,200") == "95,200"
+
+    def test_geohash_round_trip(self):
+        assert geohash_encode(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+        latitude, longitude = geohash_center(geohash_encode(57.64911, 10.40744))
+        assert abs(latitude - 57.64911) < 0.03 and abs(longitude - 10.40744) < 0.03
+
+    def test_provider_location_is_the_cell_center(self):
+        assert provider_location("51.5074,-0.1278") == provider_location(
+            "51.5080,-0.1270"
+        )
+        assert provider_location(" London ") == "London"
+
+
+@pytest.mark.asyncio
+class TestWeatherAlerts:
+    def _service(self, alerts_by_location):
+        from microservices.weather_service.weather_service import WeatherService
+
+        repository = _Repository()
+        repository.lookups = []
+
+        async def get_active_alerts(location):
+            repository.lookups.append(location)
+            return alerts_by_location.get(location, [])
+
+        repository.get_active_alerts = get_active_alerts
+        service = object.__new__(WeatherService)
+        service.cache = WeatherCache(repository)
+        service.event_bus = None
+        service.alerts_ttl = 600
+        return service, repository
+
+    async def test_alerts_are_cached_per_exact_location(self):
+        alert = {
+            "location": "Berlin",
+            "alert_type": "storm",
+            "headline": "Storm",
+            "description": "Heavy wind",
+            "start_time": "2026-10-19T00:00:00",
+            "end_time": "2026-10-20T00:00:00",
+            "source": "test",
+        }
+        service, repository = self._service({"Berlin": [alert]})
+
+        first = await service.get_weather_alerts("Berlin")
+        other = await service.get_weather_alerts("berlin")
+
+        assert len(first.alerts) == 1
+        assert other.alerts == []
+        assert repository.lookups == ["Berlin", "berlin"]
+
+    async def test_alerts_are_not_kept_past_their_ttl(self):
+        service, repository = self._service({})
+
+        await service.get_weather_alerts("Berlin")
+
+        assert repository.writes == [("weather:alerts:Berlin", 600)]